@@ -29,6 +29,7 @@ from app.core.config import settings
 # Importar todos los modelos para que Alembic los detecte
 # IMPORTANTE: Importar todos los modelos de los dominios aquí
 from app.domains import *  # noqa: F403, F401
+from app.scripts.seeds.models import SeedEstado  # noqa: F401
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,59 @@
+"""add unaccented search columns and trigram indexes
+
+Revision ID: 82645a930a78
+Revises: 4368520b7836
+Create Date: 2026-10-18 21:40:12.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel  # Always import sqlmodel for SQLModel types
+import geoalchemy2  # Required for Geometry types
+
+from app.core.search import SEARCH_DDL_STATEMENTS, documento_busqueda_sql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '82645a930a78'
+down_revision: Union[str, Sequence[str], None] = '4368520b7836'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in SEARCH_DDL_STATEMENTS:
+        op.execute(statement)
+
+    op.add_column('ciudadano', sa.Column(
+        'busqueda', sa.Text(),
+        sa.Computed(documento_busqueda_sql('nombre', 'apellido')),
+        nullable=True,
+    ))
+    op.add_column('animal', sa.Column(
+        'busqueda', sa.Text(),
+        sa.Computed(documento_busqueda_sql('especie', 'subespecie', 'raza', 'identificacion')),
+        nullable=True,
+    ))
+
+    op.create_index('idx_ciudadano_busqueda_trgm', 'ciudadano', ['busqueda'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'busqueda': 'gin_trgm_ops'})
+    op.create_index('idx_animal_busqueda_trgm', 'animal', ['busqueda'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'busqueda': 'gin_trgm_ops'})
+    op.create_index('idx_ciudadano_documento_prefijo', 'ciudadano',
+                    [sa.text('(numero_documento::text) text_pattern_ops')], unique=False)
+    op.create_index('idx_caso_id_snvs_prefijo', 'caso_epidemiologico',
+                    [sa.text('(id_snvs::text) text_pattern_ops')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_caso_id_snvs_prefijo', table_name='caso_epidemiologico')
+    op.drop_index('idx_ciudadano_documento_prefijo', table_name='ciudadano')
+    op.drop_index('idx_animal_busqueda_trgm', table_name='animal')
+    op.drop_index('idx_ciudadano_busqueda_trgm', table_name='ciudadano')
+    op.drop_column('animal', 'busqueda')
+    op.drop_column('ciudadano', 'busqueda')
+    op.execute('DROP FUNCTION IF EXISTS f_unaccent(text)')
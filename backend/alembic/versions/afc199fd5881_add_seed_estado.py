@@ -0,0 +1,41 @@
+"""add seed estado
+
+Revision ID: afc199fd5881
+Revises: f7b4d2e9a1c3
+Create Date: 2026-10-19 21:07:33.418260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel  # Always import sqlmodel for SQLModel types
+import geoalchemy2  # Required for Geometry types
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'afc199fd5881'
+down_revision: Union[str, Sequence[str], None] = 'f7b4d2e9a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Antes la creaba el orquestador de seeds con el mismo DDL: en bases ya
+    # sembradas existe y se conservan sus hashes
+    if sa.inspect(op.get_bind()).has_table('seed_estado'):
+        return
+    op.create_table('seed_estado',
+    sa.Column('paso', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('hash', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('filas', sa.Integer(), nullable=True),
+    sa.Column('duracion_ms', sa.Integer(), nullable=True),
+    sa.Column('ejecutado_en', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('paso')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('seed_estado')
@@ -0,0 +1,73 @@
+"""add ciudadano_resumen_casos
+
+Revision ID: bbffd22bc3ea
+Revises: 82645a930a78
+Create Date: 2026-10-18 22:05:41.530716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel  # Always import sqlmodel for SQLModel types
+import geoalchemy2  # Required for Geometry types
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bbffd22bc3ea'
+down_revision: Union[str, Sequence[str], None] = '82645a930a78'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ciudadano_resumen_casos',
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('codigo_ciudadano', sa.BigInteger(), nullable=False),
+    sa.Column('total_casos', sa.Integer(), nullable=False),
+    sa.Column('confirmados', sa.Integer(), nullable=False),
+    sa.Column('sospechosos', sa.Integer(), nullable=False),
+    sa.Column('probables', sa.Integer(), nullable=False),
+    sa.Column('descartados', sa.Integer(), nullable=False),
+    sa.Column('primer_caso', sa.Date(), nullable=True),
+    sa.Column('ultimo_caso', sa.Date(), nullable=True),
+    sa.Column('ultimo_caso_id_enfermedad', sa.Integer(), nullable=True),
+    sa.Column('ultimo_caso_clasificacion', postgresql.ENUM(name='tipoclasificacion', create_type=False), nullable=True),
+    sa.ForeignKeyConstraint(['codigo_ciudadano'], ['ciudadano.codigo_ciudadano'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('codigo_ciudadano', name='uq_ciudadano_resumen_codigo')
+    )
+    op.create_index('idx_ciudadano_resumen_ultimo_caso', 'ciudadano_resumen_casos', ['ultimo_caso', 'codigo_ciudadano'], unique=False)
+
+    # Backfill con los casos existentes (mismas columnas que refrescar_resumen_ciudadanos)
+    op.execute("""
+        INSERT INTO ciudadano_resumen_casos (
+            codigo_ciudadano, total_casos, confirmados, sospechosos, probables,
+            descartados, primer_caso, ultimo_caso, ultimo_caso_id_enfermedad,
+            ultimo_caso_clasificacion
+        )
+        SELECT
+            codigo_ciudadano,
+            count(*),
+            count(*) FILTER (WHERE clasificacion_estrategia = 'CONFIRMADOS'),
+            count(*) FILTER (WHERE clasificacion_estrategia = 'SOSPECHOSOS'),
+            count(*) FILTER (WHERE clasificacion_estrategia = 'PROBABLES'),
+            count(*) FILTER (WHERE clasificacion_estrategia = 'DESCARTADOS'),
+            min(fecha_minima_caso),
+            max(fecha_minima_caso),
+            (array_agg(id_enfermedad ORDER BY fecha_minima_caso DESC NULLS LAST, id DESC))[1],
+            (array_agg(clasificacion_estrategia ORDER BY fecha_minima_caso DESC NULLS LAST, id DESC))[1]
+        FROM caso_epidemiologico
+        WHERE codigo_ciudadano IS NOT NULL
+        GROUP BY codigo_ciudadano
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_ciudadano_resumen_ultimo_caso', table_name='ciudadano_resumen_casos')
+    op.drop_table('ciudadano_resumen_casos')
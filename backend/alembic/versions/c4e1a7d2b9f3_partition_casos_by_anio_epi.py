@@ -0,0 +1,295 @@
+"""partition caso_epidemiologico and child tables by anio epi
+
+Revision ID: c4e1a7d2b9f3
+Revises: bbffd22bc3ea
+Create Date: 2026-10-18 23:10:12.481305
+
+Reconstruye caso_epidemiologico y sus hijas de mayor volumen (síntomas,
+muestras, diagnósticos y agentes) como tablas particionadas por RANGE sobre
+el año epidemiológico del caso, una partición por año.
+
+- PK (id, año) y UNIQUE con el año: Postgres exige la clave de partición.
+- Las hijas llevan anio_epi_caso y una FK compuesta ON UPDATE CASCADE.
+- estudio_caso_epidemiologico (no particionada) guarda el año de su muestra.
+- Las demás tablas que referencian caso_epidemiologico(id) pierden la FK
+  en la base (no puede apuntar a una PK compuesta).
+- crear_particiones_anio_epi(año) crea las particiones de un año en todas
+  las tablas; la usan la ingesta y la tarea periódica de mantenimiento.
+- Índices BRIN sobre las fechas (los datos entran en orden de temporada).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel  # Always import sqlmodel for SQLModel types
+import geoalchemy2  # Required for Geometry types
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1a7d2b9f3'
+down_revision: Union[str, Sequence[str], None] = 'bbffd22bc3ea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CASO = 'caso_epidemiologico'
+CLAVE_CASO = 'fecha_minima_caso_anio_epi'
+CLAVE_HIJAS = 'anio_epi_caso'
+
+# tabla hija -> (nombre de la FK compuesta al caso, FKs propias a recrear)
+HIJAS = {
+    'detalle_caso_sintomas': (
+        'fk_detalle_caso_sintomas_caso',
+        [(['id_sintoma'], 'sintoma', ['id'])],
+    ),
+    'muestra_caso_epidemiologico': (
+        'fk_muestra_caso_epidemiologico_caso',
+        [(['id_establecimiento'], 'establecimiento', ['id']),
+         (['id_muestra'], 'muestra', ['id'])],
+    ),
+    'diagnostico_caso_epidemiologico': (
+        'fk_diagnostico_caso_epidemiologico_caso',
+        [(['id_establecimiento_diagnostico'], 'establecimiento', ['id'])],
+    ),
+    'caso_agente': (
+        'fk_caso_agente_caso',
+        [(['id_agente'], 'agente_etiologico', ['id']),
+         (['id_config_usada'], 'agente_extraccion_config', ['id'])],
+    ),
+}
+
+FKS_CASO = [
+    (['codigo_ciudadano'], 'ciudadano', ['codigo_ciudadano']),
+    (['id_animal'], 'animal', ['id']),
+    (['id_domicilio'], 'domicilio', ['id']),
+    (['id_enfermedad'], 'enfermedad', ['id']),
+    (['id_establecimiento_carga'], 'establecimiento', ['id']),
+    (['id_establecimiento_consulta'], 'establecimiento', ['id']),
+    (['id_establecimiento_notificacion'], 'establecimiento', ['id']),
+    (['id_estrategia_aplicada'], 'estrategia_clasificacion', ['id']),
+]
+
+# Tablas que referencian solo caso_epidemiologico(id): quedan sin FK
+REFERENCIAS_SOLO_ID = [
+    'ambitos_concurrencia_caso',
+    'antecedentes_caso_epidemiologico',
+    'caso_grupo_enfermedad',
+    'ciudadano_datos',
+    'contactos_notificacion',
+    'event_classification_audit',
+    'internacion_caso_epidemiologico',
+    'investigacion_caso_epidemiologico',
+    'tratamiento_caso_epidemiologico',
+    'vacunas_ciudadano',
+]
+
+CREAR_PARTICIONES_SQL = """
+CREATE OR REPLACE FUNCTION crear_particiones_anio_epi(p_anio integer)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_tabla text;
+    v_particion text;
+    v_creadas integer := 0;
+BEGIN
+    -- Serializa ingestas concurrentes que necesiten el mismo año
+    PERFORM pg_advisory_xact_lock(hashtext('crear_particiones_anio_epi'));
+    FOREACH v_tabla IN ARRAY ARRAY[
+        'caso_epidemiologico',
+        'detalle_caso_sintomas',
+        'muestra_caso_epidemiologico',
+        'diagnostico_caso_epidemiologico',
+        'caso_agente'
+    ] LOOP
+        v_particion := v_tabla || '_' || p_anio;
+        IF to_regclass(v_particion) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%s) TO (%s)',
+                v_particion, v_tabla, p_anio, p_anio + 1
+            );
+            v_creadas := v_creadas + 1;
+        END IF;
+    END LOOP;
+    RETURN v_creadas;
+END;
+$$;
+"""
+
+
+def _detach_secuencia(tabla: str) -> None:
+    """La secuencia del id sobrevive al DROP de la tabla vieja."""
+    op.execute(f'ALTER SEQUENCE {tabla}_id_seq OWNED BY NONE')
+
+
+def _attach_secuencia(tabla: str) -> None:
+    op.execute(f"ALTER TABLE {tabla} ALTER COLUMN id SET DEFAULT nextval('{tabla}_id_seq')")
+    op.execute(f'ALTER SEQUENCE {tabla}_id_seq OWNED BY {tabla}.id')
+
+
+def _crear_fks(tabla: str, fks: list) -> None:
+    for columnas, destino, columnas_destino in fks:
+        op.create_foreign_key(
+            f'{tabla}_{columnas[0]}_fkey', tabla, destino, columnas, columnas_destino
+        )
+
+
+def _indices_caso(using_fecha: str) -> None:
+    op.create_index('idx_caso_fecha_minima', CASO, ['fecha_minima_caso'], unique=False, postgresql_using=using_fecha)
+    op.create_index('idx_caso_domicilio_fecha', CASO, ['id_domicilio', 'fecha_minima_caso'], unique=False)
+    op.create_index('idx_caso_enfermedad_fecha', CASO, ['id_enfermedad', 'fecha_minima_caso'], unique=False)
+    op.create_index(op.f('ix_caso_epidemiologico_fecha_minima_caso_semana_epi'), CASO, ['fecha_minima_caso_semana_epi'], unique=False)
+    op.create_index(op.f('ix_caso_epidemiologico_id_domicilio'), CASO, ['id_domicilio'], unique=False)
+    op.create_index('idx_caso_id_snvs_prefijo', CASO, [sa.text('(id_snvs::text) text_pattern_ops')], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for tabla in REFERENCIAS_SOLO_ID:
+        op.execute(f'ALTER TABLE {tabla} DROP CONSTRAINT IF EXISTS {tabla}_id_caso_fkey')
+    op.execute('ALTER TABLE estudio_caso_epidemiologico DROP CONSTRAINT IF EXISTS estudio_caso_epidemiologico_id_muestra_fkey')
+
+    # 1. Tablas nuevas particionadas (mismas columnas) y renombre de las viejas
+    op.execute(f'ALTER TABLE {CASO} RENAME TO {CASO}_anterior')
+    op.execute(
+        f'CREATE TABLE {CASO} (LIKE {CASO}_anterior INCLUDING DEFAULTS) '
+        f'PARTITION BY RANGE ({CLAVE_CASO})'
+    )
+    for tabla in HIJAS:
+        op.execute(f'ALTER TABLE {tabla} RENAME TO {tabla}_anterior')
+        op.execute(
+            f'CREATE TABLE {tabla} (LIKE {tabla}_anterior INCLUDING DEFAULTS, '
+            f'{CLAVE_HIJAS} integer NOT NULL) PARTITION BY RANGE ({CLAVE_HIJAS})'
+        )
+
+    # 2. Particiones para los años con datos y el siguiente
+    op.execute(CREAR_PARTICIONES_SQL)
+    op.execute(f"""
+        SELECT crear_particiones_anio_epi(anio)
+        FROM (
+            SELECT DISTINCT {CLAVE_CASO} AS anio FROM {CASO}_anterior
+            UNION
+            SELECT extract(year FROM now())::int + 1
+        ) anios
+        ORDER BY anio
+    """)
+
+    # 3. Copia de datos. Las hijas toman el año de su caso (se descartan huérfanas)
+    op.execute(f'INSERT INTO {CASO} SELECT * FROM {CASO}_anterior')
+    for tabla in HIJAS:
+        op.execute(f"""
+            INSERT INTO {tabla}
+            SELECT h.*, c.{CLAVE_CASO}
+            FROM {tabla}_anterior h
+            JOIN {CASO} c ON c.id = h.id_caso
+        """)
+
+    # 4. Baja de las tablas viejas (las secuencias pasan a las nuevas)
+    for tabla in HIJAS:
+        _detach_secuencia(tabla)
+        op.execute(f'DROP TABLE {tabla}_anterior')
+    _detach_secuencia(CASO)
+    op.execute(f'DROP TABLE {CASO}_anterior')
+    _attach_secuencia(CASO)
+    for tabla in HIJAS:
+        _attach_secuencia(tabla)
+
+    # 5. Constraints e índices (se propagan a cada partición)
+    op.create_primary_key(f'{CASO}_pkey', CASO, ['id', CLAVE_CASO])
+    op.create_unique_constraint('uq_caso_id_snvs_anio', CASO, ['id_snvs', CLAVE_CASO])
+    op.create_index(op.f('ix_caso_epidemiologico_id_snvs'), CASO, ['id_snvs'], unique=False)
+    _indices_caso('brin')
+    _crear_fks(CASO, FKS_CASO)
+
+    for tabla, (fk_caso, fks) in HIJAS.items():
+        op.create_primary_key(f'{tabla}_pkey', tabla, ['id', CLAVE_HIJAS])
+        op.create_foreign_key(
+            fk_caso, tabla, CASO, ['id_caso', CLAVE_HIJAS], ['id', CLAVE_CASO],
+            onupdate='CASCADE',
+        )
+        _crear_fks(tabla, fks)
+
+    op.create_unique_constraint('uq_caso_sintoma', 'detalle_caso_sintomas', ['id_caso', 'id_sintoma', CLAVE_HIJAS])
+    op.create_index('idx_detalle_sintomas_fecha_inicio', 'detalle_caso_sintomas', ['fecha_inicio_sintoma'], unique=False, postgresql_using='brin')
+
+    op.create_unique_constraint('uq_muestra_caso', 'muestra_caso_epidemiologico', ['id_snvs_muestra', 'id_caso', CLAVE_HIJAS])
+    op.create_index(op.f('ix_muestra_caso_epidemiologico_id_snvs_muestra'), 'muestra_caso_epidemiologico', ['id_snvs_muestra'], unique=False)
+    op.create_index('idx_muestra_caso_fecha_toma', 'muestra_caso_epidemiologico', ['fecha_toma_muestra'], unique=False, postgresql_using='brin')
+
+    op.create_unique_constraint('uq_diagnostico_caso', 'diagnostico_caso_epidemiologico', ['id_caso', CLAVE_HIJAS])
+    op.create_index('idx_diagnostico_caso_fecha_referido', 'diagnostico_caso_epidemiologico', ['fecha_diagnostico_referido'], unique=False, postgresql_using='brin')
+
+    op.create_unique_constraint('uq_caso_agente', 'caso_agente', ['id_caso', 'id_agente', CLAVE_HIJAS])
+    op.create_index('idx_caso_agente_agente', 'caso_agente', ['id_agente'], unique=False)
+    op.create_index('idx_caso_agente_caso', 'caso_agente', ['id_caso'], unique=False)
+    op.create_index('idx_caso_agente_fecha', 'caso_agente', ['fecha_deteccion'], unique=False, postgresql_using='brin')
+    op.create_index('idx_caso_agente_resultado', 'caso_agente', ['resultado'], unique=False)
+    op.create_index(op.f('ix_caso_agente_resultado'), 'caso_agente', ['resultado'], unique=False)
+
+    # 6. Estudios: año de su muestra y FK compuesta
+    op.add_column('estudio_caso_epidemiologico', sa.Column(CLAVE_HIJAS, sa.Integer(), nullable=True))
+    op.execute(f"""
+        UPDATE estudio_caso_epidemiologico e
+        SET {CLAVE_HIJAS} = m.{CLAVE_HIJAS}
+        FROM muestra_caso_epidemiologico m
+        WHERE m.id = e.id_muestra
+    """)
+    op.execute(f'DELETE FROM estudio_caso_epidemiologico WHERE {CLAVE_HIJAS} IS NULL')
+    op.alter_column('estudio_caso_epidemiologico', CLAVE_HIJAS, nullable=False)
+    op.create_foreign_key(
+        'fk_estudio_caso_epidemiologico_muestra', 'estudio_caso_epidemiologico',
+        'muestra_caso_epidemiologico', ['id_muestra', CLAVE_HIJAS], ['id', CLAVE_HIJAS],
+        onupdate='CASCADE',
+    )
+
+    for tabla in (CASO, *HIJAS):
+        op.execute(f'ANALYZE {tabla}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_estudio_caso_epidemiologico_muestra', 'estudio_caso_epidemiologico', type_='foreignkey')
+    op.drop_column('estudio_caso_epidemiologico', CLAVE_HIJAS)
+
+    # Tablas planas con los mismos datos (sin la clave de partición en las hijas)
+    for tabla in (CASO, *HIJAS):
+        op.execute(f'CREATE TABLE {tabla}_plana (LIKE {tabla} INCLUDING DEFAULTS)')
+        op.execute(f'INSERT INTO {tabla}_plana SELECT * FROM {tabla}')
+        _detach_secuencia(tabla)
+    for tabla in (*HIJAS, CASO):
+        op.execute(f'DROP TABLE {tabla} CASCADE')
+        op.execute(f'ALTER TABLE {tabla}_plana RENAME TO {tabla}')
+        _attach_secuencia(tabla)
+    for tabla in HIJAS:
+        op.drop_column(tabla, CLAVE_HIJAS)
+    op.execute('DROP FUNCTION IF EXISTS crear_particiones_anio_epi(integer)')
+
+    op.create_primary_key(f'{CASO}_pkey', CASO, ['id'])
+    op.create_index(op.f('ix_caso_epidemiologico_id_snvs'), CASO, ['id_snvs'], unique=True)
+    op.create_index(op.f('ix_caso_epidemiologico_fecha_minima_caso_anio_epi'), CASO, [CLAVE_CASO], unique=False)
+    _indices_caso('btree')
+    _crear_fks(CASO, FKS_CASO)
+
+    for tabla, (_fk_caso, fks) in HIJAS.items():
+        op.create_primary_key(f'{tabla}_pkey', tabla, ['id'])
+        _crear_fks(tabla, [(['id_caso'], CASO, ['id']), *fks])
+
+    op.create_unique_constraint('uq_caso_sintoma', 'detalle_caso_sintomas', ['id_caso', 'id_sintoma'])
+    op.create_unique_constraint('uq_muestra_caso', 'muestra_caso_epidemiologico', ['id_snvs_muestra', 'id_caso'])
+    op.create_index(op.f('ix_muestra_caso_epidemiologico_id_snvs_muestra'), 'muestra_caso_epidemiologico', ['id_snvs_muestra'], unique=False)
+    op.create_unique_constraint('uq_diagnostico_caso', 'diagnostico_caso_epidemiologico', ['id_caso'])
+    op.create_unique_constraint('uq_caso_agente', 'caso_agente', ['id_caso', 'id_agente'])
+    op.create_index('idx_caso_agente_agente', 'caso_agente', ['id_agente'], unique=False)
+    op.create_index('idx_caso_agente_caso', 'caso_agente', ['id_caso'], unique=False)
+    op.create_index('idx_caso_agente_fecha', 'caso_agente', ['fecha_deteccion'], unique=False)
+    op.create_index('idx_caso_agente_resultado', 'caso_agente', ['resultado'], unique=False)
+    op.create_index(op.f('ix_caso_agente_fecha_deteccion'), 'caso_agente', ['fecha_deteccion'], unique=False)
+    op.create_index(op.f('ix_caso_agente_resultado'), 'caso_agente', ['resultado'], unique=False)
+
+    op.create_foreign_key(
+        'estudio_caso_epidemiologico_id_muestra_fkey', 'estudio_caso_epidemiologico',
+        'muestra_caso_epidemiologico', ['id_muestra'], ['id'],
+    )
+    for tabla in REFERENCIAS_SOLO_ID:
+        op.create_foreign_key(f'{tabla}_id_caso_fkey', tabla, CASO, ['id_caso'], ['id'])
@@ -0,0 +1,59 @@
+"""add poblacion_referencia
+
+Revision ID: d5f2b8c1e4a7
+Revises: c4e1a7d2b9f3
+Create Date: 2026-10-18 23:40:12.184503
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel  # Always import sqlmodel for SQLModel types
+import geoalchemy2  # Required for Geometry types
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f2b8c1e4a7'
+down_revision: Union[str, Sequence[str], None] = 'c4e1a7d2b9f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('poblacion_referencia',
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('id_provincia_indec', sa.Integer(), nullable=False),
+    sa.Column('id_departamento_indec', sa.Integer(), nullable=False),
+    sa.Column('anio', sa.Integer(), nullable=False),
+    sa.Column('sexo', sqlmodel.sql.sqltypes.AutoString(length=1), nullable=False),
+    sa.Column('grupo_etario', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('poblacion', sa.Integer(), nullable=False),
+    sa.Column('fuente', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.ForeignKeyConstraint(['id_provincia_indec'], ['provincia.id_provincia_indec'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id_provincia_indec', 'id_departamento_indec', 'anio', 'sexo', 'grupo_etario', name='uq_poblacion_referencia_clave')
+    )
+    op.create_index(op.f('ix_poblacion_referencia_id_provincia_indec'), 'poblacion_referencia', ['id_provincia_indec'], unique=False)
+
+    # Backfill con los totales del censo 2022 ya cargados en departamento
+    op.execute("""
+        INSERT INTO poblacion_referencia (
+            id_provincia_indec, id_departamento_indec, anio, sexo, grupo_etario,
+            poblacion, fuente
+        )
+        SELECT id_provincia_indec, id_departamento_indec, 2022, 'T', 'total',
+               poblacion, 'censo_2022'
+        FROM departamento
+        WHERE poblacion IS NOT NULL
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_poblacion_referencia_id_provincia_indec'), table_name='poblacion_referencia')
+    op.drop_table('poblacion_referencia')
@@ -0,0 +1,67 @@
+"""add vinculacion ciudadanos
+
+Revision ID: e6a3c9d1f2b8
+Revises: d5f2b8c1e4a7
+Create Date: 2026-10-19 10:12:47.530118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel  # Always import sqlmodel for SQLModel types
+import geoalchemy2  # Required for Geometry types
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a3c9d1f2b8'
+down_revision: Union[str, Sequence[str], None] = 'd5f2b8c1e4a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ciudadano_clave_bloqueo',
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('codigo_ciudadano', sa.BigInteger(), nullable=False),
+    sa.Column('tipo', sqlmodel.sql.sqltypes.AutoString(length=30), nullable=False),
+    sa.Column('clave', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['codigo_ciudadano'], ['ciudadano.codigo_ciudadano'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('codigo_ciudadano', 'tipo', name='uq_ciudadano_clave_bloqueo_tipo')
+    )
+    op.create_index('idx_ciudadano_clave_bloqueo_clave', 'ciudadano_clave_bloqueo', ['tipo', 'clave'], unique=False)
+    op.create_table('ciudadano_candidato_fusion',
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('codigo_ciudadano_a', sa.BigInteger(), nullable=False),
+    sa.Column('codigo_ciudadano_b', sa.BigInteger(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('similitudes', sa.JSON(), nullable=True),
+    sa.Column('bloques', sqlmodel.sql.sqltypes.AutoString(length=200), nullable=True),
+    sa.Column('estado', sa.Enum('PENDIENTE', 'CONFIRMADO', 'DESCARTADO', name='estadocandidatofusion'), nullable=False),
+    sa.Column('id_usuario_revision', sa.Integer(), nullable=True),
+    sa.Column('fecha_revision', sa.DateTime(), nullable=True),
+    sa.CheckConstraint('codigo_ciudadano_a < codigo_ciudadano_b', name='ck_ciudadano_candidato_fusion_orden'),
+    sa.ForeignKeyConstraint(['codigo_ciudadano_a'], ['ciudadano.codigo_ciudadano'], ),
+    sa.ForeignKeyConstraint(['codigo_ciudadano_b'], ['ciudadano.codigo_ciudadano'], ),
+    sa.ForeignKeyConstraint(['id_usuario_revision'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('codigo_ciudadano_a', 'codigo_ciudadano_b', name='uq_ciudadano_candidato_fusion_par')
+    )
+    op.create_index('idx_ciudadano_candidato_fusion_estado', 'ciudadano_candidato_fusion', ['estado', 'score'], unique=False)
+    op.create_index(op.f('ix_ciudadano_candidato_fusion_codigo_ciudadano_b'), 'ciudadano_candidato_fusion', ['codigo_ciudadano_b'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_ciudadano_candidato_fusion_codigo_ciudadano_b'), table_name='ciudadano_candidato_fusion')
+    op.drop_index('idx_ciudadano_candidato_fusion_estado', table_name='ciudadano_candidato_fusion')
+    op.drop_table('ciudadano_candidato_fusion')
+    sa.Enum(name='estadocandidatofusion').drop(op.get_bind(), checkfirst=True)
+    op.drop_index('idx_ciudadano_clave_bloqueo_clave', table_name='ciudadano_clave_bloqueo')
+    op.drop_table('ciudadano_clave_bloqueo')
@@ -0,0 +1,101 @@
+"""add alertas epidemiologicas
+
+Revision ID: f7b4d2e9a1c3
+Revises: e6a3c9d1f2b8
+Create Date: 2026-10-19 18:41:05.214870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel  # Always import sqlmodel for SQLModel types
+import geoalchemy2  # Required for Geometry types
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7b4d2e9a1c3'
+down_revision: Union[str, Sequence[str], None] = 'e6a3c9d1f2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('linea_base_endemica',
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('id_enfermedad', sa.Integer(), nullable=False),
+    sa.Column('id_provincia_indec', sa.Integer(), nullable=False),
+    sa.Column('id_departamento_indec', sa.Integer(), nullable=False),
+    sa.Column('anio_epi', sa.Integer(), nullable=False),
+    sa.Column('semana_epi', sa.Integer(), nullable=False),
+    sa.Column('p25', sa.Float(), nullable=False),
+    sa.Column('p50', sa.Float(), nullable=False),
+    sa.Column('p75', sa.Float(), nullable=False),
+    sa.Column('p90', sa.Float(), nullable=False),
+    sa.Column('anios_base', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['id_enfermedad'], ['enfermedad.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id_enfermedad', 'anio_epi', 'id_provincia_indec', 'id_departamento_indec', 'semana_epi', name='uq_linea_base_endemica_celda')
+    )
+    op.create_table('evaluacion_semanal_alerta',
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('id_enfermedad', sa.Integer(), nullable=False),
+    sa.Column('id_provincia_indec', sa.Integer(), nullable=False),
+    sa.Column('id_departamento_indec', sa.Integer(), nullable=False),
+    sa.Column('inicio_semana', sa.Date(), nullable=False),
+    sa.Column('anio_epi', sa.Integer(), nullable=False),
+    sa.Column('semana_epi', sa.Integer(), nullable=False),
+    sa.Column('casos', sa.Integer(), nullable=False),
+    sa.Column('umbral_zona', sa.Float(), nullable=True),
+    sa.Column('c1', sa.Float(), nullable=True),
+    sa.Column('c2', sa.Float(), nullable=True),
+    sa.Column('c3', sa.Float(), nullable=True),
+    sa.Column('cusum', sa.Float(), nullable=False),
+    sa.Column('senales', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['id_enfermedad'], ['enfermedad.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id_enfermedad', 'id_provincia_indec', 'id_departamento_indec', 'inicio_semana', name='uq_evaluacion_semanal_alerta_celda')
+    )
+    op.create_index('idx_evaluacion_semanal_alerta_enfermedad_semana', 'evaluacion_semanal_alerta', ['id_enfermedad', 'inicio_semana'], unique=False)
+    op.create_table('alerta_epidemiologica',
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('id_enfermedad', sa.Integer(), nullable=False),
+    sa.Column('id_provincia_indec', sa.Integer(), nullable=False),
+    sa.Column('id_departamento_indec', sa.Integer(), nullable=False),
+    sa.Column('metodo', sa.Enum('ZONA_EPIDEMICA', 'EARS_C1', 'EARS_C2', 'EARS_C3', 'CUSUM', name='metodoalerta'), nullable=False),
+    sa.Column('estado', sa.Enum('ACTIVA', 'CERRADA', name='estadoalerta'), nullable=False),
+    sa.Column('inicio_semana', sa.Date(), nullable=False),
+    sa.Column('anio_epi_inicio', sa.Integer(), nullable=False),
+    sa.Column('semana_epi_inicio', sa.Integer(), nullable=False),
+    sa.Column('ultima_senal', sa.Date(), nullable=False),
+    sa.Column('fin_semana', sa.Date(), nullable=True),
+    sa.Column('semanas_con_senal', sa.Integer(), nullable=False),
+    sa.Column('casos_pico', sa.Integer(), nullable=False),
+    sa.Column('valor_pico', sa.Float(), nullable=False),
+    sa.Column('umbral', sa.Float(), nullable=False),
+    sa.Column('fecha_evaluacion', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['id_enfermedad'], ['enfermedad.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id_enfermedad', 'id_provincia_indec', 'id_departamento_indec', 'metodo', 'inicio_semana', name='uq_alerta_epidemiologica_episodio')
+    )
+    op.create_index('idx_alerta_epidemiologica_activas', 'alerta_epidemiologica', ['id_enfermedad', 'inicio_semana'], unique=False, postgresql_where=sa.text("estado = 'ACTIVA'"))
+    op.create_index('idx_alerta_epidemiologica_inicio', 'alerta_epidemiologica', ['inicio_semana'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_alerta_epidemiologica_inicio', table_name='alerta_epidemiologica')
+    op.drop_index('idx_alerta_epidemiologica_activas', table_name='alerta_epidemiologica', postgresql_where=sa.text("estado = 'ACTIVA'"))
+    op.drop_table('alerta_epidemiologica')
+    sa.Enum(name='estadoalerta').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='metodoalerta').drop(op.get_bind(), checkfirst=True)
+    op.drop_index('idx_evaluacion_semanal_alerta_enfermedad_semana', table_name='evaluacion_semanal_alerta')
+    op.drop_table('evaluacion_semanal_alerta')
+    op.drop_table('linea_base_endemica')
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import col
 
 from app.core.database import get_async_session
+from app.core.response_cache import cache_respuesta
 from app.core.schemas.response import PaginatedResponse, PaginationMeta
 from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
@@ -52,6 +53,7 @@ class AgentesCategoriasResponse(BaseModel):
     grupos: list[str] = Field(..., description="Lista de grupos únicos")
 
 
+@cache_respuesta("agente_etiologico", "caso_agente")
 async def list_agentes(
     page: int = Query(1, ge=1, description="Número de página"),
     per_page: int = Query(50, ge=1, le=200, description="Elementos por página"),
@@ -245,6 +247,7 @@ async def list_agentes(
         ) from e
 
 
+@cache_respuesta("agente_etiologico")
 async def get_agentes_categorias(
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(RequireAnyRole()),
@@ -10,6 +10,7 @@ from pydantic import BaseModel, Field
 from sqlmodel import Session, col, select
 
 from app.core.database import get_session
+from app.core.response_cache import cache_respuesta
 from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
 from app.domains.catalogos.agentes.agrupacion import (
@@ -75,6 +76,7 @@ class AgrupacionesListResponse(BaseModel):
 
 
 @router.get("/", response_model=AgrupacionesListResponse)
+@cache_respuesta("agrupacion_agentes", "agrupacion_agente_link")
 def list_agrupaciones(
     categoria: str | None = None,
     session: Session = Depends(get_session),
@@ -125,6 +127,7 @@ def list_agrupaciones(
 
 
 @router.get("/{slug}", response_model=AgrupacionDetailResponse)
+@cache_respuesta("agrupacion_agentes", "agrupacion_agente_link", "agente_etiologico")
 def get_agrupacion(
     slug: str,
     session: Session = Depends(get_session),
@@ -180,6 +183,7 @@ def get_agrupacion(
 
 
 @router.get("/{slug}/agente-ids")
+@cache_respuesta("agrupacion_agentes", "agrupacion_agente_link")
 def get_agrupacion_agente_ids(
     slug: str,
     session: Session = Depends(get_session),
@@ -14,7 +14,7 @@ from app.api.v1.analytics.schemas import (
     CalculateChangesResponse,
     CasoEpidemiologicoCambioConCategoria,
 )
-from app.core.database import get_async_session
+from app.core.database import get_async_read_session
 from app.core.schemas.response import SuccessResponse
 from app.core.security import RequireAuthOrSignedUrl
 from app.domains.autenticacion.models import User
@@ -24,7 +24,7 @@ logger = logging.getLogger(__name__)
 
 async def calculate_changes(
     request: CalculateChangesRequest,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_read_session),
     current_user: User | None = RequireAuthOrSignedUrl,
 ) -> SuccessResponse[CalculateChangesResponse]:
     """
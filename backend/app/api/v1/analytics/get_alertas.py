@@ -0,0 +1,130 @@
+"""
+Alertas epidemiológicas detectadas por la evaluación incremental.
+
+Las alertas las genera ``app.domains.alertas`` después de cada ingesta
+(corredor endémico, EARS C1/C2/C3 y CUSUM por enfermedad y área). Acá solo se
+listan: sin ``estado`` se devuelven todas; ``estado=ACTIVA`` usa el índice
+parcial de alertas activas.
+"""
+
+from datetime import date
+
+from fastapi import Depends, HTTPException, Query, status
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col
+
+from app.api.v1.analytics.schemas import (
+    AlertaEpidemiologicaItem,
+    AlertasEpidemiologicasResponse,
+)
+from app.core.database import get_async_session
+from app.core.pagination import (
+    InvalidCursorError,
+    KeysetColumn,
+    decode_cursor,
+    keyset_condition,
+    split_page,
+)
+from app.core.schemas.response import SuccessResponse
+from app.core.security import RequireAnyRole
+from app.domains.alertas.models import (
+    AlertaEpidemiologica,
+    EstadoAlerta,
+    MetodoAlerta,
+)
+from app.domains.autenticacion.models import User
+from app.domains.territorio.geografia_models import Departamento
+from app.domains.vigilancia_nominal.models.enfermedad import Enfermedad
+
+_CAMPOS = tuple(
+    campo
+    for campo in AlertaEpidemiologicaItem.model_fields
+    if campo not in ("enfermedad", "departamento")
+)
+
+
+async def get_alertas(
+    estado: EstadoAlerta | None = Query(
+        None, description="Estado de la alerta (omitido = todas)"
+    ),
+    id_enfermedad: int | None = Query(None, description="Filtrar por enfermedad"),
+    metodo: MetodoAlerta | None = Query(None, description="Método de detección"),
+    id_provincia_indec: int | None = Query(None, description="Provincia (INDEC)"),
+    id_departamento_indec: int | None = Query(
+        None, description="Departamento (INDEC); 0 = total provincial"
+    ),
+    desde: date | None = Query(None, description="Alertas iniciadas desde"),
+    page_size: int = Query(50, ge=1, le=200, description="Tamaño de página"),
+    cursor: str | None = Query(
+        None, description="Cursor de la página anterior (next_cursor)"
+    ),
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(RequireAnyRole()),
+) -> SuccessResponse[AlertasEpidemiologicasResponse]:
+    """
+    Lista las alertas epidemiológicas, de la más reciente a la más antigua.
+
+    Paginación por keyset sobre (inicio_semana, id).
+    """
+    alerta = AlertaEpidemiologica
+
+    orden: list[KeysetColumn] = [
+        (col(alerta.inicio_semana), True),
+        (col(alerta.id), True),
+    ]
+    query = (
+        select(
+            *(col(getattr(alerta, campo)) for campo in _CAMPOS),
+            col(Enfermedad.nombre).label("enfermedad"),
+            col(Departamento.nombre).label("departamento"),
+        )
+        .join(Enfermedad, col(Enfermedad.id) == col(alerta.id_enfermedad))
+        .outerjoin(
+            Departamento,
+            and_(
+                col(Departamento.id_provincia_indec) == col(alerta.id_provincia_indec),
+                col(Departamento.id_departamento_indec)
+                == col(alerta.id_departamento_indec),
+            ),
+        )
+        .order_by(col(alerta.inicio_semana).desc(), col(alerta.id).desc())
+        .limit(page_size + 1)
+    )
+    if estado is not None:
+        query = query.where(col(alerta.estado) == estado)
+    if id_enfermedad is not None:
+        query = query.where(col(alerta.id_enfermedad) == id_enfermedad)
+    if metodo is not None:
+        query = query.where(col(alerta.metodo) == metodo)
+    if id_provincia_indec is not None:
+        query = query.where(col(alerta.id_provincia_indec) == id_provincia_indec)
+    if id_departamento_indec is not None:
+        query = query.where(col(alerta.id_departamento_indec) == id_departamento_indec)
+    if desde is not None:
+        query = query.where(col(alerta.inicio_semana) >= desde)
+    if cursor:
+        try:
+            valores_cursor = decode_cursor(cursor, len(orden))
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            ) from e
+        query = query.where(keyset_condition(orden, valores_cursor))
+
+    rows, next_cursor = split_page((await db.execute(query)).all(), page_size, orden)
+
+    return SuccessResponse(
+        data=AlertasEpidemiologicasResponse(
+            data=[
+                AlertaEpidemiologicaItem(
+                    **{campo: getattr(row, campo) for campo in _CAMPOS},
+                    enfermedad=row.enfermedad,
+                    departamento=row.departamento,
+                )
+                for row in rows
+            ],
+            has_next=next_cursor is not None,
+            next_cursor=next_cursor,
+        )
+    )
@@ -2,7 +2,9 @@
 Get analytics endpoint - comparación de métricas epidemiológicas entre períodos
 """
 
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable
 from datetime import date
 from typing import Any
 
@@ -25,10 +27,11 @@ from app.api.v1.analytics.schemas import (
     PerformanceMetrics,
     PeriodType,
 )
-from app.core.database import get_async_session
+from app.core.database import SesionLectura, get_async_read_session
 from app.core.schemas.response import SuccessResponse
 from app.core.security import RequireAuthOrSignedUrl
 from app.domains.autenticacion.models import User
+from app.domains.territorio.services.poblacion_service import obtener_poblacion
 
 logger = logging.getLogger(__name__)
 
@@ -68,25 +71,45 @@ def calculate_metric_value(
     )
 
 
-async def query_casos_metrics(
-    db: AsyncSession,
+# Joins comunes: el departamento se resuelve por el establecimiento notificador
+FROM_CASOS_SQL = """
+    FROM caso_epidemiologico e
+    LEFT JOIN establecimiento est ON e.id_establecimiento_notificacion = est.id
+    LEFT JOIN localidad l ON est.id_localidad_indec = l.id_localidad_indec
+    LEFT JOIN departamento d ON l.id_departamento_indec = d.id_departamento_indec
+"""
+
+EN_PERIODO_ACTUAL_SQL = "e.fecha_minima_caso BETWEEN :fecha_desde AND :fecha_hasta"
+EN_PERIODO_COMP_SQL = (
+    "e.fecha_minima_caso BETWEEN :fecha_desde_comp AND :fecha_hasta_comp"
+)
+
+
+def build_periodos_filter(
     fecha_desde: date,
     fecha_hasta: date,
+    fecha_desde_comp: date,
+    fecha_hasta_comp: date,
     grupo_id: int | None,
     tipo_eno_ids: list[int] | None,
     clasificaciones: list[str] | None,
     provincia_id: int | None,
-) -> dict[str, Any]:
+) -> tuple[str, dict[str, Any]]:
     """
-    Consulta métricas de casos para un período específico.
+    Construye el WHERE compartido por todas las familias de métricas.
+
+    Selecciona los casos de ambos períodos a la vez; cada agregado separa
+    después el período con ``FILTER (WHERE ...)``, así la comparación sale de
+    una sola lectura de la tabla.
     """
-    params: dict[str, Any] = {"fecha_desde": fecha_desde, "fecha_hasta": fecha_hasta}
+    params: dict[str, Any] = {
+        "fecha_desde": fecha_desde,
+        "fecha_hasta": fecha_hasta,
+        "fecha_desde_comp": fecha_desde_comp,
+        "fecha_hasta_comp": fecha_hasta_comp,
+    }
 
-    # Base query
-    where_clauses = [
-        "e.fecha_minima_caso >= :fecha_desde",
-        "e.fecha_minima_caso <= :fecha_hasta",
-    ]
+    where_clauses = [f"(({EN_PERIODO_ACTUAL_SQL}) OR ({EN_PERIODO_COMP_SQL}))"]
 
     if provincia_id:
         where_clauses.append("d.id_provincia_indec = :provincia_id")
@@ -95,7 +118,7 @@ async def query_casos_metrics(
     if grupo_id:
         where_clauses.append("""
             e.id_enfermedad IN (
-                SELECT id_enfermedad FROM tipo_eno_grupo_eno WHERE id_grupo = :grupo_id
+                SELECT id_enfermedad FROM enfermedad_grupo WHERE id_grupo = :grupo_id
             )
         """)
         params["grupo_id"] = grupo_id
@@ -105,297 +128,212 @@ async def query_casos_metrics(
         params["tipo_eno_ids"] = tipo_eno_ids
 
     if clasificaciones:
-        where_clauses.append("e.clasificacion_estrategia = ANY(:clasificaciones)")
+        where_clauses.append("e.clasificacion_estrategia::text = ANY(:clasificaciones)")
         params["clasificaciones"] = clasificaciones
 
-    where_sql = " AND ".join(where_clauses)
+    return " AND ".join(where_clauses), params
 
-    # Query total de casos
-    query_total = f"""
-    SELECT COUNT(DISTINCT e.id) as total_casos
-    FROM evento e
-    LEFT JOIN establecimiento est ON e.id_establecimiento_notificacion = est.id
-    LEFT JOIN localidad l ON est.id_localidad_indec = l.id_localidad_indec
-    LEFT JOIN departamento d ON l.id_departamento_indec = d.id_departamento_indec
-    WHERE {where_sql}
-    """
-
-    result = await db.execute(text(query_total), params)
-    total_casos = result.scalar() or 0
-
-    # Query población
-    if provincia_id:
-        query_pob = "SELECT COALESCE(SUM(poblacion), 0) FROM departamento WHERE id_provincia_indec = :provincia_id"
-        result_pob = await db.execute(text(query_pob), {"provincia_id": provincia_id})
-    else:
-        query_pob = "SELECT COALESCE(SUM(poblacion), 0) FROM departamento"
-        result_pob = await db.execute(text(query_pob), {})
 
-    poblacion = result_pob.scalar() or 0
-    incidencia_100k = (
-        round((total_casos / poblacion) * 100000, 2) if poblacion > 0 else 0
-    )
+async def query_casos_metrics(
+    db: AsyncSession,
+    where_sql: str,
+    params: dict[str, Any],
+    provincia_id: int | None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Consulta métricas de casos de ambos períodos en una sola query.
 
-    # Query casos por semana
+    Agrupa por semana epidemiológica contando cada período por separado:
+    un caso pertenece a una sola semana, así que el total es la suma de las
+    semanas y no hace falta una query aparte.
+    """
     query_semanal = f"""
     SELECT
         EXTRACT(ISOYEAR FROM e.fecha_minima_caso)::int as anio_epi,
         EXTRACT(WEEK FROM e.fecha_minima_caso)::int as semana_epi,
-        COUNT(DISTINCT e.id) as casos
-    FROM evento e
-    LEFT JOIN establecimiento est ON e.id_establecimiento_notificacion = est.id
-    LEFT JOIN localidad l ON est.id_localidad_indec = l.id_localidad_indec
-    LEFT JOIN departamento d ON l.id_departamento_indec = d.id_departamento_indec
+        COUNT(DISTINCT e.id) FILTER (WHERE {EN_PERIODO_ACTUAL_SQL}) as casos_actual,
+        COUNT(DISTINCT e.id) FILTER (WHERE {EN_PERIODO_COMP_SQL}) as casos_comp
+    {FROM_CASOS_SQL}
     WHERE {where_sql}
     GROUP BY anio_epi, semana_epi
     ORDER BY anio_epi, semana_epi
     """
 
     result_semanal = await db.execute(text(query_semanal), params)
-    casos_por_semana = []
-    total_semanas = 0
-
-    for row in result_semanal:
-        casos_por_semana.append(
-            {"anio_epi": row.anio_epi, "semana_epi": row.semana_epi, "casos": row.casos}
+    filas = result_semanal.all()
+    tabla_poblacion = await obtener_poblacion(db)
+
+    def metricas_periodo(columna: str, fecha_hasta: date) -> dict[str, Any]:
+        casos_por_semana = [
+            {
+                "anio_epi": row.anio_epi,
+                "semana_epi": row.semana_epi,
+                "casos": getattr(row, columna),
+            }
+            for row in filas
+            if getattr(row, columna) > 0
+        ]
+        total_casos = sum(semana["casos"] for semana in casos_por_semana)
+        total_semanas = len(casos_por_semana)
+        poblacion = tabla_poblacion.poblacion(
+            anio=fecha_hasta.year, id_provincia_indec=provincia_id
         )
-        total_semanas += 1
 
-    promedio_semanal = round(total_casos / total_semanas, 2) if total_semanas > 0 else 0
+        return {
+            "total_casos": total_casos,
+            "incidencia_100k": (
+                round((total_casos / poblacion) * 100000, 2) if poblacion > 0 else 0
+            ),
+            "promedio_semanal": (
+                round(total_casos / total_semanas, 2) if total_semanas > 0 else 0
+            ),
+            "casos_por_semana": casos_por_semana,
+        }
 
     return {
-        "total_casos": total_casos,
-        "incidencia_100k": incidencia_100k,
-        "promedio_semanal": promedio_semanal,
-        "casos_por_semana": casos_por_semana,
+        "actual": metricas_periodo("casos_actual", params["fecha_hasta"]),
+        "comparacion": metricas_periodo("casos_comp", params["fecha_hasta_comp"]),
     }
 
 
 async def query_cobertura_metrics(
     db: AsyncSession,
-    fecha_desde: date,
-    fecha_hasta: date,
-    fecha_desde_comp: date | None,
-    fecha_hasta_comp: date | None,
-    grupo_id: int | None,
-    tipo_eno_ids: list[int] | None,
-    clasificaciones: list[str] | None,
-    provincia_id: int | None,
-) -> dict[str, Any]:
-    """
-    Consulta métricas de cobertura geográfica.
+    where_sql: str,
+    params: dict[str, Any],
+) -> dict[str, dict[str, Any]]:
     """
-    params: dict[str, Any] = {"fecha_desde": fecha_desde, "fecha_hasta": fecha_hasta}
-
-    where_clauses = [
-        "e.fecha_minima_caso >= :fecha_desde",
-        "e.fecha_minima_caso <= :fecha_hasta",
-    ]
+    Consulta métricas de cobertura geográfica de ambos períodos en una sola query.
 
-    if provincia_id:
-        where_clauses.append("d.id_provincia_indec = :provincia_id")
-        params["provincia_id"] = provincia_id
-
-    if grupo_id:
-        where_clauses.append("""
-            e.id_enfermedad IN (
-                SELECT id_enfermedad FROM tipo_eno_grupo_eno WHERE id_grupo = :grupo_id
-            )
-        """)
-        params["grupo_id"] = grupo_id
-
-    if tipo_eno_ids and len(tipo_eno_ids) > 0:
-        where_clauses.append("e.id_enfermedad = ANY(:tipo_eno_ids)")
-        params["tipo_eno_ids"] = tipo_eno_ids
-
-    if clasificaciones:
-        where_clauses.append("e.clasificacion_estrategia = ANY(:clasificaciones)")
-        params["clasificaciones"] = clasificaciones
-
-    where_sql = " AND ".join(where_clauses)
-
-    # Áreas afectadas actual
-    query_areas = f"""
-    SELECT COUNT(DISTINCT d.id_departamento_indec) as areas_afectadas
-    FROM evento e
-    LEFT JOIN establecimiento est ON e.id_establecimiento_notificacion = est.id
-    LEFT JOIN localidad l ON est.id_localidad_indec = l.id_localidad_indec
-    LEFT JOIN departamento d ON l.id_departamento_indec = d.id_departamento_indec
-    WHERE {where_sql} AND d.id_departamento_indec IS NOT NULL
+    Una fila por departamento con casos en alguno de los dos períodos; las
+    áreas afectadas, nuevas y sin casos salen de comparar esos conjuntos.
     """
-
-    result = await db.execute(text(query_areas), params)
-    areas_afectadas = result.scalar() or 0
-
-    # Top departamentos
-    query_top = f"""
+    query_deptos = f"""
     SELECT
         d.id_departamento_indec,
         d.nombre as departamento_nombre,
-        COUNT(DISTINCT e.id) as casos
-    FROM evento e
-    LEFT JOIN establecimiento est ON e.id_establecimiento_notificacion = est.id
-    LEFT JOIN localidad l ON est.id_localidad_indec = l.id_localidad_indec
-    LEFT JOIN departamento d ON l.id_departamento_indec = d.id_departamento_indec
+        COUNT(DISTINCT e.id) FILTER (WHERE {EN_PERIODO_ACTUAL_SQL}) as casos_actual,
+        COUNT(DISTINCT e.id) FILTER (WHERE {EN_PERIODO_COMP_SQL}) as casos_comp
+    {FROM_CASOS_SQL}
     WHERE {where_sql} AND d.id_departamento_indec IS NOT NULL
     GROUP BY d.id_departamento_indec, d.nombre
-    ORDER BY casos DESC
-    LIMIT 10
     """
 
-    result_top = await db.execute(text(query_top), params)
+    result = await db.execute(text(query_deptos), params)
+    filas = result.all()
+
+    deptos_actual = {row.id_departamento_indec for row in filas if row.casos_actual}
+    deptos_comp = {row.id_departamento_indec for row in filas if row.casos_comp}
+
     top_departamentos = [
         {
             "departamento_id": row.id_departamento_indec,
             "departamento_nombre": row.departamento_nombre,
-            "casos": row.casos,
+            "casos": row.casos_actual,
         }
-        for row in result_top
+        for row in sorted(filas, key=lambda r: r.casos_actual, reverse=True)[:10]
+        if row.casos_actual
     ]
 
-    # Nuevas áreas y áreas sin casos (si hay período de comparación)
-    nuevas_areas = 0
-    areas_sin_casos = 0
-
-    if fecha_desde_comp and fecha_hasta_comp:
-        # Departamentos en período actual
-        query_deptos_actual = f"""
-        SELECT DISTINCT d.id_departamento_indec
-        FROM evento e
-        LEFT JOIN establecimiento est ON e.id_establecimiento_notificacion = est.id
-        LEFT JOIN localidad l ON est.id_localidad_indec = l.id_localidad_indec
-        LEFT JOIN departamento d ON l.id_departamento_indec = d.id_departamento_indec
-        WHERE {where_sql} AND d.id_departamento_indec IS NOT NULL
-        """
-
-        result_actual = await db.execute(text(query_deptos_actual), params)
-        deptos_actual = {row[0] for row in result_actual}
-
-        # Departamentos en período anterior
-        params_comp = params.copy()
-        params_comp["fecha_desde"] = fecha_desde_comp
-        params_comp["fecha_hasta"] = fecha_hasta_comp
-
-        where_clauses_comp = [
-            clause.replace(":fecha_desde", ":fecha_desde").replace(
-                ":fecha_hasta", ":fecha_hasta"
-            )
-            for clause in where_clauses
-        ]
-        where_sql_comp = " AND ".join(where_clauses_comp)
-
-        query_deptos_comp = f"""
-        SELECT DISTINCT d.id_departamento_indec
-        FROM evento e
-        LEFT JOIN establecimiento est ON e.id_establecimiento_notificacion = est.id
-        LEFT JOIN localidad l ON est.id_localidad_indec = l.id_localidad_indec
-        LEFT JOIN departamento d ON l.id_departamento_indec = d.id_departamento_indec
-        WHERE {where_sql_comp} AND d.id_departamento_indec IS NOT NULL
-        """
-
-        result_comp = await db.execute(text(query_deptos_comp), params_comp)
-        deptos_comp = {row[0] for row in result_comp}
-
-        nuevas_areas = len(deptos_actual - deptos_comp)
-        areas_sin_casos = len(deptos_comp - deptos_actual)
-
     return {
-        "areas_afectadas": areas_afectadas,
-        "nuevas_areas": nuevas_areas,
-        "areas_sin_casos": areas_sin_casos,
-        "top_departamentos": top_departamentos,
+        "actual": {
+            "areas_afectadas": len(deptos_actual),
+            "nuevas_areas": len(deptos_actual - deptos_comp),
+            "areas_sin_casos": len(deptos_comp - deptos_actual),
+            "top_departamentos": top_departamentos,
+        },
+        "comparacion": {"areas_afectadas": len(deptos_comp)},
     }
 
 
 async def query_performance_metrics(
     db: AsyncSession,
-    fecha_desde: date,
-    fecha_hasta: date,
-    grupo_id: int | None,
-    tipo_eno_ids: list[int] | None,
-    clasificaciones: list[str] | None,
-    provincia_id: int | None,
-) -> dict[str, Any]:
-    """
-    Consulta métricas de performance de clasificación.
+    where_sql: str,
+    params: dict[str, Any],
+) -> dict[str, dict[str, Any]]:
     """
-    params: dict[str, Any] = {"fecha_desde": fecha_desde, "fecha_hasta": fecha_hasta}
-
-    where_clauses = [
-        "e.fecha_minima_caso >= :fecha_desde",
-        "e.fecha_minima_caso <= :fecha_hasta",
-    ]
+    Consulta métricas de performance de clasificación de ambos períodos.
 
-    if provincia_id:
-        where_clauses.append("d.id_provincia_indec = :provincia_id")
-        params["provincia_id"] = provincia_id
-
-    if grupo_id:
-        where_clauses.append("""
-            e.id_enfermedad IN (
-                SELECT id_enfermedad FROM tipo_eno_grupo_eno WHERE id_grupo = :grupo_id
-            )
-        """)
-        params["grupo_id"] = grupo_id
-
-    if tipo_eno_ids and len(tipo_eno_ids) > 0:
-        where_clauses.append("e.id_enfermedad = ANY(:tipo_eno_ids)")
-        params["tipo_eno_ids"] = tipo_eno_ids
-
-    # Para performance, no filtramos por clasificación inicialmente
-    where_sql = " AND ".join(where_clauses)
-
-    # Tasa de confirmación
+    Conteos por clasificación y suma/cantidad de ``confidence_score`` por
+    período en la misma query (el promedio se arma en Python).
+    """
     query_tasas = f"""
     SELECT
-        e.clasificacion_estrategia,
-        COUNT(*) as total
-    FROM evento e
-    LEFT JOIN establecimiento est ON e.id_establecimiento_notificacion = est.id
-    LEFT JOIN localidad l ON est.id_localidad_indec = l.id_localidad_indec
-    LEFT JOIN departamento d ON l.id_departamento_indec = d.id_departamento_indec
+        e.clasificacion_estrategia::text as clasificacion_estrategia,
+        COUNT(*) FILTER (WHERE {EN_PERIODO_ACTUAL_SQL}) as total_actual,
+        COUNT(*) FILTER (WHERE {EN_PERIODO_COMP_SQL}) as total_comp,
+        SUM(e.confidence_score) FILTER (WHERE {EN_PERIODO_ACTUAL_SQL}) as confianza_suma_actual,
+        COUNT(e.confidence_score) FILTER (WHERE {EN_PERIODO_ACTUAL_SQL}) as confianza_n_actual,
+        SUM(e.confidence_score) FILTER (WHERE {EN_PERIODO_COMP_SQL}) as confianza_suma_comp,
+        COUNT(e.confidence_score) FILTER (WHERE {EN_PERIODO_COMP_SQL}) as confianza_n_comp
+    {FROM_CASOS_SQL}
     WHERE {where_sql}
     GROUP BY e.clasificacion_estrategia
     """
 
     result = await db.execute(text(query_tasas), params)
-    casos_por_clasificacion = {}
-    total_casos = 0
+    filas = result.all()
+
+    def metricas_periodo(sufijo: str) -> dict[str, Any]:
+        casos_por_clasificacion = {}
+        total_casos = 0
+        confianza_suma = 0.0
+        confianza_n = 0
+
+        for row in filas:
+            total = getattr(row, f"total_{sufijo}")
+            if row.clasificacion_estrategia:
+                casos_por_clasificacion[row.clasificacion_estrategia] = total
+                total_casos += total
+            confianza_suma += float(getattr(row, f"confianza_suma_{sufijo}") or 0)
+            confianza_n += getattr(row, f"confianza_n_{sufijo}")
+
+        confirmados = casos_por_clasificacion.get("CONFIRMADOS", 0)
+
+        return {
+            "tasa_confirmacion": (
+                round((confirmados / total_casos) * 100, 2) if total_casos > 0 else 0
+            ),
+            "tiempo_promedio_clasificacion": None,  # TODO: Implementar cuando tengamos fecha de clasificación
+            "casos_en_estudio": casos_por_clasificacion.get("EN_ESTUDIO", 0),
+            "confianza_promedio": (
+                round(confianza_suma / confianza_n, 4) if confianza_n else 0
+            ),
+        }
 
-    for row in result:
-        if row.clasificacion_estrategia:
-            casos_por_clasificacion[row.clasificacion_estrategia] = row.total
-            total_casos += row.total
+    return {
+        "actual": metricas_periodo("actual"),
+        "comparacion": metricas_periodo("comp"),
+    }
 
-    confirmados = casos_por_clasificacion.get("CONFIRMADOS", 0)
-    en_estudio = casos_por_clasificacion.get("EN_ESTUDIO", 0)
 
-    tasa_confirmacion = (
-        round((confirmados / total_casos) * 100, 2) if total_casos > 0 else 0
-    )
+# Sesiones de métricas abiertas a la vez en el proceso. Cada request abre una
+# por familia (tres conexiones del pool); el tope deja libre la mayor parte
+# del pool del engine (5 + 10 de overflow por defecto) para el resto de los
+# endpoints aunque lleguen varios requests de analytics juntos: las familias
+# que exceden el tope esperan su turno en vez de pedir otra conexión.
+MAX_SESIONES_METRICAS = 6
+_sesiones_metricas = asyncio.Semaphore(MAX_SESIONES_METRICAS)
 
-    # Confianza promedio (si existe el campo)
-    query_confianza = f"""
-    SELECT AVG(e.confidence_score) as confianza_promedio
-    FROM evento e
-    LEFT JOIN establecimiento est ON e.id_establecimiento_notificacion = est.id
-    LEFT JOIN localidad l ON est.id_localidad_indec = l.id_localidad_indec
-    LEFT JOIN departamento d ON l.id_departamento_indec = d.id_departamento_indec
-    WHERE {where_sql} AND e.confidence_score IS NOT NULL
-    """
 
-    result_conf = await db.execute(text(query_confianza), params)
-    confianza_promedio = result_conf.scalar() or 0
-    confianza_promedio = (
-        round(float(confianza_promedio), 4) if confianza_promedio else 0
-    )
+async def _en_sesion_propia(
+    db: AsyncSession,
+    consulta: Callable[..., Awaitable[dict[str, dict[str, Any]]]],
+    *args: Any,
+) -> dict[str, dict[str, Any]]:
+    """
+    Ejecuta una familia de métricas en su propia sesión (mismo engine).
 
-    return {
-        "tasa_confirmacion": tasa_confirmacion,
-        "tiempo_promedio_clasificacion": None,  # TODO: Implementar cuando tengamos fecha de clasificación
-        "casos_en_estudio": en_estudio,
-        "confianza_promedio": confianza_promedio,
-    }
+    Una AsyncSession no admite queries concurrentes, así que cada familia
+    abre la suya para poder correr en paralelo con ``asyncio.gather``. Cada
+    sesión toma su propia conexión del pool, limitadas por
+    ``MAX_SESIONES_METRICAS``, y como la del request pasa al primario si la
+    réplica se cae.
+    """
+    async with (
+        _sesiones_metricas,
+        AsyncSession(db.bind, sync_session_class=SesionLectura) as session,
+    ):
+        return await consulta(session, *args)
 
 
 async def get_analytics(
@@ -423,7 +361,7 @@ async def get_analytics(
         None, description="Filtrar por clasificaciones estratégicas"
     ),
     provincia_id: int | None = Query(None, description="Código INDEC de provincia"),
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_read_session),
     current_user: User | None = RequireAuthOrSignedUrl,
 ) -> SuccessResponse[AnalyticsResponse]:
     """
@@ -433,6 +371,9 @@ async def get_analytics(
     - Casos confirmados y tendencias
     - Cobertura geográfica
     - Performance de clasificación
+
+    Cada familia de métricas es una sola query que agrega ambos períodos a la
+    vez, por lo que el costo no depende de ``fecha_referencia``.
     """
 
     # Log parámetros recibidos
@@ -486,28 +427,40 @@ async def get_analytics(
     logger.info(f"   - Período actual: {periodo_desde} a {periodo_hasta}")
     logger.info(f"   - Período comparación: {comp_desde} a {comp_hasta}")
 
-    # Consultar métricas para período actual
-    casos_actual = await query_casos_metrics(
-        db,
+    # Un WHERE para ambos períodos; la familia de performance no filtra por
+    # clasificación (las tasas se calculan sobre todas)
+    where_sql, params = build_periodos_filter(
         periodo_desde,
         periodo_hasta,
+        comp_desde,
+        comp_hasta,
         grupo_id,
         tipo_eno_ids,
         clasificaciones,
         provincia_id,
     )
-
-    # Consultar métricas para período de comparación
-    casos_comp = await query_casos_metrics(
-        db,
+    where_sql_perf, params_perf = build_periodos_filter(
+        periodo_desde,
+        periodo_hasta,
         comp_desde,
         comp_hasta,
         grupo_id,
         tipo_eno_ids,
-        clasificaciones,
+        None,
         provincia_id,
     )
 
+    # Las tres familias son independientes: se consultan en paralelo
+    casos, cobertura, performance = await asyncio.gather(
+        _en_sesion_propia(db, query_casos_metrics, where_sql, params, provincia_id),
+        _en_sesion_propia(db, query_cobertura_metrics, where_sql, params),
+        _en_sesion_propia(db, query_performance_metrics, where_sql_perf, params_perf),
+    )
+    casos_actual, casos_comp = casos["actual"], casos["comparacion"]
+    cobertura_actual, cobertura_comp = cobertura["actual"], cobertura["comparacion"]
+    performance_actual = performance["actual"]
+    performance_comp = performance["comparacion"]
+
     # Construir CasosMetrics con comparación
     casos_metrics = CasosMetrics(
         total_casos=calculate_metric_value(
@@ -522,31 +475,6 @@ async def get_analytics(
         casos_por_semana=casos_actual["casos_por_semana"],
     )
 
-    # Cobertura
-    cobertura_actual = await query_cobertura_metrics(
-        db,
-        periodo_desde,
-        periodo_hasta,
-        comp_desde,
-        comp_hasta,
-        grupo_id,
-        tipo_eno_ids,
-        clasificaciones,
-        provincia_id,
-    )
-
-    cobertura_comp = await query_cobertura_metrics(
-        db,
-        comp_desde,
-        comp_hasta,
-        None,
-        None,
-        grupo_id,
-        tipo_eno_ids,
-        clasificaciones,
-        provincia_id,
-    )
-
     cobertura_metrics = CoberturaMetrics(
         areas_afectadas=calculate_metric_value(
             cobertura_actual["areas_afectadas"], cobertura_comp["areas_afectadas"]
@@ -556,27 +484,6 @@ async def get_analytics(
         top_departamentos=cobertura_actual["top_departamentos"],
     )
 
-    # Performance
-    performance_actual = await query_performance_metrics(
-        db,
-        periodo_desde,
-        periodo_hasta,
-        grupo_id,
-        tipo_eno_ids,
-        clasificaciones,
-        provincia_id,
-    )
-
-    performance_comp = await query_performance_metrics(
-        db,
-        comp_desde,
-        comp_hasta,
-        grupo_id,
-        tipo_eno_ids,
-        clasificaciones,
-        provincia_id,
-    )
-
     performance_metrics = PerformanceMetrics(
         tasa_confirmacion=calculate_metric_value(
             performance_actual["tasa_confirmacion"],
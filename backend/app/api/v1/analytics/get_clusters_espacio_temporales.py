@@ -0,0 +1,221 @@
+"""
+Clusters espacio-temporales de casos geocodificados de una enfermedad.
+
+Corre el scan de permutación espacio-temporal
+(``app.domains.analitica.clusters_espacio_temporales``) y lo devuelve como
+lista o como capa GeoJSON para el mapa (centro + radio, igual que los
+clusters de dengue del frontend). Las respuestas se cachean por versión de
+``caso_epidemiologico`` y ``domicilio``: el scan es determinístico (semilla
+fija) y solo cambia con una ingesta o una geocodificación.
+"""
+
+import logging
+from dataclasses import asdict
+from datetime import date
+from typing import Any
+
+from fastapi import Depends, HTTPException, Query, status
+from sqlmodel import Session
+
+from app.api.v1.analytics.schemas import (
+    ClusterEspacioTemporalItem,
+    ClustersEspacioTemporalesResponse,
+)
+from app.core.database import get_read_session
+from app.core.response_cache import cache_respuesta
+from app.core.schemas.response import SuccessResponse
+from app.core.security import RequireAuthOrSignedUrl
+from app.domains.analitica.clusters_espacio_temporales import (
+    ParametrosEscaneo,
+    ResultadoEscaneo,
+    detectar_clusters,
+)
+from app.domains.autenticacion.models import User
+
+logger = logging.getLogger(__name__)
+
+# Una temporada larga; más que esto deja de ser un análisis de brotes
+_MAX_DIAS_ANALISIS = 730
+
+
+def _escanear(
+    session: Session,
+    id_enfermedad: int,
+    fecha_desde: date,
+    fecha_hasta: date,
+    id_provincia_indec: int | None,
+    clasificaciones: list[str] | None,
+    radio_km: float,
+    dias_max: int,
+    dias_periodo: int,
+    replicas: int,
+) -> ResultadoEscaneo:
+    if fecha_hasta < fecha_desde:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="fecha_hasta debe ser posterior a fecha_desde",
+        )
+    if (fecha_hasta - fecha_desde).days > _MAX_DIAS_ANALISIS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"El período analizado no puede superar {_MAX_DIAS_ANALISIS} días",
+        )
+    return detectar_clusters(
+        session,
+        id_enfermedad,
+        fecha_desde,
+        fecha_hasta,
+        ParametrosEscaneo(
+            radio_km=radio_km,
+            dias_max=dias_max,
+            dias_periodo=dias_periodo,
+            replicas=replicas,
+        ),
+        id_provincia_indec=id_provincia_indec,
+        clasificaciones=clasificaciones,
+    )
+
+
+@cache_respuesta("caso_epidemiologico", "domicilio")
+def get_clusters_espacio_temporales(
+    id_enfermedad: int = Query(..., description="ID de la enfermedad (tipo ENO)"),
+    fecha_desde: date = Query(..., description="Inicio del período analizado"),
+    fecha_hasta: date = Query(..., description="Fin del período analizado"),
+    id_provincia_indec: int | None = Query(
+        None, description="Restringir a una provincia"
+    ),
+    clasificaciones: list[str] | None = Query(
+        None, description="Clasificaciones de caso a incluir (todas si se omite)"
+    ),
+    radio_km: float = Query(
+        1.0, gt=0, le=10, description="Radio máximo de los cilindros (km)"
+    ),
+    dias_max: int = Query(
+        28, ge=1, le=180, description="Duración máxima de los cilindros (días)"
+    ),
+    dias_periodo: int = Query(
+        7, ge=1, le=28, description="Agregación temporal de los casos (días)"
+    ),
+    replicas: int = Query(
+        999, ge=0, le=999, description="Réplicas Monte Carlo (0 = sin p-valor)"
+    ),
+    session: Session = Depends(get_read_session),
+    current_user: User | None = RequireAuthOrSignedUrl,
+) -> SuccessResponse[ClustersEspacioTemporalesResponse]:
+    """
+    Detecta clusters espacio-temporales de una enfermedad.
+
+    Devuelve los clusters más probables sin solapamiento espacial, cada uno
+    con su p-valor Monte Carlo.
+    """
+    resultado = _escanear(
+        session,
+        id_enfermedad,
+        fecha_desde,
+        fecha_hasta,
+        id_provincia_indec,
+        clasificaciones,
+        radio_km,
+        dias_max,
+        dias_periodo,
+        replicas,
+    )
+    return SuccessResponse(
+        data=ClustersEspacioTemporalesResponse(
+            clusters=[
+                ClusterEspacioTemporalItem(**asdict(c)) for c in resultado.clusters
+            ],
+            casos=resultado.casos,
+            ubicaciones=resultado.ubicaciones,
+            periodos=resultado.periodos,
+            replicas=resultado.replicas,
+            duracion_segundos=round(resultado.duracion_segundos, 3),
+        )
+    )
+
+
+@cache_respuesta("caso_epidemiologico", "domicilio")
+def get_clusters_espacio_temporales_geojson(
+    id_enfermedad: int = Query(..., description="ID de la enfermedad (tipo ENO)"),
+    fecha_desde: date = Query(..., description="Inicio del período analizado"),
+    fecha_hasta: date = Query(..., description="Fin del período analizado"),
+    id_provincia_indec: int | None = Query(
+        None, description="Restringir a una provincia"
+    ),
+    clasificaciones: list[str] | None = Query(
+        None, description="Clasificaciones de caso a incluir (todas si se omite)"
+    ),
+    radio_km: float = Query(
+        1.0, gt=0, le=10, description="Radio máximo de los cilindros (km)"
+    ),
+    dias_max: int = Query(
+        28, ge=1, le=180, description="Duración máxima de los cilindros (días)"
+    ),
+    dias_periodo: int = Query(
+        7, ge=1, le=28, description="Agregación temporal de los casos (días)"
+    ),
+    replicas: int = Query(
+        999, ge=0, le=999, description="Réplicas Monte Carlo (0 = sin p-valor)"
+    ),
+    p_max: float = Query(
+        0.05,
+        gt=0,
+        le=1,
+        description="Solo clusters con p-valor menor o igual (se ignora con replicas=0)",
+    ),
+    session: Session = Depends(get_read_session),
+    current_user: User | None = RequireAuthOrSignedUrl,
+) -> dict[str, Any]:
+    """
+    Clusters significativos como GeoJSON FeatureCollection (capa de mapa).
+
+    Cada feature es un Point en el centro del cluster con ``radio_m`` en
+    properties para dibujarlo como círculo. Sin réplicas no hay p-valor:
+    se devuelven todos los clusters, sin filtrar por ``p_max``.
+    """
+    resultado = _escanear(
+        session,
+        id_enfermedad,
+        fecha_desde,
+        fecha_hasta,
+        id_provincia_indec,
+        clasificaciones,
+        radio_km,
+        dias_max,
+        dias_periodo,
+        replicas,
+    )
+    features = [
+        {
+            "type": "Feature",
+            "properties": {
+                "id": f"cluster_{orden}",
+                "orden": orden,
+                "radio_m": round(cluster.radio_km * 1000),
+                "fecha_inicio": cluster.fecha_inicio.isoformat(),
+                "fecha_fin": cluster.fecha_fin.isoformat(),
+                "casos": cluster.casos,
+                "casos_esperados": cluster.casos_esperados,
+                "riesgo_relativo": cluster.riesgo_relativo,
+                "llr": cluster.llr,
+                "p_valor": cluster.p_valor,
+                "ubicaciones": cluster.ubicaciones,
+            },
+            "geometry": {
+                "type": "Point",
+                "coordinates": [cluster.longitud, cluster.latitud],
+            },
+        }
+        for orden, cluster in enumerate(resultado.clusters, start=1)
+        if resultado.replicas == 0 or cluster.p_valor <= p_max
+    ]
+
+    return {
+        "type": "FeatureCollection",
+        "features": features,
+        "metadata": {
+            "casos": resultado.casos,
+            "ubicaciones": resultado.ubicaciones,
+            "replicas": resultado.replicas,
+        },
+    }
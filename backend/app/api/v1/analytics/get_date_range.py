@@ -10,7 +10,7 @@ from pydantic import BaseModel
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_async_session
+from app.core.database import get_async_read_session
 from app.core.schemas.response import SuccessResponse
 from app.core.security import RequireAuthOrSignedUrl
 from app.domains.autenticacion.models import User
@@ -28,7 +28,7 @@ class DateRangeResponse(BaseModel):
 
 
 async def get_date_range(
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_read_session),
     current_user: User | None = RequireAuthOrSignedUrl,
 ) -> SuccessResponse[DateRangeResponse]:
     """
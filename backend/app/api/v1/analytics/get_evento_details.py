@@ -19,7 +19,7 @@ from app.api.v1.analytics.schemas import (
     ResumenCasoEpidemiologico,
     TrendSemanal,
 )
-from app.core.database import get_async_session
+from app.core.database import get_async_read_session
 from app.core.schemas.response import SuccessResponse
 from app.core.security import RequireAuthOrSignedUrl
 from app.domains.autenticacion.models import User
@@ -37,7 +37,7 @@ async def get_evento_details(
     num_semanas: int = Query(
         4, description="Número de semanas hacia atrás", ge=1, le=52
     ),
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_read_session),
     current_user: User | None = RequireAuthOrSignedUrl,
 ) -> SuccessResponse[CasoEpidemiologicoDetailsResponse]:
     """
@@ -15,7 +15,7 @@ from app.api.v1.analytics.schemas import (
     PeriodoAnalisis,
     TopChangesByGroupResponse,
 )
-from app.core.database import get_async_session
+from app.core.database import get_async_read_session
 from app.core.schemas.response import SuccessResponse
 from app.core.security import RequireAuthOrSignedUrl
 from app.domains.autenticacion.models import User
@@ -32,7 +32,7 @@ async def get_top_changes_by_group(
         4, description="Número de semanas hacia atrás", ge=1, le=52
     ),
     limit: int = Query(10, description="Top N eventos por grupo", ge=1, le=50),
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_read_session),
     current_user: User | None = RequireAuthOrSignedUrl,
 ) -> SuccessResponse[TopChangesByGroupResponse]:
     """
@@ -21,7 +21,7 @@ from app.api.v1.analytics.schemas import (
     TopWinnerLoser,
     TopWinnersLosersResponse,
 )
-from app.core.database import get_async_session
+from app.core.database import get_async_read_session
 from app.core.schemas.response import SuccessResponse
 from app.core.security import RequireAuthOrSignedUrl
 from app.domains.autenticacion.models import User
@@ -59,7 +59,7 @@ async def get_top_winners_losers(
         description="Código INDEC de provincia (solo para metric_type=departamentos)",
     ),
     limit: int = Query(10, description="Número de winners/losers a retornar"),
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_read_session),
     current_user: User | None = RequireAuthOrSignedUrl,
 ) -> SuccessResponse[TopWinnersLosersResponse]:
     """
@@ -5,18 +5,27 @@ Los datos de vigilancia agregada (CLI_P26, LAB_P26, CLI_P26_INT) se consultan
 directamente via POST /api/v1/metricas/query usando MetricService.
 """
 
+from typing import Any
+
 from fastapi import APIRouter
 
 from app.api.v1.analytics.calculate_changes import calculate_changes
+from app.api.v1.analytics.get_alertas import get_alertas
 from app.api.v1.analytics.get_analytics import get_analytics
+from app.api.v1.analytics.get_clusters_espacio_temporales import (
+    get_clusters_espacio_temporales,
+    get_clusters_espacio_temporales_geojson,
+)
 from app.api.v1.analytics.get_date_range import DateRangeResponse, get_date_range
 from app.api.v1.analytics.get_evento_details import get_evento_details
 from app.api.v1.analytics.get_top_changes_by_group import get_top_changes_by_group
 from app.api.v1.analytics.get_top_winners_losers import get_top_winners_losers
 from app.api.v1.analytics.schemas import (
+    AlertasEpidemiologicasResponse,
     AnalyticsResponse,
     CalculateChangesResponse,
     CasoEpidemiologicoDetailsResponse,
+    ClustersEspacioTemporalesResponse,
     TopChangesByGroupResponse,
     TopWinnersLosersResponse,
 )
@@ -107,3 +116,50 @@ router.add_api_route(
         500: {"model": ErrorResponse, "description": "Error interno del servidor"},
     },
 )
+
+# ============================================================================
+# Clusters espacio-temporales (scan de permutación)
+# ============================================================================
+
+router.add_api_route(
+    "/clusters-espacio-temporales",
+    get_clusters_espacio_temporales,
+    methods=["GET"],
+    response_model=SuccessResponse[ClustersEspacioTemporalesResponse],
+    name="get_clusters_espacio_temporales",
+    summary="Detecta clusters espacio-temporales de casos geocodificados",
+    responses={
+        400: {"model": ErrorResponse, "description": "Parámetros inválidos"},
+        500: {"model": ErrorResponse, "description": "Error interno del servidor"},
+    },
+)
+
+router.add_api_route(
+    "/clusters-espacio-temporales/geojson",
+    get_clusters_espacio_temporales_geojson,
+    methods=["GET"],
+    response_model=dict[str, Any],
+    name="get_clusters_espacio_temporales_geojson",
+    summary="Clusters espacio-temporales significativos como capa GeoJSON",
+    responses={
+        400: {"model": ErrorResponse, "description": "Parámetros inválidos"},
+        500: {"model": ErrorResponse, "description": "Error interno del servidor"},
+    },
+)
+
+# ============================================================================
+# Alertas epidemiológicas (evaluación incremental post-ingesta)
+# ============================================================================
+
+router.add_api_route(
+    "/alertas",
+    get_alertas,
+    methods=["GET"],
+    response_model=SuccessResponse[AlertasEpidemiologicasResponse],
+    name="get_alertas",
+    summary="Lista las alertas epidemiológicas (corredor endémico, EARS, CUSUM)",
+    responses={
+        400: {"model": ErrorResponse, "description": "Cursor inválido"},
+        500: {"model": ErrorResponse, "description": "Error interno del servidor"},
+    },
+)
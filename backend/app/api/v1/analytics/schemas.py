@@ -2,7 +2,7 @@
 Analytics schemas
 """
 
-from datetime import date
+from datetime import date, datetime
 from enum import Enum
 from typing import Any
 
@@ -301,3 +301,71 @@ class CasoEpidemiologicoDetailsResponse(BaseModel):
     trend_semanal: list[TrendSemanal] = Field(
         ..., description="Serie temporal por semana"
     )
+
+
+class ClusterEspacioTemporalItem(BaseModel):
+    """Cluster espacio-temporal detectado (cilindro del scan)"""
+
+    latitud: float = Field(..., description="Latitud del centro")
+    longitud: float = Field(..., description="Longitud del centro")
+    radio_km: float = Field(..., description="Radio del círculo en km")
+    fecha_inicio: date = Field(..., description="Inicio de la ventana temporal")
+    fecha_fin: date = Field(..., description="Fin de la ventana temporal")
+    casos: int = Field(..., description="Casos observados en el cilindro")
+    casos_esperados: float = Field(..., description="Casos esperados sin cluster")
+    riesgo_relativo: float | None = Field(
+        None, description="Riesgo dentro del cilindro respecto de afuera"
+    )
+    llr: float = Field(..., description="Log-likelihood ratio")
+    p_valor: float = Field(..., description="P-valor Monte Carlo")
+    ubicaciones: int = Field(..., description="Ubicaciones con casos en el círculo")
+
+
+class ClustersEspacioTemporalesResponse(BaseModel):
+    """Resultado del scan espacio-temporal de una enfermedad"""
+
+    clusters: list[ClusterEspacioTemporalItem] = Field(
+        ..., description="Clusters sin solapamiento, del más al menos probable"
+    )
+    casos: int = Field(..., description="Casos geocodificados analizados")
+    ubicaciones: int = Field(..., description="Ubicaciones distintas")
+    periodos: int = Field(..., description="Períodos de tiempo analizados")
+    replicas: int = Field(..., description="Réplicas Monte Carlo")
+    duracion_segundos: float = Field(..., description="Duración del scan")
+
+
+class AlertaEpidemiologicaItem(BaseModel):
+    """Episodio de alerta de una serie (enfermedad × área) para un método"""
+
+    id: int = Field(..., description="ID de la alerta")
+    id_enfermedad: int = Field(..., description="ID de la enfermedad")
+    enfermedad: str = Field(..., description="Nombre de la enfermedad")
+    id_provincia_indec: int = Field(..., description="Provincia (INDEC)")
+    id_departamento_indec: int = Field(
+        ..., description="Departamento (INDEC); 0 = toda la provincia"
+    )
+    departamento: str | None = Field(
+        None, description="Nombre del departamento (nulo en el total provincial)"
+    )
+    metodo: str = Field(..., description="Método de detección")
+    estado: str = Field(..., description="ACTIVA o CERRADA")
+    inicio_semana: date = Field(..., description="Primera semana con señal")
+    anio_epi_inicio: int = Field(..., description="Año epidemiológico de inicio")
+    semana_epi_inicio: int = Field(..., description="Semana epidemiológica de inicio")
+    ultima_senal: date = Field(..., description="Última semana con señal")
+    fin_semana: date | None = Field(None, description="Semana de cierre")
+    semanas_con_senal: int = Field(..., description="Semanas con señal")
+    casos_pico: int = Field(..., description="Casos de la semana pico")
+    valor_pico: float = Field(..., description="Mayor valor del estadístico")
+    umbral: float = Field(..., description="Umbral del método en la semana pico")
+    fecha_evaluacion: datetime = Field(..., description="Última evaluación")
+
+
+class AlertasEpidemiologicasResponse(BaseModel):
+    """Página de alertas epidemiológicas"""
+
+    data: list[AlertaEpidemiologicaItem] = Field(..., description="Alertas")
+    has_next: bool = Field(..., description="Si hay página siguiente")
+    next_cursor: str | None = Field(
+        None, description="Cursor para pedir la página siguiente (keyset)"
+    )
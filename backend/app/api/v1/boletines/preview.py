@@ -14,7 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import col
 
 from app.api.v1.analytics.period_utils import get_epi_week_dates
-from app.core.database import get_async_session
+from app.core.database import get_async_read_session
 from app.core.schemas.response import SuccessResponse
 from app.domains.catalogos.agentes.models import (
     AgenteEtiologico,
@@ -258,7 +258,7 @@ async def get_evento_preview(
     semana: int = Query(..., ge=1, le=53, description="Semana epidemiológica"),
     anio: int = Query(..., ge=2020, le=2030, description="Año"),
     num_semanas: int = Query(4, ge=1, le=52, description="Semanas a analizar"),
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_read_session),
 ) -> SuccessResponse[SectionPreviewResponse]:
     """
     Preview genérico de datos para cualquier evento epidemiológico.
@@ -394,7 +394,7 @@ async def get_evento_preview(
 
 
 async def list_available_eventos(
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_read_session),
 ) -> SuccessResponse[list[CasoEpidemiologicoDisponible]]:
     """
     Lista todos los eventos disponibles (Enfermedad y GrupoDeEnfermedades) para selección.
@@ -451,7 +451,7 @@ async def list_available_eventos(
 
 
 async def list_available_agentes(
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_read_session),
 ) -> SuccessResponse[list[AgenteDisponible]]:
     """
     Lista todos los agentes etiológicos disponibles para selección.
@@ -9,7 +9,7 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_async_session
+from app.core.database import get_async_read_session
 from app.domains.charts.schemas import RespuestaSpecGrafico, SolicitudSpecGrafico
 from app.domains.charts.services.spec_generator import ChartSpecGenerator
 
@@ -20,7 +20,7 @@ router = APIRouter()
 @router.post("/spec", response_model=RespuestaSpecGrafico)
 async def generate_chart_spec(
     *,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_read_session),
     request: SolicitudSpecGrafico,
 ) -> RespuestaSpecGrafico:
     """
@@ -12,10 +12,11 @@ from pydantic import BaseModel
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_async_session
+from app.core.database import get_async_read_session
 from app.core.schemas.response import SuccessResponse
 from app.core.security import RequireAuthOrSignedUrl
 from app.domains.autenticacion.models import User
+from app.domains.territorio.services.poblacion_service import obtener_poblacion
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +31,7 @@ class IndicadoresData(BaseModel):
 
 
 async def get_indicadores(
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_read_session),
     current_user: User | None = RequireAuthOrSignedUrl,
     grupo_id: int | None = Query(None),
     tipo_eno_ids: list[int] | None = Query(None),
@@ -112,17 +113,12 @@ async def get_indicadores(
         total_casos = row.total_casos if row else 0
         areas_afectadas = row.areas_afectadas if row else 0
 
-        # Query 2: Población total
-        if provincia_id:
-            query_pob = "SELECT COALESCE(SUM(poblacion), 0) FROM departamento WHERE id_provincia_indec = :provincia_id"
-            result_pob = await db.execute(
-                text(query_pob), {"provincia_id": provincia_id}
-            )
-        else:
-            query_pob = "SELECT COALESCE(SUM(poblacion), 0) FROM departamento"
-            result_pob = await db.execute(text(query_pob), {})
-
-        poblacion = result_pob.scalar() or 0
+        # Población de referencia (en memoria, interpolada al año del período)
+        tabla_poblacion = await obtener_poblacion(db)
+        poblacion = tabla_poblacion.poblacion(
+            anio=params["fecha_hasta"].year if fecha_hasta else None,
+            id_provincia_indec=provincia_id,
+        )
 
         # Calcular tasa de incidencia (por 100,000 habitantes)
         tasa_incidencia = (
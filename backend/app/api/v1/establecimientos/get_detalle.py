@@ -10,7 +10,7 @@ from typing import Any
 
 from fastapi import Depends, Path, Query
 from pydantic import BaseModel, Field
-from sqlalchemy import or_, select
+from sqlalchemy import and_, or_, select
 from sqlmodel import Session, col
 
 from app.core.database import get_session
@@ -237,7 +237,11 @@ async def get_establecimiento_detalle(
         .select_from(MuestraCasoEpidemiologico)
         .join(
             CasoEpidemiologico,
-            col(MuestraCasoEpidemiologico.id_caso) == col(CasoEpidemiologico.id),
+            and_(
+                col(MuestraCasoEpidemiologico.id_caso) == col(CasoEpidemiologico.id),
+                col(MuestraCasoEpidemiologico.anio_epi_caso)
+                == col(CasoEpidemiologico.fecha_minima_caso_anio_epi),
+            ),
         )
         .join(
             Ciudadano,
@@ -287,7 +291,11 @@ async def get_establecimiento_detalle(
         .select_from(DiagnosticoCasoEpidemiologico)
         .join(
             CasoEpidemiologico,
-            col(DiagnosticoCasoEpidemiologico.id_caso) == col(CasoEpidemiologico.id),
+            and_(
+                col(DiagnosticoCasoEpidemiologico.id_caso) == col(CasoEpidemiologico.id),
+                col(DiagnosticoCasoEpidemiologico.anio_epi_caso)
+                == col(CasoEpidemiologico.fecha_minima_caso_anio_epi),
+            ),
         )
         .join(
             Ciudadano,
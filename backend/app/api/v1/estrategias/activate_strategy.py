@@ -4,7 +4,7 @@ Activate strategy endpoint
 
 import logging
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_async_session
@@ -18,11 +18,17 @@ from app.domains.vigilancia_nominal.clasificacion.schemas import (
     EstrategiaClasificacionResponse,
 )
 
+from .reclassify_strategy import encolar_tras_cambio
+
 logger = logging.getLogger(__name__)
 
 
 async def activate_strategy(
     strategy_id: int,
+    response: Response,
+    reclasificar: bool = Query(
+        True, description="Reclasificar los casos almacenados en background"
+    ),
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(RequireSuperadmin()),
 ) -> SuccessResponse[EstrategiaClasificacionResponse]:
@@ -33,6 +39,8 @@ async def activate_strategy(
     - Desactiva automáticamente otras estrategias del mismo evento
     - Valida que la estrategia esté completa
     - Registra cambio en auditoría
+    - Reclasifica los casos almacenados en background (job en el header
+      ``X-Reclasificacion-Job-Id``)
     """
 
     logger.info(f"✅ Activating strategy: {strategy_id}")
@@ -56,6 +64,8 @@ async def activate_strategy(
         )
 
         logger.info(f"✅ Strategy activated: {activated_strategy.name}")
+        if reclasificar:
+            await encolar_tras_cambio(strategy_id, response, current_user)
         return SuccessResponse(data=strategy_response)
 
     except HTTPException:
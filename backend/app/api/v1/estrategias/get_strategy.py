@@ -8,6 +8,7 @@ from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_async_session
+from app.core.response_cache import cache_respuesta
 from app.core.schemas.response import SuccessResponse
 from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
@@ -21,6 +22,7 @@ from app.domains.vigilancia_nominal.clasificacion.schemas import (
 logger = logging.getLogger(__name__)
 
 
+@cache_respuesta("estrategia_clasificacion", "classification_rule", "filter_condition")
 async def get_strategy(
     strategy_id: int,
     db: AsyncSession = Depends(get_async_session),
@@ -9,6 +9,7 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_async_session
+from app.core.response_cache import cache_respuesta
 from app.core.schemas.response import PaginatedResponse, PaginationMeta
 from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
@@ -23,6 +24,7 @@ from app.domains.vigilancia_nominal.clasificacion.schemas import (
 logger = logging.getLogger(__name__)
 
 
+@cache_respuesta("estrategia_clasificacion", "classification_rule", "filter_condition")
 async def list_strategies(
     active_only: bool | None = None,
     tipo_eno_id: int | None = None,
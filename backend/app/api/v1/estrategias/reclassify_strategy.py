@@ -0,0 +1,101 @@
+"""
+Reclassify strategy endpoint
+"""
+
+import logging
+
+from fastapi import Depends, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_session
+from app.core.schemas.response import SuccessResponse
+from app.core.security import RequireSuperadmin
+from app.domains.autenticacion.models import User
+from app.domains.jobs.schemas import AsyncJobResponse
+from app.domains.vigilancia_nominal.clasificacion.reclasificacion import (
+    encolar_reclasificacion,
+)
+from app.domains.vigilancia_nominal.clasificacion.repositories import (
+    EstrategiaClasificacionRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+HEADER_JOB_RECLASIFICACION = "X-Reclasificacion-Job-Id"
+
+
+async def encolar_tras_cambio(
+    strategy_id: int, response: Response, current_user: User
+) -> None:
+    """
+    Lanza la reclasificación después de activar o editar una estrategia.
+
+    Si Celery no está disponible el cambio ya quedó guardado: se loguea y la
+    reclasificación puede relanzarse con ``POST /{strategy_id}/reclasificar``.
+    """
+    try:
+        job = await encolar_reclasificacion(strategy_id, creado_por=current_user.email)
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo encolar la reclasificación: {e!s}")
+        return
+    response.headers[HEADER_JOB_RECLASIFICACION] = job.id
+
+
+async def reclassify_strategy(
+    strategy_id: int,
+    dry_run: bool = Query(
+        False, description="Solo calcular el diff de clasificaciones, sin guardar"
+    ),
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(RequireSuperadmin()),
+) -> JSONResponse:
+    """
+    Reclasificar los casos almacenados con una estrategia.
+
+    **Funcionalidades:**
+    - Evalúa las reglas sobre los casos del evento dentro de la vigencia
+    - Con ``dry_run`` solo calcula las transiciones (actual → nueva)
+    - Corre en background: el resumen queda en el job
+    """
+
+    logger.info(f"🔁 Reclassifying cases for strategy: {strategy_id}")
+
+    try:
+        repo = EstrategiaClasificacionRepository(db)
+
+        strategy = await repo.get_by_id(strategy_id)
+        if not strategy:
+            logger.warning(f"❌ Strategy not found: {strategy_id}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Estrategia {strategy_id} no encontrada",
+            )
+
+        job = await encolar_reclasificacion(
+            strategy_id, dry_run=dry_run, creado_por=current_user.email
+        )
+
+        datos_respuesta = AsyncJobResponse(
+            job_id=job.id,
+            status=job.status,
+            message=(
+                f"Simulación de reclasificación iniciada para {strategy.name}"
+                if dry_run
+                else f"Reclasificación iniciada para {strategy.name}"
+            ),
+            polling_url=f"/api/v1/uploads/jobs/{job.id}/status",
+        )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=SuccessResponse(data=datos_respuesta).model_dump(mode="json"),
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"💥 Error reclassifying strategy {strategy_id}: {e!s}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error iniciando reclasificación: {e!s}",
+        ) from e
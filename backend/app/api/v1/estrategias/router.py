@@ -6,6 +6,7 @@ Estrategias router - Event classification strategies endpoints
 from fastapi import APIRouter, status
 
 from app.core.schemas.response import ErrorResponse, PaginatedResponse, SuccessResponse
+from app.domains.jobs.schemas import AsyncJobResponse
 from app.domains.vigilancia_nominal.clasificacion.schemas import (
     AuditLogResponse,
     EstrategiaClasificacionResponse,
@@ -18,6 +19,7 @@ from .delete_strategy import delete_strategy
 from .get_audit_log import get_strategy_audit_log
 from .get_strategy import get_strategy
 from .list_strategies import list_strategies
+from .reclassify_strategy import reclassify_strategy
 from .test_strategy import test_strategy
 from .update_strategy import update_strategy
 
@@ -108,6 +110,19 @@ router.add_api_route(
     },
 )
 
+# Reclassify strategy endpoint
+router.add_api_route(
+    "/{strategy_id}/reclasificar",
+    reclassify_strategy,
+    methods=["POST"],
+    response_model=SuccessResponse[AsyncJobResponse],
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        404: {"model": ErrorResponse, "description": "Estrategia no encontrada"},
+        500: {"model": ErrorResponse, "description": "Error interno del servidor"},
+    },
+)
+
 # Test strategy endpoint
 router.add_api_route(
     "/{strategy_id}/test",
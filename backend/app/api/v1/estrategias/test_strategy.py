@@ -5,7 +5,6 @@ Test strategy endpoint
 import io
 import logging
 
-import pandas as pd
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -20,9 +19,6 @@ from app.domains.vigilancia_nominal.clasificacion.schemas import (
     StrategyTestRequest,
     StrategyTestResponse,
 )
-from app.domains.vigilancia_nominal.clasificacion.services import (
-    EventClassificationService,
-)
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +40,13 @@ async def test_strategy(
     **Returns:** Resultados de clasificación simulados
     """
 
+    # pandas (servicio de clasificación) se carga solo al probar una estrategia
+    import pandas as pd
+
+    from app.domains.vigilancia_nominal.clasificacion.services import (
+        EventClassificationService,
+    )
+
     logger.info(f"🧪 Testing strategy: {strategy_id}")
 
     try:
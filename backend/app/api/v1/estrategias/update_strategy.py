@@ -4,7 +4,7 @@ Update strategy endpoint
 
 import logging
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_async_session
@@ -19,12 +19,27 @@ from app.domains.vigilancia_nominal.clasificacion.schemas import (
     EstrategiaClasificacionUpdate,
 )
 
+from .reclassify_strategy import encolar_tras_cambio
+
 logger = logging.getLogger(__name__)
 
+# Campos que cambian el resultado de clasificar los casos ya cargados
+CAMPOS_QUE_RECLASIFICAN = {
+    "active",
+    "config",
+    "valid_from",
+    "valid_until",
+    "classification_rules",
+}
+
 
 async def update_strategy(
     strategy_id: int,
     strategy_data: EstrategiaClasificacionUpdate,
+    response: Response,
+    reclasificar: bool = Query(
+        True, description="Reclasificar los casos almacenados en background"
+    ),
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(RequireSuperadmin()),
 ) -> SuccessResponse[EstrategiaClasificacionResponse]:
@@ -35,6 +50,9 @@ async def update_strategy(
     - Actualización parcial (solo campos proporcionados)
     - Validación de reglas modificadas
     - Auditoría automática de cambios
+    - Si la estrategia queda activa y cambian reglas, config o vigencia,
+      reclasifica los casos almacenados en background (job en el header
+      ``X-Reclasificacion-Job-Id``)
 
     **Returns:** Estrategia actualizada
     """
@@ -58,6 +76,9 @@ async def update_strategy(
         strategy_response = EstrategiaClasificacionResponse.model_validate(strategy)
 
         logger.info(f"✅ Strategy updated: {strategy.name}")
+        cambiados = strategy_data.model_dump(exclude_unset=True).keys()
+        if reclasificar and strategy.active and CAMPOS_QUE_RECLASIFICAN & cambiados:
+            await encolar_tras_cambio(strategy_id, response, current_user)
         return SuccessResponse(data=strategy_response)
 
     except HTTPException:
@@ -6,12 +6,11 @@ import io
 import logging
 from datetime import date, datetime
 
-import pandas as pd
 from fastapi import Depends, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_async_session
+from app.core.database import get_async_read_session
 from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
 
@@ -25,7 +24,7 @@ async def export_eventos(
     fecha_hasta: date | None = None,
     clasificacion: str | None = None,
     formato: str = Query("csv", description="Formato de exportación (csv/excel)"),
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_read_session),
     current_user: User = Depends(RequireAnyRole()),
 ) -> StreamingResponse:
     """
@@ -36,6 +35,8 @@ async def export_eventos(
     - Incluye solo datos básicos (no relaciones completas)
     """
 
+    import pandas as pd
+
     logger.info(f"📤 Exportando eventos a {formato} - usuario: {current_user.email}")
 
     try:
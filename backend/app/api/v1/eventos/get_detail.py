@@ -1,5 +1,11 @@
 """
 Get evento detail endpoint
+
+El detalle completo (caso, sujeto, establecimientos y todas sus colecciones)
+se arma en PostgreSQL con subqueries correlacionadas ``json_agg`` /
+``json_build_object`` y vuelve como un único documento JSON, que se valida
+directo contra el schema de respuesta. Abrir un caso es una sola ida y vuelta
+a la BD, sin importar cuántas filas tengan sus colecciones.
 """
 
 import logging
@@ -9,25 +15,63 @@ from typing import Any
 
 from fastapi import Depends, HTTPException, Query, status
 from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    ScalarSelect,
+    Select,
+    String,
+    Text,
+    case,
+    cast,
+    func,
+    literal_column,
+    null,
+    select,
+    true,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased
 from sqlmodel import col
 
 from app.core.database import get_async_session
 from app.core.schemas.response import SuccessResponse
 from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
-from app.domains.territorio.geografia_models import Domicilio
-from app.domains.vigilancia_nominal.clasificacion.models import TipoClasificacion
+from app.domains.territorio.establecimientos_models import Establecimiento
+from app.domains.territorio.geografia_models import Domicilio, Localidad
+from app.domains.vigilancia_nominal.clasificacion.models import (
+    EstrategiaClasificacion,
+    TipoClasificacion,
+)
+from app.domains.vigilancia_nominal.models.ambitos import AmbitosConcurrenciaCaso
+from app.domains.vigilancia_nominal.models.atencion import (
+    ContactosNotificacion,
+    DiagnosticoCasoEpidemiologico,
+    InternacionCasoEpidemiologico,
+    InvestigacionCasoEpidemiologico,
+    TratamientoCasoEpidemiologico,
+)
 from app.domains.vigilancia_nominal.models.caso import (
+    AntecedenteEpidemiologico,
+    AntecedentesCasoEpidemiologico,
     CasoEpidemiologico,
     DetalleCasoSintomas,
 )
-from app.domains.vigilancia_nominal.models.salud import MuestraCasoEpidemiologico
+from app.domains.vigilancia_nominal.models.enfermedad import Enfermedad
+from app.domains.vigilancia_nominal.models.salud import (
+    EstudioCasoEpidemiologico,
+    Muestra,
+    MuestraCasoEpidemiologico,
+    Sintoma,
+    Vacuna,
+    VacunasCiudadano,
+)
 from app.domains.vigilancia_nominal.models.sujetos import (
     Animal,
     Ciudadano,
+    CiudadanoDatos,
 )
 
 
@@ -69,9 +113,7 @@ class SintomaInfo(BaseModel):
 
     id: int = Field(..., description="ID del síntoma")
     nombre: str | None = Field(None, description="Nombre del síntoma")
-    fecha_inicio: date | None = Field(
-        None, description="Fecha de inicio del síntoma"
-    )
+    fecha_inicio: date | None = Field(None, description="Fecha de inicio del síntoma")
     semana_epidemiologica: int | None = Field(
         None, description="Semana epidemiológica de aparición"
     )
@@ -98,9 +140,7 @@ class MuestraInfo(BaseModel):
     establecimiento: str | None = Field(
         None, description="Establecimiento donde se tomó"
     )
-    semana_epidemiologica: int | None = Field(
-        None, description="Semana epidemiológica"
-    )
+    semana_epidemiologica: int | None = Field(None, description="Semana epidemiológica")
     anio_epidemiologico: int | None = Field(None, description="Año epidemiológico")
     valor: str | None = Field(None, description="Valor del resultado general")
     estudios: list[EstudioInfo] = Field(
@@ -114,9 +154,7 @@ class DiagnosticoInfo(BaseModel):
     id: int = Field(..., description="ID del diagnóstico")
     diagnostico: str | None = Field(None, description="Diagnóstico")
     fecha: date | None = Field(None, description="Fecha del diagnóstico")
-    es_principal: bool | None = Field(
-        None, description="Si es diagnóstico principal"
-    )
+    es_principal: bool | None = Field(None, description="Si es diagnóstico principal")
 
 
 class EstablecimientoInfo(BaseModel):
@@ -140,9 +178,7 @@ class TratamientoInfo(BaseModel):
     fecha_inicio: date | None = Field(None, description="Fecha de inicio")
     fecha_fin: date | None = Field(None, description="Fecha de fin")
     resultado: str | None = Field(None, description="Resultado del tratamiento")
-    recibio_tratamiento: bool | None = Field(
-        None, description="Si recibió tratamiento"
-    )
+    recibio_tratamiento: bool | None = Field(None, description="Si recibió tratamiento")
 
 
 class InternacionInfo(BaseModel):
@@ -161,9 +197,7 @@ class InvestigacionInfo(BaseModel):
     es_usuario_centinela: bool | None = Field(
         None, description="Si es usuario centinela"
     )
-    es_evento_centinela: bool | None = Field(
-        None, description="Si es evento centinela"
-    )
+    es_evento_centinela: bool | None = Field(None, description="Si es evento centinela")
     participo_usuario_centinela: bool | None = Field(
         None, description="Si participó usuario centinela"
     )
@@ -177,9 +211,7 @@ class InvestigacionInfo(BaseModel):
     es_investigacion_terreno: bool | None = Field(
         None, description="Si fue investigación de terreno"
     )
-    fecha_investigacion: date | None = Field(
-        None, description="Fecha de investigación"
-    )
+    fecha_investigacion: date | None = Field(None, description="Fecha de investigación")
     tipo_lugar_investigacion: str | None = Field(
         None, description="Tipo y lugar de investigación"
     )
@@ -202,9 +234,7 @@ class ContactoInfo(BaseModel):
         None, description="Contactos menores de 1 año"
     )
     contactos_vacunados: int | None = Field(None, description="Contactos vacunados")
-    contactos_embarazadas: int | None = Field(
-        None, description="Contactos embarazadas"
-    )
+    contactos_embarazadas: int | None = Field(None, description="Contactos embarazadas")
 
 
 class AmbitoConcurrenciaInfo(BaseModel):
@@ -233,9 +263,7 @@ class VacunaInfo(BaseModel):
 
     id: int = Field(..., description="ID de la vacuna")
     nombre_vacuna: str | None = Field(None, description="Nombre de la vacuna")
-    fecha_ultima_dosis: date | None = Field(
-        None, description="Fecha de última dosis"
-    )
+    fecha_ultima_dosis: date | None = Field(None, description="Fecha de última dosis")
     dosis_total: int | None = Field(None, description="Total de dosis")
 
 
@@ -275,13 +303,9 @@ class CasoEpidemiologicoDetailResponse(BaseModel):
     fecha_primera_consulta: date | None = Field(
         None, description="Fecha de primera consulta"
     )
-    fecha_notificacion: date | None = Field(
-        None, description="Fecha de notificación"
-    )
+    fecha_notificacion: date | None = Field(None, description="Fecha de notificación")
     fecha_diagnostico: date | None = Field(None, description="Fecha de diagnóstico")
-    fecha_investigacion: date | None = Field(
-        None, description="Fecha de investigación"
-    )
+    fecha_investigacion: date | None = Field(None, description="Fecha de investigación")
 
     # Semanas epidemiológicas
     semana_epidemiologica_apertura: int | None = Field(
@@ -404,6 +428,595 @@ class CasoEpidemiologicoDetailResponse(BaseModel):
 logger = logging.getLogger(__name__)
 
 
+# =============================================================================
+# QUERY
+# =============================================================================
+
+# Un detalle = una query: cada relación es una subquery correlacionada que
+# agrega sus filas con json_agg/json_build_object, y la fila completa sale
+# como un único documento JSON (row_to_json) que Pydantic valida directo.
+
+_LISTA_VACIA = literal_column("'[]'::json")
+
+
+def _objeto(campos: dict[str, Any]) -> ColumnElement[Any]:
+    """``json_build_object`` con claves literales (no parámetros)."""
+    argumentos: list[Any] = []
+    for clave, valor in campos.items():
+        argumentos.extend((literal_column(f"'{clave}'"), valor))
+    return func.json_build_object(*argumentos)
+
+
+def _lista(objeto: ColumnElement[Any], *orden: Any) -> ColumnElement[Any]:
+    """Array JSON ordenado de ``objeto`` (``[]`` si no hay filas)."""
+    return func.coalesce(
+        func.json_agg(aggregate_order_by(objeto, *orden)), _LISTA_VACIA
+    )
+
+
+def _conteo(modelo: Any, *condiciones: Any) -> ScalarSelect[Any]:
+    return (
+        select(func.count()).select_from(modelo).where(*condiciones).scalar_subquery()
+    )
+
+
+def _establecimiento(id_establecimiento: Any) -> ScalarSelect[Any]:
+    """Objeto JSON de un establecimiento (NULL si no hay)."""
+    return (
+        select(
+            _objeto(
+                {
+                    "id": col(Establecimiento.id),
+                    "nombre": col(Establecimiento.nombre),
+                    "tipo": null(),
+                    "provincia": null(),
+                    "localidad": col(Localidad.nombre),
+                }
+            )
+        )
+        .select_from(Establecimiento)
+        .outerjoin(
+            Localidad,
+            col(Localidad.id_localidad_indec)
+            == col(Establecimiento.id_localidad_indec),
+        )
+        .where(col(Establecimiento.id) == id_establecimiento)
+        .scalar_subquery()
+    )
+
+
+def _ciudadano(evento_id: int) -> ScalarSelect[Any]:
+    """Ciudadano con el domicilio del caso y sus datos (los del caso primero)."""
+    datos = (
+        select(
+            col(CiudadanoDatos.informacion_contacto),
+            col(CiudadanoDatos.es_embarazada),
+            col(CiudadanoDatos.cobertura_social_obra_social),
+            col(CiudadanoDatos.ocupacion_laboral),
+        )
+        .where(col(CiudadanoDatos.codigo_ciudadano) == col(Ciudadano.codigo_ciudadano))
+        .order_by(
+            (col(CiudadanoDatos.id_caso) == evento_id).desc(),
+            col(CiudadanoDatos.id),
+        )
+        .limit(1)
+        .lateral("datos")
+    )
+    return (
+        select(
+            _objeto(
+                {
+                    "codigo": col(Ciudadano.codigo_ciudadano),
+                    "nombre": func.coalesce(col(Ciudadano.nombre), ""),
+                    "apellido": func.coalesce(col(Ciudadano.apellido), ""),
+                    "documento": cast(col(Ciudadano.numero_documento), String),
+                    "fecha_nacimiento": col(Ciudadano.fecha_nacimiento),
+                    "sexo": col(Ciudadano.sexo_biologico),
+                    "provincia": null(),
+                    "localidad": col(Localidad.nombre),
+                    "calle": col(Domicilio.calle),
+                    "numero": col(Domicilio.numero),
+                    "barrio": null(),
+                    "telefono": datos.c.informacion_contacto,
+                    "es_embarazada": datos.c.es_embarazada,
+                    "cobertura_social": datos.c.cobertura_social_obra_social,
+                    "ocupacion_laboral": datos.c.ocupacion_laboral,
+                }
+            )
+        )
+        .select_from(Ciudadano)
+        .outerjoin(Domicilio, col(Domicilio.id) == col(CasoEpidemiologico.id_domicilio))
+        .outerjoin(
+            Localidad,
+            col(Localidad.id_localidad_indec) == col(Domicilio.id_localidad_indec),
+        )
+        .outerjoin(datos, true())
+        .where(
+            col(Ciudadano.codigo_ciudadano) == col(CasoEpidemiologico.codigo_ciudadano)
+        )
+        .scalar_subquery()
+    )
+
+
+def _animal() -> ScalarSelect[Any]:
+    return (
+        select(
+            _objeto(
+                {
+                    "id": col(Animal.id),
+                    "identificacion": col(Animal.identificacion),
+                    "especie": col(Animal.especie),
+                    "raza": col(Animal.raza),
+                    "provincia": col(Animal.provincia),
+                    "localidad": col(Localidad.nombre),
+                }
+            )
+        )
+        .select_from(Animal)
+        .outerjoin(
+            Localidad,
+            col(Localidad.id_localidad_indec) == col(Animal.id_localidad_indec),
+        )
+        .where(col(Animal.id) == col(CasoEpidemiologico.id_animal))
+        .scalar_subquery()
+    )
+
+
+def _domicilio() -> ScalarSelect[Any]:
+    """Snapshot geográfico del domicilio del caso."""
+    return (
+        select(
+            _objeto(
+                {
+                    "latitud": col(Domicilio.latitud),
+                    "longitud": col(Domicilio.longitud),
+                    "calle": col(Domicilio.calle),
+                    "numero": col(Domicilio.numero),
+                    "localidad": col(Localidad.nombre),
+                    "departamento": null(),
+                    "provincia": null(),
+                }
+            )
+        )
+        .select_from(Domicilio)
+        .outerjoin(
+            Localidad,
+            col(Localidad.id_localidad_indec) == col(Domicilio.id_localidad_indec),
+        )
+        .where(col(Domicilio.id) == col(CasoEpidemiologico.id_domicilio))
+        .scalar_subquery()
+    )
+
+
+def _relaciones() -> dict[str, ScalarSelect[Any]]:
+    """Subqueries de las colecciones del caso, una por campo de la respuesta."""
+    id_caso = col(CasoEpidemiologico.id)
+    anio_caso = col(CasoEpidemiologico.fecha_minima_caso_anio_epi)
+    establecimiento_muestra = aliased(Establecimiento)
+
+    estudios = (
+        select(
+            _lista(
+                _objeto(
+                    {
+                        "id": col(EstudioCasoEpidemiologico.id),
+                        "determinacion": col(EstudioCasoEpidemiologico.determinacion),
+                        "tecnica": col(EstudioCasoEpidemiologico.tecnica),
+                        "resultado": col(EstudioCasoEpidemiologico.resultado),
+                        "fecha_estudio": col(EstudioCasoEpidemiologico.fecha_estudio),
+                        "fecha_recepcion": col(
+                            EstudioCasoEpidemiologico.fecha_recepcion
+                        ),
+                    }
+                ),
+                col(EstudioCasoEpidemiologico.fecha_estudio),
+                col(EstudioCasoEpidemiologico.id),
+            )
+        )
+        .where(
+            col(EstudioCasoEpidemiologico.id_muestra)
+            == col(MuestraCasoEpidemiologico.id),
+            col(EstudioCasoEpidemiologico.anio_epi_caso)
+            == col(MuestraCasoEpidemiologico.anio_epi_caso),
+        )
+        .scalar_subquery()
+    )
+
+    return {
+        "sintomas": select(
+            _lista(
+                _objeto(
+                    {
+                        "id": col(DetalleCasoSintomas.id),
+                        "nombre": col(Sintoma.signo_sintoma),
+                        "fecha_inicio": col(DetalleCasoSintomas.fecha_inicio_sintoma),
+                        "semana_epidemiologica": col(
+                            DetalleCasoSintomas.semana_epidemiologica_aparicion_sintoma
+                        ),
+                        "anio_epidemiologico": col(
+                            DetalleCasoSintomas.anio_epidemiologico_sintoma
+                        ),
+                    }
+                ),
+                col(DetalleCasoSintomas.fecha_inicio_sintoma),
+                col(DetalleCasoSintomas.id),
+            )
+        )
+        .select_from(DetalleCasoSintomas)
+        .outerjoin(Sintoma, col(Sintoma.id) == col(DetalleCasoSintomas.id_sintoma))
+        .where(
+            col(DetalleCasoSintomas.id_caso) == id_caso,
+            col(DetalleCasoSintomas.anio_epi_caso) == anio_caso,
+        )
+        .scalar_subquery(),
+        "muestras": select(
+            _lista(
+                _objeto(
+                    {
+                        "id": col(MuestraCasoEpidemiologico.id),
+                        "tipo": col(Muestra.descripcion),
+                        "fecha_toma_muestra": col(
+                            MuestraCasoEpidemiologico.fecha_toma_muestra
+                        ),
+                        "establecimiento": establecimiento_muestra.nombre,
+                        "semana_epidemiologica": col(
+                            MuestraCasoEpidemiologico.semana_epidemiologica_muestra
+                        ),
+                        "anio_epidemiologico": col(
+                            MuestraCasoEpidemiologico.anio_epidemiologico_muestra
+                        ),
+                        "valor": col(MuestraCasoEpidemiologico.valor),
+                        "estudios": estudios,
+                    }
+                ),
+                col(MuestraCasoEpidemiologico.fecha_toma_muestra),
+                col(MuestraCasoEpidemiologico.id),
+            )
+        )
+        .select_from(MuestraCasoEpidemiologico)
+        .outerjoin(
+            Muestra, col(Muestra.id) == col(MuestraCasoEpidemiologico.id_muestra)
+        )
+        .outerjoin(
+            establecimiento_muestra,
+            establecimiento_muestra.id
+            == col(MuestraCasoEpidemiologico.id_establecimiento),
+        )
+        .where(
+            col(MuestraCasoEpidemiologico.id_caso) == id_caso,
+            col(MuestraCasoEpidemiologico.anio_epi_caso) == anio_caso,
+        )
+        .scalar_subquery(),
+        "diagnosticos": select(
+            _lista(
+                _objeto(
+                    {
+                        "id": col(DiagnosticoCasoEpidemiologico.id),
+                        "diagnostico": func.coalesce(
+                            col(DiagnosticoCasoEpidemiologico.diagnostico_referido),
+                            col(DiagnosticoCasoEpidemiologico.clasificacion_manual),
+                        ),
+                        "fecha": col(
+                            DiagnosticoCasoEpidemiologico.fecha_diagnostico_referido
+                        ),
+                        "es_principal": null(),
+                    }
+                ),
+                col(DiagnosticoCasoEpidemiologico.fecha_diagnostico_referido),
+                col(DiagnosticoCasoEpidemiologico.id),
+            )
+        )
+        .where(
+            col(DiagnosticoCasoEpidemiologico.id_caso) == id_caso,
+            col(DiagnosticoCasoEpidemiologico.anio_epi_caso) == anio_caso,
+        )
+        .scalar_subquery(),
+        "tratamientos": select(
+            _lista(
+                _objeto(
+                    {
+                        "id": col(TratamientoCasoEpidemiologico.id),
+                        "descripcion": col(
+                            TratamientoCasoEpidemiologico.descripcion_tratamiento
+                        ),
+                        "establecimiento": col(
+                            TratamientoCasoEpidemiologico.establecimiento_tratamiento
+                        ),
+                        "fecha_inicio": col(
+                            TratamientoCasoEpidemiologico.fecha_inicio_tratamiento
+                        ),
+                        "fecha_fin": col(
+                            TratamientoCasoEpidemiologico.fecha_fin_tratamiento
+                        ),
+                        "resultado": col(
+                            TratamientoCasoEpidemiologico.resultado_tratamiento
+                        ),
+                        "recibio_tratamiento": null(),
+                    }
+                ),
+                col(TratamientoCasoEpidemiologico.fecha_inicio_tratamiento),
+                col(TratamientoCasoEpidemiologico.id),
+            )
+        )
+        .where(col(TratamientoCasoEpidemiologico.id_caso) == id_caso)
+        .scalar_subquery(),
+        "internaciones": select(
+            _lista(
+                _objeto(
+                    {
+                        "id": col(InternacionCasoEpidemiologico.id),
+                        "fecha_internacion": col(
+                            InternacionCasoEpidemiologico.fecha_internacion
+                        ),
+                        "fecha_alta": col(
+                            InternacionCasoEpidemiologico.fecha_alta_medica
+                        ),
+                        "requirio_uci": col(
+                            InternacionCasoEpidemiologico.requirio_cuidado_intensivo
+                        ),
+                    }
+                ),
+                col(InternacionCasoEpidemiologico.fecha_internacion),
+                col(InternacionCasoEpidemiologico.id),
+            )
+        )
+        .where(col(InternacionCasoEpidemiologico.id_caso) == id_caso)
+        .scalar_subquery(),
+        "investigaciones": select(
+            _lista(
+                _objeto(
+                    {
+                        "id": col(InvestigacionCasoEpidemiologico.id),
+                        "es_usuario_centinela": col(
+                            InvestigacionCasoEpidemiologico.es_usuario_centinela
+                        ),
+                        "es_evento_centinela": col(
+                            InvestigacionCasoEpidemiologico.es_evento_centinela
+                        ),
+                        "participo_usuario_centinela": col(
+                            InvestigacionCasoEpidemiologico.participo_usuario_centinela
+                        ),
+                        "id_usuario_centinela_participante": col(
+                            InvestigacionCasoEpidemiologico.id_usuario_centinela_participante
+                        ),
+                        "id_usuario_registro": col(
+                            InvestigacionCasoEpidemiologico.id_usuario_registro
+                        ),
+                        "id_snvs_evento": col(
+                            InvestigacionCasoEpidemiologico.id_snvs_caso
+                        ),
+                        "es_investigacion_terreno": col(
+                            InvestigacionCasoEpidemiologico.es_investigacion_terreno
+                        ),
+                        "fecha_investigacion": col(
+                            InvestigacionCasoEpidemiologico.fecha_investigacion
+                        ),
+                        "tipo_lugar_investigacion": col(
+                            InvestigacionCasoEpidemiologico.tipo_y_lugar_investigacion
+                        ),
+                        "origen_financiamiento": col(
+                            InvestigacionCasoEpidemiologico.origen_financiamiento
+                        ),
+                    }
+                ),
+                col(InvestigacionCasoEpidemiologico.fecha_investigacion),
+                col(InvestigacionCasoEpidemiologico.id),
+            )
+        )
+        .where(col(InvestigacionCasoEpidemiologico.id_caso) == id_caso)
+        .scalar_subquery(),
+        "contactos": select(
+            _lista(
+                _objeto(
+                    {
+                        "id": col(ContactosNotificacion.id),
+                        "contacto_caso_confirmado": col(
+                            ContactosNotificacion.hubo_contacto_con_caso_confirmado
+                        ),
+                        "contacto_caso_sospechoso": col(
+                            ContactosNotificacion.hubo_contacto_con_caso_sospechoso
+                        ),
+                        "contactos_menores_un_ano": col(
+                            ContactosNotificacion.cantidad_contactos_menores_un_anio
+                        ),
+                        "contactos_vacunados": col(
+                            ContactosNotificacion.cantidad_contactos_vacunados
+                        ),
+                        "contactos_embarazadas": col(
+                            ContactosNotificacion.cantidad_contactos_embarazadas
+                        ),
+                    }
+                ),
+                col(ContactosNotificacion.id),
+            )
+        )
+        .where(col(ContactosNotificacion.id_caso) == id_caso)
+        .scalar_subquery(),
+        "ambitos_concurrencia": select(
+            _lista(
+                _objeto(
+                    {
+                        "id": col(AmbitosConcurrenciaCaso.id),
+                        "nombre_lugar": col(
+                            AmbitosConcurrenciaCaso.nombre_lugar_ocurrencia
+                        ),
+                        "tipo_lugar": col(
+                            AmbitosConcurrenciaCaso.tipo_lugar_ocurrencia
+                        ),
+                        "localidad": col(
+                            AmbitosConcurrenciaCaso.localidad_ambito_ocurrencia
+                        ),
+                        "fecha_ocurrencia": col(
+                            AmbitosConcurrenciaCaso.fecha_ambito_ocurrencia
+                        ),
+                        "frecuencia_concurrencia": col(
+                            AmbitosConcurrenciaCaso.frecuencia_concurrencia
+                        ),
+                    }
+                ),
+                col(AmbitosConcurrenciaCaso.fecha_ambito_ocurrencia),
+                col(AmbitosConcurrenciaCaso.id),
+            )
+        )
+        .where(col(AmbitosConcurrenciaCaso.id_caso) == id_caso)
+        .scalar_subquery(),
+        "antecedentes": select(
+            _lista(
+                _objeto(
+                    {
+                        "id": col(AntecedentesCasoEpidemiologico.id),
+                        "descripcion": col(AntecedenteEpidemiologico.descripcion),
+                        "fecha_antecedente": col(
+                            AntecedentesCasoEpidemiologico.fecha_antecedente_epidemiologico
+                        ),
+                    }
+                ),
+                col(AntecedentesCasoEpidemiologico.id),
+            )
+        )
+        .select_from(AntecedentesCasoEpidemiologico)
+        .outerjoin(
+            AntecedenteEpidemiologico,
+            col(AntecedenteEpidemiologico.id)
+            == col(AntecedentesCasoEpidemiologico.id_antecedente_epidemiologico),
+        )
+        .where(col(AntecedentesCasoEpidemiologico.id_caso) == id_caso)
+        .scalar_subquery(),
+        "vacunas": select(
+            _lista(
+                _objeto(
+                    {
+                        "id": col(VacunasCiudadano.id),
+                        "nombre_vacuna": col(Vacuna.nombre),
+                        "fecha_ultima_dosis": col(VacunasCiudadano.fecha_aplicacion),
+                        # La dosis se carga como texto ("1", "2", "Refuerzo"...)
+                        "dosis_total": case(
+                            (
+                                col(VacunasCiudadano.dosis).regexp_match(r"^\d{1,6}$"),
+                                cast(col(VacunasCiudadano.dosis), Integer),
+                            ),
+                        ),
+                    }
+                ),
+                col(VacunasCiudadano.fecha_aplicacion),
+                col(VacunasCiudadano.id),
+            )
+        )
+        .select_from(VacunasCiudadano)
+        .outerjoin(Vacuna, col(Vacuna.id) == col(VacunasCiudadano.id_vacuna))
+        .where(col(VacunasCiudadano.id_caso) == id_caso)
+        .scalar_subquery(),
+    }
+
+
+def _query_detalle(evento_id: int, include_relations: bool) -> Select[Any]:
+    """
+    Query del detalle completo como un único documento JSON.
+
+    Devuelve una fila con el JSON (texto) del caso, o ninguna si no existe.
+    Sin ``include_relations`` las colecciones salen vacías, pero los totales
+    se calculan igual (son conteos sobre índices por caso).
+    """
+    id_caso = col(CasoEpidemiologico.id)
+    anio_caso = col(CasoEpidemiologico.fecha_minima_caso_anio_epi)
+
+    columnas: list[Any] = [
+        id_caso.label("id"),
+        col(CasoEpidemiologico.id_snvs).label("id_evento_caso"),
+        col(CasoEpidemiologico.id_enfermedad).label("tipo_eno_id"),
+        col(Enfermedad.nombre).label("tipo_eno_nombre"),
+        col(Enfermedad.descripcion).label("tipo_eno_descripcion"),
+        col(Enfermedad.nombre).label("enfermedad"),
+        func.coalesce(
+            col(CasoEpidemiologico.fecha_minima_caso), func.current_date()
+        ).label("fecha_minima_caso"),
+        col(CasoEpidemiologico.fecha_inicio_sintomas),
+        col(CasoEpidemiologico.fecha_apertura_caso),
+        col(CasoEpidemiologico.fecha_primera_consulta),
+        col(CasoEpidemiologico.semana_epidemiologica_apertura),
+        col(CasoEpidemiologico.anio_epidemiologico_apertura),
+        col(CasoEpidemiologico.semana_epidemiologica_sintomas),
+        col(CasoEpidemiologico.clasificacion_estrategia),
+        col(CasoEpidemiologico.confidence_score),
+        col(CasoEpidemiologico.metadata_clasificacion),
+        col(CasoEpidemiologico.metadata_extraida),
+        col(CasoEpidemiologico.id_estrategia_aplicada),
+        col(EstrategiaClasificacion.name).label("estrategia_nombre"),
+        col(CasoEpidemiologico.trazabilidad_clasificacion),
+        case(
+            (col(CasoEpidemiologico.codigo_ciudadano).is_not(None), "humano"),
+            (col(CasoEpidemiologico.id_animal).is_not(None), "animal"),
+            else_="desconocido",
+        ).label("tipo_sujeto"),
+        _ciudadano(evento_id).label("ciudadano"),
+        _animal().label("animal"),
+        _domicilio().label("domicilio_geografico"),
+        _establecimiento(col(CasoEpidemiologico.id_establecimiento_consulta)).label(
+            "establecimiento_consulta"
+        ),
+        _establecimiento(col(CasoEpidemiologico.id_establecimiento_notificacion)).label(
+            "establecimiento_notificacion"
+        ),
+        _establecimiento(col(CasoEpidemiologico.id_establecimiento_carga)).label(
+            "establecimiento_carga"
+        ),
+        col(CasoEpidemiologico.es_caso_sintomatico),
+        col(CasoEpidemiologico.requiere_revision_especie),
+        col(CasoEpidemiologico.observaciones_texto),
+        col(CasoEpidemiologico.id_origen),
+        col(CasoEpidemiologico.datos_originales_csv),
+        col(CasoEpidemiologico.created_at),
+        col(CasoEpidemiologico.updated_at),
+        _conteo(
+            DetalleCasoSintomas,
+            col(DetalleCasoSintomas.id_caso) == id_caso,
+            col(DetalleCasoSintomas.anio_epi_caso) == anio_caso,
+        ).label("total_sintomas"),
+        _conteo(
+            MuestraCasoEpidemiologico,
+            col(MuestraCasoEpidemiologico.id_caso) == id_caso,
+            col(MuestraCasoEpidemiologico.anio_epi_caso) == anio_caso,
+        ).label("total_muestras"),
+        _conteo(
+            DiagnosticoCasoEpidemiologico,
+            col(DiagnosticoCasoEpidemiologico.id_caso) == id_caso,
+            col(DiagnosticoCasoEpidemiologico.anio_epi_caso) == anio_caso,
+        ).label("total_diagnosticos"),
+        _conteo(
+            TratamientoCasoEpidemiologico,
+            col(TratamientoCasoEpidemiologico.id_caso) == id_caso,
+        ).label("total_tratamientos"),
+        _conteo(
+            InternacionCasoEpidemiologico,
+            col(InternacionCasoEpidemiologico.id_caso) == id_caso,
+        ).label("total_internaciones"),
+        _conteo(
+            InvestigacionCasoEpidemiologico,
+            col(InvestigacionCasoEpidemiologico.id_caso) == id_caso,
+        ).label("total_investigaciones"),
+    ]
+    if include_relations:
+        columnas.extend(
+            subquery.label(nombre) for nombre, subquery in _relaciones().items()
+        )
+
+    detalle = (
+        select(*columnas)
+        .select_from(CasoEpidemiologico)
+        .outerjoin(
+            Enfermedad, col(Enfermedad.id) == col(CasoEpidemiologico.id_enfermedad)
+        )
+        .outerjoin(
+            EstrategiaClasificacion,
+            col(EstrategiaClasificacion.id)
+            == col(CasoEpidemiologico.id_estrategia_aplicada),
+        )
+        .where(id_caso == evento_id)
+        .subquery("detalle")
+    )
+    return select(cast(func.row_to_json(detalle.table_valued()), Text))
+
+
 async def get_evento_detail(
     evento_id: int,
     include_relations: bool = Query(True, description="Incluir datos relacionados"),
@@ -419,6 +1032,9 @@ async def get_evento_detail(
     - Síntomas, muestras, diagnósticos
     - Metadata de clasificación
     - Timeline de eventos
+
+    El payload completo se arma en PostgreSQL y se obtiene en una sola
+    ida y vuelta a la BD.
     """
 
     logger.info(
@@ -426,448 +1042,18 @@ async def get_evento_detail(
     )
 
     try:
-        # Query con TODAS las relaciones necesarias (EVENT-CENTERED)
-        query = select(CasoEpidemiologico).where(
-            col(CasoEpidemiologico.id) == evento_id
-        )
-
-        if include_relations:
-            query = query.options(
-                selectinload(
-                    CasoEpidemiologico.enfermedad
-                ),  # Cambiado de tipo_eno a enfermedad
-                selectinload(CasoEpidemiologico.estrategia_aplicada),
-                # Sujetos del evento
-                selectinload(CasoEpidemiologico.ciudadano).selectinload(
-                    Ciudadano.datos
-                ),
-                selectinload(CasoEpidemiologico.animal).selectinload(Animal.localidad),
-                # Datos geográficos del evento (normalized domicilio)
-                selectinload(CasoEpidemiologico.domicilio).selectinload(
-                    Domicilio.localidad
-                ),
-                # Establecimientos del evento
-                selectinload(CasoEpidemiologico.establecimiento_consulta),
-                selectinload(CasoEpidemiologico.establecimiento_notificacion),
-                selectinload(CasoEpidemiologico.establecimiento_carga),
-                # Salud y diagnósticos del evento
-                selectinload(CasoEpidemiologico.sintomas).selectinload(
-                    DetalleCasoSintomas.sintoma
-                ),
-                selectinload(CasoEpidemiologico.muestras).selectinload(
-                    MuestraCasoEpidemiologico.muestra
-                ),
-                selectinload(CasoEpidemiologico.muestras).selectinload(
-                    MuestraCasoEpidemiologico.establecimiento
-                ),
-                selectinload(CasoEpidemiologico.muestras).selectinload(
-                    MuestraCasoEpidemiologico.estudios
-                ),
-                selectinload(CasoEpidemiologico.diagnosticos),
-                selectinload(CasoEpidemiologico.tratamientos),
-                selectinload(CasoEpidemiologico.internaciones),
-                # Investigación epidemiológica del evento
-                selectinload(CasoEpidemiologico.investigaciones),
-                selectinload(CasoEpidemiologico.contactos),
-                selectinload(CasoEpidemiologico.ambitos_concurrencia),
-                selectinload(CasoEpidemiologico.antecedentes),
-                # Prevención del evento
-                selectinload(CasoEpidemiologico.vacunas),
-            )
+        documento = (
+            await db.execute(_query_detalle(evento_id, include_relations))
+        ).scalar_one_or_none()
 
-        result = await db.execute(query)
-        evento = result.scalar_one_or_none()
-
-        if not evento:
+        if documento is None:
             logger.warning(f"❌ CasoEpidemiologico {evento_id} no encontrado")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"CasoEpidemiologico {evento_id} no encontrado",
             )
 
-        # Verificar que el evento tenga ID (siempre debe tenerlo si viene de la DB)
-        if evento.id is None:
-            logger.error(f"💥 CasoEpidemiologico {evento_id} sin ID")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Error: evento sin ID",
-            )
-
-        # Preparar respuesta detallada (EVENT-CENTERED)
-        response = CasoEpidemiologicoDetailResponse(
-            # Datos básicos del evento
-            id=evento.id,
-            id_evento_caso=evento.id_snvs,  # Cambiado de id_evento_caso a id_snvs
-            tipo_eno_id=evento.id_enfermedad,
-            tipo_eno_nombre=evento.enfermedad.nombre
-            if evento.enfermedad
-            else None,  # Cambiado de tipo_eno a enfermedad
-            tipo_eno_descripcion=(
-                evento.enfermedad.descripcion
-                if evento.enfermedad
-                else None  # Cambiado de tipo_eno a enfermedad
-            ),
-            enfermedad=evento.enfermedad.nombre
-            if evento.enfermedad
-            else None,  # Extraer nombre del objeto
-            # Fechas importantes del evento
-            fecha_minima_caso=evento.fecha_minima_caso
-            if evento.fecha_minima_caso
-            else date.today(),  # Cambiado de fecha_minima_caso a fecha_minima_caso
-            fecha_inicio_sintomas=evento.fecha_inicio_sintomas,
-            fecha_apertura_caso=evento.fecha_apertura_caso,
-            fecha_primera_consulta=evento.fecha_primera_consulta,
-            fecha_notificacion=getattr(evento, "fecha_notificacion", None),
-            fecha_diagnostico=getattr(evento, "fecha_diagnostico", None),
-            fecha_investigacion=getattr(evento, "fecha_investigacion", None),
-            # Semanas epidemiológicas
-            semana_epidemiologica_apertura=evento.semana_epidemiologica_apertura,
-            anio_epidemiologico_apertura=evento.anio_epidemiologico_apertura,
-            semana_epidemiologica_sintomas=evento.semana_epidemiologica_sintomas,
-            # Clasificación del evento
-            clasificacion_estrategia=evento.clasificacion_estrategia,
-            confidence_score=evento.confidence_score,
-            metadata_clasificacion=evento.metadata_clasificacion,
-            metadata_extraida=evento.metadata_extraida,
-            # Trazabilidad de clasificación
-            id_estrategia_aplicada=evento.id_estrategia_aplicada,
-            estrategia_nombre=evento.estrategia_aplicada.name
-            if evento.estrategia_aplicada
-            else None,
-            trazabilidad_clasificacion=evento.trazabilidad_clasificacion,
-            # Tipo de sujeto
-            tipo_sujeto=(
-                "humano"
-                if evento.ciudadano
-                else "animal"
-                if evento.animal
-                else "desconocido"
-            ),
-            # Estados del evento
-            es_caso_sintomatico=evento.es_caso_sintomatico,
-            requiere_revision_especie=evento.requiere_revision_especie,
-            # Observaciones y datos originales
-            observaciones_texto=evento.observaciones_texto,
-            id_origen=evento.id_origen,
-            datos_originales_csv=evento.datos_originales_csv,
-            # Timestamps
-            created_at=evento.created_at,
-            updated_at=evento.updated_at,
-            # Conteos iniciales
-            total_sintomas=len(evento.sintomas or []),
-            total_muestras=len(evento.muestras or []),
-            total_diagnosticos=len(evento.diagnosticos or []),
-            total_tratamientos=len(evento.tratamientos or []),
-            total_internaciones=len(evento.internaciones or []),
-            total_investigaciones=len(evento.investigaciones or []),
-        )
-
-        # Agregar datos del sujeto
-        if evento.ciudadano:
-            # Get location and address from evento's domicilio (not ciudadano's)
-            provincia_nombre = None
-            localidad_nombre = None
-            calle_domicilio = None
-            numero_domicilio = None
-            barrio_popular = None
-            if evento.domicilio:
-                calle_domicilio = evento.domicilio.calle
-                numero_domicilio = evento.domicilio.numero
-                # Note: barrio_popular might not exist in Domicilio model
-                barrio_popular = getattr(evento.domicilio, "barrio_popular", None)
-                if evento.domicilio.localidad:
-                    localidad_nombre = evento.domicilio.localidad.nombre
-
-            # Get contact info and additional data from first datos record
-            telefono = None
-            es_embarazada = None
-            cobertura_social = None
-            ocupacion_laboral = None
-            if evento.ciudadano.datos:
-                primer_datos = evento.ciudadano.datos[0]
-                telefono = primer_datos.informacion_contacto
-                es_embarazada = getattr(primer_datos, "es_embarazada", None)
-                cobertura_social = getattr(
-                    primer_datos, "cobertura_social_obra_social", None
-                )
-                ocupacion_laboral = getattr(primer_datos, "ocupacion_laboral", None)
-
-            response.ciudadano = CiudadanoInfo(
-                codigo=evento.ciudadano.codigo_ciudadano,
-                nombre=evento.ciudadano.nombre or "",
-                apellido=evento.ciudadano.apellido or "",
-                documento=(
-                    str(evento.ciudadano.numero_documento)
-                    if evento.ciudadano.numero_documento
-                    else None
-                ),
-                fecha_nacimiento=evento.ciudadano.fecha_nacimiento,
-                sexo=evento.ciudadano.sexo_biologico,
-                provincia=provincia_nombre,
-                localidad=localidad_nombre,
-                calle=calle_domicilio,
-                numero=numero_domicilio,
-                barrio=barrio_popular,
-                telefono=telefono,
-                es_embarazada=es_embarazada,
-                cobertura_social=cobertura_social,
-                ocupacion_laboral=ocupacion_laboral,
-            )
-
-        if evento.animal and evento.animal.id is not None:
-            response.animal = AnimalInfo(
-                id=evento.animal.id,
-                identificacion=evento.animal.identificacion,
-                especie=evento.animal.especie,
-                raza=evento.animal.raza,
-                provincia=evento.animal.provincia,
-                localidad=evento.animal.localidad.nombre
-                if evento.animal.localidad
-                else None,
-            )
-
-        # Agregar establecimientos del evento
-        if (
-            evento.establecimiento_consulta
-            and evento.establecimiento_consulta.id is not None
-        ):
-            response.establecimiento_consulta = EstablecimientoInfo(
-                id=evento.establecimiento_consulta.id,
-                nombre=evento.establecimiento_consulta.nombre,
-                tipo=getattr(evento.establecimiento_consulta, "tipo", None),
-                provincia=getattr(evento.establecimiento_consulta, "provincia", None),
-                localidad=getattr(evento.establecimiento_consulta, "localidad", None),
-            )
-
-        if (
-            evento.establecimiento_notificacion
-            and evento.establecimiento_notificacion.id is not None
-        ):
-            response.establecimiento_notificacion = EstablecimientoInfo(
-                id=evento.establecimiento_notificacion.id,
-                nombre=evento.establecimiento_notificacion.nombre,
-                tipo=getattr(evento.establecimiento_notificacion, "tipo", None),
-                provincia=getattr(
-                    evento.establecimiento_notificacion, "provincia", None
-                ),
-                localidad=getattr(
-                    evento.establecimiento_notificacion, "localidad", None
-                ),
-            )
-
-        if evento.establecimiento_carga and evento.establecimiento_carga.id is not None:
-            response.establecimiento_carga = EstablecimientoInfo(
-                id=evento.establecimiento_carga.id,
-                nombre=evento.establecimiento_carga.nombre,
-                tipo=getattr(evento.establecimiento_carga, "tipo", None),
-                provincia=getattr(evento.establecimiento_carga, "provincia", None),
-                localidad=getattr(evento.establecimiento_carga, "localidad", None),
-            )
-
-        # Agregar datos geográficos del domicilio (normalized, inmutable)
-        if evento.domicilio:
-            localidad_nombre = None
-            departamento_nombre = None
-            provincia_nombre = None
-
-            if evento.domicilio.localidad:
-                localidad_nombre = evento.domicilio.localidad.nombre
-
-            response.domicilio_geografico = DomicilioGeograficoInfo(
-                latitud=evento.domicilio.latitud,
-                longitud=evento.domicilio.longitud,
-                calle=evento.domicilio.calle,
-                numero=evento.domicilio.numero,
-                localidad=localidad_nombre,
-                departamento=departamento_nombre,
-                provincia=provincia_nombre,
-            )
-
-        # Agregar TODAS las relaciones del evento si se solicitaron (EVENT-CENTERED)
-        if include_relations:
-            # Síntomas del evento
-            response.sintomas = [
-                SintomaInfo(
-                    id=s.id,
-                    nombre=(
-                        s.sintoma.signo_sintoma
-                        if hasattr(s, "sintoma") and s.sintoma
-                        else None
-                    ),
-                    fecha_inicio=s.fecha_inicio_sintoma,
-                    semana_epidemiologica=s.semana_epidemiologica_aparicion_sintoma,
-                    anio_epidemiologico=s.anio_epidemiologico_sintoma,
-                )
-                for s in (evento.sintomas or [])
-                if s.id is not None
-            ]
-
-            # Muestras del evento con sus estudios anidados
-            response.muestras = [
-                MuestraInfo(
-                    id=m.id,
-                    tipo=m.muestra.descripcion if m.muestra else None,
-                    fecha_toma_muestra=m.fecha_toma_muestra,
-                    establecimiento=m.establecimiento.nombre
-                    if m.establecimiento
-                    else None,
-                    semana_epidemiologica=m.semana_epidemiologica_muestra,
-                    anio_epidemiologico=m.anio_epidemiologico_muestra,
-                    valor=m.valor,
-                    estudios=[
-                        EstudioInfo(
-                            id=est.id,
-                            determinacion=est.determinacion,
-                            tecnica=est.tecnica,
-                            resultado=est.resultado,
-                            fecha_estudio=est.fecha_estudio,
-                            fecha_recepcion=est.fecha_recepcion,
-                        )
-                        for est in (m.estudios or [])
-                        if est.id is not None
-                    ],
-                )
-                for m in (evento.muestras or [])
-                if m.id is not None
-            ]
-
-            # Diagnósticos del evento
-            response.diagnosticos = [
-                DiagnosticoInfo(
-                    id=d.id,
-                    diagnostico=getattr(d, "metodo_diagnostico", None)
-                    or getattr(d, "resultado", None),
-                    fecha=getattr(d, "fecha_diagnostico", None),
-                    es_principal=None,
-                )
-                for d in (evento.diagnosticos or [])
-                if d.id is not None
-            ]
-
-            # Tratamientos del evento
-            response.tratamientos = [
-                TratamientoInfo(
-                    id=t.id,
-                    descripcion=getattr(t, "descripcion_tratamiento", None),
-                    establecimiento=getattr(t, "establecimiento_tratamiento", None),
-                    fecha_inicio=getattr(t, "fecha_inicio_tratamiento", None),
-                    fecha_fin=getattr(t, "fecha_fin_tratamiento", None),
-                    resultado=getattr(t, "resultado_tratamiento", None),
-                    recibio_tratamiento=None,  # Este campo no existe en el modelo
-                )
-                for t in (evento.tratamientos or [])
-                if t.id is not None
-            ]
-
-            # Internaciones del evento
-            response.internaciones = [
-                InternacionInfo(
-                    id=i.id,
-                    fecha_internacion=getattr(i, "fecha_internacion", None),
-                    fecha_alta=getattr(i, "fecha_alta_internacion", None),
-                    requirio_uci=getattr(i, "requirio_uci", None),
-                )
-                for i in (evento.internaciones or [])
-                if i.id is not None
-            ]
-
-            # Investigaciones del evento
-            response.investigaciones = [
-                InvestigacionInfo(
-                    id=inv.id,
-                    es_usuario_centinela=getattr(inv, "es_usuario_centinela", None),
-                    es_evento_centinela=getattr(inv, "es_evento_centinela", None),
-                    participo_usuario_centinela=getattr(
-                        inv, "participo_usuario_centinela", None
-                    ),
-                    id_usuario_centinela_participante=getattr(
-                        inv, "id_usuario_centinela_participante", None
-                    ),
-                    id_usuario_registro=getattr(inv, "id_usuario_registro", None),
-                    id_snvs_evento=getattr(inv, "id_snvs_evento", None),
-                    es_investigacion_terreno=getattr(
-                        inv, "es_investigacion_terreno", None
-                    ),
-                    fecha_investigacion=getattr(inv, "fecha_investigacion", None),
-                    tipo_lugar_investigacion=getattr(
-                        inv, "tipo_y_lugar_investigacion", None
-                    ),
-                    origen_financiamiento=getattr(inv, "origen_financiamiento", None),
-                )
-                for inv in (evento.investigaciones or [])
-                if inv.id is not None
-            ]
-
-            # Contactos del evento
-            response.contactos = [
-                ContactoInfo(
-                    id=c.id,
-                    contacto_caso_confirmado=getattr(
-                        c, "hubo_contacto_con_caso_confirmado", None
-                    ),
-                    contacto_caso_sospechoso=getattr(
-                        c, "hubo_contacto_con_caso_sospechoso", None
-                    ),
-                    contactos_menores_un_ano=getattr(
-                        c, "cantidad_contactos_menores_un_anio", None
-                    ),
-                    contactos_vacunados=getattr(
-                        c, "cantidad_contactos_vacunados", None
-                    ),
-                    contactos_embarazadas=getattr(
-                        c, "cantidad_contactos_embarazadas", None
-                    ),
-                )
-                for c in (evento.contactos or [])
-                if c.id is not None
-            ]
-
-            # Ámbitos de concurrencia del evento
-            response.ambitos_concurrencia = [
-                AmbitoConcurrenciaInfo(
-                    id=amb.id,
-                    nombre_lugar=getattr(amb, "nombre_lugar_ocurrencia", None),
-                    tipo_lugar=getattr(amb, "tipo_lugar_ocurrencia", None),
-                    localidad=getattr(amb, "localidad_ambito_ocurrencia", None),
-                    fecha_ocurrencia=getattr(amb, "fecha_ambito_ocurrencia", None),
-                    frecuencia_concurrencia=(
-                        str(getattr(amb, "frecuencia_concurrencia", None))
-                        if getattr(amb, "frecuencia_concurrencia", None)
-                        else None
-                    ),
-                )
-                for amb in (evento.ambitos_concurrencia or [])
-                if amb.id is not None
-            ]
-
-            # Antecedentes epidemiológicos del evento
-            response.antecedentes = [
-                AntecedenteInfo(
-                    id=ant.id,
-                    descripcion=(
-                        getattr(ant.antecedente_epidemiologico_rel, "descripcion", None)
-                        if hasattr(ant, "antecedente_epidemiologico_rel")
-                        else None
-                    ),
-                    fecha_antecedente=getattr(
-                        ant, "fecha_antecedente_epidemiologico", None
-                    ),
-                )
-                for ant in (evento.antecedentes or [])
-                if ant.id is not None
-            ]
-
-            # Vacunas relacionadas al evento
-            response.vacunas = [
-                VacunaInfo(
-                    id=v.id,
-                    nombre_vacuna=getattr(v, "nombre_vacuna", None),
-                    fecha_ultima_dosis=getattr(v, "fecha_ultima_dosis", None),
-                    dosis_total=getattr(v, "dosis_total", None),
-                )
-                for v in (evento.vacunas or [])
-                if v.id is not None
-            ]
+        response = CasoEpidemiologicoDetailResponse.model_validate_json(documento)
 
         logger.info(f"✅ Detalle de evento {evento_id} obtenido")
         return SuccessResponse(data=response)
@@ -14,6 +14,7 @@ from sqlalchemy import func, select
 from sqlmodel import Session, col
 
 from app.core.database import get_session
+from app.core.responses import RespuestaJSON
 from app.core.schemas.response import SuccessResponse
 from app.domains.territorio.geografia_models import (
     Departamento,
@@ -103,7 +104,7 @@ async def get_domicilios_mapa(
         50000, ge=1, le=100000, description="Máximo de domicilios a retornar"
     ),
     session: Session = Depends(get_session),
-) -> SuccessResponse[DomicilioMapaResponse]:
+) -> RespuestaJSON:
     """
     Obtiene domicilios geocodificados con conteo de eventos.
 
@@ -310,8 +311,9 @@ async def get_domicilios_mapa(
         # Obtener fechas para este domicilio (ordenadas)
         fechas_dom = sorted(fechas_por_domicilio.get(row.id, []))
 
+        # Valores ya tipados por la BD: sin validación por item (hasta 100k)
         items.append(
-            DomicilioMapaItem(
+            DomicilioMapaItem.model_construct(
                 id=f"domicilio_{row.id}",
                 id_domicilio=row.id,
                 nombre=nombre,
@@ -337,4 +339,5 @@ async def get_domicilios_mapa(
         items=items, total=len(items), total_eventos=total_eventos_global
     )
 
-    return SuccessResponse(data=response_data)
+    # Serializada acá: FastAPI no vuelve a validar los items
+    return RespuestaJSON(SuccessResponse(data=response_data))
@@ -15,6 +15,7 @@ from sqlalchemy.orm import selectinload
 from sqlmodel import col
 
 from app.core.database import get_async_session
+from app.core.responses import RespuestaJSON
 from app.core.schemas.response import SuccessResponse
 from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
@@ -26,7 +27,10 @@ from app.domains.vigilancia_nominal.models.sujetos import (
     Animal,
     Ciudadano,
 )
-from app.domains.vigilancia_nominal.queries import CasoEpidemiologicoQueryBuilder
+from app.domains.vigilancia_nominal.queries import (
+    CasoEpidemiologicoQueryBuilder,
+    ranking_busqueda_caso,
+)
 
 
 class CasoEpidemiologicoSortBy(str, Enum):
@@ -169,7 +173,7 @@ async def list_eventos(
     # DB and Auth
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(RequireAnyRole()),
-) -> SuccessResponse[CasoEpidemiologicoListResponse]:
+) -> RespuestaJSON:
     """
     Lista eventos epidemiológicos con filtros y paginación.
 
@@ -235,6 +239,10 @@ async def list_eventos(
             selectinload(CasoEpidemiologico.vacunas),
         )
 
+        # Con búsqueda, primero los más relevantes (sort_by desempata)
+        if search:
+            query = query.order_by(desc(ranking_busqueda_caso(search)))
+
         # Aplicar ordenamiento
         if sort_by == CasoEpidemiologicoSortBy.FECHA_DESC:
             query = query.order_by(desc(col(CasoEpidemiologico.fecha_minima_caso)))
@@ -449,6 +457,18 @@ async def list_eventos(
                 )
 
                 # Aplicar mismo ordenamiento
+                if search:
+                    query = (
+                        query.outerjoin(
+                            Ciudadano,
+                            col(CasoEpidemiologico.codigo_ciudadano)
+                            == col(Ciudadano.codigo_ciudadano),
+                        )
+                        .outerjoin(
+                            Animal, col(CasoEpidemiologico.id_animal) == col(Animal.id)
+                        )
+                        .order_by(desc(ranking_busqueda_caso(search)))
+                    )
                 if sort_by == CasoEpidemiologicoSortBy.FECHA_DESC:
                     query = query.order_by(
                         desc(col(CasoEpidemiologico.fecha_minima_caso))
@@ -601,7 +621,7 @@ async def list_eventos(
         logger.info(
             f"✅ Encontrados {len(eventos_list)} eventos de {stats.total} total"
         )
-        return SuccessResponse(data=response)
+        return RespuestaJSON(SuccessResponse(data=response))
 
     except Exception as e:
         logger.error(f"💥 Error listando eventos: {e!s}")
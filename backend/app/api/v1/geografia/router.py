@@ -10,14 +10,17 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_async_session
+from app.core.database import get_async_read_session
+from app.core.response_cache import cache_respuesta
+from app.core.responses import RespuestaJSON
 
 router = APIRouter(prefix="/geografia", tags=["Geografía"])
 
 
 @router.get("/provincias/geojson")
+@cache_respuesta("provincia")
 async def get_provincias_geojson(
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_async_read_session),
 ) -> dict[str, Any]:
     """
     Retorna todas las provincias como GeoJSON FeatureCollection.
@@ -67,11 +70,11 @@ async def get_provincias_geojson(
     }
 
 
-@router.get("/provincias/geojson-con-eventos")
+@router.get("/provincias/geojson-con-eventos", response_model=dict[str, Any])
 async def get_provincias_con_eventos(
     id_grupo: int | None = Query(None, description="Filtrar por grupo ENO"),
-    session: AsyncSession = Depends(get_async_session),
-) -> dict[str, Any]:
+    session: AsyncSession = Depends(get_async_read_session),
+) -> RespuestaJSON:
     """
     Retorna provincias con conteo de eventos para mapa coroplético.
 
@@ -147,20 +150,23 @@ async def get_provincias_con_eventos(
             }
         )
 
-    return {
-        "type": "FeatureCollection",
-        "features": features,
-        "metadata": {
-            "max_eventos": max_eventos,
-            "total_provincias": len(features),
-        },
-    }
+    return RespuestaJSON(
+        {
+            "type": "FeatureCollection",
+            "features": features,
+            "metadata": {
+                "max_eventos": max_eventos,
+                "total_provincias": len(features),
+            },
+        }
+    )
 
 
 @router.get("/departamentos/geojson")
+@cache_respuesta("departamento", "provincia")
 async def get_departamentos_geojson(
     id_provincia_indec: int | None = Query(None, description="Filtrar por provincia"),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_async_read_session),
 ) -> dict[str, Any]:
     """
     Retorna departamentos como GeoJSON FeatureCollection.
@@ -234,12 +240,12 @@ async def get_departamentos_geojson(
     }
 
 
-@router.get("/departamentos/geojson-con-eventos")
+@router.get("/departamentos/geojson-con-eventos", response_model=dict[str, Any])
 async def get_departamentos_con_eventos(
     id_provincia_indec: int | None = Query(None, description="Filtrar por provincia"),
     id_grupo: int | None = Query(None, description="Filtrar por grupo ENO"),
-    session: AsyncSession = Depends(get_async_session),
-) -> dict[str, Any]:
+    session: AsyncSession = Depends(get_async_read_session),
+) -> RespuestaJSON:
     """
     Retorna departamentos con conteo de eventos para mapa coroplético.
 
@@ -328,11 +334,13 @@ async def get_departamentos_con_eventos(
             }
         )
 
-    return {
-        "type": "FeatureCollection",
-        "features": features,
-        "metadata": {
-            "max_eventos": max_eventos,
-            "total_departamentos": len(features),
-        },
-    }
+    return RespuestaJSON(
+        {
+            "type": "FeatureCollection",
+            "features": features,
+            "metadata": {
+                "max_eventos": max_eventos,
+                "total_departamentos": len(features),
+            },
+        }
+    )
@@ -12,6 +12,7 @@ from sqlalchemy.orm import selectinload
 from sqlmodel import col
 
 from app.core.database import get_async_session
+from app.core.response_cache import cache_respuesta
 from app.core.schemas.response import PaginatedResponse, PaginationMeta
 from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
@@ -42,6 +43,7 @@ class GrupoDeEnfermedadesInfo(BaseModel):
 logger = logging.getLogger(__name__)
 
 
+@cache_respuesta("grupo_de_enfermedades", "enfermedad_grupo", "enfermedad")
 async def list_grupos_eno(
     page: int = Query(1, ge=1, description="Numero de pagina"),
     per_page: int = Query(20, ge=1, le=100, description="Elementos por pagina"),
@@ -7,13 +7,20 @@ boletines y BI explorer.
 
 from typing import Any, Self
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import Response
 from pydantic import BaseModel, Field, model_validator
 from sqlalchemy.orm import Session
 
-from app.core.database import get_session
+from app.core.database import get_read_session
 from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
+from app.domains.metricas.arrow import (
+    MEDIA_TYPE_ARROW_STREAM,
+    MEDIA_TYPE_PARQUET,
+    to_ipc_stream,
+    to_parquet,
+)
 from app.domains.metricas.criteria.base import Criterion
 from app.domains.metricas.criteria.evento import (
     AgenteCriterion,
@@ -26,10 +33,12 @@ from app.domains.metricas.schema import (  # Generado dinámicamente
     get_cube_schema,
     list_cubes,
 )
-from app.domains.metricas.service import MetricService
+from app.domains.metricas.service import MetricRequest, MetricService
 
 router = APIRouter(prefix="/metricas", tags=["metricas"])
 
+MAX_QUERIES_BATCH = 50
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SCHEMAS
@@ -187,6 +196,12 @@ class MetricDataRow(BaseModel):
     zona_brote: float | None = None
     corredor_valido: bool | None = None
 
+    # === Detección de aberraciones ===
+    esperado: float | None = None
+    estadistico: float | None = None
+    umbral: float | None = None
+    senal: bool | None = None
+
     # === Comparación ===
     delta_porcentaje: float | None = None
     tendencia: str | None = None
@@ -204,6 +219,31 @@ class MetricQueryResponse(BaseModel):
     metadata: MetricQueryMetadata
 
 
+class MetricBatchRequest(BaseModel):
+    """Request para varias queries de métricas en un solo llamado."""
+
+    queries: list[MetricQueryRequest] = Field(
+        ...,
+        description="Queries a ejecutar (se agrupan por source en un solo statement)",
+        min_length=1,
+        max_length=MAX_QUERIES_BATCH,
+    )
+
+
+class MetricBatchMetadata(BaseModel):
+    """Metadata del batch."""
+
+    total_queries: int
+    statements: int = Field(..., description="Statements SQL ejecutados")
+
+
+class MetricBatchResponse(BaseModel):
+    """Response del batch: un resultado por query, en el mismo orden."""
+
+    results: list[MetricQueryResponse]
+    metadata: MetricBatchMetadata
+
+
 # Tipos para corredor endémico
 class CorredorEndemicoRow(BaseModel):
     """Fila de datos de corredor endémico."""
@@ -292,7 +332,7 @@ def get_cube_detail(
 
 @router.get("/disponibles", response_model=MetricInfoResponse)
 def get_available_metrics(
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user: User = Depends(RequireAnyRole()),
 ) -> MetricInfoResponse:
     """
@@ -307,15 +347,35 @@ def get_available_metrics(
     )
 
 
-@router.post("/query", response_model=MetricQueryResponse)
+@router.post(
+    "/query",
+    response_model=MetricQueryResponse,
+    responses={
+        200: {
+            "content": {
+                MEDIA_TYPE_ARROW_STREAM: {},
+                MEDIA_TYPE_PARQUET: {},
+            },
+            "description": "JSON por defecto; Arrow IPC o Parquet según Accept",
+        }
+    },
+)
 def query_metric(
     request: MetricQueryRequest,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user: User = Depends(RequireAnyRole()),
-) -> MetricQueryResponse:
+    accept: str | None = Header(None),
+) -> MetricQueryResponse | Response:
     """
     Query unificado para cualquier métrica.
 
+    El formato de respuesta se negocia con el header ``Accept``:
+    - ``application/json`` (default): {columns, data, metadata}
+    - ``application/vnd.apache.arrow.stream``: Arrow IPC stream
+    - ``application/vnd.apache.parquet``: Parquet
+
+    En Arrow/Parquet la metadata viaja en el schema (clave ``metric_metadata``).
+
     Ejemplos de uso:
 
     1. Casos de ETI por semana en 2025:
@@ -357,11 +417,7 @@ def query_metric(
 
     # Parsear filtros a Criteria
     try:
-        # Para corredor endémico, expandir rango a múltiples años históricos
-        if request.compute == "corredor_endemico":
-            criteria = _parse_filters_for_corredor(request.filters)
-        else:
-            criteria = _parse_filters_to_criteria(request.filters)
+        criteria = _parse_request_criteria(request)
     except Exception as e:
         logger.error(f"❌ Error parseando filtros: {e}")
         raise HTTPException(status_code=400, detail=f"Error en filtros: {e!s}") from e
@@ -370,7 +426,7 @@ def query_metric(
     filters_dict = _filters_to_dict(request.filters)
 
     try:
-        result = service.query(
+        result = service.query_result(
             metric=request.metric,
             dimensions=request.dimensions,
             criteria=criteria,
@@ -384,7 +440,80 @@ def query_metric(
         logger.error(f"❌ NotImplementedError: {e}")
         raise HTTPException(status_code=501, detail=str(e)) from e
 
-    return MetricQueryResponse(**result)
+    formato = _negociar_formato(accept)
+    if formato == MEDIA_TYPE_ARROW_STREAM:
+        return Response(to_ipc_stream(result.to_arrow()), media_type=formato)
+    if formato == MEDIA_TYPE_PARQUET:
+        return Response(to_parquet(result.to_arrow()), media_type=formato)
+
+    return MetricQueryResponse(**result.to_dict())
+
+
+@router.post("/batch", response_model=MetricBatchResponse)
+def query_metric_batch(
+    request: MetricBatchRequest,
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(RequireAnyRole()),
+) -> MetricBatchResponse:
+    """
+    Ejecuta varias queries de métricas en un solo llamado.
+
+    Las queries sobre el mismo source (cubo) se compilan en un único statement
+    con GROUPING SETS, así totales y subtotales salen del mismo scan. Cada
+    query acepta los mismos campos que ``POST /metricas/query`` y los
+    resultados vuelven en el mismo orden.
+
+    Ejemplo (serie semanal + total por evento + total general):
+    ```json
+    {
+        "queries": [
+            {"metric": "casos_clinicos", "dimensions": ["SEMANA_EPIDEMIOLOGICA"], "filters": {...}},
+            {"metric": "casos_clinicos", "dimensions": ["TIPO_EVENTO"], "filters": {...}},
+            {"metric": "casos_clinicos", "dimensions": [], "filters": {...}}
+        ]
+    }
+    ```
+    """
+    import logging
+
+    logger = logging.getLogger(__name__)
+
+    logger.info(f"📊 Métrica batch: {len(request.queries)} queries")
+
+    service = MetricService(session)
+
+    requests: list[MetricRequest] = []
+    for i, query in enumerate(request.queries):
+        try:
+            criteria = _parse_request_criteria(query)
+        except Exception as e:
+            logger.error(f"❌ Error parseando filtros (query {i}): {e}")
+            raise HTTPException(
+                status_code=400, detail=f"Error en filtros (query {i}): {e!s}"
+            ) from e
+        requests.append(
+            MetricRequest(
+                metric=query.metric,
+                dimensions=query.dimensions,
+                criteria=criteria,
+                compute=query.compute,
+                filters=_filters_to_dict(query.filters),
+            )
+        )
+
+    try:
+        result = service.query_batch(requests)
+    except ValueError as e:
+        logger.error(f"❌ ValueError en batch: {e}")
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except NotImplementedError as e:
+        logger.error(f"❌ NotImplementedError: {e}")
+        raise HTTPException(status_code=501, detail=str(e)) from e
+
+    return MetricBatchResponse(
+        results=[MetricQueryResponse(**r) for r in result["results"]],
+        metadata=MetricBatchMetadata(**result["metadata"]),
+    )
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -392,6 +521,50 @@ def query_metric(
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
+FORMATOS_COLUMNARES = {
+    MEDIA_TYPE_ARROW_STREAM: MEDIA_TYPE_ARROW_STREAM,
+    MEDIA_TYPE_PARQUET: MEDIA_TYPE_PARQUET,
+    "application/x-parquet": MEDIA_TYPE_PARQUET,
+}
+
+
+def _negociar_formato(accept: str | None) -> str:
+    """
+    Elige el formato de respuesta según el header Accept.
+
+    Respeta los pesos ``q``; ante empate gana el primero listado. JSON es el
+    default (sin header, ``*/*`` o tipos no soportados).
+    """
+    candidatos: list[tuple[float, int, str]] = []
+    for i, rango in enumerate((accept or "").split(",")):
+        tipo, *params = [p.strip() for p in rango.split(";")]
+        calidad = 1.0
+        for param in params:
+            nombre, _, valor = param.partition("=")
+            if nombre.strip() == "q":
+                try:
+                    calidad = float(valor)
+                except ValueError:
+                    calidad = 0.0
+        tipo = tipo.lower()
+        if calidad <= 0:
+            continue
+        if tipo in FORMATOS_COLUMNARES:
+            candidatos.append((calidad, -i, FORMATOS_COLUMNARES[tipo]))
+        elif tipo in ("application/json", "application/*", "*/*"):
+            candidatos.append((calidad, -i, "application/json"))
+    if not candidatos:
+        return "application/json"
+    return max(candidatos)[2]
+
+
+def _parse_request_criteria(request: MetricQueryRequest) -> Criterion | None:
+    """Criteria de una query (el corredor endémico expande a años históricos)."""
+    if request.compute == "corredor_endemico":
+        return _parse_filters_for_corredor(request.filters)
+    return _parse_filters_to_criteria(request.filters)
+
+
 def _parse_filters_to_criteria(filters: MetricFilters) -> Criterion | None:
     """
     Convierte MetricFilters tipado a Criteria type-safe.
@@ -0,0 +1,220 @@
+"""
+Endpoints de revisión de ciudadanos posiblemente duplicados.
+
+Los candidatos los genera la vinculación de registros en cada ingesta
+(``app.domains.vigilancia_nominal.procesamiento.vinculacion``). Acá solo se
+listan y se marcan como confirmados o descartados; la fusión de los registros
+no se hace automáticamente.
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Any
+
+from fastapi import Depends, HTTPException, Path, Query, status
+from pydantic import BaseModel, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlmodel import col
+
+from app.core.database import get_async_session
+from app.core.pagination import (
+    InvalidCursorError,
+    KeysetColumn,
+    decode_cursor,
+    keyset_condition,
+    split_page,
+)
+from app.core.schemas.response import SuccessResponse
+from app.core.security import RequireAnyRole
+from app.domains.autenticacion.models import User
+from app.domains.vigilancia_nominal.models.sujetos import (
+    Ciudadano,
+    CiudadanoCandidatoFusion,
+    EstadoCandidatoFusion,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CiudadanoDuplicado(BaseModel):
+    """Datos de un ciudadano del par, para compararlos lado a lado"""
+
+    codigo_ciudadano: int = Field(..., description="Código del ciudadano")
+    nombre: str | None = Field(None, description="Nombre")
+    apellido: str | None = Field(None, description="Apellido")
+    documento: str | None = Field(None, description="Número de documento")
+    fecha_nacimiento: date | None = Field(None, description="Fecha de nacimiento")
+    sexo: str | None = Field(None, description="Sexo biológico")
+
+
+class CandidatoDuplicado(BaseModel):
+    """Par de ciudadanos que probablemente son la misma persona"""
+
+    id: int = Field(..., description="ID del candidato")
+    score: float = Field(..., description="Similitud ponderada (0 a 1)")
+    similitudes: dict[str, Any] | None = Field(None, description="Similitud por campo")
+    bloques: str | None = Field(None, description="Claves de bloqueo compartidas")
+    estado: EstadoCandidatoFusion = Field(..., description="Estado de la revisión")
+    fecha_revision: datetime | None = Field(None, description="Fecha de la revisión")
+    ciudadano_a: CiudadanoDuplicado
+    ciudadano_b: CiudadanoDuplicado
+
+
+class DuplicadosListResponse(BaseModel):
+    """Página de candidatos a duplicado"""
+
+    data: list[CandidatoDuplicado] = Field(..., description="Candidatos")
+    has_next: bool = Field(..., description="Si hay página siguiente")
+    next_cursor: str | None = Field(
+        None, description="Cursor para pedir la página siguiente (keyset)"
+    )
+
+
+class RevisarDuplicadoRequest(BaseModel):
+    """Resultado de la revisión manual de un par"""
+
+    estado: EstadoCandidatoFusion = Field(
+        ..., description="CONFIRMADO, DESCARTADO o PENDIENTE (deshacer)"
+    )
+
+
+def _ciudadano(row: Any, sufijo: str) -> CiudadanoDuplicado:
+    documento = getattr(row, f"numero_documento_{sufijo}")
+    sexo = getattr(row, f"sexo_{sufijo}")
+    return CiudadanoDuplicado(
+        codigo_ciudadano=getattr(row, f"codigo_ciudadano_{sufijo}"),
+        nombre=getattr(row, f"nombre_{sufijo}"),
+        apellido=getattr(row, f"apellido_{sufijo}"),
+        documento=str(documento) if documento else None,
+        fecha_nacimiento=getattr(row, f"fecha_nacimiento_{sufijo}"),
+        sexo=sexo.value if sexo else None,
+    )
+
+
+async def list_duplicados(
+    estado: EstadoCandidatoFusion = Query(
+        EstadoCandidatoFusion.PENDIENTE, description="Estado de revisión"
+    ),
+    score_min: float | None = Query(
+        None, ge=0, le=1, description="Score mínimo del par"
+    ),
+    page_size: int = Query(50, ge=1, le=200, description="Tamaño de página"),
+    cursor: str | None = Query(
+        None, description="Cursor de la página anterior (next_cursor)"
+    ),
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(RequireAnyRole()),
+) -> SuccessResponse[DuplicadosListResponse]:
+    """
+    Lista los pares candidatos a duplicado, de mayor a menor score.
+
+    Usa el índice (estado, score) y paginación por keyset.
+    """
+    candidato = CiudadanoCandidatoFusion
+    ciudadano_a = aliased(Ciudadano)
+    ciudadano_b = aliased(Ciudadano)
+
+    orden: list[KeysetColumn] = [
+        (col(candidato.score), True),
+        (col(candidato.id), True),
+    ]
+    query = (
+        select(
+            col(candidato.id),
+            col(candidato.score),
+            col(candidato.similitudes),
+            col(candidato.bloques),
+            col(candidato.estado),
+            col(candidato.fecha_revision),
+            *(
+                columna.label(f"{nombre}_{sufijo}")
+                for sufijo, ciudadano in (("a", ciudadano_a), ("b", ciudadano_b))
+                for nombre, columna in (
+                    ("codigo_ciudadano", ciudadano.codigo_ciudadano),
+                    ("nombre", ciudadano.nombre),
+                    ("apellido", ciudadano.apellido),
+                    ("numero_documento", ciudadano.numero_documento),
+                    ("fecha_nacimiento", ciudadano.fecha_nacimiento),
+                    ("sexo", ciudadano.sexo_biologico),
+                )
+            ),
+        )
+        .join(
+            ciudadano_a,
+            ciudadano_a.codigo_ciudadano == col(candidato.codigo_ciudadano_a),
+        )
+        .join(
+            ciudadano_b,
+            ciudadano_b.codigo_ciudadano == col(candidato.codigo_ciudadano_b),
+        )
+        .where(col(candidato.estado) == estado)
+        .order_by(col(candidato.score).desc(), col(candidato.id).desc())
+        .limit(page_size + 1)
+    )
+    if score_min is not None:
+        query = query.where(col(candidato.score) >= score_min)
+    if cursor:
+        try:
+            valores_cursor = decode_cursor(cursor, len(orden))
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            ) from e
+        query = query.where(keyset_condition(orden, valores_cursor))
+
+    rows, next_cursor = split_page((await db.execute(query)).all(), page_size, orden)
+
+    return SuccessResponse(
+        data=DuplicadosListResponse(
+            data=[
+                CandidatoDuplicado(
+                    id=row.id,
+                    score=row.score,
+                    similitudes=row.similitudes,
+                    bloques=row.bloques,
+                    estado=row.estado,
+                    fecha_revision=row.fecha_revision,
+                    ciudadano_a=_ciudadano(row, "a"),
+                    ciudadano_b=_ciudadano(row, "b"),
+                )
+                for row in rows
+            ],
+            has_next=next_cursor is not None,
+            next_cursor=next_cursor,
+        )
+    )
+
+
+async def revisar_duplicado(
+    request: RevisarDuplicadoRequest,
+    candidato_id: int = Path(..., description="ID del candidato"),
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(RequireAnyRole()),
+) -> SuccessResponse[dict]:
+    """
+    Registra la revisión manual de un par.
+
+    Los pares revisados no se vuelven a proponer ni se actualizan en las
+    ingestas siguientes; volver a PENDIENTE deshace la revisión.
+    """
+    candidato = await db.get(CiudadanoCandidatoFusion, candidato_id)
+    if not candidato:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Candidato {candidato_id} no encontrado",
+        )
+
+    pendiente = request.estado == EstadoCandidatoFusion.PENDIENTE
+    candidato.estado = request.estado
+    candidato.id_usuario_revision = None if pendiente else current_user.id
+    candidato.fecha_revision = None if pendiente else datetime.now()
+    await db.commit()
+
+    logger.info(
+        f"🔗 Candidato a duplicado {candidato_id} marcado {request.estado.value} "
+        f"por user_id={current_user.id}"
+    )
+
+    return SuccessResponse(data={"id": candidato_id, "estado": request.estado.value})
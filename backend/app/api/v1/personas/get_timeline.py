@@ -1,30 +1,84 @@
 """
 Get persona timeline endpoint - Vista PERSON-CENTERED
 Timeline completo de TODOS los eventos y actividades de una persona.
+
+El timeline se arma en PostgreSQL con un ``UNION ALL`` sobre los casos y sus
+tablas hijas (síntomas, muestras, diagnósticos, vacunas, tratamientos,
+internaciones, investigaciones), proyectando solo los campos del timeline.
+El orden, los filtros por tipo y la paginación por keyset se resuelven en la
+misma query, junto con los datos de la persona y los totales: cada página es
+una sola ida y vuelta a la BD sin importar el largo de la historia.
 """
 
 import logging
 from datetime import date
+from enum import StrEnum
 from typing import Any
 
-from fastapi import Depends, HTTPException, Path, status
+from fastapi import Depends, HTTPException, Path, Query, status
 from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import select
+from sqlalchemy import (
+    Boolean,
+    Row,
+    Select,
+    String,
+    cast,
+    func,
+    literal,
+    null,
+    select,
+    true,
+    union_all,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.expression import CTE
 from sqlmodel import col
 
 from app.core.database import get_async_session
+from app.core.pagination import (
+    InvalidCursorError,
+    KeysetColumn,
+    decode_cursor,
+    keyset_condition,
+    split_page,
+)
 from app.core.schemas.response import SuccessResponse
 from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
+from app.domains.vigilancia_nominal.models.atencion import (
+    DiagnosticoCasoEpidemiologico,
+    InternacionCasoEpidemiologico,
+    InvestigacionCasoEpidemiologico,
+    TratamientoCasoEpidemiologico,
+)
 from app.domains.vigilancia_nominal.models.caso import (
     CasoEpidemiologico,
     DetalleCasoSintomas,
 )
+from app.domains.vigilancia_nominal.models.enfermedad import Enfermedad
+from app.domains.vigilancia_nominal.models.salud import (
+    Muestra,
+    MuestraCasoEpidemiologico,
+    Sintoma,
+    Vacuna,
+    VacunasCiudadano,
+)
 from app.domains.vigilancia_nominal.models.sujetos import Animal, Ciudadano
 
 
+class TipoItemTimeline(StrEnum):
+    """Tipos de item del timeline"""
+
+    EVENTO = "evento"
+    SINTOMA = "sintoma"
+    MUESTRA = "muestra"
+    DIAGNOSTICO = "diagnostico"
+    VACUNA = "vacuna"
+    TRATAMIENTO = "tratamiento"
+    INTERNACION = "internacion"
+    INVESTIGACION = "investigacion"
+
+
 class TimelineItem(BaseModel):
     """Item individual en el timeline de la persona"""
 
@@ -63,36 +117,446 @@ class PersonaTimelineResponse(BaseModel):
     tipo_sujeto: str = Field(..., description="Tipo: humano/animal")
     nombre_completo: str = Field(..., description="Nombre de la persona")
 
-    # Timeline completo ordenado cronológicamente
+    # Página del timeline ordenada cronológicamente (más reciente primero)
     items: list[TimelineItem] = Field(
         default_factory=list, description="Items del timeline ordenados por fecha"
     )
 
-    # Metadatos
+    # Metadatos (sobre todo el timeline filtrado, no solo la página)
     fecha_inicio: date | None = Field(None, description="Fecha del primer item")
     fecha_fin: date | None = Field(None, description="Fecha del último item")
     total_items: int = Field(..., description="Total de items en el timeline")
     total_eventos: int = Field(..., description="Total de eventos")
 
+    # Paginación por keyset
+    has_next: bool = Field(default=False, description="Si hay página siguiente")
+    next_cursor: str | None = Field(
+        None, description="Cursor para pedir la página siguiente"
+    )
+
     model_config = ConfigDict(from_attributes=True)
 
 
 logger = logging.getLogger(__name__)
 
 
+# =============================================================================
+# QUERY
+# =============================================================================
+
+
+def _casos_persona(tipo_sujeto: str, persona_id: int) -> CTE:
+    """Casos de la persona con los campos que usa el timeline."""
+    if tipo_sujeto == "humano":
+        filtro = col(CasoEpidemiologico.codigo_ciudadano) == persona_id
+    else:
+        filtro = col(CasoEpidemiologico.id_animal) == persona_id
+
+    return (
+        select(
+            col(CasoEpidemiologico.id).label("id"),
+            col(CasoEpidemiologico.id_snvs).label("id_snvs"),
+            col(CasoEpidemiologico.fecha_minima_caso).label("fecha"),
+            col(CasoEpidemiologico.fecha_minima_caso_anio_epi).label("anio_epi"),
+            cast(col(CasoEpidemiologico.clasificacion_estrategia), String).label(
+                "clasificacion"
+            ),
+            col(CasoEpidemiologico.confidence_score).label("confidence_score"),
+            func.coalesce(
+                col(Enfermedad.nombre),
+                func.concat("Tipo ", col(CasoEpidemiologico.id_enfermedad)),
+            ).label("evento_tipo"),
+        )
+        .outerjoin(
+            Enfermedad, col(Enfermedad.id) == col(CasoEpidemiologico.id_enfermedad)
+        )
+        .where(filtro)
+        .cte("casos_persona")
+    )
+
+
+def _rama(
+    tipo: TipoItemTimeline,
+    casos: CTE,
+    fecha: Any,
+    item_id: Any,
+    nombre: Any = None,
+    valor: Any = None,
+    marca_1: Any = None,
+    marca_2: Any = None,
+) -> Select[Any]:
+    """SELECT de un tipo de item con las columnas comunes del UNION ALL."""
+    return select(
+        literal(tipo.value, String).label("tipo"),
+        fecha.label("fecha"),
+        item_id.label("item_id"),
+        casos.c.id.label("evento_id"),
+        (cast(null(), String) if nombre is None else nombre).label("nombre"),
+        (cast(null(), String) if valor is None else valor).label("valor"),
+        (cast(null(), Boolean) if marca_1 is None else marca_1).label("marca_1"),
+        (cast(null(), Boolean) if marca_2 is None else marca_2).label("marca_2"),
+    )
+
+
+def _ramas(casos: CTE, tipos: set[TipoItemTimeline]) -> list[Select[Any]]:
+    """Un SELECT por tipo pedido (los tipos filtrados ni se consultan)."""
+    fecha_caso = casos.c.fecha
+    ramas: list[Select[Any]] = []
+
+    if TipoItemTimeline.EVENTO in tipos:
+        ramas.append(_rama(TipoItemTimeline.EVENTO, casos, fecha_caso, casos.c.id))
+
+    if TipoItemTimeline.SINTOMA in tipos:
+        ramas.append(
+            _rama(
+                TipoItemTimeline.SINTOMA,
+                casos,
+                func.coalesce(
+                    col(DetalleCasoSintomas.fecha_inicio_sintoma), fecha_caso
+                ),
+                col(DetalleCasoSintomas.id),
+                nombre=col(Sintoma.signo_sintoma),
+            )
+            .join(
+                DetalleCasoSintomas,
+                (col(DetalleCasoSintomas.id_caso) == casos.c.id)
+                & (col(DetalleCasoSintomas.anio_epi_caso) == casos.c.anio_epi),
+            )
+            .outerjoin(Sintoma, col(Sintoma.id) == col(DetalleCasoSintomas.id_sintoma))
+        )
+
+    if TipoItemTimeline.MUESTRA in tipos:
+        ramas.append(
+            _rama(
+                TipoItemTimeline.MUESTRA,
+                casos,
+                func.coalesce(
+                    col(MuestraCasoEpidemiologico.fecha_toma_muestra), fecha_caso
+                ),
+                col(MuestraCasoEpidemiologico.id),
+                nombre=col(Muestra.descripcion),
+                valor=col(MuestraCasoEpidemiologico.valor),
+            )
+            .join(
+                MuestraCasoEpidemiologico,
+                (col(MuestraCasoEpidemiologico.id_caso) == casos.c.id)
+                & (col(MuestraCasoEpidemiologico.anio_epi_caso) == casos.c.anio_epi),
+            )
+            .outerjoin(
+                Muestra, col(Muestra.id) == col(MuestraCasoEpidemiologico.id_muestra)
+            )
+        )
+
+    if TipoItemTimeline.DIAGNOSTICO in tipos:
+        ramas.append(
+            _rama(
+                TipoItemTimeline.DIAGNOSTICO,
+                casos,
+                func.coalesce(
+                    col(DiagnosticoCasoEpidemiologico.fecha_diagnostico_referido),
+                    fecha_caso,
+                ),
+                col(DiagnosticoCasoEpidemiologico.id),
+                nombre=func.coalesce(
+                    col(DiagnosticoCasoEpidemiologico.diagnostico_referido),
+                    col(DiagnosticoCasoEpidemiologico.clasificacion_manual),
+                ),
+            ).join(
+                DiagnosticoCasoEpidemiologico,
+                (col(DiagnosticoCasoEpidemiologico.id_caso) == casos.c.id)
+                & (
+                    col(DiagnosticoCasoEpidemiologico.anio_epi_caso) == casos.c.anio_epi
+                ),
+            )
+        )
+
+    if TipoItemTimeline.VACUNA in tipos:
+        ramas.append(
+            _rama(
+                TipoItemTimeline.VACUNA,
+                casos,
+                func.coalesce(col(VacunasCiudadano.fecha_aplicacion), fecha_caso),
+                col(VacunasCiudadano.id),
+                nombre=col(Vacuna.nombre),
+                valor=col(VacunasCiudadano.dosis),
+            )
+            .join(VacunasCiudadano, col(VacunasCiudadano.id_caso) == casos.c.id)
+            .outerjoin(Vacuna, col(Vacuna.id) == col(VacunasCiudadano.id_vacuna))
+        )
+
+    if TipoItemTimeline.TRATAMIENTO in tipos:
+        ramas.append(
+            _rama(
+                TipoItemTimeline.TRATAMIENTO,
+                casos,
+                func.coalesce(
+                    col(TratamientoCasoEpidemiologico.fecha_inicio_tratamiento),
+                    fecha_caso,
+                ),
+                col(TratamientoCasoEpidemiologico.id),
+                valor=col(TratamientoCasoEpidemiologico.descripcion_tratamiento),
+            ).join(
+                TratamientoCasoEpidemiologico,
+                col(TratamientoCasoEpidemiologico.id_caso) == casos.c.id,
+            )
+        )
+
+    if TipoItemTimeline.INTERNACION in tipos:
+        ramas.append(
+            _rama(
+                TipoItemTimeline.INTERNACION,
+                casos,
+                func.coalesce(
+                    col(InternacionCasoEpidemiologico.fecha_internacion), fecha_caso
+                ),
+                col(InternacionCasoEpidemiologico.id),
+                marca_1=col(InternacionCasoEpidemiologico.requirio_cuidado_intensivo),
+                marca_2=col(InternacionCasoEpidemiologico.es_fallecido),
+            ).join(
+                InternacionCasoEpidemiologico,
+                col(InternacionCasoEpidemiologico.id_caso) == casos.c.id,
+            )
+        )
+
+    if TipoItemTimeline.INVESTIGACION in tipos:
+        ramas.append(
+            _rama(
+                TipoItemTimeline.INVESTIGACION,
+                casos,
+                func.coalesce(
+                    col(InvestigacionCasoEpidemiologico.fecha_investigacion),
+                    fecha_caso,
+                ),
+                col(InvestigacionCasoEpidemiologico.id),
+                marca_1=col(InvestigacionCasoEpidemiologico.es_investigacion_terreno),
+            ).join(
+                InvestigacionCasoEpidemiologico,
+                col(InvestigacionCasoEpidemiologico.id_caso) == casos.c.id,
+            )
+        )
+
+    return ramas
+
+
+def _persona(tipo_sujeto: str, persona_id: int) -> Any:
+    """Subquery de una fila con el nombre de la persona (vacía si no existe)."""
+    if tipo_sujeto == "humano":
+        nombre = func.coalesce(
+            func.nullif(
+                func.concat_ws(" ", col(Ciudadano.nombre), col(Ciudadano.apellido)),
+                "",
+            ),
+            "Sin nombre",
+        )
+        filtro = col(Ciudadano.codigo_ciudadano) == persona_id
+    else:
+        nombre = func.coalesce(
+            col(Animal.identificacion),
+            func.concat(col(Animal.especie), " #", col(Animal.id)),
+        )
+        filtro = col(Animal.id) == persona_id
+    return select(nombre.label("nombre_completo")).where(filtro).subquery("persona")
+
+
+def _query_timeline(
+    tipo_sujeto: str,
+    persona_id: int,
+    tipos: set[TipoItemTimeline],
+    valores_cursor: list[Any] | None,
+    page_size: int,
+) -> tuple[Select[Any], list[KeysetColumn]]:
+    """
+    Query de una página del timeline con persona y totales.
+
+    Devuelve una fila por item de la página (más una para saber si hay
+    siguiente). Si la persona existe pero la página está vacía devuelve una
+    sola fila con las columnas del item en NULL; si no existe, ninguna.
+    """
+    casos = _casos_persona(tipo_sujeto, persona_id)
+    items = union_all(*_ramas(casos, tipos)).subquery("items")
+    timeline = select(items).where(items.c.fecha.is_not(None)).cte("timeline")
+
+    orden: list[KeysetColumn] = [
+        (timeline.c.fecha, True),
+        (timeline.c.tipo, True),
+        (timeline.c.item_id, True),
+    ]
+    pagina_query = (
+        select(timeline)
+        .order_by(*(columna.desc() for columna, _ in orden))
+        .limit(page_size + 1)
+    )
+    if valores_cursor is not None:
+        pagina_query = pagina_query.where(keyset_condition(orden, valores_cursor))
+    pagina = pagina_query.subquery("pagina")
+
+    totales = select(
+        func.count().label("total_items"),
+        func.min(timeline.c.fecha).label("fecha_inicio"),
+        func.max(timeline.c.fecha).label("fecha_fin"),
+    ).subquery("totales")
+    total_eventos = select(func.count()).select_from(casos).scalar_subquery()
+    persona = _persona(tipo_sujeto, persona_id)
+
+    query = (
+        select(
+            persona.c.nombre_completo,
+            totales.c.total_items,
+            totales.c.fecha_inicio,
+            totales.c.fecha_fin,
+            total_eventos.label("total_eventos"),
+            pagina.c.tipo,
+            pagina.c.fecha,
+            pagina.c.item_id,
+            pagina.c.evento_id,
+            pagina.c.nombre,
+            pagina.c.valor,
+            pagina.c.marca_1,
+            pagina.c.marca_2,
+            casos.c.id_snvs,
+            casos.c.clasificacion,
+            casos.c.confidence_score,
+            casos.c.evento_tipo,
+        )
+        .select_from(
+            persona.join(totales, true())
+            .outerjoin(pagina, true())
+            .outerjoin(casos, casos.c.id == pagina.c.evento_id)
+        )
+        .order_by(pagina.c.fecha.desc(), pagina.c.tipo.desc(), pagina.c.item_id.desc())
+    )
+    return query, orden
+
+
+# =============================================================================
+# ITEMS
+# =============================================================================
+
+
+def _item(row: Row[Any]) -> TimelineItem:
+    """Construye el item del timeline a partir de su fila."""
+    evento_tipo = row.evento_tipo
+    comunes: dict[str, Any] = {
+        "tipo": row.tipo,
+        "fecha": row.fecha,
+        "evento_id": row.evento_id,
+        "evento_tipo": evento_tipo,
+    }
+    relacionado = f"Relacionado con evento {evento_tipo}"
+
+    if row.tipo == TipoItemTimeline.EVENTO:
+        es_critico = row.clasificacion == "CONFIRMADOS"
+        return TimelineItem(
+            **comunes,
+            titulo=f"CasoEpidemiologico {evento_tipo}",
+            descripcion=f"Caso #{row.id_snvs} - {row.clasificacion or 'Sin clasificar'}",
+            detalles={
+                "id_evento_caso": row.id_snvs,
+                "clasificacion": row.clasificacion,
+                "confidence_score": row.confidence_score,
+            },
+            clasificacion=row.clasificacion,
+            es_critico=es_critico,
+            icono="alert-circle" if es_critico else "activity",
+            color="red" if es_critico else "blue",
+        )
+
+    if row.tipo == TipoItemTimeline.SINTOMA:
+        return TimelineItem(
+            **comunes,
+            titulo=f"Síntoma: {row.nombre or 'Síntoma no especificado'}",
+            descripcion=relacionado,
+            icono="heart",
+            color="red",
+        )
+
+    if row.tipo == TipoItemTimeline.MUESTRA:
+        tipo_muestra = row.nombre or "Muestra"
+        return TimelineItem(
+            **comunes,
+            titulo=f"Muestra: {tipo_muestra}",
+            descripcion=f"Resultado: {row.valor}" if row.valor else "Pendiente",
+            detalles={"tipo": tipo_muestra, "resultado": row.valor},
+            icono="test-tube",
+            color="purple",
+            es_critico=row.valor == "Positivo",
+        )
+
+    if row.tipo == TipoItemTimeline.DIAGNOSTICO:
+        return TimelineItem(
+            **comunes,
+            titulo=f"Diagnóstico: {row.nombre or 'Diagnóstico'}",
+            descripcion=relacionado,
+            icono="stethoscope",
+            color="green",
+        )
+
+    if row.tipo == TipoItemTimeline.VACUNA:
+        nombre_vacuna = row.nombre or "Vacuna"
+        return TimelineItem(
+            **comunes,
+            titulo=f"Vacuna: {nombre_vacuna}",
+            descripcion=relacionado,
+            detalles={"nombre": nombre_vacuna, "dosis": row.valor},
+            icono="syringe",
+            color="indigo",
+        )
+
+    if row.tipo == TipoItemTimeline.TRATAMIENTO:
+        return TimelineItem(
+            **comunes,
+            titulo="Tratamiento",
+            descripcion=row.valor or "Tratamiento",
+            icono="pill",
+            color="orange",
+        )
+
+    if row.tipo == TipoItemTimeline.INTERNACION:
+        requirio_uci = bool(row.marca_1)
+        es_fallecido = bool(row.marca_2)
+        return TimelineItem(
+            **comunes,
+            titulo="Internación" + (" (UCI)" if requirio_uci else ""),
+            descripcion="Resultado mortal"
+            if es_fallecido
+            else "Internación hospitalaria",
+            detalles={"requirio_uci": requirio_uci, "es_fallecido": es_fallecido},
+            icono="building",
+            color="red" if requirio_uci or es_fallecido else "yellow",
+            es_critico=requirio_uci or es_fallecido,
+        )
+
+    # Investigación
+    return TimelineItem(
+        **comunes,
+        titulo="Investigación de terreno" if row.marca_1 else "Investigación",
+        descripcion=f"Investigación epidemiológica - CasoEpidemiologico {evento_tipo}",
+        icono="search",
+        color="teal",
+    )
+
+
 async def get_persona_timeline(
     tipo_sujeto: str = Path(..., description="Tipo de sujeto: humano o animal"),
     persona_id: int = Path(..., description="ID de la persona"),
+    tipos: list[TipoItemTimeline] | None = Query(
+        None, description="Tipos de item a incluir (default: todos)"
+    ),
+    page_size: int = Query(100, ge=10, le=500, description="Items por página"),
+    cursor: str | None = Query(
+        None, description="Cursor de la página anterior (next_cursor)"
+    ),
     db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(RequireAnyRole()),
 ) -> SuccessResponse[PersonaTimelineResponse]:
     """
-    Obtiene el timeline completo de una persona.
+    Obtiene el timeline de una persona, paginado.
 
     **Vista PERSON-CENTERED:**
     - Timeline unificado de TODOS los eventos de la persona
     - Incluye eventos, síntomas, muestras, diagnósticos, vacunas, internaciones
-    - Ordenado cronológicamente
+    - Ordenado cronológicamente (más reciente primero)
+    - Filtrable por tipo de item y paginado por cursor
     - Ideal para visualización de historia clínica/epidemiológica
 
     **Casos de uso:**
@@ -106,343 +570,64 @@ async def get_persona_timeline(
         f"📅 Obteniendo timeline de persona {tipo_sujeto}/{persona_id} para usuario {current_user.email}"
     )
 
-    try:
-        # Verificar que la persona existe
-        nombre_completo = ""
-        if tipo_sujeto == "humano":
-            query = select(Ciudadano).where(
-                col(Ciudadano.codigo_ciudadano) == persona_id
-            )
-            result = await db.execute(query)
-            persona = result.scalar_one_or_none()
-            if not persona:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Ciudadano {persona_id} no encontrado",
-                )
-            nombre_completo = (
-                f"{persona.nombre or ''} {persona.apellido or ''}".strip()
-                or "Sin nombre"
-            )
+    if tipo_sujeto not in ("humano", "animal"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="tipo_sujeto debe ser 'humano' o 'animal'",
+        )
 
-        elif tipo_sujeto == "animal":
-            query = select(Animal).where(col(Animal.id) == persona_id)
-            result = await db.execute(query)
-            persona = result.scalar_one_or_none()
-            if not persona:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Animal {persona_id} no encontrado",
-                )
-            nombre_completo = (
-                persona.identificacion or f"{persona.especie} #{persona.id}"
-            )
-        else:
+    valores_cursor = None
+    if cursor:
+        try:
+            valores_cursor = decode_cursor(cursor, 3)
+        except InvalidCursorError as e:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="tipo_sujeto debe ser 'humano' o 'animal'",
-            )
-
-        # Obtener TODOS los eventos de la persona con TODAS sus relaciones
-        if tipo_sujeto == "humano":
-            eventos_query = (
-                select(CasoEpidemiologico)
-                .where(col(CasoEpidemiologico.codigo_ciudadano) == persona_id)
-                .options(
-                    selectinload(
-                        CasoEpidemiologico.enfermedad
-                    ),  # Cambiado de tipo_eno a enfermedad
-                    selectinload(CasoEpidemiologico.sintomas).selectinload(
-                        DetalleCasoSintomas.sintoma
-                    ),
-                    selectinload(CasoEpidemiologico.muestras),
-                    selectinload(CasoEpidemiologico.diagnosticos),
-                    selectinload(CasoEpidemiologico.vacunas),
-                    selectinload(CasoEpidemiologico.tratamientos),
-                    selectinload(CasoEpidemiologico.internaciones),
-                    selectinload(CasoEpidemiologico.investigaciones),
-                    selectinload(CasoEpidemiologico.contactos),
-                    selectinload(CasoEpidemiologico.antecedentes),
-                    selectinload(CasoEpidemiologico.ambitos_concurrencia),
-                )
-            )
-        else:  # animal
-            eventos_query = (
-                select(CasoEpidemiologico)
-                .where(col(CasoEpidemiologico.id_animal) == persona_id)
-                .options(
-                    selectinload(
-                        CasoEpidemiologico.enfermedad
-                    ),  # Cambiado de tipo_eno a enfermedad
-                    selectinload(CasoEpidemiologico.sintomas).selectinload(
-                        DetalleCasoSintomas.sintoma
-                    ),
-                    selectinload(CasoEpidemiologico.muestras),
-                    selectinload(CasoEpidemiologico.diagnosticos),
-                    selectinload(CasoEpidemiologico.vacunas),
-                    selectinload(CasoEpidemiologico.tratamientos),
-                    selectinload(CasoEpidemiologico.internaciones),
-                    selectinload(CasoEpidemiologico.investigaciones),
-                    selectinload(CasoEpidemiologico.contactos),
-                    selectinload(CasoEpidemiologico.antecedentes),
-                    selectinload(CasoEpidemiologico.ambitos_concurrencia),
-                )
-            )
-
-        result = await db.execute(eventos_query)
-        eventos = result.scalars().all()
-
-        # Construir timeline con TODOS los items
-        timeline_items = []
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            ) from e
 
-        for evento in eventos:
-            evento_tipo_nombre = (
-                evento.enfermedad.nombre
-                if evento.enfermedad
-                else f"Tipo {evento.id_enfermedad}"  # Cambiado de tipo_eno a enfermedad
-            )
+    try:
+        query, orden = _query_timeline(
+            tipo_sujeto,
+            persona_id,
+            set(tipos) if tipos else set(TipoItemTimeline),
+            valores_cursor,
+            page_size,
+        )
+        rows = (await db.execute(query)).all()
 
-            # 1. Item del evento principal
-            es_critico_evento = evento.clasificacion_estrategia == "CONFIRMADOS"
-            fecha_evento = evento.fecha_minima_caso
-            if fecha_evento is None:
-                continue  # Skip eventos without date
-            timeline_items.append(
-                TimelineItem(
-                    tipo="evento",
-                    fecha=fecha_evento,
-                    titulo=f"CasoEpidemiologico {evento_tipo_nombre}",
-                    descripcion=(
-                        f"Caso #{evento.id_snvs} - "  # Cambiado de id_evento_caso a id_snvs
-                        f"{evento.clasificacion_estrategia or 'Sin clasificar'}"
-                    ),
-                    detalles={
-                        "id_evento_caso": evento.id_snvs,  # Cambiado de id_evento_caso a id_snvs
-                        "clasificacion": evento.clasificacion_estrategia,
-                        "confidence_score": evento.confidence_score,
-                    },
-                    evento_id=evento.id,
-                    evento_tipo=evento_tipo_nombre,
-                    clasificacion=evento.clasificacion_estrategia,
-                    es_critico=es_critico_evento,
-                    icono="activity" if not es_critico_evento else "alert-circle",
-                    color="blue" if not es_critico_evento else "red",
-                )
+        if not rows:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=(
+                    f"Ciudadano {persona_id} no encontrado"
+                    if tipo_sujeto == "humano"
+                    else f"Animal {persona_id} no encontrado"
+                ),
             )
 
-            # 2. Síntomas del evento
-            for sintoma_detalle in evento.sintomas or []:
-                fecha_sintoma = (
-                    sintoma_detalle.fecha_inicio_sintoma or evento.fecha_minima_caso
-                )
-                if fecha_sintoma is None:
-                    continue  # Skip sintomas without date
-                sintoma_nombre = (
-                    sintoma_detalle.sintoma.signo_sintoma
-                    if hasattr(sintoma_detalle, "sintoma") and sintoma_detalle.sintoma
-                    else "Síntoma no especificado"
-                )
-                timeline_items.append(
-                    TimelineItem(
-                        tipo="sintoma",
-                        fecha=fecha_sintoma,
-                        titulo=f"Síntoma: {sintoma_nombre}",
-                        descripcion=f"Relacionado con evento {evento_tipo_nombre}",
-                        evento_id=evento.id,
-                        evento_tipo=evento_tipo_nombre,
-                        icono="heart",
-                        color="red",
-                    )
-                )
-
-            # 3. Muestras del evento
-            for muestra in evento.muestras or []:
-                fecha_muestra = (
-                    getattr(muestra, "fecha_toma_muestra", None)
-                    or evento.fecha_minima_caso
-                )
-                if fecha_muestra is None:
-                    continue  # Skip muestras without date
-                tipo_muestra = getattr(muestra, "tipo_muestra", "Muestra")
-                resultado = getattr(muestra, "resultado", None)
-
-                timeline_items.append(
-                    TimelineItem(
-                        tipo="muestra",
-                        fecha=fecha_muestra,
-                        titulo=f"Muestra: {tipo_muestra}",
-                        descripcion=(
-                            f"Resultado: {resultado}" if resultado else "Pendiente"
-                        ),
-                        detalles={
-                            "tipo": tipo_muestra,
-                            "resultado": resultado,
-                        },
-                        evento_id=evento.id,
-                        evento_tipo=evento_tipo_nombre,
-                        icono="test-tube",
-                        color="purple",
-                        es_critico=resultado == "Positivo" if resultado else False,
-                    )
-                )
-
-            # 4. Diagnósticos del evento
-            for diagnostico in evento.diagnosticos or []:
-                fecha_diagnostico = (
-                    getattr(diagnostico, "fecha_diagnostico", None)
-                    or evento.fecha_minima_caso
-                )
-                if fecha_diagnostico is None:
-                    continue  # Skip diagnosticos without date
-                metodo = getattr(diagnostico, "metodo_diagnostico", "Diagnóstico")
-
-                timeline_items.append(
-                    TimelineItem(
-                        tipo="diagnostico",
-                        fecha=fecha_diagnostico,
-                        titulo=f"Diagnóstico: {metodo}",
-                        descripcion=f"Relacionado con evento {evento_tipo_nombre}",
-                        evento_id=evento.id,
-                        evento_tipo=evento_tipo_nombre,
-                        icono="stethoscope",
-                        color="green",
-                    )
-                )
-
-            # 5. Vacunas del evento
-            for vacuna in evento.vacunas or []:
-                fecha_vacuna = (
-                    getattr(vacuna, "fecha_ultima_dosis", None)
-                    or evento.fecha_minima_caso
-                )
-                if fecha_vacuna is None:
-                    continue  # Skip vacunas without date
-                nombre_vacuna = getattr(vacuna, "nombre_vacuna", "Vacuna")
-
-                timeline_items.append(
-                    TimelineItem(
-                        tipo="vacuna",
-                        fecha=fecha_vacuna,
-                        titulo=f"Vacuna: {nombre_vacuna}",
-                        descripcion=f"Relacionado con evento {evento_tipo_nombre}",
-                        detalles={
-                            "nombre": nombre_vacuna,
-                            "dosis": getattr(vacuna, "dosis_total", None),
-                        },
-                        evento_id=evento.id,
-                        evento_tipo=evento_tipo_nombre,
-                        icono="syringe",
-                        color="indigo",
-                    )
-                )
-
-            # 6. Tratamientos del evento
-            for tratamiento in evento.tratamientos or []:
-                fecha_tratamiento = (
-                    getattr(tratamiento, "fecha_inicio_tratamiento", None)
-                    or evento.fecha_minima_caso
-                )
-                if fecha_tratamiento is None:
-                    continue  # Skip tratamientos without date
-                descripcion_tratamiento = getattr(
-                    tratamiento, "descripcion_tratamiento", "Tratamiento"
-                )
-
-                timeline_items.append(
-                    TimelineItem(
-                        tipo="tratamiento",
-                        fecha=fecha_tratamiento,
-                        titulo="Tratamiento",
-                        descripcion=descripcion_tratamiento,
-                        evento_id=evento.id,
-                        evento_tipo=evento_tipo_nombre,
-                        icono="pill",
-                        color="orange",
-                    )
-                )
-
-            # 7. Internaciones del evento
-            for internacion in evento.internaciones or []:
-                fecha_internacion = (
-                    getattr(internacion, "fecha_internacion", None)
-                    or evento.fecha_minima_caso
-                )
-                if fecha_internacion is None:
-                    continue  # Skip internaciones without date
-                requirio_uci = getattr(internacion, "requirio_uci", False)
-                es_fallecido = getattr(internacion, "es_fallecido", False)
-
-                timeline_items.append(
-                    TimelineItem(
-                        tipo="internacion",
-                        fecha=fecha_internacion,
-                        titulo="Internación" + (" (UCI)" if requirio_uci else ""),
-                        descripcion=(
-                            "Resultado mortal"
-                            if es_fallecido
-                            else "Internación hospitalaria"
-                        ),
-                        detalles={
-                            "requirio_uci": requirio_uci,
-                            "es_fallecido": es_fallecido,
-                        },
-                        evento_id=evento.id,
-                        evento_tipo=evento_tipo_nombre,
-                        icono="building",
-                        color="red" if requirio_uci or es_fallecido else "yellow",
-                        es_critico=requirio_uci or es_fallecido,
-                    )
-                )
-
-            # 8. Investigaciones del evento
-            for investigacion in evento.investigaciones or []:
-                fecha_investigacion = (
-                    getattr(investigacion, "fecha_investigacion", None)
-                    or evento.fecha_minima_caso
-                )
-                if fecha_investigacion is None:
-                    continue  # Skip investigaciones without date
-                es_terreno = getattr(investigacion, "es_investigacion_terreno", False)
-
-                timeline_items.append(
-                    TimelineItem(
-                        tipo="investigacion",
-                        fecha=fecha_investigacion,
-                        titulo=(
-                            "Investigación de terreno"
-                            if es_terreno
-                            else "Investigación"
-                        ),
-                        descripcion=f"Investigación epidemiológica - CasoEpidemiologico {evento_tipo_nombre}",
-                        evento_id=evento.id,
-                        evento_tipo=evento_tipo_nombre,
-                        icono="search",
-                        color="teal",
-                    )
-                )
-
-        # Ordenar timeline por fecha (descendente - más reciente primero)
-        timeline_items.sort(key=lambda x: x.fecha, reverse=True)
-
-        # Calcular metadatos
-        fechas = [item.fecha for item in timeline_items]
-        fecha_inicio = min(fechas) if fechas else None
-        fecha_fin = max(fechas) if fechas else None
+        primera = rows[0]
+        filas_items, next_cursor = split_page(
+            [row for row in rows if row.tipo is not None], page_size, orden
+        )
+        timeline_items = [_item(row) for row in filas_items]
 
         response = PersonaTimelineResponse(
             persona_id=persona_id,
             tipo_sujeto=tipo_sujeto,
-            nombre_completo=nombre_completo,
+            nombre_completo=primera.nombre_completo,
             items=timeline_items,
-            fecha_inicio=fecha_inicio,
-            fecha_fin=fecha_fin,
-            total_items=len(timeline_items),
-            total_eventos=len(eventos),
+            fecha_inicio=primera.fecha_inicio,
+            fecha_fin=primera.fecha_fin,
+            total_items=primera.total_items,
+            total_eventos=primera.total_eventos,
+            has_next=next_cursor is not None,
+            next_cursor=next_cursor,
         )
 
         logger.info(
             f"✅ Timeline de persona {tipo_sujeto}/{persona_id} obtenido: "
-            f"{len(timeline_items)} items, {len(eventos)} eventos"
+            f"{len(timeline_items)} de {primera.total_items} items, "
+            f"{primera.total_eventos} eventos"
         )
         return SuccessResponse(data=response)
 
@@ -3,6 +3,10 @@ Endpoint para listado de personas (ciudadanos/animales) con sus eventos agrupado
 Vista PERSON-CENTERED: cada item es una persona con resumen de TODOS sus eventos.
 
 OPTIMIZADO: Usa agregaciones SQL nativas para evitar N+1 queries.
+- Sin filtros a nivel de caso lee ``ciudadano_resumen_casos`` (mantenida en la
+  ingesta); con filtros agrega los casos filtrados en la misma query.
+- Estadísticas en una sola pasada con ``COUNT(*) FILTER (...)``.
+- Paginación por keyset (``cursor``); ``page`` se mantiene para saltos.
 """
 
 import logging
@@ -12,23 +16,41 @@ from typing import Any
 
 from fastapi import Depends, HTTPException, Query, status
 from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import String, case, cast, desc, func, or_, select
+from sqlalchemy import Select, exists, func, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import col
 
+from app.core.config import settings
 from app.core.database import get_async_session
+from app.core.pagination import (
+    InvalidCursorError,
+    KeysetColumn,
+    decode_cursor,
+    keyset_condition,
+    split_page,
+)
 from app.core.schemas.response import SuccessResponse
 from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
 from app.domains.territorio.establecimientos_models import Establecimiento
-from app.domains.territorio.geografia_models import Departamento, Localidad, Provincia
-from app.domains.vigilancia_nominal.clasificacion.models import TipoClasificacion
+from app.domains.territorio.geografia_models import Departamento, Localidad
 from app.domains.vigilancia_nominal.models.caso import CasoEpidemiologico
 from app.domains.vigilancia_nominal.models.enfermedad import (
     Enfermedad,
     EnfermedadGrupo,
 )
-from app.domains.vigilancia_nominal.models.sujetos import Ciudadano
+from app.domains.vigilancia_nominal.models.sujetos import (
+    Ciudadano,
+    CiudadanoResumenCasos,
+)
+from app.domains.vigilancia_nominal.queries import (
+    condicion_busqueda_ciudadano,
+    ranking_busqueda_ciudadano,
+)
+from app.domains.vigilancia_nominal.queries.resumen_ciudadanos import (
+    COLUMNAS_RESUMEN,
+    columnas_resumen_casos,
+)
 
 
 class PersonaSortBy(str, Enum):
@@ -97,6 +119,9 @@ class PaginationInfo(BaseModel):
     total_pages: int = Field(..., description="Total de páginas")
     has_next: bool = Field(..., description="Si hay página siguiente")
     has_prev: bool = Field(..., description="Si hay página anterior")
+    next_cursor: str | None = Field(
+        None, description="Cursor para pedir la página siguiente (keyset)"
+    )
 
 
 class AggregatedStats(BaseModel):
@@ -130,10 +155,117 @@ class PersonaListResponse(BaseModel):
 logger = logging.getLogger(__name__)
 
 
+def _casos_filtrados_query(
+    provincia_ids_establecimiento: list[int] | None,
+    tipo_eno_ids: list[int] | None,
+    grupo_eno_ids: list[int] | None,
+    edad_min: int | None,
+    edad_max: int | None,
+) -> Select:
+    """
+    Casos de ciudadanos que pasan los filtros a nivel de caso.
+
+    Proyecta solo las columnas que usa ``columnas_resumen_casos``. El filtro
+    por grupo usa EXISTS en lugar de JOIN para no duplicar casos.
+    """
+    query = select(
+        col(CasoEpidemiologico.id),
+        col(CasoEpidemiologico.codigo_ciudadano),
+        col(CasoEpidemiologico.id_enfermedad),
+        col(CasoEpidemiologico.clasificacion_estrategia),
+        col(CasoEpidemiologico.fecha_minima_caso),
+    ).where(col(CasoEpidemiologico.codigo_ciudadano).isnot(None))
+
+    # Provincia por ESTABLECIMIENTO DE NOTIFICACIÓN
+    if provincia_ids_establecimiento:
+        query = (
+            query.join(
+                Establecimiento,
+                col(CasoEpidemiologico.id_establecimiento_notificacion)
+                == col(Establecimiento.id),
+            )
+            .join(
+                Localidad,
+                col(Establecimiento.id_localidad_indec)
+                == col(Localidad.id_localidad_indec),
+            )
+            .join(
+                Departamento,
+                col(Localidad.id_departamento_indec)
+                == col(Departamento.id_departamento_indec),
+            )
+            .where(
+                col(Departamento.id_provincia_indec).in_(provincia_ids_establecimiento)
+            )
+        )
+
+    if tipo_eno_ids:
+        query = query.where(col(CasoEpidemiologico.id_enfermedad).in_(tipo_eno_ids))
+
+    if grupo_eno_ids:
+        query = query.where(
+            exists().where(
+                col(EnfermedadGrupo.id_enfermedad)
+                == col(CasoEpidemiologico.id_enfermedad),
+                col(EnfermedadGrupo.id_grupo).in_(grupo_eno_ids),
+            )
+        )
+
+    # Edad a partir de fecha_nacimiento y fecha_apertura_caso
+    if edad_min is not None or edad_max is not None:
+        edad_calculada = func.extract(
+            "year",
+            func.age(
+                CasoEpidemiologico.fecha_apertura_caso,
+                CasoEpidemiologico.fecha_nacimiento,
+            ),
+        )
+        query = query.where(
+            col(CasoEpidemiologico.fecha_nacimiento).isnot(None),
+            col(CasoEpidemiologico.fecha_apertura_caso).isnot(None),
+        )
+        if edad_min is not None:
+            query = query.where(edad_calculada >= edad_min)
+        if edad_max is not None:
+            query = query.where(edad_calculada <= edad_max)
+
+    return query
+
+
+def _columnas_orden(
+    personas: Any, sort_by: PersonaSortBy, por_relevancia: bool
+) -> list[KeysetColumn]:
+    """
+    Columnas de ordenamiento (y del cursor) para el listado.
+
+    Siempre terminan en ``codigo_ciudadano`` para que el orden sea total.
+    """
+    columnas_por_sort: dict[PersonaSortBy, tuple[Any, bool]] = {
+        PersonaSortBy.NOMBRE_ASC: (personas.c.orden_nombre, False),
+        PersonaSortBy.NOMBRE_DESC: (personas.c.orden_nombre, True),
+        PersonaSortBy.EVENTOS_DESC: (personas.c.total_casos, True),
+        PersonaSortBy.EVENTOS_ASC: (personas.c.total_casos, False),
+        PersonaSortBy.ULTIMO_EVENTO_DESC: (personas.c.orden_ultimo_caso, True),
+        PersonaSortBy.ULTIMO_EVENTO_ASC: (personas.c.orden_ultimo_caso, False),
+    }
+    columna, descendente = columnas_por_sort[sort_by]
+    orden: list[KeysetColumn] = []
+    # Con búsqueda, primero los más relevantes (sort_by desempata)
+    if por_relevancia:
+        orden.append((personas.c.relevancia, True))
+    orden.append((columna, descendente))
+    orden.append((personas.c.codigo_ciudadano, descendente))
+    return orden
+
+
 async def list_personas(
     # Paginación
     page: int = Query(1, ge=1, description="Número de página"),
     page_size: int = Query(50, ge=10, le=200, description="Tamaño de página"),
+    cursor: str | None = Query(
+        None,
+        description="Cursor de la página anterior (next_cursor); tiene prioridad sobre page",
+    ),
     # Búsqueda
     search: str | None = Query(
         None, description="Búsqueda por nombre, apellido o documento"
@@ -170,7 +302,8 @@ async def list_personas(
     **Vista PERSON-CENTERED optimizada:**
     - Usa agregaciones SQL para máxima performance
     - Evita N+1 queries
-    - Procesa TODO en base de datos
+    - Procesa TODO en base de datos: ni las estadísticas ni la paginación
+      traen filas de más a Python
     """
 
     logger.info(f"📋 Listando personas - page: {page}, user: {current_user.email}")
@@ -182,379 +315,147 @@ async def list_personas(
 
         hace_30_dias = datetime.now().date() - timedelta(days=30)
 
-        # === QUERY OPTIMIZADA PARA CIUDADANOS CON AGREGACIONES SQL ===
+        # === CIUDADANOS: AGREGADOS, STATS Y PÁGINA RESUELTOS EN SQL ===
         if buscar_ciudadanos:
-            # Subquery con TODAS las agregaciones en SQL (una sola query)
-            # IMPORTANTE: Incluye JOINs para filtrar por provincia de ESTABLECIMIENTO DE NOTIFICACIÓN
-            eventos_base_query = (
-                select(CasoEpidemiologico)
-                .outerjoin(
-                    Enfermedad,
-                    col(CasoEpidemiologico.id_enfermedad) == col(Enfermedad.id),
-                )
-                .outerjoin(
-                    EnfermedadGrupo,
-                    col(Enfermedad.id) == col(EnfermedadGrupo.id_enfermedad),
-                )
-                # JOINs para filtro de provincia por ESTABLECIMIENTO DE NOTIFICACIÓN
-                .outerjoin(
-                    Establecimiento,
-                    col(CasoEpidemiologico.id_establecimiento_notificacion)
-                    == col(Establecimiento.id),
-                )
-                .outerjoin(
-                    Localidad,
-                    col(Establecimiento.id_localidad_indec)
-                    == col(Localidad.id_localidad_indec),
-                )
-                .outerjoin(
-                    Departamento,
-                    col(Localidad.id_departamento_indec)
-                    == col(Departamento.id_departamento_indec),
-                )
-                .outerjoin(
-                    Provincia,
-                    col(Departamento.id_provincia_indec)
-                    == col(Provincia.id_provincia_indec),
-                )
-                .where(col(CasoEpidemiologico.codigo_ciudadano).isnot(None))
+            hay_filtros_de_caso = bool(
+                provincia_ids_establecimiento
+                or tipo_eno_ids
+                or grupo_eno_ids
+                or edad_min is not None
+                or edad_max is not None
             )
 
-            # Aplicar filtros de eventos
-            if provincia_ids_establecimiento:
-                eventos_base_query = eventos_base_query.where(
-                    col(Provincia.id_provincia_indec).in_(provincia_ids_establecimiento)
-                )
-
-            if tipo_eno_ids:
-                eventos_base_query = eventos_base_query.where(
-                    col(CasoEpidemiologico.id_enfermedad).in_(tipo_eno_ids)
-                )
-
-            if grupo_eno_ids:
-                eventos_base_query = eventos_base_query.where(
-                    col(EnfermedadGrupo.id_grupo).in_(grupo_eno_ids)
-                )
-
-            # Filtros de edad (calcular edad a partir de fecha_nacimiento y fecha_apertura_caso)
-            if edad_min is not None or edad_max is not None:
-                # Calcular edad usando AGE(fecha_apertura_caso, fecha_nacimiento)
-                edad_calculada = func.extract(
-                    "year",
-                    func.age(
-                        CasoEpidemiologico.fecha_apertura_caso,
-                        CasoEpidemiologico.fecha_nacimiento,
-                    ),
-                )
-                # Asegurarse de que ambas fechas existan
-                eventos_base_query = eventos_base_query.where(
-                    col(CasoEpidemiologico.fecha_nacimiento).isnot(None),
-                    col(CasoEpidemiologico.fecha_apertura_caso).isnot(None),
-                )
-
-                if edad_min is not None:
-                    eventos_base_query = eventos_base_query.where(
-                        edad_calculada >= edad_min
-                    )
-
-                if edad_max is not None:
-                    eventos_base_query = eventos_base_query.where(
-                        edad_calculada <= edad_max
+            if settings.PERSONAS_USAR_RESUMEN and not hay_filtros_de_caso:
+                # Resumen mantenido en la ingesta: no se agregan casos por request
+                resumen = select(
+                    *(
+                        getattr(CiudadanoResumenCasos.__table__.c, nombre)
+                        for nombre in COLUMNAS_RESUMEN
                     )
-
-            # Crear subquery filtrada
-            eventos_filtrados = eventos_base_query.subquery()
-
-            # Ahora agregar con los eventos filtrados
-            eventos_stats_subq = (
-                select(
-                    eventos_filtrados.c.codigo_ciudadano,
-                    func.count(func.distinct(eventos_filtrados.c.id)).label(
-                        "total_eventos"
-                    ),
-                    func.sum(
-                        case(
-                            (
-                                eventos_filtrados.c.clasificacion_estrategia
-                                == TipoClasificacion.CONFIRMADOS,
-                                1,
-                            ),
-                            else_=0,
-                        )
-                    ).label("confirmados"),
-                    func.sum(
-                        case(
-                            (
-                                eventos_filtrados.c.clasificacion_estrategia
-                                == TipoClasificacion.SOSPECHOSOS,
-                                1,
-                            ),
-                            else_=0,
-                        )
-                    ).label("sospechosos"),
-                    func.sum(
-                        case(
-                            (
-                                eventos_filtrados.c.clasificacion_estrategia
-                                == TipoClasificacion.PROBABLES,
-                                1,
-                            ),
-                            else_=0,
-                        )
-                    ).label("probables"),
-                    func.sum(
-                        case(
-                            (
-                                eventos_filtrados.c.clasificacion_estrategia
-                                == TipoClasificacion.DESCARTADOS,
-                                1,
-                            ),
-                            else_=0,
-                        )
-                    ).label("descartados"),
-                    func.min(eventos_filtrados.c.fecha_minima_caso).label(
-                        "primer_evento"
-                    ),
-                    func.max(eventos_filtrados.c.fecha_minima_caso).label(
-                        "ultimo_evento"
-                    ),
-                    func.sum(
-                        case(
-                            (eventos_filtrados.c.fecha_minima_caso >= hace_30_dias, 1),
-                            else_=0,
-                        )
-                    ).label("eventos_recientes"),
-                )
-                .where(col(eventos_filtrados.c.codigo_ciudadano).isnot(None))
-                .group_by(eventos_filtrados.c.codigo_ciudadano)
-                .subquery()
-            )
-
-            # Subquery para obtener el último evento con su tipo (usa eventos filtrados)
-            ultimo_evento_subq = (
-                select(
-                    eventos_filtrados.c.codigo_ciudadano,
-                    eventos_filtrados.c.id_enfermedad,
-                    eventos_filtrados.c.clasificacion_estrategia,
-                    func.row_number()
-                    .over(
-                        partition_by=eventos_filtrados.c.codigo_ciudadano,
-                        order_by=desc(eventos_filtrados.c.fecha_minima_caso),
-                    )
-                    .label("rn"),
-                )
-                .where(col(eventos_filtrados.c.codigo_ciudadano).isnot(None))
-                .subquery()
-            )
-
-            ultimo_evento_filtrado = (
-                select(
-                    ultimo_evento_subq.c.codigo_ciudadano,
-                    ultimo_evento_subq.c.id_enfermedad,
-                    ultimo_evento_subq.c.clasificacion_estrategia,
-                )
-                .where(ultimo_evento_subq.c.rn == 1)
-                .subquery()
-            )
-
-            # Query principal con JOINS
-            ciudadanos_query = (
-                select(
-                    Ciudadano,
-                    eventos_stats_subq.c.total_eventos,
-                    eventos_stats_subq.c.confirmados,
-                    eventos_stats_subq.c.sospechosos,
-                    eventos_stats_subq.c.probables,
-                    eventos_stats_subq.c.descartados,
-                    eventos_stats_subq.c.primer_evento,
-                    eventos_stats_subq.c.ultimo_evento,
-                    eventos_stats_subq.c.eventos_recientes,
-                    ultimo_evento_filtrado.c.clasificacion_estrategia.label(
-                        "ultimo_evento_clasificacion"
-                    ),
-                    col(Enfermedad.nombre).label("ultimo_evento_tipo"),
-                )
-                .outerjoin(
-                    eventos_stats_subq,
-                    col(Ciudadano.codigo_ciudadano)
-                    == eventos_stats_subq.c.codigo_ciudadano,
-                )
-                .outerjoin(
-                    ultimo_evento_filtrado,
-                    col(Ciudadano.codigo_ciudadano)
-                    == ultimo_evento_filtrado.c.codigo_ciudadano,
-                )
-                .outerjoin(
-                    Enfermedad,
-                    ultimo_evento_filtrado.c.id_enfermedad == col(Enfermedad.id),
-                )
-                .where(col(eventos_stats_subq.c.total_eventos).isnot(None))
-            )
-
-            # Aplicar filtros de búsqueda
-            if search:
-                search_term = f"%{search}%"
-                ciudadanos_query = ciudadanos_query.where(
-                    or_(
-                        col(Ciudadano.nombre).ilike(search_term),
-                        col(Ciudadano.apellido).ilike(search_term),
-                        cast(col(Ciudadano.numero_documento), String).ilike(
-                            search_term
-                        ),
-                    )
-                )
-
-            # Aplicar filtros adicionales
-            if tiene_multiples_eventos:
-                ciudadanos_query = ciudadanos_query.where(
-                    eventos_stats_subq.c.total_eventos > 1
-                )
-
-            # Aplicar ordenamiento
-            if sort_by == PersonaSortBy.NOMBRE_ASC:
-                ciudadanos_query = ciudadanos_query.order_by(col(Ciudadano.nombre))
-            elif sort_by == PersonaSortBy.NOMBRE_DESC:
-                ciudadanos_query = ciudadanos_query.order_by(
-                    desc(col(Ciudadano.nombre))
-                )
-            elif sort_by == PersonaSortBy.EVENTOS_DESC:
-                ciudadanos_query = ciudadanos_query.order_by(
-                    desc(eventos_stats_subq.c.total_eventos)
-                )
-            elif sort_by == PersonaSortBy.EVENTOS_ASC:
-                ciudadanos_query = ciudadanos_query.order_by(
-                    eventos_stats_subq.c.total_eventos
-                )
-            elif sort_by == PersonaSortBy.ULTIMO_EVENTO_DESC:
-                ciudadanos_query = ciudadanos_query.order_by(
-                    desc(eventos_stats_subq.c.ultimo_evento)
-                )
-            elif sort_by == PersonaSortBy.ULTIMO_EVENTO_ASC:
-                ciudadanos_query = ciudadanos_query.order_by(
-                    eventos_stats_subq.c.ultimo_evento
-                )
-
-            # Paginación en SQL
-            offset = (page - 1) * page_size
-            ciudadanos_query = ciudadanos_query.offset(offset).limit(page_size)
-
-            # Ejecutar query (UNA SOLA VEZ)
-            result = await db.execute(ciudadanos_query)
-            rows = result.all()
-
-            # Contar total (query separada pero eficiente)
-            count_query = (
-                select(func.count())
-                .select_from(Ciudadano)
-                .outerjoin(
-                    eventos_stats_subq,
-                    Ciudadano.codigo_ciudadano == eventos_stats_subq.c.codigo_ciudadano,
-                )
-                .where(col(eventos_stats_subq.c.total_eventos).isnot(None))
+                ).subquery("resumen")
+            else:
+                casos_filtrados = _casos_filtrados_query(
+                    provincia_ids_establecimiento=provincia_ids_establecimiento,
+                    tipo_eno_ids=tipo_eno_ids,
+                    grupo_eno_ids=grupo_eno_ids,
+                    edad_min=edad_min,
+                    edad_max=edad_max,
+                ).subquery("casos_filtrados")
+                resumen = (
+                    select(*columnas_resumen_casos(casos_filtrados))
+                    .group_by(casos_filtrados.c.codigo_ciudadano)
+                    .subquery("resumen")
+                )
+
+            # Una fila por persona que coincide con los filtros
+            personas_query = select(
+                col(Ciudadano.codigo_ciudadano),
+                col(Ciudadano.nombre),
+                col(Ciudadano.apellido),
+                col(Ciudadano.numero_documento),
+                col(Ciudadano.sexo_biologico),
+                *(
+                    resumen.c[nombre]
+                    for nombre in COLUMNAS_RESUMEN
+                    if nombre != "codigo_ciudadano"
+                ),
+                # Claves de ordenamiento no nulas (requisito del keyset)
+                func.coalesce(col(Ciudadano.nombre), "").label("orden_nombre"),
+                func.coalesce(resumen.c.ultimo_caso, literal(date.min)).label(
+                    "orden_ultimo_caso"
+                ),
+                (ranking_busqueda_ciudadano(search) if search else literal(0.0)).label(
+                    "relevancia"
+                ),
+            ).join(
+                resumen,
+                col(Ciudadano.codigo_ciudadano) == resumen.c.codigo_ciudadano,
             )
 
             if search:
-                search_term = f"%{search}%"
-                count_query = count_query.where(
-                    or_(
-                        col(Ciudadano.nombre).ilike(search_term),
-                        col(Ciudadano.apellido).ilike(search_term),
-                        cast(col(Ciudadano.numero_documento), String).ilike(
-                            search_term
-                        ),
-                    )
+                personas_query = personas_query.where(
+                    condicion_busqueda_ciudadano(search)
                 )
 
             if tiene_multiples_eventos:
-                count_query = count_query.where(eventos_stats_subq.c.total_eventos > 1)
-
-            total_result = await db.execute(count_query)
-            total = total_result.scalar() or 0
-
-            # Calcular estadísticas agregadas sobre TODAS las personas que coinciden con filtros
-            # Query base para stats (reutiliza la misma lógica de filtros)
-            stats_base_query = (
-                select(
-                    eventos_stats_subq.c.total_eventos,
-                    eventos_stats_subq.c.confirmados,
-                    eventos_stats_subq.c.eventos_recientes,
-                )
-                .select_from(Ciudadano)
+                personas_query = personas_query.where(resumen.c.total_casos > 1)
+
+            personas = personas_query.cte("personas")
+
+            # Estadísticas: una sola pasada agregada (FILTER) sobre las personas
+            stats_query = select(
+                func.count().label("total"),
+                func.count().filter(personas.c.total_casos > 1).label("con_multiples"),
+                func.count()
+                .filter(personas.c.confirmados > 0)
+                .label("con_confirmados"),
+                func.count()
+                .filter(personas.c.ultimo_caso >= hace_30_dias)
+                .label("activas"),
+            ).select_from(personas)
+            stats_row = (await db.execute(stats_query)).one()
+            total = stats_row.total or 0
+
+            # Página: keyset si viene cursor, OFFSET para saltar a una página
+            orden = _columnas_orden(personas, sort_by, por_relevancia=bool(search))
+            page_query = (
+                select(personas, col(Enfermedad.nombre).label("ultimo_caso_tipo"))
                 .outerjoin(
-                    eventos_stats_subq,
-                    Ciudadano.codigo_ciudadano == eventos_stats_subq.c.codigo_ciudadano,
+                    Enfermedad,
+                    personas.c.ultimo_caso_id_enfermedad == col(Enfermedad.id),
                 )
-                .where(col(eventos_stats_subq.c.total_eventos).isnot(None))
-            )
-
-            # Aplicar los mismos filtros de búsqueda
-            if search:
-                search_term = f"%{search}%"
-                stats_base_query = stats_base_query.where(
-                    or_(
-                        col(Ciudadano.nombre).ilike(search_term),
-                        col(Ciudadano.apellido).ilike(search_term),
-                        cast(col(Ciudadano.numero_documento), String).ilike(
-                            search_term
-                        ),
+                .order_by(
+                    *(
+                        columna.desc() if descendente else columna.asc()
+                        for columna, descendente in orden
                     )
                 )
-
-            if tiene_multiples_eventos:
-                stats_base_query = stats_base_query.where(
-                    eventos_stats_subq.c.total_eventos > 1
-                )
-
-            # Ejecutar query de stats
-            stats_result = await db.execute(stats_base_query)
-            stats_rows = stats_result.all()
-
-            # Calcular agregaciones
-            personas_con_multiples = sum(
-                1 for row in stats_rows if (row.total_eventos or 0) > 1
+                .limit(page_size + 1)
             )
-            personas_con_confirmados = sum(
-                1 for row in stats_rows if (row.confirmados or 0) > 0
+            if cursor:
+                try:
+                    valores_cursor = decode_cursor(cursor, len(orden))
+                except InvalidCursorError as e:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+                    ) from e
+                page_query = page_query.where(keyset_condition(orden, valores_cursor))
+            else:
+                page_query = page_query.offset((page - 1) * page_size)
+
+            rows, next_cursor = split_page(
+                (await db.execute(page_query)).all(), page_size, orden
             )
-            personas_activas = sum(
-                1 for row in stats_rows if (row.eventos_recientes or 0) > 0
-            )
-
-            # Construir respuesta desde los rows
-            personas_list = []
-            for row in rows:
-                row_dict = row._mapping
-                ciudadano = row_dict["Ciudadano"]
-
-                personas_list.append(
-                    PersonaListItem(
-                        tipo_sujeto="humano",
-                        persona_id=ciudadano.codigo_ciudadano,
-                        nombre_completo=f"{ciudadano.nombre or ''} {ciudadano.apellido or ''}".strip()
-                        or "Sin nombre",
-                        documento=(
-                            str(ciudadano.numero_documento)
-                            if ciudadano.numero_documento
-                            else None
-                        ),
-                        edad_actual=None,  # TODO: calcular si necesario
-                        sexo=ciudadano.sexo_biologico,
-                        provincia=None,  # TODO: obtener de domicilio si necesario
-                        localidad=None,
-                        total_eventos=row_dict["total_eventos"] or 0,
-                        eventos_confirmados=row_dict["confirmados"] or 0,
-                        eventos_sospechosos=row_dict["sospechosos"] or 0,
-                        eventos_probables=row_dict["probables"] or 0,
-                        eventos_descartados=row_dict["descartados"] or 0,
-                        primer_evento_fecha=row_dict["primer_evento"],
-                        ultimo_evento_fecha=row_dict["ultimo_evento"],
-                        ultimo_evento_tipo=row_dict.get("ultimo_evento_tipo"),
-                        ultimo_evento_clasificacion=row_dict.get(
-                            "ultimo_evento_clasificacion"
-                        ),
-                        tiene_eventos_activos=(row_dict["eventos_recientes"] or 0) > 0,
-                    )
+            has_next = next_cursor is not None
+
+            personas_list = [
+                PersonaListItem(
+                    tipo_sujeto="humano",
+                    persona_id=row.codigo_ciudadano,
+                    nombre_completo=f"{row.nombre or ''} {row.apellido or ''}".strip()
+                    or "Sin nombre",
+                    documento=(
+                        str(row.numero_documento) if row.numero_documento else None
+                    ),
+                    edad_actual=None,  # TODO: calcular si necesario
+                    sexo=row.sexo_biologico,
+                    provincia=None,  # TODO: obtener de domicilio si necesario
+                    localidad=None,
+                    total_eventos=row.total_casos or 0,
+                    eventos_confirmados=row.confirmados or 0,
+                    eventos_sospechosos=row.sospechosos or 0,
+                    eventos_probables=row.probables or 0,
+                    eventos_descartados=row.descartados or 0,
+                    primer_evento_fecha=row.primer_caso,
+                    ultimo_evento_fecha=row.ultimo_caso,
+                    ultimo_evento_tipo=row.ultimo_caso_tipo,
+                    ultimo_evento_clasificacion=row.ultimo_caso_clasificacion,
+                    tiene_eventos_activos=(
+                        row.ultimo_caso is not None and row.ultimo_caso >= hace_30_dias
+                    ),
                 )
+                for row in rows
+            ]
 
             # Respuesta con metadata de paginación y stats
             response = PersonaListResponse(
@@ -564,14 +465,15 @@ async def list_personas(
                     page_size=page_size,
                     total=total,
                     total_pages=(total + page_size - 1) // page_size,
-                    has_next=offset + page_size < total,
-                    has_prev=page > 1,
+                    has_next=has_next,
+                    has_prev=page > 1 or cursor is not None,
+                    next_cursor=next_cursor,
                 ),
                 stats=AggregatedStats(
                     total_personas=total,
-                    personas_con_multiples_eventos=personas_con_multiples,
-                    personas_con_confirmados=personas_con_confirmados,
-                    personas_activas=personas_activas,
+                    personas_con_multiples_eventos=stats_row.con_multiples or 0,
+                    personas_con_confirmados=stats_row.con_confirmados or 0,
+                    personas_activas=stats_row.activas or 0,
                 ),
                 filters_applied={
                     "search": search,
@@ -645,6 +547,8 @@ async def list_personas(
                 },
             )
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"💥 Error listando personas: {e!s}", exc_info=True)
         raise HTTPException(
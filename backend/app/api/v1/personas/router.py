@@ -7,6 +7,11 @@ from fastapi import APIRouter
 
 from app.core.schemas.response import ErrorResponse, SuccessResponse
 
+from .duplicados import (
+    DuplicadosListResponse,
+    list_duplicados,
+    revisar_duplicado,
+)
 from .get_detail import PersonaDetailResponse, get_persona_detail
 from .get_timeline import PersonaTimelineResponse, get_persona_timeline
 from .list import PersonaListResponse, list_personas
@@ -25,6 +30,30 @@ router.add_api_route(
     },
 )
 
+# Candidatos a duplicado (antes del detalle para que no lo capture
+# /{tipo_sujeto}/{persona_id})
+router.add_api_route(
+    "/duplicados",
+    list_duplicados,
+    methods=["GET"],
+    response_model=SuccessResponse[DuplicadosListResponse],
+    responses={
+        400: {"model": ErrorResponse, "description": "Cursor inválido"},
+        500: {"model": ErrorResponse, "description": "Error interno del servidor"},
+    },
+)
+
+router.add_api_route(
+    "/duplicados/{candidato_id}",
+    revisar_duplicado,
+    methods=["PATCH"],
+    response_model=SuccessResponse[dict],
+    responses={
+        404: {"model": ErrorResponse, "description": "Candidato no encontrado"},
+        500: {"model": ErrorResponse, "description": "Error interno del servidor"},
+    },
+)
+
 # Registrar endpoints de detalle
 router.add_api_route(
     "/{tipo_sujeto}/{persona_id}",
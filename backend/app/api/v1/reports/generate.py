@@ -11,10 +11,9 @@ from fastapi import Depends, HTTPException, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_async_session
+from app.core.database import get_async_read_session
 from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
-from app.domains.reporteria.serverside_pdf_generator import serverside_pdf_generator
 
 from .schemas import ReportRequest
 
@@ -23,13 +22,18 @@ logger = logging.getLogger(__name__)
 
 async def generate_report(
     request: ReportRequest,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_read_session),
     current_user: User = Depends(RequireAnyRole()),
 ) -> Response:
     """
     Genera un reporte PDF 100% SERVER-SIDE usando matplotlib + ReportLab
     Sin Playwright - Renderizado completo en el backend
     """
+    # Import diferido: reportlab y matplotlib solo se cargan al generar
+    from app.domains.reporteria.serverside_pdf_generator import (
+        serverside_pdf_generator,
+    )
+
     try:
         logger.info(
             f"Generando reporte PDF SERVER-SIDE para {len(request.combinations)} combinaciones"
@@ -10,10 +10,9 @@ from fastapi import Depends, HTTPException, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_async_session
+from app.core.database import get_async_read_session
 from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
-from app.domains.reporteria.zip_generator import zip_generator
 
 from .schemas import ReportRequest
 
@@ -22,13 +21,16 @@ logger = logging.getLogger(__name__)
 
 async def generate_zip_report(
     request: ReportRequest,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_read_session),
     current_user: User = Depends(RequireAnyRole()),
 ) -> Response:
     """
     Generate ZIP report with multiple PDFs (one per combination) generated in parallel.
     Each PDF contains all charts for that combination.
     """
+    # Import diferido: reportlab y matplotlib solo se cargan al generar
+    from app.domains.reporteria.zip_generator import zip_generator
+
     try:
         logger.info(
             f"Generating ZIP report with {len(request.combinations)} combinations"
@@ -11,7 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.charts.get_dashboard import get_dashboard_charts
 from app.api.v1.charts.get_indicadores import get_indicadores
-from app.core.database import get_async_session
+from app.core.database import get_async_read_session
 from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
 
@@ -22,7 +22,7 @@ logger = logging.getLogger(__name__)
 
 async def preview_report(
     request: ReportRequest,
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_async_read_session),
     current_user: User = Depends(RequireAnyRole()),
 ) -> dict[str, Any]:
     """
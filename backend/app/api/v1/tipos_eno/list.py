@@ -12,6 +12,7 @@ from sqlalchemy.orm import selectinload
 from sqlmodel import col
 
 from app.core.database import get_async_session
+from app.core.response_cache import cache_respuesta
 from app.core.schemas.response import PaginatedResponse, PaginationMeta
 from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
@@ -47,6 +48,9 @@ class EnfermedadInfo(BaseModel):
 logger = logging.getLogger(__name__)
 
 
+@cache_respuesta(
+    "enfermedad", "enfermedad_grupo", "grupo_de_enfermedades", "caso_epidemiologico"
+)
 async def list_tipos_eno(
     page: int = Query(1, ge=1, description="Número de página"),
     per_page: int = Query(50, ge=1, le=200, description="Elementos por página"),
@@ -6,9 +6,11 @@ import logging
 
 from fastapi import Depends, HTTPException, status
 
+from app.core.replicas import marcar_lectura_primario
 from app.core.schemas.response import SuccessResponse
 from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
+from app.domains.jobs.models import JobStatus
 from app.domains.jobs.schemas import JobStatusResponse
 from app.domains.jobs.services import job_service
 
@@ -29,6 +31,10 @@ async def get_job_status_endpoint(
             status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} no encontrado"
         )
 
+    if job_status.status == JobStatus.COMPLETED:
+        # Las réplicas pueden no tener todavía lo que cargó el job
+        marcar_lectura_primario(current_user.id)
+
     logger.info(
         f"Job {job_id} status: {job_status.status}, progress: {job_status.progress_percentage}%"
     )
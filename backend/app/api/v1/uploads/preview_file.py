@@ -7,10 +7,9 @@ import tempfile
 import time
 import uuid
 from pathlib import Path
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 import magic
-import pandas as pd
 from fastapi import Depends, File, HTTPException, UploadFile, status
 from pydantic import BaseModel
 
@@ -19,6 +18,9 @@ from app.core.security import RequireAnyRole
 from app.domains.autenticacion.models import User
 from app.domains.vigilancia_nominal.procesamiento.config.columns import REQUIRED_COLUMNS
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 # MIME types válidos para archivos permitidos
 VALID_MIME_TYPES = {
     "text/csv",
@@ -137,13 +139,15 @@ def get_missing_columns(
     return missing
 
 
-def clean_preview_data(df: pd.DataFrame, max_rows: int = 10) -> list[list[Any]]:
+def clean_preview_data(df: "pd.DataFrame", max_rows: int = 10) -> list[list[Any]]:
     """
     Convert DataFrame to serializable preview data.
 
     OPTIMIZED: Convert all values to Python native types (str, int, float, None)
     to avoid pandas/numpy serialization issues.
     """
+    import pandas as pd
+
     # Take only first N rows
     df_preview = df.head(max_rows)
 
@@ -175,6 +179,8 @@ def get_total_row_count(file_path: Path, sheet_name: str | None = None) -> int:
     file_ext = file_path.suffix.lower()
 
     if file_ext == ".csv":
+        import pandas as pd
+
         # Count lines efficiently
         logger.debug("🔢 Counting CSV rows using chunks...")
         chunk_start = time.time()
@@ -219,6 +225,8 @@ async def preview_uploaded_file(
 
     **Returns:** Upload ID + sheet previews
     """
+    # pandas se carga con el primer preview, no al arrancar la API
+    import pandas as pd
 
     logger.info(
         f"📤 Preview request - filename: {file.filename}, user: {current_user.email}"
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Backfill de la vinculación de ciudadanos (claves de bloqueo y candidatos).
+
+La migración ``e6a3c9d1f2b8`` crea ``ciudadano_clave_bloqueo`` vacía y la
+ingesta solo vincula a los ciudadanos de cada archivo: sin este backfill los
+ciudadanos cargados antes no se comparan entre sí ni aparecen en los bloques
+de los nuevos. Recorre el padrón por ``codigo_ciudadano`` en lotes y corre
+``vincular_ciudadanos`` sobre cada uno, con un commit por lote. Los lotes
+anteriores ya tienen sus claves guardadas, así que cada par se encuentra al
+procesar el lote de su segundo miembro.
+
+Es idempotente (los ciudadanos cuyas claves no cambiaron se saltean) y se
+retoma con ``--desde``. Conviene correrlo con la ingesta detenida: dos
+procesos que reemplazan las claves del mismo ciudadano chocan en la
+restricción única.
+
+Usage: uv run python -m app.commands.vincular_ciudadanos [--lote 5000] [--desde N]
+"""
+
+import argparse
+
+from sqlalchemy import select
+from sqlmodel import Session, col
+
+from app.core.database import engine
+from app.domains.vigilancia_nominal.models.sujetos import Ciudadano
+from app.domains.vigilancia_nominal.procesamiento.vinculacion import (
+    ResultadoVinculacion,
+    vincular_ciudadanos,
+)
+
+
+def backfill(
+    session: Session, lote: int, desde: int | None = None
+) -> ResultadoVinculacion:
+    """
+    Vincula todo el padrón en lotes de ``lote`` ciudadanos.
+
+    Args:
+        session: Sesión síncrona; se hace commit después de cada lote
+        lote: Ciudadanos por lote
+        desde: Último ``codigo_ciudadano`` ya procesado (para retomar)
+
+    Returns:
+        Conteos acumulados de todos los lotes
+    """
+    total = ResultadoVinculacion()
+    ultimo = desde
+    while True:
+        query = (
+            select(col(Ciudadano.codigo_ciudadano))
+            .order_by(col(Ciudadano.codigo_ciudadano))
+            .limit(lote)
+        )
+        if ultimo is not None:
+            query = query.where(col(Ciudadano.codigo_ciudadano) > ultimo)
+        codigos = list(session.execute(query).scalars())
+        if not codigos:
+            return total
+
+        resultado = vincular_ciudadanos(session, codigos)
+        session.commit()
+        ultimo = codigos[-1]
+
+        total.personas += resultado.personas
+        total.personas_procesadas += resultado.personas_procesadas
+        total.pares_comparados += resultado.pares_comparados
+        total.candidatos += resultado.candidatos
+        total.duracion_segundos += resultado.duracion_segundos
+        print(
+            f"   ✅ Hasta {ultimo}: {resultado.personas_procesadas} procesados, "
+            f"{resultado.candidatos} candidatos ({total.personas} en total)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Genera claves de bloqueo y candidatos para todo el padrón"
+    )
+    parser.add_argument("--lote", type=int, default=5000)
+    parser.add_argument(
+        "--desde", type=int, help="Retomar después de este codigo_ciudadano"
+    )
+    args = parser.parse_args()
+    if args.lote <= 0:
+        parser.error("--lote tiene que ser positivo")
+
+    print("🔗 Vinculando ciudadanos existentes...")
+    with Session(engine) as session:
+        total = backfill(session, args.lote, args.desde)
+    print(
+        f"\n✨ {total.personas} ciudadanos, {total.personas_procesadas} procesados, "
+        f"{total.pares_comparados} pares, {total.candidatos} candidatos en "
+        f"{total.duracion_segundos:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
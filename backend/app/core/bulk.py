@@ -4,12 +4,13 @@ Shared utilities for bulk processors - POLARS PURO.
 Consolidates:
 - BulkOperationResult (result dataclass)
 - Polars expression builders (para mapeos, conversiones, etc.)
+- CatalogResolver (mapeo nombre → id por join, sin cadenas when/then)
 - BulkProcessorBase (base class con helpers Polars)
-- Catalog get-or-create patterns
+- Catalog get-or-create patterns (resueltos contra app.core.catalog_snapshots)
 """
 
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any, TypeVar
@@ -22,7 +23,9 @@ from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel import SQLModel, col
 
+from app.core.catalog_snapshots import catalog_snapshots
 from app.core.constants import SexoBiologico, TipoDocumento
+from app.core.slug import ACENTOS_SLUG, LARGO_MAXIMO_SLUG, PATRONES_SLUG
 
 # === MAPEOS DE NORMALIZACIÓN ===
 # Mapeo de tipos de documento
@@ -142,14 +145,11 @@ def pl_map_tipo_documento(col_name: str) -> pl.Expr:
     Usage:
         df.select(pl_map_tipo_documento("tipo_doc").alias("tipo_documento"))
     """
-    expr = pl.col(col_name).str.to_uppercase().str.strip_chars()
-
-    # Construir mapeo usando when/then
-    result = pl.lit(None)  # Default
-    for key, value in DOCUMENTO_MAPPING.items():
-        result = pl.when(expr == key).then(pl.lit(value.value)).otherwise(result)
-
-    return result
+    return pl_map_catalog(
+        pl.col(col_name).str.to_uppercase().str.strip_chars(),
+        {key: value.value for key, value in DOCUMENTO_MAPPING.items()},
+        pl.Utf8,
+    )
 
 
 def pl_map_boolean(col_name: str) -> pl.Expr:
@@ -161,15 +161,60 @@ def pl_map_boolean(col_name: str) -> pl.Expr:
     Usage:
         df.select(pl_map_boolean("internado").alias("internado"))
     """
-    expr = pl.col(col_name).str.to_uppercase().str.strip_chars()
+    return pl_map_catalog(
+        pl.col(col_name).str.to_uppercase().str.strip_chars(),
+        BOOLEAN_MAPPING,
+        pl.Boolean,
+    )
+
+
+def pl_map_catalog(
+    expr: pl.Expr, mapping: Mapping[str, Any], return_dtype: pl.DataType
+) -> pl.Expr:
+    """
+    Expresión Polars para mapear valores con un diccionario (hash lookup).
 
-    # Construir mapeo usando when/then
-    result = pl.lit(None)  # Default
-    for key, value in BOOLEAN_MAPPING.items():
-        if value is not None:  # Solo mapear valores definidos
-            result = pl.when(expr == key).then(pl.lit(value)).otherwise(result)
+    Valores no encontrados (y nulls) quedan en null. Para catálogos grandes
+    que se aplican a varias columnas usar CatalogResolver.
 
-    return result
+    Usage:
+        df.select(pl_map_catalog(pl.col("sexo"), {"M": 1, "F": 2}, pl.Int64))
+    """
+    return expr.replace_strict(
+        list(mapping.keys()),
+        list(mapping.values()),
+        default=None,
+        return_dtype=return_dtype,
+    )
+
+
+def pl_slug(col_name: str | pl.Expr) -> pl.Expr:
+    """
+    Versión vectorizada de app.core.slug.generar_slug.
+
+    Aplica las mismas reglas (ACENTOS_SLUG, PATRONES_SLUG) con expresiones
+    de string de Polars, sin pasar por Python fila a fila. Nulls y valores
+    que quedan vacíos resultan en "unknown", igual que generar_slug.
+
+    Usage:
+        df.select(pl_slug("evento").alias("slug_evento"))
+    """
+    expr = pl.col(col_name) if isinstance(col_name, str) else col_name
+    texto = (
+        expr.cast(pl.Utf8)
+        .str.strip_chars()
+        .str.to_lowercase()
+        .str.replace_many(list(ACENTOS_SLUG.keys()), list(ACENTOS_SLUG.values()))
+    )
+    for patron, reemplazo in PATRONES_SLUG:
+        texto = texto.str.replace_all(patron, reemplazo)
+    texto = texto.str.strip_chars("-").str.slice(0, LARGO_MAXIMO_SLUG)
+
+    return (
+        pl.when(texto.is_null() | (texto == ""))
+        .then(pl.lit("unknown"))
+        .otherwise(texto)
+    )
 
 
 def pl_clean_numero_domicilio(col_name: str) -> pl.Expr:
@@ -241,6 +286,63 @@ def pl_col_or_null(
         return pl.lit(None)
 
 
+# ===== CATALOG RESOLVER =====
+
+
+class CatalogResolver:
+    """
+    Resuelve nombres a IDs de catálogo con un hash join.
+
+    El mapping (ej: establecimiento_clean -> id) se convierte una sola vez en
+    un DataFrame chico; cada columna a resolver es un único join contra él,
+    sin importar cuántas entradas tenga el catálogo. Las claves se codifican
+    como Categorical: los strings repetidos de la columna se hashean una vez
+    al codificar y el join compara códigos enteros (desde polars 1.32 las
+    categorías son globales, así que no hace falta un ``StringCache`` ni
+    recodificar; ``maintain_order`` en el join también requiere esa versión).
+
+    Usage:
+        establecimientos = CatalogResolver(establecimiento_mapping)
+        df = establecimientos.resolve(df, "estab_notif_clean", "id_estab_notif")
+    """
+
+    def __init__(
+        self,
+        mapping: Mapping[str, Any],
+        value_dtype: pl.DataType = pl.Int64,
+    ) -> None:
+        self.value_dtype = value_dtype
+        self.df = pl.DataFrame(
+            {"clave": list(mapping.keys()), "valor": list(mapping.values())},
+            schema={"clave": pl.Categorical, "valor": value_dtype},
+        )
+
+    def __len__(self) -> int:
+        return self.df.height
+
+    def resolve(
+        self,
+        df: pl.DataFrame | pl.LazyFrame,
+        col_name: str,
+        alias: str,
+    ) -> pl.DataFrame | pl.LazyFrame:
+        """
+        Agrega la columna ``alias`` con el ID de cada valor de ``col_name``.
+
+        Left join (mantiene el orden de ``df``): valores sin match quedan en null.
+        """
+        clave = f"__clave_{alias}"
+        catalogo = self.df.rename({"clave": clave, "valor": alias})
+        if isinstance(df, pl.LazyFrame):
+            catalogo = catalogo.lazy()
+
+        return (
+            df.with_columns(pl.col(col_name).cast(pl.Categorical).alias(clave))
+            .join(catalogo, on=clave, how="left", maintain_order="left")
+            .drop(clave)
+        )
+
+
 # ===== GENERAL UTILITIES =====
 
 
@@ -332,20 +434,20 @@ def get_or_create_catalog(
     if not valor_to_key:
         return {}
 
-    # 3. Buscar existentes en BD usando las keys transformadas
+    # 3. Buscar existentes usando las keys transformadas
+    # Sin filtro adicional, se resuelven contra el snapshot compartido del catálogo
     keys_to_search = list(set(valor_to_key.values()))
-    model_key = getattr(model, key_field)
-    model_id = model.id
-    stmt = select(col(model_id), col(model_key))
-
     if existing_filter:
-        stmt = stmt.where(existing_filter)
+        stmt = select(col(model.id), col(getattr(model, key_field))).where(
+            existing_filter
+        )
+        existing_mapping = {
+            getattr(row, key_field): row.id for row in session.execute(stmt).all()
+        }
     else:
-        stmt = stmt.where(col(model_key).in_(keys_to_search))
-
-    existing_mapping = {
-        getattr(row, key_field): row.id for row in session.execute(stmt).all()
-    }
+        existing_mapping = catalog_snapshots.lookup(
+            session, model, key_field, keys_to_search
+        )
 
     # 4. Identificar faltantes (comparar keys transformadas, no valores originales)
     existing_keys = set(existing_mapping.keys())
@@ -394,13 +496,10 @@ def get_or_create_catalog(
 
         session.flush()
 
-        # 6. Re-query para obtener IDs de TODOS (existentes + nuevos)
-        stmt = select(col(model_id), col(model_key)).where(
-            col(model_key).in_(keys_to_search)
+        # 6. Re-query solo de las faltantes (quedan registradas en el snapshot)
+        existing_mapping.update(
+            catalog_snapshots.lookup(session, model, key_field, faltantes_keys)
         )
-        existing_mapping = {
-            getattr(row, key_field): row.id for row in session.execute(stmt).all()
-        }
 
     return existing_mapping
 
@@ -0,0 +1,355 @@
+"""
+Snapshots en memoria de catálogos para los procesadores bulk.
+
+Cada job de carga resolvía los mismos catálogos (enfermedades, grupos,
+establecimientos, síntomas, ...) con un ``SELECT ... WHERE clave IN (...)``
+por catálogo. Entre jobs esos catálogos casi no cambian, así que el proceso
+guarda una copia como DataFrame de Polars (``clave`` → ``id``) y la reutiliza.
+
+Validez:
+- Cada tabla tiene una versión ``(total, max(id), max(updated_at))``.
+  ``validar()`` la compara al inicio de cada job con una sola consulta.
+- Si cambió, se traen solo las filas nuevas o modificadas. Si además faltan
+  filas (borrados), se recarga el snapshot completo.
+- Las claves que no están en el snapshot se consultan a la BD, así que un
+  snapshot desactualizado nunca oculta filas existentes.
+
+Lo que la sesión inserta o descubre queda pendiente en ``session.info`` y se
+incorpora al snapshot recién en el ``commit``; un ``rollback`` lo descarta.
+"""
+
+import logging
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import polars as pl
+from sqlalchemy import event, func, or_, select, text
+from sqlalchemy.orm import Session
+from sqlmodel import SQLModel, col
+
+logger = logging.getLogger(__name__)
+
+# (tabla, campo clave, comparación en mayúsculas)
+SnapshotKey = tuple[str, str, bool]
+
+# (total de filas, max(id), max(updated_at))
+VersionTabla = tuple[int, int | None, datetime | None]
+
+_PENDIENTES_INFO = "catalog_snapshots_pendientes"
+_EVENTOS_INFO = "catalog_snapshots_eventos"
+
+
+@dataclass
+class CatalogSnapshot:
+    """Copia de un catálogo: una fila por clave con el id de la BD."""
+
+    model: type[SQLModel]
+    key_field: str
+    upper: bool
+    frame: pl.DataFrame
+    version: VersionTabla
+
+    def buscar(self, claves: set[Any]) -> dict[Any, int]:
+        """Retorna {clave: id} para las claves presentes en el snapshot."""
+        if self.frame.height == 0:
+            return {}
+        encontrados = self.frame.filter(pl.col("clave").is_in(list(claves)))
+        return dict(
+            zip(
+                encontrados["clave"].to_list(),
+                encontrados["id"].to_list(),
+                strict=True,
+            )
+        )
+
+
+def _armar_frame(filas: Iterable[tuple[Any, Any]]) -> pl.DataFrame:
+    """Arma el frame (clave, id) sin nulos, quedándose con el mayor id por clave."""
+    filas = [(clave, id_) for clave, id_ in filas if clave is not None]
+    frame = pl.DataFrame(
+        {
+            "clave": [clave for clave, _ in filas],
+            "id": [id_ for _, id_ in filas],
+        },
+        schema_overrides={"id": pl.Int64},
+    )
+    return frame.sort("id").unique(subset="clave", keep="last", maintain_order=True)
+
+
+def _unir_frames(base: pl.DataFrame, nuevo: pl.DataFrame) -> pl.DataFrame:
+    """Agrega filas al snapshot; las claves de ``nuevo`` pisan las existentes."""
+    if nuevo.height == 0:
+        return base
+    base = base.filter(
+        ~pl.col("id").is_in(nuevo["id"].implode())
+        & ~pl.col("clave").is_in(nuevo["clave"].implode())
+    )
+    return pl.concat([base, nuevo], how="vertical_relaxed")
+
+
+class CatalogSnapshotStore:
+    """
+    Snapshots de catálogos compartidos por todos los jobs del proceso.
+
+    Thread-safe: los procesadores bulk corren operaciones en paralelo con
+    ThreadPoolExecutor, por eso toda mutación pasa por un lock.
+    """
+
+    def __init__(self) -> None:
+        self._snapshots: dict[SnapshotKey, CatalogSnapshot] = {}
+        self._lock = threading.Lock()
+
+    # ===== CONSULTA =====
+
+    def lookup(
+        self,
+        session: Session,
+        model: type[SQLModel],
+        key_field: str,
+        claves: Iterable[Any],
+        *,
+        upper: bool = False,
+    ) -> dict[Any, int]:
+        """
+        Resuelve claves de un catálogo a ids.
+
+        Args:
+            session: Sesión sync del job
+            model: Modelo del catálogo (ej: Enfermedad)
+            key_field: Campo que identifica la fila (ej: "slug")
+            claves: Claves a resolver
+            upper: Comparar ``UPPER(key_field)`` (las claves se pasan a mayúsculas)
+
+        Returns:
+            Dict {clave: id} con las claves que existen (snapshot o BD)
+        """
+        buscadas = {
+            clave.upper() if upper and isinstance(clave, str) else clave
+            for clave in claves
+            if clave is not None
+        }
+        if not buscadas:
+            return {}
+
+        clave_snapshot = (model.__tablename__, key_field, upper)
+        snapshot = self._obtener_snapshot(session, model, key_field, upper)
+        encontrados = snapshot.buscar(buscadas)
+
+        pendientes = session.info.get(_PENDIENTES_INFO, {}).get(clave_snapshot, {})
+        for clave in buscadas - encontrados.keys():
+            if clave in pendientes:
+                encontrados[clave] = pendientes[clave]
+
+        # Lo que no está en el snapshot puede haberse creado después de cargarlo
+        faltantes = buscadas - encontrados.keys()
+        if faltantes:
+            desde_bd = dict(
+                self._consultar(session, model, key_field, upper, list(faltantes))
+            )
+            if desde_bd:
+                encontrados.update(desde_bd)
+                self.registrar(session, model, key_field, desde_bd, upper=upper)
+
+        return encontrados
+
+    def registrar(
+        self,
+        session: Session,
+        model: type[SQLModel],
+        key_field: str,
+        mapping: dict[Any, int],
+        *,
+        upper: bool = False,
+    ) -> None:
+        """
+        Registra filas insertadas o descubiertas por la sesión.
+
+        Quedan visibles para esa sesión de inmediato y se incorporan al
+        snapshot compartido cuando la sesión hace commit.
+        """
+        if not mapping:
+            return
+
+        self._escuchar_sesion(session)
+        clave_snapshot = (model.__tablename__, key_field, upper)
+        pendientes = session.info.setdefault(_PENDIENTES_INFO, {})
+        pendientes.setdefault(clave_snapshot, {}).update(
+            {
+                clave.upper() if upper and isinstance(clave, str) else clave: id_
+                for clave, id_ in mapping.items()
+                if clave is not None
+            }
+        )
+
+    # ===== VALIDACIÓN =====
+
+    def validar(self, session: Session) -> None:
+        """
+        Verifica la versión de cada tabla cacheada (una sola consulta).
+
+        Se llama al inicio de cada job. Las tablas que cambiaron se refrescan
+        con las filas nuevas o modificadas; si hubo borrados, se recargan.
+        """
+        with self._lock:
+            tablas = {
+                snapshot.model.__tablename__: snapshot.model
+                for snapshot in self._snapshots.values()
+            }
+        if not tablas:
+            return
+
+        versiones = self._consultar_versiones(session, tablas)
+
+        for tabla, version_actual in versiones.items():
+            with self._lock:
+                snapshots = [
+                    (clave, snapshot)
+                    for clave, snapshot in self._snapshots.items()
+                    if clave[0] == tabla
+                ]
+            for clave_snapshot, snapshot in snapshots:
+                if snapshot.version == version_actual:
+                    continue
+                refrescado = self._refrescar(session, snapshot, version_actual)
+                with self._lock:
+                    self._snapshots[clave_snapshot] = refrescado
+
+    def invalidar(self, model: type[SQLModel] | None = None) -> None:
+        """Descarta los snapshots de un modelo (o todos si no se indica)."""
+        with self._lock:
+            if model is None:
+                self._snapshots.clear()
+                return
+            for clave in [c for c in self._snapshots if c[0] == model.__tablename__]:
+                del self._snapshots[clave]
+
+    # ===== CARGA =====
+
+    def _obtener_snapshot(
+        self,
+        session: Session,
+        model: type[SQLModel],
+        key_field: str,
+        upper: bool,
+    ) -> CatalogSnapshot:
+        clave_snapshot = (model.__tablename__, key_field, upper)
+        with self._lock:
+            snapshot = self._snapshots.get(clave_snapshot)
+        if snapshot is not None:
+            return snapshot
+
+        snapshot = self._cargar(session, model, key_field, upper)
+        with self._lock:
+            return self._snapshots.setdefault(clave_snapshot, snapshot)
+
+    def _cargar(
+        self,
+        session: Session,
+        model: type[SQLModel],
+        key_field: str,
+        upper: bool,
+    ) -> CatalogSnapshot:
+        # La versión se lee antes que las filas: si entra una fila en el medio,
+        # el próximo validar() la vuelve a traer (el merge es idempotente)
+        tabla = model.__tablename__
+        version = self._consultar_versiones(session, {tabla: model})[tabla]
+        frame = _armar_frame(self._consultar(session, model, key_field, upper))
+        logger.debug(f"Snapshot {tabla}.{key_field} cargado: {frame.height} claves")
+        return CatalogSnapshot(model, key_field, upper, frame, version)
+
+    def _refrescar(
+        self,
+        session: Session,
+        snapshot: CatalogSnapshot,
+        version_actual: VersionTabla,
+    ) -> CatalogSnapshot:
+        total_previo, max_id_previo, max_updated_previo = snapshot.version
+        model = snapshot.model
+
+        filtros = []
+        if max_id_previo is not None:
+            filtros.append(col(model.id) > max_id_previo)
+        if max_updated_previo is not None:
+            filtros.append(col(model.updated_at) > max_updated_previo)
+        if not filtros:
+            return self._cargar(session, model, snapshot.key_field, snapshot.upper)
+
+        columna = self._columna_clave(model, snapshot.key_field, snapshot.upper)
+        stmt = select(columna, col(model.id), col(model.id) > (max_id_previo or 0))
+        delta = session.execute(stmt.where(or_(*filtros))).all()
+
+        # Si el total no cierra con las altas, hubo borrados: recargar
+        altas = sum(1 for _, _, es_alta in delta if es_alta)
+        if version_actual[0] != total_previo + altas:
+            return self._cargar(session, model, snapshot.key_field, snapshot.upper)
+
+        frame = _unir_frames(
+            snapshot.frame, _armar_frame((clave, id_) for clave, id_, _ in delta)
+        )
+        return CatalogSnapshot(
+            model, snapshot.key_field, snapshot.upper, frame, version_actual
+        )
+
+    @staticmethod
+    def _columna_clave(model: type[SQLModel], key_field: str, upper: bool) -> Any:
+        columna = col(getattr(model, key_field))
+        return func.upper(columna) if upper else columna
+
+    def _consultar(
+        self,
+        session: Session,
+        model: type[SQLModel],
+        key_field: str,
+        upper: bool,
+        claves: list[Any] | None = None,
+    ) -> list[tuple[Any, int]]:
+        columna = self._columna_clave(model, key_field, upper)
+        stmt = select(columna, col(model.id))
+        if claves is not None:
+            stmt = stmt.where(columna.in_(claves))
+        return [(clave, id_) for clave, id_ in session.execute(stmt).all()]
+
+    @staticmethod
+    def _consultar_versiones(
+        session: Session, tablas: dict[str, type[SQLModel]]
+    ) -> dict[str, VersionTabla]:
+        partes = [
+            f"SELECT '{tabla}' AS tabla, count(*) AS total, max(id) AS max_id, "
+            f"max(updated_at) AS max_updated FROM {tabla}"
+            for tabla in tablas
+        ]
+        filas = session.execute(text(" UNION ALL ".join(partes))).all()
+        return {
+            fila.tabla: (fila.total, fila.max_id, fila.max_updated) for fila in filas
+        }
+
+    # ===== CICLO DE VIDA DE LA SESIÓN =====
+
+    def _escuchar_sesion(self, session: Session) -> None:
+        if session.info.get(_EVENTOS_INFO):
+            return
+        session.info[_EVENTOS_INFO] = True
+        event.listen(session, "after_commit", self._al_commit)
+        event.listen(session, "after_rollback", self._al_rollback)
+
+    def _al_commit(self, session: Session) -> None:
+        pendientes = session.info.pop(_PENDIENTES_INFO, {})
+        with self._lock:
+            for clave_snapshot, mapping in pendientes.items():
+                snapshot = self._snapshots.get(clave_snapshot)
+                if snapshot is None:
+                    continue
+                snapshot.frame = _unir_frames(
+                    snapshot.frame, _armar_frame(mapping.items())
+                )
+
+    @staticmethod
+    def _al_rollback(session: Session) -> None:
+        session.info.pop(_PENDIENTES_INFO, None)
+
+
+# Instancia única por proceso (cada worker tiene la suya)
+catalog_snapshots = CatalogSnapshotStore()
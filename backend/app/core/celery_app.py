@@ -12,6 +12,7 @@ import logging
 from typing import Any
 
 from celery import Celery
+from celery.signals import worker_init
 
 from app.core.config import settings
 
@@ -35,6 +36,8 @@ def create_celery_app() -> Celery:
         include=[
             "app.domains.jobs.tasks",
             "app.domains.territorio.geocoding_tasks",
+            "app.domains.vigilancia_nominal.clasificacion.tasks",
+            "app.domains.alertas.tasks",
             # Agregar más módulos de tasks aquí
         ],
     )
@@ -64,6 +67,14 @@ def create_celery_app() -> Celery:
                 "queue": "file_processing",
                 "priority": 5,
             },
+            "app.domains.vigilancia_nominal.clasificacion.tasks.reclasificar_casos": {
+                "queue": "file_processing",
+                "priority": 3,
+            },
+            "app.domains.alertas.tasks.evaluar_alertas": {
+                "queue": "file_processing",
+                "priority": 3,
+            },
             "app.domains.jobs.tasks.cleanup_old_files": {
                 "queue": "maintenance",
                 "priority": 1,
@@ -102,10 +113,32 @@ def create_celery_app() -> Celery:
                 "schedule": 3600.0,  # Cada hora
                 "options": {"queue": "maintenance"},
             },
+            "crear-particiones-anio-siguiente": {
+                "task": "app.domains.jobs.tasks.crear_particiones_anio_siguiente",
+                "schedule": 86400.0,  # Una vez por día
+                "options": {"queue": "maintenance"},
+            },
         },
     )
 
-    # Test Redis connection on startup
+    logger.info("🎯 Celery configuration completed")
+    return celery_app
+
+
+# Instancia global de Celery
+celery_app = create_celery_app()
+
+
+@worker_init.connect
+def _verificar_redis(**kwargs: Any) -> None:
+    """
+    Prueba la conexión a Redis al arrancar un worker.
+
+    Corre en el arranque del worker y no al importar el módulo: la API
+    importa ``celery_app`` para encolar tasks y ya prueba Redis en su
+    lifespan, así que no paga estos round-trips (ni el timeout si Redis no
+    responde) en cada import.
+    """
     logger.info("🔍 Testing Redis connection...")
     try:
         # Import redis client to test connection
@@ -139,13 +172,6 @@ def create_celery_app() -> Celery:
         logger.error(f"❌ Full error details: {type(e).__name__}: {e!s}")
         logger.warning("⚠️ Celery will not work properly without Redis!")
 
-    logger.info("🎯 Celery configuration completed")
-    return celery_app
-
-
-# Instancia global de Celery
-celery_app = create_celery_app()
-
 
 # Task decorators para conveniencia
 def file_processing_task(*args: Any, **kwargs: Any) -> Any:
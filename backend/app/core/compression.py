@@ -0,0 +1,291 @@
+"""
+Compresión de respuestas negociada con ``Accept-Encoding``.
+
+Codificaciones, en orden de preferencia del servidor:
+- ``zstd`` (paquete ``zstandard``, extra ``compression``)
+- ``br`` (paquete ``brotli``, extra ``compression``)
+- ``gzip`` (stdlib, siempre disponible)
+
+Las que no están instaladas simplemente no se ofrecen. Entre las aceptadas
+por el cliente gana la de mayor ``q``; a igual ``q``, la preferida por el
+servidor.
+
+``CompressionMiddleware`` (ASGI puro):
+- Solo comprime tipos de texto (JSON, GeoJSON, CSV, ...) y bodies de al
+  menos ``COMPRESSION_MIN_BYTES``.
+- Si la respuesta viene en un solo mensaje la comprime de una vez (en un
+  thread si es grande, para no frenar el event loop).
+- Si viene en varios (``StreamingResponse``) comprime en streaming,
+  vaciando el compresor en cada chunk para que el cliente reciba los datos
+  a medida que se generan.
+- Respeta respuestas que ya traen ``Content-Encoding`` (ej: bodies
+  precomprimidos del cache de respuestas).
+"""
+
+import zlib
+from collections.abc import Callable
+from typing import Any
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+# Bodies más grandes se comprimen en un thread
+_UMBRAL_THREAD = 256 * 1024
+
+_TIPOS_COMPRIMIBLES = (
+    "application/json",
+    "application/geo+json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+# ===== COMPRESORES =====
+
+
+class _CompresorGzip:
+    def __init__(self) -> None:
+        # wbits=31: formato gzip (header y checksum)
+        self._obj = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def comprimir(self, chunk: bytes) -> bytes:
+        return self._obj.compress(chunk) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def terminar(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _CompresorBrotli:
+    def __init__(self) -> None:
+        import brotli
+
+        self._obj = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def comprimir(self, chunk: bytes) -> bytes:
+        return self._obj.process(chunk) + self._obj.flush()
+
+    def terminar(self) -> bytes:
+        return self._obj.finish()
+
+
+class _CompresorZstd:
+    def __init__(self) -> None:
+        import zstandard
+
+        self._flush_bloque = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._obj = zstandard.ZstdCompressor(
+            level=settings.COMPRESSION_ZSTD_LEVEL
+        ).compressobj()
+
+    def comprimir(self, chunk: bytes) -> bytes:
+        return self._obj.compress(chunk) + self._obj.flush(self._flush_bloque)
+
+    def terminar(self) -> bytes:
+        return self._obj.flush()
+
+
+def _gzip(body: bytes) -> bytes:
+    obj = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    return obj.compress(body) + obj.flush()
+
+
+def _brotli(body: bytes) -> bytes:
+    import brotli
+
+    return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+
+def _zstd(body: bytes) -> bytes:
+    import zstandard
+
+    return zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compress(
+        body
+    )
+
+
+def _detectar_codificaciones() -> dict[str, tuple[Callable[[bytes], bytes], type]]:
+    """Codificaciones instaladas, en orden de preferencia."""
+    codificaciones: dict[str, tuple[Callable[[bytes], bytes], type]] = {}
+    try:
+        import zstandard  # noqa: F401
+
+        codificaciones["zstd"] = (_zstd, _CompresorZstd)
+    except ImportError:
+        pass
+    try:
+        import brotli  # noqa: F401
+
+        codificaciones["br"] = (_brotli, _CompresorBrotli)
+    except ImportError:
+        pass
+    codificaciones["gzip"] = (_gzip, _CompresorGzip)
+    return codificaciones
+
+
+_CODIFICACIONES = _detectar_codificaciones()
+
+
+# ===== NEGOCIACIÓN =====
+
+
+def elegir_codificacion(accept_encoding: str | None) -> str | None:
+    """
+    Codificación para la respuesta según ``Accept-Encoding``.
+
+    Returns:
+        ``"zstd"``, ``"br"`` o ``"gzip"``, o None para mandar sin comprimir
+    """
+    if not accept_encoding:
+        return None
+
+    aceptadas: dict[str, float] = {}
+    for parte in accept_encoding.split(","):
+        codificacion, _, params = parte.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+        aceptadas[codificacion.strip().lower()] = q
+
+    comodin = aceptadas.get("*", 0.0)
+    mejor: str | None = None
+    mejor_q = 0.0
+    for codificacion in _CODIFICACIONES:
+        q = aceptadas.get(codificacion, comodin)
+        if q > mejor_q:
+            mejor, mejor_q = codificacion, q
+    return mejor
+
+
+def comprimir(body: bytes, codificacion: str) -> bytes:
+    """Comprime un body completo con la codificación dada."""
+    return _CODIFICACIONES[codificacion][0](body)
+
+
+async def comprimir_async(body: bytes, codificacion: str) -> bytes:
+    """Como ``comprimir``, en un thread si el body es grande."""
+    if len(body) < _UMBRAL_THREAD:
+        return comprimir(body, codificacion)
+    return await anyio.to_thread.run_sync(comprimir, body, codificacion)
+
+
+def es_comprimible(content_type: str | None) -> bool:
+    """Si vale la pena comprimir este tipo de contenido."""
+    if not content_type:
+        return False
+    tipo = content_type.split(";", 1)[0].strip().lower()
+    return (
+        tipo.startswith("text/")
+        or tipo.endswith("+json")
+        or tipo in _TIPOS_COMPRIMIBLES
+    )
+
+
+def agregar_vary(headers: MutableHeaders) -> None:
+    """Agrega ``Accept-Encoding`` al header ``Vary``."""
+    vary = headers.get("vary")
+    if vary is None:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+def _debilitar_etag(headers: MutableHeaders) -> None:
+    # Un ETag fuerte identifica los bytes exactos: al comprimir deja de valer
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+# ===== MIDDLEWARE =====
+
+
+class CompressionMiddleware:
+    """Comprime respuestas de texto con zstd, Brotli o gzip (ASGI puro)."""
+
+    def __init__(self, app: ASGIApp, min_bytes: int | None = None) -> None:
+        self.app = app
+        self.min_bytes = (
+            settings.COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        codificacion = elegir_codificacion(Headers(scope=scope).get("accept-encoding"))
+        if codificacion is None:
+            await self.app(scope, receive, send)
+            return
+
+        inicio: Message | None = None
+        compresor: Any = None
+        pasar = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal inicio, compresor, pasar
+
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                comprimible = es_comprimible(headers.get("content-type"))
+                if comprimible:
+                    agregar_vary(headers)
+                if (
+                    not comprimible
+                    or "content-encoding" in headers
+                    or message["status"] in (204, 304)
+                    or scope["method"] == "HEAD"
+                ):
+                    pasar = True
+                    await send(message)
+                else:
+                    # Se manda con el primer chunk, cuando se sabe el tamaño
+                    inicio = message
+                return
+
+            if pasar or message["type"] != "http.response.body":
+                if inicio is not None:
+                    await send(inicio)
+                    inicio = None
+                await send(message)
+                return
+
+            body: bytes = message.get("body", b"")
+            mas = message.get("more_body", False)
+
+            if inicio is not None:
+                headers = MutableHeaders(scope=inicio)
+                if not mas:
+                    # Respuesta completa en un solo mensaje
+                    if len(body) >= self.min_bytes:
+                        body = await comprimir_async(body, codificacion)
+                        headers["Content-Encoding"] = codificacion
+                        headers["Content-Length"] = str(len(body))
+                        _debilitar_etag(headers)
+                    await send(inicio)
+                    inicio = None
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                compresor = _CODIFICACIONES[codificacion][1]()
+                headers["Content-Encoding"] = codificacion
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                _debilitar_etag(headers)
+                await send(inicio)
+                inicio = None
+
+            chunk = compresor.comprimir(body) if body else b""
+            if not mas:
+                chunk += compresor.terminar()
+            await send({"type": "http.response.body", "body": chunk, "more_body": mas})
+
+        await self.app(scope, receive, send_wrapper)
@@ -29,6 +29,22 @@ class Settings(BaseSettings):
     # IMPORTANTE: Usar credenciales fuertes en producción
     DATABASE_URL: str = Field(...)
 
+    # Réplicas de solo lectura (opcional), separadas por coma, mismo formato que
+    # DATABASE_URL. Vacío = todas las lecturas van al primario.
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_HEALTHCHECK_SECONDS: int = 15
+    # Una réplica con más lag que esto se saltea hasta el próximo chequeo
+    REPLICA_MAX_LAG_SECONDS: float = 30.0
+    # Tras ver terminar un job, el usuario lee del primario durante este lapso
+    REPLICA_PRIMARY_AFTER_JOB_SECONDS: int = 60
+
+    @property
+    def DATABASE_READ_REPLICAS(self) -> list[str]:
+        """Convierte DATABASE_REPLICA_URLS en lista."""
+        return [
+            url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()
+        ]
+
     # =============================================================================
     # CONFIGURACIÓN DE SEGURIDAD
     # =============================================================================
@@ -81,12 +97,71 @@ class Settings(BaseSettings):
     # =============================================================================
     LOG_LEVEL: str = "INFO"
 
+    # Contabilidad de SQL por request (Server-Timing, N+1 y queries lentas)
+    SQL_STATS_ENABLED: bool = True
+    SQL_SLOW_QUERY_MS: int = 500
+    # Adjuntar el plan (EXPLAIN sin ANALYZE) al log de queries lentas
+    SQL_SLOW_QUERY_EXPLAIN: bool = False
+    # Una misma forma de statement repetida esta cantidad de veces = posible N+1
+    SQL_N1_THRESHOLD: int = 10
+
+    # Cache de respuestas con ETag de endpoints de referencia (app.core.response_cache)
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512
+    # La versión rota igual cada este lapso (cambios que no pasan por el ORM)
+    RESPONSE_CACHE_TTL_SECONDS: int = 3600
+
+    # Compresión de respuestas (zstd/br requieren el extra "compression"),
+    # ver app.core.compression
+    COMPRESSION_ENABLED: bool = True
+    # Bodies más chicos se mandan sin comprimir
+    COMPRESSION_MIN_BYTES: int = 1024
+    # Niveles rápidos: payloads grandes se comprimen en cada request
+    COMPRESSION_GZIP_LEVEL: int = 5
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Profiler por request (requiere el extra "profiling"), ver app.core.profiling
+    PROFILING_DIR: str = "./profiles"
+    # Header X-Profile: 1 (o ?profile=1) de un SUPERADMIN perfila ese request
+    PROFILING_HEADER_ENABLED: bool = True
+    # Fracción de requests perfilados (0 = apagado); se guardan solo los lentos
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_SLOW_MS: int = 2000
+    PROFILING_INTERVAL_MS: float = 1.0
+
     # =============================================================================
     # CONFIGURACIÓN ESPECÍFICA DE EPIDEMIOLOGÍA
     # =============================================================================
     DEFAULT_TIMEZONE: str = "America/Argentina/Buenos_Aires"
     PAGINATION_PAGE_SIZE: int = 50
     PAGINATION_MAX_PAGE_SIZE: int = 200
+    # Listado de personas desde ciudadano_resumen_casos (mantenida en la ingesta)
+    # cuando no hay filtros a nivel de caso
+    PERSONAS_USAR_RESUMEN: bool = True
+    # Vinculación de ciudadanos duplicados (ver app.domains.vigilancia_nominal
+    # .procesamiento.vinculacion): score mínimo para proponer un par, y bloques
+    # más grandes que esto se ignoran (claves demasiado comunes)
+    VINCULACION_HABILITADA: bool = True
+    VINCULACION_UMBRAL: float = 0.85
+    VINCULACION_MAX_BLOQUE: int = 500
+    # Procesos para las réplicas Monte Carlo del scan de clusters
+    # espacio-temporales (0 = cantidad de CPUs; nunca más que las CPUs). Con
+    # varios workers de uvicorn cada uno tiene su propio pool
+    CLUSTERS_PROCESOS: int = 4
+    # Alertas por umbral endémico evaluadas después de cada ingesta (ver
+    # app.domains.alertas): una alerta se cierra tras ALERTAS_SEMANAS_CIERRE
+    # semanas seguidas sin señal, y no se abre con menos de ALERTAS_MIN_CASOS
+    # casos en la semana
+    ALERTAS_HABILITADAS: bool = True
+    ALERTAS_SEMANAS_CIERRE: int = 2
+    ALERTAS_MIN_CASOS: int = 3
+    # Población de referencia en memoria: cada cuánto se compara la versión
+    # del seed de población (tabla seed_estado) para recargarla
+    POBLACION_VERIFICAR_SEGUNDOS: int = 300
+    # Crecimiento anual para proyectar departamentos con un solo censo cargado
+    POBLACION_CRECIMIENTO_ANUAL: float = 0.0
+    # Población estándar de las tasas ajustadas por edad (OMS_2000 o SEGI_1960)
+    POBLACION_ESTANDAR: str = "OMS_2000"
 
     # =============================================================================
     # CONFIGURACIÓN DE GEOCODIFICACIÓN
@@ -1,12 +1,18 @@
 """Configuración de la base de datos."""
 
+import asyncio
 import logging
 from collections.abc import AsyncGenerator, Generator
+from typing import Any
 
+from fastapi import Request
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
 
 from app.core.config import settings
+from app.core.replicas import Replica, debe_leer_primario, replica_router
+from app.core.sql_stats import instrumentar_engine
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +27,14 @@ engine = create_engine(database_url_sync, echo=False)
 
 async_engine = create_async_engine(database_url_async, echo=False)
 
+for _engine in (
+    engine,
+    async_engine.sync_engine,
+    *(replica.engine for replica in replica_router.replicas),
+    *(replica.async_engine.sync_engine for replica in replica_router.replicas),
+):
+    instrumentar_engine(_engine)
+
 
 def get_session() -> Generator[Session, None, None]:
     """Obtiene una sesión de base de datos."""
@@ -37,6 +51,88 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+def _usuario_de_request(request: Request) -> int | None:
+    """user_id del token Bearer, sin ir a la BD (solo para rutear lecturas)."""
+    from app.domains.autenticacion.security import TokenSecurity
+
+    auth_header = request.headers.get("authorization", "")
+    if not auth_header.startswith("Bearer "):
+        return None
+    token_data = TokenSecurity.verificar_token(auth_header[len("Bearer ") :])
+    return token_data.user_id if token_data else None
+
+
+def _elegir_replica(request: Request) -> Replica | None:
+    """Réplica para las lecturas del request, o None para usar el primario."""
+    if debe_leer_primario(_usuario_de_request(request)):
+        return None
+    return replica_router.elegir()
+
+
+class SesionLectura(Session):
+    """
+    Sesión de solo lectura que sobrevive a la caída de una réplica.
+
+    Si una consulta contra una réplica falla por la conexión (desconexión,
+    réplica apagada, conflicto con la recuperación), la réplica sale de la
+    rotación y la consulta se repite en el primario; el resto de la sesión
+    sigue en el primario. Los errores de la consulta en sí se propagan.
+
+    Como solo lee, repetir la consulta es seguro. Bajo un AsyncSession se usa
+    como ``sync_session_class``.
+    """
+
+    def _execute_internal(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return super()._execute_internal(statement, *args, **kwargs)
+        except DBAPIError as e:
+            replica = replica_router.replica_de(self.bind)
+            if replica is None or not (
+                e.connection_invalidated
+                or isinstance(e, OperationalError | InterfaceError)
+            ):
+                raise
+            logger.warning(
+                f"⚠️ Réplica {replica.nombre} falló durante una consulta, "
+                f"se repite en el primario: {e.orig}"
+            )
+            replica_router.marcar_caida(replica)
+            self.rollback()
+            self.bind = (
+                engine if self.bind is replica.engine else async_engine.sync_engine
+            )
+            return super()._execute_internal(statement, *args, **kwargs)
+
+
+def get_read_session(request: Request) -> Generator[Session, None, None]:
+    """
+    Sesión de solo lectura: réplica sana si hay, si no el primario.
+
+    Solo para endpoints que no escriben (ver ``app.core.replicas``).
+    """
+    replica = _elegir_replica(request) if replica_router.habilitado else None
+    session = SesionLectura(replica.engine if replica else engine)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+async def get_async_read_session(
+    request: Request,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Versión asíncrona de ``get_read_session``."""
+    replica = None
+    if replica_router.habilitado:
+        # El chequeo de salud y Redis son bloqueantes: fuera del event loop
+        replica = await asyncio.to_thread(_elegir_replica, request)
+    async with AsyncSession(
+        replica.async_engine if replica else async_engine,
+        sync_session_class=SesionLectura,
+    ) as session:
+        yield session
+
+
 def create_db_and_tables() -> None:
     """Crea las tablas de la base de datos."""
     try:
@@ -1,22 +1,26 @@
-"""Middleware personalizado para manejo de excepciones, autenticación y otros aspectos transversales."""
+"""
+Middleware personalizado para manejo de excepciones, logging y headers.
+
+Todos son ASGI puros (sin ``BaseHTTPMiddleware``): no envuelven el body de la
+respuesta en una tarea y un memory stream aparte, así que no agregan latencia
+y las respuestas grandes se transmiten en streaming de verdad. Los headers se
+agregan al pasar el mensaje ``http.response.start``.
+"""
 
 import logging
 import time
 import traceback
-from collections.abc import Callable
 from typing import Any
 from uuid import uuid4
 
-from fastapi import FastAPI, HTTPException, Request, Response, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer
-from starlette.middleware.base import (
-    BaseHTTPMiddleware,
-    DispatchFunction,
-    RequestResponseEndpoint,
-)
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
 from app.core.exceptions import (
     AuthenticationException,
     AuthorizationException,
@@ -28,169 +32,128 @@ from app.core.exceptions import (
     NotFoundException,
     ValidationException,
 )
+from app.core.profiling import ProfilingMiddleware
 from app.core.schemas.response import ErrorDetail, ErrorResponse
+from app.core.sql_stats import finalizar_request, iniciar_request
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
 
-class ExceptionHandlerMiddleware(BaseHTTPMiddleware):
+def _state(scope: Scope) -> dict[str, Any]:
+    """El dict que Starlette expone como ``request.state``."""
+    return scope.setdefault("state", {})
+
+
+class ExceptionHandlerMiddleware:
     """Middleware para manejo centralizado de excepciones."""
 
-    def __init__(
-        self, app: ASGIApp, dispatch: DispatchFunction | None = None
-    ) -> None:
-        super().__init__(app, dispatch)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        """Procesa la request y maneja excepciones."""
         # Generar ID único para tracking
         request_id = str(uuid4())
-        request.state.request_id = request_id
+        _state(scope)["request_id"] = request_id
+        response_started = False
 
-        try:
-            response: Response = await call_next(request)
-            return response
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
-        except EpidemiologiaException as e:
-            return await self._handle_epidemiologia_exception(e, request_id)
-        except HTTPException as e:
-            return await self._handle_http_exception(e, request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+            return
         except Exception as e:
-            return await self._handle_generic_exception(e, request_id)
-
-    async def _handle_epidemiologia_exception(
-        self, exc: EpidemiologiaException, request_id: str
-    ) -> JSONResponse:
-        """Maneja excepciones específicas del dominio."""
-        status_code = self._get_status_code_for_exception(exc)
-
-        error_detail = ErrorDetail(
-            code=exc.error_code or "UNKNOWN_ERROR", message=exc.message, field=None
-        )
-
-        response = ErrorResponse(error=error_detail, request_id=request_id)
-
-        return JSONResponse(status_code=status_code, content=response.model_dump())
-
-    async def _handle_http_exception(
-        self, exc: HTTPException, request_id: str
-    ) -> JSONResponse:
-        """Maneja excepciones HTTP.
-
-        Si es una excepción estructurada (con code), la usa.
-        Si no, es la red de seguridad para excepciones no estructuradas.
-        """
-        # Red de seguridad para HTTPException de FastAPI o librerías externas
-        # En nuestro código NO deberíamos llegar aquí nunca
-        error_detail = ErrorDetail(
-            code=f"HTTP_{exc.status_code}",
-            message=str(exc.detail) if exc.detail else f"Error HTTP {exc.status_code}",
-            field=None,
-        )
+            # Con la respuesta ya iniciada no se puede mandar otra
+            if response_started:
+                raise
+            if isinstance(e, EpidemiologiaException):
+                response = await _handle_epidemiologia_exception(e, request_id)
+            elif isinstance(e, HTTPException):
+                response = await _handle_http_exception(e, request_id)
+            else:
+                response = await _handle_generic_exception(e, request_id)
+        await response(scope, receive, send)
 
-        # Log para identificar excepciones HTTP no estructuradas
-        logger.warning(f"HTTPException no estructurada [{request_id}]: {exc.detail}")
 
-        response = ErrorResponse(error=error_detail, request_id=request_id)
+class SQLStatsMiddleware:
+    """Contabilidad de SQL por request (Server-Timing, N+1)."""
 
-        return JSONResponse(status_code=exc.status_code, content=response.model_dump())
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-    async def _handle_generic_exception(
-        self, exc: Exception, request_id: str
-    ) -> JSONResponse:
-        """Red de seguridad para excepciones no esperadas.
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        Esto SOLO debería ocurrir con bugs reales.
-        En producción, no exponer detalles del error.
-        """
-        # Log completo para debugging (error crítico)
-        error_traceback = traceback.format_exc()
-        logger.error(f"Excepción no manejada [{request_id}]: {error_traceback}")
+        stats, token = iniciar_request()
+        _state(scope)["sql_stats"] = stats
 
-        error_detail = ErrorDetail(
-            code="INTERNAL_SERVER_ERROR",
-            message="Se produjo un error interno. Por favor, intente nuevamente.",
-            field=None,
-        )
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["Server-Timing"] = stats.server_timing()
+            await send(message)
 
-        response = ErrorResponse(error=error_detail, request_id=request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finalizar_request(stats, token, f"{scope['method']} {scope['path']}")
 
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=response.model_dump(),
-        )
 
-    def _get_status_code_for_exception(self, exc: EpidemiologiaException) -> int:
-        """Mapea tipos de excepción a códigos HTTP."""
-        if isinstance(exc, ValidationException):
-            return status.HTTP_422_UNPROCESSABLE_ENTITY
-        elif isinstance(exc, BusinessRuleException):
-            return status.HTTP_400_BAD_REQUEST
-        elif isinstance(exc, NotFoundException):
-            return status.HTTP_404_NOT_FOUND
-        elif isinstance(exc, DuplicateException):
-            return status.HTTP_409_CONFLICT
-        elif isinstance(exc, AuthenticationException):
-            return status.HTTP_401_UNAUTHORIZED
-        elif isinstance(exc, AuthorizationException):
-            return status.HTTP_403_FORBIDDEN
-        elif isinstance(exc, ExternalServiceException):
-            return status.HTTP_502_BAD_GATEWAY
-        elif isinstance(exc, DatabaseException):
-            return status.HTTP_500_INTERNAL_SERVER_ERROR
-        else:
-            return status.HTTP_500_INTERNAL_SERVER_ERROR
-
-
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """Middleware para logging de requests."""
 
-    def __init__(
-        self, app: ASGIApp, dispatch: DispatchFunction | None = None
-    ) -> None:
-        super().__init__(app, dispatch)
-
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        """Procesa la request y registra información."""
-        start_time = time.time()
-
-        # Capturar info de request
-        method = request.method
-        path = request.url.path
-        request_id = getattr(request.state, "request_id", "unknown")
-
-        # Procesar request
-        response: Response = await call_next(request)
-
-        # Log de actividad (requerido por estándar DGT)
-        process_time = time.time() - start_time
-        status_code = response.status_code
-
-        # Log estructurado para monitoreo
-        logger.info(
-            f"{method} {path} - {status_code} - {process_time:.3f}s",
-            extra={
-                "request_id": request_id,
-                "method": method,
-                "path": path,
-                "status_code": status_code,
-                "duration_ms": int(process_time * 1000),
-            },
-        )
-
-        # Agregar headers de response
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Process-Time"] = str(process_time)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        return response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+        start_time = time.time()
+        method = scope["method"]
+        path = scope["path"]
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                process_time = time.time() - start_time
+                status_code = message["status"]
+                state = _state(scope)
+                request_id = state.get("request_id", "unknown")
+                sql_stats = state.get("sql_stats")
+
+                # Log estructurado para monitoreo (requerido por estándar DGT)
+                logger.info(
+                    f"{method} {path} - {status_code} - {process_time:.3f}s",
+                    extra={
+                        "request_id": request_id,
+                        "method": method,
+                        "path": path,
+                        "status_code": status_code,
+                        "duration_ms": int(process_time * 1000),
+                        "sql_statements": sql_stats.statements if sql_stats else None,
+                        "sql_ms": round(sql_stats.tiempo_ms, 1) if sql_stats else None,
+                    },
+                )
+
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = str(request_id)
+                headers["X-Process-Time"] = str(process_time)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class SecurityHeadersMiddleware:
     """
     Middleware para agregar headers de seguridad HTTP
 
@@ -201,197 +164,109 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - Información del servidor
     """
 
-    def __init__(
-        self, app: ASGIApp, dispatch: DispatchFunction | None = None
-    ) -> None:
-        super().__init__(app, dispatch)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        response = await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Prevenir XSS
-        response.headers["X-Content-Type-Options"] = "nosniff"
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
 
-        # Prevenir clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
+                # Prevenir XSS
+                headers["X-Content-Type-Options"] = "nosniff"
 
-        # XSS Protection (legacy pero aún útil)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
+                # Prevenir clickjacking
+                headers["X-Frame-Options"] = "DENY"
 
-        # Content Security Policy (CSP) - Básico para APIs
-        response.headers["Content-Security-Policy"] = "default-src 'self'"
-
-        # HSTS - Forzar HTTPS en producción
-        # Solo habilitar en producción con HTTPS configurado
-        if request.url.scheme == "https":
-            response.headers["Strict-Transport-Security"] = (
-                "max-age=31536000; includeSubDomains"
-            )
+                # XSS Protection (legacy pero aún útil)
+                headers["X-XSS-Protection"] = "1; mode=block"
 
-        # Remover headers que exponen información del servidor
-        if "Server" in response.headers:
-            del response.headers["Server"]
+                # Content Security Policy (CSP) - Básico para APIs
+                headers["Content-Security-Policy"] = "default-src 'self'"
 
-        # Referrer Policy - No enviar información de referrer
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+                # HSTS - Forzar HTTPS en producción
+                if scope.get("scheme") == "https":
+                    headers["Strict-Transport-Security"] = (
+                        "max-age=31536000; includeSubDomains"
+                    )
 
-        # Permissions Policy - Deshabilitar features no necesarios
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), microphone=(), camera=()"
-        )
+                # Remover headers que exponen información del servidor
+                if "Server" in headers:
+                    del headers["Server"]
 
-        return response
+                # Referrer Policy - No enviar información de referrer
+                headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
 
+                # Permissions Policy - Deshabilitar features no necesarios
+                headers["Permissions-Policy"] = (
+                    "geolocation=(), microphone=(), camera=()"
+                )
+            await send(message)
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    """
-    Global authentication middleware
-    Simple middleware for CORS preflight handling only
-    Authentication is handled explicitly by FastAPI dependencies
-    """
+        await self.app(scope, receive, send_wrapper)
 
-    def __init__(
-        self, app: ASGIApp, dispatch: DispatchFunction | None = None
-    ) -> None:
-        super().__init__(app, dispatch)
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        # Skip for OPTIONS requests (CORS preflight)
-        if request.method == "OPTIONS":
-            return await call_next(request)
+class AccessLogMiddleware:
+    """Log de requests entrantes (inicio y fin, con IP del cliente)."""
 
-        return await call_next(request)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-def setup_middleware(app: FastAPI) -> None:
-    """Configura todos los middlewares de la aplicación.
-
-    Nota: El orden de add_middleware es inverso al orden de ejecución.
-    El último middleware agregado es el primero en procesar la request.
-    """
-    # Los middlewares se agregan en orden inverso al deseado
-    # porque FastAPI los apila (el último agregado es el primero en ejecutar)
-
-    # 1. Exception handler (más externo - captura todo)
-    app.middleware("http")(create_exception_handler_middleware())
-
-    # 2. Request logging
-    app.middleware("http")(create_logging_middleware())
-
-    # 3. Security headers
-    app.middleware("http")(create_security_headers_middleware())
-
-    # 4. Auth middleware (más interno)
-    app.middleware("http")(create_auth_middleware())
-
-
-def create_exception_handler_middleware() -> Callable[
-    [Request, Callable[[Request], Any]], Any
-]:
-    """Factory para el middleware de manejo de excepciones."""
-
-    async def middleware(
-        request: Request, call_next: Callable[[Request], Any]
-    ) -> Response:
-        request_id = str(uuid4())
-        request.state.request_id = request_id
-
-        try:
-            response: Response = await call_next(request)
-            return response
-        except EpidemiologiaException as e:
-            return await _handle_epidemiologia_exception(e, request_id)
-        except HTTPException as e:
-            return await _handle_http_exception(e, request_id)
-        except Exception as e:
-            return await _handle_generic_exception(e, request_id)
-
-    return middleware
-
-
-def create_logging_middleware() -> Callable[[Request, Callable[[Request], Any]], Any]:
-    """Factory para el middleware de logging."""
-
-    async def middleware(
-        request: Request, call_next: Callable[[Request], Any]
-    ) -> Response:
         start_time = time.time()
-        method = request.method
-        path = request.url.path
-        request_id = getattr(request.state, "request_id", "unknown")
-
-        response: Response = await call_next(request)
-
-        process_time = time.time() - start_time
-        status_code = response.status_code
-
-        logger.info(
-            f"{method} {path} - {status_code} - {process_time:.3f}s",
-            extra={
-                "request_id": request_id,
-                "method": method,
-                "path": path,
-                "status_code": status_code,
-                "duration_ms": int(process_time * 1000),
-            },
-        )
-
-        response.headers["X-Request-ID"] = str(request_id)
-        response.headers["X-Process-Time"] = str(process_time)
-
-        return response
-
-    return middleware
-
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
 
-def create_security_headers_middleware() -> Callable[
-    [Request, Callable[[Request], Any]], Any
-]:
-    """Factory para el middleware de headers de seguridad."""
+        logger.info(f"🔍 {method} {path} - IP: {client[0] if client else 'unknown'}")
 
-    async def middleware(
-        request: Request, call_next: Callable[[Request], Any]
-    ) -> Response:
-        response: Response = await call_next(request)
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                process_time = time.time() - start_time
+                logger.info(
+                    f"✅ {method} {path} - "
+                    f"Status: {message['status']} - "
+                    f"Time: {process_time:.3f}s"
+                )
+            await send(message)
 
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Content-Security-Policy"] = "default-src 'self'"
+        await self.app(scope, receive, send_wrapper)
 
-        if request.url.scheme == "https":
-            response.headers["Strict-Transport-Security"] = (
-                "max-age=31536000; includeSubDomains"
-            )
-
-        if "Server" in response.headers:
-            del response.headers["Server"]
 
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), microphone=(), camera=()"
-        )
+def setup_middleware(app: FastAPI) -> None:
+    """Configura todos los middlewares de la aplicación.
 
-        return response
+    Nota: El orden de add_middleware es inverso al orden de ejecución.
+    El último middleware agregado es el primero en procesar la request.
+    """
+    # 1. Exception handler (más interno - genera el request_id)
+    app.add_middleware(ExceptionHandlerMiddleware)
 
-    return middleware
+    # 2. Compresión (zstd/br/gzip); adentro del logging para que los tiempos
+    # incluyan el costo de comprimir
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(CompressionMiddleware)
 
+    # 3. Contabilidad de SQL del request (Server-Timing, N+1)
+    if settings.SQL_STATS_ENABLED:
+        app.add_middleware(SQLStatsMiddleware)
 
-def create_auth_middleware() -> Callable[[Request, Callable[[Request], Any]], Any]:
-    """Factory para el middleware de autenticación."""
+    # 4. Request logging
+    app.add_middleware(RequestLoggingMiddleware)
 
-    async def middleware(
-        request: Request, call_next: Callable[[Request], Any]
-    ) -> Response:
-        if request.method == "OPTIONS":
-            return await call_next(request)
-        return await call_next(request)
+    # 5. Security headers
+    app.add_middleware(SecurityHeadersMiddleware)
 
-    return middleware
+    # 6. Profiler por request (opt-in, ver app.core.profiling)
+    app.add_middleware(ProfilingMiddleware)
 
 
 async def _handle_epidemiologia_exception(
@@ -0,0 +1,120 @@
+"""
+Paginación por keyset (cursor).
+
+A diferencia de ``OFFSET``, el costo de pedir la página siguiente no crece con
+la profundidad: la query continúa desde los valores de ordenamiento de la
+última fila vista, usando los índices.
+
+El cursor es opaco para el cliente: base64 de una lista JSON con los valores
+de las columnas de ordenamiento de la última fila.
+"""
+
+import base64
+import json
+from collections.abc import Sequence
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import ColumnElement, Row, and_, false, or_
+
+# (expresión, descendente)
+KeysetColumn = tuple[ColumnElement[Any], bool]
+
+
+class InvalidCursorError(ValueError):
+    """El cursor recibido no es válido para esta consulta."""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Codifica los valores de ordenamiento de la última fila como cursor.
+
+    Args:
+        values: Valores en el mismo orden que las columnas de ordenamiento
+
+    Returns:
+        Cursor opaco (base64 url-safe)
+    """
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, expected_length: int) -> list[Any]:
+    """
+    Decodifica un cursor generado por ``encode_cursor``.
+
+    Raises:
+        InvalidCursorError: Si el cursor está corrupto o no corresponde
+            a la cantidad de columnas de ordenamiento
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Cursor inválido") from e
+    if not isinstance(values, list) or len(values) != expected_length:
+        raise InvalidCursorError("Cursor no corresponde al ordenamiento pedido")
+    return [_decode_value(v) for v in values]
+
+
+def keyset_condition(
+    columns: Sequence[KeysetColumn], values: Sequence[Any]
+) -> ColumnElement[bool]:
+    """
+    Condición "filas posteriores a ``values``" para un ordenamiento dado.
+
+    Soporta direcciones mezcladas (ej: relevancia DESC, nombre ASC), por lo
+    que se expande como ``(a > x) OR (a = x AND b > y) OR ...`` en lugar de
+    una comparación de tuplas. Las expresiones no deben ser NULL (usar
+    ``coalesce`` en las columnas de ordenamiento).
+
+    Args:
+        columns: Columnas de ordenamiento con su dirección
+        values: Valores de la última fila vista
+
+    Returns:
+        Condición SQLAlchemy para aplicar con ``where``
+    """
+    clauses = []
+    for i, (column, descending) in enumerate(columns):
+        previous_equal = [columns[j][0] == values[j] for j in range(i)]
+        after = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*previous_equal, after))
+    return or_(*clauses) if clauses else false()
+
+
+def split_page(
+    rows: Sequence[Row[Any]], page_size: int, columns: Sequence[KeysetColumn]
+) -> tuple[list[Row[Any]], str | None]:
+    """
+    Separa la página de la fila extra pedida con ``LIMIT page_size + 1``.
+
+    Args:
+        rows: Filas devueltas por la query (hasta ``page_size + 1``)
+        page_size: Tamaño de página
+        columns: Columnas de ordenamiento; la fila debe exponerlas con el
+            mismo nombre
+
+    Returns:
+        Filas de la página y cursor de la siguiente (None si es la última)
+    """
+    page = list(rows[:page_size])
+    if len(rows) <= page_size:
+        return page, None
+    return page, encode_cursor([page[-1]._mapping[c.name] for c, _ in columns])
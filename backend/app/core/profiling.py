@@ -0,0 +1,148 @@
+"""
+Profiler por request (opt-in) para medir latencia en producción.
+
+Usa pyinstrument (extra ``profiling``), que muestrea el stack y entiende
+async: el tiempo de cada ``await`` se atribuye al request perfilado y no a
+otros requests del mismo event loop. Si no está instalado, el middleware
+no hace nada.
+
+Se perfila un request cuando:
+- Trae el header ``X-Profile: 1`` (o el query param ``?profile=1``, para
+  Swagger u otros clientes que no dejan agregar headers) y el token es de un
+  SUPERADMIN (``PROFILING_HEADER_ENABLED``). El artefacto se guarda siempre y su nombre
+  vuelve en el header ``X-Profile-Artifact``.
+- Cae en el muestreo ``PROFILING_SAMPLE_RATE`` (0 = apagado). El artefacto se
+  guarda solo si el request tardó más de ``PROFILING_SLOW_MS``.
+
+El artefacto es el HTML de pyinstrument (árbol de llamadas y flame graph en
+la vista timeline) en ``PROFILING_DIR``. El código sync que FastAPI corre en
+el threadpool aparece como el ``await`` que lo espera.
+"""
+
+import logging
+import random
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_PARAM = "profile"
+ARTIFACT_HEADER = "X-Profile-Artifact"
+
+_pyinstrument_disponible: bool | None = None
+
+
+def _profiler_disponible() -> bool:
+    global _pyinstrument_disponible
+    if _pyinstrument_disponible is None:
+        try:
+            import pyinstrument  # noqa: F401
+
+            _pyinstrument_disponible = True
+        except ImportError:
+            logger.warning(
+                "⚠️ Profiling pedido pero pyinstrument no está instalado "
+                "(instalar el extra 'profiling')"
+            )
+            _pyinstrument_disponible = False
+    return _pyinstrument_disponible
+
+
+def _pedido_por_admin(scope: Scope) -> bool:
+    """``X-Profile: 1`` (header o query param) con un token de SUPERADMIN."""
+    headers = Headers(scope=scope)
+    pedido = (
+        headers.get(PROFILE_HEADER) == "1"
+        or QueryParams(scope.get("query_string", b"")).get(PROFILE_PARAM) == "1"
+    )
+    if not pedido:
+        return False
+    auth_header = headers.get("authorization", "")
+    if not auth_header.startswith("Bearer "):
+        return False
+
+    from app.domains.autenticacion.models import UserRole
+    from app.domains.autenticacion.security import TokenSecurity
+
+    token_data = TokenSecurity.verificar_token(auth_header[len("Bearer ") :])
+    return token_data is not None and token_data.rol == UserRole.SUPERADMIN.value
+
+
+def _nombre_artefacto(scope: Scope) -> str:
+    ruta = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+    request_id = str(scope.get("state", {}).get("request_id", "sin_id"))[:8]
+    fecha = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"{fecha}_{scope['method']}_{ruta[:80]}_{request_id}.html"
+
+
+def _guardar(profiler: Any, nombre: str) -> Path:
+    directorio = Path(settings.PROFILING_DIR)
+    directorio.mkdir(parents=True, exist_ok=True)
+    ruta = directorio / nombre
+    ruta.write_text(profiler.output_html(), encoding="utf-8")
+    return ruta
+
+
+class ProfilingMiddleware:
+    """Perfila requests puntuales y guarda el flame graph (ASGI puro)."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        por_header = settings.PROFILING_HEADER_ENABLED and _pedido_por_admin(scope)
+        por_muestreo = (
+            not por_header
+            and settings.PROFILING_SAMPLE_RATE > 0
+            and random.random() < settings.PROFILING_SAMPLE_RATE
+        )
+        if not (por_header or por_muestreo) or not _profiler_disponible():
+            await self.app(scope, receive, send)
+            return
+
+        from pyinstrument import Profiler
+
+        nombre: str | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal nombre
+            if message["type"] == "http.response.start" and por_header:
+                nombre = _nombre_artefacto(scope)
+                MutableHeaders(scope=message)[ARTIFACT_HEADER] = nombre
+            await send(message)
+
+        profiler = Profiler(
+            interval=settings.PROFILING_INTERVAL_MS / 1000, async_mode="enabled"
+        )
+        inicio = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            duracion_ms = (time.perf_counter() - inicio) * 1000
+            if por_header or duracion_ms >= settings.PROFILING_SLOW_MS:
+                try:
+                    ruta = await anyio.to_thread.run_sync(
+                        _guardar, profiler, nombre or _nombre_artefacto(scope)
+                    )
+                    logger.info(
+                        f"🔥 Perfil de {scope['method']} {scope['path']} "
+                        f"({duracion_ms:.0f} ms): {ruta}"
+                    )
+                except OSError as e:
+                    logger.warning(f"No se pudo guardar el perfil: {e}")
@@ -0,0 +1,224 @@
+"""
+Ruteo de lecturas a réplicas de PostgreSQL.
+
+Los endpoints analíticos (charts, métricas, boletines, exports, geografía)
+leen con ``get_read_session`` / ``get_async_read_session`` (ver
+``app.core.database``). Si hay réplicas configuradas en
+``DATABASE_REPLICA_URLS`` se reparten en round-robin entre las sanas; si no
+hay ninguna sana, o no hay réplicas, se usa el primario.
+
+Salud:
+- Cada ``REPLICA_HEALTHCHECK_SECONDS`` se consulta el lag de replay de cada
+  réplica. Con error de conexión o lag mayor a ``REPLICA_MAX_LAG_SECONDS``
+  queda fuera hasta el próximo chequeo.
+- Un error de conexión durante una consulta la marca caída en el momento y
+  la consulta se repite en el primario (ver ``SesionLectura`` en
+  ``app.core.database``): el request no falla por una réplica que se cae.
+
+Lecturas después de un job:
+- Cuando un usuario ve terminar un job (endpoint de estado), se marca en
+  Redis que ese usuario lea del primario durante
+  ``REPLICA_PRIMARY_AFTER_JOB_SECONDS``, así no ve datos previos a la carga
+  por el lag de la réplica.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Engine, create_engine, event, make_url, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Lag de replay en segundos. Si la réplica ya aplicó todo lo recibido el lag
+# es 0 aunque el último commit sea viejo (primario sin escrituras).
+_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+_PREFIJO_PRIMARIO = "lectura_primario:"
+
+
+@dataclass
+class Replica:
+    """Una réplica con sus engines y su último estado conocido."""
+
+    nombre: str
+    engine: Engine
+    async_engine: AsyncEngine
+    sana: bool = True
+    lag: float = 0.0
+    chequeada_en: float = field(default=0.0)
+
+
+class ReplicaRouter:
+    """
+    Elige la réplica para una lectura.
+
+    Thread-safe: las dependencias sync corren en el threadpool de FastAPI.
+    """
+
+    def __init__(
+        self, urls: list[str], intervalo_chequeo: float, max_lag: float
+    ) -> None:
+        self.replicas = [self._crear_replica(url) for url in urls]
+        self.intervalo_chequeo = intervalo_chequeo
+        self.max_lag = max_lag
+        self._turno = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def habilitado(self) -> bool:
+        return bool(self.replicas)
+
+    def _crear_replica(self, url: str) -> Replica:
+        url_async = make_url(url)
+        url_sync = url_async.set(drivername="postgresql")
+        replica = Replica(
+            nombre=url_async.render_as_string(hide_password=True),
+            engine=create_engine(
+                url_sync, pool_pre_ping=True, connect_args={"connect_timeout": 2}
+            ),
+            async_engine=create_async_engine(
+                url_async, pool_pre_ping=True, connect_args={"timeout": 2}
+            ),
+        )
+
+        def _on_error(context: Any) -> None:
+            if context.is_disconnect:
+                self._marcar(replica, sana=False)
+
+        event.listen(replica.engine, "handle_error", _on_error)
+        event.listen(replica.async_engine.sync_engine, "handle_error", _on_error)
+        return replica
+
+    def _marcar(self, replica: Replica, sana: bool, lag: float = 0.0) -> None:
+        if replica.sana != sana:
+            if sana:
+                logger.info(f"✅ Réplica {replica.nombre} disponible (lag {lag:.1f}s)")
+            else:
+                logger.warning(f"⚠️ Réplica {replica.nombre} fuera de servicio")
+        replica.sana = sana
+        replica.lag = lag
+        replica.chequeada_en = time.monotonic()
+
+    def marcar_caida(self, replica: Replica) -> None:
+        """Saca a la réplica de la rotación hasta el próximo chequeo."""
+        self._marcar(replica, sana=False)
+
+    def replica_de(self, bind: Any) -> Replica | None:
+        """Réplica dueña de un engine (sync o el sync_engine del async)."""
+        for replica in self.replicas:
+            if bind is replica.engine or bind is replica.async_engine.sync_engine:
+                return replica
+        return None
+
+    def chequeo_vencido(self) -> bool:
+        """Si alguna réplica necesita un chequeo de salud."""
+        ahora = time.monotonic()
+        return any(
+            ahora - replica.chequeada_en >= self.intervalo_chequeo
+            for replica in self.replicas
+        )
+
+    def chequear(self) -> None:
+        """Consulta el lag de las réplicas con el chequeo vencido."""
+        with self._lock:
+            ahora = time.monotonic()
+            for replica in self.replicas:
+                if ahora - replica.chequeada_en < self.intervalo_chequeo:
+                    continue
+                try:
+                    with replica.engine.connect() as conn:
+                        lag = float(conn.execute(_LAG_SQL).scalar_one())
+                except Exception as e:
+                    logger.debug(f"Chequeo de réplica {replica.nombre} falló: {e}")
+                    self._marcar(replica, sana=False)
+                    continue
+                if lag > self.max_lag:
+                    logger.warning(
+                        f"⚠️ Réplica {replica.nombre} con lag {lag:.1f}s, se lee del primario"
+                    )
+                self._marcar(replica, sana=lag <= self.max_lag, lag=lag)
+
+    def elegir(self) -> Replica | None:
+        """Réplica sana en round-robin, o None para leer del primario."""
+        if not self.habilitado:
+            return None
+        if self.chequeo_vencido():
+            self.chequear()
+        sanas = [replica for replica in self.replicas if replica.sana]
+        if not sanas:
+            return None
+        return sanas[next(self._turno) % len(sanas)]
+
+    def estado(self) -> list[dict[str, Any]]:
+        """Estado de cada réplica (para el health check)."""
+        return [
+            {"replica": r.nombre, "sana": r.sana, "lag_segundos": round(r.lag, 2)}
+            for r in self.replicas
+        ]
+
+
+replica_router = ReplicaRouter(
+    settings.DATABASE_READ_REPLICAS,
+    intervalo_chequeo=settings.REPLICA_HEALTHCHECK_SECONDS,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+)
+
+
+# ===== LECTURAS DEL PRIMARIO TRAS UN JOB =====
+
+_redis_client = None
+
+
+def _get_redis() -> Any:
+    """Conexión a Redis (lazy), compartida por el proceso."""
+    global _redis_client
+    if _redis_client is None:
+        import redis
+
+        _redis_client = redis.from_url(
+            settings.REDIS_URL, decode_responses=True, socket_connect_timeout=1
+        )
+    return _redis_client
+
+
+def marcar_lectura_primario(user_id: int | None) -> None:
+    """El usuario lee del primario por un rato (acaba de terminar su job)."""
+    if user_id is None or not replica_router.habilitado:
+        return
+    try:
+        _get_redis().set(
+            f"{_PREFIJO_PRIMARIO}{user_id}",
+            "1",
+            ex=settings.REPLICA_PRIMARY_AFTER_JOB_SECONDS,
+        )
+    except Exception as e:
+        logger.warning(f"No se pudo marcar lectura del primario: {e}")
+
+
+def debe_leer_primario(user_id: int | None) -> bool:
+    """
+    Si las lecturas del usuario tienen que ir al primario.
+
+    Sin Redis no se puede saber si el usuario acaba de cargar datos, así que
+    se lee del primario.
+    """
+    if user_id is None:
+        return False
+    try:
+        return bool(_get_redis().exists(f"{_PREFIJO_PRIMARIO}{user_id}"))
+    except Exception as e:
+        logger.debug(f"Redis no disponible para ruteo de lecturas: {e}")
+        return True
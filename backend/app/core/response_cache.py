@@ -0,0 +1,318 @@
+"""
+Cache de respuestas con ETag para endpoints de referencia (solo lectura).
+
+Catálogos, estrategias y geometrías casi no cambian, pero cada carga del
+frontend los volvía a consultar y serializar. ``cache_respuesta`` envuelve
+un endpoint GET:
+
+- La versión de la respuesta sale de contadores en Redis, uno por tabla de
+  la que depende el endpoint (más uno global). El ETag es un hash de la URL
+  y esas versiones, así que se calcula sin tocar la BD.
+- ``If-None-Match`` igual al ETag → ``304`` sin body.
+- Si no, se busca el body ya serializado en un cache en memoria del proceso
+  (LRU); solo ante un miss se ejecuta el endpoint. El body se guarda también
+  comprimido por codificación (``app.core.compression``), así un hit no
+  vuelve a serializar ni a comprimir.
+
+Invalidación:
+- Los commits de sesiones ORM incrementan el contador de las tablas que
+  tocaron (flush y DML ``session.execute(insert/update/delete(...))``), solo
+  para tablas que algún endpoint cacheado declara.
+- Las cargas masivas y seeds (SQL crudo, ``session_replication_role``)
+  llaman a ``invalidar_todo()`` al terminar.
+- Como red de seguridad la versión rota cada ``RESPONSE_CACHE_TTL_SECONDS``.
+
+Sin Redis el endpoint se ejecuta normalmente (sin ETag).
+
+Las dependencias del endpoint (autenticación incluida) se resuelven siempre:
+el cache solo evita la consulta y la serialización.
+"""
+
+import functools
+import hashlib
+import inspect
+import logging
+import threading
+import time
+import typing
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import Request, Response
+from sqlalchemy import Delete, Insert, Update, event
+from sqlalchemy.orm import Session, SessionTransaction
+from starlette.concurrency import run_in_threadpool
+
+from app.core.compression import agregar_vary, comprimir_async, elegir_codificacion
+from app.core.config import settings
+from app.core.responses import serializar_json
+
+logger = logging.getLogger(__name__)
+
+_PREFIJO_VERSION = "cache_version:"
+_VERSION_GLOBAL = "__global__"
+_TABLAS_INFO = "response_cache_tablas"
+
+# Tablas de las que depende algún endpoint cacheado
+_tablas_observadas: set[str] = set()
+
+
+@dataclass(frozen=True)
+class RespuestaCacheada:
+    etag: str
+    body: bytes
+    media_type: str
+    # Body comprimido por codificación, se completa a demanda
+    comprimidos: dict[str, bytes] = field(default_factory=dict, compare=False)
+
+    async def body_para(self, codificacion: str | None) -> bytes:
+        """Body en la codificación dada (None = sin comprimir)."""
+        if codificacion is None:
+            return self.body
+        comprimido = self.comprimidos.get(codificacion)
+        if comprimido is None:
+            comprimido = await comprimir_async(self.body, codificacion)
+            self.comprimidos[codificacion] = comprimido
+        return comprimido
+
+
+class _CacheLRU:
+    """Bodies serializados por URL, acotados a ``max_entradas``."""
+
+    def __init__(self, max_entradas: int) -> None:
+        self.max_entradas = max_entradas
+        self._entradas: OrderedDict[str, RespuestaCacheada] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clave: str, etag: str) -> RespuestaCacheada | None:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None or entrada.etag != etag:
+                return None
+            self._entradas.move_to_end(clave)
+            return entrada
+
+    def set(self, clave: str, entrada: RespuestaCacheada) -> None:
+        with self._lock:
+            self._entradas[clave] = entrada
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+
+
+_cache = _CacheLRU(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+# ===== VERSIONES (REDIS) =====
+
+_redis_sync = None
+_redis_async = None
+
+
+def _get_redis() -> Any:
+    global _redis_sync
+    if _redis_sync is None:
+        import redis
+
+        _redis_sync = redis.from_url(
+            settings.REDIS_URL, decode_responses=True, socket_connect_timeout=1
+        )
+    return _redis_sync
+
+
+def _get_redis_async() -> Any:
+    global _redis_async
+    if _redis_async is None:
+        import redis.asyncio
+
+        _redis_async = redis.asyncio.from_url(
+            settings.REDIS_URL, decode_responses=True, socket_connect_timeout=1
+        )
+    return _redis_async
+
+
+async def _versiones(tablas: tuple[str, ...]) -> str | None:
+    """Versión combinada de las tablas, o None si Redis no está disponible."""
+    claves = [f"{_PREFIJO_VERSION}{t}" for t in (_VERSION_GLOBAL, *tablas)]
+    try:
+        valores = await _get_redis_async().mget(claves)
+    except Exception as e:
+        logger.debug(f"Redis no disponible para cache de respuestas: {e}")
+        return None
+    ventana = int(time.time() // settings.RESPONSE_CACHE_TTL_SECONDS)
+    return ":".join(v or "0" for v in valores) + f":{ventana}"
+
+
+def invalidar_tablas(tablas: Iterable[str]) -> None:
+    """Incrementa la versión de las tablas (invalida los ETags que dependen)."""
+    tablas = set(tablas)
+    if not tablas:
+        return
+    try:
+        pipe = _get_redis().pipeline()
+        for tabla in tablas:
+            pipe.incr(f"{_PREFIJO_VERSION}{tabla}")
+        pipe.execute()
+    except Exception as e:
+        # Sin Redis tampoco se sirven respuestas cacheadas
+        logger.warning(f"No se pudo invalidar cache de respuestas: {e}")
+
+
+def invalidar_todo() -> None:
+    """Invalida todas las respuestas cacheadas (cargas masivas, seeds)."""
+    invalidar_tablas([_VERSION_GLOBAL])
+
+
+# ===== INVALIDACIÓN DESDE SESIONES ORM =====
+
+
+def _registrar_tablas(session: Session, tablas: Iterable[str]) -> None:
+    relevantes = _tablas_observadas.intersection(tablas)
+    if relevantes:
+        session.info.setdefault(_TABLAS_INFO, set()).update(relevantes)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context: Any) -> None:
+    if not _tablas_observadas:
+        return
+    objetos = [*session.new, *session.dirty, *session.deleted]
+    _registrar_tablas(
+        session,
+        {getattr(obj, "__tablename__", None) for obj in objetos} - {None},
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _do_orm_execute(orm_execute_state: Any) -> None:
+    statement = orm_execute_state.statement
+    if _tablas_observadas and isinstance(statement, Insert | Update | Delete):
+        _registrar_tablas(orm_execute_state.session, [statement.table.name])
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    tablas = session.info.pop(_TABLAS_INFO, None)
+    if tablas:
+        invalidar_tablas(tablas)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_rollback(session: Session, previous_transaction: SessionTransaction) -> None:
+    session.info.pop(_TABLAS_INFO, None)
+
+
+# ===== DECORADOR =====
+
+
+def _clave(request: Request) -> str:
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+def _headers(etag: str) -> dict[str, str]:
+    # private: las respuestas requieren autenticación. no-cache: el navegador
+    # revalida siempre, y la revalidación cuesta solo un 304
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def _etag_coincide(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return etag in {v.strip() for v in if_none_match.split(",")} or if_none_match == "*"
+
+
+def cache_respuesta(*tablas: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Cachea un endpoint GET de solo lectura con ETag y versión por tabla.
+
+    Args:
+        tablas: Tablas de las que depende la respuesta
+
+    El endpoint debe devolver el mismo tipo que su ``response_model``
+    (o datos JSON): en un hit se devuelve el body ya serializado.
+    """
+    _tablas_observadas.update(tablas)
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        firma = inspect.signature(func)
+        hints = typing.get_type_hints(func)
+        parametros = [
+            p.replace(annotation=hints.get(p.name, p.annotation))
+            for p in firma.parameters.values()
+        ]
+        nombre_request = next(
+            (p.name for p in parametros if p.annotation is Request), None
+        )
+        if nombre_request is None:
+            nombre_request = "_cache_request"
+            parametros.append(
+                inspect.Parameter(
+                    nombre_request, inspect.Parameter.KEYWORD_ONLY, annotation=Request
+                )
+            )
+        es_async = inspect.iscoroutinefunction(func)
+
+        async def ejecutar(kwargs: dict[str, Any]) -> Any:
+            if es_async:
+                return await func(**kwargs)
+            return await run_in_threadpool(func, **kwargs)
+
+        @functools.wraps(func)
+        async def wrapper(**kwargs: Any) -> Any:
+            request: Request = kwargs[nombre_request]
+            if nombre_request not in firma.parameters:
+                del kwargs[nombre_request]
+
+            version = await _versiones(tablas)
+            if version is None:
+                return await ejecutar(kwargs)
+
+            clave = _clave(request)
+            digest = hashlib.sha1(f"{clave}|{version}".encode()).hexdigest()[:20]
+            etag = f'W/"{digest}"'
+            if _etag_coincide(request, etag):
+                return Response(status_code=304, headers=_headers(etag))
+
+            entrada = _cache.get(clave, etag)
+            if entrada is None:
+                resultado = await ejecutar(kwargs)
+                if isinstance(resultado, Response):
+                    return resultado
+                entrada = RespuestaCacheada(
+                    etag, serializar_json(resultado), "application/json"
+                )
+                _cache.set(clave, entrada)
+
+            codificacion = None
+            if (
+                settings.COMPRESSION_ENABLED
+                and len(entrada.body) >= settings.COMPRESSION_MIN_BYTES
+            ):
+                codificacion = elegir_codificacion(
+                    request.headers.get("accept-encoding")
+                )
+            respuesta = Response(
+                content=await entrada.body_para(codificacion),
+                media_type=entrada.media_type,
+                headers=_headers(etag),
+            )
+            agregar_vary(respuesta.headers)
+            if codificacion is not None:
+                respuesta.headers["Content-Encoding"] = codificacion
+            return respuesta
+
+        wrapper.__signature__ = firma.replace(  # type: ignore[attr-defined]
+            parameters=parametros,
+            return_annotation=hints.get("return", firma.return_annotation),
+        )
+        return wrapper
+
+    return decorator
@@ -0,0 +1,50 @@
+"""
+Respuesta JSON rápida para payloads grandes.
+
+Por defecto FastAPI valida lo que devuelve el endpoint contra el
+``response_model`` y, para dicts sin modelo, arma una copia con
+``jsonable_encoder`` antes de serializar. En respuestas de decenas de miles
+de items (mapa de domicilios, GeoJSON) eso es la mayor parte del tiempo.
+
+``RespuestaJSON`` se devuelve directamente desde el endpoint (FastAPI no la
+vuelve a validar) y serializa:
+- modelos Pydantic con su serializer compilado (ya fueron validados al
+  construirse);
+- el resto (dicts, listas, filas) con orjson, sin copia intermedia.
+
+El ``response_model`` del endpoint se mantiene para la documentación.
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+_OPCIONES = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    """Tipos que orjson no serializa solo."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, set | frozenset):
+        return list(obj)
+    raise TypeError(f"Tipo no serializable a JSON: {type(obj).__name__}")
+
+
+def serializar_json(contenido: Any) -> bytes:
+    """Serializa a JSON (bytes) un modelo Pydantic o datos JSON-compatibles."""
+    if isinstance(contenido, BaseModel):
+        return contenido.__pydantic_serializer__.to_json(contenido, by_alias=True)
+    return orjson.dumps(contenido, default=_default, option=_OPCIONES)
+
+
+class RespuestaJSON(JSONResponse):
+    """``JSONResponse`` serializada con orjson / pydantic-core."""
+
+    def render(self, content: Any) -> bytes:
+        return serializar_json(content)
@@ -0,0 +1,93 @@
+"""
+Soporte de búsqueda de texto sin acentos (pg_trgm + unaccent).
+
+Las tablas que se buscan por nombre (ciudadano, animal) guardan una columna
+generada ``busqueda`` con el texto normalizado (minúsculas, sin acentos). Esa
+columna tiene un índice GIN trigram, por lo que ``LIKE '%término%'`` y
+``word_similarity`` usan el índice en vez de recorrer la tabla.
+
+``unaccent()`` no es IMMUTABLE y PostgreSQL no lo acepta en columnas generadas
+ni en índices; por eso se define el wrapper ``f_unaccent`` (la receta estándar
+que fija el diccionario explícitamente).
+"""
+
+import re
+import unicodedata
+
+from sqlalchemy import DDL, MetaData, event
+
+UNACCENT_FUNCTION = "f_unaccent"
+
+SEARCH_DDL_STATEMENTS: tuple[str, ...] = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    f"""
+    CREATE OR REPLACE FUNCTION {UNACCENT_FUNCTION}(text)
+    RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $func$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $func$
+    """,
+)
+
+# Similaridad mínima para considerar un match difuso (operador <% de pg_trgm)
+SIMILARIDAD_MINIMA = 0.4
+
+_ESPACIOS = re.compile(r"\s+")
+
+
+def documento_busqueda_sql(*columnas: str) -> str:
+    """
+    Genera la expresión SQL de una columna generada de búsqueda.
+
+    Args:
+        columnas: Nombres de columnas de texto a concatenar
+
+    Returns:
+        Expresión SQL lista para usar en ``Computed(...)``
+
+    Examples:
+        >>> documento_busqueda_sql("nombre", "apellido")
+        "f_unaccent(lower(coalesce(nombre, '') || ' ' || coalesce(apellido, '')))"
+    """
+    concatenado = " || ' ' || ".join(f"coalesce({c}, '')" for c in columnas)
+    return f"{UNACCENT_FUNCTION}(lower({concatenado}))"
+
+
+def normalizar_busqueda(texto: str) -> str:
+    """
+    Normaliza un término de búsqueda igual que la columna generada.
+
+    Minúsculas, sin acentos (NFKD) y espacios colapsados.
+
+    Examples:
+        >>> normalizar_busqueda("  José  PÉREZ ")
+        'jose perez'
+    """
+    descompuesto = unicodedata.normalize("NFKD", texto.lower())
+    sin_acentos = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return _ESPACIOS.sub(" ", sin_acentos).strip()
+
+
+def es_busqueda_numerica(texto: str) -> bool:
+    """True si el término es un identificador numérico (DNI, ID SNVS)."""
+    return texto.strip().isdigit()
+
+
+def escapar_like(texto: str) -> str:
+    """Escapa los comodines de LIKE (``\\``, ``%`` y ``_``) en input del usuario."""
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def registrar_ddl_busqueda(metadata: MetaData) -> None:
+    """
+    Crea extensiones y ``f_unaccent`` antes de ``metadata.create_all``.
+
+    En entornos migrados con Alembic esto ya lo hace la migración; el
+    listener cubre bases creadas directamente desde los modelos (tests).
+    """
+    for statement in SEARCH_DDL_STATEMENTS:
+        event.listen(
+            metadata,
+            "before_create",
+            DDL(statement).execute_if(dialect="postgresql"),
+        )
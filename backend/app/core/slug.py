@@ -8,6 +8,30 @@ URL-friendly y estable.
 
 import re
 
+# Reglas del slug, compartidas con la versión vectorizada (app.core.bulk.pl_slug)
+ACENTOS_SLUG: dict[str, str] = {
+    "á": "a",
+    "é": "e",
+    "í": "i",
+    "ó": "o",
+    "ú": "u",
+    "ü": "u",
+    "ñ": "n",
+    "ç": "c",
+}
+
+# (patrón, reemplazo) en orden; sintaxis válida tanto en `re` como en Polars
+PATRONES_SLUG: list[tuple[str, str]] = [
+    # Remover paréntesis y contenido
+    (r"\([^)]*\)", ""),
+    # Solo letras, números, espacios y guiones
+    (r"[^\w\s-]", ""),
+    (r"[\s_]+", "-"),
+    (r"-+", "-"),
+]
+
+LARGO_MAXIMO_SLUG = 50
+
 
 def generar_slug(nombre: str) -> str:
     """
@@ -35,29 +59,14 @@ def generar_slug(nombre: str) -> str:
     texto = nombre.strip().lower()
 
     # Remover acentos
-    acentos = {
-        "á": "a",
-        "é": "e",
-        "í": "i",
-        "ó": "o",
-        "ú": "u",
-        "ü": "u",
-        "ñ": "n",
-        "ç": "c",
-    }
-    for acento, plain in acentos.items():
+    for acento, plain in ACENTOS_SLUG.items():
         texto = texto.replace(acento, plain)
 
-    # Remover paréntesis y contenido
-    texto = re.sub(r"\([^)]*\)", "", texto)
-
-    # Solo letras, números, espacios y guiones
-    texto = re.sub(r"[^\w\s-]", "", texto)
-    texto = re.sub(r"[\s_]+", "-", texto)
-    texto = re.sub(r"-+", "-", texto)
+    for patron, reemplazo in PATRONES_SLUG:
+        texto = re.sub(patron, reemplazo, texto)
     texto = texto.strip("-")
 
-    return texto[:50] if texto else "unknown"
+    return texto[:LARGO_MAXIMO_SLUG] if texto else "unknown"
 
 
 def capitalizar_nombre(nombre: str) -> str:
@@ -0,0 +1,184 @@
+"""
+Contabilidad de SQL por request.
+
+Se engancha a los eventos de cursor de los engines de ``app.core.database``
+(sync, async y réplicas). Por cada request el middleware deja en un
+contextvar un ``EstadisticasSQL`` que acumula:
+
+- cantidad de statements, tiempo total en la BD y filas;
+- cuántas veces se ejecutó cada forma de statement (el SQL con parámetros
+  sin bindear). Una misma forma repetida ``SQL_N1_THRESHOLD`` veces o más
+  es un probable N+1 y se loguea.
+
+Los statements más lentos que ``SQL_SLOW_QUERY_MS`` se loguean (también
+fuera de un request, ej: en Celery) y, con ``SQL_SLOW_QUERY_EXPLAIN``, con el
+plan (``EXPLAIN`` sin ANALYZE, no vuelve a ejecutar la consulta). Los valores
+de los parámetros nunca se loguean (documentos, nombres: datos personales):
+solo la forma del statement, y en el plan los literales se reemplazan por
+``?``. Con drivers async (asyncpg) no se pide el plan.
+
+Los totales salen en el header ``Server-Timing`` de la respuesta.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_INICIO_INFO = "sql_stats_inicio"
+_MAX_LARGO_LOG = 2000
+
+# Condiciones del plan donde PostgreSQL muestra los valores bindeados
+_LINEA_CONDICION_PLAN = re.compile(r"(Cond|Filter):")
+_LITERAL_PLAN = re.compile(r"'(?:[^']|'')*'|(?<![\w.$])-?\d+(?:\.\d+)?(?![\w.])")
+
+
+@dataclass
+class EstadisticasSQL:
+    """Totales de SQL de un request."""
+
+    statements: int = 0
+    tiempo_ms: float = 0.0
+    filas: int = 0
+    formas: Counter[str] = field(default_factory=Counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def registrar(self, statement: str, duracion_ms: float, filas: int) -> None:
+        # Dependencias sync corren en threads con el mismo contexto
+        with self._lock:
+            self.statements += 1
+            self.tiempo_ms += duracion_ms
+            self.filas += max(filas, 0)
+            self.formas[statement] += 1
+
+    def repetidas(self, umbral: int) -> list[tuple[str, int]]:
+        """Formas de statement ejecutadas ``umbral`` veces o más."""
+        return [(sql, n) for sql, n in self.formas.most_common() if n >= umbral]
+
+    def server_timing(self) -> str:
+        """Valor del header ``Server-Timing``."""
+        return (
+            f'db;dur={self.tiempo_ms:.1f};desc="{self.statements} statements", '
+            f'db-rows;desc="{self.filas} filas"'
+        )
+
+
+_estadisticas: ContextVar[EstadisticasSQL | None] = ContextVar(
+    "sql_stats", default=None
+)
+
+
+def iniciar_request() -> tuple[EstadisticasSQL, Token]:
+    """Empieza a contabilizar el SQL del request actual."""
+    stats = EstadisticasSQL()
+    return stats, _estadisticas.set(stats)
+
+
+def finalizar_request(stats: EstadisticasSQL, token: Token, ruta: str) -> None:
+    """Deja de contabilizar y loguea los probables N+1."""
+    _estadisticas.reset(token)
+    for statement, veces in stats.repetidas(settings.SQL_N1_THRESHOLD):
+        logger.warning(
+            f"🔁 Posible N+1 en {ruta}: {veces} ejecuciones de {_recortar(statement)}"
+        )
+
+
+def _recortar(texto: Any) -> str:
+    texto = " ".join(str(texto).split())
+    if len(texto) > _MAX_LARGO_LOG:
+        return texto[:_MAX_LARGO_LOG] + "..."
+    return texto
+
+
+def _redactar_plan(plan: str) -> str:
+    """Reemplaza por ``?`` los literales de las condiciones del plan."""
+    return "\n".join(
+        _LITERAL_PLAN.sub("?", linea) if _LINEA_CONDICION_PLAN.search(linea) else linea
+        for linea in plan.splitlines()
+    )
+
+
+def _explain(conn: Any, cursor: Any, statement: str, parameters: Any) -> str | None:
+    """Plan estimado del statement, con un cursor nuevo de la misma conexión."""
+    if statement.lstrip()[:6].upper() not in ("SELECT", "WITH"):
+        return None
+    # El cursor adaptado de asyncpg no puede abrir otro cursor desde un
+    # listener sync (la conexión está ocupada por el await en curso)
+    if conn.dialect.is_async:
+        return None
+    try:
+        explain_cursor = cursor.connection.cursor()
+        try:
+            explain_cursor.execute(f"EXPLAIN {statement}", parameters)
+            plan = "\n".join(str(fila[0]) for fila in explain_cursor.fetchall())
+        finally:
+            explain_cursor.close()
+    except Exception as e:
+        return f"(EXPLAIN falló: {type(e).__name__})"
+    return _redactar_plan(plan)
+
+
+def _before_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    conn.info.setdefault(_INICIO_INFO, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    inicios = conn.info.get(_INICIO_INFO)
+    if not inicios:
+        return
+    duracion_ms = (time.perf_counter() - inicios.pop()) * 1000
+
+    stats = _estadisticas.get()
+    if stats is not None:
+        stats.registrar(statement, duracion_ms, getattr(cursor, "rowcount", 0) or 0)
+
+    if duracion_ms >= settings.SQL_SLOW_QUERY_MS:
+        mensaje = f"🐢 Query lenta ({duracion_ms:.0f} ms): {_recortar(statement)}"
+        if settings.SQL_SLOW_QUERY_EXPLAIN and not executemany:
+            plan = _explain(conn, cursor, statement, parameters)
+            if plan:
+                mensaje += f"\n{plan}"
+        logger.warning(mensaje)
+
+
+def _handle_error(context: Any) -> None:
+    # El statement falló: no hay after_cursor_execute que consuma el inicio
+    if context.connection is not None and context.cursor is not None:
+        inicios = context.connection.info.get(_INICIO_INFO)
+        if inicios:
+            inicios.pop()
+
+
+def instrumentar_engine(engine: Engine) -> None:
+    """Registra los listeners de contabilidad en un engine sync."""
+    if not settings.SQL_STATS_ENABLED:
+        return
+    if event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
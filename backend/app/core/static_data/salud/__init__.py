@@ -21,6 +21,7 @@ from .parametros_epidemiologicos import (
     AJUSTE_100_HAB,
     AJUSTE_HAB,
     GRUPOS_ETARIOS,
+    POBLACIONES_ESTANDAR,
     SIN_DATO,
 )
 
@@ -37,6 +38,7 @@ __all__ = [
     "ESQUEL",
     "GRUPOS_ETARIOS",
     "NORTE",
+    "POBLACIONES_ESTANDAR",
     "POBLACION_AREAS",
     "SIN_DATO",
     "SUR",
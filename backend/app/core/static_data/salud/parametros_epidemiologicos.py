@@ -25,3 +25,49 @@ GRUPOS_ETARIOS = [
 
 # VALOR PARA DATOS FALTANTES
 SIN_DATO = "*sin dato*"  # Los casos de la U6 aparecen como sin dato
+
+# POBLACIONES ESTÁNDAR (para tasas ajustadas por edad, método directo)
+# Habitantes por grupo quinquenal en 100.000, con las etiquetas de
+# GRUPOS_EDAD_ESTANDAR (app.domains.dashboard.age_groups_config).
+# OMS 2000-2025 (Ahmad et al., 2001); "80+" agrupa 80-84 a 100+.
+# Segi 1960 (población mundial), la usada por los registros de cáncer.
+POBLACIONES_ESTANDAR: dict[str, dict[str, int]] = {
+    "OMS_2000": {
+        "0-4": 8860,
+        "5-9": 8690,
+        "10-14": 8600,
+        "15-19": 8470,
+        "20-24": 8220,
+        "25-29": 7930,
+        "30-34": 7610,
+        "35-39": 7150,
+        "40-44": 6590,
+        "45-49": 6040,
+        "50-54": 5370,
+        "55-59": 4550,
+        "60-64": 3720,
+        "65-69": 2960,
+        "70-74": 2210,
+        "75-79": 1520,
+        "80+": 1545,
+    },
+    "SEGI_1960": {
+        "0-4": 12000,
+        "5-9": 10000,
+        "10-14": 9000,
+        "15-19": 9000,
+        "20-24": 8000,
+        "25-29": 8000,
+        "30-34": 6000,
+        "35-39": 6000,
+        "40-44": 6000,
+        "45-49": 6000,
+        "50-54": 5000,
+        "55-59": 4000,
+        "60-64": 4000,
+        "65-69": 3000,
+        "70-74": 2000,
+        "75-79": 1000,
+        "80+": 1000,
+    },
+}
@@ -20,6 +20,13 @@ PRINCIPIOS APLICADOS:
 
 # Import all models for Alembic auto-detection
 
+# ALERTAS DOMAIN
+from app.domains.alertas.models import (
+    AlertaEpidemiologica,
+    EvaluacionSemanal,
+    LineaBaseEndemica,
+)
+
 # AUTENTICACION DOMAIN
 from app.domains.autenticacion.models import User, UserLogin, UserSession
 
@@ -64,6 +71,7 @@ from app.domains.territorio.geografia_models import (
     Localidad,
     Provincia,
 )
+from app.domains.territorio.poblacion_models import PoblacionReferencia
 
 # VIGILANCIA AGREGADA DOMAIN (datos agregados)
 from app.domains.vigilancia_agregada.constants import (
@@ -108,9 +116,12 @@ from app.domains.vigilancia_nominal.models import (
     CasoEpidemiologico,
     CasoGrupoEnfermedad,
     Ciudadano,
+    CiudadanoCandidatoFusion,
+    CiudadanoClaveBloqueo,
     CiudadanoComorbilidades,
     CiudadanoDatos,
     CiudadanoDomicilio,
+    CiudadanoResumenCasos,
     # Salud (catálogos y registros)
     Comorbilidad,
     # Atención médica
@@ -144,6 +155,8 @@ __all__ = [
     "AgenteEtiologico",
     # Vigilancia nominal - Agentes
     "AgenteExtraccionConfig",
+    # Alertas
+    "AlertaEpidemiologica",
     # Vigilancia nominal - Ámbitos
     "AmbitosConcurrenciaCaso",
     "Animal",
@@ -166,9 +179,12 @@ __all__ = [
     "CategoriaAgente",
     # Vigilancia nominal - Sujetos
     "Ciudadano",
+    "CiudadanoCandidatoFusion",
+    "CiudadanoClaveBloqueo",
     "CiudadanoComorbilidades",
     "CiudadanoDatos",
     "CiudadanoDomicilio",
+    "CiudadanoResumenCasos",
     "ClassificationRule",
     "Comorbilidad",
     "ContactosNotificacion",
@@ -191,6 +207,7 @@ __all__ = [
     # Vigilancia nominal - Clasificación
     "EstrategiaClasificacion",
     "EstudioCasoEpidemiologico",
+    "EvaluacionSemanal",
     "EventClassificationAudit",
     "FilterCondition",
     "GrupoAgente",
@@ -198,6 +215,7 @@ __all__ = [
     "InternacionCasoEpidemiologico",
     "InvestigacionCasoEpidemiologico",
     "Job",
+    "LineaBaseEndemica",
     "Localidad",
     "Muestra",
     "MuestraCasoEpidemiologico",
@@ -205,6 +223,7 @@ __all__ = [
     # Vigilancia agregada
     "OrigenDatosPasivos",
     "PersonaDomicilio",
+    "PoblacionReferencia",
     # Territorio
     "Provincia",
     "RangoEtario",
@@ -0,0 +1,25 @@
+"""
+Dominio de alertas epidemiológicas.
+
+Detección de aberraciones (zona epidémica del corredor, EARS C1-C3, CUSUM)
+evaluada de forma incremental después de cada ingesta, con episodios de
+alerta persistidos con histéresis.
+"""
+
+from .models import (
+    AREA_PROVINCIA,
+    AlertaEpidemiologica,
+    EstadoAlerta,
+    EvaluacionSemanal,
+    LineaBaseEndemica,
+    MetodoAlerta,
+)
+
+__all__ = [
+    "AREA_PROVINCIA",
+    "AlertaEpidemiologica",
+    "EstadoAlerta",
+    "EvaluacionSemanal",
+    "LineaBaseEndemica",
+    "MetodoAlerta",
+]
@@ -0,0 +1,187 @@
+"""
+Modelos del dominio de alertas epidemiológicas.
+
+- LineaBaseEndemica: percentiles históricos por enfermedad, área y semana
+  (corredor endémico precalculado)
+- EvaluacionSemanal: casos y estadísticos de detección de cada semana de
+  cada serie (enfermedad × área). Guarda el estado que necesita la
+  evaluación incremental (CUSUM acumulado, señales por método)
+- AlertaEpidemiologica: episodio de alerta de una serie para un método, con
+  histéresis (se cierra recién tras varias semanas sin señal)
+
+Las áreas son departamentos (``id_provincia_indec``, ``id_departamento_indec``)
+y el total provincial, que usa ``id_departamento_indec = AREA_PROVINCIA``.
+"""
+
+import enum
+from datetime import date, datetime
+
+from sqlalchemy import Index, text
+from sqlmodel import Field, UniqueConstraint
+
+from app.core.models import BaseModel
+
+__all__ = [
+    "AREA_PROVINCIA",
+    "AlertaEpidemiologica",
+    "EstadoAlerta",
+    "EvaluacionSemanal",
+    "LineaBaseEndemica",
+    "MetodoAlerta",
+]
+
+# id_departamento_indec de las series que suman toda la provincia
+AREA_PROVINCIA = 0
+
+
+class MetodoAlerta(enum.StrEnum):
+    """
+    Método de detección que generó la señal.
+
+    ZONA_EPIDEMICA: casos sobre el P75 histórico de la semana (corredor)
+    EARS_C1 / EARS_C2 / EARS_C3: CDC Early Aberration Reporting System
+    CUSUM: suma acumulada de desvíos estandarizados
+    """
+
+    ZONA_EPIDEMICA = "ZONA_EPIDEMICA"
+    EARS_C1 = "EARS_C1"
+    EARS_C2 = "EARS_C2"
+    EARS_C3 = "EARS_C3"
+    CUSUM = "CUSUM"
+
+
+class EstadoAlerta(enum.StrEnum):
+    """Estado de un episodio de alerta."""
+
+    ACTIVA = "ACTIVA"
+    CERRADA = "CERRADA"
+
+
+class LineaBaseEndemica(BaseModel, table=True):
+    """
+    Percentiles históricos de casos de una semana epidemiológica.
+
+    Se calculan una vez por enfermedad y año con los años previos (sin
+    2020-2021, igual que el corredor endémico) y se reutilizan en cada
+    evaluación. Cargar datos de años anteriores los invalida.
+    """
+
+    __tablename__ = "linea_base_endemica"
+    __table_args__ = (
+        UniqueConstraint(
+            "id_enfermedad",
+            "anio_epi",
+            "id_provincia_indec",
+            "id_departamento_indec",
+            "semana_epi",
+            name="uq_linea_base_endemica_celda",
+        ),
+    )
+
+    id_enfermedad: int = Field(foreign_key="enfermedad.id", description="Enfermedad")
+    id_provincia_indec: int = Field(description="Provincia (INDEC)")
+    id_departamento_indec: int = Field(
+        description="Departamento (INDEC); 0 = toda la provincia"
+    )
+    anio_epi: int = Field(description="Año epidemiológico al que aplica")
+    semana_epi: int = Field(description="Semana epidemiológica")
+    p25: float = Field(description="Percentil 25 (límite zona de éxito)")
+    p50: float = Field(description="Percentil 50 (mediana)")
+    p75: float = Field(description="Percentil 75 (límite de la zona epidémica)")
+    p90: float = Field(description="Percentil 90")
+    anios_base: int = Field(description="Años históricos usados")
+
+
+class EvaluacionSemanal(BaseModel, table=True):
+    """
+    Casos y estadísticos de una semana de una serie (enfermedad × área).
+
+    ``senales`` es una máscara de bits con un bit por ``MetodoAlerta`` (en el
+    orden del enum) que marca los métodos que superaron su umbral esa semana.
+    """
+
+    __tablename__ = "evaluacion_semanal_alerta"
+    __table_args__ = (
+        UniqueConstraint(
+            "id_enfermedad",
+            "id_provincia_indec",
+            "id_departamento_indec",
+            "inicio_semana",
+            name="uq_evaluacion_semanal_alerta_celda",
+        ),
+        Index(
+            "idx_evaluacion_semanal_alerta_enfermedad_semana",
+            "id_enfermedad",
+            "inicio_semana",
+        ),
+    )
+
+    id_enfermedad: int = Field(foreign_key="enfermedad.id", description="Enfermedad")
+    id_provincia_indec: int = Field(description="Provincia (INDEC)")
+    id_departamento_indec: int = Field(
+        description="Departamento (INDEC); 0 = toda la provincia"
+    )
+    inicio_semana: date = Field(description="Domingo de inicio de la semana")
+    anio_epi: int = Field(description="Año epidemiológico")
+    semana_epi: int = Field(description="Semana epidemiológica")
+    casos: int = Field(description="Casos de la semana")
+    umbral_zona: float | None = Field(
+        None, description="P75 histórico de la semana (sin línea base si es nulo)"
+    )
+    c1: float | None = Field(None, description="Estadístico EARS C1")
+    c2: float | None = Field(None, description="Estadístico EARS C2")
+    c3: float | None = Field(None, description="Estadístico EARS C3")
+    cusum: float = Field(0.0, description="CUSUM acumulado al final de la semana")
+    senales: int = Field(0, description="Métodos con señal (máscara de bits)")
+
+
+class AlertaEpidemiologica(BaseModel, table=True):
+    """
+    Episodio de alerta de una serie para un método de detección.
+
+    Empieza en la primera semana con señal y se cierra después de
+    ``ALERTAS_SEMANAS_CIERRE`` semanas seguidas sin señal; una señal en el
+    medio lo mantiene abierto (histéresis), así una serie que oscila alrededor
+    del umbral no abre y cierra alertas cada semana.
+    """
+
+    __tablename__ = "alerta_epidemiologica"
+    __table_args__ = (
+        UniqueConstraint(
+            "id_enfermedad",
+            "id_provincia_indec",
+            "id_departamento_indec",
+            "metodo",
+            "inicio_semana",
+            name="uq_alerta_epidemiologica_episodio",
+        ),
+        Index(
+            "idx_alerta_epidemiologica_activas",
+            "id_enfermedad",
+            "inicio_semana",
+            postgresql_where=text("estado = 'ACTIVA'"),
+        ),
+        Index("idx_alerta_epidemiologica_inicio", "inicio_semana"),
+    )
+
+    id_enfermedad: int = Field(foreign_key="enfermedad.id", description="Enfermedad")
+    id_provincia_indec: int = Field(description="Provincia (INDEC)")
+    id_departamento_indec: int = Field(
+        description="Departamento (INDEC); 0 = toda la provincia"
+    )
+    metodo: MetodoAlerta = Field(description="Método de detección")
+    estado: EstadoAlerta = Field(
+        default=EstadoAlerta.ACTIVA, description="Estado del episodio"
+    )
+    inicio_semana: date = Field(description="Primera semana con señal")
+    anio_epi_inicio: int = Field(description="Año epidemiológico de inicio")
+    semana_epi_inicio: int = Field(description="Semana epidemiológica de inicio")
+    ultima_senal: date = Field(description="Última semana con señal")
+    fin_semana: date | None = Field(
+        None, description="Semana en que se cerró (nula si está activa)"
+    )
+    semanas_con_senal: int = Field(description="Semanas con señal en el episodio")
+    casos_pico: int = Field(description="Casos de la semana con mayor estadístico")
+    valor_pico: float = Field(description="Mayor valor del estadístico")
+    umbral: float = Field(description="Umbral del método en la semana pico")
+    fecha_evaluacion: datetime = Field(description="Última evaluación del episodio")
@@ -0,0 +1,817 @@
+"""
+Motor de alertas por umbral endémico, incremental por ingesta.
+
+Después de cada ingesta exitosa se evalúan solo las celdas (enfermedad ×
+semana × área) que el archivo tocó:
+
+1. ``semanas_de_casos`` obtiene las semanas (enfermedad, año, semana) de los
+   casos del archivo.
+2. Por enfermedad se cuentan los casos de la ventana afectada más las
+   ``_RETROSPECTIVA`` semanas previas que necesitan EARS y CUSUM, por
+   departamento y total provincial (GROUPING SETS, con poda de particiones).
+3. Los estadísticos se calculan vectorizados sobre la matriz áreas × semanas:
+   zona epidémica contra la línea base guardada (P75 histórico), EARS C1-C3
+   y CUSUM (``app.domains.metricas.aberraciones``), que arranca del
+   acumulado guardado en la semana anterior.
+4. Las señales se guardan por celda (``evaluacion_semanal_alerta``) y los
+   episodios de alerta se rearman con histéresis desde las señales, así los
+   datos tardíos de semanas pasadas corrigen las alertas ya emitidas.
+
+El costo es proporcional a las semanas y enfermedades del archivo: la
+historia solo se lee una vez por enfermedad y año para armar la línea base
+(``linea_base_endemica``). Cargar semanas anteriores a las ya evaluadas
+recalcula hacia adelante hasta la última semana evaluada, porque C1-C3 y
+CUSUM dependen de las semanas previas.
+
+Se cuentan todos los casos notificados salvo negativos y descartados; una
+reclasificación posterior no reevalúa las alertas hasta la próxima ingesta
+de esas semanas.
+"""
+
+import logging
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import delete, func, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, col
+
+from app.core.config import settings
+from app.core.epidemiology import (
+    calcular_semana_epidemiologica,
+    obtener_fechas_semana_epidemiologica,
+)
+from app.domains.metricas.aberraciones import (
+    CUSUM_H,
+    DESFASE_EARS,
+    SEMANAS_EARS,
+    UMBRAL_C1_C2,
+    UMBRAL_C3,
+    cusum,
+    ears,
+)
+from app.domains.territorio.geografia_models import Departamento, Domicilio, Localidad
+from app.domains.vigilancia_nominal.clasificacion.models import TipoClasificacion
+from app.domains.vigilancia_nominal.models.caso import CasoEpidemiologico
+
+from .models import (
+    AREA_PROVINCIA,
+    AlertaEpidemiologica,
+    EstadoAlerta,
+    EvaluacionSemanal,
+    LineaBaseEndemica,
+    MetodoAlerta,
+)
+
+logger = logging.getLogger(__name__)
+
+# Filas por lote (lecturas con IN y escrituras)
+_LOTE = 5000
+
+# Línea base del corredor: 5 años previos sin la pandemia, mínimo 2 años
+_ANIOS_BASE = 5
+_ANIOS_EXCLUIDOS = (2020, 2021)
+_MIN_ANIOS_BASE = 2
+_PERCENTILES = (25, 50, 75, 90)
+
+# EARS y CUSUM con los parámetros de aberraciones (base de 7 semanas, 2 de
+# desfase). Semanas previas que necesita una semana: C3 usa C2 de t-2, cuya
+# base empieza en t-11
+_RETROSPECTIVA = SEMANAS_EARS + 2 * DESFASE_EARS
+
+_CLASIFICACIONES_EXCLUIDAS = (
+    TipoClasificacion.NEGATIVOS,
+    TipoClasificacion.DESCARTADOS,
+)
+
+# Bit de cada método en ``EvaluacionSemanal.senales``
+BITS_METODO = {metodo: 1 << i for i, metodo in enumerate(MetodoAlerta)}
+
+_UMBRALES_FIJOS = {
+    MetodoAlerta.EARS_C1: UMBRAL_C1_C2,
+    MetodoAlerta.EARS_C2: UMBRAL_C1_C2,
+    MetodoAlerta.EARS_C3: UMBRAL_C3,
+    MetodoAlerta.CUSUM: CUSUM_H,
+}
+
+
+@dataclass
+class ResultadoEvaluacion:
+    enfermedades: int = 0
+    series: int = 0
+    celdas: int = 0
+    alertas_activas: int = 0
+    alertas_cerradas: int = 0
+    duracion_segundos: float = 0.0
+
+
+@dataclass
+class _Estadisticos:
+    """Estadísticos de las semanas evaluadas (matrices áreas × semanas)."""
+
+    c1: np.ndarray
+    c2: np.ndarray
+    c3: np.ndarray
+    cusum: np.ndarray
+
+
+# =============================================================================
+# SEMANAS
+# =============================================================================
+
+
+def _indice_semana(inicio: date) -> int:
+    """Índice correlativo de la semana (los domingos son múltiplos de 7)."""
+    return inicio.toordinal() // 7
+
+
+def _inicio_de_indice(indice: int) -> date:
+    return date.fromordinal(indice * 7)
+
+
+def _indice_de_semana_epi(anio: int, semana: int) -> int:
+    return _indice_semana(obtener_fechas_semana_epidemiologica(anio, semana)[0])
+
+
+def _semana_epi_de_indice(indice: int) -> tuple[int, int]:
+    semana, anio = calcular_semana_epidemiologica(_inicio_de_indice(indice))
+    assert semana is not None and anio is not None
+    return anio, semana
+
+
+# =============================================================================
+# ESTADÍSTICOS
+# =============================================================================
+
+
+def calcular_estadisticos(
+    conteos: np.ndarray, cusum_previo: np.ndarray
+) -> _Estadisticos:
+    """
+    EARS C1-C3 y CUSUM de las semanas ``_RETROSPECTIVA:`` de ``conteos``.
+
+    Args:
+        conteos: Casos por área (filas) y semana (columnas); las primeras
+            ``_RETROSPECTIVA`` columnas son solo base
+        cusum_previo: CUSUM de cada área en la semana anterior a la primera
+            evaluada
+
+    Returns:
+        Matrices áreas × semanas evaluadas
+    """
+    c1, c2, c3 = (m[:, _RETROSPECTIVA:] for m in ears(conteos))
+    return _Estadisticos(c1=c1, c2=c2, c3=c3, cusum=cusum(c2, inicial=cusum_previo))
+
+
+def calcular_senales(
+    casos: np.ndarray, umbral_zona: np.ndarray, estadisticos: _Estadisticos
+) -> np.ndarray:
+    """Máscara de bits de métodos con señal (``BITS_METODO``) por celda."""
+    suficientes = casos >= settings.ALERTAS_MIN_CASOS
+    with np.errstate(invalid="ignore"):
+        superados = {
+            MetodoAlerta.ZONA_EPIDEMICA: casos > umbral_zona,
+            MetodoAlerta.EARS_C1: estadisticos.c1 > UMBRAL_C1_C2,
+            MetodoAlerta.EARS_C2: estadisticos.c2 > UMBRAL_C1_C2,
+            MetodoAlerta.EARS_C3: estadisticos.c3 > UMBRAL_C3,
+            MetodoAlerta.CUSUM: estadisticos.cusum > CUSUM_H,
+        }
+    senales = np.zeros(casos.shape, dtype=np.int64)
+    for metodo, superado in superados.items():
+        senales |= np.where(superado & suficientes, BITS_METODO[metodo], 0)
+    return senales
+
+
+def episodios(
+    con_senal: np.ndarray, semanas_cierre: int
+) -> list[tuple[int, int, int | None, int]]:
+    """
+    Episodios de alerta de una serie de señales semanales, con histéresis.
+
+    Returns:
+        (inicio, última señal, cierre o None si sigue activo, semanas con
+        señal), en posiciones de ``con_senal``
+    """
+    resultado: list[tuple[int, int, int | None, int]] = []
+    inicio = ultima = -1
+    semanas = 0
+    for i in np.flatnonzero(con_senal).tolist():
+        if semanas and i - ultima > semanas_cierre:
+            resultado.append((inicio, ultima, ultima + semanas_cierre, semanas))
+            semanas = 0
+        if not semanas:
+            inicio = i
+        ultima = i
+        semanas += 1
+    if semanas:
+        cierre = ultima + semanas_cierre
+        resultado.append(
+            (inicio, ultima, cierre if cierre < len(con_senal) else None, semanas)
+        )
+    return resultado
+
+
+# =============================================================================
+# LECTURAS
+# =============================================================================
+
+
+def semanas_de_casos(
+    session: Session, ids_caso: Sequence[int], anios: Iterable[int]
+) -> list[tuple[int, int, int]]:
+    """(id_enfermedad, año, semana) distintos de los casos dados."""
+    anio = col(CasoEpidemiologico.fecha_minima_caso_anio_epi)
+    semana = col(CasoEpidemiologico.fecha_minima_caso_semana_epi)
+    anios = sorted(set(anios))
+    semanas: set[tuple[int, int, int]] = set()
+    for inicio in range(0, len(ids_caso), _LOTE):
+        query = (
+            select(col(CasoEpidemiologico.id_enfermedad), anio, semana)
+            .where(
+                col(CasoEpidemiologico.id).in_(ids_caso[inicio : inicio + _LOTE]),
+                anio.in_(anios),
+            )
+            .distinct()
+        )
+        semanas.update(tuple(f) for f in session.execute(query).all())
+    return sorted(semanas)
+
+
+def _contar_casos(
+    session: Session,
+    id_enfermedad: int,
+    anios: Sequence[int],
+    fecha_desde: date | None = None,
+    fecha_hasta: date | None = None,
+) -> list[tuple[int, int, int, int, int]]:
+    """
+    Casos por (provincia, departamento, año, semana), con el total provincial
+    como departamento ``AREA_PROVINCIA``. Los casos sin domicilio no tienen
+    área y no se cuentan. Filtrar por ``anios`` (la clave de partición) deja
+    afuera las particiones que no hacen falta.
+    """
+    anio = col(CasoEpidemiologico.fecha_minima_caso_anio_epi)
+    semana = col(CasoEpidemiologico.fecha_minima_caso_semana_epi)
+    provincia = col(Departamento.id_provincia_indec)
+    departamento = col(Departamento.id_departamento_indec)
+    query = (
+        select(
+            provincia,
+            func.coalesce(departamento, AREA_PROVINCIA),
+            anio,
+            semana,
+            func.count(),
+        )
+        .select_from(CasoEpidemiologico)
+        .join(Domicilio, col(CasoEpidemiologico.id_domicilio) == col(Domicilio.id))
+        .join(
+            Localidad,
+            col(Domicilio.id_localidad_indec) == col(Localidad.id_localidad_indec),
+        )
+        .join(
+            Departamento,
+            col(Localidad.id_departamento_indec) == departamento,
+        )
+        .where(
+            col(CasoEpidemiologico.id_enfermedad) == id_enfermedad,
+            anio.in_(anios),
+            or_(
+                col(CasoEpidemiologico.clasificacion_estrategia).is_(None),
+                col(CasoEpidemiologico.clasificacion_estrategia).not_in(
+                    _CLASIFICACIONES_EXCLUIDAS
+                ),
+            ),
+        )
+        .group_by(
+            func.grouping_sets(
+                tuple_(provincia, departamento, anio, semana),
+                tuple_(provincia, anio, semana),
+            )
+        )
+    )
+    if fecha_desde is not None:
+        query = query.where(col(CasoEpidemiologico.fecha_minima_caso) >= fecha_desde)
+    if fecha_hasta is not None:
+        query = query.where(col(CasoEpidemiologico.fecha_minima_caso) <= fecha_hasta)
+    return [tuple(f) for f in session.execute(query).all()]  # type: ignore[misc]
+
+
+# =============================================================================
+# LÍNEA BASE
+# =============================================================================
+
+
+def _anios_historicos(anio: int) -> list[int]:
+    return [a for a in range(anio - _ANIOS_BASE, anio) if a not in _ANIOS_EXCLUIDOS]
+
+
+def invalidar_lineas_base(
+    session: Session, semanas: Iterable[tuple[int, int, int]]
+) -> None:
+    """Borra las líneas base que usan como historia los años cargados."""
+    anios_por_enfermedad: dict[int, set[int]] = {}
+    for id_enfermedad, anio, _ in semanas:
+        anios_por_enfermedad.setdefault(id_enfermedad, set()).add(anio)
+    for id_enfermedad, anios in anios_por_enfermedad.items():
+        afectados = {a + d for a in anios for d in range(1, _ANIOS_BASE + 1)}
+        session.execute(
+            delete(LineaBaseEndemica).where(
+                col(LineaBaseEndemica.id_enfermedad) == id_enfermedad,
+                col(LineaBaseEndemica.anio_epi).in_(sorted(afectados)),
+            )
+        )
+
+
+def _calcular_lineas_base(
+    session: Session, id_enfermedad: int, anios: Sequence[int]
+) -> list[dict]:
+    """Percentiles por área y semana, con ceros en las semanas sin casos."""
+    historicos = sorted({a for anio in anios for a in _anios_historicos(anio)})
+    if not historicos:
+        return []
+    conteos: dict[tuple[int, int], dict[int, np.ndarray]] = {}
+    for provincia, departamento, anio, semana, casos in _contar_casos(
+        session, id_enfermedad, historicos
+    ):
+        # La semana 53 se compara con la base de la 52
+        por_anio = conteos.setdefault((provincia, departamento), {})
+        fila = por_anio.setdefault(anio, np.zeros(52))
+        fila[min(semana, 52) - 1] += casos
+    # Años con notificación de la enfermedad en alguna área
+    con_datos = {a for por_anio in conteos.values() for a in por_anio}
+
+    filas = []
+    for anio in anios:
+        base = [a for a in _anios_historicos(anio) if a in con_datos]
+        if not base:
+            continue
+        for (provincia, departamento), por_anio in conteos.items():
+            matriz = np.stack([por_anio.get(a, np.zeros(52)) for a in base])
+            percentiles = np.percentile(matriz, _PERCENTILES, axis=0)
+            filas.extend(
+                {
+                    "id_enfermedad": id_enfermedad,
+                    "id_provincia_indec": provincia,
+                    "id_departamento_indec": departamento,
+                    "anio_epi": anio,
+                    "semana_epi": semana + 1,
+                    "p25": float(percentiles[0, semana]),
+                    "p50": float(percentiles[1, semana]),
+                    "p75": float(percentiles[2, semana]),
+                    "p90": float(percentiles[3, semana]),
+                    "anios_base": len(base),
+                }
+                for semana in range(52)
+            )
+    return filas
+
+
+def _umbrales_zona(
+    session: Session, id_enfermedad: int, anios: Sequence[int]
+) -> dict[tuple[int, int, int, int], float]:
+    """
+    P75 por (provincia, departamento, año, semana), calculando las líneas
+    base que falten. Solo las que tienen historia suficiente.
+    """
+    guardados = set(
+        session.execute(
+            select(col(LineaBaseEndemica.anio_epi))
+            .where(
+                col(LineaBaseEndemica.id_enfermedad) == id_enfermedad,
+                col(LineaBaseEndemica.anio_epi).in_(anios),
+            )
+            .distinct()
+        ).scalars()
+    )
+    faltantes = [a for a in anios if a not in guardados]
+    if faltantes:
+        filas = _calcular_lineas_base(session, id_enfermedad, faltantes)
+        for inicio in range(0, len(filas), _LOTE):
+            stmt = pg_insert(LineaBaseEndemica.__table__).values(
+                filas[inicio : inicio + _LOTE]
+            )
+            session.execute(
+                stmt.on_conflict_do_nothing(constraint="uq_linea_base_endemica_celda")
+            )
+
+    query = select(
+        col(LineaBaseEndemica.id_provincia_indec),
+        col(LineaBaseEndemica.id_departamento_indec),
+        col(LineaBaseEndemica.anio_epi),
+        col(LineaBaseEndemica.semana_epi),
+        col(LineaBaseEndemica.p75),
+    ).where(
+        col(LineaBaseEndemica.id_enfermedad) == id_enfermedad,
+        col(LineaBaseEndemica.anio_epi).in_(anios),
+        col(LineaBaseEndemica.anios_base) >= _MIN_ANIOS_BASE,
+    )
+    return {
+        (provincia, departamento, anio, semana): p75
+        for provincia, departamento, anio, semana, p75 in session.execute(query).all()
+    }
+
+
+# =============================================================================
+# EVALUACIÓN
+# =============================================================================
+
+
+def _evaluar_enfermedad(
+    session: Session, id_enfermedad: int, desde: int, hasta: int
+) -> ResultadoEvaluacion:
+    """
+    Recalcula las semanas ``desde``..``hasta`` (índices de semana) de todas
+    las áreas de una enfermedad y rearma sus alertas.
+    """
+    resultado = ResultadoEvaluacion(enfermedades=1)
+    celda = EvaluacionSemanal
+    ultima_guardada = session.execute(
+        select(func.max(col(celda.inicio_semana))).where(
+            col(celda.id_enfermedad) == id_enfermedad
+        )
+    ).scalar()
+    if ultima_guardada is not None:
+        # Sin huecos: CUSUM y la histéresis necesitan todas las semanas
+        ultima = _indice_semana(ultima_guardada)
+        desde = min(desde, ultima + 1)
+        hasta = max(hasta, ultima)
+    if desde > hasta:
+        return resultado
+
+    # Episodios que la reevaluación puede cambiar
+    alertas = (
+        session.execute(
+            select(AlertaEpidemiologica).where(
+                col(AlertaEpidemiologica.id_enfermedad) == id_enfermedad,
+                or_(
+                    col(AlertaEpidemiologica.estado) == EstadoAlerta.ACTIVA,
+                    col(AlertaEpidemiologica.fin_semana) >= _inicio_de_indice(desde),
+                ),
+            )
+        )
+        .scalars()
+        .all()
+    )
+    carga = min(
+        [desde - _RETROSPECTIVA] + [_indice_semana(a.inicio_semana) for a in alertas]
+    )
+    n = hasta - carga + 1
+
+    primera = desde - _RETROSPECTIVA
+    conteos = _contar_casos(
+        session,
+        id_enfermedad,
+        list(
+            range(
+                _semana_epi_de_indice(primera)[0],
+                _semana_epi_de_indice(hasta)[0] + 1,
+            )
+        ),
+        _inicio_de_indice(primera),
+        _inicio_de_indice(hasta) + timedelta(days=6),
+    )
+    guardadas = (
+        session.execute(
+            select(celda).where(
+                col(celda.id_enfermedad) == id_enfermedad,
+                col(celda.inicio_semana) >= _inicio_de_indice(carga),
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    areas = sorted(
+        {(p, d) for p, d, *_ in conteos}
+        | {(c.id_provincia_indec, c.id_departamento_indec) for c in guardadas}
+        | {(a.id_provincia_indec, a.id_departamento_indec) for a in alertas}
+    )
+    if not areas:
+        return resultado
+    fila_area = {area: i for i, area in enumerate(areas)}
+
+    # Semanas previas a ``desde``: lo guardado; desde ``desde``: recalculado
+    casos = np.zeros((len(areas), n), dtype=np.int64)
+    senales = np.zeros((len(areas), n), dtype=np.int64)
+    valores = {m: np.full((len(areas), n), np.nan) for m in MetodoAlerta}
+    umbral_zona = np.full((len(areas), n), np.nan)
+    cusum_previo = np.zeros(len(areas))
+    for c in guardadas:
+        i = fila_area[(c.id_provincia_indec, c.id_departamento_indec)]
+        j = _indice_semana(c.inicio_semana) - carga
+        if j >= n:
+            continue
+        casos[i, j] = c.casos
+        senales[i, j] = c.senales
+        umbral_zona[i, j] = np.nan if c.umbral_zona is None else c.umbral_zona
+        for metodo, valor in (
+            (MetodoAlerta.ZONA_EPIDEMICA, c.casos),
+            (MetodoAlerta.EARS_C1, c.c1),
+            (MetodoAlerta.EARS_C2, c.c2),
+            (MetodoAlerta.EARS_C3, c.c3),
+            (MetodoAlerta.CUSUM, c.cusum),
+        ):
+            valores[metodo][i, j] = np.nan if valor is None else valor
+        if j == desde - 1 - carga:
+            cusum_previo[i] = c.cusum
+
+    ventana = np.zeros((len(areas), hasta - desde + 1 + _RETROSPECTIVA))
+    for provincia, departamento, anio, semana, n_casos in conteos:
+        j = _indice_de_semana_epi(anio, semana) - primera
+        if 0 <= j < ventana.shape[1]:
+            ventana[fila_area[(provincia, departamento)], j] = n_casos
+
+    semanas_epi = [_semana_epi_de_indice(i) for i in range(desde, hasta + 1)]
+    umbrales = _umbrales_zona(
+        session, id_enfermedad, sorted({anio for anio, _ in semanas_epi})
+    )
+    nuevas = slice(desde - carga, n)
+    estadisticos = calcular_estadisticos(ventana, cusum_previo)
+    casos[:, nuevas] = ventana[:, _RETROSPECTIVA:]
+    umbral_zona[:, nuevas] = [
+        [
+            umbrales.get((p, d, anio, min(semana, 52)), np.nan)
+            for anio, semana in semanas_epi
+        ]
+        for p, d in areas
+    ]
+    senales[:, nuevas] = calcular_senales(
+        casos[:, nuevas], umbral_zona[:, nuevas], estadisticos
+    )
+    valores[MetodoAlerta.ZONA_EPIDEMICA][:, nuevas] = casos[:, nuevas]
+    valores[MetodoAlerta.EARS_C1][:, nuevas] = estadisticos.c1
+    valores[MetodoAlerta.EARS_C2][:, nuevas] = estadisticos.c2
+    valores[MetodoAlerta.EARS_C3][:, nuevas] = estadisticos.c3
+    valores[MetodoAlerta.CUSUM][:, nuevas] = estadisticos.cusum
+
+    _guardar_celdas(
+        session,
+        id_enfermedad,
+        areas,
+        desde,
+        semanas_epi,
+        casos[:, nuevas],
+        umbral_zona[:, nuevas],
+        estadisticos,
+        senales[:, nuevas],
+    )
+    resultado.series = len(areas)
+    resultado.celdas = len(areas) * len(semanas_epi)
+
+    # Episodios: los que terminan antes de ``desde`` no cambian
+    semanas_cierre = settings.ALERTAS_SEMANAS_CIERRE
+    ahora = datetime.now()
+    derivadas: list[dict] = []
+    for metodo, bit in BITS_METODO.items():
+        con_senal = (senales & bit) != 0
+        for i in np.flatnonzero(con_senal.any(axis=1)).tolist():
+            provincia, departamento = areas[i]
+            for inicio, ultima, cierre, semanas in episodios(
+                con_senal[i], semanas_cierre
+            ):
+                if cierre is not None and cierre + carga < desde:
+                    continue
+                tramo = slice(inicio, ultima + 1)
+                pico = inicio + int(
+                    np.argmax(
+                        np.where(
+                            con_senal[i, tramo], valores[metodo][i, tramo], -np.inf
+                        )
+                    )
+                )
+                umbral = (
+                    umbral_zona[i, pico]
+                    if metodo == MetodoAlerta.ZONA_EPIDEMICA
+                    else _UMBRALES_FIJOS[metodo]
+                )
+                anio_inicio, semana_inicio = _semana_epi_de_indice(inicio + carga)
+                derivadas.append(
+                    {
+                        "id_enfermedad": id_enfermedad,
+                        "id_provincia_indec": provincia,
+                        "id_departamento_indec": departamento,
+                        "metodo": metodo.value,
+                        "estado": (
+                            EstadoAlerta.ACTIVA
+                            if cierre is None
+                            else EstadoAlerta.CERRADA
+                        ).value,
+                        "inicio_semana": _inicio_de_indice(inicio + carga),
+                        "anio_epi_inicio": anio_inicio,
+                        "semana_epi_inicio": semana_inicio,
+                        "ultima_senal": _inicio_de_indice(ultima + carga),
+                        "fin_semana": (
+                            None
+                            if cierre is None
+                            else _inicio_de_indice(cierre + carga)
+                        ),
+                        "semanas_con_senal": semanas,
+                        "casos_pico": int(casos[i, pico]),
+                        "valor_pico": float(valores[metodo][i, pico]),
+                        "umbral": float(umbral),
+                        "fecha_evaluacion": ahora,
+                    }
+                )
+                if cierre is None:
+                    resultado.alertas_activas += 1
+                else:
+                    resultado.alertas_cerradas += 1
+
+    _guardar_alertas(session, alertas, derivadas)
+    return resultado
+
+
+def _guardar_celdas(
+    session: Session,
+    id_enfermedad: int,
+    areas: Sequence[tuple[int, int]],
+    desde: int,
+    semanas_epi: Sequence[tuple[int, int]],
+    casos: np.ndarray,
+    umbral_zona: np.ndarray,
+    estadisticos: _Estadisticos,
+    senales: np.ndarray,
+) -> None:
+    """Upsert de las semanas evaluadas de todas las áreas."""
+
+    def opcional(valor: float) -> float | None:
+        return None if np.isnan(valor) else float(valor)
+
+    filas = [
+        {
+            "id_enfermedad": id_enfermedad,
+            "id_provincia_indec": provincia,
+            "id_departamento_indec": departamento,
+            "inicio_semana": _inicio_de_indice(desde + j),
+            "anio_epi": anio,
+            "semana_epi": semana,
+            "casos": int(casos[i, j]),
+            "umbral_zona": opcional(umbral_zona[i, j]),
+            "c1": float(estadisticos.c1[i, j]),
+            "c2": float(estadisticos.c2[i, j]),
+            "c3": float(estadisticos.c3[i, j]),
+            "cusum": float(estadisticos.cusum[i, j]),
+            "senales": int(senales[i, j]),
+        }
+        for i, (provincia, departamento) in enumerate(areas)
+        for j, (anio, semana) in enumerate(semanas_epi)
+    ]
+    tabla = EvaluacionSemanal.__table__
+    for inicio in range(0, len(filas), _LOTE):
+        stmt = pg_insert(tabla).values(filas[inicio : inicio + _LOTE])
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_evaluacion_semanal_alerta_celda",
+            set_={
+                columna: stmt.excluded[columna]
+                for columna in (
+                    "casos",
+                    "umbral_zona",
+                    "c1",
+                    "c2",
+                    "c3",
+                    "cusum",
+                    "senales",
+                )
+            }
+            | {"updated_at": text("now()")},
+        )
+        session.execute(stmt)
+
+
+def _guardar_alertas(
+    session: Session,
+    previas: Sequence[AlertaEpidemiologica],
+    derivadas: list[dict],
+) -> None:
+    """
+    Reemplaza los episodios reevaluados: upsert de los derivados y baja de
+    los previos que ya no existen (ej: una señal que desapareció con datos
+    corregidos).
+    """
+
+    def clave(
+        provincia: int, departamento: int, metodo: str, inicio: date
+    ) -> tuple[int, int, str, date]:
+        return provincia, departamento, metodo, inicio
+
+    vigentes = {
+        clave(
+            d["id_provincia_indec"],
+            d["id_departamento_indec"],
+            d["metodo"],
+            d["inicio_semana"],
+        )
+        for d in derivadas
+    }
+    obsoletas = [
+        a.id
+        for a in previas
+        if clave(
+            a.id_provincia_indec,
+            a.id_departamento_indec,
+            a.metodo.value,
+            a.inicio_semana,
+        )
+        not in vigentes
+    ]
+    if obsoletas:
+        session.execute(
+            delete(AlertaEpidemiologica).where(
+                col(AlertaEpidemiologica.id).in_(obsoletas)
+            )
+        )
+
+    tabla = AlertaEpidemiologica.__table__
+    for inicio in range(0, len(derivadas), _LOTE):
+        stmt = pg_insert(tabla).values(derivadas[inicio : inicio + _LOTE])
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_alerta_epidemiologica_episodio",
+            set_={
+                columna: stmt.excluded[columna]
+                for columna in (
+                    "estado",
+                    "ultima_senal",
+                    "fin_semana",
+                    "semanas_con_senal",
+                    "casos_pico",
+                    "valor_pico",
+                    "umbral",
+                    "fecha_evaluacion",
+                )
+            }
+            | {"updated_at": text("now()")},
+        )
+        session.execute(stmt)
+
+
+def evaluar_alertas(
+    session: Session, semanas: Iterable[tuple[int, int, int]]
+) -> ResultadoEvaluacion:
+    """
+    Evalúa las alertas de las semanas cargadas por una ingesta.
+
+    Cada enfermedad se evalúa y se confirma en su propia transacción, con un
+    advisory lock para que dos ingestas seguidas no la evalúen a la vez.
+    También avanzan hasta la última semana cargada las enfermedades con
+    alertas activas que no estaban en el archivo, para que sus alertas puedan
+    cerrarse.
+
+    Args:
+        session: Sesión síncrona (hace commit por enfermedad)
+        semanas: (id_enfermedad, año, semana) cargados
+
+    Returns:
+        Totales de la evaluación
+    """
+    inicio = time.perf_counter()
+    resultado = ResultadoEvaluacion()
+    semanas = list(semanas)
+    if not semanas:
+        return resultado
+
+    rangos: dict[int, tuple[int, int]] = {}
+    for id_enfermedad, anio, semana in semanas:
+        indice = _indice_de_semana_epi(anio, semana)
+        desde, hasta = rangos.get(id_enfermedad, (indice, indice))
+        rangos[id_enfermedad] = (min(desde, indice), max(hasta, indice))
+    ultima_cargada = max(hasta for _, hasta in rangos.values())
+    con_alertas = (
+        session.execute(
+            select(col(AlertaEpidemiologica.id_enfermedad))
+            .where(col(AlertaEpidemiologica.estado) == EstadoAlerta.ACTIVA)
+            .distinct()
+        )
+        .scalars()
+        .all()
+    )
+    for id_enfermedad in con_alertas:
+        # ``_evaluar_enfermedad`` arranca después de la última semana guardada
+        rangos.setdefault(id_enfermedad, (ultima_cargada + 1, ultima_cargada))
+
+    invalidar_lineas_base(session, semanas)
+    session.commit()
+
+    for id_enfermedad, (desde, hasta) in sorted(rangos.items()):
+        session.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext('alertas'), :id)"),
+            {"id": id_enfermedad},
+        )
+        parcial = _evaluar_enfermedad(session, id_enfermedad, desde, hasta)
+        session.commit()
+        resultado.enfermedades += parcial.enfermedades
+        resultado.series += parcial.series
+        resultado.celdas += parcial.celdas
+        resultado.alertas_activas += parcial.alertas_activas
+        resultado.alertas_cerradas += parcial.alertas_cerradas
+
+    resultado.duracion_segundos = time.perf_counter() - inicio
+    logger.info(
+        f"🚨 Alertas: {resultado.celdas} celdas de {resultado.series} series "
+        f"({resultado.enfermedades} enfermedades), {resultado.alertas_activas} "
+        f"activas, {resultado.alertas_cerradas} cerradas en "
+        f"{resultado.duracion_segundos:.2f}s"
+    )
+    return resultado
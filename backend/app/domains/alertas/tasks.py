@@ -0,0 +1,45 @@
+"""
+Celery tasks del dominio de alertas.
+
+- evaluar_alertas_task: evalúa las alertas de las semanas que cargó una
+  ingesta. La encola ``execute_job`` cuando el job termina bien.
+"""
+
+import logging
+from typing import Any
+
+from celery import Task
+from sqlmodel import Session
+
+from app.core.celery_app import celery_app
+from app.core.database import engine
+from app.domains.alertas.motor import evaluar_alertas
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    name="app.domains.alertas.tasks.evaluar_alertas",
+    bind=True,
+    queue="file_processing",
+)
+def evaluar_alertas_task(self: Task, semanas: list[list[int]]) -> dict[str, Any]:
+    """
+    Evalúa las alertas de las semanas dadas.
+
+    Args:
+        semanas: [id_enfermedad, año, semana] cargados por la ingesta
+    """
+    with Session(engine) as session:
+        resultado = evaluar_alertas(
+            session,
+            [(enfermedad, anio, semana) for enfermedad, anio, semana in semanas],
+        )
+    return {
+        "enfermedades": resultado.enfermedades,
+        "series": resultado.series,
+        "celdas": resultado.celdas,
+        "alertas_activas": resultado.alertas_activas,
+        "alertas_cerradas": resultado.alertas_cerradas,
+        "duracion_segundos": round(resultado.duracion_segundos, 3),
+    }
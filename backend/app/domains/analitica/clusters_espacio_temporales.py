@@ -0,0 +1,680 @@
+"""
+Detección de clusters espacio-temporales de casos geocodificados.
+
+Implementa el scan de permutación espacio-temporal (Kulldorff 2005): no
+necesita población de referencia, solo la ubicación y la fecha de cada caso.
+
+- Ventanas cilíndricas: la base es un círculo centrado en una ubicación con
+  casos (radio hasta ``radio_km``) y la altura un intervalo de períodos
+  (hasta ``dias_max``).
+- Casos esperados de un cilindro = casos del círculo en todo el período x
+  casos de la ventana en toda la región / total. El estadístico es el
+  log-likelihood ratio (LLR) de la ventana contra el resto.
+- Significancia por Monte Carlo: se permutan las fechas entre los casos
+  (los totales por círculo y por ventana no cambian) y el p-valor es el
+  rango del LLR observado entre los máximos de las réplicas.
+
+Performance:
+- Los casos se agregan en celdas de ``resolucion_km`` (ubicaciones) y los
+  vecinos de cada ubicación salen de un índice de grilla (``IndiceGrilla``),
+  nunca de la matriz de distancias completa.
+- Cada réplica es un ``bincount`` más sumas acumuladas sobre un arreglo
+  centros x vecinos x períodos: sin loops por cilindro.
+- Las réplicas se reparten entre procesos (``CLUSTERS_PROCESOS``).
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import select
+from sqlmodel import Session, col
+
+from app.core.config import settings
+from app.domains.territorio.geografia_models import (
+    Departamento,
+    Domicilio,
+    EstadoGeocodificacion,
+    Localidad,
+)
+from app.domains.vigilancia_nominal.models.caso import CasoEpidemiologico
+from app.domains.vigilancia_nominal.queries.particiones import condiciones_particion
+
+logger = logging.getLogger(__name__)
+
+_RADIO_TIERRA_KM = 6371.0088
+
+# Centros por bloque al evaluar los cilindros (acota la memoria de cada réplica)
+_BLOQUE_CENTROS = 2048
+
+# Por debajo de esta cantidad de cilindros x réplicas no conviene repartir
+# entre procesos (el costo de serializar supera al cálculo)
+_MIN_TRABAJO_PARALELO = 5_000_000
+
+
+@dataclass(frozen=True)
+class ParametrosEscaneo:
+    """Parámetros del scan espacio-temporal"""
+
+    radio_km: float = 1.0
+    dias_max: int = 28
+    dias_periodo: int = 7
+    resolucion_km: float = 0.1
+    # Tamaño máximo de un cluster como fracción del total de casos
+    max_fraccion_casos: float = 0.5
+    max_vecinos: int = 50
+    replicas: int = 999
+    min_casos: int = 3
+    max_clusters: int = 10
+    semilla: int = 20240101
+
+
+@dataclass
+class ClusterEspacioTemporal:
+    latitud: float
+    longitud: float
+    radio_km: float
+    fecha_inicio: date
+    fecha_fin: date
+    casos: int
+    casos_esperados: float
+    riesgo_relativo: float | None
+    llr: float
+    p_valor: float
+    ubicaciones: int
+
+
+@dataclass
+class ResultadoEscaneo:
+    clusters: list[ClusterEspacioTemporal] = field(default_factory=list)
+    casos: int = 0
+    ubicaciones: int = 0
+    periodos: int = 0
+    replicas: int = 0
+    duracion_segundos: float = 0.0
+
+
+# =============================================================================
+# ÍNDICE ESPACIAL
+# =============================================================================
+
+
+def proyectar_km(latitud: np.ndarray, longitud: np.ndarray) -> np.ndarray:
+    """
+    Coordenadas planas en km (sinusoidal centrada en la longitud media).
+
+    A escala provincial el error en distancias cortas es despreciable.
+    """
+    lat = np.radians(latitud)
+    lon = np.radians(longitud - longitud.mean())
+    return np.column_stack(
+        (_RADIO_TIERRA_KM * lon * np.cos(lat), _RADIO_TIERRA_KM * lat)
+    )
+
+
+class IndiceGrilla:
+    """
+    Índice espacial de grilla uniforme para búsquedas por radio.
+
+    Los puntos se ordenan por celda; los vecinos de un centro dentro de
+    ``tamano_celda`` están en las 3x3 celdas alrededor y cada una es un rango
+    contiguo del orden (``searchsorted``), así la búsqueda es O(vecinos) y
+    vectorizada para todos los centros a la vez.
+    """
+
+    def __init__(self, xy: np.ndarray, tamano_celda: float):
+        self.xy = xy
+        self.tamano_celda = tamano_celda
+        celdas = np.floor(xy / tamano_celda).astype(np.int64)
+        # Margen de una celda para que los vecinos de los bordes no se solapen
+        self._origen = celdas.min(axis=0) - 1
+        self._ancho = int(celdas[:, 0].max() - self._origen[0]) + 2
+        claves = self._clave(celdas)
+        self._orden = np.argsort(claves, kind="stable")
+        self._claves = claves[self._orden]
+
+    def _clave(self, celdas: np.ndarray) -> np.ndarray:
+        relativas = celdas - self._origen
+        return relativas[:, 1] * self._ancho + relativas[:, 0]
+
+    def pares_en_radio(
+        self, centros: np.ndarray, radio: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Pares (centro, punto) a distancia <= ``radio``.
+
+        Args:
+            centros: Coordenadas (n, 2) de los centros
+            radio: Radio de búsqueda (no mayor que el tamaño de celda)
+
+        Returns:
+            Índice del centro, índice del punto y distancia de cada par
+        """
+        if radio > self.tamano_celda:
+            raise ValueError("El radio no puede superar el tamaño de celda")
+        celdas = np.floor(centros / self.tamano_celda).astype(np.int64)
+        indices_centro, indices_punto = [], []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                claves = self._clave(celdas + np.array([dx, dy]))
+                inicio = np.searchsorted(self._claves, claves, side="left")
+                cantidad = np.searchsorted(self._claves, claves, side="right") - inicio
+                total = int(cantidad.sum())
+                if total == 0:
+                    continue
+                # Expande cada rango [inicio, inicio + cantidad) sin loops
+                desplazamiento = np.arange(total) - np.repeat(
+                    np.cumsum(cantidad) - cantidad, cantidad
+                )
+                indices_centro.append(np.repeat(np.arange(len(centros)), cantidad))
+                indices_punto.append(
+                    self._orden[np.repeat(inicio, cantidad) + desplazamiento]
+                )
+        if not indices_centro:
+            vacio = np.empty(0, dtype=np.int64)
+            return vacio, vacio, np.empty(0)
+        centro = np.concatenate(indices_centro)
+        punto = np.concatenate(indices_punto)
+        distancia = np.hypot(*(centros[centro] - self.xy[punto]).T)
+        en_radio = distancia <= radio
+        return centro[en_radio], punto[en_radio], distancia[en_radio]
+
+
+def _vecindarios(
+    xy: np.ndarray, radio: float, max_vecinos: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vecinos de cada ubicación ordenados por distancia (ella misma primero).
+
+    Returns:
+        Matriz (ubicaciones, k) de índices, rellenada con ``len(xy)`` (una
+        ubicación vacía), y la matriz de distancias correspondiente
+    """
+    centro, punto, distancia = IndiceGrilla(xy, radio).pares_en_radio(xy, radio)
+    orden = np.lexsort((punto, distancia, centro))
+    centro, punto, distancia = centro[orden], punto[orden], distancia[orden]
+    primero = np.searchsorted(centro, centro, side="left")
+    rango = np.arange(len(centro)) - primero
+    dentro = rango < max_vecinos
+    centro, punto, distancia, rango = (
+        centro[dentro],
+        punto[dentro],
+        distancia[dentro],
+        rango[dentro],
+    )
+    k = int(rango.max()) + 1
+    vecinos = np.full((len(xy), k), len(xy), dtype=np.int64)
+    distancias = np.full((len(xy), k), np.inf)
+    vecinos[centro, rango] = punto
+    distancias[centro, rango] = distancia
+    return vecinos, distancias
+
+
+# =============================================================================
+# SCAN
+# =============================================================================
+
+
+@dataclass
+class _Modelo:
+    """Todo lo que no cambia entre réplicas (se envía a cada proceso)."""
+
+    vecinos: np.ndarray
+    ubicaciones: np.ndarray
+    periodos: np.ndarray
+    # Casos del círculo / total (inf si el círculo no es válido: relleno o
+    # más grande que max_fraccion_casos), así sus cilindros nunca superan
+    # a los esperados
+    fraccion_circulo: np.ndarray
+    # Casos de cada ventana (por inicio) para cada duración 1..D
+    total_ventana: list[np.ndarray]
+    n_periodos: int
+    min_casos: int
+
+
+def _xlog(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """a * log(a / b), con 0 cuando a es 0."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(a > 0, a * np.log(a / b), 0.0)
+
+
+def _llr(n: np.ndarray, esperados: np.ndarray, total: int) -> np.ndarray:
+    """LLR de cilindros con exceso de casos (n > esperados)."""
+    return _xlog(n, esperados) + _xlog(total - n, total - esperados)
+
+
+def _acumulados(
+    modelo: _Modelo, periodos: np.ndarray
+) -> Iterator[tuple[slice, np.ndarray]]:
+    """
+    Casos de cada círculo acumulados en el tiempo, por bloque de centros.
+
+    Yields:
+        Bloque de centros y arreglo (centros, vecinos, períodos + 1)
+    """
+    t = modelo.n_periodos
+    n_ubicaciones = modelo.vecinos.shape[0]
+    tipo = _tipo_conteos(len(periodos))
+    conteos = np.bincount(
+        modelo.ubicaciones * t + periodos, minlength=(n_ubicaciones + 1) * t
+    ).reshape(n_ubicaciones + 1, t)
+    # Acumulado en el tiempo por ubicación; como sumar vecinos y acumular en
+    # el tiempo conmutan, cada bloque es un gather y una sola suma acumulada
+    acumulado_tiempo = np.zeros((n_ubicaciones + 1, t + 1), dtype=tipo)
+    np.cumsum(conteos, axis=1, out=acumulado_tiempo[:, 1:])
+    for inicio in range(0, n_ubicaciones, _BLOQUE_CENTROS):
+        bloque = slice(inicio, inicio + _BLOQUE_CENTROS)
+        yield (
+            bloque,
+            np.cumsum(acumulado_tiempo[modelo.vecinos[bloque]], axis=1, dtype=tipo),
+        )
+
+
+def _tipo_conteos(total: int) -> type[np.signedinteger]:
+    """Entero más chico que alcanza (menos memoria que recorrer por réplica)."""
+    return np.int16 if total < np.iinfo(np.int16).max else np.int32
+
+
+def _ventanas(acumulado: np.ndarray, duracion: int) -> np.ndarray:
+    """Casos de cada cilindro (centros, vecinos, inicios) de una duración."""
+    return acumulado[:, :, duracion:] - acumulado[:, :, :-duracion]
+
+
+def _esperados(modelo: _Modelo, bloque: slice, duracion: int) -> np.ndarray:
+    # Círculo inválido (inf) x ventana vacía da NaN: tampoco supera nada
+    with np.errstate(invalid="ignore"):
+        return (
+            modelo.fraccion_circulo[bloque, :, None]
+            * modelo.total_ventana[duracion - 1]
+        )
+
+
+def _mejores_por_centro(modelo: _Modelo) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Mejor cilindro de cada centro con los datos observados.
+
+    Returns:
+        LLR por centro y matriz (centros, 3) con el vecino más lejano
+        incluido, el período inicial y la duración
+    """
+    total = len(modelo.periodos)
+    n_ubicaciones = modelo.vecinos.shape[0]
+    mejor = np.zeros(n_ubicaciones)
+    posicion = np.zeros((n_ubicaciones, 3), dtype=np.int64)
+    for bloque, acumulado in _acumulados(modelo, modelo.periodos):
+        for duracion in range(1, len(modelo.total_ventana) + 1):
+            n = _ventanas(acumulado, duracion)
+            esperados = _esperados(modelo, bloque, duracion)
+            candidato = (n > esperados) & (n >= modelo.min_casos)
+            llr = np.zeros(n.shape)
+            llr[candidato] = _llr(n[candidato], esperados[candidato], total)
+            plano = llr.reshape(llr.shape[0], -1)
+            indice = plano.argmax(axis=1)
+            valor = plano[np.arange(len(indice)), indice]
+            mejora = valor > mejor[bloque]
+            mejor[bloque] = np.where(mejora, valor, mejor[bloque])
+            vecino, periodo = np.divmod(indice, llr.shape[2])
+            actual = posicion[bloque]
+            actual[mejora] = np.column_stack(
+                (vecino, periodo, np.full_like(vecino, duracion))
+            )[mejora]
+    return mejor, posicion
+
+
+def _minimos_casos(modelo: _Modelo, piso: float) -> list[list[np.ndarray]]:
+    """
+    Casos mínimos que necesita cada cilindro para llegar a un LLR de ``piso``.
+
+    Para el p-valor solo importa si el máximo de una réplica supera el LLR
+    de algún cluster reportado, así que alcanza con evaluar los cilindros
+    que pueden llegar al menor de ellos. Como LLR <= n log(n / esperados),
+    hace falta esperados <= n exp(-piso / n), que es creciente en n: el
+    mínimo sale de un ``searchsorted`` sobre esa tabla. Los esperados no
+    cambian entre réplicas, así que se calcula una vez por proceso.
+
+    Returns:
+        Por bloque de centros y duración, arreglo (centros, vecinos, inicios)
+    """
+    total = len(modelo.periodos)
+    tipo = _tipo_conteos(total)
+    conteos = np.arange(1, total + 1, dtype=np.float64)
+    umbral = np.concatenate(([-1.0], conteos * np.exp(-piso / conteos) * (1 + 1e-6)))
+    umbral[: modelo.min_casos] = -1.0
+    n_ubicaciones = modelo.vecinos.shape[0]
+    return [
+        [
+            np.searchsorted(umbral, _esperados(modelo, bloque, duracion)).astype(tipo)
+            for duracion in range(1, len(modelo.total_ventana) + 1)
+        ]
+        for bloque in (
+            slice(inicio, inicio + _BLOQUE_CENTROS)
+            for inicio in range(0, n_ubicaciones, _BLOQUE_CENTROS)
+        )
+    ]
+
+
+def _maximo_llr(
+    modelo: _Modelo, periodos: np.ndarray, minimos: list[list[np.ndarray]]
+) -> float:
+    """
+    LLR del cilindro más probable de una réplica.
+
+    Solo se evalúan los cilindros con al menos ``minimos`` casos, así que
+    el resultado es exacto si llega al piso usado para calcularlos.
+    """
+    total = len(periodos)
+    mejor = 0.0
+    for (bloque, acumulado), minimos_bloque in zip(
+        _acumulados(modelo, periodos), minimos, strict=True
+    ):
+        for duracion, minimo in enumerate(minimos_bloque, start=1):
+            n = _ventanas(acumulado, duracion)
+            # flatnonzero es bastante más rápido que nonzero en 3D
+            indices = np.flatnonzero(n >= minimo)
+            if not len(indices):
+                continue
+            circulo, periodo = np.divmod(indices, n.shape[2])
+            esperados = (
+                modelo.fraccion_circulo[bloque].ravel()[circulo]
+                * modelo.total_ventana[duracion - 1][periodo]
+            )
+            mejor = max(mejor, float(_llr(n.ravel()[indices], esperados, total).max()))
+    return mejor
+
+
+def _maximos_replicas(
+    modelo: _Modelo, piso: float, semillas: list[np.random.SeedSequence]
+) -> np.ndarray:
+    """Máximo LLR de una réplica con fechas permutadas por cada semilla."""
+    minimos = _minimos_casos(modelo, piso)
+    return np.array(
+        [
+            _maximo_llr(
+                modelo, np.random.default_rng(s).permutation(modelo.periodos), minimos
+            )
+            for s in semillas
+        ]
+    )
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _procesos() -> int:
+    cpus = os.cpu_count() or 1
+    return min(settings.CLUSTERS_PROCESOS or cpus, cpus)
+
+
+def _obtener_pool() -> ProcessPoolExecutor:
+    """Pool de procesos compartido (se crea una vez por proceso)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # forkserver: no hereda hilos ni conexiones del servidor
+            _pool = ProcessPoolExecutor(
+                max_workers=_procesos(),
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+        return _pool
+
+
+def _simular(modelo: _Modelo, piso: float, replicas: int, semilla: int) -> np.ndarray:
+    """
+    Máximos de las réplicas, repartidas entre procesos si conviene.
+
+    Cada réplica tiene su propia semilla, así el resultado no depende de la
+    cantidad de procesos.
+    """
+    semillas = np.random.SeedSequence(semilla).spawn(replicas)
+    procesos = min(_procesos(), replicas)
+    trabajo = modelo.vecinos.size * modelo.n_periodos * replicas
+    if procesos <= 1 or trabajo < _MIN_TRABAJO_PARALELO:
+        return _maximos_replicas(modelo, piso, semillas)
+
+    futuros = [
+        _obtener_pool().submit(_maximos_replicas, modelo, piso, list(parte))
+        for parte in np.array_split(np.array(semillas, dtype=object), procesos)
+    ]
+    return np.concatenate([f.result() for f in futuros])
+
+
+def escanear_clusters(
+    latitud: np.ndarray,
+    longitud: np.ndarray,
+    fechas: np.ndarray,
+    fecha_desde: date,
+    parametros: ParametrosEscaneo,
+) -> ResultadoEscaneo:
+    """
+    Scan de permutación espacio-temporal sobre casos puntuales.
+
+    Args:
+        latitud: Latitud de cada caso
+        longitud: Longitud de cada caso
+        fechas: Fecha de cada caso (``datetime64[D]``)
+        fecha_desde: Inicio del período analizado (inicio del primer período)
+        parametros: Parámetros del scan
+
+    Returns:
+        Clusters sin solapamiento espacial, del más al menos probable
+    """
+    inicio = time.perf_counter()
+    resultado = ResultadoEscaneo(casos=len(latitud), replicas=parametros.replicas)
+    if len(latitud) < parametros.min_casos:
+        return resultado
+
+    # Ubicaciones: casos agregados en celdas de resolucion_km
+    xy = proyectar_km(latitud, longitud)
+    celdas, ubicaciones = np.unique(
+        np.floor(xy / parametros.resolucion_km).astype(np.int64),
+        axis=0,
+        return_inverse=True,
+    )
+    ubicaciones = ubicaciones.ravel()
+    casos_ubicacion = np.bincount(ubicaciones)
+    xy_ubicacion = (
+        np.column_stack(
+            [np.bincount(ubicaciones, weights=xy[:, eje]) for eje in (0, 1)]
+        )
+        / casos_ubicacion[:, None]
+    )
+    lat_ubicacion = np.bincount(ubicaciones, weights=latitud) / casos_ubicacion
+    lon_ubicacion = np.bincount(ubicaciones, weights=longitud) / casos_ubicacion
+
+    dias = (fechas - np.datetime64(fecha_desde, "D")).astype(np.int64)
+    periodos = dias // parametros.dias_periodo
+    n_periodos = int(periodos.max()) + 1
+    duracion_max = min(
+        max(1, parametros.dias_max // parametros.dias_periodo), n_periodos
+    )
+    resultado.ubicaciones = len(celdas)
+    resultado.periodos = n_periodos
+
+    vecinos, distancias = _vecindarios(
+        xy_ubicacion, parametros.radio_km, parametros.max_vecinos
+    )
+    total = len(periodos)
+    total_circulo = np.cumsum(np.append(casos_ubicacion, 0)[vecinos], axis=1)
+    casos_periodo = np.concatenate(
+        ([0], np.cumsum(np.bincount(periodos, minlength=n_periodos)))
+    )
+    circulo_valido = (vecinos < len(celdas)) & (
+        total_circulo <= parametros.max_fraccion_casos * total
+    )
+    modelo = _Modelo(
+        vecinos=vecinos,
+        ubicaciones=ubicaciones,
+        periodos=periodos,
+        fraccion_circulo=np.where(circulo_valido, total_circulo / total, np.inf).astype(
+            np.float32
+        ),
+        total_ventana=[
+            (casos_periodo[d:] - casos_periodo[:-d]).astype(np.float32)
+            for d in range(1, duracion_max + 1)
+        ],
+        n_periodos=n_periodos,
+        min_casos=parametros.min_casos,
+    )
+
+    llr_centro, posicion = _mejores_por_centro(modelo)
+
+    # Clusters secundarios: mejores centros sin ubicaciones en común
+    usadas = np.zeros(len(celdas), dtype=bool)
+    llr_clusters: list[float] = []
+    for centro in np.argsort(-llr_centro, kind="stable"):
+        llr = float(llr_centro[centro])
+        if llr <= 0 or len(resultado.clusters) >= parametros.max_clusters:
+            break
+        vecino, periodo, duracion = (int(v) for v in posicion[centro])
+        miembros = vecinos[centro, : vecino + 1]
+        if usadas[miembros].any():
+            continue
+        usadas[miembros] = True
+
+        casos = int(
+            (
+                (np.isin(ubicaciones, miembros))
+                & (periodos >= periodo)
+                & (periodos < periodo + duracion)
+            ).sum()
+        )
+        esperados = float(
+            total_circulo[centro, vecino]
+            * modelo.total_ventana[duracion - 1][periodo]
+            / total
+        )
+        fuera = (total - casos) / (total - esperados) if total > esperados else 0.0
+        desde = fecha_desde + timedelta(days=periodo * parametros.dias_periodo)
+        resultado.clusters.append(
+            ClusterEspacioTemporal(
+                latitud=float(lat_ubicacion[centro]),
+                longitud=float(lon_ubicacion[centro]),
+                # Radio hasta la ubicación más lejana (al menos media celda)
+                radio_km=round(
+                    max(
+                        float(distancias[centro, vecino]), parametros.resolucion_km / 2
+                    ),
+                    3,
+                ),
+                fecha_inicio=desde,
+                fecha_fin=desde
+                + timedelta(days=duracion * parametros.dias_periodo - 1),
+                casos=casos,
+                casos_esperados=round(esperados, 2),
+                riesgo_relativo=round(casos / esperados / fuera, 2)
+                if fuera > 0
+                else None,
+                llr=round(llr, 3),
+                p_valor=1.0,
+                ubicaciones=len(miembros),
+            )
+        )
+        llr_clusters.append(llr)
+
+    if llr_clusters and parametros.replicas > 0:
+        maximos = _simular(
+            modelo, min(llr_clusters), parametros.replicas, parametros.semilla
+        )
+        for cluster, llr in zip(resultado.clusters, llr_clusters, strict=True):
+            cluster.p_valor = round(
+                (1 + int((maximos >= llr).sum())) / (len(maximos) + 1), 4
+            )
+
+    resultado.duracion_segundos = time.perf_counter() - inicio
+    return resultado
+
+
+# =============================================================================
+# CARGA
+# =============================================================================
+
+
+def cargar_casos_geocodificados(
+    session: Session,
+    id_enfermedad: int,
+    fecha_desde: date,
+    fecha_hasta: date,
+    id_provincia_indec: int | None = None,
+    clasificaciones: list[str] | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Coordenadas y fecha de los casos de una enfermedad con domicilio geocodificado.
+
+    Returns:
+        Latitud, longitud y fecha (``datetime64[D]``) de cada caso
+    """
+    query = (
+        select(
+            col(Domicilio.latitud),
+            col(Domicilio.longitud),
+            col(CasoEpidemiologico.fecha_minima_caso),
+        )
+        .join(Domicilio, col(CasoEpidemiologico.id_domicilio) == col(Domicilio.id))
+        .where(
+            col(CasoEpidemiologico.id_enfermedad) == id_enfermedad,
+            col(CasoEpidemiologico.fecha_minima_caso).between(fecha_desde, fecha_hasta),
+            *condiciones_particion(fecha_desde, fecha_hasta),
+            col(Domicilio.estado_geocodificacion)
+            == EstadoGeocodificacion.GEOCODIFICADO,
+            col(Domicilio.latitud).is_not(None),
+            col(Domicilio.longitud).is_not(None),
+        )
+    )
+    if id_provincia_indec is not None:
+        query = (
+            query.join(
+                Localidad,
+                col(Domicilio.id_localidad_indec) == col(Localidad.id_localidad_indec),
+            )
+            .join(
+                Departamento,
+                col(Localidad.id_departamento_indec)
+                == col(Departamento.id_departamento_indec),
+            )
+            .where(col(Departamento.id_provincia_indec) == id_provincia_indec)
+        )
+    if clasificaciones:
+        query = query.where(
+            col(CasoEpidemiologico.clasificacion_estrategia).in_(clasificaciones)
+        )
+
+    filas = session.execute(query).all()
+    latitud = np.array([float(f.latitud) for f in filas])
+    longitud = np.array([float(f.longitud) for f in filas])
+    fechas = np.array([f.fecha_minima_caso for f in filas], dtype="datetime64[D]")
+    return latitud, longitud, fechas
+
+
+def detectar_clusters(
+    session: Session,
+    id_enfermedad: int,
+    fecha_desde: date,
+    fecha_hasta: date,
+    parametros: ParametrosEscaneo,
+    id_provincia_indec: int | None = None,
+    clasificaciones: list[str] | None = None,
+) -> ResultadoEscaneo:
+    """Carga los casos geocodificados de una enfermedad y corre el scan."""
+    latitud, longitud, fechas = cargar_casos_geocodificados(
+        session,
+        id_enfermedad,
+        fecha_desde,
+        fecha_hasta,
+        id_provincia_indec,
+        clasificaciones,
+    )
+    resultado = escanear_clusters(latitud, longitud, fechas, fecha_desde, parametros)
+    logger.info(
+        f"🗺️ Scan espacio-temporal enfermedad={id_enfermedad}: {resultado.casos} casos, "
+        f"{resultado.ubicaciones} ubicaciones, {len(resultado.clusters)} clusters "
+        f"en {resultado.duracion_segundos:.2f}s"
+    )
+    return resultado
@@ -4,7 +4,9 @@ Schemas para Analytics - grupos de eventos y configuraciones para visualizacione
 
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+from app.domains.dashboard.age_groups_config import obtener_configuracion_grupos_edad
 
 
 class GrupoCasoEpidemiologico(BaseModel):
@@ -107,6 +109,13 @@ class DatosVisualizacionRequest(BaseModel):
         default_factory=dict, description="Parámetros adicionales"
     )
 
+    @field_validator("parametros_extra")
+    @classmethod
+    def validate_age_group_config(cls, v: dict[str, Any]) -> dict[str, Any]:
+        # Una configuración desconocida es un 422, no un 500 en la consulta
+        obtener_configuracion_grupos_edad(v.get("age_group_config", "standard"))
+        return v
+
 
 class DatosVisualizacionResponse(BaseModel):
     """Respuesta con datos para visualización."""
@@ -6,10 +6,15 @@ import logging
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import func
+from sqlalchemy import func, text
 from sqlalchemy.orm import Session
 from sqlmodel import col
 
+from app.domains.dashboard.age_groups_config import (
+    generar_sql_case_when,
+    obtener_configuracion_grupos_edad,
+    obtener_etiquetas_grupos_edad,
+)
 from app.domains.vigilancia_nominal.clasificacion.models import TipoClasificacion
 from app.domains.vigilancia_nominal.models.caso import CasoEpidemiologico
 from app.domains.vigilancia_nominal.models.enfermedad import Enfermedad
@@ -298,38 +303,12 @@ class AnalyticsService:
                 )
 
                 if tipo_eno_evento:
-                    # Obtener estadísticas básicas
-                    total_query = self.session.query(
-                        func.count(col(CasoEpidemiologico.id))
-                    ).filter(
-                        col(CasoEpidemiologico.id_enfermedad) == tipo_eno_evento.id
-                    )
-                    total_casos = total_query.scalar() or 0
-
-                    confirmados_query = self.session.query(
-                        func.count(col(CasoEpidemiologico.id))
-                    ).filter(
-                        col(CasoEpidemiologico.id_enfermedad) == tipo_eno_evento.id,
-                        col(CasoEpidemiologico.clasificacion_estrategia)
-                        == TipoClasificacion.CONFIRMADOS,
-                    )
-                    casos_confirmados = confirmados_query.scalar() or 0
-
-                    sospechosos_query = self.session.query(
-                        func.count(col(CasoEpidemiologico.id))
-                    ).filter(
-                        col(CasoEpidemiologico.id_enfermedad) == tipo_eno_evento.id,
-                        col(CasoEpidemiologico.clasificacion_estrategia)
-                        == TipoClasificacion.SOSPECHOSOS,
-                    )
-                    casos_sospechosos = sospechosos_query.scalar() or 0
-
-                    ultimo_caso_query = self.session.query(
-                        func.max(col(CasoEpidemiologico.fecha_minima_caso))
-                    ).filter(
-                        col(CasoEpidemiologico.id_enfermedad) == tipo_eno_evento.id
-                    )
-                    ultimo_caso = ultimo_caso_query.scalar()
+                    (
+                        total_casos,
+                        casos_confirmados,
+                        casos_sospechosos,
+                        ultimo_caso,
+                    ) = self._estadisticas_evento(tipo_eno_evento.id)
 
                     evento = CasoEpidemiologicoDentroGrupo(
                         id=tipo_eno_evento.id,
@@ -353,32 +332,12 @@ class AnalyticsService:
                 .first()
             )
             if tipo_eno:
-                # Obtener estadísticas básicas del evento simple
-                total_query = self.session.query(
-                    func.count(col(CasoEpidemiologico.id))
-                ).filter(col(CasoEpidemiologico.id_enfermedad) == tipo_eno.id)
-                total_casos = total_query.scalar() or 0
-
-                confirmados_query = self.session.query(
-                    func.count(col(CasoEpidemiologico.id))
-                ).filter(
-                    col(CasoEpidemiologico.id_enfermedad) == tipo_eno.id,
-                    col(CasoEpidemiologico.clasificacion_estrategia) == "confirmados",
-                )
-                casos_confirmados = confirmados_query.scalar() or 0
-
-                sospechosos_query = self.session.query(
-                    func.count(col(CasoEpidemiologico.id))
-                ).filter(
-                    col(CasoEpidemiologico.id_enfermedad) == tipo_eno.id,
-                    col(CasoEpidemiologico.clasificacion_estrategia) == "sospechosos",
-                )
-                casos_sospechosos = sospechosos_query.scalar() or 0
-
-                ultimo_caso_query = self.session.query(
-                    func.max(col(CasoEpidemiologico.fecha_minima_caso))
-                ).filter(col(CasoEpidemiologico.id_enfermedad) == tipo_eno.id)
-                ultimo_caso = ultimo_caso_query.scalar()
+                (
+                    total_casos,
+                    casos_confirmados,
+                    casos_sospechosos,
+                    ultimo_caso,
+                ) = self._estadisticas_evento(tipo_eno.id)
 
                 evento = CasoEpidemiologicoDentroGrupo(
                     id=tipo_eno.id,
@@ -407,6 +366,25 @@ class AnalyticsService:
             grupo=grupo, eventos=eventos, graficos_disponibles=graficos_disponibles
         )
 
+    def _estadisticas_evento(self, id_enfermedad: int) -> tuple[int, int, int, Any]:
+        """Total, confirmados, sospechosos y último caso de un evento en una consulta."""
+        clasificacion = col(CasoEpidemiologico.clasificacion_estrategia)
+        fila = (
+            self.session.query(
+                func.count(col(CasoEpidemiologico.id)),
+                func.count(col(CasoEpidemiologico.id)).filter(
+                    clasificacion == TipoClasificacion.CONFIRMADOS
+                ),
+                func.count(col(CasoEpidemiologico.id)).filter(
+                    clasificacion == TipoClasificacion.SOSPECHOSOS
+                ),
+                func.max(col(CasoEpidemiologico.fecha_minima_caso)),
+            )
+            .filter(col(CasoEpidemiologico.id_enfermedad) == id_enfermedad)
+            .one()
+        )
+        return fila[0] or 0, fila[1] or 0, fila[2] or 0, fila[3]
+
     async def get_datos_visualizacion(
         self, request: DatosVisualizacionRequest
     ) -> DatosVisualizacionResponse:
@@ -424,40 +402,42 @@ class AnalyticsService:
             else [e.tipo_eno_id for e in grupo_detalle.eventos]
         )
 
-        # Query base
-        query = self.session.query(CasoEpidemiologico).filter(
-            col(CasoEpidemiologico.id_enfermedad).in_(evento_ids)
-        )
-
-        # Aplicar filtros
+        # Filtros comunes a todas las consultas (alias "e" = caso_epidemiologico)
+        condiciones = ["e.id_enfermedad = ANY(:evento_ids)"]
+        params: dict[str, Any] = {"evento_ids": evento_ids}
         filtros_aplicados = {}
 
         if request.clasificacion != "todos":
-            query = query.filter(
-                col(CasoEpidemiologico.clasificacion_estrategia)
-                == request.clasificacion
-            )
+            condiciones.append("e.clasificacion_estrategia = :clasificacion")
+            params["clasificacion"] = request.clasificacion.upper()
             filtros_aplicados["clasificacion"] = request.clasificacion
 
         if request.fecha_desde:
-            fecha_desde = datetime.strptime(request.fecha_desde, "%Y-%m-%d").date()
-            query = query.filter(
-                col(CasoEpidemiologico.fecha_minima_caso) >= fecha_desde
-            )
+            condiciones.append("e.fecha_minima_caso >= :fecha_desde")
+            params["fecha_desde"] = datetime.strptime(
+                request.fecha_desde, "%Y-%m-%d"
+            ).date()
             filtros_aplicados["fecha_desde"] = request.fecha_desde
 
         if request.fecha_hasta:
-            fecha_hasta = datetime.strptime(request.fecha_hasta, "%Y-%m-%d").date()
-            query = query.filter(
-                col(CasoEpidemiologico.fecha_minima_caso) <= fecha_hasta
-            )
+            condiciones.append("e.fecha_minima_caso <= :fecha_hasta")
+            params["fecha_hasta"] = datetime.strptime(
+                request.fecha_hasta, "%Y-%m-%d"
+            ).date()
             filtros_aplicados["fecha_hasta"] = request.fecha_hasta
 
-        # Generar datos según tipo de gráfico
-        datos = await self._generar_datos_grafico(query, request.tipo_grafico)
+        where_sql = " AND ".join(condiciones)
 
-        # Contar total de casos
-        total_casos = query.count()
+        # Total, sexo, serie mensual y grupos de edad en una sola pasada
+        agregados = self._calcular_agregados(
+            where_sql, params, request.parametros_extra
+        )
+
+        # Generar datos según tipo de gráfico
+        if request.tipo_grafico == "tabla":
+            datos = await self._generar_tabla(where_sql, params)
+        else:
+            datos = await self._generar_datos_grafico(agregados, request.tipo_grafico)
 
         return DatosVisualizacionResponse(
             grupo=grupo_detalle.grupo.nombre,
@@ -471,152 +451,166 @@ class AnalyticsService:
                 "generated_at": datetime.now().isoformat(),
                 "query_params": request.parametros_extra,
             },
-            total_casos=total_casos,
+            total_casos=agregados["total"],
             fecha_generacion=datetime.now().isoformat(),
             filtros_aplicados=filtros_aplicados,
         )
 
-    async def _generar_datos_grafico(
-        self, query: Any, tipo_grafico: str
-    ) -> list[dict[str, Any]]:
-        """Genera datos específicos según el tipo de gráfico."""
-
-        if tipo_grafico == "casos_por_edad":
-            return await self._generar_casos_por_edad(query)
-        elif tipo_grafico == "torta_sexo":
-            return await self._generar_torta_sexo(query)
-        elif tipo_grafico == "casos_mensual":
-            return await self._generar_casos_mensual(query)
-        elif tipo_grafico == "tabla":
-            return await self._generar_tabla(query)
-        else:
-            # Gráfico genérico de totales
-            return await self._generar_totales(query)
+    def _calcular_agregados(
+        self,
+        where_sql: str,
+        params: dict[str, Any],
+        parametros_extra: dict[str, Any],
+    ) -> dict[str, Any]:
+        """
+        Calcula todos los agregados de la visualización con un único GROUPING SETS.
 
-    async def _generar_casos_por_edad(self, query: Any) -> list[dict[str, Any]]:
-        """Genera datos para gráfico de casos por edad."""
-        # Unir con ciudadano para obtener fecha de nacimiento
-        from app.domains.vigilancia_nominal.models.sujetos import Ciudadano
+        Cada fila del resultado pertenece a un solo conjunto de agrupación,
+        identificado por la máscara de bits de GROUPING(): el total general,
+        los casos por sexo, la serie mensual y los grupos de edad. El costo en
+        Python depende de la cantidad de grupos, no de la cantidad de casos.
 
-        resultados = (
-            query.join(Ciudadano)
-            .with_entities(
-                func.extract("year", func.age(Ciudadano.fecha_nacimiento)).label("edad")
-            )
-            .all()
+        Parámetros extra opcionales:
+            - age_group_config: str = "standard" | "pediatric" | "simple" | "decennial"
+        """
+        config_nombre = parametros_extra.get("age_group_config", "standard")
+        grupos_edad = obtener_configuracion_grupos_edad(config_nombre)
+        etiquetas_edad = obtener_etiquetas_grupos_edad(grupos_edad)
+
+        # generar_sql_case_when ya contempla fecha de nacimiento nula
+        # ('Desconocido'). El total y la serie mensual cuentan todos los casos;
+        # sexo y edad solo los de ciudadanos (los casos animales no tienen
+        # ciudadano y no deben caer en 'Desconocido' ni en 'Sin datos')
+        query = f"""
+        WITH casos AS (
+            SELECT
+                {generar_sql_case_when(grupos_edad)} AS grupo_edad,
+                c.sexo_biologico::text AS sexo,
+                c.codigo_ciudadano IS NOT NULL AS es_ciudadano,
+                EXTRACT(YEAR FROM e.fecha_minima_caso)::int AS anio,
+                EXTRACT(MONTH FROM e.fecha_minima_caso)::int AS mes
+            FROM caso_epidemiologico e
+            LEFT JOIN ciudadano c ON c.codigo_ciudadano = e.codigo_ciudadano
+            WHERE {where_sql}
         )
+        SELECT
+            GROUPING(sexo, anio, mes, grupo_edad) AS conjunto,
+            sexo,
+            anio,
+            mes,
+            grupo_edad,
+            COUNT(*) AS casos,
+            COUNT(*) FILTER (WHERE es_ciudadano) AS casos_ciudadanos
+        FROM casos
+        GROUP BY GROUPING SETS ((), (sexo), (anio, mes), (grupo_edad))
+        """
 
-        # Agrupar por rangos etarios
-        rangos = {
-            "0-4": 0,
-            "5-14": 0,
-            "15-24": 0,
-            "25-34": 0,
-            "35-44": 0,
-            "45-54": 0,
-            "55-64": 0,
-            "65+": 0,
-            "Sin datos": 0,
-        }
+        # Bits de GROUPING(sexo, anio, mes, grupo_edad): 1 = columna no agrupada
+        conjunto_total = 0b1111
+        conjunto_sexo = 0b0111
+        conjunto_mensual = 0b1001
+        conjunto_edad = 0b1110
+
+        total = 0
+        por_sexo: list[dict[str, Any]] = []
+        mensual: list[tuple[int, int, int]] = []
+        por_edad = dict.fromkeys([*etiquetas_edad, "Desconocido"], 0)
+
+        for fila in self.session.execute(text(query), params):
+            if fila.conjunto == conjunto_total:
+                total = fila.casos
+            elif fila.conjunto == conjunto_sexo:
+                if fila.casos_ciudadanos:
+                    por_sexo.append(
+                        {
+                            "sexo": fila.sexo or "Sin datos",
+                            "casos": fila.casos_ciudadanos,
+                        }
+                    )
+            elif fila.conjunto == conjunto_mensual:
+                # Casos sin fecha no tienen mes: solo cuentan en el total
+                if fila.anio is not None:
+                    mensual.append((fila.anio, fila.mes, fila.casos))
+            elif fila.conjunto == conjunto_edad:
+                por_edad[fila.grupo_edad] = fila.casos_ciudadanos
 
-        for resultado in resultados:
-            edad = resultado.edad
-            if edad is None:
-                rangos["Sin datos"] += 1
-            elif edad < 5:
-                rangos["0-4"] += 1
-            elif edad < 15:
-                rangos["5-14"] += 1
-            elif edad < 25:
-                rangos["15-24"] += 1
-            elif edad < 35:
-                rangos["25-34"] += 1
-            elif edad < 45:
-                rangos["35-44"] += 1
-            elif edad < 55:
-                rangos["45-54"] += 1
-            elif edad < 65:
-                rangos["55-64"] += 1
-            else:
-                rangos["65+"] += 1
+        mensual.sort()
 
-        return [
-            {"rango": rango, "casos": cantidad} for rango, cantidad in rangos.items()
-        ]
+        return {
+            "total": total,
+            "por_sexo": por_sexo,
+            "mensual": [
+                {
+                    "periodo": f"{anio}-{mes:02d}",
+                    "casos": casos,
+                    "anio": anio,
+                    "mes": mes,
+                }
+                for anio, mes, casos in mensual
+            ],
+            "por_edad": [
+                {"rango": rango, "casos": cantidad}
+                for rango, cantidad in por_edad.items()
+            ],
+        }
 
-    async def _generar_torta_sexo(self, query: Any) -> list[dict[str, Any]]:
-        """Genera datos para gráfico de torta por sexo."""
-        from app.domains.vigilancia_nominal.models.sujetos import Ciudadano
+    async def _generar_datos_grafico(
+        self, agregados: dict[str, Any], tipo_grafico: str
+    ) -> list[dict[str, Any]]:
+        """Selecciona los datos del gráfico a partir de los agregados calculados."""
 
-        resultados = (
-            query.join(Ciudadano)
-            .with_entities(
-                col(Ciudadano.sexo_biologico),
-                func.count(col(CasoEpidemiologico.id)).label("casos"),
-            )
-            .group_by(col(Ciudadano.sexo_biologico))
-            .all()
-        )
+        if tipo_grafico == "casos_por_edad":
+            return agregados["por_edad"]
+        elif tipo_grafico == "torta_sexo":
+            return agregados["por_sexo"]
+        elif tipo_grafico == "casos_mensual":
+            return agregados["mensual"]
+        else:
+            # Gráfico genérico de totales
+            return [{"categoria": "Total de casos", "valor": agregados["total"]}]
 
-        return [
-            {"sexo": r.sexo_biologico or "Sin datos", "casos": r.casos}
-            for r in resultados
-        ]
+    async def _generar_tabla(
+        self, where_sql: str, params: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        """
+        Genera datos para tabla (columnas proyectadas, sin hidratar ORM).
 
-    async def _generar_casos_mensual(self, query: Any) -> list[dict[str, Any]]:
-        """Genera datos para gráfico mensual."""
-        resultados = (
-            query.with_entities(
-                func.extract("year", col(CasoEpidemiologico.fecha_minima_caso)).label(
-                    "anio"
-                ),
-                func.extract("month", col(CasoEpidemiologico.fecha_minima_caso)).label(
-                    "mes"
-                ),
-                func.count(col(CasoEpidemiologico.id)).label("casos"),
-            )
-            .group_by("anio", "mes")
-            .order_by("anio", "mes")
-            .all()
-        )
+        Solo casos de ciudadanos, con la provincia y la localidad del
+        domicilio del caso.
+        """
+        query = f"""
+        SELECT
+            e.id,
+            concat_ws(' ', c.nombre, c.apellido) AS nombre,
+            e.fecha_minima_caso,
+            e.clasificacion_estrategia::text AS clasificacion,
+            p.nombre AS provincia,
+            l.nombre AS localidad
+        FROM caso_epidemiologico e
+        JOIN ciudadano c ON c.codigo_ciudadano = e.codigo_ciudadano
+        LEFT JOIN domicilio dom ON dom.id = e.id_domicilio
+        LEFT JOIN localidad l ON l.id_localidad_indec = dom.id_localidad_indec
+        LEFT JOIN departamento d ON d.id_departamento_indec = l.id_departamento_indec
+        LEFT JOIN provincia p ON p.id_provincia_indec = d.id_provincia_indec
+        WHERE {where_sql}
+        ORDER BY e.fecha_minima_caso DESC NULLS LAST, e.id DESC
+        LIMIT 100
+        """
 
         return [
             {
-                "periodo": f"{int(r.anio)}-{int(r.mes):02d}",
-                "casos": r.casos,
-                "anio": int(r.anio),
-                "mes": int(r.mes),
-            }
-            for r in resultados
-        ]
-
-    async def _generar_tabla(self, query: Any) -> list[dict[str, Any]]:
-        """Genera datos para tabla."""
-        from app.domains.vigilancia_nominal.models.sujetos import Ciudadano
-
-        resultados = query.join(Ciudadano).limit(100).all()
-
-        datos = [
-            {
-                "id": evento.id_evento_caso,
-                "nombre": f"{evento.ciudadano.nombre} {evento.ciudadano.apellido}",
-                "fecha": evento.fecha_minima_caso.isoformat()
-                if evento.fecha_minima_caso
+                "id": fila.id,
+                "nombre": fila.nombre or None,
+                "fecha": fila.fecha_minima_caso.isoformat()
+                if fila.fecha_minima_caso
                 else None,
-                "clasificacion": evento.clasificacion_estrategia,
-                "provincia": evento.ciudadano.provincia,
-                "localidad": evento.ciudadano.localidad,
+                "clasificacion": fila.clasificacion,
+                "provincia": fila.provincia,
+                "localidad": fila.localidad,
             }
-            for evento in resultados
+            for fila in self.session.execute(text(query), params)
         ]
 
-        return datos
-
-    async def _generar_totales(self, query: Any) -> list[dict[str, Any]]:
-        """Genera datos de totales simples."""
-        total = query.count()
-        return [{"categoria": "Total de casos", "valor": total}]
-
 
 # Instancia del servicio (será inyectada)
 analytics_service = None
@@ -26,7 +26,7 @@ from app.domains.metricas.criteria.temporal import (
     AniosMultiplesCriterion,
     RangoPeriodoCriterion,
 )
-from app.domains.metricas.service import MetricService
+from app.domains.metricas.service import MetricRequest, MetricService
 from app.domains.vigilancia_agregada.models.catalogos import (
     TipoCasoEpidemiologicoPasivo,
 )
@@ -161,54 +161,65 @@ class BloqueQueryAdapter:
             f"     Compute: {compute}, métrica: {bloque.metrica_codigo}, dims: {bloque.dimensiones}"
         )
 
-        # 4. Ejecutar query por cada serie
-        resultados_series = []
-        for serie in series:
-            criterio_final = (
-                criterio_base & serie.criterion if serie.criterion else criterio_base
+        # 4. Ejecutar las series en batch (una sola query por source)
+        filtros = {
+            "periodo": {
+                "anio_desde": contexto.anio_actual,
+                "semana_desde": max(
+                    1, contexto.semana_actual - contexto.num_semanas + 1
+                ),
+                "anio_hasta": contexto.anio_actual,
+                "semana_hasta": contexto.semana_actual,
+            }
+        }
+        requests = [
+            MetricRequest(
+                metric=bloque.metrica_codigo,
+                dimensions=bloque.dimensiones,
+                criteria=(
+                    criterio_base & serie.criterion
+                    if serie.criterion
+                    else criterio_base
+                ),
+                compute=compute,
+                filters=filtros,
             )
-            logger.info(f"       Serie '{serie.slug}': ejecutando query...")
-
-            try:
-                result = self.metric_service.query(
-                    metric=bloque.metrica_codigo,
-                    dimensions=bloque.dimensiones,
-                    criteria=criterio_final,
-                    compute=compute,
-                    filters={
-                        "periodo": {
-                            "anio_desde": contexto.anio_actual,
-                            "semana_desde": max(
-                                1, contexto.semana_actual - contexto.num_semanas + 1
-                            ),
-                            "anio_hasta": contexto.anio_actual,
-                            "semana_hasta": contexto.semana_actual,
-                        }
-                    },
-                )
-                data_count = len(result.get("data", []))
-                logger.info(f"       Serie '{serie.slug}': {data_count} filas de datos")
-                if data_count > 0:
-                    logger.info(f"       Muestra de datos: {result['data'][:2]}")
-                resultados_series.append(
-                    {
-                        "serie": serie.label,
-                        "slug": serie.slug,
-                        "color": serie.color,
-                        "data": result["data"],
-                        "metadata": result["metadata"],
-                    }
+            for serie in series
+        ]
+        logger.info(f"       Ejecutando {len(requests)} series en batch...")
+
+        resultados_series = []
+        try:
+            resultados, _ = self.metric_service.query_batch_results(requests)
+        except Exception as e:
+            # Las series comparten métrica y dimensiones: el error es común a todas
+            logger.error(f"       Bloque '{bloque.slug}': ERROR - {e}")
+            resultados_series = [
+                {
+                    "serie": serie.label,
+                    "slug": serie.slug,
+                    "color": serie.color,
+                    "data": [],
+                    "error": str(e),
+                }
+                for serie in series
+            ]
+        else:
+            for serie, result in zip(series, resultados, strict=True):
+                frame = result.frame
+                logger.info(
+                    f"       Serie '{serie.slug}': {frame.height} filas de datos"
                 )
-            except Exception as e:
-                # Log error pero continuar con otras series
-                logger.error(f"       Serie '{serie.slug}': ERROR - {e}")
+                if frame.height > 0:
+                    logger.info(f"       Muestra de datos: {frame.head(2).to_dicts()}")
+                # El bloque se guarda como JSON (TipTap): filas recién al final
                 resultados_series.append(
                     {
                         "serie": serie.label,
                         "slug": serie.slug,
                         "color": serie.color,
-                        "data": [],
-                        "error": str(e),
+                        "data": frame.to_dicts(),
+                        "metadata": result.metadata,
                     }
                 )
 
@@ -0,0 +1,363 @@
+"""
+Cachés del renderizado server-side de charts.
+
+Un boletín renderiza decenas de charts seguidos; lo caro no son los datos sino
+armar cada vez lo mismo:
+
+- MapaChubut: el SVG de Chubut se parsea una sola vez a paths de matplotlib
+  (polígono + etiqueta por departamento, con la posición de la etiqueta ya
+  calculada). El mapa base (bordes y nombres) se rasteriza una vez por
+  (dpi, tamaño) y se compone como capa RGBA sobre la capa de datos, que es
+  lo único que se dibuja en cada render.
+- FigurePool: figuras/axes de matplotlib reutilizables por (tamaño, dpi). En
+  vez de crear y destruir una figura por chart, se limpia el axes y se vuelve
+  a usar.
+"""
+
+import re
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cache, cached_property
+from pathlib import Path as FsPath
+from weakref import WeakKeyDictionary
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import PathPatch
+from matplotlib.path import Path
+
+# app/assets/chubut.svg
+SVG_CHUBUT = FsPath(__file__).resolve().parents[3] / "assets" / "chubut.svg"
+
+_SVG_NS = "{http://www.w3.org/2000/svg}"
+_TOKEN_PATH = re.compile(r"[A-Za-z]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+# Capas base cacheadas (una por dpi y tamaño)
+MAX_MAPAS_BASE = 4
+
+# Figuras libres por clave (tamaño, dpi, layout) y claves distintas en el pool
+MAX_FIGURAS_POR_CLAVE = 2
+MAX_CLAVES_POOL = 16
+
+RectAxes = tuple[float, float, float, float]
+ClavePool = tuple[float, float, int, RectAxes | None]
+
+
+def parsear_path_svg(d: str) -> Path:
+    """
+    Convierte el atributo ``d`` de un <path> SVG a un Path de matplotlib.
+
+    Soporta M/L/H/V/C/Z (absolutos y relativos), que es lo que usa el mapa.
+    """
+    tokens = _TOKEN_PATH.findall(d)
+    vertices: list[tuple[float, float]] = []
+    codigos: list[int] = []
+    x = y = inicio_x = inicio_y = 0.0
+    comando = ""
+    i = 0
+
+    def numero() -> float:
+        nonlocal i
+        valor = float(tokens[i])
+        i += 1
+        return valor
+
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            comando = tokens[i]
+            i += 1
+            if comando in "Zz":
+                vertices.append((inicio_x, inicio_y))
+                codigos.append(Path.CLOSEPOLY)
+                x, y = inicio_x, inicio_y
+                continue
+        relativo = comando.islower()
+        base_x, base_y = (x, y) if relativo else (0.0, 0.0)
+
+        if comando in "Mm":
+            x, y = base_x + numero(), base_y + numero()
+            vertices.append((x, y))
+            codigos.append(Path.MOVETO)
+            inicio_x, inicio_y = x, y
+            # Pares siguientes a un M son lineTo implícitos
+            comando = "l" if relativo else "L"
+        elif comando in "Ll":
+            x, y = base_x + numero(), base_y + numero()
+            vertices.append((x, y))
+            codigos.append(Path.LINETO)
+        elif comando in "Hh":
+            x = base_x + numero()
+            vertices.append((x, y))
+            codigos.append(Path.LINETO)
+        elif comando in "Vv":
+            y = base_y + numero()
+            vertices.append((x, y))
+            codigos.append(Path.LINETO)
+        elif comando in "Cc":
+            for _ in range(3):
+                vertices.append((base_x + numero(), base_y + numero()))
+                codigos.append(Path.CURVE4)
+            x, y = vertices[-1]
+        else:
+            raise ValueError(f"Comando de path SVG no soportado: {comando!r}")
+
+    return Path(np.array(vertices, dtype=float), codigos)
+
+
+@dataclass(frozen=True)
+class DepartamentoSvg:
+    """Departamento del SVG: polígono, nombre (como contornos) y anclas."""
+
+    slug: str
+    poligono: Path
+    etiqueta: Path | None
+
+    @cached_property
+    def posicion_etiqueta(self) -> tuple[float, float]:
+        """Centro inferior del nombre, o centro del polígono si no tiene."""
+        if self.etiqueta is None:
+            extents = self.poligono.get_extents()
+            return (extents.x0 + extents.x1) / 2, (extents.y0 + extents.y1) / 2
+        extents = self.etiqueta.get_extents()
+        return (extents.x0 + extents.x1) / 2, extents.y1
+
+
+@dataclass(frozen=True)
+class CapaBase:
+    """
+    Capa base rasterizada, guardada solo en sus píxeles no transparentes.
+
+    Los bordes y nombres ocupan una fracción chica del mapa; componer solo
+    esos píxeles evita recorrer la imagen completa en cada render.
+    """
+
+    alto: int
+    filas: np.ndarray
+    columnas: np.ndarray
+    rgb: np.ndarray  # (n, 3) uint16
+    alpha: np.ndarray  # (n, 1) uint16
+
+    @classmethod
+    def desde_rgba(cls, rgba: np.ndarray) -> "CapaBase":
+        filas, columnas = np.nonzero(rgba[..., 3])
+        pixeles = rgba[filas, columnas].astype(np.uint16)
+        return cls(
+            alto=rgba.shape[0],
+            filas=filas,
+            columnas=columnas,
+            rgb=pixeles[:, :3],
+            alpha=pixeles[:, 3:4],
+        )
+
+
+class MapaChubut:
+    """
+    SVG de Chubut parseado una vez por proceso.
+
+    Las coordenadas son las del viewBox (y crece hacia abajo); los axes que
+    dibujan el mapa usan ``ylim(alto, 0)``.
+    """
+
+    def __init__(self, svg_path: FsPath = SVG_CHUBUT) -> None:
+        raiz = ET.parse(svg_path).getroot()
+        _, _, ancho, alto = (float(v) for v in raiz.attrib["viewBox"].split())
+        self.ancho = ancho
+        self.alto = alto
+
+        departamentos: dict[str, DepartamentoSvg] = {}
+        for grupo in raiz.iter(f"{_SVG_NS}g"):
+            paths = grupo.findall(f"{_SVG_NS}path")
+            if not paths:
+                continue
+            # Primer path: el polígono; el resto: el nombre como contornos
+            poligono = parsear_path_svg(paths[0].attrib["d"])
+            etiqueta = (
+                Path.make_compound_path(
+                    *(parsear_path_svg(p.attrib["d"]) for p in paths[1:])
+                )
+                if len(paths) > 1
+                else None
+            )
+            slug = grupo.attrib["id"]
+            departamentos[slug] = DepartamentoSvg(slug, poligono, etiqueta)
+        self.departamentos = departamentos
+
+        self._capas: OrderedDict[tuple[int, int, int], CapaBase] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def aspecto(self) -> float:
+        """Alto / ancho del mapa."""
+        return self.alto / self.ancho
+
+    def preparar_axes(self, ax: Axes) -> None:
+        """Configura un axes en coordenadas del SVG, sin ejes visibles."""
+        ax.set_xlim(0, self.ancho)
+        ax.set_ylim(self.alto, 0)
+        ax.set_aspect("equal")
+        ax.axis("off")
+
+    def capa_base(self, dpi: int, ancho_px: int, alto_px: int) -> CapaBase:
+        """
+        Bordes y nombres de departamentos rasterizados a ``ancho_px × alto_px``.
+
+        Se rasteriza una vez por (dpi, tamaño) y se reutiliza.
+        """
+        clave = (dpi, ancho_px, alto_px)
+        with self._lock:
+            if clave in self._capas:
+                self._capas.move_to_end(clave)
+                return self._capas[clave]
+
+        capa = CapaBase.desde_rgba(self._rasterizar_base(dpi, ancho_px, alto_px))
+
+        with self._lock:
+            self._capas[clave] = capa
+            while len(self._capas) > MAX_MAPAS_BASE:
+                self._capas.popitem(last=False)
+        return capa
+
+    def aplicar_capa_base(
+        self, imagen: np.ndarray, dpi: int, ancho_px: int, alto_px: int
+    ) -> None:
+        """
+        Compone la capa base sobre ``imagen`` (RGBA, modificada in place).
+
+        El mapa ocupa la esquina inferior izquierda de la imagen con tamaño
+        ``ancho_px × alto_px``. Es un blend en numpy sobre los píxeles no
+        transparentes: no pasa por el remuestreo de imágenes de matplotlib,
+        que es lo caro a 300 dpi.
+        """
+        capa = self.capa_base(dpi, ancho_px, alto_px)
+        desplazamiento = imagen.shape[0] - capa.alto
+        filas = capa.filas + desplazamiento
+        visibles = (filas >= 0) & (capa.columnas < imagen.shape[1])
+        filas = filas[visibles]
+        columnas = capa.columnas[visibles]
+        alpha = capa.alpha[visibles]
+
+        fondo = imagen[filas, columnas, :3].astype(np.uint16)
+        imagen[filas, columnas, :3] = (
+            (capa.rgb[visibles] * alpha + fondo * (255 - alpha) + 127) // 255
+        ).astype(np.uint8)
+
+    def _rasterizar_base(self, dpi: int, ancho_px: int, alto_px: int) -> np.ndarray:
+        fig = Figure(figsize=(ancho_px / dpi, alto_px / dpi), dpi=dpi)
+        fig.patch.set_alpha(0)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_axes((0, 0, 1, 1))
+        self.preparar_axes(ax)
+        # El bitmap cubre exactamente el viewBox
+        ax.set_aspect("auto")
+        ax.patch.set_alpha(0)
+
+        for departamento in self.departamentos.values():
+            ax.add_patch(
+                PathPatch(
+                    departamento.poligono,
+                    facecolor="none",
+                    edgecolor="#4B5563",
+                    linewidth=0.8,
+                )
+            )
+            if departamento.etiqueta is not None:
+                ax.add_patch(
+                    PathPatch(
+                        departamento.etiqueta,
+                        facecolor="#111827",
+                        edgecolor="none",
+                    )
+                )
+
+        canvas.draw()
+        return np.asarray(canvas.buffer_rgba()).copy()
+
+
+@cache
+def mapa_chubut() -> MapaChubut:
+    """Mapa de Chubut compartido por el proceso (se parsea en el primer uso)."""
+    return MapaChubut()
+
+
+class FigurePool:
+    """
+    Pool de figuras de matplotlib con un único axes.
+
+    ``obtener`` entrega una figura libre del tamaño pedido (o crea una) con el
+    axes limpio; ``devolver`` la deja disponible para el próximo chart. Las
+    figuras se crean con ``Figure`` (sin pyplot), así que no hay estado global
+    que cerrar: una figura que no se devuelve (ej: por un error) simplemente
+    se libera con el garbage collector.
+    """
+
+    def __init__(self) -> None:
+        self._libres: OrderedDict[ClavePool, list[tuple[Figure, Axes]]] = OrderedDict()
+        self._claves: WeakKeyDictionary[Figure, ClavePool] = WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def obtener(
+        self,
+        ancho: float,
+        alto: float,
+        dpi: int,
+        rect: RectAxes | None = None,
+    ) -> tuple[Figure, Axes]:
+        """
+        Args:
+            ancho, alto: Tamaño de la figura en pulgadas
+            dpi: Resolución
+            rect: Posición fija del axes (fracciones de la figura); None usa
+                el subplot por defecto
+        """
+        clave = (round(ancho, 3), round(alto, 3), dpi, rect)
+        with self._lock:
+            libres = self._libres.get(clave)
+            figura = libres.pop() if libres else None
+
+        if figura is None:
+            fig, ax = crear_figura(ancho, alto, dpi, rect)
+            with self._lock:
+                self._claves[fig] = clave
+            return fig, ax
+
+        fig, ax = figura
+        ax.clear()
+        # clear() conserva los kwargs de ticks/grilla del chart anterior
+        ax.tick_params(reset=True, which="both")
+        if rect is None:
+            # tight_layout del uso anterior movió los márgenes
+            fig.subplots_adjust(
+                **{
+                    lado: mpl.rcParams[f"figure.subplot.{lado}"]
+                    for lado in ("left", "right", "top", "bottom")
+                }
+            )
+        return fig, ax
+
+    def devolver(self, fig: Figure, ax: Axes) -> None:
+        """Deja la figura disponible para reutilizarla."""
+        with self._lock:
+            clave = self._claves.get(fig)
+            if clave is None:
+                return
+            libres = self._libres.setdefault(clave, [])
+            self._libres.move_to_end(clave)
+            if len(libres) < MAX_FIGURAS_POR_CLAVE:
+                libres.append((fig, ax))
+            while len(self._libres) > MAX_CLAVES_POOL:
+                self._libres.popitem(last=False)
+
+
+def crear_figura(
+    ancho: float, alto: float, dpi: int, rect: RectAxes | None = None
+) -> tuple[Figure, Axes]:
+    """Figura nueva con canvas Agg y un único axes."""
+    fig = Figure(figsize=(ancho, alto), dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes(rect) if rect is not None else fig.add_subplot()
+    return fig, ax
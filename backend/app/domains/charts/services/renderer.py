@@ -6,7 +6,6 @@ Estilo inspirado en Recharts para fidelidad visual con el dashboard web
 
 import io
 import logging
-import os
 
 import matplotlib
 
@@ -15,12 +14,16 @@ from typing import Any
 
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.collections import PatchCollection
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch, PathPatch
 from matplotlib.transforms import Bbox
 from PIL import Image
-from reportlab.graphics import renderPM
-from svglib.svglib import svg2rlg
 
+from app.core.slug import generar_slug
 from app.domains.charts.schemas import (
+    DatosDepartamentoMapa,
     DatosGraficoArea,
     DatosGraficoBarra,
     DatosGraficoLinea,
@@ -29,6 +32,12 @@ from app.domains.charts.schemas import (
     EspecificacionGraficoUniversal,
     WrapperDatosGraficoMapa,
 )
+from app.domains.charts.services.render_cache import (
+    FigurePool,
+    RectAxes,
+    crear_figura,
+    mapa_chubut,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -72,12 +81,36 @@ plt.rcParams.update(
 )
 
 
+# Escala de tasa de incidencia del mapa (misma que chubut-map-chart.tsx)
+COLOR_SIN_DATOS_MAPA = "#e0e0e0"
+ESCALA_TASA_MAPA: list[tuple[float, str, str]] = [
+    # (tasa menor a, color, etiqueta)
+    (1, "#fee0d2", "< 1"),
+    (5, "#fcbba1", "1 - 5"),
+    (10, "#fc9272", "5 - 10"),
+    (20, "#fb6a4a", "10 - 20"),
+    (50, "#ef3b2c", "20 - 50"),
+    (float("inf"), "#cb181d", "≥ 50"),
+]
+COLOR_TASA_CERO_MAPA = "#f0f0f0"
+
+# Layout del mapa: ancho en pulgadas y margen superior para el título
+ANCHO_MAPA = 12.0
+MARGEN_TITULO_MAPA = 0.6
+
+
 class ChartRenderer:
     """
     Renderiza charts desde EspecificacionGraficoUniversal a imágenes PNG
     100% server-side, sin necesidad de navegador
+
+    Con ``reutilizar_figuras`` (default) las figuras se toman de un pool por
+    tamaño en vez de crearse y destruirse en cada chart.
     """
 
+    def __init__(self, reutilizar_figuras: bool = True) -> None:
+        self._pool = FigurePool() if reutilizar_figuras else None
+
     def renderizar_a_bytes(
         self, spec: EspecificacionGraficoUniversal, dpi: int = 300
     ) -> bytes:
@@ -118,6 +151,29 @@ class ChartRenderer:
             return config.get(key, default)
         return getattr(config, key, default)
 
+    def _figura(
+        self, ancho: float, alto: float, dpi: int, rect: RectAxes | None = None
+    ) -> tuple[Figure, Axes]:
+        """Figura con un único axes (del pool si está habilitado)."""
+        if self._pool is not None:
+            return self._pool.obtener(ancho, alto, dpi, rect)
+        return crear_figura(ancho, alto, dpi, rect)
+
+    def _a_png(self, fig: Figure, ax: Axes, dpi: int) -> bytes:
+        """Guarda la figura como PNG y la devuelve al pool."""
+        buf = io.BytesIO()
+        fig.savefig(
+            buf,
+            format="png",
+            dpi=dpi,
+            bbox_inches="tight",
+            facecolor="white",
+            edgecolor="none",
+        )
+        if self._pool is not None:
+            self._pool.devolver(fig, ax)
+        return buf.getvalue()
+
     def _normalizar_color(self, color: str | None) -> str | None:
         """
         Normaliza colores de diferentes formatos a formato hex de matplotlib
@@ -159,7 +215,7 @@ class ChartRenderer:
         self, titulo: str, dpi: int, ancho: float = 8.0, alto: float = 5.0
     ) -> bytes:
         """Renderiza un placeholder cuando no hay datos disponibles."""
-        fig, ax = plt.subplots(figsize=(ancho, alto), dpi=dpi)
+        fig, ax = self._figura(ancho, alto, dpi)
         ax.text(
             0.5,
             0.5,
@@ -180,18 +236,7 @@ class ChartRenderer:
         ax.set_title(titulo, fontsize=15, fontweight="600", color="#1F2937", pad=15)
         ax.axis("off")
 
-        buf = io.BytesIO()
-        fig.savefig(
-            buf,
-            format="png",
-            dpi=dpi,
-            bbox_inches="tight",
-            facecolor="white",
-            edgecolor="none",
-        )
-        plt.close(fig)
-        buf.seek(0)
-        return buf.read()
+        return self._a_png(fig, ax, dpi)
 
     def _renderizar_grafico_linea(
         self, spec: EspecificacionGraficoUniversal, dpi: int
@@ -220,7 +265,7 @@ class ChartRenderer:
         ancho = alto * 1.6
 
         # Crear figura
-        fig, ax = plt.subplots(figsize=(ancho, alto), dpi=dpi)
+        fig, ax = self._figura(ancho, alto, dpi)
 
         # Plotear datasets
         for dataset in datos.datos.conjuntos_datos:
@@ -250,27 +295,16 @@ class ChartRenderer:
 
         # Rotar labels si son muchos
         if len(datos.datos.etiquetas) > 10:
-            plt.xticks(rotation=45, ha="right", fontsize=9)
+            ax.tick_params(axis="x", labelrotation=45, labelsize=9)
+            plt.setp(ax.get_xticklabels(), ha="right")
 
         # Remover spines superiores y derechas
         ax.spines["top"].set_visible(False)
         ax.spines["right"].set_visible(False)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        # Convertir a bytes
-        buf = io.BytesIO()
-        fig.savefig(
-            buf,
-            format="png",
-            dpi=dpi,
-            bbox_inches="tight",
-            facecolor="white",
-            edgecolor="none",
-        )
-        plt.close(fig)
-        buf.seek(0)
-        return buf.read()
+        return self._a_png(fig, ax, dpi)
 
     def _renderizar_grafico_barra(
         self, spec: EspecificacionGraficoUniversal, dpi: int
@@ -297,7 +331,7 @@ class ChartRenderer:
         # Aspect ratio 16:9
         ancho = alto * 1.6
 
-        fig, ax = plt.subplots(figsize=(ancho, alto), dpi=dpi)
+        fig, ax = self._figura(ancho, alto, dpi)
 
         etiquetas = datos.datos.etiquetas
         x = np.arange(len(etiquetas))
@@ -352,20 +386,9 @@ class ChartRenderer:
         ax.spines["top"].set_visible(False)
         ax.spines["right"].set_visible(False)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        buf = io.BytesIO()
-        fig.savefig(
-            buf,
-            format="png",
-            dpi=dpi,
-            bbox_inches="tight",
-            facecolor="white",
-            edgecolor="none",
-        )
-        plt.close(fig)
-        buf.seek(0)
-        return buf.read()
+        return self._a_png(fig, ax, dpi)
 
     def _renderizar_grafico_area(
         self, spec: EspecificacionGraficoUniversal, dpi: int
@@ -404,7 +427,7 @@ class ChartRenderer:
         ancho = alto * 1.6
         alto_con_leyenda = alto + 1.2
 
-        fig, ax = plt.subplots(figsize=(ancho, alto_con_leyenda), dpi=dpi)
+        fig, ax = self._figura(ancho, alto_con_leyenda, dpi)
 
         # Extraer valores numéricos de datos (manejar formato mixto)
         def extract_values(dataset_data: list[Any]) -> list[float]:
@@ -520,20 +543,9 @@ class ChartRenderer:
         ax.spines["top"].set_visible(False)
         ax.spines["right"].set_visible(False)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        buf = io.BytesIO()
-        fig.savefig(
-            buf,
-            format="png",
-            dpi=dpi,
-            bbox_inches="tight",
-            facecolor="white",
-            edgecolor="none",
-        )
-        plt.close(fig)
-        buf.seek(0)
-        return buf.read()
+        return self._a_png(fig, ax, dpi)
 
     def _renderizar_grafico_torta(
         self, spec: EspecificacionGraficoUniversal, dpi: int
@@ -544,8 +556,12 @@ class ChartRenderer:
             raise ValueError("Data type mismatch for pie chart")
 
         # Check empty data
-        if not datos.datos.etiquetas or not datos.datos.conjuntos_datos or not any(
-            v is not None and v != 0 for v in datos.datos.conjuntos_datos[0].datos
+        if (
+            not datos.datos.etiquetas
+            or not datos.datos.conjuntos_datos
+            or not any(
+                v is not None and v != 0 for v in datos.datos.conjuntos_datos[0].datos
+            )
         ):
             return self._renderizar_sin_datos(spec.titulo, dpi)
 
@@ -559,7 +575,7 @@ class ChartRenderer:
         # Más espacio horizontal para la leyenda
         ancho = alto * 1.4
 
-        fig, ax = plt.subplots(figsize=(ancho, alto), dpi=dpi)
+        fig, ax = self._figura(ancho, alto, dpi)
 
         # Tomar el primer dataset (pie chart solo tiene uno)
         dataset = datos.datos.conjuntos_datos[0]
@@ -611,20 +627,9 @@ class ChartRenderer:
             fontsize=9,
         )
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        buf = io.BytesIO()
-        fig.savefig(
-            buf,
-            format="png",
-            dpi=dpi,
-            bbox_inches="tight",
-            facecolor="white",
-            edgecolor="none",
-        )
-        plt.close(fig)
-        buf.seek(0)
-        return buf.read()
+        return self._a_png(fig, ax, dpi)
 
     def _renderizar_grafico_piramide(
         self, spec: EspecificacionGraficoUniversal, dpi: int
@@ -650,7 +655,7 @@ class ChartRenderer:
         # Aspect ratio más ancho para mejor visualización
         ancho = alto * 1.8
 
-        fig, ax = plt.subplots(figsize=(ancho, alto), dpi=dpi)
+        fig, ax = self._figura(ancho, alto, dpi)
 
         # Extraer datos por grupo de edad
         grupos_edad = [p.grupo_edad for p in datos.datos]
@@ -721,75 +726,32 @@ class ChartRenderer:
         # Remover spines superiores
         ax.spines["top"].set_visible(False)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        buf = io.BytesIO()
-        fig.savefig(
-            buf,
-            format="png",
-            dpi=dpi,
-            bbox_inches="tight",
-            facecolor="white",
-            edgecolor="none",
-        )
-        plt.close(fig)
-        buf.seek(0)
-        return buf.read()
+        return self._a_png(fig, ax, dpi)
 
     def _renderizar_grafico_mapa(
         self, spec: EspecificacionGraficoUniversal, dpi: int
     ) -> bytes:
         """
-        Renderiza mapa geográfico usando el SVG de Chubut.
+        Renderiza mapa coroplético de Chubut (tasa de incidencia por departamento).
         Solo el mapa, sin tabla (la tabla se genera como HTML nativo).
+
+        El SVG se parsea una vez por proceso y los bordes/nombres se rasterizan
+        una vez por (dpi, tamaño): acá solo se dibujan rellenos, casos, título
+        y leyenda.
         """
         datos = spec.datos
         if not isinstance(datos, WrapperDatosGraficoMapa):
             raise ValueError("Data type mismatch for map chart")
 
-        # Path al SVG de Chubut
-        svg_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)), "assets", "chubut.svg"
-        )
-
-        # Convertir SVG a imagen PNG usando svglib + reportlab
         try:
-            drawing = svg2rlg(svg_path)
-            if drawing:
-                # Renderizar SVG a PNG
-                svg_img_bytes = renderPM.drawToString(drawing, fmt="PNG", dpi=dpi)
-                svg_img = Image.open(io.BytesIO(svg_img_bytes))
-
-                # Crear figura solo para el mapa
-                fig, ax = plt.subplots(figsize=(12, 14), dpi=dpi)
-
-                # Mostrar mapa
-                ax.imshow(svg_img, aspect="equal")
-                ax.axis("off")
-
-                # Título
-                ax.set_title(
-                    spec.titulo, fontsize=16, fontweight="600", color="#1F2937", pad=15
-                )
-
-                plt.tight_layout()
-
-                # Convertir a bytes
-                buf = io.BytesIO()
-                fig.savefig(
-                    buf, format="png", dpi=dpi, bbox_inches="tight", facecolor="white"
-                )
-                plt.close(fig)
-                buf.seek(0)
-                return buf.read()
-            else:
-                raise ValueError("No se pudo cargar el SVG")
-
+            mapa = mapa_chubut()
         except Exception as e:
-            logger.warning(f"Error renderizando mapa SVG: {e}. Usando placeholder.")
+            logger.warning(f"Error cargando mapa SVG: {e}. Usando placeholder.")
 
             # Fallback: placeholder si el SVG falla
-            fig, ax = plt.subplots(figsize=(10, 8), dpi=dpi)
+            fig, ax = self._figura(10, 8, dpi)
             ax.text(
                 0.5,
                 0.5,
@@ -801,14 +763,102 @@ class ChartRenderer:
             )
             ax.axis("off")
             ax.set_title(spec.titulo, fontsize=14, fontweight="bold", pad=20)
+            return self._a_png(fig, ax, dpi)
+
+        # Axes en posición fija: su tamaño en píxeles coincide con la capa base
+        alto_mapa = ANCHO_MAPA * mapa.aspecto
+        alto = alto_mapa + MARGEN_TITULO_MAPA
+        fig, ax = self._figura(ANCHO_MAPA, alto, dpi, rect=(0, 0, 1, alto_mapa / alto))
+
+        por_slug = {
+            generar_slug(departamento.nombre): departamento
+            for departamento in datos.datos.departamentos
+        }
+        departamentos = list(mapa.departamentos.values())
+
+        # Capa de datos: rellenos por tasa
+        ax.add_collection(
+            PatchCollection(
+                [PathPatch(departamento.poligono) for departamento in departamentos],
+                facecolors=[
+                    self._color_tasa_mapa(por_slug.get(departamento.slug))
+                    for departamento in departamentos
+                ],
+                edgecolors="none",
+                zorder=1,
+            )
+        )
 
-            buf = io.BytesIO()
-            fig.savefig(
-                buf, format="png", dpi=dpi, bbox_inches="tight", facecolor="white"
+        mapa.preparar_axes(ax)
+
+        # Casos debajo del nombre de cada departamento
+        for departamento in departamentos:
+            dato = por_slug.get(departamento.slug)
+            if dato is None:
+                continue
+            x, y = departamento.posicion_etiqueta
+            ax.text(
+                x,
+                y + 2,
+                f"{dato.casos:,}",
+                ha="center",
+                va="top",
+                fontsize=9,
+                fontweight="bold",
+                color="#1F2937",
+                zorder=3,
             )
-            plt.close(fig)
-            buf.seek(0)
-            return buf.read()
+
+        # Leyenda sobre el mar (esquina inferior derecha del mapa)
+        ax.legend(
+            handles=[
+                Patch(
+                    facecolor=color,
+                    edgecolor="#9CA3AF",
+                    label=etiqueta,
+                )
+                for color, etiqueta in [
+                    (COLOR_SIN_DATOS_MAPA, "Sin datos"),
+                    (COLOR_TASA_CERO_MAPA, "0"),
+                    *[(color, etiqueta) for _, color, etiqueta in ESCALA_TASA_MAPA],
+                ]
+            ],
+            title="Tasa c/100.000 hab.",
+            loc="lower right",
+            frameon=True,
+            fontsize=9,
+            title_fontsize=9,
+        )
+
+        ax.set_title(
+            spec.titulo, fontsize=16, fontweight="600", color="#1F2937", pad=15
+        )
+
+        # Layout fijo (sin bbox "tight"): se dibuja una vez y la capa base
+        # cacheada (bordes y nombres) se compone encima de los rellenos
+        fig.canvas.draw()
+        imagen = np.array(fig.canvas.buffer_rgba())  # type: ignore[attr-defined]
+        mapa.aplicar_capa_base(
+            imagen, dpi, round(ANCHO_MAPA * dpi), round(alto_mapa * dpi)
+        )
+        if self._pool is not None:
+            self._pool.devolver(fig, ax)
+
+        buf = io.BytesIO()
+        Image.fromarray(imagen).save(buf, format="PNG", dpi=(dpi, dpi))
+        return buf.getvalue()
+
+    @staticmethod
+    def _color_tasa_mapa(departamento: DatosDepartamentoMapa | None) -> str:
+        """Color del departamento según su tasa de incidencia."""
+        if departamento is None:
+            return COLOR_SIN_DATOS_MAPA
+        if departamento.tasa_incidencia == 0:
+            return COLOR_TASA_CERO_MAPA
+        for limite, color, _ in ESCALA_TASA_MAPA:
+            if departamento.tasa_incidencia < limite:
+                return color
+        return ESCALA_TASA_MAPA[-1][1]
 
     def renderizar_tabla_departamentos(
         self, datos: WrapperDatosGraficoMapa, titulo: str = "", dpi: int = 300
@@ -7,7 +7,6 @@ import logging
 from datetime import date, datetime
 from typing import Any
 
-import pandas as pd
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -512,7 +511,8 @@ class ChartDataProcessor:
             ae.slug as agente_codigo,
             COUNT(DISTINCT e.id) as casos
         FROM caso_epidemiologico e
-        JOIN caso_agente ea ON e.id = ea.id_caso
+        JOIN caso_agente ea
+          ON e.id = ea.id_caso AND e.fecha_minima_caso_anio_epi = ea.anio_epi_caso
         JOIN agente_etiologico ae ON ea.id_agente = ae.id
         WHERE ae.slug = ANY(:agente_codigos)
           AND ea.resultado = :resultado_positivo
@@ -627,6 +627,8 @@ class ChartDataProcessor:
         Calcula percentiles basados en datos históricos (últimos 5 años)
         Muestra solo las semanas del rango de fechas seleccionado
         """
+        # pandas solo lo usa el corredor: se carga al primer uso
+        import pandas as pd
 
         # Determinar rango de semanas a mostrar basado en filtros de fecha
         fecha_desde = (
@@ -995,6 +997,11 @@ class ChartDataProcessor:
             f"✅ Pirámide poblacional - Total M: {total_male}, F: {total_female}"
         )
 
+        # Solo los grupos quinquenales coinciden con la población estándar
+        tasa_ajustada = None
+        if age_group_config_name == "standard":
+            tasa_ajustada = await self._tasa_ajustada_por_edad(rows, params)
+
         return {
             "type": "d3_pyramid",
             "data": pyramid_data,
@@ -1004,20 +1011,60 @@ class ChartDataProcessor:
                 "total_male": total_male,
                 "total_female": total_female,
                 "total_casos": total_male + total_female,
+                "tasa_ajustada": tasa_ajustada,
             },
         }
 
+    async def _tasa_ajustada_por_edad(
+        self, rows: list, params: dict[str, Any]
+    ) -> float | None:
+        """
+        Tasa ajustada por edad (método directo) de los casos de la pirámide.
+
+        Cuenta todos los casos del grupo etario (incluidos los de sexo no
+        especificado). Es None si no hay población cargada por grupo etario.
+        """
+        import polars as pl
+
+        from app.domains.territorio.services.poblacion_service import (
+            obtener_poblacion,
+        )
+
+        casos = pl.DataFrame(
+            [(grupo_edad, casos) for grupo_edad, _sexo, casos in rows],
+            schema={"grupo_etario": pl.Utf8, "casos": pl.Int64},
+            orient="row",
+        )
+        if "provincia_id" in params:
+            casos = casos.with_columns(
+                pl.lit(params["provincia_id"], dtype=pl.Int64).alias(
+                    "id_provincia_indec"
+                )
+            )
+        anio = params["fecha_hasta"].year if params.get("fecha_hasta") else None
+
+        tabla_poblacion = await obtener_poblacion(self.db)
+        tasa = tabla_poblacion.tasas_ajustadas_por_edad(casos, anio=anio)[
+            "tasa_ajustada"
+        ][0]
+        return round(tasa, 2) if tasa is not None else None
+
     async def procesar_mapa_geografico(self, filtros: dict[str, Any]) -> dict[str, Any]:
         """
         Procesa datos para mapa geográfico con departamentos de Chubut
         """
         from datetime import datetime
 
+        import polars as pl
+
         from app.core.static_data.geografia_chubut import (
             DEPARTAMENTOS_CHUBUT,
             POBLACION_DEPARTAMENTOS,
             get_zona_ugd,
         )
+        from app.domains.territorio.services.poblacion_service import (
+            obtener_poblacion,
+        )
 
         # Query para obtener casos por departamento
         query = """
@@ -1079,11 +1126,28 @@ class ChartDataProcessor:
             row.codigo_indec: row.casos for row in rows if row.codigo_indec
         }
 
-        # Construir datos para todos los departamentos
+        # Tasas de todos los departamentos de una vez con la población de
+        # referencia del año del período (la tabla estática queda de respaldo)
+        anio = params["fecha_hasta"].year if "fecha_hasta" in params else None
+        tabla_poblacion = await obtener_poblacion(self.db)
+        frame = tabla_poblacion.agregar_tasas(
+            pl.DataFrame(
+                {
+                    "id_departamento_indec": list(DEPARTAMENTOS_CHUBUT),
+                    "casos": [
+                        casos_por_departamento.get(codigo, 0)
+                        for codigo in DEPARTAMENTOS_CHUBUT
+                    ],
+                }
+            ),
+            anio=anio,
+        )
+
         departamentos_data = []
-        for codigo_indec in DEPARTAMENTOS_CHUBUT:
-            casos = casos_por_departamento.get(codigo_indec, 0)
-            poblacion = POBLACION_DEPARTAMENTOS.get(codigo_indec, 0)
+        for codigo_indec, casos, poblacion in frame.select(
+            "id_departamento_indec", "casos", "poblacion"
+        ).iter_rows():
+            poblacion = round(poblacion or POBLACION_DEPARTAMENTOS.get(codigo_indec, 0))
             tasa_incidencia = (
                 round((casos / poblacion) * 100000, 2) if poblacion > 0 else 0.0
             )
@@ -1494,7 +1558,8 @@ class ChartDataProcessor:
             ae.slug as agente_codigo,
             COUNT(DISTINCT e.id) as casos
         FROM caso_epidemiologico e
-        JOIN caso_agente ea ON e.id = ea.id_caso
+        JOIN caso_agente ea
+          ON e.id = ea.id_caso AND e.fecha_minima_caso_anio_epi = ea.anio_epi_caso
         JOIN agente_etiologico ae ON ea.id_agente = ae.id
         WHERE e.fecha_nacimiento IS NOT NULL
           AND ae.slug = ANY(:agente_codigos)
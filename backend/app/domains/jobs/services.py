@@ -7,6 +7,7 @@ NO contiene lógica específica de archivos.
 
 import logging
 from datetime import datetime
+from typing import Any
 
 from celery.result import AsyncResult
 
@@ -43,11 +44,16 @@ class JobService:
         logger.info(f"Job creado: {job_creado.id} ({tipo_job}/{tipo_procesador})")
         return job_creado
 
-    async def iniciar_job(self, job: Job) -> Job:
-        """Iniciar la ejecución de un job via Celery."""
+    async def iniciar_job(self, job: Job, tarea: Any | None = None) -> Job:
+        """
+        Iniciar la ejecución de un job via Celery.
+
+        Por defecto usa el dispatcher de archivos (execute_job); los jobs que
+        no procesan archivos pasan su propia task, que recibe el job_id.
+        """
         from app.domains.jobs.tasks import execute_job
 
-        celery_task = execute_job.delay(job.id)
+        celery_task = (tarea or execute_job).delay(job.id)
 
         job.celery_task_id = celery_task.id
         job.mark_started(celery_task.id)
@@ -22,6 +22,8 @@ import app.domains.vigilancia_agregada.procesamiento
 import app.domains.vigilancia_nominal.procesamiento  # noqa: F401
 from app.core.celery_app import file_processing_task, maintenance_task
 from app.core.database import Session, engine
+from app.core.response_cache import invalidar_todo
+from app.domains.alertas.tasks import evaluar_alertas_task
 from app.domains.jobs.models import Job, JobStatus
 from app.domains.jobs.registry import get_processor
 
@@ -51,6 +53,15 @@ def convert_numpy_types(obj: Any) -> Any:
     return obj
 
 
+def _encolar_alertas(semanas: list[tuple[int, int, int]]) -> None:
+    """Encola la evaluación de alertas; si falla, la ingesta igual queda bien."""
+    try:
+        evaluar_alertas_task.delay([list(s) for s in semanas])
+        logger.info(f"🚨 Evaluación de alertas encolada ({len(semanas)} semanas)")
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo encolar la evaluación de alertas: {e}")
+
+
 @file_processing_task(name="app.domains.jobs.tasks.execute_job")
 def execute_job(self: Task, job_id: str) -> dict[str, Any]:
     """
@@ -111,6 +122,9 @@ def execute_job(self: Task, job_id: str) -> dict[str, Any]:
             else:
                 result = processor.procesar_archivo(ruta_archivo_obj, nombre_hoja)
 
+            # Semanas cargadas (solo para encolar las alertas, no van al job)
+            semanas_afectadas = result.pop("semanas_afectadas", None)
+
             result_data = {
                 "ruta_archivo": str(ruta_archivo),
                 "tamano_archivo": ruta_archivo_obj.stat().st_size
@@ -121,7 +135,11 @@ def execute_job(self: Task, job_id: str) -> dict[str, Any]:
 
             if result.get("status") == "SUCCESS":
                 job.mark_completed(**result_data)
+                # La carga escribe con SQL crudo: invalidar respuestas cacheadas
+                invalidar_todo()
                 logger.info(f"Job exitoso: {job_id}")
+                if semanas_afectadas:
+                    _encolar_alertas(semanas_afectadas)
             else:
                 with contextlib.suppress(Exception):
                     session.rollback()
@@ -259,3 +277,22 @@ def cleanup_temp_uploads() -> dict[str, Any]:
     except Exception as e:
         logger.error(f"Error limpiando archivos temporales: {e}")
         return {"status": "failed", "error": str(e)}
+
+
+@maintenance_task(name="app.domains.jobs.tasks.crear_particiones_anio_siguiente")
+def crear_particiones_anio_siguiente() -> dict[str, Any]:
+    """Crea por adelantado las particiones del año epidemiológico siguiente."""
+    from app.core.epidemiology import calcular_semana_epidemiologica
+    from app.domains.vigilancia_nominal.queries.particiones import (
+        asegurar_particiones,
+    )
+
+    anio = calcular_semana_epidemiologica(datetime.now().date())[1] + 1
+    try:
+        with Session(engine) as session:
+            creadas = asegurar_particiones(session, [anio])
+            session.commit()
+        return {"status": "completed", "anio": anio, "particiones_creadas": creadas}
+    except Exception as e:
+        logger.error(f"Error creando particiones del año {anio}: {e}")
+        return {"status": "failed", "error": str(e)}
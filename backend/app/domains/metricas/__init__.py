@@ -96,6 +96,8 @@ Ver registry/metrics.py para la lista completa. Principales:
     - tasa_positividad: Derivada (positivas/estudiadas × 100)
     - casos_nominales: Casos individuales
     - ocupacion_camas_ira: Camas hospitalarias (CLI_P26_INT)
+    - aberracion_ears_c1/c2/c3, aberracion_cusum, aberracion_farrington:
+      Detección de brotes sobre casos nominales (ver abajo)
 
 
 DIMENSIONES
@@ -131,14 +133,60 @@ COMPUTACIONES POST-QUERY
     #     "zona_alerta": 130,        # p75
     #     "zona_brote": 160,         # p90
     # }
+
+
+DETECCIÓN DE ABERRACIONES
+-------------------------
+
+    result = service.query(
+        metric="aberracion_farrington",
+        dimensions=["TIPO_EVENTO", "DEPARTAMENTO",
+                    "ANIO_EPIDEMIOLOGICO", "SEMANA_EPIDEMIOLOGICA"],
+        criteria=RangoPeriodoCriterion(2019, 1, 2025, 20),
+    )
+
+    # Una sola query trae la serie semanal de casos; aberraciones.py corre el
+    # método vectorizado sobre la matriz series × semanas completa (EARS
+    # C1/C2/C3, CUSUM y Farrington flexible). Cada fila trae valor, esperado,
+    # estadistico, umbral y senal. Farrington necesita 5 años de historia en
+    # el rango pedido; las semanas sin base suficiente vienen en null.
+
+
+BATCH (VARIAS MÉTRICAS EN UNA QUERY)
+------------------------------------
+
+    from app.domains.metricas import MetricRequest
+
+    batch = service.query_batch([
+        MetricRequest("casos_clinicos", ["SEMANA_EPIDEMIOLOGICA"], criterio),
+        MetricRequest("casos_clinicos", ["TIPO_EVENTO"], criterio),
+        MetricRequest("casos_clinicos", [], criterio),  # total
+    ])
+
+    # Las consultas del mismo source se resuelven en un solo statement con
+    # GROUPING SETS (un set por combinación de dimensiones, un FILTER por
+    # criterio distinto). batch["results"] respeta el orden de las consultas.
+
+
+FORMATO COLUMNAR (ARROW / POLARS)
+---------------------------------
+
+    result = service.query_result(metric="casos_clinicos", dimensions=[...])
+    result.frame       # polars.DataFrame (armado desde el cursor, sin dicts)
+    result.to_arrow()  # pyarrow.Table con la metadata en el schema
+
+    # POST /metricas/query negocia Arrow IPC o Parquet con el header Accept
+    # (ver arrow.py); JSON sigue siendo el default.
 """
 
 from .registry.dimensions import DimensionCode, get_dimension
 from .registry.metrics import MetricSource, get_metric, list_metrics
-from .service import MetricService
+from .service import MetricRequest, MetricResult, MetricService
 
 __all__ = [
     "DimensionCode",
+    "MetricRequest",
+    "MetricResult",
     # Servicio principal
     "MetricService",
     # Enums y helpers
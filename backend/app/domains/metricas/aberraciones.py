@@ -0,0 +1,426 @@
+"""
+Detección de aberraciones sobre series semanales, vectorizada.
+
+Todas las funciones reciben una matriz ``series × semanas`` (una fila por
+serie, semanas consecutivas en columnas, semanas sin casos en cero) y
+calculan todas las series y semanas a la vez con numpy: no hay un loop por
+serie ni por semana (salvo CUSUM, que es recursivo en el tiempo y recorre
+las semanas operando sobre todas las series juntas).
+
+Métodos:
+
+- EARS C1, C2, C3 (Hutwagner et al. 2003, CDC Early Aberration Reporting
+  System) adaptados a semanas: base de 7 semanas, C2 y C3 con 2 semanas de
+  desfase.
+- CUSUM (Page 1954) sobre los desvíos estandarizados de C2.
+- Farrington flexible (Farrington et al. 1996, Noufaily et al. 2013):
+  GLM quasi-Poisson con tendencia opcional sobre las mismas semanas de años
+  anteriores, reponderación de semanas atípicas de la base y umbral con la
+  transformación 2/3. El ajuste (IRLS) se hace en lote para todas las
+  celdas.
+
+Las celdas sin historia suficiente valen NaN. ``METODOS`` mapea cada método
+a una función con salida uniforme (``Aberracion``) para el Metric Engine.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+__all__ = [
+    "METODOS",
+    "Aberracion",
+    "aberracion_cusum",
+    "aberracion_ears",
+    "aberracion_farrington",
+    "cusum",
+    "ears",
+    "farrington",
+]
+
+# EARS en semanas: base de 7 semanas; C2 y C3 con 2 semanas de desfase. El
+# desvío tiene un piso para series con base constante.
+SEMANAS_EARS = 7
+DESFASE_EARS = 2
+SIGMA_MIN = 0.5
+UMBRAL_C1_C2 = 3.0
+UMBRAL_C3 = 2.0
+
+# CUSUM: valor de referencia k y umbral h, en desvíos
+CUSUM_K = 0.5
+CUSUM_H = 4.0
+
+# Farrington: años de base, semanas a cada lado de la semana evaluada
+_FARRINGTON_ANIOS = 5
+_FARRINGTON_VENTANA = 3
+_SEMANAS_ANIO = 52
+_FARRINGTON_ALFA = 0.05
+# Residuos de Anscombe por encima de esto se reponderan (Noufaily 2013)
+_FARRINGTON_UMBRAL_PESOS = 2.58
+# Sin alarma con menos de estos casos en las últimas 4 semanas
+_FARRINGTON_MIN_CASOS_4_SEMANAS = 5
+_IRLS_ITERACIONES = 25
+_IRLS_TOLERANCIA = 1e-6
+_ETA_MIN = -20.0
+
+
+@dataclass
+class Aberracion:
+    """
+    Resultado de un método sobre la matriz (todas del mismo shape).
+
+    ``estadistico`` se compara contra ``umbral``; ``esperado`` es el valor
+    esperado de casos cuando el método lo estima (NaN si no).
+    """
+
+    estadistico: np.ndarray
+    umbral: np.ndarray
+    esperado: np.ndarray
+    senal: np.ndarray
+
+
+# =============================================================================
+# EARS Y CUSUM
+# =============================================================================
+
+
+def ears(
+    conteos: np.ndarray,
+    semanas_base: int = SEMANAS_EARS,
+    desfase: int = DESFASE_EARS,
+    sigma_min: float = SIGMA_MIN,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Estadísticos EARS C1, C2 y C3.
+
+    C1 estandariza cada semana contra la media y el desvío de las
+    ``semanas_base`` semanas previas; C2 igual pero con ``desfase`` semanas de
+    separación; C3 suma los excesos de C2 sobre 1 de la semana y las dos
+    anteriores.
+
+    Returns:
+        (c1, c2, c3), con el shape de ``conteos`` y NaN donde falta base
+    """
+    conteos = np.asarray(conteos, dtype=np.float64)
+    series, semanas = conteos.shape
+    c1 = np.full((series, semanas), np.nan)
+    c2 = np.full((series, semanas), np.nan)
+    c3 = np.full((series, semanas), np.nan)
+    if semanas <= semanas_base:
+        return c1, c2, c3
+
+    # La ventana j cubre las semanas j..j+base-1: base de C1 para
+    # t = j+base y de C2 para t = j+base+desfase
+    ventanas = sliding_window_view(conteos[:, :-1], semanas_base, axis=1)
+    medias = ventanas.mean(axis=2)
+    desvios = np.maximum(ventanas.std(axis=2, ddof=1), sigma_min)
+
+    c1[:, semanas_base:] = (conteos[:, semanas_base:] - medias) / desvios
+    inicio_c2 = semanas_base + desfase
+    if semanas > inicio_c2:
+        c2[:, inicio_c2:] = (conteos[:, inicio_c2:] - medias[:, :-desfase]) / (
+            desvios[:, :-desfase]
+        )
+        excesos = np.maximum(c2 - 1.0, 0.0)
+        c3[:, 2:] = excesos[:, 2:] + excesos[:, 1:-1] + excesos[:, :-2]
+    return c1, c2, c3
+
+
+def cusum(
+    desvios: np.ndarray,
+    k: float = CUSUM_K,
+    inicial: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    CUSUM unilateral ``S_t = max(0, S_{t-1} + z_t - k)`` de cada serie.
+
+    Args:
+        desvios: Desvíos estandarizados (series × semanas); las semanas NaN
+            no acumulan
+        k: Valor de referencia (mitad del corrimiento a detectar)
+        inicial: Acumulado de cada serie antes de la primera semana
+
+    Returns:
+        Acumulado al final de cada semana
+    """
+    desvios = np.asarray(desvios, dtype=np.float64)
+    acumulado = (
+        np.zeros(desvios.shape[0])
+        if inicial is None
+        else np.asarray(inicial, dtype=np.float64).copy()
+    )
+    resultado = np.empty_like(desvios)
+    for semana in range(desvios.shape[1]):
+        z = desvios[:, semana]
+        acumulado = np.where(np.isnan(z), acumulado, np.maximum(acumulado + z - k, 0.0))
+        resultado[:, semana] = acumulado
+    return resultado
+
+
+# =============================================================================
+# FARRINGTON FLEXIBLE
+# =============================================================================
+
+
+def _irls(
+    y: np.ndarray, diseno: np.ndarray, pesos: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Ajusta en lote ``log(mu) = diseno @ beta`` (Poisson, pesos previos).
+
+    X'WX de todas las celdas sale de un solo producto matricial contra los
+    productos externos de las filas del diseño (n × p²).
+
+    Args:
+        y: Observaciones (celdas × n)
+        diseno: Matriz de diseño compartida (n × p)
+        pesos: Pesos previos (celdas × n)
+
+    Returns:
+        (beta (celdas × p), mu (celdas × n), inversa de X'WX (celdas × p × p))
+    """
+    celdas, p = y.shape[0], diseno.shape[1]
+    externos = _productos_externos(diseno)
+    if p == 1:
+        # Solo intercepto: el estimador es la media ponderada, sin iterar
+        media = (pesos * y).sum(axis=1) / pesos.sum(axis=1)
+        beta = np.maximum(np.log(np.maximum(media, 1e-300)), _ETA_MIN)[:, None]
+        mu = np.exp(beta @ diseno.T)
+        return beta, mu, np.linalg.inv(_xtwx(pesos * mu, externos, p))
+    # Las bases todas en cero tienen mu -> 0: se fijan en el piso sin iterar
+    beta = np.zeros((celdas, p))
+    beta[:, 0] = np.log(y.mean(axis=1) + 0.5)
+    vacias = ~y.any(axis=1)
+    beta[vacias, 0] = _ETA_MIN
+    # Solo se sigue iterando sobre las celdas que no convergieron
+    activas = np.flatnonzero(~vacias)
+    for _ in range(_IRLS_ITERACIONES):
+        if not activas.size:
+            break
+        todas = activas.size == celdas
+        y_a = y if todas else y[activas]
+        pesos_a = pesos if todas else pesos[activas]
+        eta = np.maximum(beta[activas] @ diseno.T, _ETA_MIN)
+        mu = np.exp(eta)
+        w = pesos_a * mu
+        # X'W·z con z = eta + (y - mu) / mu, sin dividir
+        xtwz = (w * eta + pesos_a * (y_a - mu)) @ diseno
+        nuevo = np.linalg.solve(_xtwx(w, externos, p), xtwz[..., None])[..., 0]
+        cambio = np.abs(nuevo - beta[activas]).max(axis=1)
+        beta[activas] = nuevo
+        activas = activas[cambio >= _IRLS_TOLERANCIA]
+    mu = np.exp(np.maximum(beta @ diseno.T, _ETA_MIN))
+    return beta, mu, np.linalg.inv(_xtwx(pesos * mu, externos, p))
+
+
+def _productos_externos(diseno: np.ndarray) -> np.ndarray:
+    """Producto externo de cada fila del diseño, aplanado (n × p²)."""
+    return (diseno[:, :, None] * diseno[:, None, :]).reshape(diseno.shape[0], -1)
+
+
+def _xtwx(w: np.ndarray, externos: np.ndarray, p: int) -> np.ndarray:
+    # Regularización mínima para celdas con base toda en cero
+    return (w @ externos).reshape(-1, p, p) + np.eye(p) * 1e-10
+
+
+def _dispersion(y: np.ndarray, mu: np.ndarray, pesos: np.ndarray, p: int) -> np.ndarray:
+    """Sobredispersión quasi-Poisson (Pearson), con piso en 1."""
+    n = y.shape[1]
+    pearson = (pesos * (y - mu) ** 2 / mu).sum(axis=1)
+    return np.maximum(pearson / max(n - p, 1), 1.0)
+
+
+def _ajustar_reponderado(
+    y: np.ndarray, y_23: np.ndarray, diseno: np.ndarray, reponderar: bool
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Ajuste quasi-Poisson con reponderación de semanas atípicas de la base.
+
+    Args:
+        y: Base de cada celda (celdas × n)
+        y_23: ``y ** (2/3)``, compartido entre los modelos
+        diseno: Matriz de diseño (n × p)
+        reponderar: Si se bajan los pesos de las semanas atípicas
+
+    Returns:
+        (beta, dispersión, inversa de X'WX) de cada celda
+    """
+    n, p = diseno.shape
+    pesos = np.ones_like(y)
+    beta, mu, inversa = _irls(y, diseno, pesos)
+    phi = _dispersion(y, mu, pesos, p)
+    if reponderar:
+        # Residuos de Anscombe estandarizados con el leverage de cada semana
+        raiz_mu = np.cbrt(mu)
+        apalancamiento = (
+            inversa.reshape(inversa.shape[0], -1) @ _productos_externos(diseno).T * mu
+        )
+        residuos = (
+            1.5
+            * (y_23 - raiz_mu * raiz_mu)
+            / (
+                np.sqrt(phi)[:, None]
+                * np.sqrt(raiz_mu * np.maximum(1.0 - apalancamiento, 1e-10))
+            )
+        )
+        atipicas = residuos > _FARRINGTON_UMBRAL_PESOS
+        pesos = np.where(atipicas, 1.0 / np.where(atipicas, residuos, 1.0) ** 2, 1.0)
+        pesos *= n / pesos.sum(axis=1, keepdims=True)
+        beta, mu, inversa = _irls(y, diseno, pesos)
+        phi = _dispersion(y, mu, pesos, p)
+    return beta, phi, inversa
+
+
+def farrington(
+    conteos: np.ndarray,
+    anios_base: int = _FARRINGTON_ANIOS,
+    ventana: int = _FARRINGTON_VENTANA,
+    alfa: float = _FARRINGTON_ALFA,
+    tendencia: bool = True,
+    reponderar: bool = True,
+    min_casos_4_semanas: int = _FARRINGTON_MIN_CASOS_4_SEMANAS,
+) -> Aberracion:
+    """
+    Farrington flexible sobre todas las celdas con historia suficiente.
+
+    La base de la semana t son las semanas ``t - 52·a ± ventana`` de los
+    ``anios_base`` años previos. Con la covariable de tiempo centrada en t
+    (en años), el diseño es el mismo para todas las celdas y el valor
+    esperado es ``exp(intercepto)``: el IRLS se resuelve en lote con
+    productos matriciales y ``linalg.solve`` sobre matrices p × p.
+
+    La tendencia se conserva solo si es significativa y no predice más que
+    el máximo de la base. El umbral superior usa la transformación 2/3 y
+    ``estadistico`` es el puntaje de exceso ``(y - esperado) / (umbral -
+    esperado)``: hay señal si supera 1 con al menos ``min_casos_4_semanas``
+    casos en las últimas 4 semanas.
+    """
+    conteos = np.asarray(conteos, dtype=np.float64)
+    series, semanas = conteos.shape
+    vacio = np.full((series, semanas), np.nan)
+    resultado = Aberracion(
+        estadistico=vacio.copy(),
+        umbral=vacio.copy(),
+        esperado=vacio.copy(),
+        senal=np.zeros((series, semanas), dtype=bool),
+    )
+    desplazamientos = np.array(
+        [
+            -_SEMANAS_ANIO * anio + d
+            for anio in range(1, anios_base + 1)
+            for d in range(-ventana, ventana + 1)
+        ]
+    )
+    primera = -int(desplazamientos.min())
+    if semanas <= primera or series == 0:
+        return resultado
+
+    evaluadas = np.arange(primera, semanas)
+    # Celdas (serie, semana evaluada) aplanadas: base de n semanas cada una
+    y = conteos[:, evaluadas[:, None] + desplazamientos[None, :]].reshape(
+        -1, desplazamientos.size
+    )
+    observado = conteos[:, evaluadas].reshape(-1)
+
+    tiempo = desplazamientos / _SEMANAS_ANIO
+    disenos = [np.column_stack([np.ones_like(tiempo), tiempo])]
+    if not tendencia:
+        disenos = [disenos[0][:, :1]]
+    else:
+        disenos.append(disenos[0][:, :1])
+
+    y_23 = np.cbrt(y) ** 2
+    ajustes = [_ajustar_reponderado(y, y_23, diseno, reponderar) for diseno in disenos]
+    beta, phi, inversa = ajustes[0]
+    if tendencia:
+        beta_sin, phi_sin, inversa_sin = ajustes[1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z_tendencia = np.abs(beta[:, 1]) / np.sqrt(phi * inversa[:, 1, 1])
+        usar = (z_tendencia > 1.96) & (np.exp(beta[:, 0]) <= y.max(axis=1))
+        eta0 = np.where(usar, beta[:, 0], beta_sin[:, 0])
+        var_eta0 = np.where(
+            usar, phi * inversa[:, 0, 0], phi_sin * inversa_sin[:, 0, 0]
+        )
+        phi = np.where(usar, phi, phi_sin)
+    else:
+        eta0 = beta[:, 0]
+        var_eta0 = phi * inversa[:, 0, 0]
+
+    # Umbral con la transformación 2/3 (varianza por método delta)
+    esperado = np.exp(np.maximum(eta0, _ETA_MIN))
+    tau = phi + esperado * var_eta0
+    z = NormalDist().inv_cdf(1 - alfa / 2)
+    umbral = (
+        np.cbrt(esperado) ** 2 + z * np.sqrt(4 / 9 * np.cbrt(esperado) * tau)
+    ) ** 1.5
+    with np.errstate(divide="ignore", invalid="ignore"):
+        puntaje = (observado - esperado) / (umbral - esperado)
+
+    # Casos de las últimas 4 semanas (incluida la evaluada)
+    acumulado = np.cumsum(np.pad(conteos, ((0, 0), (4, 0))), axis=1)
+    ultimas_4 = (acumulado[:, evaluadas + 4] - acumulado[:, evaluadas]).reshape(-1)
+
+    forma = (series, evaluadas.size)
+    resultado.esperado[:, evaluadas] = esperado.reshape(forma)
+    resultado.umbral[:, evaluadas] = umbral.reshape(forma)
+    resultado.estadistico[:, evaluadas] = puntaje.reshape(forma)
+    resultado.senal[:, evaluadas] = (
+        (observado > umbral) & (ultimas_4 >= min_casos_4_semanas)
+    ).reshape(forma)
+    return resultado
+
+
+# =============================================================================
+# SALIDA UNIFORME (METRIC ENGINE)
+# =============================================================================
+
+
+def _umbral_fijo(conteos: np.ndarray, valor: float) -> np.ndarray:
+    return np.full(conteos.shape, valor)
+
+
+def aberracion_ears(conteos: np.ndarray, estadistico: str) -> Aberracion:
+    """EARS C1, C2 o C3 (``estadistico`` = "c1", "c2" o "c3")."""
+    c1, c2, c3 = ears(conteos)
+    valores = {"c1": c1, "c2": c2, "c3": c3}[estadistico]
+    umbral = UMBRAL_C3 if estadistico == "c3" else UMBRAL_C1_C2
+    with np.errstate(invalid="ignore"):
+        senal = valores > umbral
+    return Aberracion(
+        estadistico=valores,
+        umbral=_umbral_fijo(conteos, umbral),
+        esperado=np.full(conteos.shape, np.nan),
+        senal=senal,
+    )
+
+
+def aberracion_cusum(conteos: np.ndarray) -> Aberracion:
+    """CUSUM de los desvíos de C2, con umbral ``CUSUM_H``."""
+    _, c2, _ = ears(conteos)
+    acumulado = cusum(c2)
+    acumulado[np.isnan(c2)] = np.nan
+    with np.errstate(invalid="ignore"):
+        senal = acumulado > CUSUM_H
+    return Aberracion(
+        estadistico=acumulado,
+        umbral=_umbral_fijo(conteos, CUSUM_H),
+        esperado=np.full(conteos.shape, np.nan),
+        senal=senal,
+    )
+
+
+def aberracion_farrington(conteos: np.ndarray) -> Aberracion:
+    """Farrington flexible con los parámetros por defecto."""
+    return farrington(conteos)
+
+
+METODOS: dict[str, Callable[[np.ndarray], Aberracion]] = {
+    "ears_c1": lambda conteos: aberracion_ears(conteos, "c1"),
+    "ears_c2": lambda conteos: aberracion_ears(conteos, "c2"),
+    "ears_c3": lambda conteos: aberracion_ears(conteos, "c3"),
+    "cusum": aberracion_cusum,
+    "farrington": aberracion_farrington,
+}
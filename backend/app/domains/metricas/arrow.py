@@ -0,0 +1,66 @@
+"""
+Formato columnar (Arrow/Parquet) para resultados del Metric Engine.
+
+Los builders arman la tabla Arrow directamente desde las tuplas del cursor,
+sin pasar por un dict por fila. El servicio trabaja sobre esa tabla con
+Polars (zero-copy) y recién al final se decide el formato de salida:
+
+- JSON (default): ``frame.to_dicts()``
+- Arrow IPC stream: ``application/vnd.apache.arrow.stream``
+- Parquet: ``application/vnd.apache.parquet``
+
+La metadata del resultado (métrica, dimensiones, warnings, corredor...) viaja
+en la metadata del schema bajo la clave ``metric_metadata`` (JSON).
+"""
+
+import io
+import json
+from collections.abc import Sequence
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+MEDIA_TYPE_ARROW_STREAM = "application/vnd.apache.arrow.stream"
+MEDIA_TYPE_PARQUET = "application/vnd.apache.parquet"
+
+METADATA_KEY = b"metric_metadata"
+
+
+def rows_to_arrow(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> pa.Table:
+    """
+    Arma una tabla Arrow a partir de las filas (tuplas) de un cursor.
+
+    Los NUMERIC de Postgres (SUM/AVG) llegan como Decimal: se convierten a
+    int64 si no tienen decimales y a float64 en caso contrario.
+    """
+    valores = list(zip(*rows, strict=True)) if rows else [() for _ in columns]
+    arrays = []
+    for columna in valores:
+        array = pa.array(columna)
+        if pa.types.is_decimal(array.type):
+            array = array.cast(pa.int64() if array.type.scale == 0 else pa.float64())
+        arrays.append(array)
+    return pa.Table.from_arrays(arrays, names=list(columns))
+
+
+def with_metadata(table: pa.Table, metadata: dict) -> pa.Table:
+    """Adjunta la metadata del resultado al schema de la tabla."""
+    return table.replace_schema_metadata(
+        {METADATA_KEY: json.dumps(metadata, default=str).encode()}
+    )
+
+
+def to_ipc_stream(table: pa.Table) -> bytes:
+    """Serializa la tabla como Arrow IPC stream."""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def to_parquet(table: pa.Table) -> bytes:
+    """Serializa la tabla como Parquet (zstd)."""
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, compression="zstd")
+    return buffer.getvalue()
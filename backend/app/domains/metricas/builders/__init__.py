@@ -40,7 +40,7 @@ NOTA: Normalmente no se usan directamente. MetricService selecciona el builder
 apropiado según el MetricSource de la métrica.
 """
 
-from .base import MetricQueryBuilder
+from .base import ConsultaBatch, MetricQueryBuilder
 from .clinico import ClinicoQueryBuilder
 from .hospitalario import HospitalarioQueryBuilder
 from .laboratorio import LaboratorioQueryBuilder
@@ -48,6 +48,7 @@ from .nominal import NominalQueryBuilder
 
 __all__ = [
     "ClinicoQueryBuilder",
+    "ConsultaBatch",
     "HospitalarioQueryBuilder",
     "LaboratorioQueryBuilder",
     "MetricQueryBuilder",
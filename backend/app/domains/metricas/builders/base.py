@@ -6,18 +6,37 @@ Cada builder DEBE implementar get_dimension_column() con su propio mapeo.
 """
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import Any
 
-from sqlalchemy import ColumnElement, Select
+import pyarrow as pa
+import pyarrow.compute as pc
+from sqlalchemy import ColumnElement, Select, func, or_, tuple_
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Session
 
-from app.domains.metricas.criteria.base import Criterion
+from app.domains.metricas.arrow import rows_to_arrow
+from app.domains.metricas.criteria.base import Criterion, OrCriteria
 from app.domains.metricas.registry.dimensions import (
     DIMENSIONS,
     DimensionCode,
     DimensionDefinition,
 )
-from app.domains.metricas.registry.metrics import MetricDefinition
+from app.domains.metricas.registry.metrics import MetricDefinition, get_metric
+
+
+@dataclass(frozen=True)
+class ConsultaBatch:
+    """
+    Una consulta dentro de un batch sobre el mismo source.
+
+    Cada consulta aporta un grouping set (sus dimensiones) y, si su criterio
+    difiere del resto, agregaciones con ``FILTER (WHERE ...)`` propias.
+    """
+
+    metricas: tuple[MetricDefinition, ...]
+    dimensiones: tuple[DimensionCode, ...]
+    criterio: Criterion | None = None
 
 
 class MetricQueryBuilder(ABC):
@@ -106,13 +125,12 @@ class MetricQueryBuilder(ABC):
         self._order_by_dims = True
         return self
 
-    def execute(self, metric: MetricDefinition) -> list[dict]:
+    def build_query(self, metric: MetricDefinition) -> Select:
         """
-        Ejecuta la query y retorna resultados.
+        Arma la query completa (JOINs, dimensiones, agregación, filtros, orden).
 
-        Returns:
-            Lista de diccionarios con los resultados.
-            Cada dict tiene las dimensiones como claves + "valor" para la métrica.
+        Las métricas derivadas agregan sus métricas base, una columna por
+        código, para que el servicio aplique la fórmula.
         """
         # 1. Obtener query base con JOINs
         query = self.build_base_query(metric)
@@ -137,6 +155,10 @@ class MetricQueryBuilder(ABC):
         agg_expr = metric.get_aggregation_expr()
         if agg_expr is not None:
             select_columns.append(agg_expr.label("valor"))
+        for code in metric.derived_from or []:
+            base_expr = get_metric(code).get_aggregation_expr()
+            if base_expr is not None:
+                select_columns.append(base_expr.label(code))
 
         # 3. Modificar query con SELECT explícito
         if select_columns:
@@ -144,7 +166,7 @@ class MetricQueryBuilder(ABC):
 
         # 4. Aplicar criterios
         if self._criteria:
-            expr = self._criteria.to_expression()
+            expr = self._criterion_expression(self._criteria)
             if expr is not None:
                 query = query.where(expr)
 
@@ -157,10 +179,193 @@ class MetricQueryBuilder(ABC):
             for order_col in order_columns:
                 query = query.order_by(order_col)
 
-        # 7. Ejecutar
-        result = self.session.execute(query)
+        return query
+
+    def execute(self, metric: MetricDefinition) -> list[dict]:
+        """
+        Ejecuta la query y retorna resultados.
+
+        Returns:
+            Lista de diccionarios con los resultados.
+            Cada dict tiene las dimensiones como claves + "valor" para la métrica.
+        """
+        result = self.session.execute(self.build_query(metric))
         return [dict(row._mapping) for row in result]
 
+    def execute_arrow(self, metric: MetricDefinition) -> pa.Table:
+        """
+        Ejecuta la query y retorna una tabla Arrow armada desde el cursor.
+
+        Mismas columnas que ``execute`` sin materializar un dict por fila.
+        """
+        return self._fetch_arrow(self.build_query(metric))
+
+    def _fetch_arrow(self, query: Select) -> pa.Table:
+        result = self.session.execute(query)
+        return rows_to_arrow(list(result.keys()), result.all())
+
+    def execute_grouping_sets(self, consultas: list[ConsultaBatch]) -> list[pa.Table]:
+        """
+        Ejecuta varias consultas del mismo source en un único statement.
+
+        Las dimensiones de cada consulta se compilan como un grouping set
+        (``GROUP BY GROUPING SETS (...)``), así totales y subtotales salen del
+        mismo scan. Las consultas con criterios distintos comparten el scan:
+        el WHERE es el OR de todos y cada agregación lleva su ``FILTER``.
+
+        Returns:
+            Una tabla Arrow por consulta (mismo orden que ``consultas``) con
+            las dimensiones de la consulta + una columna por código de métrica.
+        """
+        # 1. Unión de dimensiones (en orden de aparición)
+        dimensiones: list[DimensionCode] = []
+        for consulta in consultas:
+            for dim_code in consulta.dimensiones:
+                if dim_code not in dimensiones:
+                    dimensiones.append(dim_code)
+        self._dimensions = [DIMENSIONS[code] for code in dimensiones]
+
+        # 2. Criterios distintos (las consultas con el mismo criterio comparten columnas)
+        expresiones: dict[str, ColumnElement[Any] | None] = {}
+        indice_criterio: list[int] = []
+        for consulta in consultas:
+            expr = (
+                self._criterion_expression(consulta.criterio)
+                if consulta.criterio
+                else None
+            )
+            clave = self._clave_expresion(expr)
+            if clave not in expresiones:
+                expresiones[clave] = expr
+            indice_criterio.append(list(expresiones).index(clave))
+        filtros = list(expresiones.values())
+        con_filtro = len(filtros) > 1
+
+        # Los builders con lazy joins analizan self._criteria para decidir JOINs
+        criterios = [c.criterio for c in consultas if c.criterio is not None]
+        if criterios:
+            self._criteria = (
+                criterios[0] if len(criterios) == 1 else OrCriteria(*criterios)
+            )
+
+        query = self.build_base_query(consultas[0].metricas[0])
+
+        # 3. SELECT: dimensiones, máscara GROUPING() y agregaciones
+        select_columns: list[ColumnElement[Any]] = []
+        columnas_set: dict[DimensionCode, list[ColumnElement[Any]]] = {}
+        columnas_dim: list[ColumnElement[Any]] = []
+        order_columns: list[ColumnElement[Any]] = []
+        for dim_code in dimensiones:
+            columna = self.get_dimension_column(dim_code)
+            order_col = self.get_dimension_order_column(dim_code)
+            select_columns.append(columna.label(dim_code.value.lower()))
+            columnas_dim.append(columna)
+            columnas_set[dim_code] = [columna]
+            if order_col is not columna:
+                columnas_set[dim_code].append(order_col)
+            order_columns.append(order_col)
+
+        if columnas_dim:
+            select_columns.append(func.grouping(*columnas_dim).label("_grupo"))
+
+        agregadas: set[tuple[str, int]] = set()
+        for consulta, indice in zip(consultas, indice_criterio, strict=True):
+            filtro = filtros[indice]
+            for metric in consulta.metricas:
+                if (metric.code, indice) in agregadas:
+                    continue
+                agregadas.add((metric.code, indice))
+                agg_expr = metric.get_aggregation_expr()
+                if agg_expr is None:
+                    continue
+                if con_filtro and filtro is not None:
+                    agg_expr = agg_expr.filter(filtro)
+                select_columns.append(agg_expr.label(f"{metric.code}__{indice}"))
+        if con_filtro:
+            for indice, filtro in enumerate(filtros):
+                conteo = func.count()
+                if filtro is not None:
+                    conteo = conteo.filter(filtro)
+                select_columns.append(conteo.label(f"_filas__{indice}"))
+
+        query = query.with_only_columns(*select_columns)
+
+        # 4. WHERE: OR de los criterios (sin WHERE si alguna consulta no filtra)
+        if filtros and all(f is not None for f in filtros):
+            query = query.where(filtros[0] if len(filtros) == 1 else or_(*filtros))
+
+        # 5. GROUPING SETS (uno por conjunto distinto de dimensiones: el orden
+        # de las dimensiones de la consulta no cambia el grupo ni su máscara)
+        sets = list(
+            dict.fromkeys(
+                tuple(code for code in dimensiones if code in c.dimensiones)
+                for c in consultas
+            )
+        )
+        if columnas_dim:
+            query = query.group_by(
+                func.grouping_sets(
+                    *[
+                        tuple_(*[c for code in dims for c in columnas_set[code]])
+                        for dims in sets
+                    ]
+                )
+            ).order_by("_grupo", *order_columns)
+
+        # 6. Repartir filas: GROUPING() marca con 1 las dimensiones agregadas,
+        # así cada consulta toma las filas de su set por máscara
+        mascaras = {
+            dims: sum(
+                1 << (len(dimensiones) - 1 - j)
+                for j, code in enumerate(dimensiones)
+                if code not in dims
+            )
+            for dims in sets
+        }
+        tabla = self._fetch_arrow(query)
+        resultados: list[pa.Table] = []
+        for consulta, indice in zip(consultas, indice_criterio, strict=True):
+            mascara = mascaras[
+                tuple(code for code in dimensiones if code in consulta.dimensiones)
+            ]
+            filas = tabla
+            if columnas_dim and filas.num_rows:
+                filas = filas.filter(pc.equal(filas["_grupo"], mascara))
+            # Filas del scan compartido que no cumplen el criterio de la consulta
+            if con_filtro and consulta.dimensiones and filas.num_rows:
+                filas = filas.filter(pc.greater(filas[f"_filas__{indice}"], 0))
+
+            nombres = [code.value.lower() for code in consulta.dimensiones]
+            columnas = [filas[nombre] for nombre in nombres]
+            for metric in consulta.metricas:
+                nombre = f"{metric.code}__{indice}"
+                if nombre in filas.column_names:
+                    columnas.append(filas[nombre])
+                    nombres.append(metric.code)
+            resultados.append(pa.Table.from_arrays(columnas, names=nombres))
+
+        return resultados
+
+    def _criterion_expression(self, criterion: Criterion) -> ColumnElement[Any] | None:
+        """Expresión SQL de un criterio (los builders pueden traducir columnas)."""
+        return criterion.to_expression()
+
+    @staticmethod
+    def _clave_expresion(expr: ColumnElement[Any] | None) -> str:
+        """Clave para detectar criterios iguales dentro de un batch."""
+        if expr is None:
+            return ""
+        try:
+            return str(
+                expr.compile(
+                    dialect=postgresql.dialect(),
+                    compile_kwargs={"literal_binds": True},
+                )
+            )
+        except Exception:
+            # Sin representación literal: se trata como criterio único
+            return f"expr:{id(expr)}"
+
     def reset(self) -> "MetricQueryBuilder":
         """Resetea el builder para reutilizar."""
         self._dimensions = []
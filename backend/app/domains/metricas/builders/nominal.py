@@ -245,7 +245,13 @@ class NominalQueryBuilder(MetricQueryBuilder):
                         < criterion.anio_hasta,
                     )
                 )
-            return or_(*conditions)
+            # El BETWEEN sobre la clave de partición deja podar años fuera del rango
+            return and_(
+                col(CasoEpidemiologico.fecha_minima_caso_anio_epi).between(
+                    criterion.anio_desde, criterion.anio_hasta
+                ),
+                or_(*conditions),
+            )
 
         if isinstance(criterion, AniosMultiplesCriterion):
             return col(CasoEpidemiologico.fecha_minima_caso_anio_epi).in_(
@@ -254,42 +260,6 @@ class NominalQueryBuilder(MetricQueryBuilder):
 
         return criterion.to_expression()
 
-    def execute(self, metric: MetricDefinition) -> list[dict]:
-        """Sobrescribe execute para usar _transform_criterion_expression."""
-        query = self.build_base_query(metric)
-
-        select_columns = []
-        group_by_columns = []
-        order_columns = []
-
-        for dim in self._dimensions:
-            col = self.get_dimension_column(dim.code)
-            select_columns.append(col.label(dim.code.value.lower()))
-            group_by_columns.append(col)
-
-            order_col = self.get_dimension_order_column(dim.code)
-            if dim.code == DimensionCode.GRUPO_ETARIO or str(order_col) != str(col):
-                group_by_columns.append(order_col)
-            order_columns.append(order_col)
-
-        agg_expr = metric.get_aggregation_expr()
-        if agg_expr is not None:
-            select_columns.append(agg_expr.label("valor"))
-
-        if select_columns:
-            query = query.with_only_columns(*select_columns)
-
-        if self._criteria:
-            expr = self._transform_criterion_expression(self._criteria)
-            if expr is not None:
-                query = query.where(expr)
-
-        if group_by_columns:
-            query = query.group_by(*group_by_columns)
-
-        if self._order_by_dims and order_columns:
-            for order_col in order_columns:
-                query = query.order_by(order_col)
-
-        result = self.session.execute(query)
-        return [dict(row._mapping) for row in result]
+    def _criterion_expression(self, criterion: Criterion) -> ColumnElement[Any] | None:
+        """Usa la traducción de criterios temporales a CasoEpidemiologico."""
+        return self._transform_criterion_expression(criterion)
@@ -55,8 +55,22 @@ Estas tienen:
 - aggregation=DERIVED
 - derived_from=["metrica1", "metrica2"]
 - formula_fn=lambda row: row["metrica1"] / row["metrica2"] * 100
+- formula_expr=lambda: pl.col("metrica1") / pl.col("metrica2") * 100  (opcional)
 
 El MetricService ejecuta primero las métricas base y luego aplica la fórmula.
+Si la métrica define formula_expr (expresión Polars) se calcula vectorizada
+sobre todo el resultado; formula_fn queda como fallback fila a fila.
+
+══════════════════════════════════════════════════════════════════════════════════
+DETECCIÓN DE ABERRACIONES
+══════════════════════════════════════════════════════════════════════════════════
+
+Las métricas con aberracion="<método>" (ver aberraciones.METODOS) son
+derivadas de una serie semanal: el MetricService arma la matriz series ×
+semanas de la métrica base (una serie por combinación de las dimensiones no
+temporales) y corre el método sobre toda la matriz. Requieren las dimensiones
+SEMANA_EPIDEMIOLOGICA y ANIO_EPIDEMIOLOGICO y devuelven valor (casos),
+esperado, estadistico, umbral y senal por serie y semana.
 """
 
 from collections.abc import Callable
@@ -64,6 +78,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
+import polars as pl
 from sqlalchemy import ColumnElement, func
 from sqlmodel import SQLModel
 
@@ -127,6 +142,10 @@ class MetricDefinition:
     # Para métricas derivadas
     derived_from: list[str] | None = None
     formula_fn: Callable[[dict], float] | None = None
+    formula_expr: Callable[[], pl.Expr] | None = None
+
+    # Para métricas de detección de aberraciones (clave de aberraciones.METODOS)
+    aberracion: str | None = None
 
     # Formato de display
     format_pattern: str = "0,0"
@@ -242,6 +261,11 @@ METRICS: dict[str, MetricDefinition] = {
             if row.get("muestras_estudiadas", 0) > 0
             else 0.0
         ),
+        formula_expr=lambda: (
+            pl.when(pl.col("muestras_estudiadas") > 0)
+            .then(pl.col("muestras_positivas") / pl.col("muestras_estudiadas") * 100)
+            .otherwise(0.0)
+        ),
         allowed_dimensions=[
             DimensionCode.SEMANA_EPIDEMIOLOGICA,
             DimensionCode.AGENTE_ETIOLOGICO,
@@ -273,6 +297,114 @@ METRICS: dict[str, MetricDefinition] = {
         suffix=" casos",
     ),
     # ═══════════════════════════════════════════════════════════════
+    # DETECCIÓN DE ABERRACIONES (sobre casos nominales)
+    # ═══════════════════════════════════════════════════════════════
+    "aberracion_ears_c1": MetricDefinition(
+        code="aberracion_ears_c1",
+        label="EARS C1",
+        description="EARS C1: casos de la semana contra media y desvío de las 7 semanas previas",
+        categoria="Detección de Brotes",
+        source=MetricSource.NOMINAL,
+        model=CasoEpidemiologico,
+        aggregation=AggregationType.DERIVED,
+        derived_from=["casos_nominales"],
+        aberracion="ears_c1",
+        allowed_dimensions=[
+            DimensionCode.SEMANA_EPIDEMIOLOGICA,
+            DimensionCode.ANIO_EPIDEMIOLOGICO,
+            DimensionCode.TIPO_EVENTO,
+            DimensionCode.GRUPO_ETARIO,
+            DimensionCode.SEXO,
+            DimensionCode.PROVINCIA,
+            DimensionCode.DEPARTAMENTO,
+        ],
+        format_pattern="0.00",
+    ),
+    "aberracion_ears_c2": MetricDefinition(
+        code="aberracion_ears_c2",
+        label="EARS C2",
+        description="EARS C2: como C1 pero con 2 semanas de desfase entre la base y la semana evaluada",
+        categoria="Detección de Brotes",
+        source=MetricSource.NOMINAL,
+        model=CasoEpidemiologico,
+        aggregation=AggregationType.DERIVED,
+        derived_from=["casos_nominales"],
+        aberracion="ears_c2",
+        allowed_dimensions=[
+            DimensionCode.SEMANA_EPIDEMIOLOGICA,
+            DimensionCode.ANIO_EPIDEMIOLOGICO,
+            DimensionCode.TIPO_EVENTO,
+            DimensionCode.GRUPO_ETARIO,
+            DimensionCode.SEXO,
+            DimensionCode.PROVINCIA,
+            DimensionCode.DEPARTAMENTO,
+        ],
+        format_pattern="0.00",
+    ),
+    "aberracion_ears_c3": MetricDefinition(
+        code="aberracion_ears_c3",
+        label="EARS C3",
+        description="EARS C3: suma de los excesos de C2 de las últimas 3 semanas",
+        categoria="Detección de Brotes",
+        source=MetricSource.NOMINAL,
+        model=CasoEpidemiologico,
+        aggregation=AggregationType.DERIVED,
+        derived_from=["casos_nominales"],
+        aberracion="ears_c3",
+        allowed_dimensions=[
+            DimensionCode.SEMANA_EPIDEMIOLOGICA,
+            DimensionCode.ANIO_EPIDEMIOLOGICO,
+            DimensionCode.TIPO_EVENTO,
+            DimensionCode.GRUPO_ETARIO,
+            DimensionCode.SEXO,
+            DimensionCode.PROVINCIA,
+            DimensionCode.DEPARTAMENTO,
+        ],
+        format_pattern="0.00",
+    ),
+    "aberracion_cusum": MetricDefinition(
+        code="aberracion_cusum",
+        label="CUSUM",
+        description="Suma acumulada de los desvíos estandarizados de C2",
+        categoria="Detección de Brotes",
+        source=MetricSource.NOMINAL,
+        model=CasoEpidemiologico,
+        aggregation=AggregationType.DERIVED,
+        derived_from=["casos_nominales"],
+        aberracion="cusum",
+        allowed_dimensions=[
+            DimensionCode.SEMANA_EPIDEMIOLOGICA,
+            DimensionCode.ANIO_EPIDEMIOLOGICO,
+            DimensionCode.TIPO_EVENTO,
+            DimensionCode.GRUPO_ETARIO,
+            DimensionCode.SEXO,
+            DimensionCode.PROVINCIA,
+            DimensionCode.DEPARTAMENTO,
+        ],
+        format_pattern="0.00",
+    ),
+    "aberracion_farrington": MetricDefinition(
+        code="aberracion_farrington",
+        label="Farrington flexible",
+        description="Casos sobre el umbral de un GLM quasi-Poisson con las mismas semanas de los 5 años previos",
+        categoria="Detección de Brotes",
+        source=MetricSource.NOMINAL,
+        model=CasoEpidemiologico,
+        aggregation=AggregationType.DERIVED,
+        derived_from=["casos_nominales"],
+        aberracion="farrington",
+        allowed_dimensions=[
+            DimensionCode.SEMANA_EPIDEMIOLOGICA,
+            DimensionCode.ANIO_EPIDEMIOLOGICO,
+            DimensionCode.TIPO_EVENTO,
+            DimensionCode.GRUPO_ETARIO,
+            DimensionCode.SEXO,
+            DimensionCode.PROVINCIA,
+            DimensionCode.DEPARTAMENTO,
+        ],
+        format_pattern="0.00",
+    ),
+    # ═══════════════════════════════════════════════════════════════
     # OCUPACIÓN HOSPITALARIA (CLI_P26_INT)
     # ═══════════════════════════════════════════════════════════════
     "ocupacion_camas_ira": MetricDefinition(
@@ -5,8 +5,22 @@ Este es el punto de entrada principal (Facade) que expone
 todas las capacidades del Metric Engine.
 """
 
+from dataclasses import dataclass, field
+from datetime import date
+
+import numpy as np
+import polars as pl
+import pyarrow as pa
 from sqlalchemy.orm import Session
 
+from app.core.epidemiology import (
+    calcular_semana_epidemiologica,
+    obtener_fechas_semana_epidemiologica,
+)
+
+from .aberraciones import METODOS
+from .arrow import with_metadata
+from .builders.base import ConsultaBatch, MetricQueryBuilder
 from .builders.clinico import ClinicoQueryBuilder
 from .builders.hospitalario import HospitalarioQueryBuilder
 from .builders.laboratorio import LaboratorioQueryBuilder
@@ -24,6 +38,42 @@ from .registry.metrics import (
 )
 
 
+@dataclass
+class MetricResult:
+    """
+    Resultado columnar de una query de métrica.
+
+    ``frame`` es un DataFrame de Polars armado sobre la tabla Arrow del
+    builder; la conversión a filas (JSON) o a Arrow se hace recién al salir.
+    """
+
+    frame: pl.DataFrame
+    metadata: dict
+
+    def to_dict(self) -> dict:
+        """Formato JSON clásico: {columns, data, metadata}."""
+        return {
+            "columns": self.frame.columns if self.frame.height else [],
+            "data": self.frame.to_dicts(),
+            "metadata": self.metadata,
+        }
+
+    def to_arrow(self) -> pa.Table:
+        """Tabla Arrow con la metadata en el schema (clave ``metric_metadata``)."""
+        return with_metadata(self.frame.to_arrow(), self.metadata)
+
+
+@dataclass
+class MetricRequest:
+    """Una consulta dentro de un batch (mismos parámetros que ``query``)."""
+
+    metric: str
+    dimensions: list[str] = field(default_factory=list)
+    criteria: Criterion | None = None
+    compute: str | None = None
+    filters: dict | None = None
+
+
 class MetricService:
     """
     Servicio unificado para consultas de métricas.
@@ -39,6 +89,16 @@ class MetricService:
             criteria=RangoPeriodoCriterion(2025, 1, 2025, 20) & TipoEventoCriterion(evento_nombre="ETI")
         )
 
+        # Resultado columnar (Polars/Arrow) sin armar dicts por fila
+        result = service.query_result(metric="casos_clinicos", ...)
+        tabla = result.to_arrow()
+
+        # Varias métricas: una sola query por source (GROUPING SETS)
+        batch = service.query_batch([
+            MetricRequest("casos_clinicos", ["SEMANA_EPIDEMIOLOGICA"], criteria),
+            MetricRequest("casos_clinicos", [], criteria),  # total
+        ])
+
         # Listar métricas disponibles
         metrics = service.list_available_metrics()
 
@@ -100,93 +160,321 @@ class MetricService:
                 "metadata": {...}
             }
         """
+        return self.query_result(
+            metric, dimensions, criteria, compute, filters
+        ).to_dict()
+
+    def query_result(
+        self,
+        metric: str,
+        dimensions: list[str] | None = None,
+        criteria: Criterion | None = None,
+        compute: str | None = None,
+        filters: dict | None = None,
+    ) -> MetricResult:
+        """
+        Igual que ``query`` pero retorna el resultado columnar.
+
+        La tabla Arrow sale directo del cursor y el post-proceso (derivadas,
+        corredor) opera sobre Polars.
+        """
         # Validar métrica
         metric_def = get_metric(metric)
+        dimension_codes = self._parse_dimensions(metric_def, dimensions)
+
+        # Construir y ejecutar query
+        builder = self._get_builder(metric_def)
+        builder.with_dimensions(*dimension_codes)
+
+        if criteria:
+            builder.with_criteria(criteria)
+
+        builder.order_by_dimensions()
+
+        frame = pl.from_arrow(builder.execute_arrow(metric_def))
+        assert isinstance(frame, pl.DataFrame)
+
+        # Post-procesar métricas derivadas
+        if metric_def.derived_from:
+            frame = self._compute_derived_metrics(metric_def, frame, dimension_codes)
+
+        return self._build_result(metric_def, dimension_codes, frame, compute, filters)
+
+    def query_batch(self, requests: list[MetricRequest]) -> dict:
+        """
+        Ejecuta varias consultas de métricas agrupándolas por source.
+
+        Todas las consultas de un mismo source (cubo) se compilan en un único
+        statement con ``GROUPING SETS``: cada combinación de dimensiones es un
+        grouping set y cada criterio distinto un ``FILTER`` sobre el mismo
+        scan. Los resultados se reparten luego por consulta.
+
+        Args:
+            requests: Consultas a ejecutar
+
+        Returns:
+            {
+                "results": [{"columns", "data", "metadata"}, ...],  # mismo orden
+                "metadata": {"total_queries": int, "statements": int}
+            }
+        """
+        results, metadata = self.query_batch_results(requests)
+        return {
+            "results": [result.to_dict() for result in results],
+            "metadata": metadata,
+        }
+
+    def query_batch_results(
+        self, requests: list[MetricRequest]
+    ) -> tuple[list[MetricResult], dict]:
+        """Igual que ``query_batch`` pero con resultados columnares."""
+        # Validar todo antes de ejecutar nada
+        preparadas: list[tuple[MetricDefinition, list[DimensionCode]]] = []
+        for request in requests:
+            metric_def = get_metric(request.metric)
+            dimension_codes = self._parse_dimensions(metric_def, request.dimensions)
+            if metric_def.source not in self._builders:
+                raise ValueError(
+                    f"No hay builder implementado para source: {metric_def.source}"
+                )
+            preparadas.append((metric_def, dimension_codes))
+
+        por_source: dict[MetricSource, list[int]] = {}
+        for i, (metric_def, _) in enumerate(preparadas):
+            por_source.setdefault(metric_def.source, []).append(i)
+
+        frames: list[pl.DataFrame] = [pl.DataFrame() for _ in requests]
+        for indices in por_source.values():
+            consultas = [
+                ConsultaBatch(
+                    metricas=tuple(self._base_metrics(preparadas[i][0])),
+                    dimensiones=tuple(preparadas[i][1]),
+                    criterio=requests[i].criteria,
+                )
+                for i in indices
+            ]
+            builder = self._get_builder(preparadas[indices[0]][0])
+            tablas = builder.execute_grouping_sets(consultas)
+            for i, tabla in zip(indices, tablas, strict=True):
+                frames[i] = self._batch_table_to_frame(*preparadas[i], tabla)
+
+        results = [
+            self._build_result(
+                metric_def, dimension_codes, frames[i], request.compute, request.filters
+            )
+            for i, (request, (metric_def, dimension_codes)) in enumerate(
+                zip(requests, preparadas, strict=True)
+            )
+        ]
+        metadata = {
+            "total_queries": len(requests),
+            "statements": len(por_source),
+        }
+        return results, metadata
 
-        # Parsear dimensiones
+    def _parse_dimensions(
+        self, metric_def: MetricDefinition, dimensions: list[str] | None
+    ) -> list[DimensionCode]:
+        """Valida las dimensiones contra las permitidas por la métrica."""
         dimension_codes = []
         for dim_str in dimensions or []:
             dim_code = DimensionCode(dim_str)
             if dim_code not in metric_def.allowed_dimensions:
                 raise ValueError(
-                    f"Dimensión {dim_str} no permitida para métrica {metric}. "
+                    f"Dimensión {dim_str} no permitida para métrica {metric_def.code}. "
                     f"Permitidas: {[d.value for d in metric_def.allowed_dimensions]}"
                 )
             dimension_codes.append(dim_code)
+        temporales = {
+            DimensionCode.SEMANA_EPIDEMIOLOGICA,
+            DimensionCode.ANIO_EPIDEMIOLOGICO,
+        }
+        if metric_def.aberracion and not temporales <= set(dimension_codes):
+            raise ValueError(
+                f"La métrica {metric_def.code} requiere las dimensiones "
+                "SEMANA_EPIDEMIOLOGICA y ANIO_EPIDEMIOLOGICO"
+            )
+        return dimension_codes
 
-        # Obtener builder para el source
+    def _get_builder(self, metric_def: MetricDefinition) -> MetricQueryBuilder:
+        """Instancia el builder del source de la métrica."""
         BuilderClass = self._builders.get(metric_def.source)
         if not BuilderClass:
             raise ValueError(
                 f"No hay builder implementado para source: {metric_def.source}"
             )
+        return BuilderClass(self.session)
 
-        # Construir y ejecutar query
-        builder = BuilderClass(self.session)
-        builder.with_dimensions(*dimension_codes)
-
-        if criteria:
-            builder.with_criteria(criteria)
-
-        builder.order_by_dimensions()
-
-        data = builder.execute(metric_def)
+    def _base_metrics(self, metric_def: MetricDefinition) -> list[MetricDefinition]:
+        """Métricas que hay que agregar en SQL (las bases si es derivada)."""
+        if metric_def.derived_from:
+            return [get_metric(code) for code in metric_def.derived_from]
+        return [metric_def]
 
-        # Post-procesar métricas derivadas
+    def _batch_table_to_frame(
+        self,
+        metric_def: MetricDefinition,
+        dimension_codes: list[DimensionCode],
+        tabla: pa.Table,
+    ) -> pl.DataFrame:
+        """Convierte la tabla del batch (una columna por métrica) al formato de ``query``."""
+        frame = pl.from_arrow(tabla)
+        assert isinstance(frame, pl.DataFrame)
         if metric_def.derived_from:
-            data = self._compute_derived_metrics(metric_def, data)
+            return self._compute_derived_metrics(metric_def, frame, dimension_codes)
+        return frame.rename({metric_def.code: "valor"})
 
+    def _build_result(
+        self,
+        metric_def: MetricDefinition,
+        dimension_codes: list[DimensionCode],
+        frame: pl.DataFrame,
+        compute: str | None,
+        filters: dict | None,
+    ) -> MetricResult:
+        """Aplica compute y arma el resultado con su metadata."""
         # Aplicar cálculos post-query si se solicitan
         compute_warnings: list[str] = []
         compute_extra_metadata: dict = {}
         if compute:
-            data, compute_warnings, compute_extra_metadata = self._apply_compute(
-                compute, data, dimension_codes, filters or {}
+            frame, compute_warnings, compute_extra_metadata = self._apply_compute(
+                compute, frame, dimension_codes, filters or {}
             )
 
-        # Extraer columns del primer row (todos los rows tienen las mismas keys)
-        columns = list(data[0].keys()) if data else []
-
         metadata: dict = {
             "metric": metric_def.code,
             "metric_label": metric_def.label,
             "dimensions": [d.value for d in dimension_codes],
-            "total_rows": len(data),
+            "total_rows": frame.height,
             "source": metric_def.source.value,
             "compute": compute,
             "warnings": compute_warnings if compute_warnings else None,
             **compute_extra_metadata,
         }
 
-        return {
-            "columns": columns,
-            "data": data,
-            "metadata": metadata,
-        }
+        return MetricResult(frame=frame, metadata=metadata)
 
     def _compute_derived_metrics(
         self,
         metric_def: MetricDefinition,
-        data: list[dict],
-    ) -> list[dict]:
-        """Calcula métricas derivadas post-query."""
-        if not metric_def.formula_fn:
-            return data
+        frame: pl.DataFrame,
+        dimension_codes: list[DimensionCode],
+    ) -> pl.DataFrame:
+        """
+        Calcula métricas derivadas post-query.
+
+        Reemplaza las columnas de las métricas base por ``valor``. Usa
+        ``formula_expr`` (vectorizado); ``formula_fn`` queda como fallback
+        fila a fila para métricas que no la definen. Las de detección de
+        aberraciones se calculan sobre la serie semanal completa.
+        """
+        if metric_def.aberracion:
+            return self._compute_aberracion(metric_def, frame, dimension_codes)
+        bases = [c for c in metric_def.derived_from or [] if c in frame.columns]
+        if metric_def.formula_expr is not None and frame.height:
+            valor = metric_def.formula_expr()
+        elif metric_def.formula_fn is not None and frame.height:
+            valor = pl.Series(
+                [
+                    metric_def.compute_derived(row)
+                    for row in frame.iter_rows(named=True)
+                ],
+                dtype=pl.Float64,
+            )
+        else:
+            return frame.drop(bases)
+        return frame.with_columns(valor.alias("valor")).drop(bases)
+
+    def _compute_aberracion(
+        self,
+        metric_def: MetricDefinition,
+        frame: pl.DataFrame,
+        dimension_codes: list[DimensionCode],
+    ) -> pl.DataFrame:
+        """
+        Corre un método de detección sobre todas las series a la vez.
 
-        for row in data:
-            derived_value = metric_def.compute_derived(row)
-            if derived_value is not None:
-                row["valor"] = derived_value
+        Arma la matriz series × semanas de la métrica base: una serie por
+        combinación de las dimensiones no temporales y semanas consecutivas
+        entre la primera y la última con datos (las que faltan valen 0).
+        Devuelve una fila por serie y semana con ``valor`` (casos),
+        ``esperado``, ``estadistico``, ``umbral`` y ``senal``.
+        """
+        anio = DimensionCode.ANIO_EPIDEMIOLOGICO.value.lower()
+        semana = DimensionCode.SEMANA_EPIDEMIOLOGICA.value.lower()
+        base = (metric_def.derived_from or [])[0]
+        claves = [
+            d.value.lower()
+            for d in dimension_codes
+            if d.value.lower() not in (anio, semana)
+        ]
+        frame = frame.drop_nulls([anio, semana])
+        columnas = [*claves, anio, semana, "valor"]
+        if frame.height == 0:
+            return pl.DataFrame(schema=columnas)
+
+        # Índice correlativo de cada semana (los domingos son múltiplos de 7)
+        periodos = frame.select(anio, semana).unique()
+        indices = periodos.with_columns(
+            pl.Series(
+                "_semana",
+                [
+                    obtener_fechas_semana_epidemiologica(a, s)[0].toordinal() // 7
+                    for a, s in periodos.iter_rows()
+                ],
+                dtype=pl.Int64,
+            )
+        )
+        frame = frame.join(indices, on=[anio, semana], how="left")
+        primera = int(frame["_semana"].min())  # type: ignore[arg-type]
+        ultima = int(frame["_semana"].max())  # type: ignore[arg-type]
+
+        series = (
+            frame.select(claves).unique(maintain_order=True)
+            if claves
+            else pl.DataFrame({"_vacia": [0]})
+        )
+        series = series.with_row_index("_serie")
+        if claves:
+            frame = frame.join(series, on=claves, how="left", nulls_equal=True)
+        else:
+            frame = frame.with_columns(pl.lit(0, dtype=pl.UInt32).alias("_serie"))
 
-        return data
+        matriz = np.zeros((series.height, ultima - primera + 1))
+        matriz[frame["_serie"].to_numpy(), frame["_semana"].to_numpy() - primera] = (
+            frame[base].cast(pl.Float64).fill_null(0.0).to_numpy()
+        )
+        resultado = METODOS[metric_def.aberracion or ""](matriz)
+
+        semanas = pl.DataFrame(
+            [
+                calcular_semana_epidemiologica(date.fromordinal(i * 7))[::-1]
+                for i in range(primera, ultima + 1)
+            ],
+            schema={anio: pl.Int64, semana: pl.Int64},
+            orient="row",
+        )
+        return (
+            series.drop("_serie", "_vacia", strict=False)
+            .join(semanas, how="cross")
+            .with_columns(
+                pl.Series("valor", matriz.ravel()),
+                pl.Series("esperado", resultado.esperado.ravel(), nan_to_null=True),
+                pl.Series(
+                    "estadistico", resultado.estadistico.ravel(), nan_to_null=True
+                ),
+                pl.Series("umbral", resultado.umbral.ravel(), nan_to_null=True),
+                pl.Series("senal", resultado.senal.ravel()),
+            )
+        )
 
     def _apply_compute(
         self,
         compute: str,
-        data: list[dict],
+        frame: pl.DataFrame,
         dimension_codes: list[DimensionCode],
         filters: dict,
-    ) -> tuple[list[dict], list[str], dict]:
+    ) -> tuple[pl.DataFrame, list[str], dict]:
         """
         Aplica cálculos post-query.
 
@@ -197,7 +485,7 @@ class MetricService:
             Tuple of (processed_data, warnings, extra_metadata)
         """
         if compute == "corredor_endemico":
-            return self._compute_corredor_endemico(data, dimension_codes, filters)
+            return self._compute_corredor_endemico(frame, dimension_codes, filters)
         else:
             raise ValueError(
                 f"Compute no soportado: {compute}. Opciones: corredor_endemico"
@@ -205,32 +493,38 @@ class MetricService:
 
     def _compute_corredor_endemico(
         self,
-        data: list[dict],
+        frame: pl.DataFrame,
         dimension_codes: list[DimensionCode],
         filters: dict,
-    ) -> tuple[list[dict], list[str], dict]:
+    ) -> tuple[pl.DataFrame, list[str], dict]:
         """
         Calcula corredor endémico a partir de datos multi-año.
 
+        Los percentiles (interpolación lineal, igual que numpy) se calculan
+        por semana sobre todas las filas históricas de esa semana.
+
         REQUISITOS:
         - Mínimo 2 años históricos (excluyendo 2020-2021)
         """
-        import numpy as np  # Disponible via pandas
-
         MIN_YEARS_VALID = 2
+        ANIOS_EXCLUIDOS = [2020, 2021]
         warnings = []
 
-        if not data:
-            return [], ["No hay datos disponibles para calcular el corredor endémico"]
+        if frame.height == 0:
+            return (
+                pl.DataFrame(),
+                ["No hay datos disponibles para calcular el corredor endémico"],
+                {},
+            )
 
         # 1. Identificar años disponibles
+        if "anio_epidemiologico" not in frame.columns:
+            return pl.DataFrame(), ["No se encontraron años en los datos"], {}
         anios = {
-            row.get("anio_epidemiologico")
-            for row in data
-            if row.get("anio_epidemiologico")
+            a for a in frame["anio_epidemiologico"].drop_nulls().unique().to_list() if a
         }
         if not anios:
-            return [], ["No se encontraron años en los datos"]
+            return pl.DataFrame(), ["No se encontraron años en los datos"], {}
 
         # Formato unificado de periodo:
         # {"anio_desde": int, "semana_desde": int, "anio_hasta": int, "semana_hasta": int}
@@ -239,7 +533,7 @@ class MetricService:
 
         # Excluir 2020 y 2021 de los históricos
         anios_historicos = sorted(
-            [a for a in anios if a != anio_actual and a not in [2020, 2021]]
+            [a for a in anios if a != anio_actual and a not in ANIOS_EXCLUIDOS]
         )
         n_anios_hist = len(anios_historicos)
 
@@ -250,71 +544,69 @@ class MetricService:
                 f"Se requieren mínimo {MIN_YEARS_VALID} años (excluyendo 2020-2021)."
             )
 
-        # 3. Agrupar por semana separando histórico vs actual
-        from collections import defaultdict
-
-        semanas_historicas: dict[int, list[float]] = defaultdict(list)
-        semanas_actuales: dict[int, float] = defaultdict(float)
-
-        for row in data:
-            semana = row.get("semana_epidemiologica")
-            anio = row.get("anio_epidemiologico")
-            valor = float(row.get("valor", 0) or 0)
-
-            if semana is None or anio is None:
-                continue
-
-            # Skip pandemic years in processing
-            if anio in [2020, 2021] and anio != anio_actual:
-                continue
-
-            if anio == anio_actual:
-                semanas_actuales[semana] += valor
-            else:
-                semanas_historicas[semana].append(valor)
-
-        # 4. Calcular percentiles y fusionar
-        result = []
-        todas_semanas = set(semanas_historicas.keys()) | set(semanas_actuales.keys())
-
-        for semana in sorted(todas_semanas):
-            valores_hist = semanas_historicas.get(semana, [])
-            valor_act = semanas_actuales.get(semana, 0.0)
-
-            # Cálculo de zonas (solo si hay historia suficiente)
-            if len(valores_hist) > 0 and n_anios_hist >= MIN_YEARS_VALID:
-                p25 = float(np.percentile(valores_hist, 25))
-                p50 = float(np.percentile(valores_hist, 50))
-                p75 = float(np.percentile(valores_hist, 75))
-                p90 = float(np.percentile(valores_hist, 90))
-
-                row_data = {
-                    "semana_epidemiologica": semana,
-                    "valor_actual": valor_act,
-                    "zona_exito": p25,
-                    "zona_seguridad": p50,
-                    "zona_alerta": p75,
-                    "zona_brote": p90,
-                    "corredor_valido": True,
-                }
-            else:
-                # Solo datos actuales si no hay suficiente historia
-                row_data = {
-                    "semana_epidemiologica": semana,
-                    "valor_actual": valor_act,
-                    "zona_exito": 0,
-                    "zona_seguridad": 0,
-                    "zona_alerta": 0,
-                    "zona_brote": 0,
-                    "corredor_valido": False,
-                }
-            result.append(row_data)
+        # 3. Separar histórico vs actual (sin años de pandemia en el histórico)
+        base = frame.filter(
+            pl.col("semana_epidemiologica").is_not_null()
+            & pl.col("anio_epidemiologico").is_not_null()
+            & (
+                (pl.col("anio_epidemiologico") == anio_actual)
+                | ~pl.col("anio_epidemiologico").is_in(ANIOS_EXCLUIDOS)
+            )
+        ).select(
+            pl.col("semana_epidemiologica"),
+            pl.col("anio_epidemiologico"),
+            pl.col("valor").cast(pl.Float64).fill_null(0.0),
+        )
+        es_actual = pl.col("anio_epidemiologico") == anio_actual
+
+        actuales = (
+            base.filter(es_actual)
+            .group_by("semana_epidemiologica")
+            .agg(pl.col("valor").sum().alias("valor_actual"))
+        )
+        percentiles = {
+            "zona_exito": 0.25,
+            "zona_seguridad": 0.50,
+            "zona_alerta": 0.75,
+            "zona_brote": 0.90,
+        }
+        historicas = (
+            base.filter(~es_actual)
+            .group_by("semana_epidemiologica")
+            .agg(
+                pl.len().alias("_n_hist"),
+                *[
+                    pl.col("valor").quantile(q, interpolation="linear").alias(zona)
+                    for zona, q in percentiles.items()
+                ],
+            )
+        )
+
+        # 4. Fusionar; las zonas valen 0 si no hay historia suficiente
+        valido = pl.col("_n_hist").is_not_null() & pl.lit(
+            n_anios_hist >= MIN_YEARS_VALID
+        )
+        result = (
+            actuales.join(
+                historicas, on="semana_epidemiologica", how="full", coalesce=True
+            )
+            .sort("semana_epidemiologica")
+            .select(
+                pl.col("semana_epidemiologica"),
+                pl.col("valor_actual").fill_null(0.0),
+                *[
+                    pl.when(valido).then(pl.col(zona)).otherwise(0.0).alias(zona)
+                    for zona in percentiles
+                ],
+                valido.alias("corredor_valido"),
+            )
+        )
 
         extra_metadata = {
             "corredor": {
                 "anio_actual": anio_actual,
                 "anios_historicos": anios_historicos,
-                "anios_excluidos": [2020, 2021],
+                "anios_excluidos": ANIOS_EXCLUIDOS,
             },
         }
 
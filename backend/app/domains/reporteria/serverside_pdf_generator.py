@@ -19,8 +19,6 @@ from reportlab.platypus import Image, PageBreak, Paragraph, SimpleDocTemplate, S
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domains.charts.schemas import CodigoGrafico, FiltrosGrafico
-from app.domains.charts.services.renderer import chart_renderer
-from app.domains.charts.services.spec_generator import ChartSpecGenerator
 
 logger = logging.getLogger(__name__)
 
@@ -242,6 +240,10 @@ class ServerSidePDFGenerator:
         Returns:
             Bytes del PDF generado
         """
+        # matplotlib (renderer) y pandas (spec generator) se cargan al usarse
+        from app.domains.charts.services.renderer import chart_renderer
+        from app.domains.charts.services.spec_generator import ChartSpecGenerator
+
         logger.info(
             f"Generando PDF server-side para {combination.get('group_name', 'Unknown')}"
         )
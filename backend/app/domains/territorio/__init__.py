@@ -5,6 +5,7 @@ Contexto geográfico y de infraestructura sanitaria.
 
 MÓDULOS:
 ├── geografia_models.py     🌍 Ubicaciones geográficas
+├── poblacion_models.py     👥 Población de referencia (denominadores)
 └── establecimientos_models.py  🏥 Establecimientos de salud
 
 AGGREGATE ROOTS:
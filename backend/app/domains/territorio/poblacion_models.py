@@ -0,0 +1,57 @@
+"""Modelo de población de referencia (denominadores de tasas).
+
+Una fila por departamento, año censal, sexo y grupo etario. Los totales se
+guardan con ``sexo = "T"`` y ``grupo_etario = "total"``, así la clave única
+no tiene NULLs. El servicio de población
+(``app.domains.territorio.services.poblacion_service``) la carga en memoria e
+interpola entre años.
+"""
+
+from sqlalchemy import UniqueConstraint
+from sqlmodel import Field
+
+from app.core.models import BaseModel
+
+SEXO_TOTAL = "T"
+GRUPO_ETARIO_TOTAL = "total"
+
+
+class PoblacionReferencia(BaseModel, table=True):
+    """Población de un departamento en un año censal (o proyección)."""
+
+    __tablename__ = "poblacion_referencia"
+    __table_args__ = (
+        UniqueConstraint(
+            "id_provincia_indec",
+            "id_departamento_indec",
+            "anio",
+            "sexo",
+            "grupo_etario",
+            name="uq_poblacion_referencia_clave",
+        ),
+        {"extend_existing": True},
+    )
+
+    id_provincia_indec: int = Field(
+        foreign_key="provincia.id_provincia_indec",
+        index=True,
+        description="ID de la provincia",
+    )
+    id_departamento_indec: int = Field(
+        description="ID de departamento INDEC (único por provincia)"
+    )
+    anio: int = Field(description="Año del censo o de la proyección")
+    sexo: str = Field(
+        default=SEXO_TOTAL,
+        max_length=1,
+        description="T (total), M (masculino) o F (femenino)",
+    )
+    grupo_etario: str = Field(
+        default=GRUPO_ETARIO_TOTAL,
+        max_length=20,
+        description="Etiqueta del grupo etario quinquenal (ej: '0-4', '80+') o 'total'",
+    )
+    poblacion: int = Field(description="Cantidad de habitantes")
+    fuente: str | None = Field(
+        None, max_length=100, description="Fuente del dato (ej: censo_2022)"
+    )
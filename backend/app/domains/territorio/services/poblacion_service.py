@@ -0,0 +1,426 @@
+"""
+Servicio de población de referencia (denominadores de tasas).
+
+RESPONSABILIDAD: Dar la población de cualquier combinación de provincia,
+departamento, sexo, grupo etario y año sin consultar la BD en cada request,
+y calcular tasas sobre frames de resultados completos.
+
+FUNCIONAMIENTO:
+- Carga una sola vez ``poblacion_referencia`` (más ``departamento.poblacion``
+  para departamentos sin filas de referencia) en un ``pl.DataFrame`` con una
+  fila por (provincia, departamento, sexo, grupo etario, año censal).
+- Entre años censales interpola geométricamente; fuera del rango proyecta con
+  el crecimiento anual observado entre el primer y el último censo del
+  departamento, o ``POBLACION_CRECIMIENTO_ANUAL`` si tiene un solo censo.
+  Las estimaciones por año se memorizan.
+- Provincia y país se obtienen sumando departamentos.
+
+INVALIDACIÓN:
+- La versión de la tabla son los hashes de los pasos ``geografia`` y
+  ``poblacion`` en ``seed_estado`` (orquestador de seeds). Cada
+  ``POBLACION_VERIFICAR_SEGUNDOS`` se compara (una consulta por PK) y, si
+  cambió, se recarga. Sin ``seed_estado`` se recarga en cada verificación.
+- ``invalidar_poblacion()`` fuerza la recarga en el proceso actual.
+
+USO:
+    tabla = await obtener_poblacion(db)
+    tabla.poblacion(id_provincia_indec=26)
+    tabla.agregar_tasas(df_casos)  # columnas: claves presentes + casos
+    tabla.tasas_ajustadas_por_edad(df_casos_por_grupo)  # pirámide poblacional
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Iterable
+from datetime import date
+
+import polars as pl
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.static_data.salud import AJUSTE_HAB, POBLACIONES_ESTANDAR
+from app.domains.territorio.poblacion_models import GRUPO_ETARIO_TOTAL, SEXO_TOTAL
+
+logger = logging.getLogger(__name__)
+
+# Claves de la tabla (además del año)
+CLAVES = ("id_provincia_indec", "id_departamento_indec", "sexo", "grupo_etario")
+
+_ESQUEMA = {
+    "id_provincia_indec": pl.Int64,
+    "id_departamento_indec": pl.Int64,
+    "sexo": pl.Utf8,
+    "grupo_etario": pl.Utf8,
+    "anio": pl.Int64,
+    "poblacion": pl.Float64,
+}
+
+# Pasos del orquestador de seeds que cambian la población
+_PASOS_SEED = ("geografia", "poblacion")
+
+# Año asignado a departamento.poblacion (censo 2022) si no hay referencia
+_ANIO_CENSO_DEPARTAMENTO = 2022
+
+_SQL_CARGA = """
+    SELECT id_provincia_indec, id_departamento_indec, sexo, grupo_etario, anio,
+           poblacion
+    FROM poblacion_referencia
+    UNION ALL
+    SELECT d.id_provincia_indec, d.id_departamento_indec, :sexo_total,
+           :grupo_total, :anio_censo, d.poblacion
+    FROM departamento d
+    WHERE d.poblacion IS NOT NULL
+      AND NOT EXISTS (
+          SELECT 1 FROM poblacion_referencia p
+          WHERE p.id_provincia_indec = d.id_provincia_indec
+            AND p.id_departamento_indec = d.id_departamento_indec
+      )
+"""
+
+
+def _estimar(censos: pl.DataFrame, anios: list[int]) -> pl.DataFrame:
+    """
+    Población estimada de cada clave para cada año pedido.
+
+    Interpolación geométrica entre los censos que rodean al año; fuera del
+    rango, proyección con el factor de crecimiento anual de la clave.
+    """
+    factor_defecto = 1.0 + settings.POBLACION_CRECIMIENTO_ANUAL
+    por_clave = (
+        censos.group_by(CLAVES)
+        .agg(
+            pl.col("anio").min().alias("_anio_min"),
+            pl.col("anio").max().alias("_anio_max"),
+            pl.col("poblacion").sort_by("anio").first().alias("_pob_min"),
+            pl.col("poblacion").sort_by("anio").last().alias("_pob_max"),
+        )
+        .with_columns(
+            pl.when(
+                (pl.col("_anio_max") > pl.col("_anio_min")) & (pl.col("_pob_min") > 0)
+            )
+            .then(
+                (pl.col("_pob_max") / pl.col("_pob_min"))
+                ** (1 / (pl.col("_anio_max") - pl.col("_anio_min")))
+            )
+            .otherwise(factor_defecto)
+            .alias("_factor")
+        )
+        .select(*CLAVES, "_factor")
+    )
+
+    objetivos = por_clave.join(
+        pl.DataFrame({"anio": anios}, schema={"anio": pl.Int64}), how="cross"
+    ).sort("anio")
+    puntos = censos.sort("anio")
+    anteriores = puntos.select(
+        *CLAVES,
+        pl.col("anio").alias("_anio_ant"),
+        pl.col("poblacion").alias("_pob_ant"),
+    )
+    siguientes = puntos.select(
+        *CLAVES,
+        pl.col("anio").alias("_anio_sig"),
+        pl.col("poblacion").alias("_pob_sig"),
+    )
+    # Ambos lados ya están ordenados por año
+    estimados = objetivos.join_asof(
+        anteriores,
+        left_on="anio",
+        right_on="_anio_ant",
+        by=CLAVES,
+        strategy="backward",
+        check_sortedness=False,
+    ).join_asof(
+        siguientes,
+        left_on="anio",
+        right_on="_anio_sig",
+        by=CLAVES,
+        strategy="forward",
+        check_sortedness=False,
+    )
+
+    anio = pl.col("anio")
+    return estimados.select(
+        *CLAVES,
+        anio,
+        pl.when(
+            pl.col("_anio_sig").is_not_null()
+            & (pl.col("_anio_sig") > pl.col("_anio_ant"))
+            & (pl.col("_pob_ant") > 0)
+        )
+        .then(
+            pl.col("_pob_ant")
+            * (pl.col("_pob_sig") / pl.col("_pob_ant"))
+            ** (
+                (anio - pl.col("_anio_ant"))
+                / (pl.col("_anio_sig") - pl.col("_anio_ant"))
+            )
+        )
+        .when(pl.col("_anio_ant").is_not_null())
+        .then(pl.col("_pob_ant") * pl.col("_factor") ** (anio - pl.col("_anio_ant")))
+        .otherwise(
+            pl.col("_pob_sig") * pl.col("_factor") ** (anio - pl.col("_anio_sig"))
+        )
+        .alias("poblacion"),
+    )
+
+
+class TablaPoblacion:
+    """Población de referencia en memoria (inmutable salvo por el memo de años)."""
+
+    def __init__(self, censos: pl.DataFrame, version: str | None) -> None:
+        self.censos = censos
+        self.version = version
+        self._por_anio: dict[int, pl.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def estimar(self, anios: Iterable[int]) -> pl.DataFrame:
+        """Población estimada por clave para los años dados (columnas CLAVES, anio, poblacion)."""
+        anios = sorted(set(anios))
+        with self._lock:
+            faltantes = [a for a in anios if a not in self._por_anio]
+            if faltantes and not self.censos.is_empty():
+                estimados = _estimar(self.censos, faltantes)
+                for (anio,), frame in estimados.partition_by(
+                    "anio", as_dict=True
+                ).items():
+                    self._por_anio[int(anio)] = frame  # type: ignore[call-overload]
+            frames = [self._por_anio[a] for a in anios if a in self._por_anio]
+        if not frames:
+            return pl.DataFrame(schema=_ESQUEMA)
+        return pl.concat(frames)
+
+    def poblacion(
+        self,
+        anio: int | None = None,
+        id_provincia_indec: int | None = None,
+        id_departamento_indec: int | None = None,
+        sexo: str = SEXO_TOTAL,
+        grupo_etario: str = GRUPO_ETARIO_TOTAL,
+    ) -> float:
+        """
+        Población de un área (None en provincia/departamento = todas).
+
+        Args:
+            anio: Año de referencia (default: año actual)
+            id_provincia_indec: Provincia
+            id_departamento_indec: Departamento (requiere provincia)
+            sexo: T, M o F
+            grupo_etario: Etiqueta del grupo etario o "total"
+
+        Returns:
+            Habitantes estimados (0 si no hay datos)
+        """
+        frame = self.estimar([anio or date.today().year]).filter(
+            (pl.col("sexo") == sexo) & (pl.col("grupo_etario") == grupo_etario)
+        )
+        if id_provincia_indec is not None:
+            frame = frame.filter(pl.col("id_provincia_indec") == id_provincia_indec)
+        if id_departamento_indec is not None:
+            frame = frame.filter(
+                pl.col("id_departamento_indec") == id_departamento_indec
+            )
+        return float(frame["poblacion"].sum())
+
+    def agregar_tasas(
+        self,
+        df: pl.DataFrame,
+        casos: str = "casos",
+        por: int = AJUSTE_HAB,
+        anio: int | None = None,
+        columna: str = "tasa",
+    ) -> pl.DataFrame:
+        """
+        Agrega ``poblacion`` y la tasa a un frame de resultados.
+
+        El nivel de agregación sale de las columnas presentes: las claves
+        (``id_provincia_indec``, ``id_departamento_indec``, ``sexo``,
+        ``grupo_etario``) que falten se suman, usando los totales de sexo y
+        grupo etario. Si el frame tiene ``anio`` cada fila usa la población
+        de su año; si no, la de ``anio`` (default: año actual).
+
+        Args:
+            df: Frame con las claves del nivel y la columna de casos
+            casos: Columna con los casos (numerador)
+            por: Factor de la tasa (100.000 habitantes)
+            anio: Año de referencia si el frame no tiene columna ``anio``
+            columna: Nombre de la columna de la tasa
+
+        Returns:
+            El frame con ``poblacion`` y la tasa (null sin población)
+        """
+        niveles = [c for c in CLAVES if c in df.columns]
+        con_anio = "anio" in df.columns
+        if con_anio:
+            anios = [int(a) for a in df["anio"].drop_nulls().unique()]
+        else:
+            anios = [anio or date.today().year]
+
+        denominadores = self.estimar(anios)
+        if "sexo" not in df.columns:
+            denominadores = denominadores.filter(pl.col("sexo") == SEXO_TOTAL)
+        if "grupo_etario" not in df.columns:
+            denominadores = denominadores.filter(
+                pl.col("grupo_etario") == GRUPO_ETARIO_TOTAL
+            )
+
+        grupo = [*niveles, "anio"] if con_anio else niveles
+        if grupo:
+            denominadores = denominadores.group_by(grupo).agg(pl.col("poblacion").sum())
+            denominadores = denominadores.with_columns(
+                pl.col(c).cast(df.schema[c]) for c in grupo
+            )
+            resultado = df.join(denominadores, on=grupo, how="left")
+        else:
+            resultado = df.with_columns(
+                pl.lit(float(denominadores["poblacion"].sum())).alias("poblacion")
+            )
+
+        return resultado.with_columns(
+            pl.when(pl.col("poblacion") > 0)
+            .then(pl.col(casos) / pl.col("poblacion") * por)
+            .otherwise(None)
+            .alias(columna)
+        )
+
+    def tasas_ajustadas_por_edad(
+        self,
+        df: pl.DataFrame,
+        casos: str = "casos",
+        por: int = AJUSTE_HAB,
+        estandar: str | None = None,
+        anio: int | None = None,
+        columna: str = "tasa_ajustada",
+    ) -> pl.DataFrame:
+        """
+        Tasas ajustadas por edad (método directo) contra una población estándar.
+
+        ``df`` tiene una fila por grupo etario (etiquetas de
+        ``GRUPOS_EDAD_ESTANDAR``) y las demás claves o ``anio`` por las que
+        se agrupa el resultado. Cada tasa específica se pondera por el peso
+        del grupo en la población estándar; los grupos sin casos aportan 0.
+        Si algún grupo con casos no tiene población (no se cargaron
+        denominadores por edad) la tasa del área queda en null.
+
+        Args:
+            df: Casos por grupo etario y área
+            casos: Columna con los casos
+            por: Factor de la tasa
+            estandar: Población estándar (default: ``POBLACION_ESTANDAR``)
+            anio: Año de referencia si el frame no tiene columna ``anio``
+            columna: Nombre de la columna de la tasa ajustada
+
+        Returns:
+            Una fila por área con los casos totales y la tasa ajustada
+        """
+        if "grupo_etario" not in df.columns:
+            raise ValueError("Se necesita la columna 'grupo_etario'")
+        nombre = estandar or settings.POBLACION_ESTANDAR
+        if nombre not in POBLACIONES_ESTANDAR:
+            raise ValueError(f"Población estándar desconocida: {nombre}")
+
+        estandar_grupos = POBLACIONES_ESTANDAR[nombre]
+        total_estandar = sum(estandar_grupos.values())
+        pesos = pl.DataFrame(
+            {
+                "grupo_etario": list(estandar_grupos),
+                "_peso": [v / total_estandar for v in estandar_grupos.values()],
+            }
+        ).with_columns(pl.col("grupo_etario").cast(df.schema["grupo_etario"]))
+
+        especificas = self.agregar_tasas(
+            df, casos=casos, por=1, anio=anio, columna="_tasa_especifica"
+        ).join(pesos, on="grupo_etario", how="inner")
+
+        grupo = [
+            c for c in (*CLAVES, "anio") if c in df.columns and c != "grupo_etario"
+        ]
+        agregados = [
+            pl.col(casos).sum(),
+            pl.when(pl.col("_tasa_especifica").is_null().any())
+            .then(None)
+            .otherwise((pl.col("_tasa_especifica") * pl.col("_peso")).sum() * por)
+            .alias(columna),
+        ]
+        if grupo:
+            return especificas.group_by(grupo, maintain_order=True).agg(agregados)
+        return especificas.select(agregados)
+
+
+# ===== CACHE DEL PROCESO =====
+
+_tabla: TablaPoblacion | None = None
+_verificada_en = 0.0
+_lock_carga = asyncio.Lock()
+
+
+async def _version_seed(db: AsyncSession) -> str | None:
+    """Hashes de los seeds de población, o None si no hay ``seed_estado``."""
+    existe = await db.execute(text("SELECT to_regclass('seed_estado') IS NOT NULL"))
+    if not existe.scalar():
+        return None
+    resultado = await db.execute(
+        text("""
+            SELECT string_agg(paso || ':' || hash, ',' ORDER BY paso)
+            FROM seed_estado
+            WHERE paso = ANY(:pasos)
+        """),
+        {"pasos": list(_PASOS_SEED)},
+    )
+    return resultado.scalar()
+
+
+async def _cargar(db: AsyncSession, version: str | None) -> TablaPoblacion:
+    inicio = time.perf_counter()
+    resultado = await db.execute(
+        text(_SQL_CARGA),
+        {
+            "sexo_total": SEXO_TOTAL,
+            "grupo_total": GRUPO_ETARIO_TOTAL,
+            "anio_censo": _ANIO_CENSO_DEPARTAMENTO,
+        },
+    )
+    censos = pl.DataFrame(
+        [tuple(fila) for fila in resultado.all()], schema=_ESQUEMA, orient="row"
+    )
+    logger.info(
+        f"👥 Población de referencia cargada: {censos.height} filas "
+        f"en {(time.perf_counter() - inicio) * 1000:.0f} ms (versión {version})"
+    )
+    return TablaPoblacion(censos, version)
+
+
+async def obtener_poblacion(db: AsyncSession) -> TablaPoblacion:
+    """Tabla de población del proceso, recargada si cambió el seed."""
+    global _tabla, _verificada_en
+
+    if (
+        _tabla is not None
+        and time.monotonic() - _verificada_en < settings.POBLACION_VERIFICAR_SEGUNDOS
+    ):
+        return _tabla
+
+    async with _lock_carga:
+        # Otro request pudo haberla recargado mientras esperaba el lock
+        if (
+            _tabla is not None
+            and time.monotonic() - _verificada_en
+            < settings.POBLACION_VERIFICAR_SEGUNDOS
+        ):
+            return _tabla
+
+        version = await _version_seed(db)
+        if _tabla is None or version is None or version != _tabla.version:
+            _tabla = await _cargar(db, version)
+        _verificada_en = time.monotonic()
+        return _tabla
+
+
+def invalidar_poblacion() -> None:
+    """Fuerza la recarga de la población en la próxima consulta."""
+    global _tabla, _verificada_en
+    _tabla = None
+    _verificada_en = 0.0
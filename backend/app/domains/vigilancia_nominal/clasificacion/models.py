@@ -406,7 +406,6 @@ class EventClassificationAudit(BaseModel, table=True):
 
     # Relación con evento y estrategia
     id_caso: int = Field(
-        foreign_key="caso_epidemiologico.id",
         index=True,
         description="ID del evento clasificado",
     )
@@ -0,0 +1,791 @@
+"""
+Reclasificación masiva de casos almacenados.
+
+Cuando una estrategia se activa o se edita, los casos ya cargados conservan la
+clasificación calculada en la ingesta. Este módulo re-evalúa todos los casos de
+la enfermedad dentro de la ventana de validez de la estrategia, por lotes y sin
+recorrer filas en Python:
+
+- Modo SQL: cada condición se traduce a un predicado sobre columnas almacenadas
+  y cada lote se resuelve con un único ``UPDATE ... FROM`` con ``CASE``.
+- Modo Polars: si alguna condición no tiene traducción exacta (regex), los
+  valores se traen por lotes (keyset sobre ``id``) y las reglas se evalúan con
+  expresiones vectorizadas. La escritura es el mismo UPDATE set-based.
+
+Ambos modos replican la semántica de ``SyncEventClassificationService``: reglas
+activas por prioridad, condiciones combinadas en orden con AND/OR, la primera
+regla que se cumple gana y el resto queda como REQUIERE_REVISION.
+
+Una sola corrida por enfermedad a la vez: un advisory lock sobre la enfermedad
+se mantiene durante toda la corrida, aunque cada lote haga su propio commit.
+
+Los campos del CSV se leen desde su columna almacenada (``CAMPOS_ALMACENADOS``).
+Los campos de tablas hijas (estudios, internaciones) se cumplen si alguna fila
+hija cumple. Los campos sin columna propia se leen de ``datos_originales_csv``;
+los casos que no lo tienen quedan fuera del alcance.
+"""
+
+import json
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+import polars as pl
+from sqlalchemy import text
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, col, select
+
+from app.core.search import UNACCENT_FUNCTION
+from app.domains.jobs.models import Job
+from app.domains.vigilancia_nominal.clasificacion.models import (
+    ClassificationRule,
+    EstrategiaClasificacion,
+    FilterCondition,
+    TipoClasificacion,
+    TipoFiltro,
+)
+from app.domains.vigilancia_nominal.queries.resumen_ciudadanos import (
+    refrescar_resumen_ciudadanos,
+)
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPE_RECLASIFICACION = "reclasificacion"
+
+# Espacio del advisory lock por enfermedad (ver ``_bloquear_enfermedad``)
+LOCK_RECLASIFICACION = "reclasificacion"
+
+# Casos por lote: cada lote es una sentencia (y un commit si no es dry-run)
+TAMANO_LOTE = 20_000
+
+# Ids de ejemplo que se guardan por cada transición (desde → hasta)
+EJEMPLOS_POR_TRANSICION = 5
+
+ProgressCallback = Callable[[int, str], None]
+
+
+@dataclass(frozen=True)
+class CampoAlmacenado:
+    """
+    Dónde vive un campo del CSV una vez cargado.
+
+    ``expresion`` es SQL sobre ``ce`` (caso_epidemiologico) y ``enf``
+    (enfermedad). Si el campo es multi-valor, ``tabla_hija``/``union``
+    indican la tabla hija y su condición de unión con ``ce``.
+    """
+
+    expresion: str
+    tabla_hija: str | None = None
+    union: str | None = None
+
+    @property
+    def es_multivalor(self) -> bool:
+        return self.tabla_hija is not None
+
+
+CAMPOS_ALMACENADOS: dict[str, CampoAlmacenado] = {
+    "CLASIFICACION_MANUAL": CampoAlmacenado("ce.clasificacion_manual"),
+    "IDEVENTOCASO": CampoAlmacenado("ce.id_snvs::text"),
+    "EVENTO": CampoAlmacenado("enf.nombre"),
+    "RESULTADO": CampoAlmacenado(
+        "est.resultado",
+        tabla_hija=(
+            "estudio_caso_epidemiologico est "
+            "JOIN muestra_caso_epidemiologico mce "
+            "ON mce.id = est.id_muestra AND mce.anio_epi_caso = est.anio_epi_caso"
+        ),
+        union=(
+            "mce.id_caso = ce.id AND mce.anio_epi_caso = ce.fecha_minima_caso_anio_epi"
+        ),
+    ),
+    "FALLECIDO": CampoAlmacenado(
+        "CASE WHEN ice.es_fallecido THEN 'SI' WHEN NOT ice.es_fallecido THEN 'NO' END",
+        tabla_hija="internacion_caso_epidemiologico ice",
+        union="ice.id_caso = ce.id",
+    ),
+}
+
+
+def _normalizar_sql(expresion: str) -> str:
+    """Equivalente SQL de ``SyncEventClassificationService.normalize_text``."""
+    return (
+        f"btrim(regexp_replace(lower({UNACCENT_FUNCTION}({expresion})), "
+        f"'\\s+', ' ', 'g'))"
+    )
+
+
+def _regex_valida_polars(patron: str) -> bool:
+    try:
+        pl.Series([""]).str.contains(patron)
+    except Exception:
+        return False
+    return True
+
+
+@dataclass
+class CondicionCompilada:
+    """Condición de una regla lista para SQL o para Polars."""
+
+    condicion: FilterCondition
+    campo: CampoAlmacenado
+    alias: str
+    # Predicado SQL (None = se evalúa en Polars sobre ``alias``)
+    predicado_sql: str | None
+
+    @property
+    def operador(self) -> str:
+        return "OR" if self.condicion.logical_operator == "OR" else "AND"
+
+    def columna_sql(self) -> str:
+        """Columna del SELECT por lote: booleano o valor(es) crudos."""
+        if self.predicado_sql is not None:
+            return f"{self.predicado_sql} AS {self.alias}"
+        if self.campo.es_multivalor:
+            return (
+                f"ARRAY(SELECT ({self.campo.expresion})::text "
+                f"FROM {self.campo.tabla_hija} WHERE {self.campo.union}) "
+                f"AS {self.alias}"
+            )
+        return f"({self.campo.expresion})::text AS {self.alias}"
+
+    def tipo_polars(self) -> pl.DataType:
+        if self.predicado_sql is not None:
+            return pl.Boolean()
+        return pl.List(pl.Utf8) if self.campo.es_multivalor else pl.Utf8()
+
+    def mascara_polars(self) -> pl.Expr:
+        if self.predicado_sql is not None:
+            return pl.col(self.alias)
+        if self.campo.es_multivalor:
+            return (
+                pl.col(self.alias)
+                .list.eval(self._predicado_polars(pl.element()).fill_null(False))
+                .list.any()
+                .fill_null(False)
+            )
+        return self._predicado_polars(pl.col(self.alias)).fill_null(False)
+
+    def _predicado_polars(self, valor: pl.Expr) -> pl.Expr:
+        """Predicado vectorizado de las condiciones sin traducción SQL exacta."""
+        config = self.condicion.config or {}
+        if self.condicion.filter_type == TipoFiltro.REGEX_EXTRACCION:
+            # pandas str.match: anclado al inicio
+            return valor.str.contains(f"^(?:{config.get('pattern', '')})")
+        # CAMPO_CONTIENE estricto: pandas str.contains interpreta el valor como regex
+        patron = str(config.get("value", ""))
+        if not config.get("case_sensitive", True):
+            patron = f"(?i){patron}"
+        return valor.str.contains(patron)
+
+
+@dataclass
+class ReglaCompilada:
+    regla: ClassificationRule
+    condiciones: list[CondicionCompilada]
+
+    def combinar(self, predicados: list[Any], verdadero: Any) -> Any:
+        """Combina predicados en orden como ``_apply_rule`` (acumulado AND/OR)."""
+        mascara = verdadero
+        for condicion, predicado in zip(self.condiciones, predicados, strict=True):
+            if condicion.operador == "OR":
+                mascara = mascara | predicado
+            else:
+                mascara = mascara & predicado
+        return mascara
+
+
+class _CombinadorSQL:
+    """Envuelve SQL para poder reutilizar ``ReglaCompilada.combinar``."""
+
+    def __init__(self, sql: str) -> None:
+        self.sql = sql
+
+    def __and__(self, otro: "_CombinadorSQL") -> "_CombinadorSQL":
+        return _CombinadorSQL(f"({self.sql} AND {otro.sql})")
+
+    def __or__(self, otro: "_CombinadorSQL") -> "_CombinadorSQL":
+        return _CombinadorSQL(f"({self.sql} OR {otro.sql})")
+
+
+@dataclass
+class PlanReclasificacion:
+    """Estrategia traducida: reglas compiladas, alcance y parámetros SQL."""
+
+    estrategia: EstrategiaClasificacion
+    reglas: list[ReglaCompilada]
+    alcance_sql: str
+    params: dict[str, Any] = field(default_factory=dict)
+    campos_desde_csv: list[str] = field(default_factory=list)
+
+    @property
+    def condiciones(self) -> list[CondicionCompilada]:
+        return [c for regla in self.reglas for c in regla.condiciones]
+
+    @property
+    def modo(self) -> str:
+        if all(c.predicado_sql is not None for c in self.condiciones):
+            return "sql"
+        return "polars"
+
+    def reglas_json(self) -> str:
+        return json.dumps(
+            [
+                {
+                    "id": r.regla.id,
+                    "nombre": r.regla.name,
+                    "prioridad": r.regla.priority,
+                }
+                for r in self.reglas
+            ]
+        )
+
+
+class CompiladorReglas:
+    """Traduce las reglas de una estrategia a predicados sobre casos almacenados."""
+
+    def __init__(self, estrategia: EstrategiaClasificacion) -> None:
+        self.estrategia = estrategia
+        self.params: dict[str, Any] = {}
+        self.campos_desde_csv: list[str] = []
+        self._total_condiciones = 0
+        config = estrategia.config if isinstance(estrategia.config, dict) else {}
+        # column_mapping renombra columnas del CSV antes de evaluar las reglas
+        self._nombres_originales = {
+            destino: origen
+            for origen, destino in (config.get("column_mapping") or {}).items()
+        }
+
+    def compilar(self) -> PlanReclasificacion:
+        reglas = sorted(
+            [r for r in self.estrategia.classification_rules if r.is_active],
+            key=lambda r: r.priority,
+        )
+        for regla in reglas:
+            # Valida antes de escribir: el UPDATE castea al enum
+            TipoClasificacion(regla.classification)
+
+        compiladas = [
+            ReglaCompilada(
+                regla,
+                [
+                    self._compilar_condicion(condicion)
+                    for condicion in sorted(
+                        regla.filters, key=lambda c: (c.order, c.id or 0)
+                    )
+                ],
+            )
+            for regla in reglas
+        ]
+
+        self.params["id_enfermedad"] = self.estrategia.id_enfermedad
+        self.params["valido_desde"] = self.estrategia.valid_from.date()
+        condiciones = [
+            "ce.id_enfermedad = :id_enfermedad",
+            "ce.fecha_minima_caso >= :valido_desde",
+        ]
+        if self.estrategia.valid_until is not None:
+            self.params["valido_hasta"] = self.estrategia.valid_until.date()
+            condiciones.append("ce.fecha_minima_caso <= :valido_hasta")
+        if self.campos_desde_csv:
+            condiciones.append("ce.datos_originales_csv IS NOT NULL")
+
+        return PlanReclasificacion(
+            estrategia=self.estrategia,
+            reglas=compiladas,
+            alcance_sql=" AND ".join(condiciones),
+            params=self.params,
+            campos_desde_csv=sorted(set(self.campos_desde_csv)),
+        )
+
+    def _param(self, valor: Any) -> str:
+        nombre = f"p{len(self.params)}"
+        self.params[nombre] = valor
+        return f":{nombre}"
+
+    def _resolver_campo(self, nombre: str) -> CampoAlmacenado:
+        nombre = self._nombres_originales.get(nombre, nombre)
+        if nombre in CAMPOS_ALMACENADOS:
+            return CAMPOS_ALMACENADOS[nombre]
+        self.campos_desde_csv.append(nombre)
+        return CampoAlmacenado(f"(ce.datos_originales_csv ->> {self._param(nombre)})")
+
+    def _compilar_condicion(self, condicion: FilterCondition) -> CondicionCompilada:
+        campo = self._resolver_campo(condicion.field_name)
+        self._total_condiciones += 1
+        alias = f"c{self._total_condiciones}"
+        predicado = self._predicado_sql(condicion, campo.expresion)
+
+        if predicado is not None and campo.es_multivalor:
+            predicado = (
+                f"EXISTS (SELECT 1 FROM {campo.tabla_hija} "
+                f"WHERE {campo.union} AND {predicado})"
+            )
+        if predicado is not None:
+            predicado = f"COALESCE({predicado}, FALSE)"
+
+        return CondicionCompilada(condicion, campo, alias, predicado)
+
+    def _predicado_sql(self, condicion: FilterCondition, valor: str) -> str | None:
+        """Predicado SQL de la condición, o None si requiere Polars."""
+        # El servicio sync usa pandas: se importa al compilar, no al arrancar
+        from app.domains.vigilancia_nominal.clasificacion.sync_services import (
+            SyncEventClassificationService,
+        )
+
+        config = condicion.config or {}
+        estricto = config.get("strict", False)
+        normalizar = SyncEventClassificationService.normalize_text
+        tipo = condicion.filter_type
+
+        if tipo == TipoFiltro.CAMPO_IGUAL:
+            esperado = str(config.get("value", ""))
+            if estricto:
+                return f"({valor})::text = {self._param(esperado)}"
+            return f"{_normalizar_sql(f'({valor})::text')} = {self._param(normalizar(esperado))}"
+
+        if tipo == TipoFiltro.CAMPO_EN_LISTA:
+            valores = config.get("values", [])
+            if not isinstance(valores, list):
+                valores = [v.strip() for v in str(valores).split(",")]
+            if estricto:
+                lista = [str(v) for v in valores]
+                return f"({valor})::text = ANY({self._param(lista)})"
+            lista = [normalizar(str(v)) for v in valores]
+            return f"{_normalizar_sql(f'({valor})::text')} = ANY({self._param(lista)})"
+
+        if tipo == TipoFiltro.CAMPO_CONTIENE:
+            if estricto:
+                return None
+            buscado = normalizar(str(config.get("value", "")))
+            return f"strpos({_normalizar_sql(f'({valor})::text')}, {self._param(buscado)}) > 0"
+
+        if tipo == TipoFiltro.CAMPO_EXISTE:
+            return f"NULLIF(btrim(({valor})::text), '') IS NOT NULL"
+
+        if tipo == TipoFiltro.CAMPO_NO_NULO:
+            return f"({valor}) IS NOT NULL"
+
+        if tipo == TipoFiltro.REGEX_EXTRACCION:
+            patron = config.get("pattern", "")
+            if patron and _regex_valida_polars(f"^(?:{patron})"):
+                return None
+            return "FALSE"
+
+        # CUSTOM_FUNCTION, DETECTOR_TIPO_SUJETO, EXTRACTOR_METADATA: no clasifican
+        return "FALSE"
+
+
+class ReclasificadorCasos:
+    """
+    Re-evalúa los casos almacenados de una estrategia por lotes.
+
+    No depende de Celery: recibe una sesión sync y un callback de progreso
+    ``(porcentaje, mensaje)`` con la misma firma que los processors de jobs.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        progress_callback: ProgressCallback | None = None,
+        tamano_lote: int = TAMANO_LOTE,
+    ) -> None:
+        self.session = session
+        self.progress_callback = progress_callback
+        self.tamano_lote = tamano_lote
+
+    def ejecutar(
+        self, id_estrategia: int, dry_run: bool = False, job_id: str | None = None
+    ) -> dict[str, Any]:
+        """
+        Reclasifica (o simula) los casos alcanzados por una estrategia.
+
+        Args:
+            id_estrategia: Estrategia a aplicar
+            dry_run: Solo calcular el diff, sin escribir
+            job_id: Job que se registra en la trazabilidad
+
+        Returns:
+            Resumen con totales y transiciones ``desde → hasta``
+        """
+        with self._bloquear_enfermedad(id_estrategia):
+            # Se carga con el lock tomado: si esperó a otra corrida, usa las
+            # reglas vigentes al arrancar
+            estrategia = self._cargar_estrategia(id_estrategia)
+            return self._reclasificar(estrategia, dry_run, job_id)
+
+    @contextmanager
+    def _bloquear_enfermedad(self, id_estrategia: int) -> Iterator[None]:
+        """
+        Advisory lock sobre la enfermedad de la estrategia durante toda la corrida.
+
+        Dos corridas sobre la misma enfermedad (por ejemplo, dos ediciones
+        seguidas de la estrategia) se pisarían lote a lote. Cada lote hace
+        commit, así que un lock de transacción no alcanza: se toma un lock de
+        sesión en una conexión propia en autocommit, que no cambia entre lotes
+        ni queda con una transacción abierta.
+        """
+        with (
+            self.session.get_bind()
+            .connect()
+            .execution_options(isolation_level="AUTOCOMMIT") as conexion
+        ):
+            id_enfermedad = conexion.execute(
+                select(col(EstrategiaClasificacion.id_enfermedad)).where(
+                    col(EstrategiaClasificacion.id) == id_estrategia
+                )
+            ).scalar_one_or_none()
+            if id_enfermedad is None:
+                raise ValueError(f"Estrategia {id_estrategia} no encontrada")
+
+            params = {"espacio": LOCK_RECLASIFICACION, "id": id_enfermedad}
+            tomado = conexion.execute(
+                text("SELECT pg_try_advisory_lock(hashtext(:espacio), :id)"),
+                params,
+            ).scalar_one()
+            if not tomado:
+                logger.info(
+                    f"Esperando otra reclasificación de la enfermedad {id_enfermedad}"
+                )
+                conexion.execute(
+                    text("SELECT pg_advisory_lock(hashtext(:espacio), :id)"),
+                    params,
+                )
+            try:
+                yield
+            finally:
+                conexion.execute(
+                    text("SELECT pg_advisory_unlock(hashtext(:espacio), :id)"),
+                    params,
+                )
+
+    def _reclasificar(
+        self,
+        estrategia: EstrategiaClasificacion,
+        dry_run: bool,
+        job_id: str | None,
+    ) -> dict[str, Any]:
+        inicio = time.perf_counter()
+        plan = CompiladorReglas(estrategia).compilar()
+
+        total = self.session.execute(
+            text(
+                f"SELECT count(*) FROM caso_epidemiologico ce WHERE {plan.alcance_sql}"
+            ),
+            plan.params,
+        ).scalar_one()
+        logger.info(
+            f"Reclasificando {total} casos con estrategia {estrategia.id} "
+            f"(modo {plan.modo}, dry_run={dry_run})"
+        )
+
+        transiciones: dict[tuple[str | None, str], dict[str, Any]] = {}
+        evaluados = 0
+        actualizados = 0
+        ultimo_id = 0
+
+        while True:
+            if plan.modo == "sql":
+                evaluado_sql, params = self._evaluado_sql(plan, ultimo_id)
+            else:
+                evaluado_sql, params = self._evaluado_polars(plan, ultimo_id)
+                if evaluado_sql is None:
+                    break
+
+            filas = self.session.execute(
+                text(self._consulta_lote(evaluado_sql, dry_run)),
+                {
+                    **params,
+                    "id_estrategia": estrategia.id,
+                    "estrategia_nombre": estrategia.name,
+                    "reglas": plan.reglas_json(),
+                    "job_id": job_id,
+                },
+            ).all()
+            if not filas:
+                break
+
+            # El conteo de actualizados es del lote: se repite en cada grupo
+            actualizados += filas[0].actualizados or 0
+            codigos: set[int] = set()
+            for fila in filas:
+                evaluados += fila.casos
+                ultimo_id = max(ultimo_id, fila.ultimo_id)
+                codigos.update(fila.ciudadanos or [])
+                if fila.actual == fila.nueva:
+                    continue
+                transicion = transiciones.setdefault(
+                    (fila.actual, fila.nueva),
+                    {
+                        "desde": fila.actual,
+                        "hasta": fila.nueva,
+                        "casos": 0,
+                        "ejemplos": [],
+                    },
+                )
+                transicion["casos"] += fila.casos
+                faltan = EJEMPLOS_POR_TRANSICION - len(transicion["ejemplos"])
+                transicion["ejemplos"].extend((fila.ejemplos or [])[:faltan])
+
+            if not dry_run:
+                if codigos:
+                    refrescar_resumen_ciudadanos(self.session, list(codigos))
+                self.session.commit()
+
+            self._reportar(evaluados, total, dry_run)
+
+        if dry_run:
+            self.session.rollback()
+
+        return {
+            "id_estrategia": estrategia.id,
+            "id_enfermedad": estrategia.id_enfermedad,
+            "dry_run": dry_run,
+            "modo": plan.modo,
+            "casos_evaluados": evaluados,
+            "casos_reclasificados": sum(t["casos"] for t in transiciones.values()),
+            "casos_actualizados": actualizados,
+            "transiciones": sorted(
+                transiciones.values(), key=lambda t: t["casos"], reverse=True
+            ),
+            "campos_desde_csv_original": plan.campos_desde_csv,
+            "duracion_segundos": round(time.perf_counter() - inicio, 2),
+        }
+
+    def _cargar_estrategia(self, id_estrategia: int) -> EstrategiaClasificacion:
+        estrategia = (
+            self.session.execute(
+                select(EstrategiaClasificacion)
+                .where(col(EstrategiaClasificacion.id) == id_estrategia)
+                .options(
+                    selectinload(
+                        EstrategiaClasificacion.classification_rules
+                    ).selectinload(ClassificationRule.filters)
+                )
+            )
+            .scalars()
+            .first()
+        )
+        if not estrategia:
+            raise ValueError(f"Estrategia {id_estrategia} no encontrada")
+        return estrategia
+
+    def _lote_sql(self, plan: PlanReclasificacion) -> str:
+        return f"""
+            SELECT ce.id FROM caso_epidemiologico ce
+            WHERE {plan.alcance_sql} AND ce.id > :ultimo_id
+            ORDER BY ce.id
+            LIMIT :tamano_lote
+        """
+
+    def _evaluado_sql(
+        self, plan: PlanReclasificacion, ultimo_id: int
+    ) -> tuple[str, dict[str, Any]]:
+        """CTE ``evaluado`` con la clasificación nueva calculada en SQL."""
+        casos_clasificacion = []
+        casos_regla = []
+        for regla in plan.reglas:
+            predicado = regla.combinar(
+                [_CombinadorSQL(c.predicado_sql or "FALSE") for c in regla.condiciones],
+                _CombinadorSQL("TRUE"),
+            ).sql
+            casos_clasificacion.append(
+                f"WHEN {predicado} THEN '{regla.regla.classification}'"
+            )
+            casos_regla.append(f"WHEN {predicado} THEN {int(regla.regla.id or 0)}")
+
+        nueva = (
+            f"CASE {' '.join(casos_clasificacion)} "
+            f"ELSE '{TipoClasificacion.REQUIERE_REVISION.value}' END"
+            if casos_clasificacion
+            else f"'{TipoClasificacion.REQUIERE_REVISION.value}'"
+        )
+        id_regla = f"CASE {' '.join(casos_regla)} END" if casos_regla else "NULL::int"
+
+        evaluado = f"""
+            lote AS ({self._lote_sql(plan)}),
+            evaluado AS (
+                SELECT
+                    ce.id,
+                    ce.codigo_ciudadano,
+                    ce.clasificacion_estrategia::text AS actual,
+                    ce.id_estrategia_aplicada AS estrategia_actual,
+                    {nueva} AS nueva,
+                    {id_regla} AS id_regla
+                FROM lote
+                JOIN caso_epidemiologico ce ON ce.id = lote.id
+                LEFT JOIN enfermedad enf ON enf.id = ce.id_enfermedad
+            )
+        """
+        return evaluado, {
+            **plan.params,
+            "ultimo_id": ultimo_id,
+            "tamano_lote": self.tamano_lote,
+        }
+
+    def _evaluado_polars(
+        self, plan: PlanReclasificacion, ultimo_id: int
+    ) -> tuple[str | None, dict[str, Any]]:
+        """Trae un lote, evalúa las reglas en Polars y arma ``evaluado`` con unnest."""
+        condiciones = plan.condiciones
+        columnas = ",\n".join(c.columna_sql() for c in condiciones)
+        consulta = f"""
+            WITH lote AS ({self._lote_sql(plan)})
+            SELECT
+                ce.id,
+                ce.codigo_ciudadano,
+                ce.clasificacion_estrategia::text AS actual,
+                ce.id_estrategia_aplicada AS estrategia_actual
+                {"," if columnas else ""}{columnas}
+            FROM lote
+            JOIN caso_epidemiologico ce ON ce.id = lote.id
+            LEFT JOIN enfermedad enf ON enf.id = ce.id_enfermedad
+        """
+        filas = self.session.execute(
+            text(consulta),
+            {**plan.params, "ultimo_id": ultimo_id, "tamano_lote": self.tamano_lote},
+        ).all()
+        if not filas:
+            return None, {}
+
+        schema: dict[str, pl.DataType] = {
+            "id": pl.Int64(),
+            "codigo_ciudadano": pl.Int64(),
+            "actual": pl.Utf8(),
+            "estrategia_actual": pl.Int64(),
+        }
+        schema.update({c.alias: c.tipo_polars() for c in condiciones})
+        df = pl.DataFrame([tuple(f) for f in filas], schema=schema, orient="row")
+
+        nueva = pl.lit(TipoClasificacion.REQUIERE_REVISION.value)
+        id_regla = pl.lit(None, dtype=pl.Int64)
+        # Se encadena de menor a mayor prioridad: la última envoltura gana
+        for regla in reversed(plan.reglas):
+            cumple = regla.combinar(
+                [c.mascara_polars() for c in regla.condiciones], pl.lit(True)
+            )
+            nueva = (
+                pl.when(cumple)
+                .then(pl.lit(regla.regla.classification))
+                .otherwise(nueva)
+            )
+            id_regla = pl.when(cumple).then(pl.lit(regla.regla.id)).otherwise(id_regla)
+
+        df = df.select(
+            "id",
+            "codigo_ciudadano",
+            "actual",
+            "estrategia_actual",
+            nueva.alias("nueva"),
+            id_regla.cast(pl.Int64).alias("id_regla"),
+        )
+
+        evaluado = """
+            evaluado AS (
+                SELECT * FROM unnest(
+                    CAST(:ids AS bigint[]),
+                    CAST(:ciudadanos_lote AS bigint[]),
+                    CAST(:actuales AS text[]),
+                    CAST(:estrategias_actuales AS bigint[]),
+                    CAST(:nuevas AS text[]),
+                    CAST(:reglas_ids AS bigint[])
+                ) AS e(id, codigo_ciudadano, actual, estrategia_actual, nueva, id_regla)
+            )
+        """
+        return evaluado, {
+            "ids": df["id"].to_list(),
+            "ciudadanos_lote": df["codigo_ciudadano"].to_list(),
+            "actuales": df["actual"].to_list(),
+            "estrategias_actuales": df["estrategia_actual"].to_list(),
+            "nuevas": df["nueva"].to_list(),
+            "reglas_ids": df["id_regla"].to_list(),
+        }
+
+    @staticmethod
+    def _consulta_lote(evaluado_sql: str, dry_run: bool) -> str:
+        """
+        Diff del lote agrupado por transición y, si no es dry-run, el UPDATE.
+
+        Solo se escriben los casos cuya clasificación o estrategia cambia.
+        """
+        actualizado = ""
+        conteo_actualizados = "0"
+        if not dry_run:
+            actualizado = """,
+            actualizado AS (
+                UPDATE caso_epidemiologico ce SET
+                    clasificacion_estrategia = e.nueva::tipoclasificacion,
+                    id_estrategia_aplicada = :id_estrategia,
+                    trazabilidad_clasificacion = json_build_object(
+                        'razon', CASE WHEN e.id_regla IS NULL
+                            THEN 'requiere_revision' ELSE 'regla_aplicada' END,
+                        'origen', 'reclasificacion',
+                        'job_id', CAST(:job_id AS text),
+                        'estrategia_id', :id_estrategia,
+                        'estrategia_nombre', CAST(:estrategia_nombre AS text),
+                        'regla_id', e.id_regla,
+                        'regla_nombre', r.nombre,
+                        'regla_prioridad', r.prioridad,
+                        'clasificacion_aplicada', e.nueva,
+                        'clasificacion_anterior', e.actual
+                    ),
+                    updated_at = now()
+                FROM evaluado e
+                LEFT JOIN jsonb_to_recordset(CAST(:reglas AS jsonb))
+                    AS r(id bigint, nombre text, prioridad int) ON r.id = e.id_regla
+                WHERE ce.id = e.id
+                  AND (e.actual IS DISTINCT FROM e.nueva
+                       OR e.estrategia_actual IS DISTINCT FROM :id_estrategia)
+                RETURNING ce.id
+            )"""
+            conteo_actualizados = "(SELECT count(*) FROM actualizado)"
+
+        return f"""
+            WITH {evaluado_sql}{actualizado}
+            SELECT
+                e.actual,
+                e.nueva,
+                count(*) AS casos,
+                max(e.id) AS ultimo_id,
+                (array_agg(e.id ORDER BY e.id))[1:{EJEMPLOS_POR_TRANSICION}] AS ejemplos,
+                array_agg(DISTINCT e.codigo_ciudadano) FILTER (
+                    WHERE e.codigo_ciudadano IS NOT NULL
+                      AND e.actual IS DISTINCT FROM e.nueva
+                ) AS ciudadanos,
+                {conteo_actualizados} AS actualizados
+            FROM evaluado e
+            GROUP BY e.actual, e.nueva
+        """
+
+    def _reportar(self, evaluados: int, total: int, dry_run: bool) -> None:
+        if not self.progress_callback:
+            return
+        porcentaje = int(evaluados * 100 / total) if total else 100
+        accion = "Simulando" if dry_run else "Reclasificando"
+        self.progress_callback(
+            min(porcentaje, 99), f"{accion} casos: {evaluados}/{total}"
+        )
+
+
+async def encolar_reclasificacion(
+    id_estrategia: int, dry_run: bool = False, creado_por: str | None = None
+) -> Job:
+    """
+    Crea el job de reclasificación y lo lanza en Celery.
+
+    El progreso y el resumen quedan en el Job (``/uploads/jobs/{id}/status``).
+    """
+    from app.domains.jobs.services import job_service
+    from app.domains.vigilancia_nominal.clasificacion.tasks import (
+        reclasificar_casos_task,
+    )
+
+    job = await job_service.crear_job(
+        tipo_job=JOB_TYPE_RECLASIFICACION,
+        tipo_procesador="vigilancia_nominal",
+        datos_entrada={"id_estrategia": id_estrategia, "dry_run": dry_run},
+        creado_por=creado_por,
+    )
+    return await job_service.iniciar_job(job, tarea=reclasificar_casos_task)
@@ -0,0 +1,76 @@
+"""
+Celery tasks del dominio de clasificación.
+
+- reclasificar_casos_task: aplica (o simula) una estrategia sobre los casos
+  ya almacenados, reportando progreso en el Job.
+"""
+
+import json
+import logging
+from typing import Any
+
+from celery import Task
+from sqlmodel import Session
+
+from app.core.celery_app import celery_app
+from app.core.database import engine
+from app.domains.jobs.models import Job
+from app.domains.vigilancia_nominal.clasificacion.reclasificacion import (
+    ReclasificadorCasos,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    name="app.domains.vigilancia_nominal.clasificacion.tasks.reclasificar_casos",
+    bind=True,
+    queue="file_processing",
+    soft_time_limit=1800,
+    time_limit=2100,
+)
+def reclasificar_casos_task(self: Task, job_id: str) -> dict[str, Any]:
+    """
+    Reclasifica los casos de la estrategia indicada en el Job.
+
+    El progreso se guarda en una sesión propia para no mezclar sus commits
+    con los lotes de la reclasificación.
+    """
+    with Session(engine) as sesion_job:
+        job = sesion_job.get(Job, job_id)
+        if not job:
+            raise Exception(f"Job {job_id} no encontrado")
+
+        def update_progress(percentage: int, message: str) -> None:
+            try:
+                job.update_progress(percentage, message)
+                sesion_job.add(job)
+                sesion_job.commit()
+                self.update_state(
+                    state="PROGRESS",
+                    meta={"percentage": percentage, "step": message},
+                )
+            except Exception as e:
+                logger.warning(f"Error actualizando progreso: {e}")
+
+        try:
+            with Session(engine) as session:
+                resultado = ReclasificadorCasos(session, update_progress).ejecutar(
+                    job.get_input("id_estrategia"),
+                    dry_run=bool(job.get_input("dry_run", False)),
+                    job_id=job_id,
+                )
+        except Exception as e:
+            logger.error(f"Error reclasificando (job {job_id}): {e}", exc_info=True)
+            job.mark_failed(
+                f"Error reclasificando casos: {e!s}",
+                json.dumps({"error_type": type(e).__name__}, default=str),
+            )
+            sesion_job.add(job)
+            sesion_job.commit()
+            raise
+
+        job.mark_completed(**resultado)
+        sesion_job.add(job)
+        sesion_job.commit()
+        return resultado
@@ -65,9 +65,13 @@ from app.domains.vigilancia_nominal.models.salud import (
 from app.domains.vigilancia_nominal.models.sujetos import (
     Animal,
     Ciudadano,
+    CiudadanoCandidatoFusion,
+    CiudadanoClaveBloqueo,
     CiudadanoComorbilidades,
     CiudadanoDatos,
     CiudadanoDomicilio,
+    CiudadanoResumenCasos,
+    EstadoCandidatoFusion,
     PersonaDomicilio,
     ViajesCiudadano,
 )
@@ -86,9 +90,12 @@ __all__ = [
     "CasoGrupoEnfermedad",
     # Sujetos
     "Ciudadano",
+    "CiudadanoCandidatoFusion",
+    "CiudadanoClaveBloqueo",
     "CiudadanoComorbilidades",
     "CiudadanoDatos",
     "CiudadanoDomicilio",
+    "CiudadanoResumenCasos",
     "Comorbilidad",
     "ContactosNotificacion",
     "DetalleCasoSintomas",
@@ -98,6 +105,7 @@ __all__ = [
     # Enfermedades
     "Enfermedad",
     "EnfermedadGrupo",
+    "EstadoCandidatoFusion",
     "EstudioCasoEpidemiologico",
     "GrupoDeEnfermedades",
     "InternacionCasoEpidemiologico",
@@ -17,6 +17,11 @@ from sqlalchemy.orm import Mapped
 from sqlmodel import Field, Relationship
 
 from app.core.models import BaseModel
+from app.domains.vigilancia_nominal.models.particionado import (
+    COLUMNA_PARTICION_HIJAS,
+    fk_caso,
+    particion_por_anio,
+)
 
 if TYPE_CHECKING:
     from app.domains.catalogos.agentes.models import AgenteEtiologico
@@ -137,16 +142,29 @@ class CasoAgente(BaseModel, table=True):
 
     __tablename__ = "caso_agente"
     __table_args__ = (
-        UniqueConstraint("id_caso", "id_agente", name="uq_caso_agente"),
+        UniqueConstraint(
+            "id_caso", "id_agente", COLUMNA_PARTICION_HIJAS, name="uq_caso_agente"
+        ),
+        fk_caso("fk_caso_agente_caso"),
         Index("idx_caso_agente_caso", "id_caso"),
         Index("idx_caso_agente_agente", "id_agente"),
-        Index("idx_caso_agente_fecha", "fecha_deteccion"),
+        Index("idx_caso_agente_fecha", "fecha_deteccion", postgresql_using="brin"),
         Index("idx_caso_agente_resultado", "resultado"),
+        particion_por_anio(COLUMNA_PARTICION_HIJAS),
+    )
+
+    id: int | None = Field(
+        default=None,
+        primary_key=True,
+        sa_column_kwargs={"autoincrement": True},
+        description="Identificador único",
     )
 
     # FKs principales
-    id_caso: int = Field(
-        foreign_key="caso_epidemiologico.id", description="ID del caso epidemiológico"
+    id_caso: int = Field(description="ID del caso epidemiológico")
+    anio_epi_caso: int = Field(
+        primary_key=True,
+        description="Año epidemiológico del caso (clave de partición)",
     )
     id_agente: int = Field(
         foreign_key="agente_etiologico.id",
@@ -170,7 +188,7 @@ class CasoAgente(BaseModel, table=True):
         None, max_length=200, description="Valor original del resultado"
     )
     fecha_deteccion: date | None = Field(
-        None, index=True, description="Fecha de la detección/resultado"
+        None, description="Fecha de la detección/resultado"
     )
 
     # Trazabilidad
@@ -189,7 +207,9 @@ class CasoAgente(BaseModel, table=True):
     # Relaciones
     caso: Mapped["CasoEpidemiologico"] = Relationship(
         back_populates="agentes_detectados",
-        sa_relationship_kwargs={"foreign_keys": "caso_agente.c.id_caso"},
+        sa_relationship_kwargs={
+            "foreign_keys": "[CasoAgente.id_caso, CasoAgente.anio_epi_caso]"
+        },
     )
     agente: Mapped["AgenteEtiologico"] = Relationship()
     config_usada: Mapped[Optional["AgenteExtraccionConfig"]] = Relationship(
@@ -14,6 +14,7 @@ from sqlmodel import Field, Relationship
 
 from app.core.constants import FrecuenciaOcurrencia
 from app.core.models import BaseModel
+from app.domains.vigilancia_nominal.models.particionado import join_caso
 
 if TYPE_CHECKING:
     from app.domains.territorio.geografia_models import Localidad
@@ -32,9 +33,7 @@ class AmbitosConcurrenciaCaso(BaseModel, table=True):
     __table_args__ = (UniqueConstraint("id_caso", name="uq_ambito_caso"),)
 
     # Foreign Keys
-    id_caso: int = Field(
-        foreign_key="caso_epidemiologico.id", description="ID del caso"
-    )
+    id_caso: int = Field(description="ID del caso")
     id_localidad_ambito_ocurrencia: int | None = Field(
         None,
         sa_type=BigInteger,
@@ -67,6 +66,7 @@ class AmbitosConcurrenciaCaso(BaseModel, table=True):
 
     # Relaciones
     caso: Mapped["CasoEpidemiologico"] = Relationship(
-        back_populates="ambitos_concurrencia"
+        back_populates="ambitos_concurrencia",
+        sa_relationship_kwargs=join_caso("AmbitosConcurrenciaCaso"),
     )
     localidad: Mapped[Optional["Localidad"]] = Relationship()
@@ -14,12 +14,18 @@ Todos estos modelos son extensiones del CasoEpidemiologico.
 from datetime import date
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Text, UniqueConstraint
+from sqlalchemy import Index, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped
 from sqlmodel import Field, Relationship
 
 from app.core.constants import OrigenFinanciamiento
 from app.core.models import BaseModel
+from app.domains.vigilancia_nominal.models.particionado import (
+    COLUMNA_PARTICION_HIJAS,
+    fk_caso,
+    join_caso,
+    particion_por_anio,
+)
 
 if TYPE_CHECKING:
     from app.domains.territorio.establecimientos_models import Establecimiento
@@ -41,8 +47,21 @@ class DiagnosticoCasoEpidemiologico(BaseModel, table=True):
 
     __tablename__ = "diagnostico_caso_epidemiologico"
     __table_args__ = (
-        UniqueConstraint("id_caso", name="uq_diagnostico_caso"),
-        {"extend_existing": True},
+        UniqueConstraint("id_caso", COLUMNA_PARTICION_HIJAS, name="uq_diagnostico_caso"),
+        fk_caso("fk_diagnostico_caso_epidemiologico_caso"),
+        Index(
+            "idx_diagnostico_caso_fecha_referido",
+            "fecha_diagnostico_referido",
+            postgresql_using="brin",
+        ),
+        {"extend_existing": True, **particion_por_anio(COLUMNA_PARTICION_HIJAS)},
+    )
+
+    id: int | None = Field(
+        default=None,
+        primary_key=True,
+        sa_column_kwargs={"autoincrement": True},
+        description="Identificador único",
     )
 
     # Campos propios
@@ -76,8 +95,10 @@ class DiagnosticoCasoEpidemiologico(BaseModel, table=True):
     )
 
     # Foreign Keys
-    id_caso: int = Field(
-        foreign_key="caso_epidemiologico.id", description="ID del caso"
+    id_caso: int = Field(description="ID del caso")
+    anio_epi_caso: int = Field(
+        primary_key=True,
+        description="Año epidemiológico del caso (clave de partición)",
     )
     id_establecimiento_diagnostico: int | None = Field(
         None,
@@ -132,12 +153,12 @@ class InternacionCasoEpidemiologico(BaseModel, table=True):
     )
 
     # Foreign Keys
-    id_caso: int = Field(
-        foreign_key="caso_epidemiologico.id", description="ID del caso"
-    )
+    id_caso: int = Field(description="ID del caso")
 
     # Relaciones
-    caso: Mapped["CasoEpidemiologico"] = Relationship(back_populates="internaciones")
+    caso: Mapped["CasoEpidemiologico"] = Relationship(
+        back_populates="internaciones", sa_relationship_kwargs=join_caso("InternacionCasoEpidemiologico")
+    )
 
 
 # =============================================================================
@@ -180,9 +201,7 @@ class TratamientoCasoEpidemiologico(BaseModel, table=True):
     )
 
     # Foreign Keys
-    id_caso: int = Field(
-        foreign_key="caso_epidemiologico.id", description="ID del caso"
-    )
+    id_caso: int = Field(description="ID del caso")
     id_establecimiento_tratamiento: int | None = Field(
         None,
         foreign_key="establecimiento.id",
@@ -190,7 +209,9 @@ class TratamientoCasoEpidemiologico(BaseModel, table=True):
     )
 
     # Relaciones
-    caso: Mapped["CasoEpidemiologico"] = Relationship(back_populates="tratamientos")
+    caso: Mapped["CasoEpidemiologico"] = Relationship(
+        back_populates="tratamientos", sa_relationship_kwargs=join_caso("TratamientoCasoEpidemiologico")
+    )
     establecimiento: Mapped[Optional["Establecimiento"]] = Relationship()
 
 
@@ -236,12 +257,12 @@ class InvestigacionCasoEpidemiologico(BaseModel, table=True):
     )
 
     # Foreign Keys
-    id_caso: int = Field(
-        foreign_key="caso_epidemiologico.id", description="ID del caso"
-    )
+    id_caso: int = Field(description="ID del caso")
 
     # Relaciones
-    caso: Mapped["CasoEpidemiologico"] = Relationship(back_populates="investigaciones")
+    caso: Mapped["CasoEpidemiologico"] = Relationship(
+        back_populates="investigaciones", sa_relationship_kwargs=join_caso("InvestigacionCasoEpidemiologico")
+    )
 
 
 # =============================================================================
@@ -280,9 +301,9 @@ class ContactosNotificacion(BaseModel, table=True):
     )
 
     # Foreign Keys
-    id_caso: int = Field(
-        foreign_key="caso_epidemiologico.id", description="ID del caso"
-    )
+    id_caso: int = Field(description="ID del caso")
 
     # Relaciones
-    caso: Mapped["CasoEpidemiologico"] = Relationship(back_populates="contactos")
+    caso: Mapped["CasoEpidemiologico"] = Relationship(
+        back_populates="contactos", sa_relationship_kwargs=join_caso("ContactosNotificacion")
+    )
@@ -8,12 +8,27 @@ Representa un caso individual de una Enfermedad de Notificación Obligatoria.
 from datetime import date
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import JSON, BigInteger, Column, Index, Text, UniqueConstraint
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    Index,
+    Text,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.orm import Mapped
 from sqlmodel import Field, Relationship
 
 from app.core.models import BaseModel
 from app.domains.vigilancia_nominal.clasificacion.models import TipoClasificacion
+from app.domains.vigilancia_nominal.models.particionado import (
+    COLUMNA_PARTICION_CASO,
+    COLUMNA_PARTICION_HIJAS,
+    fk_caso,
+    join_caso,
+    particion_por_anio,
+)
 
 if TYPE_CHECKING:
     from app.domains.territorio.establecimientos_models import Establecimiento
@@ -62,16 +77,16 @@ class CasoGrupoEnfermedad(BaseModel, table=True):
         UniqueConstraint("id_caso", "id_grupo", name="uq_caso_grupo_enfermedad"),
     )
 
-    id_caso: int = Field(
-        foreign_key="caso_epidemiologico.id",
-        description="ID del caso epidemiológico",
-    )
+    id_caso: int = Field(description="ID del caso epidemiológico")
     id_grupo: int = Field(
         foreign_key="grupo_de_enfermedades.id",
         description="ID del grupo de enfermedades",
     )
 
-    caso: Mapped["CasoEpidemiologico"] = Relationship(back_populates="caso_grupos")
+    caso: Mapped["CasoEpidemiologico"] = Relationship(
+        back_populates="caso_grupos",
+        sa_relationship_kwargs=join_caso("CasoGrupoEnfermedad"),
+    )
     grupo: Mapped["GrupoDeEnfermedades"] = Relationship(back_populates="casos_en_grupo")
 
 
@@ -131,18 +146,30 @@ class CasoEpidemiologico(BaseModel, table=True):
 
     __tablename__ = "caso_epidemiologico"
     __table_args__ = (
-        Index("idx_caso_fecha_minima", "fecha_minima_caso"),
+        # Un id_snvs por año: la clave de partición tiene que estar en el UNIQUE
+        UniqueConstraint(
+            "id_snvs", COLUMNA_PARTICION_CASO, name="uq_caso_id_snvs_anio"
+        ),
+        Index("idx_caso_fecha_minima", "fecha_minima_caso", postgresql_using="brin"),
         Index("idx_caso_domicilio_fecha", "id_domicilio", "fecha_minima_caso"),
         Index("idx_caso_enfermedad_fecha", "id_enfermedad", "fecha_minima_caso"),
+        # Búsqueda por prefijo de ID SNVS
+        Index("idx_caso_id_snvs_prefijo", text("(id_snvs::text) text_pattern_ops")),
+        particion_por_anio(COLUMNA_PARTICION_CASO),
     )
 
     # =========================================================================
     # Identificación
     # =========================================================================
 
+    id: int | None = Field(
+        default=None,
+        primary_key=True,
+        sa_column_kwargs={"autoincrement": True},
+        description="Identificador único",
+    )
     id_snvs: int = Field(
         sa_type=BigInteger,
-        unique=True,
         index=True,
         description="ID único del caso en el Sistema Nacional de Vigilancia de la Salud",
     )
@@ -159,7 +186,9 @@ class CasoEpidemiologico(BaseModel, table=True):
         ..., index=True, description="Semana epidemiológica de fecha_minima_caso (1-53)"
     )
     fecha_minima_caso_anio_epi: int = Field(
-        ..., index=True, description="Año epidemiológico de fecha_minima_caso"
+        ...,
+        primary_key=True,
+        description="Año epidemiológico de fecha_minima_caso (clave de partición)",
     )
     fecha_inicio_sintomas: date | None = Field(
         None, description="Fecha de inicio de síntomas"
@@ -293,7 +322,7 @@ class CasoEpidemiologico(BaseModel, table=True):
 
     enfermedad: Mapped["Enfermedad"] = Relationship(back_populates="casos")
     caso_grupos: Mapped[list["CasoGrupoEnfermedad"]] = Relationship(
-        back_populates="caso"
+        back_populates="caso", sa_relationship_kwargs=join_caso("CasoGrupoEnfermedad")
     )
     ciudadano: Mapped[Optional["Ciudadano"]] = Relationship(back_populates="casos")
     animal: Mapped[Optional["Animal"]] = Relationship(back_populates="casos")
@@ -322,31 +351,40 @@ class CasoEpidemiologico(BaseModel, table=True):
         back_populates="caso"
     )
     antecedentes: Mapped[list["AntecedentesCasoEpidemiologico"]] = Relationship(
-        back_populates="caso"
+        back_populates="caso",
+        sa_relationship_kwargs=join_caso("AntecedentesCasoEpidemiologico"),
+    )
+    vacunas: Mapped[list["VacunasCiudadano"]] = Relationship(
+        back_populates="caso", sa_relationship_kwargs=join_caso("VacunasCiudadano")
     )
-    vacunas: Mapped[list["VacunasCiudadano"]] = Relationship(back_populates="caso")
     diagnosticos: Mapped[list["DiagnosticoCasoEpidemiologico"]] = Relationship(
         back_populates="caso"
     )
     internaciones: Mapped[list["InternacionCasoEpidemiologico"]] = Relationship(
-        back_populates="caso"
+        back_populates="caso",
+        sa_relationship_kwargs=join_caso("InternacionCasoEpidemiologico"),
     )
     tratamientos: Mapped[list["TratamientoCasoEpidemiologico"]] = Relationship(
-        back_populates="caso"
+        back_populates="caso",
+        sa_relationship_kwargs=join_caso("TratamientoCasoEpidemiologico"),
     )
     investigaciones: Mapped[list["InvestigacionCasoEpidemiologico"]] = Relationship(
-        back_populates="caso"
+        back_populates="caso",
+        sa_relationship_kwargs=join_caso("InvestigacionCasoEpidemiologico"),
     )
     contactos: Mapped[list["ContactosNotificacion"]] = Relationship(
-        back_populates="caso"
+        back_populates="caso", sa_relationship_kwargs=join_caso("ContactosNotificacion")
     )
     ambitos_concurrencia: Mapped[list["AmbitosConcurrenciaCaso"]] = Relationship(
-        back_populates="caso"
+        back_populates="caso",
+        sa_relationship_kwargs=join_caso("AmbitosConcurrenciaCaso"),
     )
     domicilio: Mapped[Optional["Domicilio"]] = Relationship(back_populates="casos")
     agentes_detectados: Mapped[list["CasoAgente"]] = Relationship(
         back_populates="caso",
-        sa_relationship_kwargs={"foreign_keys": "caso_agente.c.id_caso"},
+        sa_relationship_kwargs={
+            "foreign_keys": "[CasoAgente.id_caso, CasoAgente.anio_epi_caso]"
+        },
     )
 
 
@@ -364,7 +402,23 @@ class DetalleCasoSintomas(BaseModel, table=True):
 
     __tablename__ = "detalle_caso_sintomas"
     __table_args__ = (
-        UniqueConstraint("id_caso", "id_sintoma", name="uq_caso_sintoma"),
+        UniqueConstraint(
+            "id_caso", "id_sintoma", COLUMNA_PARTICION_HIJAS, name="uq_caso_sintoma"
+        ),
+        fk_caso("fk_detalle_caso_sintomas_caso"),
+        Index(
+            "idx_detalle_sintomas_fecha_inicio",
+            "fecha_inicio_sintoma",
+            postgresql_using="brin",
+        ),
+        particion_por_anio(COLUMNA_PARTICION_HIJAS),
+    )
+
+    id: int | None = Field(
+        default=None,
+        primary_key=True,
+        sa_column_kwargs={"autoincrement": True},
+        description="Identificador único",
     )
 
     semana_epidemiologica_aparicion_sintoma: int | None = Field(
@@ -377,8 +431,10 @@ class DetalleCasoSintomas(BaseModel, table=True):
         None, description="Año epidemiológico del síntoma"
     )
 
-    id_caso: int = Field(
-        foreign_key="caso_epidemiologico.id", description="ID del caso"
+    id_caso: int = Field(description="ID del caso")
+    anio_epi_caso: int = Field(
+        primary_key=True,
+        description="Año epidemiológico del caso (clave de partición)",
     )
     id_sintoma: int = Field(foreign_key="sintoma.id", description="ID del síntoma")
 
@@ -409,14 +465,15 @@ class AntecedentesCasoEpidemiologico(BaseModel, table=True):
         None, description="Fecha del antecedente (si aplica)"
     )
 
-    id_caso: int = Field(
-        foreign_key="caso_epidemiologico.id", description="ID del caso"
-    )
+    id_caso: int = Field(description="ID del caso")
     id_antecedente_epidemiologico: int = Field(
         foreign_key="antecedente_epidemiologico.id", description="ID del antecedente"
     )
 
-    caso: Mapped["CasoEpidemiologico"] = Relationship(back_populates="antecedentes")
+    caso: Mapped["CasoEpidemiologico"] = Relationship(
+        back_populates="antecedentes",
+        sa_relationship_kwargs=join_caso("AntecedentesCasoEpidemiologico"),
+    )
     antecedente_epidemiologico_rel: Mapped["AntecedenteEpidemiologico"] = Relationship(
         back_populates="antecedentes_casos"
     )
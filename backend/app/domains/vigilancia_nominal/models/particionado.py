@@ -0,0 +1,60 @@
+"""
+Particionado por año epidemiológico de los casos y sus tablas hijas.
+
+``caso_epidemiologico`` está particionada por RANGE sobre
+``fecha_minima_caso_anio_epi`` (una partición por año, ``<tabla>_<año>``).
+Las tablas hijas de mayor volumen (síntomas, muestras, diagnósticos y agentes)
+repiten el año del caso en ``anio_epi_caso`` y se particionan igual, con una
+FK compuesta ``(id_caso, anio_epi_caso)`` con ON UPDATE CASCADE.
+
+Postgres exige que las PK/UNIQUE de una tabla particionada incluyan la clave
+de partición, por eso las PK son ``(id, año)``. Las tablas que siguen
+referenciando solo ``caso_epidemiologico.id`` no tienen FK en la base: la
+relación ORM se declara con ``primaryjoin`` explícito (``join_caso``).
+
+Las particiones se crean con la función SQL ``crear_particiones_anio_epi``
+(ver ``queries/particiones.py``).
+"""
+
+from typing import Any
+
+from sqlalchemy import ForeignKeyConstraint
+
+# Tablas particionadas, en el orden en que se crean sus particiones
+TABLAS_PARTICIONADAS = (
+    "caso_epidemiologico",
+    "detalle_caso_sintomas",
+    "muestra_caso_epidemiologico",
+    "diagnostico_caso_epidemiologico",
+    "caso_agente",
+)
+
+COLUMNA_PARTICION_CASO = "fecha_minima_caso_anio_epi"
+COLUMNA_PARTICION_HIJAS = "anio_epi_caso"
+
+
+def particion_por_anio(columna: str) -> dict[str, Any]:
+    """Opciones de ``__table_args__`` para particionar por año."""
+    return {"postgresql_partition_by": f"RANGE ({columna})"}
+
+
+def fk_caso(nombre: str) -> ForeignKeyConstraint:
+    """FK compuesta de una tabla hija hacia la partición de su caso."""
+    return ForeignKeyConstraint(
+        ["id_caso", COLUMNA_PARTICION_HIJAS],
+        ["caso_epidemiologico.id", f"caso_epidemiologico.{COLUMNA_PARTICION_CASO}"],
+        name=nombre,
+        onupdate="CASCADE",
+    )
+
+
+def join_caso(modelo: str) -> dict[str, str]:
+    """
+    ``sa_relationship_kwargs`` para relaciones con el caso sin FK en la base.
+
+    Sirve para ambos lados de la relación: el ``foreign()`` marca la columna
+    ``id_caso`` del modelo hijo.
+    """
+    return {
+        "primaryjoin": f"CasoEpidemiologico.id == foreign({modelo}.id_caso)",
+    }
@@ -11,11 +11,17 @@ Estos modelos están ligados a casos de vigilancia nominal.
 from datetime import date
 from typing import TYPE_CHECKING, ClassVar, Optional
 
-from sqlalchemy import BigInteger, UniqueConstraint
+from sqlalchemy import BigInteger, ForeignKeyConstraint, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped
 from sqlmodel import Field, Relationship
 
 from app.core.models import BaseModel
+from app.domains.vigilancia_nominal.models.particionado import (
+    COLUMNA_PARTICION_HIJAS,
+    fk_caso,
+    join_caso,
+    particion_por_anio,
+)
 
 if TYPE_CHECKING:
     from app.domains.territorio.establecimientos_models import Establecimiento
@@ -226,7 +232,21 @@ class MuestraCasoEpidemiologico(BaseModel, table=True):
 
     __tablename__ = "muestra_caso_epidemiologico"
     __table_args__ = (
-        UniqueConstraint("id_snvs_muestra", "id_caso", name="uq_muestra_caso"),
+        UniqueConstraint(
+            "id_snvs_muestra", "id_caso", COLUMNA_PARTICION_HIJAS, name="uq_muestra_caso"
+        ),
+        fk_caso("fk_muestra_caso_epidemiologico_caso"),
+        Index(
+            "idx_muestra_caso_fecha_toma", "fecha_toma_muestra", postgresql_using="brin"
+        ),
+        particion_por_anio(COLUMNA_PARTICION_HIJAS),
+    )
+
+    id: int | None = Field(
+        default=None,
+        primary_key=True,
+        sa_column_kwargs={"autoincrement": True},
+        description="Identificador único",
     )
 
     # Campos propios
@@ -262,8 +282,10 @@ class MuestraCasoEpidemiologico(BaseModel, table=True):
     )
 
     # Foreign Keys
-    id_caso: int = Field(
-        foreign_key="caso_epidemiologico.id", description="ID del caso"
+    id_caso: int = Field(description="ID del caso")
+    anio_epi_caso: int = Field(
+        primary_key=True,
+        description="Año epidemiológico del caso (clave de partición)",
     )
     id_establecimiento: int = Field(
         foreign_key="establecimiento.id", description="ID del establecimiento"
@@ -290,7 +312,19 @@ class EstudioCasoEpidemiologico(BaseModel, table=True):
     """
 
     __tablename__ = "estudio_caso_epidemiologico"
-    __table_args__: ClassVar[dict[str, bool]] = {"extend_existing": True}
+    __table_args__ = (
+        # La muestra está particionada: la FK lleva el año del caso
+        ForeignKeyConstraint(
+            ["id_muestra", COLUMNA_PARTICION_HIJAS],
+            [
+                "muestra_caso_epidemiologico.id",
+                f"muestra_caso_epidemiologico.{COLUMNA_PARTICION_HIJAS}",
+            ],
+            name="fk_estudio_caso_epidemiologico_muestra",
+            onupdate="CASCADE",
+        ),
+        {"extend_existing": True},
+    )
 
     fecha_estudio: date | None = Field(None, description="Fecha del estudio")
     determinacion: str | None = Field(
@@ -305,8 +339,9 @@ class EstudioCasoEpidemiologico(BaseModel, table=True):
     fecha_recepcion: date | None = Field(None, description="Fecha de recepción")
 
     # Foreign Keys
-    id_muestra: int = Field(
-        foreign_key="muestra_caso_epidemiologico.id", description="ID de la muestra"
+    id_muestra: int = Field(description="ID de la muestra")
+    anio_epi_caso: int = Field(
+        description="Año epidemiológico del caso de la muestra"
     )
 
     # Relaciones
@@ -348,13 +383,11 @@ class VacunasCiudadano(BaseModel, table=True):
         description="Código del ciudadano",
     )
     id_vacuna: int = Field(foreign_key="vacuna.id", description="ID de la vacuna")
-    id_caso: int | None = Field(
-        None, foreign_key="caso_epidemiologico.id", description="ID del caso (opcional)"
-    )
+    id_caso: int | None = Field(None, description="ID del caso (opcional)")
 
     # Relaciones
     ciudadano: Mapped["Ciudadano"] = Relationship(back_populates="vacunas")
     vacuna: Mapped["Vacuna"] = Relationship(back_populates="vacunas_ciudadanos")
     caso: Mapped[Optional["CasoEpidemiologico"]] = Relationship(
-        back_populates="vacunas"
+        back_populates="vacunas", sa_relationship_kwargs=join_caso("VacunasCiudadano")
     )
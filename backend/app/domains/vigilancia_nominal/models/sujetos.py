@@ -5,20 +5,37 @@ Los sujetos son las entidades sobre las cuales se registran casos de vigilancia
 - Ciudadano: Personas humanas con sus datos demográficos
 - Animal: Animales involucrados en casos (ej: rabia, brucelosis)
 - ViajesCiudadano: Viajes relevantes para rastreo epidemiológico
+- CiudadanoClaveBloqueo / CiudadanoCandidatoFusion: Vinculación de registros
+  (detección de ciudadanos duplicados)
 
 IMPORTANTE: Estos modelos solo aplican a vigilancia NOMINAL.
 Los datos agregados no tienen sujetos individuales.
 """
 
-from datetime import date
+import enum
+from datetime import date, datetime
 from typing import TYPE_CHECKING, ClassVar, Optional
 
-from sqlalchemy import JSON, BigInteger, Column
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    CheckConstraint,
+    Column,
+    Computed,
+    Index,
+    Text,
+    text,
+)
 from sqlalchemy.orm import Mapped
-from sqlmodel import Field, Relationship, UniqueConstraint
+from sqlmodel import Field, Relationship, SQLModel, UniqueConstraint
 
 from app.core.constants import SexoBiologico, TipoDocumento
 from app.core.models import BaseModel
+from app.core.search import documento_busqueda_sql, registrar_ddl_busqueda
+from app.domains.vigilancia_nominal.clasificacion.models import TipoClasificacion
+
+# f_unaccent debe existir antes de crear las columnas generadas
+registrar_ddl_busqueda(SQLModel.metadata)
 
 if TYPE_CHECKING:
     from app.domains.territorio.geografia_models import Domicilio, Localidad
@@ -47,6 +64,18 @@ class Ciudadano(BaseModel, table=True):
         UniqueConstraint(
             "tipo_documento", "numero_documento", name="uk_ciudadano_documento"
         ),
+        # Búsqueda por nombre sin acentos (LIKE/word_similarity usan el GIN)
+        Index(
+            "idx_ciudadano_busqueda_trgm",
+            "busqueda",
+            postgresql_using="gin",
+            postgresql_ops={"busqueda": "gin_trgm_ops"},
+        ),
+        # Búsqueda por prefijo de documento ("2345" -> 23456789)
+        Index(
+            "idx_ciudadano_documento_prefijo",
+            text("(numero_documento::text) text_pattern_ops"),
+        ),
         {"extend_existing": True},
     )
 
@@ -83,6 +112,13 @@ class Ciudadano(BaseModel, table=True):
     )
     etnia: str | None = Field(None, max_length=30, description="Etnia")
 
+    # Documento de búsqueda (generado por PostgreSQL, no se escribe desde la app)
+    busqueda: str | None = Field(
+        default=None,
+        sa_column=Column(Text, Computed(documento_busqueda_sql("nombre", "apellido"))),
+        description="Nombre y apellido normalizados (minúsculas, sin acentos)",
+    )
+
     # Relaciones
     domicilios: Mapped[list["CiudadanoDomicilio"]] = Relationship(
         back_populates="ciudadano"
@@ -142,7 +178,6 @@ class CiudadanoDatos(BaseModel, table=True):
         description="Código del ciudadano",
     )
     id_caso: int = Field(  # Cambiado de id_evento a id_caso para consistencia
-        foreign_key="caso_epidemiologico.id",
         description="ID del caso asociado (para mantener historial temporal)",
     )
 
@@ -171,6 +206,41 @@ class CiudadanoDatos(BaseModel, table=True):
     ciudadano: Mapped["Ciudadano"] = Relationship(back_populates="datos")
 
 
+class CiudadanoResumenCasos(BaseModel, table=True):
+    """
+    Resumen precalculado de los casos de cada ciudadano.
+
+    Se mantiene en cada ingesta (ver ``refrescar_resumen_ciudadanos``) y lo usa
+    el listado de personas cuando no hay filtros a nivel de caso, evitando
+    agregar toda la tabla de casos en cada request.
+    """
+
+    __tablename__ = "ciudadano_resumen_casos"
+    __table_args__ = (
+        UniqueConstraint("codigo_ciudadano", name="uq_ciudadano_resumen_codigo"),
+        Index("idx_ciudadano_resumen_ultimo_caso", "ultimo_caso", "codigo_ciudadano"),
+    )
+
+    codigo_ciudadano: int = Field(
+        sa_type=BigInteger,
+        foreign_key="ciudadano.codigo_ciudadano",
+        description="Código del ciudadano",
+    )
+    total_casos: int = Field(0, description="Total de casos del ciudadano")
+    confirmados: int = Field(0, description="Casos confirmados")
+    sospechosos: int = Field(0, description="Casos sospechosos")
+    probables: int = Field(0, description="Casos probables")
+    descartados: int = Field(0, description="Casos descartados")
+    primer_caso: date | None = Field(None, description="Fecha del primer caso")
+    ultimo_caso: date | None = Field(None, description="Fecha del último caso")
+    ultimo_caso_id_enfermedad: int | None = Field(
+        None, description="Enfermedad del último caso"
+    )
+    ultimo_caso_clasificacion: TipoClasificacion | None = Field(
+        None, description="Clasificación del último caso"
+    )
+
+
 class CiudadanoComorbilidades(BaseModel, table=True):
     """Relación N:M entre Ciudadano y Comorbilidad."""
 
@@ -233,6 +303,105 @@ class PersonaDomicilio(BaseModel, table=True):
     domicilio: Mapped["Domicilio"] = Relationship()
 
 
+# =============================================================================
+# VINCULACIÓN DE REGISTROS (DUPLICADOS)
+# =============================================================================
+
+
+class EstadoCandidatoFusion(enum.StrEnum):
+    """
+    Estado de revisión de un par de ciudadanos posiblemente duplicados.
+
+    PENDIENTE: Detectado por la vinculación, sin revisar
+    CONFIRMADO: Revisado: son la misma persona
+    DESCARTADO: Revisado: son personas distintas (no se vuelve a proponer)
+    """
+
+    PENDIENTE = "PENDIENTE"
+    CONFIRMADO = "CONFIRMADO"
+    DESCARTADO = "DESCARTADO"
+
+
+class CiudadanoClaveBloqueo(BaseModel, table=True):
+    """
+    Claves de bloqueo de cada ciudadano para la vinculación de registros.
+
+    Una fila por ciudadano y tipo de clave (ej: apellido fonético + año de
+    nacimiento). Solo se comparan ciudadanos que comparten alguna clave, así
+    la búsqueda de duplicados no es cuadrática. Las mantiene
+    ``vincular_ciudadanos`` en cada ingesta.
+    """
+
+    __tablename__ = "ciudadano_clave_bloqueo"
+    __table_args__ = (
+        UniqueConstraint(
+            "codigo_ciudadano", "tipo", name="uq_ciudadano_clave_bloqueo_tipo"
+        ),
+        Index("idx_ciudadano_clave_bloqueo_clave", "tipo", "clave"),
+    )
+
+    codigo_ciudadano: int = Field(
+        sa_type=BigInteger,
+        foreign_key="ciudadano.codigo_ciudadano",
+        description="Código del ciudadano",
+    )
+    tipo: str = Field(max_length=30, description="Tipo de clave de bloqueo")
+    clave: str = Field(max_length=100, description="Valor de la clave")
+
+
+class CiudadanoCandidatoFusion(BaseModel, table=True):
+    """
+    Par de ciudadanos que probablemente son la misma persona.
+
+    Lo genera la vinculación de registros para revisión manual. El par se
+    guarda ordenado (``codigo_ciudadano_a < codigo_ciudadano_b``) para que sea
+    único.
+    """
+
+    __tablename__ = "ciudadano_candidato_fusion"
+    __table_args__ = (
+        UniqueConstraint(
+            "codigo_ciudadano_a",
+            "codigo_ciudadano_b",
+            name="uq_ciudadano_candidato_fusion_par",
+        ),
+        CheckConstraint(
+            "codigo_ciudadano_a < codigo_ciudadano_b",
+            name="ck_ciudadano_candidato_fusion_orden",
+        ),
+        Index("idx_ciudadano_candidato_fusion_estado", "estado", "score"),
+    )
+
+    codigo_ciudadano_a: int = Field(
+        sa_type=BigInteger,
+        foreign_key="ciudadano.codigo_ciudadano",
+        description="Código del ciudadano con menor código",
+    )
+    codigo_ciudadano_b: int = Field(
+        sa_type=BigInteger,
+        foreign_key="ciudadano.codigo_ciudadano",
+        index=True,
+        description="Código del ciudadano con mayor código",
+    )
+    score: float = Field(description="Similitud ponderada del par (0 a 1)")
+    similitudes: dict | None = Field(
+        None,
+        sa_column=Column(JSON),
+        description="Similitud por campo (nombre, apellido, documento, fecha...)",
+    )
+    bloques: str | None = Field(
+        None, max_length=200, description="Claves de bloqueo compartidas"
+    )
+    estado: EstadoCandidatoFusion = Field(
+        default=EstadoCandidatoFusion.PENDIENTE,
+        description="Estado de la revisión",
+    )
+    id_usuario_revision: int | None = Field(
+        None, foreign_key="users.id", description="Usuario que revisó el par"
+    )
+    fecha_revision: datetime | None = Field(None, description="Fecha de la revisión")
+
+
 # =============================================================================
 # ANIMAL
 # =============================================================================
@@ -246,7 +415,15 @@ class Animal(BaseModel, table=True):
     """
 
     __tablename__ = "animal"
-    __table_args__: ClassVar[dict[str, bool]] = {"extend_existing": True}
+    __table_args__ = (
+        Index(
+            "idx_animal_busqueda_trgm",
+            "busqueda",
+            postgresql_using="gin",
+            postgresql_ops={"busqueda": "gin_trgm_ops"},
+        ),
+        {"extend_existing": True},
+    )
 
     # Campos propios
     especie: str = Field(..., max_length=100, description="Especie del animal")
@@ -275,6 +452,18 @@ class Animal(BaseModel, table=True):
         max_length=255,
         description="Cómo se detectó: 'automatico', 'manual', 'revision'",
     )
+    busqueda: str | None = Field(
+        default=None,
+        sa_column=Column(
+            Text,
+            Computed(
+                documento_busqueda_sql(
+                    "especie", "subespecie", "raza", "identificacion"
+                )
+            ),
+        ),
+        description="Especie, raza e identificación normalizadas para búsqueda",
+    )
     confidence_deteccion: float | None = Field(
         None,
         ge=0.0,
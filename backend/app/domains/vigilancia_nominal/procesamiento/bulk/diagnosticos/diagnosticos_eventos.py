@@ -48,6 +48,7 @@ class DiagnosticosCasoEpidemiologicosProcessor(BulkProcessorBase):
         # NOTE: id_evento already added by main.py via JOIN, use it directly
         select_exprs = [
             pl.col("id_caso"),
+            pl.col("anio_epi_caso"),
         ]
 
         # Clasificación manual
@@ -162,7 +163,8 @@ class DiagnosticosCasoEpidemiologicosProcessor(BulkProcessorBase):
 
             stmt = pg_insert(table).values(valid_records)
             upsert_stmt = stmt.on_conflict_do_update(
-                index_elements=["id_caso"],
+                # uq_diagnostico_caso (incluye la clave de partición)
+                index_elements=["id_caso", "anio_epi_caso"],
                 set_={
                     "clasificacion_manual": stmt.excluded.clasificacion_manual,
                     "clasificacion_automatica": stmt.excluded.clasificacion_automatica,
@@ -69,12 +69,14 @@ class EstudiosProcessor(BulkProcessorBase):
         self.logger.info(f"Bulk upserting {estudios_df.height} estudios")
 
         # ===== MAPEO DE MUESTRAS: Query SQL -> Polars DataFrame =====
-        # Obtener mapping de muestras_evento desde BD
+        # Obtener mapping de muestras_evento desde BD, solo de las particiones
+        # (años epidemiológicos) de los casos del lote
+        anios_lote = estudios_df.get_column("anio_epi_caso").drop_nulls().unique()
         stmt = select(
             col(MuestraCasoEpidemiologico.id),
             col(MuestraCasoEpidemiologico.id_snvs_muestra),
             col(MuestraCasoEpidemiologico.id_caso),  # Cambiado de id_evento a id_caso
-        )
+        ).where(col(MuestraCasoEpidemiologico.anio_epi_caso).in_(anios_lote.to_list()))
         muestra_rows = self.context.session.execute(stmt).all()
 
         # Convertir a DataFrame de Polars con schema explícito
@@ -102,6 +104,7 @@ class EstudiosProcessor(BulkProcessorBase):
             .select(
                 [
                     pl.col("id_caso"),  # Ya existe del JOIN en main.py
+                    pl.col("anio_epi_caso"),
                     (
                         pl.col(Columns.ID_SNVS_MUESTRA.name).cast(
                             pl.Int64, strict=False
@@ -157,6 +160,7 @@ class EstudiosProcessor(BulkProcessorBase):
             .select(
                 [
                     "id_muestra",  # FK requerido
+                    "anio_epi_caso",
                     "determinacion",
                     "tecnica",
                     "fecha_estudio",
@@ -21,10 +21,10 @@ OPTIMIZACIONES:
 """
 
 import polars as pl
-from sqlalchemy import func, inspect, select
+from sqlalchemy import inspect
 from sqlalchemy.dialects.postgresql import insert as pg_insert
-from sqlmodel import col
 
+from app.core.catalog_snapshots import catalog_snapshots
 from app.domains.territorio.establecimientos_models import Establecimiento
 from app.domains.territorio.services.geografia_bootstrap_service import (
     GeografiaBootstrapService,
@@ -338,18 +338,11 @@ class EstablecimientosProcessor(BulkProcessorBase):
         if not ids_snvs:
             return {}
 
-        # Query buscando por codigo_snvs (ahora son IDs numéricos)
-        stmt = select(col(Establecimiento.id), col(Establecimiento.codigo_snvs)).where(
-            col(Establecimiento.codigo_snvs).in_(ids_snvs)
+        # Snapshot compartido por codigo_snvs (solo consulta la BD por los que falten)
+        return catalog_snapshots.lookup(
+            self.context.session, Establecimiento, "codigo_snvs", ids_snvs
         )
 
-        # Retornar mapeo id_snvs → id_establecimiento
-        return {
-            codigo_snvs: estab_id
-            for estab_id, codigo_snvs in self.context.session.execute(stmt).all()
-            if codigo_snvs  # Filtrar NULLs
-        }
-
     def _get_existing_establecimientos(self, nombres: list) -> dict[str, int]:
         """
         Obtiene mapeo de establecimientos existentes por nombre.
@@ -363,17 +356,7 @@ class EstablecimientosProcessor(BulkProcessorBase):
         if not nombres:
             return {}
 
-        # Convertir nombres a uppercase para matching case-insensitive
-        nombres_upper = [n.upper() for n in nombres]
-
-        # Query con UPPER() para matching case-insensitive
-        stmt = select(col(Establecimiento.id), col(Establecimiento.nombre)).where(
-            func.upper(col(Establecimiento.nombre)).in_(nombres_upper)
+        # Snapshot por UPPER(nombre): el nombre en uppercase es la key del mapeo
+        return catalog_snapshots.lookup(
+            self.context.session, Establecimiento, "nombre", nombres, upper=True
         )
-
-        # Retornar mapeo usando el nombre en uppercase como key
-        return {
-            nombre.upper(): estab_id
-            for estab_id, nombre in self.context.session.execute(stmt).all()
-            if nombre is not None
-        }
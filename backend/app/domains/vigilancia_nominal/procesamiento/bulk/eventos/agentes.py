@@ -452,6 +452,7 @@ class AgentesExtractor:
 
             agente_data = {
                 "id_caso": id_evento,
+                "anio_epi_caso": self.context.anio_por_caso[id_evento],
                 "id_agente": id_agente,
                 "resultado": resultado.value,
                 "metodo_deteccion": regla.get("metodo"),
@@ -591,7 +592,8 @@ class AgentesExtractor:
         try:
             stmt = pg_insert(inspect(CasoAgente).local_table).values(unique_agentes)
             stmt = stmt.on_conflict_do_update(
-                constraint="uq_caso_agente",  # Cambiado de uq_evento_agente a uq_caso_agente
+                # uq_caso_agente (incluye la clave de partición)
+                index_elements=["id_caso", "id_agente", "anio_epi_caso"],
                 set_={
                     "resultado": stmt.excluded.resultado,
                     "metodo_deteccion": stmt.excluded.metodo_deteccion,
@@ -8,10 +8,10 @@ OPTIMIZADO CON POLARS PURO - lazy evaluation, joins, sin loops Python.
 from typing import Any
 
 import polars as pl
-from sqlalchemy import inspect, select
+from sqlalchemy import inspect
 from sqlalchemy.dialects.postgresql import insert as pg_insert
-from sqlmodel import col
 
+from app.core.catalog_snapshots import catalog_snapshots
 from app.core.slug import capitalizar_nombre, generar_slug
 from app.domains.vigilancia_nominal.models.enfermedad import (
     Enfermedad,
@@ -19,7 +19,7 @@ from app.domains.vigilancia_nominal.models.enfermedad import (
 )
 
 from ...config.columns import Columns
-from ..shared import get_current_timestamp, get_or_create_catalog
+from ..shared import get_current_timestamp, get_or_create_catalog, pl_slug
 
 
 class CatalogsProcessor:
@@ -101,15 +101,11 @@ class CatalogsProcessor:
         if df_prepared.height == 0:
             return {}, {}
 
-        # === PASO 2: Generar slugs con Polars apply (batch processing) ===
+        # === PASO 2: Generar slugs vectorizados (mismas reglas que generar_slug) ===
         df_with_slugs = df_prepared.with_columns(
             [
-                pl.col("grupo_str")
-                .map_elements(generar_slug, return_dtype=pl.Utf8)
-                .alias("slug_grupo"),
-                pl.col("tipo_str")
-                .map_elements(generar_slug, return_dtype=pl.Utf8)
-                .alias("slug_tipo"),
+                pl_slug("grupo_str").alias("slug_grupo"),
+                pl_slug("tipo_str").alias("slug_tipo"),
             ]
         )
 
@@ -143,14 +139,10 @@ class CatalogsProcessor:
         if not slugs_set:
             return {}, {}
 
-        # === PASO 5: Check existing enfermedades ===
-        stmt = select(col(Enfermedad.id), col(Enfermedad.slug)).where(
-            col(Enfermedad.slug).in_(list(slugs_set))
+        # === PASO 5: Check existing enfermedades (snapshot compartido entre jobs) ===
+        existing_mapping = catalog_snapshots.lookup(
+            self.context.session, Enfermedad, "slug", slugs_set
         )
-        existing_mapping = {
-            slug: enfermedad_id
-            for enfermedad_id, slug in self.context.session.execute(stmt).all()
-        }
 
         # === PASO 6: Create missing enfermedades ===
         existing_slugs = set(existing_mapping.keys())
@@ -181,14 +173,12 @@ class CatalogsProcessor:
                 upsert_stmt = stmt.on_conflict_do_nothing(index_elements=["slug"])
                 self.context.session.execute(upsert_stmt)
 
-                # Re-fetch complete mapping
-                stmt = select(col(Enfermedad.id), col(Enfermedad.slug)).where(
-                    col(Enfermedad.slug).in_(list(slugs_set))
+                # Re-fetch solo de las nuevas
+                existing_mapping.update(
+                    catalog_snapshots.lookup(
+                        self.context.session, Enfermedad, "slug", faltantes
+                    )
                 )
-                existing_mapping = {
-                    slug: enfermedad_id
-                    for enfermedad_id, slug in self.context.session.execute(stmt).all()
-                }
 
         # === PASO 7: Build enfermedad_id → grupo_ids mapping ===
         enfermedad_id_df = pl.DataFrame(
@@ -7,7 +7,7 @@ from decimal import Decimal
 from typing import TYPE_CHECKING
 
 import polars as pl
-from sqlalchemy import inspect, select
+from sqlalchemy import BigInteger, Integer, column, inspect, select, update, values
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel import col
 
@@ -15,19 +15,33 @@ from app.core.epidemiology import (
     calcular_semana_epidemiologica,
 )
 from app.core.slug import capitalizar_nombre, generar_slug
-from app.domains.vigilancia_nominal.models.caso import CasoEpidemiologico
+from app.domains.vigilancia_nominal.models.agentes import CasoAgente
+from app.domains.vigilancia_nominal.models.atencion import (
+    DiagnosticoCasoEpidemiologico,
+)
+from app.domains.vigilancia_nominal.models.caso import (
+    CasoEpidemiologico,
+    DetalleCasoSintomas,
+)
 from app.domains.vigilancia_nominal.models.enfermedad import (
     Enfermedad,
     GrupoDeEnfermedades,
 )
+from app.domains.vigilancia_nominal.models.salud import (
+    EstudioCasoEpidemiologico,
+    MuestraCasoEpidemiologico,
+)
+from app.domains.vigilancia_nominal.queries.particiones import asegurar_particiones
 
 from ...config.columns import Columns
 from ..shared import (
     BulkProcessorBase,
+    CatalogResolver,
     es_nombre_calle_valido,
     get_or_create_catalog,
     pl_clean_numero_domicilio,
     pl_clean_string,
+    pl_slug,
 )
 
 if TYPE_CHECKING:
@@ -399,29 +413,6 @@ class CasoEpidemiologicosProcessor(BulkProcessorBase):
 
         return result
 
-    def _build_establecimiento_mapping_expr(
-        self, establecimiento_mapping: dict[str, int], col_name: str
-    ) -> pl.Expr:
-        """
-        Build Polars expression to map establecimiento names to IDs.
-
-        Args:
-            establecimiento_mapping: Dict of establecimiento_clean -> id
-            col_name: Column name to map
-
-        Returns:
-            Polars expression that maps the column to establecimiento IDs
-        """
-        # Create when/then chain for mapping
-        expr = pl.lit(None, dtype=pl.Int64)
-        for estab_name, estab_id in establecimiento_mapping.items():
-            expr = (
-                pl.when(pl.col(col_name) == estab_name)
-                .then(pl.lit(estab_id))
-                .otherwise(expr)
-            )
-        return expr
-
     def upsert_eventos(
         self, df: pl.DataFrame, establecimiento_mapping: dict[str, int]
     ) -> dict[int, int]:
@@ -506,34 +497,17 @@ class CasoEpidemiologicosProcessor(BulkProcessorBase):
             .collect()
         )
 
-        # Extraer valores únicos LIMPIOS y generar códigos (solo para valores únicos)
-        grupos_unicos_list = (
-            df_cleaned["grupo_nombre_clean"].drop_nulls().unique().to_list()
-        )
-        eventos_unicos = (
-            df_cleaned["evento_nombre_clean"].drop_nulls().unique().to_list()
-        )
-
-        # Generar códigos solo para valores únicos (no para cada fila)
-        # Ahora el mapping usa los valores limpios como keys
-        grupo_kebab_map = {g: generar_slug(g) for g in grupos_unicos_list if g}
-        evento_kebab_map = {e: generar_slug(e) for e in eventos_unicos if e}
-
-        # Aplicar mapping vectorizado
-        df_prepared = (
-            df_cleaned.lazy()
-            .with_columns(
-                [
-                    # Mapear a códigos usando replace (VECTORIZADO en Rust, no Python loop)
-                    pl.col("grupo_nombre_clean")
-                    .replace(grupo_kebab_map, default=None)
-                    .alias("grupo_codigo"),
-                    pl.col("evento_nombre_clean")
-                    .replace(evento_kebab_map, default=None)
-                    .alias("tipo_codigo"),
-                ]
-            )
-            .collect()
+        # Generar códigos kebab vectorizados (mismas reglas que generar_slug);
+        # los valores vacíos quedan en null para no matchear "unknown"
+        df_prepared = df_cleaned.with_columns(
+            [
+                pl.when(pl.col("grupo_nombre_clean").is_not_null())
+                .then(pl_slug("grupo_nombre_clean"))
+                .alias("grupo_codigo"),
+                pl.when(pl.col("evento_nombre_clean").is_not_null())
+                .then(pl_slug("evento_nombre_clean"))
+                .alias("tipo_codigo"),
+            ]
         )
 
         # 4. JOIN con mappings para obtener IDs
@@ -626,6 +600,16 @@ class CasoEpidemiologicosProcessor(BulkProcessorBase):
             .collect()
         )
 
+        # Resolver establecimientos con un join por columna (no when/then por
+        # establecimiento ni lookup por fila)
+        establecimientos = CatalogResolver(establecimiento_mapping)
+        for col_nombre, col_id in (
+            ("estab_consulta_final", "id_estab_consulta"),
+            ("estab_notif_final", "id_estab_notif"),
+            ("estab_carga_final", "id_estab_carga"),
+        ):
+            agg_results = establecimientos.resolve(agg_results, col_nombre, col_id)
+
         # 6. OPTIMIZACIÓN: Bulk load de domicilios (elimina N+1 queries)
         # Pre-cargar todos los domicilios existentes que necesitamos
         domicilios_map = self._bulk_load_domicilios(agg_results)
@@ -679,21 +663,10 @@ class CasoEpidemiologicosProcessor(BulkProcessorBase):
             # OPTIMIZACIÓN: Lookup de domicilio en dict (O(1) en lugar de query)
             id_domicilio = domicilios_map.get(id_evento_caso)
 
-            # Mapear establecimientos usando el mapping
-            id_estab_consulta = None
-            id_estab_notif = None
-            id_estab_carga = None
-
-            estab_consulta_final = agg_row.get("estab_consulta_final")
-            estab_notif_final = agg_row.get("estab_notif_final")
-            estab_carga_final = agg_row.get("estab_carga_final")
-
-            if estab_consulta_final:
-                id_estab_consulta = establecimiento_mapping.get(estab_consulta_final)
-            if estab_notif_final:
-                id_estab_notif = establecimiento_mapping.get(estab_notif_final)
-            if estab_carga_final:
-                id_estab_carga = establecimiento_mapping.get(estab_carga_final)
+            # Establecimientos ya resueltos por CatalogResolver
+            id_estab_consulta = agg_row.get("id_estab_consulta")
+            id_estab_notif = agg_row.get("id_estab_notif")
+            id_estab_carga = agg_row.get("id_estab_carga")
 
             # Procesar clasificación
             clasificacion_estrategia = agg_row.get("clasificacion_estrategia_first")
@@ -809,6 +782,14 @@ class CasoEpidemiologicosProcessor(BulkProcessorBase):
             f"notificación={eventos_con_notif}, carga={eventos_con_carga}"
         )
 
+        # Particionado por año epidemiológico: crear las particiones que falten
+        # y mover de partición los casos cuyo año cambió antes del upsert
+        anios_lote = {e["fecha_minima_caso_anio_epi"] for e in eventos_data}
+        particiones_creadas = asegurar_particiones(self.context.session, anios_lote)
+        if particiones_creadas:
+            self.logger.info(f"🗂️ {particiones_creadas} particiones nuevas")
+        self._mover_casos_de_anio(eventos_data)
+
         # PostgreSQL UPSERT
         stmt = pg_insert(inspect(CasoEpidemiologico).local_table).values(eventos_data)
 
@@ -820,9 +801,8 @@ class CasoEpidemiologicosProcessor(BulkProcessorBase):
             "fecha_minima_caso": stmt.excluded.fecha_minima_caso,
             "semana_epidemiologica_apertura": stmt.excluded.semana_epidemiologica_apertura,
             "anio_epidemiologico_apertura": stmt.excluded.anio_epidemiologico_apertura,
-            # Nuevos campos canónicos
+            # Nuevos campos canónicos (el año es parte de la clave de conflicto)
             "fecha_minima_caso_semana_epi": stmt.excluded.fecha_minima_caso_semana_epi,
-            "fecha_minima_caso_anio_epi": stmt.excluded.fecha_minima_caso_anio_epi,
             "semana_epidemiologica_sintomas": stmt.excluded.semana_epidemiologica_sintomas,
             "fecha_nacimiento": stmt.excluded.fecha_nacimiento,
             "id_enfermedad": stmt.excluded.id_enfermedad,
@@ -833,23 +813,30 @@ class CasoEpidemiologicosProcessor(BulkProcessorBase):
             "updated_at": self._get_current_timestamp(),
         }
 
+        # uq_caso_id_snvs_anio: el conflicto se resuelve dentro de la partición
         upsert_stmt = stmt.on_conflict_do_update(
-            index_elements=["id_snvs"],
+            index_elements=["id_snvs", "fecha_minima_caso_anio_epi"],
             set_=update_fields,
         )
 
         self.context.session.execute(upsert_stmt)
 
-        # Obtener mapping de id_snvs -> id (PK) para los eventos insertados
+        # Obtener mapping de id_snvs -> id (PK) para los eventos insertados,
+        # podando por los años del lote
         id_eventos_casos = [e["id_snvs"] for e in eventos_data]
         stmt = select(
-            col(CasoEpidemiologico.id), col(CasoEpidemiologico.id_snvs)
-        ).where(col(CasoEpidemiologico.id_snvs).in_(id_eventos_casos))
+            col(CasoEpidemiologico.id),
+            col(CasoEpidemiologico.id_snvs),
+            col(CasoEpidemiologico.fecha_minima_caso_anio_epi),
+        ).where(
+            col(CasoEpidemiologico.id_snvs).in_(id_eventos_casos),
+            col(CasoEpidemiologico.fecha_minima_caso_anio_epi).in_(anios_lote),
+        )
 
-        evento_mapping = {
-            id_snvs: evento_id
-            for evento_id, id_snvs in self.context.session.execute(stmt).all()
-        }
+        evento_mapping = {}
+        for evento_id, id_snvs, anio_epi in self.context.session.execute(stmt).all():
+            evento_mapping[id_snvs] = evento_id
+            self.context.anio_por_caso[evento_id] = anio_epi
 
         # Insertar relaciones many-to-many en evento_grupo_eno
         from app.domains.vigilancia_nominal.models.caso import CasoGrupoEnfermedad
@@ -895,6 +882,72 @@ class CasoEpidemiologicosProcessor(BulkProcessorBase):
 
         return evento_mapping
 
+    def _mover_casos_de_anio(self, eventos_data: list[dict]) -> int:
+        """
+        Mueve de partición los casos existentes cuyo año epidemiológico cambió.
+
+        ON CONFLICT no puede mover una fila entre particiones y, como el
+        conflicto se resuelve por (id_snvs, año), sin este paso el caso quedaría
+        duplicado. Las tablas hijas se actualizan acá porque la ingesta corre
+        con ``session_replication_role = replica``: los triggers de FK están
+        desactivados y el ON UPDATE CASCADE no se dispara.
+
+        Returns:
+            Cantidad de casos movidos
+        """
+        caso = inspect(CasoEpidemiologico).local_table
+        lote = values(
+            column("id_snvs", BigInteger), column("anio", Integer), name="lote"
+        ).data([(e["id_snvs"], e["fecha_minima_caso_anio_epi"]) for e in eventos_data])
+        stmt = (
+            update(caso)
+            .where(
+                caso.c.id_snvs == lote.c.id_snvs,
+                caso.c.fecha_minima_caso_anio_epi != lote.c.anio,
+            )
+            .values(fecha_minima_caso_anio_epi=lote.c.anio)
+            .returning(caso.c.id, caso.c.fecha_minima_caso_anio_epi)
+        )
+        movidos = [tuple(fila) for fila in self.context.session.execute(stmt).all()]
+        if not movidos:
+            return 0
+
+        casos_movidos = values(
+            column("id", Integer), column("anio", Integer), name="movidos"
+        ).data(movidos)
+        for modelo in (
+            DetalleCasoSintomas,
+            MuestraCasoEpidemiologico,
+            DiagnosticoCasoEpidemiologico,
+            CasoAgente,
+        ):
+            hija = inspect(modelo).local_table
+            self.context.session.execute(
+                update(hija)
+                .where(
+                    hija.c.id_caso == casos_movidos.c.id,
+                    hija.c.anio_epi_caso != casos_movidos.c.anio,
+                )
+                .values(anio_epi_caso=casos_movidos.c.anio)
+            )
+
+        # Los estudios siguen a su muestra (ya movida)
+        estudio = inspect(EstudioCasoEpidemiologico).local_table
+        muestra = inspect(MuestraCasoEpidemiologico).local_table
+        self.context.session.execute(
+            update(estudio)
+            .where(
+                estudio.c.id_muestra == muestra.c.id,
+                muestra.c.id_caso == casos_movidos.c.id,
+                muestra.c.anio_epi_caso == casos_movidos.c.anio,
+                estudio.c.anio_epi_caso != casos_movidos.c.anio,
+            )
+            .values(anio_epi_caso=casos_movidos.c.anio)
+        )
+
+        self.logger.info(f"🗂️ {len(movidos)} casos cambiaron de año epidemiológico")
+        return len(movidos)
+
     def _get_or_create_domicilio(self, row: dict) -> int | None:
         """
         Get or create an immutable domicilio record.
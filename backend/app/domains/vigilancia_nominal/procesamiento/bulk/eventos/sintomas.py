@@ -4,10 +4,10 @@ from datetime import date, datetime
 from typing import Any
 
 import polars as pl
-from sqlalchemy import inspect, select
+from sqlalchemy import inspect
 from sqlalchemy.dialects.postgresql import insert as pg_insert
-from sqlmodel import col
 
+from app.core.catalog_snapshots import catalog_snapshots
 from app.core.epidemiology import (
     calcular_semana_epidemiologica,
 )
@@ -87,6 +87,7 @@ class SintomasProcessor(BulkProcessorBase):
             .select(
                 [
                     pl.col("id_caso"),  # Cambiado de id_evento a id_caso
+                    pl.col("anio_epi_caso"),
                     pl_clean_string(Columns.SIGNO_SINTOMA.name).alias("sintoma_raw"),
                     (
                         pl.col(Columns.FECHA_INICIO_SINTOMA.name)
@@ -152,7 +153,7 @@ class SintomasProcessor(BulkProcessorBase):
         # 9. POLARS: Deduplicar y agregrar por (id_caso, id_sintoma)
         # Mantener la fecha más temprana para cada combinación
         sintomas_dedup = sintomas_validos.group_by(
-            ["id_caso", "id_sintoma"]
+            ["id_caso", "anio_epi_caso", "id_sintoma"]
         ).agg(  # Cambiado de id_evento a id_caso
             [pl.col("fecha_inicio_sintoma").min().alias("fecha_inicio_sintoma")]
         )
@@ -186,6 +187,7 @@ class SintomasProcessor(BulkProcessorBase):
                     "id_caso": int(
                         record["id_caso"]
                     ),  # Cambiado de id_evento a id_caso
+                    "anio_epi_caso": int(record["anio_epi_caso"]),
                     "id_sintoma": int(record["id_sintoma"]),
                     "fecha_inicio_sintoma": fecha_inicio,
                     "semana_epidemiologica_aparicion_sintoma": semana_epi,
@@ -204,7 +206,8 @@ class SintomasProcessor(BulkProcessorBase):
                 index_elements=[
                     "id_caso",
                     "id_sintoma",
-                ],  # Cambiado de id_evento a id_caso
+                    "anio_epi_caso",
+                ],  # uq_caso_sintoma (incluye la clave de partición)
                 set_={
                     "fecha_inicio_sintoma": stmt.excluded.fecha_inicio_sintoma,
                     "semana_epidemiologica_aparicion_sintoma": stmt.excluded.semana_epidemiologica_aparicion_sintoma,
@@ -284,18 +287,15 @@ class SintomasProcessor(BulkProcessorBase):
         sintomas_data = dict(
             zip(
                 sintomas_prepared["sintoma_clean"].to_list(),
-                sintomas_prepared["id_snvs"].to_list(), strict=False,
+                sintomas_prepared["id_snvs"].to_list(),
+                strict=False,
             )
         )
 
-        # 4. Verificar existentes
-        stmt = select(col(Sintoma.id), col(Sintoma.signo_sintoma)).where(
-            col(Sintoma.signo_sintoma).in_(list(sintomas_data.keys()))
+        # 4. Verificar existentes (snapshot compartido entre jobs)
+        existing_mapping = catalog_snapshots.lookup(
+            self.context.session, Sintoma, "signo_sintoma", sintomas_data.keys()
         )
-        existing_mapping = {
-            signo_sintoma: sintoma_id
-            for sintoma_id, signo_sintoma in self.context.session.execute(stmt).all()
-        }
 
         # 5. Crear nuevos con IDs del CSV
         nuevos_sintomas = []
@@ -316,23 +316,19 @@ class SintomasProcessor(BulkProcessorBase):
             stmt = pg_insert(inspect(Sintoma).local_table).values(nuevos_sintomas)
             self.context.session.execute(stmt.on_conflict_do_nothing())
 
-        # 6. SIEMPRE re-obtener mapping completo después de cualquier inserción
-        # Usar id_snvs_signo_sintoma para el mapping ya que es único y consistente
-        stmt = select(
-            col(Sintoma.id),
-            col(Sintoma.id_snvs_signo_sintoma),
-            col(Sintoma.signo_sintoma),
-        ).where(col(Sintoma.id_snvs_signo_sintoma).in_(list(sintomas_data.values())))
-
-        all_results = list(self.context.session.execute(stmt).all())
-        self.logger.info(f"Mapping de síntomas: {len(all_results)} encontrados en BD")
-
-        # 7. Crear mapping por nombre de síntoma basado en los IDs SNVS
-        id_snvs_to_db_id = {
-            id_snvs: sintoma_id for sintoma_id, id_snvs, _ in all_results
-        }
+        # 6. Mapping por id_snvs_signo_sintoma (único y consistente); los recién
+        # insertados no están en el snapshot y se consultan a la BD
+        id_snvs_to_db_id = catalog_snapshots.lookup(
+            self.context.session,
+            Sintoma,
+            "id_snvs_signo_sintoma",
+            sintomas_data.values(),
+        )
+        self.logger.info(
+            f"Mapping de síntomas: {len(id_snvs_to_db_id)} encontrados en BD"
+        )
 
-        # 8. Crear el mapping final: signo_sintoma (UPPER) -> id de la BD
+        # 7. Crear el mapping final: signo_sintoma (UPPER) -> id de la BD
         final_mapping = {}
         sintomas_faltantes = []
 
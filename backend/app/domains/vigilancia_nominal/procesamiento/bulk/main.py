@@ -8,6 +8,7 @@ OPTIMIZACIONES ARQUITECTURALES:
 - Pre-filtrado por dominios (evita filtros redundantes)
 - Join con evento_mapping una sola vez
 - Creación de catálogos al inicio (mejor orden de ejecución)
+- Snapshots de catálogos reutilizados entre jobs (app.core.catalog_snapshots)
 - Ejecución paralela de operaciones independientes (ThreadPoolExecutor)
 """
 
@@ -30,7 +31,17 @@ from app.core.bulk import (
     pl_safe_date,
     pl_safe_int,
 )
+from app.core.catalog_snapshots import catalog_snapshots
+from app.core.config import settings
+from app.domains.alertas.motor import semanas_de_casos
 from app.domains.territorio.establecimientos_models import Establecimiento
+from app.domains.vigilancia_nominal.procesamiento.vinculacion import (
+    vincular_ciudadanos,
+)
+from app.domains.vigilancia_nominal.queries.resumen_ciudadanos import (
+    ciudadanos_de_casos,
+    refrescar_resumen_ciudadanos,
+)
 
 from ..config.columns import Columns
 from .ciudadanos import CiudadanosManager
@@ -68,6 +79,9 @@ class MainProcessor:
         self.total_operaciones = 19
         self.operaciones_completadas = 0
 
+        # (id_enfermedad, año, semana) cargados, para evaluar alertas
+        self.semanas_afectadas: list[tuple[int, int, int]] = []
+
     def _preprocesar_dataframe(self, df: pl.DataFrame) -> pl.DataFrame:
         """
         Pre-procesa el DataFrame con conversiones comunes.
@@ -151,7 +165,7 @@ class MainProcessor:
         self, df: pl.DataFrame, mapeo_eventos: dict[int, int]
     ) -> pl.DataFrame:
         """
-        Agrega columna id_evento al DataFrame mediante JOIN.
+        Agrega columnas id_caso y anio_epi_caso al DataFrame mediante JOIN.
 
         OPTIMIZACIÓN: Hace el JOIN UNA SOLA VEZ en lugar de que cada processor
         convierta el dict a DataFrame y haga su propio join (elimina ~10 joins redundantes).
@@ -161,7 +175,8 @@ class MainProcessor:
             mapeo_eventos: Dict mapping id_evento_caso -> id_evento
 
         Returns:
-            DataFrame con columna id_evento agregada
+            DataFrame con id_caso y el año epidemiológico del caso (clave de
+            partición de las tablas hijas)
         """
         if not mapeo_eventos or Columns.IDEVENTOCASO.name not in df.columns:
             return df
@@ -171,6 +186,10 @@ class MainProcessor:
             {
                 "id_evento_caso_original": list(mapeo_eventos.keys()),
                 "id_caso": list(mapeo_eventos.values()),
+                "anio_epi_caso": [
+                    self.context.anio_por_caso[id_caso]
+                    for id_caso in mapeo_eventos.values()
+                ],
             }
         )
 
@@ -225,6 +244,9 @@ class MainProcessor:
         self.logger.info("🚀 Deshabilitando FK checks para máxima velocidad...")
         self.context.session.execute(text("SET session_replication_role = replica"))
 
+        # Catálogos cacheados entre jobs: una consulta de versión por tabla
+        catalog_snapshots.validar(self.context.session)
+
         try:
             # ===== OPTIMIZACIÓN 1: PRE-PROCESAMIENTO =====
             # Convertir columnas comunes UNA SOLA VEZ
@@ -234,7 +256,9 @@ class MainProcessor:
             # ===== OPTIMIZACIÓN 2: PRE-FILTRADO =====
             # Crear vistas filtradas por dominio UNA SOLA VEZ
             self.logger.info("Creando vistas filtradas por dominio...")
-            df_ciudadanos, df_eventos, _df_completo = self._preparar_vistas_filtradas(df)
+            df_ciudadanos, df_eventos, _df_completo = self._preparar_vistas_filtradas(
+                df
+            )
 
             # 1. ESTABLECIMIENTOS - Independientes, crean el catálogo
             mapeo_establecimientos = (
@@ -299,6 +323,15 @@ class MainProcessor:
             # IMPORTANTE: Crear síntomas ANTES de crear eventos y relaciones
             mapeo_sintomas = self.manager_eventos._get_or_create_sintomas(df)
 
+            # Titulares actuales de los casos del archivo: si el upsert pasa un
+            # caso a otro ciudadano, el anterior también necesita su resumen
+            ciudadanos_previos: set[int] = set()
+            if "id_evento_caso_int" in df.columns:
+                ciudadanos_previos = ciudadanos_de_casos(
+                    self.context.session,
+                    df.get_column("id_evento_caso_int").drop_nulls().unique().to_list(),
+                )
+
             mapeo_eventos = self.manager_eventos.upsert_eventos(
                 df, mapeo_establecimientos
             )
@@ -435,6 +468,40 @@ class MainProcessor:
 
             self.logger.info("✅ Todas las operaciones completadas (Fase 1 + Fase 2)")
 
+            # Resumen de casos por ciudadano (listado de personas), solo para
+            # los ciudadanos del archivo y los que perdieron casos
+            if "codigo_ciudadano_int" in df.columns:
+                codigos_ciudadano = (
+                    df.get_column("codigo_ciudadano_int")
+                    .drop_nulls()
+                    .unique()
+                    .to_list()
+                )
+                a_refrescar = sorted(ciudadanos_previos.union(codigos_ciudadano))
+                refrescar_resumen_ciudadanos(self.context.session, a_refrescar)
+                self.logger.info(
+                    f"✅ Resumen de {len(a_refrescar)} ciudadanos actualizado"
+                )
+
+                # Candidatos a duplicados: un error acá no debe perder la ingesta,
+                # por eso corre en un savepoint
+                if settings.VINCULACION_HABILITADA:
+                    try:
+                        with self.context.session.begin_nested():
+                            vinculacion = vincular_ciudadanos(
+                                self.context.session, codigos_ciudadano
+                            )
+                        self.logger.info(
+                            f"✅ Vinculación: {vinculacion.candidatos} candidatos a "
+                            f"duplicado ({vinculacion.personas_procesadas} ciudadanos "
+                            f"procesados, {vinculacion.pares_comparados} pares) en "
+                            f"{vinculacion.duracion_segundos:.2f}s"
+                        )
+                    except Exception as exc:
+                        self.logger.warning(
+                            f"⚠️ Vinculación de ciudadanos falló, se omite: {exc}"
+                        )
+
             # ===== COMMIT CRÍTICO 3: TODAS LAS RELACIONES Y DATOS SECUNDARIOS =====
             # Todas las operaciones desde ciudadanos_datos hasta contactos en un solo commit
             # Esto incluye: ciudadanos_datos, ambitos, síntomas, antecedentes, muestras,
@@ -442,6 +509,19 @@ class MainProcessor:
             self.context.session.commit()
             self.logger.info("✅ Todas las relaciones y datos secundarios committed")
             self._actualizar_progreso_operacion("relaciones y datos secundarios")
+
+            # Semanas del archivo: las alertas se evalúan solo sobre ellas
+            if settings.ALERTAS_HABILITADAS and mapeo_eventos:
+                try:
+                    self.semanas_afectadas = semanas_de_casos(
+                        self.context.session,
+                        list(mapeo_eventos.values()),
+                        self.context.anio_por_caso.values(),
+                    )
+                except Exception as exc:
+                    self.logger.warning(
+                        f"⚠️ No se pudieron obtener las semanas para alertas: {exc}"
+                    )
             self._loguear_resumen(resultados)
 
             return resultados
@@ -88,6 +88,7 @@ class MuestrasProcessor(BulkProcessorBase):
                     pl_safe_int(Columns.ID_SNVS_MUESTRA.name).alias("id_snvs_muestra"),
                     # Use id_evento directly - already added by main.py via JOIN
                     pl.col("id_caso"),
+                    pl.col("anio_epi_caso"),
                     # Limpiar tipo de muestra
                     (
                         pl_clean_string(Columns.MUESTRA.name).str.to_uppercase()
@@ -170,6 +171,7 @@ class MuestrasProcessor(BulkProcessorBase):
                 [
                     "id_snvs_muestra",
                     "id_caso",
+                    "anio_epi_caso",
                     "id_muestra",
                     "id_establecimiento",
                     "fecha_toma_muestra",
@@ -196,7 +198,8 @@ class MuestrasProcessor(BulkProcessorBase):
             table = SQLModel.metadata.tables[MuestraCasoEpidemiologico.__tablename__]
             stmt = pg_insert(table).values(muestras_eventos_data)
             upsert_stmt = stmt.on_conflict_do_update(
-                index_elements=["id_snvs_muestra", "id_caso"],
+                # uq_muestra_caso (incluye la clave de partición)
+                index_elements=["id_snvs_muestra", "id_caso", "anio_epi_caso"],
                 set_={
                     "id_muestra": stmt.excluded.id_muestra,
                     "id_establecimiento": stmt.excluded.id_establecimiento,
@@ -15,6 +15,7 @@ from typing import TypeVar
 from app.core.bulk import (
     BulkOperationResult,
     BulkProcessorBase,
+    CatalogResolver,
     get_current_timestamp,
     get_or_create_catalog,
     has_any_value,
@@ -22,15 +23,18 @@ from app.core.bulk import (
     pl_clean_string,
     pl_col_or_null,
     pl_map_boolean,
+    pl_map_catalog,
     pl_map_sexo,
     pl_map_tipo_documento,
     pl_safe_date,
     pl_safe_int,
+    pl_slug,
 )
 
 __all__ = [
     "BulkOperationResult",
     "BulkProcessorBase",
+    "CatalogResolver",
     "get_current_timestamp",
     "get_or_create_catalog",
     "has_any_value",
@@ -38,10 +42,12 @@ __all__ = [
     "pl_clean_string",
     "pl_col_or_null",
     "pl_map_boolean",
+    "pl_map_catalog",
     "pl_map_sexo",
     "pl_map_tipo_documento",
     "pl_safe_date",
     "pl_safe_int",
+    "pl_slug",
 ]
 
 # Patrones de calles inválidas
@@ -7,11 +7,13 @@ Cada columna se define UNA SOLA VEZ con nombre + tipo + si es requerida.
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import pandas as pd
 import polars as pl
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 # === TIPOS DE DATOS ===
 
 
@@ -339,7 +341,7 @@ def get_columns_by_type(column_type: ColumnType) -> list[str]:
     return [col.name for col in _get_all_columns() if col.type == column_type]
 
 
-def validate_dataframe(df: pd.DataFrame) -> dict[str, Any]:
+def validate_dataframe(df: "pd.DataFrame") -> dict[str, Any]:
     """
     Valida que el DataFrame tenga las columnas requeridas.
 
@@ -22,6 +22,9 @@ class ProcessingContext:
         self.session = session
         self.progress_callback = progress_callback
         self.batch_size = batch_size
+        # Año epidemiológico (clave de partición) de cada caso del lote:
+        # id_caso -> año. Lo completa upsert_eventos para las tablas hijas.
+        self.anio_por_caso: dict[int, int] = {}
 
     def update_progress(self, percentage: int, message: str) -> None:
         """Actualiza el progreso del procesamiento."""
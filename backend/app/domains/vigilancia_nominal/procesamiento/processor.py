@@ -98,6 +98,7 @@ class SimpleEpidemiologicalProcessor:
                     "diagnosticos_creados", 0
                 ),
                 "errors": self.estadisticas["errores"],
+                "semanas_afectadas": self.estadisticas.get("semanas_afectadas", []),
             }
 
         except Exception as e:
@@ -185,6 +186,7 @@ class SimpleEpidemiologicalProcessor:
         self.estadisticas["diagnosticos_creados"] = resultados.get(
             "diagnosticos_eventos", BulkOperationResult(0, 0, 0, [], 0.0)
         ).inserted_count
+        self.estadisticas["semanas_afectadas"] = procesador.semanas_afectadas
 
         # Agregar errores si los hay
         errores_list = self.estadisticas.get("errores")
@@ -0,0 +1,605 @@
+"""
+Vinculación de registros de ciudadanos (detección de duplicados).
+
+En la ingesta los ciudadanos se identifican por ``codigo_ciudadano``: una misma
+persona cargada con otro código (documento faltante o mal tipeado) queda como
+dos personas e infla los conteos. Comparar todos contra todos es cuadrático,
+así que la vinculación usa bloqueo:
+
+1. Cada ciudadano tiene claves de bloqueo (``ciudadano_clave_bloqueo``):
+   apellido fonético + año de nacimiento, nombre + apellido fonéticos,
+   apellido fonético + localidad y número de documento.
+2. Solo se comparan pares que comparten alguna clave. Los bloques más grandes
+   que ``VINCULACION_MAX_BLOQUE`` (claves demasiado comunes) se ignoran.
+3. Cada par se puntúa con similitudes vectorizadas (Dice de bigramas para
+   nombre y apellido, fecha de nacimiento con errores típicos de tipeo,
+   documento con un dígito cambiado o dos transpuestos) y los pares sobre
+   ``VINCULACION_UMBRAL`` se guardan en ``ciudadano_candidato_fusion`` para
+   revisión manual. Nunca se fusiona automáticamente.
+
+Es incremental: en cada ingesta solo se procesan los ciudadanos del archivo
+cuyas claves cambiaron (o que no tenían), contra los miembros de sus bloques.
+El costo es proporcional al archivo y no al padrón. Los ciudadanos cargados
+antes de crear la tabla de claves se vinculan una vez con
+``python -m app.commands.vincular_ciudadanos``.
+"""
+
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import polars as pl
+from sqlalchemy import String, cast, delete, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, col
+
+from app.core.config import settings
+from app.domains.territorio.geografia_models import Domicilio
+from app.domains.vigilancia_nominal.models.sujetos import (
+    Ciudadano,
+    CiudadanoCandidatoFusion,
+    CiudadanoClaveBloqueo,
+    CiudadanoDomicilio,
+    EstadoCandidatoFusion,
+)
+
+# Ciudadanos por lote (lecturas con IN y escrituras)
+_LOTE = 5000
+
+# Peso de cada campo en el score; los campos nulos en alguno de los dos
+# registros no cuentan (ni a favor ni en contra)
+PESOS = {
+    "apellido": 0.35,
+    "nombre": 0.25,
+    "fecha_nacimiento": 0.2,
+    "documento": 0.2,
+}
+# Sexo informado y distinto en los dos registros
+_FACTOR_SEXO_DISTINTO = 0.7
+
+# Reglas fonéticas para español, en orden. Las mayúsculas son marcadores
+# temporales para que una regla no vuelva a disparar otra (gue -> ge -> je).
+# "ll" se colapsa como letra doble: villalba y vilalba son más frecuentes en
+# la carga que la confusión ll/y.
+_REEMPLAZOS_FONETICOS = (
+    ("ch", "X"),
+    ("qu", "k"),
+    ("gu([ei])", "G${1}"),
+    ("g([ei])", "j${1}"),
+    ("c([ei])", "s${1}"),
+    ("c", "k"),
+    ("z", "s"),
+    ("x", "ks"),
+    ("v", "b"),
+    ("w", "b"),
+    ("h", ""),
+    ("y([^aeiou]|$)", "i${1}"),
+)
+_LETRAS = "abdefgijklmnoprstuyGX"
+
+_ESQUEMA_PERSONAS: dict[str, pl.DataType] = {
+    "codigo_ciudadano": pl.Int64(),
+    "nombre": pl.Utf8(),
+    "apellido": pl.Utf8(),
+    "numero_documento": pl.Int64(),
+    "fecha_nacimiento": pl.Date(),
+    "sexo": pl.Utf8(),
+    "id_localidad_indec": pl.Int64(),
+}
+
+
+@dataclass
+class ResultadoVinculacion:
+    personas: int = 0
+    personas_procesadas: int = 0
+    pares_comparados: int = 0
+    candidatos: int = 0
+    duracion_segundos: float = 0.0
+
+
+# =============================================================================
+# NORMALIZACIÓN Y CLAVES
+# =============================================================================
+
+
+def normalizar_nombre(expr: pl.Expr) -> pl.Expr:
+    """Minúsculas, sin acentos, solo letras y espacios simples (vacío = null)."""
+    texto = (
+        expr.str.to_lowercase()
+        .str.normalize("NFKD")
+        .str.replace_all(r"\p{Mn}", "")
+        .str.replace_all(r"[^a-z]+", " ")
+        .str.strip_chars()
+    )
+    return pl.when(texto.str.len_chars() > 0).then(texto)
+
+
+def fonetizar(expr: pl.Expr) -> pl.Expr:
+    """
+    Forma fonética de un nombre ya normalizado.
+
+    Unifica grafías que suenan igual en español (b/v, c/k/qu, s/z/ce/ci,
+    j/ge/gi, h muda, letras dobles), así "gonzalez" y "gonsales" quedan
+    iguales.
+    """
+    for patron, reemplazo in _REEMPLAZOS_FONETICOS:
+        expr = expr.str.replace_all(patron, reemplazo)
+    for letra in _LETRAS:
+        expr = expr.str.replace_all(f"{letra}{{2,}}", letra)
+    return expr
+
+
+def clave_fonetica(expr: pl.Expr) -> pl.Expr:
+    """
+    Clave de bloqueo: primera palabra fonética sin las vocales posteriores a
+    la primera letra (concentran los errores de tipeo).
+
+    Examples:
+        "gonzalez" y "gonsales" -> "gnsls"; "villalba" y "bilalva" -> "bllb"
+    """
+    palabra = expr.str.split(" ").list.first()
+    return pl.concat_str(
+        palabra.str.slice(0, 1), palabra.str.slice(1).str.replace_all("[aeiou]", "")
+    )
+
+
+def preparar_personas(personas: pl.DataFrame) -> pl.DataFrame:
+    """Agrega nombre/apellido en forma fonética y sus claves."""
+    return (
+        personas.with_columns(
+            fonetizar(normalizar_nombre(pl.col("nombre"))).alias("nombre"),
+            fonetizar(normalizar_nombre(pl.col("apellido"))).alias("apellido"),
+        )
+        .with_columns(
+            pl.col("nombre").str.split(" ").list.first().alias("primer_nombre")
+        )
+        .with_columns(
+            clave_fonetica(pl.col("nombre")).alias("fonetico_nombre"),
+            clave_fonetica(pl.col("apellido")).alias("fonetico_apellido"),
+        )
+    )
+
+
+def claves_bloqueo(personas: pl.DataFrame) -> pl.DataFrame:
+    """
+    Claves de bloqueo de cada persona (una fila por persona y tipo).
+
+    Args:
+        personas: Resultado de ``preparar_personas``
+
+    Returns:
+        DataFrame con ``codigo_ciudadano``, ``tipo`` y ``clave``
+    """
+    apellido = pl.col("fonetico_apellido")
+    claves = {
+        "apellido_anio": pl.concat_str(
+            apellido, pl.col("fecha_nacimiento").dt.year().cast(pl.Utf8), separator="|"
+        ),
+        "nombre_apellido": pl.concat_str(
+            pl.col("fonetico_nombre"), apellido, separator="|"
+        ),
+        "apellido_localidad": pl.concat_str(
+            apellido, pl.col("id_localidad_indec").cast(pl.Utf8), separator="|"
+        ),
+        "documento": pl.col("numero_documento").cast(pl.Utf8),
+    }
+    return pl.concat(
+        [
+            personas.select(
+                pl.col("codigo_ciudadano"),
+                pl.lit(tipo).alias("tipo"),
+                expresion.alias("clave"),
+            )
+            for tipo, expresion in claves.items()
+        ]
+    ).filter(pl.col("clave").is_not_null() & (pl.col("clave").str.len_chars() > 0))
+
+
+# =============================================================================
+# SIMILITUD
+# =============================================================================
+
+
+def _bigramas(personas: pl.DataFrame, columna: str) -> pl.Series:
+    """Bigramas únicos de cada valor (con un espacio de relleno en los bordes)."""
+    return (
+        personas.lazy()
+        .select(
+            pl.int_range(pl.len()).alias("fila"),
+            pl.concat_str(pl.lit(" "), pl.col(columna), pl.lit(" ")).alias("texto"),
+        )
+        .with_columns(
+            pl.int_ranges(0, pl.col("texto").str.len_chars() - 1).alias("inicio")
+        )
+        .explode("inicio")
+        .group_by("fila")
+        .agg(pl.col("texto").str.slice(pl.col("inicio"), 2).drop_nulls().unique())
+        .sort("fila")
+        .collect()
+        .get_column("texto")
+    )
+
+
+def _similitud_dice(campo: str) -> pl.Expr:
+    """
+    Coeficiente de Dice entre los bigramas de ``campo`` de cada lado del par.
+
+    Null si el campo falta (o queda vacío al normalizar) en alguno de los dos
+    registros: un nombre sin cargar no cuenta como nombre distinto.
+    """
+    a, b = pl.col(f"bigramas_{campo}_a"), pl.col(f"bigramas_{campo}_b")
+    total = a.list.len() + b.list.len()
+    return pl.when((a.list.len() > 0) & (b.list.len() > 0)).then(
+        2 * a.list.set_intersection(b).list.len() / total
+    )
+
+
+def _similitud_fecha() -> pl.Expr:
+    """Fecha de nacimiento: igual, día/mes invertidos, día o año mal tipeado."""
+    a, b = pl.col("fecha_nacimiento_a"), pl.col("fecha_nacimiento_b")
+    mismo_anio = a.dt.year() == b.dt.year()
+    mismo_mes = a.dt.month() == b.dt.month()
+    return (
+        pl.when(a.is_null() | b.is_null())
+        .then(None)
+        .when(a == b)
+        .then(1.0)
+        .when(mismo_anio & (a.dt.month() == b.dt.day()) & (a.dt.day() == b.dt.month()))
+        .then(0.8)
+        .when(mismo_anio & mismo_mes)
+        .then(0.6)
+        .when(
+            mismo_mes
+            & (a.dt.day() == b.dt.day())
+            & ((a.dt.year() - b.dt.year()).abs() <= 10)
+        )
+        .then(0.6)
+        .otherwise(0.0)
+        .alias("fecha_nacimiento")
+    )
+
+
+def similitud_documento(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Similitud entre números de documento (NaN si falta alguno).
+
+    1 si son iguales, 0.8 si difieren en un dígito o en dos dígitos contiguos
+    transpuestos, 0 en otro caso.
+    """
+    faltante = np.isnan(a) | np.isnan(b)
+    da = np.nan_to_num(a).astype(np.int64)
+    db = np.nan_to_num(b).astype(np.int64)
+    potencias = 10 ** np.arange(10, dtype=np.int64)
+    digitos_a = (da[:, None] // potencias) % 10
+    digitos_b = (db[:, None] // potencias) % 10
+    distintos = digitos_a != digitos_b
+    cantidad = distintos.sum(axis=1)
+    transpuestos = (
+        distintos[:, :-1]
+        & distintos[:, 1:]
+        & (digitos_a[:, :-1] == digitos_b[:, 1:])
+        & (digitos_a[:, 1:] == digitos_b[:, :-1])
+    ).any(axis=1)
+    # Un dígito de más o de menos cambia la magnitud: no es un error de tipeo
+    misma_longitud = np.floor(np.log10(np.maximum(da, 1))) == np.floor(
+        np.log10(np.maximum(db, 1))
+    )
+    similitud = np.select(
+        [
+            cantidad == 0,
+            misma_longitud & (cantidad == 1),
+            misma_longitud & (cantidad == 2) & transpuestos,
+        ],
+        [1.0, 0.8, 0.8],
+        default=0.0,
+    )
+    return np.where(faltante, np.nan, similitud)
+
+
+def puntuar_pares(pares: pl.DataFrame, personas: pl.DataFrame) -> pl.DataFrame:
+    """
+    Score de cada par candidato.
+
+    Args:
+        pares: ``codigo_ciudadano_a``, ``codigo_ciudadano_b`` y ``bloques``
+        personas: Resultado de ``preparar_personas`` con todos los códigos
+            de los pares
+
+    Returns:
+        Los pares con la similitud por campo y ``score``
+    """
+    atributos = personas.select(
+        "codigo_ciudadano",
+        "fecha_nacimiento",
+        "numero_documento",
+        "sexo",
+        _bigramas(personas, "nombre").alias("bigramas_nombre"),
+        _bigramas(personas, "apellido").alias("bigramas_apellido"),
+        _bigramas(personas, "primer_nombre").alias("bigramas_primer_nombre"),
+    )
+    df = pares.join(atributos.rename(lambda c: f"{c}_a"), on="codigo_ciudadano_a").join(
+        atributos.rename(lambda c: f"{c}_b"), on="codigo_ciudadano_b"
+    )
+
+    df = df.with_columns(
+        _similitud_dice("apellido").alias("apellido"),
+        # El segundo nombre suele faltar en alguno de los registros
+        pl.max_horizontal(
+            _similitud_dice("nombre"), _similitud_dice("primer_nombre")
+        ).alias("nombre"),
+        _similitud_fecha(),
+        pl.Series(
+            "documento",
+            similitud_documento(
+                df.get_column("numero_documento_a").cast(pl.Float64).to_numpy(),
+                df.get_column("numero_documento_b").cast(pl.Float64).to_numpy(),
+            ),
+            nan_to_null=True,
+        ),
+    )
+
+    ponderado = pl.sum_horizontal(
+        pl.col(campo).fill_null(0.0) * peso for campo, peso in PESOS.items()
+    )
+    pesos_presentes = pl.sum_horizontal(
+        pl.col(campo).is_not_null().cast(pl.Float64) * peso
+        for campo, peso in PESOS.items()
+    )
+    sexo_distinto = (
+        pl.col("sexo_a").is_not_null()
+        & pl.col("sexo_b").is_not_null()
+        & (pl.col("sexo_a") != "NO_ESPECIFICADO")
+        & (pl.col("sexo_b") != "NO_ESPECIFICADO")
+        & (pl.col("sexo_a") != pl.col("sexo_b"))
+    )
+    return df.select(
+        "codigo_ciudadano_a",
+        "codigo_ciudadano_b",
+        "bloques",
+        *PESOS,
+        (
+            ponderado
+            / pesos_presentes
+            * pl.when(sexo_distinto).then(_FACTOR_SEXO_DISTINTO).otherwise(1.0)
+        )
+        .round(4)
+        .alias("score"),
+    ).filter(pl.col("apellido").is_not_null() & pl.col("score").is_not_null())
+
+
+# =============================================================================
+# BASE DE DATOS
+# =============================================================================
+
+
+def _lotes(codigos: Sequence[int]) -> Iterator[list[int]]:
+    for inicio in range(0, len(codigos), _LOTE):
+        yield list(codigos[inicio : inicio + _LOTE])
+
+
+def _cargar_personas(session: Session, codigos: Sequence[int]) -> pl.DataFrame:
+    """Atributos de vinculación (localidad = último domicilio vinculado)."""
+    filas = []
+    for lote in _lotes(codigos):
+        domicilio = (
+            select(
+                col(CiudadanoDomicilio.codigo_ciudadano),
+                col(Domicilio.id_localidad_indec),
+            )
+            .join(Domicilio, col(Domicilio.id) == col(CiudadanoDomicilio.id_domicilio))
+            .where(col(CiudadanoDomicilio.codigo_ciudadano).in_(lote))
+            .distinct(col(CiudadanoDomicilio.codigo_ciudadano))
+            .order_by(
+                col(CiudadanoDomicilio.codigo_ciudadano),
+                col(CiudadanoDomicilio.id).desc(),
+            )
+            .subquery()
+        )
+        query = (
+            select(
+                col(Ciudadano.codigo_ciudadano),
+                col(Ciudadano.nombre),
+                col(Ciudadano.apellido),
+                col(Ciudadano.numero_documento),
+                col(Ciudadano.fecha_nacimiento),
+                cast(col(Ciudadano.sexo_biologico), String),
+                domicilio.c.id_localidad_indec,
+            )
+            .outerjoin(
+                domicilio,
+                domicilio.c.codigo_ciudadano == col(Ciudadano.codigo_ciudadano),
+            )
+            .where(col(Ciudadano.codigo_ciudadano).in_(lote))
+        )
+        filas.extend(tuple(f) for f in session.execute(query).all())
+    return pl.DataFrame(filas, schema=_ESQUEMA_PERSONAS, orient="row")
+
+
+def _claves_guardadas(session: Session, codigos: Sequence[int]) -> pl.DataFrame:
+    filas = []
+    for lote in _lotes(codigos):
+        query = select(
+            col(CiudadanoClaveBloqueo.codigo_ciudadano),
+            col(CiudadanoClaveBloqueo.tipo),
+            col(CiudadanoClaveBloqueo.clave),
+        ).where(col(CiudadanoClaveBloqueo.codigo_ciudadano).in_(lote))
+        filas.extend(tuple(f) for f in session.execute(query).all())
+    return pl.DataFrame(
+        filas,
+        schema={"codigo_ciudadano": pl.Int64, "tipo": pl.Utf8, "clave": pl.Utf8},
+        orient="row",
+    )
+
+
+def _reemplazar_claves(
+    session: Session, codigos: Sequence[int], claves: pl.DataFrame
+) -> None:
+    for lote in _lotes(codigos):
+        session.execute(
+            delete(CiudadanoClaveBloqueo).where(
+                col(CiudadanoClaveBloqueo.codigo_ciudadano).in_(lote)
+            )
+        )
+    for inicio in range(0, claves.height, _LOTE):
+        session.execute(
+            pg_insert(CiudadanoClaveBloqueo.__table__).values(
+                claves.slice(inicio, _LOTE).to_dicts()
+            )
+        )
+
+
+def _miembros_bloques(session: Session, claves: pl.DataFrame) -> pl.DataFrame:
+    """Todos los ciudadanos de los bloques de ``claves`` (salvo bloques enormes)."""
+    bloques = claves.select("tipo", "clave").unique()
+    filas = []
+    for inicio in range(0, bloques.height, _LOTE):
+        lote = bloques.slice(inicio, _LOTE)
+        filas.extend(
+            tuple(f)
+            for f in session.execute(
+                text("""
+                    WITH bloque AS (
+                        SELECT b.codigo_ciudadano, b.tipo, b.clave,
+                               count(*) OVER (PARTITION BY b.tipo, b.clave) AS tamano
+                        FROM ciudadano_clave_bloqueo b
+                        JOIN unnest(CAST(:tipos AS text[]), CAST(:claves AS text[]))
+                            AS k(tipo, clave)
+                            ON b.tipo = k.tipo AND b.clave = k.clave
+                    )
+                    SELECT codigo_ciudadano, tipo, clave
+                    FROM bloque
+                    WHERE tamano BETWEEN 2 AND :max_bloque
+                """),
+                {
+                    "tipos": lote.get_column("tipo").to_list(),
+                    "claves": lote.get_column("clave").to_list(),
+                    "max_bloque": settings.VINCULACION_MAX_BLOQUE,
+                },
+            ).all()
+        )
+    return pl.DataFrame(
+        filas,
+        schema={"codigo_ciudadano": pl.Int64, "tipo": pl.Utf8, "clave": pl.Utf8},
+        orient="row",
+    )
+
+
+def _guardar_candidatos(session: Session, candidatos: pl.DataFrame) -> None:
+    """Upsert de candidatos; los pares ya revisados no se tocan."""
+    tabla = CiudadanoCandidatoFusion.__table__
+    filas = candidatos.select(
+        "codigo_ciudadano_a",
+        "codigo_ciudadano_b",
+        "score",
+        pl.struct(*PESOS).alias("similitudes"),
+        pl.col("bloques").list.join(",").str.slice(0, 200),
+        pl.lit(EstadoCandidatoFusion.PENDIENTE.value).alias("estado"),
+    )
+    for inicio in range(0, filas.height, _LOTE):
+        stmt = pg_insert(tabla).values(filas.slice(inicio, _LOTE).to_dicts())
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_ciudadano_candidato_fusion_par",
+            set_={
+                "score": stmt.excluded.score,
+                "similitudes": stmt.excluded.similitudes,
+                "bloques": stmt.excluded.bloques,
+                "updated_at": text("now()"),
+            },
+            where=tabla.c.estado == EstadoCandidatoFusion.PENDIENTE,
+        )
+        session.execute(stmt)
+
+
+# =============================================================================
+# VINCULACIÓN
+# =============================================================================
+
+
+def vincular_ciudadanos(
+    session: Session, codigos_ciudadano: Sequence[int]
+) -> ResultadoVinculacion:
+    """
+    Busca duplicados de los ciudadanos dados y guarda los candidatos.
+
+    Solo se procesan los ciudadanos cuyas claves de bloqueo cambiaron (o que
+    no las tenían), así reingestar un archivo no vuelve a comparar nada.
+    No hace commit: se ejecuta dentro de la transacción del llamador.
+
+    Args:
+        session: Sesión síncrona
+        codigos_ciudadano: Ciudadanos recién ingestados
+
+    Returns:
+        Conteos de la corrida
+    """
+    inicio = time.perf_counter()
+    resultado = ResultadoVinculacion(personas=len(codigos_ciudadano))
+    if not codigos_ciudadano:
+        return resultado
+
+    personas = preparar_personas(_cargar_personas(session, codigos_ciudadano))
+    claves = claves_bloqueo(personas)
+
+    # Ciudadanos cuyas claves no cambiaron ya fueron comparados
+    guardadas = _claves_guardadas(
+        session, personas.get_column("codigo_ciudadano").to_list()
+    )
+    columnas_clave = ["codigo_ciudadano", "tipo", "clave"]
+    cambiados = (
+        pl.concat(
+            [
+                claves.join(guardadas, on=columnas_clave, how="anti"),
+                guardadas.join(claves, on=columnas_clave, how="anti"),
+            ]
+        )
+        .get_column("codigo_ciudadano")
+        .unique()
+    )
+    if cambiados.is_empty():
+        resultado.duracion_segundos = time.perf_counter() - inicio
+        return resultado
+
+    claves_cambiadas = claves.filter(pl.col("codigo_ciudadano").is_in(cambiados))
+    _reemplazar_claves(session, cambiados.to_list(), claves_cambiadas)
+    resultado.personas_procesadas = cambiados.len()
+
+    # Pares: cada ciudadano procesado contra los demás miembros de sus bloques
+    miembros = _miembros_bloques(session, claves_cambiadas)
+    pares = (
+        claves_cambiadas.join(miembros, on=["tipo", "clave"], suffix="_otro")
+        .filter(pl.col("codigo_ciudadano") != pl.col("codigo_ciudadano_otro"))
+        .select(
+            pl.min_horizontal("codigo_ciudadano", "codigo_ciudadano_otro").alias(
+                "codigo_ciudadano_a"
+            ),
+            pl.max_horizontal("codigo_ciudadano", "codigo_ciudadano_otro").alias(
+                "codigo_ciudadano_b"
+            ),
+            "tipo",
+        )
+        .group_by("codigo_ciudadano_a", "codigo_ciudadano_b")
+        .agg(pl.col("tipo").unique().sort().alias("bloques"))
+    )
+    resultado.pares_comparados = pares.height
+    if pares.is_empty():
+        resultado.duracion_segundos = time.perf_counter() - inicio
+        return resultado
+
+    codigos_pares = pl.concat(
+        [pares.get_column("codigo_ciudadano_a"), pares.get_column("codigo_ciudadano_b")]
+    ).unique()
+    otros = codigos_pares.filter(
+        ~codigos_pares.is_in(personas.get_column("codigo_ciudadano"))
+    )
+    todas = pl.concat(
+        [personas, preparar_personas(_cargar_personas(session, otros.to_list()))]
+    )
+
+    candidatos = puntuar_pares(pares, todas).filter(
+        pl.col("score") >= settings.VINCULACION_UMBRAL
+    )
+    _guardar_candidatos(session, candidatos)
+    resultado.candidatos = candidatos.height
+    resultado.duracion_segundos = time.perf_counter() - inicio
+    return resultado
@@ -5,8 +5,20 @@ This module provides reusable query builders that ensure consistency
 across different endpoints that query the same domain entities.
 """
 
+from app.domains.vigilancia_nominal.queries.busqueda import (
+    condicion_busqueda_caso,
+    condicion_busqueda_ciudadano,
+    ranking_busqueda_caso,
+    ranking_busqueda_ciudadano,
+)
 from app.domains.vigilancia_nominal.queries.evento_filters import (
     CasoEpidemiologicoQueryBuilder,
 )
 
-__all__ = ["CasoEpidemiologicoQueryBuilder"]
+__all__ = [
+    "CasoEpidemiologicoQueryBuilder",
+    "condicion_busqueda_caso",
+    "condicion_busqueda_ciudadano",
+    "ranking_busqueda_caso",
+    "ranking_busqueda_ciudadano",
+]
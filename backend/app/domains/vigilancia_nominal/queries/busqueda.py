@@ -0,0 +1,121 @@
+"""
+Búsqueda de casos y personas por nombre, documento o ID.
+
+Reemplaza el ``ILIKE '%término%'`` sobre columnas crudas (que obliga a un
+seq scan y no encuentra "Pérez" buscando "perez") por:
+
+- Términos de texto: ``LIKE`` por palabra sobre la columna generada
+  ``busqueda`` (minúsculas, sin acentos) con índice GIN trigram.
+- Términos numéricos: prefijo exacto sobre ``numero_documento``/``id_snvs``
+  con índices ``text_pattern_ops`` (no se buscan en nombres).
+
+Cada condición tiene su expresión de ranking para ordenar por relevancia.
+"""
+
+from sqlalchemy import ColumnElement, Float, Text, and_, case, cast, func, literal, or_
+from sqlmodel import col
+
+from app.core.search import (
+    es_busqueda_numerica,
+    escapar_like,
+    normalizar_busqueda,
+)
+from app.domains.vigilancia_nominal.models.caso import CasoEpidemiologico
+from app.domains.vigilancia_nominal.models.sujetos import Animal, Ciudadano
+
+# Con más dígitos el término no entra en un BIGINT y la comparación exacta
+# falla en el servidor; solo puede coincidir por prefijo.
+_MAX_DIGITOS_BIGINT = 18
+
+
+def _condicion_texto(columna: ColumnElement, termino: str) -> ColumnElement[bool]:
+    """Cada palabra del término debe aparecer en el documento de búsqueda."""
+    return and_(
+        *(columna.like(f"%{escapar_like(palabra)}%") for palabra in termino.split(" "))
+    )
+
+
+def _condicion_prefijo(columna: ColumnElement, digitos: str) -> ColumnElement[bool]:
+    """Prefijo numérico; usa el índice ``(columna::text) text_pattern_ops``."""
+    return cast(columna, Text).like(f"{digitos}%")
+
+
+def _ranking_texto(columna: ColumnElement, termino: str) -> ColumnElement[float]:
+    return func.coalesce(func.word_similarity(termino, columna), 0.0)
+
+
+def _ranking_prefijo(columna: ColumnElement, digitos: str) -> ColumnElement[float]:
+    """1.0 si coincide exacto, 0.5 si solo coincide el prefijo."""
+    prefijo = (_condicion_prefijo(columna, digitos), 0.5)
+    if len(digitos) > _MAX_DIGITOS_BIGINT:
+        return case(prefijo, else_=0.0)
+    return case((columna == int(digitos), 1.0), prefijo, else_=0.0)
+
+
+def condicion_busqueda_ciudadano(search: str) -> ColumnElement[bool]:
+    """
+    Condición de búsqueda sobre ciudadanos (nombre, apellido o documento).
+
+    Args:
+        search: Término ingresado por el usuario
+
+    Returns:
+        Condición SQLAlchemy sobre la tabla ``ciudadano``
+    """
+    termino = normalizar_busqueda(search)
+    if es_busqueda_numerica(termino):
+        return _condicion_prefijo(col(Ciudadano.numero_documento), termino)
+    return _condicion_texto(col(Ciudadano.busqueda), termino)
+
+
+def ranking_busqueda_ciudadano(search: str) -> ColumnElement[float]:
+    """Relevancia (0-1) de un ciudadano para el término buscado."""
+    termino = normalizar_busqueda(search)
+    if es_busqueda_numerica(termino):
+        return _ranking_prefijo(col(Ciudadano.numero_documento), termino)
+    return _ranking_texto(col(Ciudadano.busqueda), termino)
+
+
+def condicion_busqueda_caso(search: str) -> ColumnElement[bool]:
+    """
+    Condición de búsqueda sobre casos (ID SNVS, ciudadano o animal).
+
+    Requiere que la query tenga los OUTER JOIN a ``Ciudadano`` y ``Animal``
+    (ver ``CasoEpidemiologicoQueryBuilder.add_base_joins``).
+
+    Args:
+        search: Término ingresado por el usuario
+
+    Returns:
+        Condición SQLAlchemy
+    """
+    termino = normalizar_busqueda(search)
+    if es_busqueda_numerica(termino):
+        return or_(
+            _condicion_prefijo(col(CasoEpidemiologico.id_snvs), termino),
+            _condicion_prefijo(col(Ciudadano.numero_documento), termino),
+        )
+    return or_(
+        _condicion_texto(col(Ciudadano.busqueda), termino),
+        _condicion_texto(col(Animal.busqueda), termino),
+    )
+
+
+def ranking_busqueda_caso(search: str | None) -> ColumnElement[float]:
+    """
+    Relevancia (0-1) de un caso para el término buscado.
+
+    Sin término devuelve una constante, para poder ordenar siempre por ella.
+    """
+    if not search:
+        return literal(0.0, Float)
+    termino = normalizar_busqueda(search)
+    if es_busqueda_numerica(termino):
+        return func.greatest(
+            _ranking_prefijo(col(CasoEpidemiologico.id_snvs), termino),
+            _ranking_prefijo(col(Ciudadano.numero_documento), termino),
+        )
+    return func.greatest(
+        _ranking_texto(col(Ciudadano.busqueda), termino),
+        _ranking_texto(col(Animal.busqueda), termino),
+    )
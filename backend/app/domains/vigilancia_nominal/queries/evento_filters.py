@@ -11,7 +11,7 @@ no domicilio del ciudadano, para consistencia epidemiológica.
 from datetime import date
 from typing import Any
 
-from sqlalchemy import String, and_, cast, func, or_
+from sqlalchemy import and_, func
 from sqlmodel import col
 
 from app.domains.territorio.establecimientos_models import Establecimiento
@@ -22,6 +22,8 @@ from app.domains.vigilancia_nominal.models.enfermedad import (
     EnfermedadGrupo,
 )
 from app.domains.vigilancia_nominal.models.sujetos import Animal, Ciudadano
+from app.domains.vigilancia_nominal.queries.busqueda import condicion_busqueda_caso
+from app.domains.vigilancia_nominal.queries.particiones import condiciones_particion
 
 
 class CasoEpidemiologicoQueryBuilder:
@@ -129,6 +131,9 @@ class CasoEpidemiologicoQueryBuilder:
         if fecha_hasta:
             conditions.append(col(CasoEpidemiologico.fecha_minima_caso) <= fecha_hasta)
 
+        # Mismo rango sobre la clave de partición (poda de particiones por año)
+        conditions.extend(condiciones_particion(fecha_desde, fecha_hasta))
+
         # Clasificaciones múltiples
         if clasificacion:
             if isinstance(clasificacion, list):
@@ -181,18 +186,9 @@ class CasoEpidemiologicoQueryBuilder:
             if edad_max is not None:
                 conditions.append(edad_calculada <= edad_max)
 
-        # Búsqueda por texto
+        # Búsqueda por texto (trigram sin acentos) o prefijo numérico (ID/DNI)
         if search:
-            search_term = f"%{search}%"
-            conditions.append(
-                or_(
-                    cast(col(CasoEpidemiologico.id_snvs), String).ilike(search_term),
-                    col(Ciudadano.nombre).ilike(search_term),
-                    col(Ciudadano.apellido).ilike(search_term),
-                    cast(col(Ciudadano.numero_documento), String).ilike(search_term),
-                    col(Animal.especie).ilike(search_term),
-                )
-            )
+            conditions.append(condicion_busqueda_caso(search))
 
         return conditions
 
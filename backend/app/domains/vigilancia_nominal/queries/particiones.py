@@ -0,0 +1,72 @@
+"""
+Particiones por año epidemiológico de ``caso_epidemiologico`` y sus hijas.
+
+- ``asegurar_particiones``: crea (si faltan) las particiones de los años de un
+  lote antes del upsert. Primero busca en el catálogo qué años no tienen
+  todas sus particiones (sin locks) y solo para esos llama a la función SQL
+  ``crear_particiones_anio_epi`` (migración ``c4e1a7d2b9f3``), que toma un
+  advisory lock para que dos ingestas no compitan por el mismo año. No hay
+  caché en el proceso: una partición creada en una transacción que después
+  hace rollback desaparece, y el catálogo lo refleja.
+- ``condiciones_particion``: traduce un rango de ``fecha_minima_caso`` a un
+  rango de años para que el planner descarte particiones. El año
+  epidemiológico es monótono en la fecha, así que el rango es exacto.
+"""
+
+from collections.abc import Iterable
+from datetime import date
+
+from sqlalchemy import ColumnElement, text
+from sqlmodel import Session, col
+
+from app.core.epidemiology import calcular_semana_epidemiologica
+from app.domains.vigilancia_nominal.models.caso import CasoEpidemiologico
+from app.domains.vigilancia_nominal.models.particionado import TABLAS_PARTICIONADAS
+
+_ANIOS_SIN_PARTICION = text(
+    """
+    SELECT anio
+    FROM unnest(CAST(:anios AS integer[])) AS anio
+    WHERE EXISTS (
+        SELECT 1
+        FROM unnest(CAST(:tablas AS text[])) AS tabla
+        WHERE to_regclass(tabla || '_' || anio) IS NULL
+    )
+    ORDER BY anio
+    """
+)
+
+
+def asegurar_particiones(session: Session, anios: Iterable[int | None]) -> int:
+    """
+    Crea las particiones que falten para los años dados.
+
+    Returns:
+        Cantidad de particiones creadas (todas las tablas particionadas)
+    """
+    anios = sorted({a for a in anios if a is not None})
+    if not anios:
+        return 0
+    faltantes = session.execute(
+        _ANIOS_SIN_PARTICION,
+        {"anios": anios, "tablas": list(TABLAS_PARTICIONADAS)},
+    ).scalars()
+    creadas = 0
+    for anio in list(faltantes):
+        creadas += session.execute(
+            text("SELECT crear_particiones_anio_epi(:anio)"), {"anio": anio}
+        ).scalar_one()
+    return creadas
+
+
+def condiciones_particion(
+    fecha_desde: date | None = None, fecha_hasta: date | None = None
+) -> list[ColumnElement[bool]]:
+    """Condiciones sobre la clave de partición equivalentes al rango de fechas."""
+    anio = col(CasoEpidemiologico.fecha_minima_caso_anio_epi)
+    condiciones = []
+    if fecha_desde:
+        condiciones.append(anio >= calcular_semana_epidemiologica(fecha_desde)[1])
+    if fecha_hasta:
+        condiciones.append(anio <= calcular_semana_epidemiologica(fecha_hasta)[1])
+    return condiciones
@@ -0,0 +1,164 @@
+"""
+Agregados de casos por ciudadano.
+
+Las mismas columnas se usan en dos lugares:
+- El listado de personas, agregando sobre los casos que pasan los filtros.
+- La tabla ``ciudadano_resumen_casos``, que se refresca en cada ingesta solo
+  para los ciudadanos del archivo y los titulares anteriores de sus casos
+  (INSERT ... SELECT ... ON CONFLICT).
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    Integer,
+    delete,
+    exists,
+    func,
+    select,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, col
+
+from app.domains.vigilancia_nominal.clasificacion.models import TipoClasificacion
+from app.domains.vigilancia_nominal.models.caso import CasoEpidemiologico
+from app.domains.vigilancia_nominal.models.sujetos import CiudadanoResumenCasos
+
+COLUMNAS_RESUMEN = (
+    "codigo_ciudadano",
+    "total_casos",
+    "confirmados",
+    "sospechosos",
+    "probables",
+    "descartados",
+    "primer_caso",
+    "ultimo_caso",
+    "ultimo_caso_id_enfermedad",
+    "ultimo_caso_clasificacion",
+)
+
+
+def columnas_resumen_casos(casos: Any) -> list[ColumnElement[Any]]:
+    """
+    Columnas agregadas por ciudadano sobre un selectable de casos.
+
+    ``casos`` debe exponer ``id``, ``codigo_ciudadano``, ``id_enfermedad``,
+    ``clasificacion_estrategia`` y ``fecha_minima_caso`` (la tabla o una
+    subquery filtrada). Agrupar por ``casos.c.codigo_ciudadano``.
+
+    Args:
+        casos: Tabla o subquery de casos
+
+    Returns:
+        Columnas etiquetadas según ``COLUMNAS_RESUMEN``
+    """
+    c = casos.c
+    clasificacion_type = CasoEpidemiologico.__table__.c.clasificacion_estrategia.type
+    # Último caso = el de fecha mayor (desempata por id)
+    orden_ultimo = (c.fecha_minima_caso.desc().nulls_last(), c.id.desc())
+
+    def contar(clasificacion: TipoClasificacion) -> ColumnElement[int]:
+        return func.count().filter(c.clasificacion_estrategia == clasificacion)
+
+    return [
+        c.codigo_ciudadano,
+        func.count().label("total_casos"),
+        contar(TipoClasificacion.CONFIRMADOS).label("confirmados"),
+        contar(TipoClasificacion.SOSPECHOSOS).label("sospechosos"),
+        contar(TipoClasificacion.PROBABLES).label("probables"),
+        contar(TipoClasificacion.DESCARTADOS).label("descartados"),
+        func.min(c.fecha_minima_caso).label("primer_caso"),
+        func.max(c.fecha_minima_caso).label("ultimo_caso"),
+        func.array_agg(
+            aggregate_order_by(c.id_enfermedad, *orden_ultimo),
+            type_=ARRAY(Integer),
+        )[1].label("ultimo_caso_id_enfermedad"),
+        func.array_agg(
+            aggregate_order_by(c.clasificacion_estrategia, *orden_ultimo),
+            type_=ARRAY(clasificacion_type),
+        )[1].label("ultimo_caso_clasificacion"),
+    ]
+
+
+def ciudadanos_de_casos(session: Session, ids_snvs: Sequence[int]) -> set[int]:
+    """
+    Ciudadanos a los que pertenecen hoy los casos dados.
+
+    Se llama antes del upsert de casos: si un caso pasa a otro ciudadano, el
+    titular anterior no viene en el archivo y su resumen también quedaría
+    desactualizado.
+
+    Args:
+        session: Sesión síncrona
+        ids_snvs: IDs SNVS de los casos
+
+    Returns:
+        Códigos de ciudadano de los casos ya existentes
+    """
+    if not ids_snvs:
+        return set()
+    stmt = (
+        select(col(CasoEpidemiologico.codigo_ciudadano))
+        .where(
+            col(CasoEpidemiologico.id_snvs).in_(list(ids_snvs)),
+            col(CasoEpidemiologico.codigo_ciudadano).isnot(None),
+        )
+        .distinct()
+    )
+    return set(session.execute(stmt).scalars())
+
+
+def refrescar_resumen_ciudadanos(
+    session: Session, codigos_ciudadano: Sequence[int] | None = None
+) -> None:
+    """
+    Recalcula ``ciudadano_resumen_casos`` en una sola sentencia set-based.
+
+    No hace commit: se ejecuta dentro de la transacción del llamador
+    (ingesta o reclasificación).
+
+    Args:
+        session: Sesión síncrona
+        codigos_ciudadano: Ciudadanos a refrescar (None = todos)
+    """
+    casos = CasoEpidemiologico.__table__
+    agregados = (
+        select(*columnas_resumen_casos(casos))
+        .where(casos.c.codigo_ciudadano.isnot(None))
+        .group_by(casos.c.codigo_ciudadano)
+    )
+    if codigos_ciudadano is not None:
+        if not codigos_ciudadano:
+            return
+        agregados = agregados.where(
+            casos.c.codigo_ciudadano.in_(list(codigos_ciudadano))
+        )
+
+    stmt = pg_insert(CiudadanoResumenCasos.__table__).from_select(
+        list(COLUMNAS_RESUMEN), agregados
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["codigo_ciudadano"],
+        set_={
+            **{nombre: stmt.excluded[nombre] for nombre in COLUMNAS_RESUMEN[1:]},
+            "updated_at": func.now(),
+        },
+    )
+    session.execute(stmt)
+
+    # Ciudadanos que quedaron sin casos (ej: caso reasignado a otro ciudadano)
+    sin_casos = delete(CiudadanoResumenCasos).where(
+        ~exists().where(
+            col(CasoEpidemiologico.codigo_ciudadano)
+            == col(CiudadanoResumenCasos.codigo_ciudadano)
+        )
+    )
+    if codigos_ciudadano is not None:
+        sin_casos = sin_casos.where(
+            col(CiudadanoResumenCasos.codigo_ciudadano).in_(list(codigos_ciudadano))
+        )
+    session.execute(sin_casos)
@@ -7,7 +7,7 @@ JWT y gestión de eventos de salud pública.
 
 import logging
 import time
-from collections.abc import AsyncGenerator, Callable
+from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from typing import Any
 
@@ -21,7 +21,7 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.api.v1.router import api_router
 from app.core.config import settings
-from app.core.middleware import setup_middleware
+from app.core.middleware import AccessLogMiddleware, setup_middleware
 
 # Configurar logging
 logging.basicConfig(
@@ -167,28 +167,7 @@ def setup_standard_middleware(app: FastAPI) -> None:
         app.add_middleware(TrustedHostMiddleware, allowed_hosts=allowed_hosts_list)  # type: ignore[arg-type]
 
     # Middleware personalizado para logging de requests
-    @app.middleware("http")
-    async def log_requests(
-        request: Request, call_next: Callable[[Request], Any]
-    ) -> Response:
-        """Log de requests entrantes"""
-        start_time = time.time()
-
-        logger.info(
-            f"🔍 {request.method} {request.url.path} - "
-            f"IP: {request.client.host if request.client else 'unknown'}"
-        )
-
-        response = await call_next(request)
-
-        process_time = time.time() - start_time
-        logger.info(
-            f"✅ {request.method} {request.url.path} - "
-            f"Status: {response.status_code} - "
-            f"Time: {process_time:.3f}s"
-        )
-
-        return response
+    app.add_middleware(AccessLogMiddleware)
 
 
 def setup_exception_handlers(app: FastAPI) -> None:
@@ -271,6 +250,7 @@ async def health_check(response: Response) -> dict[str, Any]:
     from sqlalchemy import text
 
     from app.core.database import engine
+    from app.core.replicas import replica_router
 
     try:
         with engine.connect() as conn:
@@ -290,6 +270,8 @@ async def health_check(response: Response) -> dict[str, Any]:
         "timestamp": time.time(),
         "services": {
             "database": db_status,
+            # Informativo: sin réplicas sanas las lecturas van al primario
+            "replicas": replica_router.estado(),
         },
         "version": "1.0.0",
     }
@@ -4,9 +4,25 @@ Scripts de mantenimiento y carga de datos del sistema.
 Módulos disponibles:
 - seed: Orquestador principal de seeds
 - seeds/: Carpeta con todos los seeds específicos
+- import_budget: Presupuesto de tiempo de import de la API y el worker
+
+Los re-exports se resuelven al usarse: importar un script suelto (ej: la
+limpieza de uploads desde Celery) no carga toda la herramienta de seeds.
 """
 
-from app.scripts.seed import main as seed_all
-from app.scripts.seeds import seed_strategies
+from importlib import import_module
+from typing import Any
+
+_EXPORTS = {
+    "seed_all": ("app.scripts.seed", "main"),
+    "seed_strategies": ("app.scripts.seeds", "seed_strategies"),
+}
 
 __all__ = ["seed_all", "seed_strategies"]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    modulo, atributo = _EXPORTS[name]
+    return getattr(import_module(modulo), atributo)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Presupuesto de tiempo de import de la API y del worker.
+
+Importa cada entrypoint en un intérprete nuevo (como al arrancar un
+contenedor) y reporta el tiempo total y los paquetes y módulos que más
+pesan. Falla (exit 1) si:
+
+- el import supera el presupuesto del entrypoint, o
+- se cargó algún módulo que tiene que ser diferido. matplotlib, reportlab,
+  pandas, python-docx, etc. se importan dentro de las funciones que los usan
+  (renderer de charts, generadores de reportería, seeds); si un import a
+  nivel de módulo los vuelve a traer al arranque, este chequeo lo detecta
+  aunque el tiempo siga dentro del presupuesto.
+
+El tiempo es el mínimo de ``--repeticiones`` corridas (el ruido de la
+máquina solo suma). El detalle por módulo sale de una corrida aparte con
+``-X importtime``, que agrega overhead y no cuenta para el presupuesto.
+
+Los presupuestos son el tiempo actual en una máquina de desarrollo más un
+margen chico, y quedan por debajo del tiempo que tenían los entrypoints
+antes de diferir los imports pesados: volver a cargarlos al arranque tiene
+que fallar. En máquinas más lentas (CI compartido, laptops con ahorro de
+energía) se escalan con ``--factor`` o con la variable de entorno
+``IMPORT_BUDGET_FACTOR``, en vez de tocar los valores de acá.
+
+USO:
+----
+  python -m app.scripts.import_budget
+  python -m app.scripts.import_budget --entrypoint app.main --presupuesto-ms 3000
+  python -m app.scripts.import_budget --factor 1.5
+  IMPORT_BUDGET_FACTOR=1.5 make import-budget
+  python -m app.scripts.import_budget --salida import_budget.json
+
+O desde Make:
+  make import-budget
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class Presupuesto:
+    """Límites de import de un entrypoint."""
+
+    ms: float
+    diferidos: tuple[str, ...] = ()
+
+
+# Módulos que ningún entrypoint carga al arrancar
+_DIFERIDOS_COMUNES = (
+    "matplotlib",
+    "reportlab",
+    "svglib",
+    "xhtml2pdf",
+    "docx",
+    "geopandas",
+)
+
+PRESUPUESTOS: dict[str, Presupuesto] = {
+    # API (uvicorn app.main:app): ~3.5 s, antes ~4.3 s
+    "app.main": Presupuesto(
+        ms=3800, diferidos=(*_DIFERIDOS_COMUNES, "pandas", "openpyxl")
+    ),
+    # Worker de Celery (módulos de tasks que carga al arrancar): ~2.0 s
+    "app.domains.jobs.tasks": Presupuesto(ms=2200, diferidos=_DIFERIDOS_COMUNES),
+}
+
+# Escala todos los presupuestos (ej. 1.5 en un runner lento)
+_FACTOR_ENV = "IMPORT_BUDGET_FACTOR"
+
+_LINEA_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+# Imprime el tiempo del import y los módulos cargados, en una línea JSON
+_PROGRAMA = """
+import json, sys, time
+inicio = time.perf_counter()
+import {entrypoint}
+duracion = time.perf_counter() - inicio
+print(json.dumps({{"ms": duracion * 1000, "modulos": sorted(sys.modules)}}))
+"""
+
+
+@dataclass
+class Medicion:
+    """Resultado de importar un entrypoint."""
+
+    entrypoint: str
+    ms: float
+    modulos: set[str]
+    # Tiempo acumulado (ms) del primer import de cada módulo
+    acumulado: dict[str, float] = field(default_factory=dict)
+    # Tiempo propio (ms), sin los imports anidados
+    propio: dict[str, float] = field(default_factory=dict)
+
+
+def medir(entrypoint: str, detalle: bool = False) -> Medicion:
+    """Importa el entrypoint en un proceso nuevo (con detalle por módulo)."""
+    flags = ["-X", "importtime"] if detalle else []
+    proceso = subprocess.run(
+        [sys.executable, *flags, "-c", _PROGRAMA.format(entrypoint=entrypoint)],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proceso.returncode != 0:
+        raise RuntimeError(
+            f"No se pudo importar {entrypoint}:\n{proceso.stderr[-2000:]}"
+        )
+
+    resultado = json.loads(proceso.stdout.strip().splitlines()[-1])
+    medicion = Medicion(entrypoint, resultado["ms"], set(resultado["modulos"]))
+    for linea in proceso.stderr.splitlines():
+        match = _LINEA_IMPORTTIME.match(linea)
+        if match:
+            modulo = match.group(4)
+            medicion.propio[modulo] = int(match.group(1)) / 1000
+            medicion.acumulado[modulo] = int(match.group(2)) / 1000
+    return medicion
+
+
+def por_paquete(medicion: Medicion) -> dict[str, float]:
+    """Tiempo propio sumado por paquete (``app.<capa>.<dominio>`` para el código propio)."""
+    totales: dict[str, float] = {}
+    for modulo, ms in medicion.propio.items():
+        partes = modulo.split(".")
+        clave = ".".join(partes[:3]) if partes[0] == "app" else partes[0]
+        totales[clave] = totales.get(clave, 0.0) + ms
+    return dict(sorted(totales.items(), key=lambda item: -item[1]))
+
+
+def verificar(
+    entrypoint: str, presupuesto: Presupuesto, repeticiones: int, top: int
+) -> tuple[bool, dict[str, Any]]:
+    """Mide el entrypoint, imprime el reporte y devuelve si cumple."""
+    ms = min(medir(entrypoint).ms for _ in range(repeticiones))
+    detalle = medir(entrypoint, detalle=True)
+    paquetes = por_paquete(detalle)
+    cargados = sorted(m for m in presupuesto.diferidos if m in detalle.modulos)
+
+    print(f"\n📦 {entrypoint}")
+    print(
+        f"   Tiempo de import: {ms:.0f} ms "
+        f"(presupuesto {presupuesto.ms:.0f} ms, mínimo de {repeticiones})"
+    )
+    print(f"   Paquetes que más pesan (tiempo propio, top {top}):")
+    for paquete, ms_paquete in list(paquetes.items())[:top]:
+        print(f"     {ms_paquete:8.1f} ms  {paquete}")
+
+    ok = True
+    if ms > presupuesto.ms:
+        ok = False
+        print(f"   ❌ Supera el presupuesto por {ms - presupuesto.ms:.0f} ms")
+    for modulo in cargados:
+        ok = False
+        print(
+            f"   ❌ '{modulo}' se carga al importar ({detalle.acumulado.get(modulo, 0):.0f} ms): "
+            "debería importarse dentro de la función que lo usa"
+        )
+    if ok:
+        print("   ✅ Dentro del presupuesto")
+
+    return ok, {
+        "entrypoint": entrypoint,
+        "ms": round(ms, 1),
+        "presupuesto_ms": presupuesto.ms,
+        "diferidos_cargados": cargados,
+        "paquetes_ms": {k: round(v, 1) for k, v in paquetes.items()},
+        "modulos_ms": {
+            k: round(v, 1)
+            for k, v in sorted(detalle.acumulado.items(), key=lambda item: -item[1])
+        },
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Verifica el presupuesto de tiempo de import"
+    )
+    parser.add_argument(
+        "--entrypoint",
+        action="append",
+        help="Entrypoint a medir (default: todos los configurados)",
+    )
+    parser.add_argument(
+        "--presupuesto-ms",
+        type=float,
+        help="Reemplaza el presupuesto configurado de los entrypoints medidos",
+    )
+    parser.add_argument(
+        "--factor",
+        type=float,
+        default=float(os.environ.get(_FACTOR_ENV, "1")),
+        help=f"Multiplica los presupuestos configurados (default: ${_FACTOR_ENV} o 1)",
+    )
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument(
+        "--salida", help="Guarda el tiempo por módulo en este archivo JSON"
+    )
+    args = parser.parse_args()
+    if args.factor <= 0:
+        parser.error("--factor tiene que ser positivo")
+
+    entrypoints = args.entrypoint or list(PRESUPUESTOS)
+    resultados = []
+    ok = True
+    for entrypoint in entrypoints:
+        presupuesto = PRESUPUESTOS.get(entrypoint, Presupuesto(ms=float("inf")))
+        # --presupuesto-ms es un valor explícito: el factor no lo escala
+        ms = args.presupuesto_ms or presupuesto.ms * args.factor
+        presupuesto = Presupuesto(ms, presupuesto.diferidos)
+        cumple, resultado = verificar(
+            entrypoint, presupuesto, args.repeticiones, args.top
+        )
+        ok = ok and cumple
+        resultados.append(resultado)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Tiempos por módulo guardados en {args.salida}")
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,9 +6,24 @@ Cada módulo en esta carpeta contiene seeds específicos:
 - charts: Configuración de charts por tipo ENO
 - (futuro) users: Usuarios iniciales
 - (futuro) establishments: Establecimientos de salud
+
+Los re-exports se resuelven al usarse, así importar un seed puntual no carga
+los demás.
 """
 
-from app.scripts.seeds.charts import main as seed_charts
-from app.scripts.seeds.strategies import main as seed_strategies
+from importlib import import_module
+from typing import Any
+
+_EXPORTS = {
+    "seed_charts": ("app.scripts.seeds.charts", "main"),
+    "seed_strategies": ("app.scripts.seeds.strategies", "main"),
+}
 
 __all__ = ["seed_charts", "seed_strategies"]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    modulo, atributo = _EXPORTS[name]
+    return getattr(import_module(modulo), atributo)
@@ -17,6 +17,11 @@ CACHE_DIR = _PROJECT_ROOT / ".cache" / "seeds"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def cache_file(cache_key: str) -> Path:
+    """Archivo local donde se guarda (o guardaría) la respuesta cacheada."""
+    return CACHE_DIR / f"{cache_key}.cache"
+
+
 def get_cached_response(cache_key: str, max_age_days: int = 7) -> str | None:
     """
     Obtiene respuesta cacheada si existe y no está muy vieja.
@@ -28,19 +33,19 @@ def get_cached_response(cache_key: str, max_age_days: int = 7) -> str | None:
     Returns:
         Contenido del caché o None si no existe/expiró
     """
-    cache_file = CACHE_DIR / f"{cache_key}.cache"
+    archivo = cache_file(cache_key)
 
-    if not cache_file.exists():
+    if not archivo.exists():
         return None
 
     # Verificar edad del archivo
-    file_age = datetime.now() - datetime.fromtimestamp(cache_file.stat().st_mtime)
+    file_age = datetime.now() - datetime.fromtimestamp(archivo.stat().st_mtime)
     if file_age > timedelta(days=max_age_days):
         print(f"   ⚠️  Caché expirado (antigüedad: {file_age.days} días)")
         return None
 
     print(f"   ✅ Usando caché local (antigüedad: {file_age.days} días)")
-    return cache_file.read_text(encoding="utf-8")
+    return archivo.read_text(encoding="utf-8")
 
 
 def save_to_cache(cache_key: str, content: str) -> None:
@@ -51,8 +56,7 @@ def save_to_cache(cache_key: str, content: str) -> None:
         cache_key: Nombre del archivo de caché (sin extensión)
         content: Contenido a guardar
     """
-    cache_file = CACHE_DIR / f"{cache_key}.cache"
-    cache_file.write_text(content, encoding="utf-8")
+    cache_file(cache_key).write_text(content, encoding="utf-8")
 
     # Guardar metadata
     metadata_file = CACHE_DIR / f"{cache_key}.meta.json"
@@ -93,7 +97,7 @@ def download_with_cache(
         return cached
 
     # Descargar desde URL
-    print("   📥 Descargando desde WFS...")
+    print("   📥 Descargando...")
     try:
         response = requests.get(url, timeout=timeout, verify=verify_ssl)
         response.raise_for_status()
@@ -109,8 +113,8 @@ def download_with_cache(
     except requests.RequestException as e:
         print(f"   ❌ Error descargando: {e}")
         # Intentar usar caché viejo si existe
-        cache_file = CACHE_DIR / f"{cache_key}.cache"
-        if cache_file.exists():
+        archivo = cache_file(cache_key)
+        if archivo.exists():
             print("   ⚠️  Usando caché VIEJO como fallback")
-            return cache_file.read_text(encoding="utf-8")
+            return archivo.read_text(encoding="utf-8")
         raise
@@ -0,0 +1,69 @@
+"""
+Carga masiva con COPY para los seeds.
+
+Los seeds de tablas grandes (geografía, geometrías, establecimientos) cargan
+con ``COPY ... FROM STDIN`` en vez de INSERTs fila por fila: una sola ida y
+vuelta a la BD por tabla. Funciona dentro de la transacción de la conexión
+(``engine.begin()``), así que un error revierte todo el paso.
+"""
+
+import csv
+import io
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Marca de NULL en el CSV (distinta de un string vacío)
+_NULL = "\\N"
+
+
+def _filas_csv(filas: Iterable[Sequence[Any]]) -> tuple[io.StringIO, int]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    cantidad = 0
+    for fila in filas:
+        writer.writerow(_NULL if valor is None else valor for valor in fila)
+        cantidad += 1
+    buffer.seek(0)
+    return buffer, cantidad
+
+
+def copiar_filas(
+    conn: Connection,
+    tabla: str,
+    columnas: Sequence[str],
+    filas: Iterable[Sequence[Any]],
+) -> int:
+    """
+    Carga filas en una tabla con COPY.
+
+    Args:
+        conn: Conexión SQLAlchemy (driver psycopg2)
+        tabla: Tabla destino (puede ser temporal)
+        columnas: Columnas en el orden de cada fila
+        filas: Valores por fila (None = NULL)
+
+    Returns:
+        Cantidad de filas cargadas
+    """
+    buffer, cantidad = _filas_csv(filas)
+    if cantidad == 0:
+        return 0
+
+    sql = (
+        f"COPY {tabla} ({', '.join(columnas)}) "
+        f"FROM STDIN WITH (FORMAT csv, NULL '{_NULL}')"
+    )
+    cursor = conn.connection.dbapi_connection.cursor()  # type: ignore[union-attr]
+    try:
+        cursor.copy_expert(sql, buffer)
+    finally:
+        cursor.close()
+    return cantidad
+
+
+def crear_tabla_temporal(conn: Connection, nombre: str, columnas: str) -> None:
+    """Crea una tabla temporal que se descarta al terminar la transacción."""
+    conn.execute(text(f"CREATE TEMP TABLE {nombre} ({columnas}) ON COMMIT DROP"))
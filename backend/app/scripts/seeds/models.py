@@ -0,0 +1,30 @@
+"""
+Modelo del estado de los seeds.
+
+Lo escribe el orquestador (``app/scripts/seeds/orquestador.py``) después de
+cada paso ejecutado y lo lee para saltear los pasos sin cambios. También lo
+consulta ``poblacion_service`` para saber si cambió la población de
+referencia.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlmodel import Field, SQLModel
+
+
+class SeedEstado(SQLModel, table=True):
+    """Hash de la última ejecución exitosa de cada paso del seed."""
+
+    __tablename__ = "seed_estado"
+
+    paso: str = Field(primary_key=True, max_length=100, description="Nombre del paso")
+    hash: str = Field(
+        max_length=64, description="SHA-256 del código, fuentes y dependencias"
+    )
+    filas: int | None = Field(default=None, description="Filas que cargó el paso")
+    duracion_ms: int | None = Field(default=None, description="Duración del paso")
+    ejecutado_en: datetime = Field(
+        sa_column_kwargs={"server_default": func.now(), "nullable": False},
+        description="Fecha y hora de la última ejecución",
+    )
@@ -0,0 +1,320 @@
+"""
+Orquestador de seeds: DAG de pasos, ejecución en paralelo y salteo por hash.
+
+Cada ``PasoSeed`` declara de qué pasos depende. Los pasos sin dependencias
+pendientes corren en paralelo (un thread por paso, cada uno con su propia
+conexión), así la descarga/carga de geografía no espera a los catálogos ENO
+ni a las estrategias.
+
+Salteo de pasos sin cambios:
+- El hash de un paso combina el código de sus módulos (donde viven los datos
+  de los seeds de catálogos), los archivos fuente que usa (descargas en el
+  caché de seeds, planillas en ``seeds/data``) y los hashes de sus
+  dependencias.
+- Tras ejecutarse bien se guarda en la tabla ``seed_estado`` (modelo
+  ``SeedEstado``, creada por las migraciones). La próxima vez, si el hash
+  coincide y sus tablas tienen datos, el paso se saltea.
+- Un paso se ejecuta igual si alguna dependencia se ejecutó en esta corrida
+  (ej: recargar geografía trunca establecimientos en cascada).
+
+Un paso que falla marca como omitidos a los que dependen de él. Si el paso
+es opcional (fuentes externas que pueden estar caídas) la corrida sigue
+siendo exitosa.
+"""
+
+import hashlib
+import time
+import traceback
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from importlib.util import find_spec
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.scripts.seeds.models import SeedEstado
+
+_TABLA_ESTADO = SeedEstado.__tablename__
+
+
+@dataclass(frozen=True)
+class PasoSeed:
+    """Un paso del seed y lo que define si cambió."""
+
+    nombre: str
+    descripcion: str
+    ejecutar: Callable[[Engine], int | None]
+    depende_de: tuple[str, ...] = ()
+    # Módulos Python del seed (su código forma parte del hash)
+    modulos: tuple[str, ...] = ()
+    # Archivos fuente (caché de descargas, planillas); se evalúa al hashear
+    archivos: Callable[[], Iterable[Path]] = lambda: ()
+    # Tablas que el paso llena: si alguna está vacía se ejecuta igual
+    tablas: tuple[str, ...] = ()
+    # Si falla, la corrida no se considera fallida
+    opcional: bool = False
+    # False = solo se ejecuta si se pide explícitamente (``solo``)
+    por_defecto: bool = True
+
+
+@dataclass
+class ResultadoPaso:
+    nombre: str
+    # "ejecutado", "sin_cambios", "fallido" u "omitido"
+    estado: str
+    filas: int | None = None
+    segundos: float = 0.0
+    error: str | None = None
+
+
+@dataclass
+class ResultadoSeeds:
+    pasos: dict[str, ResultadoPaso] = field(default_factory=dict)
+    segundos: float = 0.0
+
+    @property
+    def fallidos(self) -> list[ResultadoPaso]:
+        return [r for r in self.pasos.values() if r.estado == "fallido"]
+
+
+# ===== HASH Y ESTADO =====
+
+
+def _hash_archivo(digest: "hashlib._Hash", ruta: Path) -> None:
+    digest.update(str(ruta.name).encode())
+    if not ruta.exists():
+        digest.update(b"<ausente>")
+        return
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            digest.update(bloque)
+
+
+def hash_paso(paso: PasoSeed, hashes_dependencias: Iterable[str] = ()) -> str:
+    """Hash del contenido de un paso (código, archivos fuente y dependencias)."""
+    digest = hashlib.sha256(paso.nombre.encode())
+    for modulo in paso.modulos:
+        spec = find_spec(modulo)
+        if spec is None or spec.origin is None:
+            raise ValueError(f"Módulo de seed inexistente: {modulo}")
+        _hash_archivo(digest, Path(spec.origin))
+    for ruta in sorted(paso.archivos()):
+        _hash_archivo(digest, ruta)
+    for hash_dependencia in hashes_dependencias:
+        digest.update(hash_dependencia.encode())
+    return digest.hexdigest()
+
+
+def _hashes_guardados(engine: Engine) -> dict[str, str]:
+    with engine.connect() as conn:
+        filas = conn.execute(text(f"SELECT paso, hash FROM {_TABLA_ESTADO}"))
+        return dict(filas.tuples().all())
+
+
+def _guardar_hash(engine: Engine, resultado: ResultadoPaso, hash_: str) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            text(f"""
+                INSERT INTO {_TABLA_ESTADO} (paso, hash, filas, duracion_ms)
+                VALUES (:paso, :hash, :filas, :duracion_ms)
+                ON CONFLICT (paso) DO UPDATE SET
+                    hash = EXCLUDED.hash,
+                    filas = EXCLUDED.filas,
+                    duracion_ms = EXCLUDED.duracion_ms,
+                    ejecutado_en = now()
+            """),
+            {
+                "paso": resultado.nombre,
+                "hash": hash_,
+                "filas": resultado.filas,
+                "duracion_ms": int(resultado.segundos * 1000),
+            },
+        )
+
+
+def _tablas_con_datos(engine: Engine, tablas: tuple[str, ...]) -> bool:
+    if not tablas:
+        return True
+    with engine.connect() as conn:
+        return all(
+            conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {tabla})")).scalar()
+            for tabla in tablas
+        )
+
+
+# ===== EJECUCIÓN =====
+
+
+def _validar(pasos: list[PasoSeed]) -> dict[str, PasoSeed]:
+    """Indexa los pasos y verifica que las dependencias formen un DAG."""
+    por_nombre = {paso.nombre: paso for paso in pasos}
+    if len(por_nombre) != len(pasos):
+        raise ValueError("Hay pasos de seed con nombre repetido")
+    for paso in pasos:
+        faltantes = set(paso.depende_de) - por_nombre.keys()
+        if faltantes:
+            raise ValueError(
+                f"'{paso.nombre}' depende de pasos inexistentes: {faltantes}"
+            )
+
+    visitados: set[str] = set()
+    en_curso: set[str] = set()
+
+    def visitar(nombre: str) -> None:
+        if nombre in en_curso:
+            raise ValueError(f"Dependencia circular en seeds: '{nombre}'")
+        if nombre in visitados:
+            return
+        en_curso.add(nombre)
+        for dependencia in por_nombre[nombre].depende_de:
+            visitar(dependencia)
+        en_curso.discard(nombre)
+        visitados.add(nombre)
+
+    for nombre in por_nombre:
+        visitar(nombre)
+    return por_nombre
+
+
+def ejecutar_seeds(
+    engine: Engine,
+    pasos: list[PasoSeed],
+    paralelo: int = 4,
+    forzar: bool = False,
+    solo: set[str] | None = None,
+) -> ResultadoSeeds:
+    """
+    Ejecuta los pasos respetando sus dependencias.
+
+    Args:
+        engine: Engine síncrono (cada paso abre sus propias conexiones)
+        pasos: Pasos del seed
+        paralelo: Máximo de pasos ejecutándose a la vez
+        forzar: Ejecutar todos los pasos aunque no hayan cambiado
+        solo: Ejecutar solo estos pasos (forzados), incluidos los que no
+            corren por defecto; sus dependencias se asumen ya cargadas
+
+    Returns:
+        Resultado por paso
+    """
+    por_nombre = _validar(pasos)
+    if solo is not None:
+        desconocidos = solo - por_nombre.keys()
+        if desconocidos:
+            raise ValueError(f"Pasos desconocidos: {', '.join(sorted(desconocidos))}")
+
+    guardados = _hashes_guardados(engine)
+
+    inicio = time.perf_counter()
+    resultado = ResultadoSeeds()
+    hashes: dict[str, str] = {}
+    pendientes = [
+        p for p in pasos if (p.nombre in solo if solo is not None else p.por_defecto)
+    ]
+    seleccionados = {p.nombre for p in pendientes}
+    en_ejecucion: dict[Future[int | None], tuple[PasoSeed, float]] = {}
+
+    def dependencias_listas(paso: PasoSeed) -> bool:
+        # Las dependencias no seleccionadas se asumen ya cargadas
+        return all(
+            d in resultado.pasos or d not in seleccionados for d in paso.depende_de
+        )
+
+    def registrar(paso_resultado: ResultadoPaso) -> None:
+        resultado.pasos[paso_resultado.nombre] = paso_resultado
+        icono = {
+            "ejecutado": "✅",
+            "sin_cambios": "⏭️ ",
+            "fallido": "❌",
+            "omitido": "⏭️ ",
+        }[paso_resultado.estado]
+        detalle = {
+            "ejecutado": f"{paso_resultado.segundos:.1f}s",
+            "sin_cambios": "sin cambios",
+            "fallido": paso_resultado.error,
+            "omitido": paso_resultado.error,
+        }[paso_resultado.estado]
+        print(f"\n{icono} [{paso_resultado.nombre}] {detalle}")
+
+    with ThreadPoolExecutor(max_workers=max(paralelo, 1)) as executor:
+        while pendientes or en_ejecucion:
+            for paso in [p for p in pendientes if dependencias_listas(p)]:
+                pendientes.remove(paso)
+                previos = [resultado.pasos.get(d) for d in paso.depende_de]
+
+                caidos = [
+                    p.nombre
+                    for p in previos
+                    if p and p.estado in ("fallido", "omitido")
+                ]
+                if caidos:
+                    registrar(
+                        ResultadoPaso(
+                            paso.nombre,
+                            "omitido",
+                            error=f"depende de {', '.join(caidos)}, que no se cargó",
+                        )
+                    )
+                    continue
+
+                hashes[paso.nombre] = hash_paso(
+                    paso, (hashes.get(d, "") for d in paso.depende_de)
+                )
+                dependencia_ejecutada = any(
+                    p and p.estado == "ejecutado" for p in previos
+                )
+                if (
+                    not forzar
+                    and solo is None
+                    and not dependencia_ejecutada
+                    and guardados.get(paso.nombre) == hashes[paso.nombre]
+                    and _tablas_con_datos(engine, paso.tablas)
+                ):
+                    registrar(ResultadoPaso(paso.nombre, "sin_cambios"))
+                    continue
+
+                print(f"\n▶️  [{paso.nombre}] {paso.descripcion}")
+                futuro = executor.submit(paso.ejecutar, engine)
+                en_ejecucion[futuro] = (paso, time.perf_counter())
+
+            if not en_ejecucion:
+                continue
+
+            terminados, _ = wait(en_ejecucion, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                paso, inicio_paso = en_ejecucion.pop(futuro)
+                segundos = time.perf_counter() - inicio_paso
+                try:
+                    filas = futuro.result()
+                except Exception as e:
+                    traceback.print_exception(e)
+                    registrar(
+                        ResultadoPaso(
+                            paso.nombre, "fallido", segundos=segundos, error=str(e)
+                        )
+                    )
+                    continue
+
+                paso_resultado = ResultadoPaso(
+                    paso.nombre, "ejecutado", filas=filas, segundos=segundos
+                )
+                # Se recalcula: la primera corrida descarga los archivos fuente
+                hashes[paso.nombre] = hash_paso(
+                    paso, (hashes.get(d, "") for d in paso.depende_de)
+                )
+                _guardar_hash(engine, paso_resultado, hashes[paso.nombre])
+                registrar(paso_resultado)
+
+    resultado.segundos = time.perf_counter() - inicio
+    return resultado
+
+
+def fallo_obligatorio(resultado: ResultadoSeeds, pasos: list[PasoSeed]) -> bool:
+    """Si falló (u omitió por dependencia) algún paso no opcional."""
+    opcionales = {p.nombre for p in pasos if p.opcional}
+    return any(
+        r.estado in ("fallido", "omitido") and r.nombre not in opcionales
+        for r in resultado.pasos.values()
+    )
@@ -31,31 +31,35 @@ CAPAS DESCARGADAS AUTOMÁTICAMENTE:
 
 DESCARGA AUTOMÁTICA:
 --------------------
-Este script SIEMPRE descarga las capas directamente desde el servicio WFS del IGN.
-NO usa archivos locales. Requiere conexión a internet estable.
+Las capas se descargan desde el servicio WFS del IGN y quedan en el caché
+local de seeds (cache_helper). Los GeoJSON se cargan con COPY y PostGIS
+convierte las geometrías en un solo INSERT por capa.
 
 REQUISITOS:
 -----------
 - PostGIS habilitado en PostgreSQL
 - Tablas capa_hidrografia y capa_area_urbana creadas (migración aplicada)
 - Conexión a internet para descargar desde WFS
-- Dependencias: geopandas, shapely, geoalchemy2, requests
+- Dependencias: requests
 
 USO:
 ----
   python app/scripts/seeds/seed_capas_gis_ign.py
 
-TIEMPO ESTIMADO: 3-5 minutos (dependiendo de la velocidad de descarga)
+TIEMPO ESTIMADO: 3-5 minutos la primera vez (descarga); segundos con el caché local
 """
 
+import json
 import sys
-from collections.abc import Generator
 from pathlib import Path
+from typing import Any, cast
 
-import geopandas as gpd
 from sqlalchemy import text
 from sqlalchemy.engine import Connection
 
+from app.scripts.seeds.cache_helper import download_with_cache
+from app.scripts.seeds.copy_helper import copiar_filas, crear_tabla_temporal
+
 # Agregar el directorio raíz al path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
@@ -68,29 +72,19 @@ WFS_URLS = {
 }
 
 
-def descargar_desde_wfs_chunked(
-    capa_key: str, chunk_size: int = 5000, max_features: int | None = None
-) -> "Generator[gpd.GeoDataFrame, None, None]":
+def descargar_features(capa_key: str) -> list[dict[str, Any]]:
     """
-    Descarga una capa GIS desde el servicio WFS del IGN con caché local,
-    procesándola en chunks para evitar problemas de memoria.
+    Descarga una capa GIS desde el servicio WFS del IGN con caché local.
 
     Args:
         capa_key: Clave de la capa en WFS_URLS
-        chunk_size: Tamaño de chunk para procesar
-        max_features: Límite opcional de features a descargar para pruebas.
 
-    Yields:
-        GeoDataFrame con chunks de datos
+    Returns:
+        Features GeoJSON de la capa (lista vacía si falla la descarga)
     """
-    import json
-    from io import StringIO
-
-    from app.scripts.seeds.cache_helper import download_with_cache
-
     if capa_key not in WFS_URLS:
         print(f"❌ Capa desconocida: {capa_key}")
-        return
+        return []
 
     url = WFS_URLS[capa_key]
     print(f"📥 Descargando capa GIS: {capa_key}...")
@@ -102,53 +96,68 @@ def descargar_desde_wfs_chunked(
             url=url,
             cache_key=f"gis_ign_{capa_key}",
             max_age_days=7,
-            timeout=300,  # Default timeout
+            timeout=300,
             verify_ssl=True,
         )
+    except Exception as e:
+        print(f"❌ Error descargando {capa_key}: {e}")
+        return []
 
-        # Parsear GeoJSON
-        geojson_data = json.loads(geojson_content)
-        features = geojson_data.get("features", [])
-
-        if max_features is not None:
-            features = features[:max_features]
-
-        total_features = len(features)
-
-        print(f"✅ Descargados {total_features:,} features de {capa_key}")
+    features = cast(
+        list[dict[str, Any]], json.loads(geojson_content).get("features", [])
+    )
+    print(f"✅ Descargados {len(features):,} features de {capa_key}")
+    return features
 
-        # Procesar en chunks
-        for i in range(0, total_features, chunk_size):
-            chunk_features = features[i : i + chunk_size]
 
-            # Crear un GeoJSON temporal para este chunk
-            chunk_geojson = {"type": "FeatureCollection", "features": chunk_features}
+def _nombre(props: dict[str, Any]) -> str | None:
+    nombre = props.get("nombre") or props.get("nam")
+    return str(nombre)[:200] if nombre else None
 
-            # Convertir a GeoDataFrame
-            chunk_json_str = json.dumps(chunk_geojson)
-            gdf = gpd.read_file(StringIO(chunk_json_str))
 
-            # Asegurar que esté en EPSG:4326
-            if gdf.crs and gdf.crs.to_epsg() != 4326:
-                gdf = gdf.to_crs(epsg=4326)
+# Tipos de las columnas cargadas como texto en la tabla temporal
+_TIPOS = {"poblacion": "integer"}
 
-            yield gdf
 
-    except Exception as e:
-        print(f"❌ Error procesando {capa_key}: {e}")
-        import traceback
+def _cargar_capa(
+    conn: Connection,
+    tabla: str,
+    columnas: tuple[str, ...],
+    filas: list[tuple[Any, ...]],
+) -> int:
+    """
+    Carga filas (columnas..., geometría GeoJSON) con COPY en una tabla
+    temporal e inserta en la capa con un solo INSERT ... SELECT.
 
-        traceback.print_exc()
+    PostGIS parsea el GeoJSON (EPSG:4326) y ``ST_Multi`` lo lleva al tipo
+    multi de la tabla.
+    """
+    crear_tabla_temporal(
+        conn,
+        "_capa_gis",
+        ", ".join(f"{c} text" for c in columnas) + ", geojson text",
+    )
+    copiar_filas(conn, "_capa_gis", (*columnas, "geojson"), filas)
+    result = conn.execute(
+        text(f"""
+            INSERT INTO {tabla} ({", ".join(columnas)}, geometria, fuente)
+            SELECT
+                {", ".join(f"{c}::{_TIPOS.get(c, 'text')}" for c in columnas)},
+                ST_Multi(ST_SetSRID(ST_GeomFromGeoJSON(geojson), 4326)),
+                'IGN'
+            FROM _capa_gis
+        """)
+    )
+    conn.execute(text("DROP TABLE _capa_gis"))
+    return result.rowcount
 
 
 def seed_hidrografia(conn: Connection) -> int:
     """
     Carga cursos de agua descargándolos desde el servicio WFS del IGN.
 
-    IMPORTANTE: Siempre descarga desde WFS, nunca usa archivos locales.
-
     Args:
-        conn: Conexión SQLAlchemy
+        conn: Conexión SQLAlchemy (dentro de una transacción)
 
     Returns:
         Número de cursos de agua insertados
@@ -158,7 +167,6 @@ def seed_hidrografia(conn: Connection) -> int:
     print("=" * 70)
 
     total_inserted = 0
-    table_name = "capa_hidrografia"
 
     # Capas de hidrografía desde WFS
     capas_hidro = [
@@ -169,103 +177,31 @@ def seed_hidrografia(conn: Connection) -> int:
     for capa_key, tipo_curso in capas_hidro:
         print(f"\n📍 Procesando: {tipo_curso}")
 
-        # Descargar y procesar en chunks desde WFS
-        inserted_in_capa = 0
-        chunk_num = 0
-
-        for gdf_chunk in descargar_desde_wfs_chunked(capa_key, chunk_size=5000):
-            chunk_num += 1
-            print(f"\n   📦 Chunk {chunk_num} ({len(gdf_chunk):,} features)...")
-
-            if gdf_chunk.empty:
-                print("      Chunk vacío, saltando.")
-                continue
-
-            # Preparar GeoDataFrame para inserción
-            df_to_insert = gdf_chunk.copy()
-
-            # Renombrar columna de geometría a 'geometria' si no lo está
-            if "geometry" in df_to_insert.columns:
-                df_to_insert.rename(columns={"geometry": "geometria"}, inplace=True)
-
-            # Añadir columnas de metadatos
-            df_to_insert["tipo"] = tipo_curso
-            df_to_insert["fuente"] = "IGN"
-            df_to_insert["created_at"] = text("CURRENT_TIMESTAMP")
-            df_to_insert["updated_at"] = text("CURRENT_TIMESTAMP")
-
-            # Normalizar columna 'nombre'
-            if "nombre" in df_to_insert.columns:
-                df_to_insert["nombre"] = (
-                    df_to_insert["nombre"].astype(str).str[:200].replace("None", None)
-                )
-            elif "nam" in df_to_insert.columns:
-                df_to_insert["nombre"] = (
-                    df_to_insert["nam"].astype(str).str[:200].replace("None", None)
-                )
-                df_to_insert.drop(columns=["nam"], inplace=True)
-            else:
-                df_to_insert["nombre"] = None
-
-            # Eliminar columnas que no existen en la tabla destino o no son necesarias
-            # Mantener solo 'nombre', 'tipo', 'geometria', 'fuente', 'created_at', 'updated_at'
-            cols_to_keep = [
-                "nombre",
-                "tipo",
-                "geometria",
-                "fuente",
-                "created_at",
-                "updated_at",
-            ]
-            df_to_insert = df_to_insert[
-                [col for col in cols_to_keep if col in df_to_insert.columns]
-            ]
-
-            # Iniciar transacción para el chunk
-            trans = conn.begin()
-            try:
-                print(f"      Insertando {len(df_to_insert)} registros...")
-                df_to_insert.to_postgis(
-                    table_name,
-                    conn,
-                    schema="public",  # Asumiendo que la tabla está en el schema public
-                    if_exists="append",  # Siempre append para chunks
-                    index=False,
-                    dtype={
-                        "geometria": Geometry("MULTILINESTRING", srid=4326)
-                    },  # Hidrografía es LineString/MultiLineString
-                )
-                trans.commit()
-                inserted_in_capa += len(df_to_insert)
-                print("      ✅ Chunk insertado.")
-            except Exception as e:
-                print(f"      ❌ Error insertando chunk: {e}")
-                import traceback
-
-                traceback.print_exc()
-                trans.rollback()
-                # Continuar con el siguiente chunk o capa si se desea, o re-raise
-                continue
-
-        # Crear índice espacial al final de cada capa
-        if inserted_in_capa > 0:
-            print(f"   Creando índice espacial para {table_name}...")
-            trans = conn.begin()
-            try:
-                conn.execute(
-                    text(
-                        f"CREATE INDEX IF NOT EXISTS idx_{table_name}_geometria ON public.{table_name} USING GIST (geometria)"
-                    )
-                )
-                trans.commit()  # Commit del CREATE INDEX
-                print("   ✅ Índice espacial creado.")
-            except Exception as e:
-                print(f"   ❌ Error creando índice espacial: {e}")
-                trans.rollback()
+        filas = [
+            (
+                _nombre(feature.get("properties") or {}),
+                tipo_curso,
+                json.dumps(feature["geometry"]),
+            )
+            for feature in descargar_features(capa_key)
+            if feature.get("geometry")
+        ]
+        inserted_in_capa = _cargar_capa(
+            conn, "capa_hidrografia", ("nombre", "tipo"), filas
+        )
 
         print(f"\n✅ Insertados {inserted_in_capa:,} {tipo_curso}")
         total_inserted += inserted_in_capa
 
+    # Índice espacial (la tabla no lo define en el modelo)
+    if total_inserted > 0:
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS idx_capa_hidrografia_geometria "
+                "ON public.capa_hidrografia USING GIST (geometria)"
+            )
+        )
+
     print("\n" + "=" * 70)
     print(f"✅ HIDROGRAFÍA CARGADA: {total_inserted:,} cursos de agua")
     print("=" * 70)
@@ -277,10 +213,8 @@ def seed_areas_urbanas(conn: Connection) -> int:
     """
     Carga áreas urbanas descargándolas desde el servicio WFS del IGN.
 
-    IMPORTANTE: Siempre descarga desde WFS, nunca usa archivos locales.
-
     Args:
-        conn: Conexión SQLAlchemy
+        conn: Conexión SQLAlchemy (dentro de una transacción)
 
     Returns:
         Número de áreas urbanas insertadas
@@ -289,92 +223,18 @@ def seed_areas_urbanas(conn: Connection) -> int:
     print("🏙️  CARGANDO ÁREAS URBANAS")
     print("=" * 70)
 
-    # Descargar y procesar en chunks desde WFS
-    inserted = 0
-    batch_size = 2000  # 🚀 4x más grande
-    chunk_num = 0
-
-    for gdf_chunk in descargar_desde_wfs_chunked("areas_urbanas", chunk_size=5000):
-        chunk_num += 1
-        print(f"\n   📦 Chunk {chunk_num} ({len(gdf_chunk):,} features)...")
-
-        # Iniciar transacción para el chunk
-        trans = conn.begin()
-        try:
-            # Procesar el chunk en batches más pequeños para inserción
-            for i in range(0, len(gdf_chunk), batch_size):
-                batch = gdf_chunk.iloc[i : i + batch_size]
-                batch_num = (i // batch_size) + 1
-                total_batches = (len(gdf_chunk) + batch_size - 1) // batch_size
-
-                # 🚀 Print solo cada 5 batches
-                if batch_num % 5 == 1 or batch_num == total_batches:
-                    print(
-                        f"      → Batch {batch_num}/{total_batches}...",
-                        end=" ",
-                        flush=True,
-                    )
-
-                values_list = []
-                for _idx, row in batch.iterrows():
-                    # Extraer nombre y población si existen
-                    nombre = None
-                    poblacion = None
-
-                    if "nombre" in row:
-                        nombre = str(row["nombre"])[:200] if row["nombre"] else None
-                    elif "nam" in row:
-                        nombre = str(row["nam"])[:200] if row["nam"] else None
-
-                    # Escapar comillas simples en el nombre (SQL injection prevention)
-                    if nombre:
-                        nombre = nombre.replace("'", "''")
-
-                    if "poblacion" in row:
-                        try:
-                            poblacion = int(row["poblacion"])
-                        except (ValueError, TypeError):
-                            poblacion = None
-
-                    # Convertir geometría a WKT
-                    geom_wkt = row.geometry.wkt if row.geometry else None
-
-                    if geom_wkt:
-                        # Escapar comillas simples en la geometría también
-                        geom_wkt = geom_wkt.replace("'", "''")
-
-                        values_list.append(f"""(
-                            {f"'{nombre}'" if nombre else "NULL"},
-                            NULL,
-                            {poblacion if poblacion else "NULL"},
-                            ST_GeomFromText('{geom_wkt}', 4326),
-                            'IGN',
-                            CURRENT_TIMESTAMP,
-                            CURRENT_TIMESTAMP
-                        )""")
-
-                if values_list:
-                    stmt = text(f"""
-                        INSERT INTO capa_area_urbana (
-                            nombre, id_departamento_indec, poblacion,
-                            geometria, fuente, created_at, updated_at
-                        ) VALUES {",".join(values_list)}
-                    """)
-
-                    conn.execute(stmt)
-                    inserted += len(values_list)
-                    if batch_num % 5 == 1 or batch_num == total_batches:
-                        print("✅")
-
-            # Commit al finalizar el chunk exitosamente
-            trans.commit()
-
-        except Exception as e:
-            print(f"❌ Error procesando chunk: {e}")
-            trans.rollback()
-            # Continuar con siguiente chunk? O fallar?
-            # Mejor continuar intentando siguiente chunk
+    filas = []
+    for feature in descargar_features("areas_urbanas"):
+        if not feature.get("geometry"):
             continue
+        props = feature.get("properties") or {}
+        try:
+            poblacion = int(props["poblacion"]) if props.get("poblacion") else None
+        except (ValueError, TypeError):
+            poblacion = None
+        filas.append((_nombre(props), poblacion, json.dumps(feature["geometry"])))
+
+    inserted = _cargar_capa(conn, "capa_area_urbana", ("nombre", "poblacion"), filas)
 
     print("\n" + "=" * 70)
     print(f"✅ ÁREAS URBANAS CARGADAS: {inserted:,}")
@@ -386,8 +246,7 @@ def seed_areas_urbanas(conn: Connection) -> int:
 if __name__ == "__main__":
     import os
 
-    from geoalchemy2 import Geometry
-    from sqlalchemy import create_engine, text
+    from sqlalchemy import create_engine
 
     DATABASE_URL = os.getenv(
         "DATABASE_URL",
@@ -412,7 +271,7 @@ if __name__ == "__main__":
     print("=" * 70)
 
     try:
-        with engine.connect() as conn:
+        with engine.begin() as conn:
             # Verificar PostGIS
             result = conn.execute(text("SELECT PostGIS_Version()")).fetchone()
             print(f"\n✅ PostGIS detectado: {result[0]}")
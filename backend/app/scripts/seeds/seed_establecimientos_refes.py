@@ -42,7 +42,7 @@ USO:
 ----
   python app/scripts/seeds/seed_establecimientos_refes.py
 
-TIEMPO ESTIMADO: 2-3 minutos (~8,300 registros + descarga WFS)
+TIEMPO ESTIMADO: segundos con el WFS en caché (~8,300 registros por COPY)
 """
 
 import json
@@ -52,13 +52,10 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import pandas as pd
-from sqlalchemy import case, func
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import text
 from sqlalchemy.engine import Connection
-from sqlmodel import col, select, update
 
-from app.domains.territorio.establecimientos_models import Establecimiento
-from app.domains.territorio.geografia_models import Departamento, Localidad
+from app.scripts.seeds.copy_helper import copiar_filas, crear_tabla_temporal
 
 if TYPE_CHECKING:
     import geopandas as gpd
@@ -137,95 +134,73 @@ def limpiar_coordenada(val: Any) -> float | None:
         return None
 
 
-def asignar_localidad_por_coordenadas(
-    conn: Connection, lat: float, lng: float
-) -> int | None:
+def asignar_localidades(conn: Connection) -> int:
     """
-    Asigna localidad INDEC usando reverse geocoding mejorado.
+    Asigna localidad INDEC a los establecimientos IGN por cercanía.
 
-    Estrategia v2 (mejorada):
-    1. Buscar departamento más cercano al punto (lat, lng)
-    2. Dentro de ese departamento, buscar la localidad MÁS CERCANA al punto
-    3. Si no hay localidades con coordenadas, usar la primera del departamento
-
-    Mejoras respecto a v1:
-    - Busca localidad más cercana (antes solo tomaba la primera)
-    - Considera localidades con coordenadas válidas
-    - Fallback a primera localidad si ninguna tiene coords
+    Misma estrategia que el reverse geocoding punto por punto, pero en un
+    solo UPDATE para todos los establecimientos sin localidad:
+    1. Departamento más cercano al punto (dentro de ±0.5 grados, ~55km)
+    2. Dentro de ese departamento, la localidad con coordenadas MÁS CERCANA
+    3. Si ninguna localidad tiene coordenadas, la primera del departamento
 
     Args:
         conn: Conexión SQLAlchemy
-        lat: Latitud del punto
-        lng: Longitud del punto
 
     Returns:
-        id_localidad_indec o None si no se encuentra
+        Número de establecimientos con localidad asignada
     """
-    # Paso 1: Encontrar departamento más cercano
-    # Buffer de 0.5 grados (~55km) para limitar búsqueda
-    # Paso 1: Encontrar departamento más cercano
-    # Buffer de 0.5 grados (~55km) para limitar búsqueda
-    # SELECT id_departamento_indec FROM departamento ...
-    lat_min, lat_max = lat - 0.5, lat + 0.5
-    lng_min, lng_max = lng - 0.5, lng + 0.5
-
-    stmt_dept = (
-        select(Departamento.id_departamento_indec)
-        .where(col(Departamento.latitud).between(lat_min, lat_max))
-        .where(col(Departamento.longitud).between(lng_min, lng_max))
-        .order_by(
-            (col(Departamento.latitud) - lat) * (col(Departamento.latitud) - lat)  # type: ignore[operator]
-            + (col(Departamento.longitud) - lng) * (col(Departamento.longitud) - lng)  # type: ignore[operator]
-        )
-        .limit(1)
-    )
-
-    dept_result = conn.execute(stmt_dept)
-
-    dept_row = dept_result.first()
-    if not dept_row:
-        return None
-
-    id_departamento = dept_row[0]
-
-    # Paso 2: Dentro de ese departamento, buscar localidad más cercana
-    # Priorizar localidades con coordenadas válidas
-    stmt_loc = (
-        select(Localidad.id_localidad_indec)
-        .where(Localidad.id_departamento_indec == id_departamento)
-        .where(col(Localidad.latitud).is_not(None))
-        .where(col(Localidad.longitud).is_not(None))
-        .order_by(
-            (col(Localidad.latitud) - lat) * (col(Localidad.latitud) - lat)  # type: ignore[operator]
-            + (col(Localidad.longitud) - lng) * (col(Localidad.longitud) - lng)  # type: ignore[operator]
-        )
-        .limit(1)
-    )
-
-    loc_result = conn.execute(stmt_loc)
-    loc_row = loc_result.first()
-
-    # Si encontramos localidad con coordenadas, usarla
-    if loc_row:
-        return int(loc_row[0])
-
-    # Fallback: Si ninguna localidad tiene coordenadas, usar la primera del departamento
-    stmt_fallback = (
-        select(Localidad.id_localidad_indec)
-        .where(Localidad.id_departamento_indec == id_departamento)
-        .limit(1)
-    )
-    fallback_result = conn.execute(stmt_fallback)
-
-    fallback_row = fallback_result.first()
-    return fallback_row[0] if fallback_row else None
+    stmt = text("""
+        UPDATE establecimiento e
+        SET id_localidad_indec = asignada.id_localidad_indec
+        FROM (
+            SELECT
+                est.id,
+                COALESCE(cercana.id_localidad_indec, primera.id_localidad_indec)
+                    AS id_localidad_indec
+            FROM establecimiento est
+            CROSS JOIN LATERAL (
+                SELECT d.id_departamento_indec
+                FROM departamento d
+                WHERE d.latitud BETWEEN est.latitud - 0.5 AND est.latitud + 0.5
+                  AND d.longitud BETWEEN est.longitud - 0.5 AND est.longitud + 0.5
+                ORDER BY (d.latitud - est.latitud) * (d.latitud - est.latitud)
+                       + (d.longitud - est.longitud) * (d.longitud - est.longitud)
+                LIMIT 1
+            ) dept
+            LEFT JOIN LATERAL (
+                SELECT l.id_localidad_indec
+                FROM localidad l
+                WHERE l.id_departamento_indec = dept.id_departamento_indec
+                  AND l.latitud IS NOT NULL
+                  AND l.longitud IS NOT NULL
+                ORDER BY (l.latitud - est.latitud) * (l.latitud - est.latitud)
+                       + (l.longitud - est.longitud) * (l.longitud - est.longitud)
+                LIMIT 1
+            ) cercana ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT l.id_localidad_indec
+                FROM localidad l
+                WHERE l.id_departamento_indec = dept.id_departamento_indec
+                LIMIT 1
+            ) primera ON TRUE
+            WHERE est.source = 'IGN'
+              AND est.id_localidad_indec IS NULL
+              AND est.latitud IS NOT NULL
+              AND est.longitud IS NOT NULL
+        ) asignada
+        WHERE e.id = asignada.id
+          AND asignada.id_localidad_indec IS NOT NULL
+    """)
+    return conn.execute(stmt).rowcount
 
 
 def seed_refes(conn: Connection) -> int:
     """
     Carga establecimientos de salud desde WFS del IGN en la tabla 'establecimiento'.
 
-    Estrategia: INSERT directo, asume DB vacía (sin checks de conflicto).
+    Estrategia: COPY directo, asume DB vacía (sin checks de conflicto). La
+    localidad se asigna después con un UPDATE por cercanía.
 
     Args:
         conn: Conexión SQLAlchemy
@@ -243,119 +218,50 @@ def seed_refes(conn: Connection) -> int:
     print(f"\n📋 Columnas disponibles: {list(gdf.columns)}")
     print(f"📊 Total descargado: {len(gdf):,} establecimientos")
 
-    # 2. Extraer coordenadas de la geometría Point
-    # La geometría viene del WFS, extraer lat/lon
-    gdf["latitud"] = gdf.geometry.y
-    gdf["longitud"] = gdf.geometry.x
-
-    # 3. Mapeo de columnas IGN a nuestro modelo
+    # 2. Mapeo de columnas IGN a nuestro modelo
     # Columnas IGN: id, gid, entidad, fna, gna, nam, fdc, sag
+    # gid = código único (se usa como codigo_refes)
     # fna = Full Name (nombre completo del establecimiento)
-    # gna = Generic Name (tipo: Hospital, Centro de Salud, etc.)
-    # nam = Name (nombre corto/localidad)
-    column_mapping = {
-        "gid": "codigo_refes",  # Usar GID como código único
-        "fna": "nombre",  # Nombre completo
-        "gna": "tipo_establecimiento",  # Tipo (Hospital, Centro de Salud, etc.)
-        "nam": "nombre_corto",  # Nombre corto
-    }
-
-    # Renombrar columnas
-    df_renamed = gdf.rename(columns=column_mapping)
+    # Las coordenadas salen de la geometría Point
+    codigos = gdf["gid"] if "gid" in gdf.columns else [None] * len(gdf)
+    nombres = gdf["fna"] if "fna" in gdf.columns else [None] * len(gdf)
 
-    # 4. Limpiar y preparar datos
+    # 3. Limpiar y preparar datos
     establecimientos = []
-
-    print("\n🗺️  Asignando localidades con reverse geocoding...")
-    localidades_asignadas = 0
-
-    for idx, (_, row) in enumerate(df_renamed.iterrows()):
-        if idx % 1000 == 0 and idx > 0:
-            print(
-                f"   Procesados: {idx}/{len(df_renamed)} ({localidades_asignadas} con localidad)"
-            )
-
-        # Datos básicos de IGN
-        codigo_refes = limpiar_string(row.get("codigo_refes"))
-        nombre = limpiar_string(row.get("nombre"))
-
+    for codigo, nombre_ign, lat, lng in zip(
+        codigos, nombres, gdf.geometry.y, gdf.geometry.x, strict=True
+    ):
+        nombre = limpiar_string(nombre_ign)
         if not nombre:
             continue  # Skip si no hay nombre
 
-        # Coordenadas (ya extraídas de la geometría)
-        latitud = limpiar_coordenada(row.get("latitud"))
-        longitud = limpiar_coordenada(row.get("longitud"))
-
-        # Asignar localidad por reverse geocoding
-        id_localidad = None
-        if latitud and longitud:
-            try:
-                id_localidad = asignar_localidad_por_coordenadas(
-                    conn, latitud, longitud
-                )
-                if id_localidad:
-                    localidades_asignadas += 1
-            except Exception:
-                # Si falla el reverse geocoding, seguir sin localidad
-                pass
-
-        # IGN provee: código, nombre, coordenadas + reverse geocoding de localidad
+        codigo_refes = limpiar_string(codigo)
         establecimientos.append(
-            {
-                "codigo_refes": str(codigo_refes) if codigo_refes else None,
-                "nombre": nombre,
-                "latitud": latitud,
-                "longitud": longitud,
-                "id_localidad_indec": id_localidad,
-                "source": "IGN",
-            }
+            (
+                str(codigo_refes) if codigo_refes else None,
+                nombre,
+                limpiar_coordenada(lat),
+                limpiar_coordenada(lng),
+                "IGN",
+            )
         )
 
     if not establecimientos:
         print("⚠️  No se encontraron establecimientos válidos")
         return 0
 
-    print(f"📊 Preparados {len(establecimientos):,} establecimientos para insertar")
-
-    # 4. INSERT masivo con raw SQL
-    inserted_count = 0
-    batch_size = 500
-    total_batches = (len(establecimientos) + batch_size - 1) // batch_size
-
-    for i in range(0, len(establecimientos), batch_size):
-        batch = establecimientos[i : i + batch_size]
-        batch_num = (i // batch_size) + 1
-
-        print(
-            f"📦 Insertando batch {batch_num}/{total_batches} ({len(batch)} establecimientos)...",
-            end=" ",
-        )
+    # 4. COPY masivo
+    print(f"📦 Insertando {len(establecimientos):,} establecimientos (COPY)...")
+    inserted_count = copiar_filas(
+        conn,
+        "establecimiento",
+        ("codigo_refes", "nombre", "latitud", "longitud", "source"),
+        establecimientos,
+    )
 
-        # Construir lista de diccionarios para INSERT
-        # Usa insert() de SQLAlchemy para bulk
-        values_list = [
-            {
-                "codigo_refes": est["codigo_refes"],
-                "nombre": est["nombre"],
-                "latitud": est["latitud"],
-                "longitud": est["longitud"],
-                "id_localidad_indec": est["id_localidad_indec"],
-                "source": est.get("source"),
-                "created_at": func.current_timestamp(),
-                "updated_at": func.current_timestamp(),
-            }
-            for est in batch
-        ]
-
-        stmt = insert(Establecimiento).values(values_list)
-
-        try:
-            conn.execute(stmt)
-            inserted_count += len(batch)
-            print("✅")
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            continue
+    # 5. Localidad por cercanía (un solo UPDATE)
+    print("\n🗺️  Asignando localidades con reverse geocoding...")
+    localidades_asignadas = asignar_localidades(conn)
 
     print("\n" + "=" * 70)
     print(f"✅ ESTABLECIMIENTOS REFES CARGADOS: {inserted_count:,}")
@@ -408,54 +314,23 @@ def cargar_mapping_snvs(conn: Connection) -> int:
 
     print(f"📋 Mappings encontrados: {len(mapping):,}")
 
-    # Actualizar establecimientos con código SNVS
-    updated_count = 0
-    batch_size = 100
-
-    mapping_items = list(mapping.items())
-    total_batches = (len(mapping_items) + batch_size - 1) // batch_size
-
-    for i in range(0, len(mapping_items), batch_size):
-        batch = mapping_items[i : i + batch_size]
-        batch_num = (i // batch_size) + 1
-
-        print(
-            f"📦 Actualizando batch {batch_num}/{total_batches} ({len(batch)} mappings)...",
-            end=" ",
-        )
-
-        # Construir expresión CASE
-
-        # Primero, necesitamos una lista de tuplas para el case
-        # case_parts ya contiene strings "WHEN ... THEN ...",
-        # pero para SQLAlchemy ORM usamos case() expression object.
-
-        case_map = {
-            ign_data["codigo_refes"]: codigo_snvs
-            for codigo_snvs, ign_data in batch
-            if ign_data.get("codigo_refes")
-        }
-
-        if not case_map:
-            print("⏭️  (sin mappings válidos)")
-            continue
-
-        stmt = (
-            update(Establecimiento)
-            .where(col(Establecimiento.codigo_refes).in_(case_map.keys()))
-            .values(
-                codigo_snvs=case(case_map, value=Establecimiento.codigo_refes),
-                updated_at=func.current_timestamp(),
-            )
-        )
-
-        try:
-            result = conn.execute(stmt)
-            updated_count += result.rowcount
-            print(f"✅ ({result.rowcount} actualizados)")
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            continue
+    # codigo_refes → codigo_snvs, cargado con COPY y aplicado en un UPDATE
+    filas = {
+        ign_data["codigo_refes"]: codigo_snvs
+        for codigo_snvs, ign_data in mapping.items()
+        if ign_data.get("codigo_refes")
+    }
+    crear_tabla_temporal(conn, "_mapping_snvs", "codigo_refes text, codigo_snvs text")
+    copiar_filas(conn, "_mapping_snvs", ("codigo_refes", "codigo_snvs"), filas.items())
+    result = conn.execute(
+        text("""
+            UPDATE establecimiento e
+            SET codigo_snvs = m.codigo_snvs, updated_at = CURRENT_TIMESTAMP
+            FROM _mapping_snvs m
+            WHERE e.codigo_refes = m.codigo_refes
+        """)
+    )
+    updated_count = result.rowcount
 
     print("\n" + "=" * 70)
     print(f"✅ MAPPING SNVS CARGADO: {updated_count:,} establecimientos actualizados")
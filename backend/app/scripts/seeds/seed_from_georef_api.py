@@ -8,16 +8,22 @@ Este script:
 2. Los inserta en la BD con coordenadas
 3. Descarga localidades desde la API Georef
 4. Las inserta en la BD con coordenadas y población (censo 2010)
+
+Las respuestas de la API quedan en el caché local de seeds (cache_helper) y
+la carga es con COPY (copy_helper).
 """
 
 import json
 import os
 import time
-import urllib.request
+from typing import Any, cast
 
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Connection
 
+from app.scripts.seeds.cache_helper import cache_file, download_with_cache
+from app.scripts.seeds.copy_helper import copiar_filas
+
 
 def normalizar_nombre(nombre: str) -> str:
     """Normaliza nombres para matching"""
@@ -32,66 +38,47 @@ def normalizar_nombre(nombre: str) -> str:
     )
 
 
+def _descargar_json(url: str, cache_key: str) -> dict[str, Any] | None:
+    """Descarga un JSON de la API Georef (con caché local)."""
+    try:
+        contenido = download_with_cache(url, cache_key, max_age_days=30, timeout=60)
+    except Exception as e:
+        print(f"❌ Error descargando {url}: {e}")
+        return None
+    return cast(dict[str, Any], json.loads(contenido))
+
+
 def seed_provincias_desde_georef(conn: Connection) -> int:
     """Carga provincias desde API Georef"""
     print("\n📍 Descargando provincias desde API Georef...")
 
     # API Georef - traer todas las provincias
     url = "https://apis.datos.gob.ar/georef/api/provincias?max=50"
-
-    try:
-        with urllib.request.urlopen(url, timeout=30) as response:
-            data = json.loads(response.read().decode("utf-8"))
-    except Exception as e:
-        print(f"❌ Error descargando provincias: {e}")
+    data = _descargar_json(url, "georef_provincias")
+    if data is None:
         return 0
 
     provincias = data.get("provincias", [])
     print(f"   Descargadas: {len(provincias)} provincias")
 
-    inserted = 0
-    errors = 0
-
-    for prov in provincias:
-        # Extraer datos
-        id_provincia_indec = int(prov["id"])
-        nombre = prov["nombre"]
-
-        # Coordenadas del centroide
-        latitud = prov["centroide"]["lat"]
-        longitud = prov["centroide"]["lon"]
-
-        # INSERT simple (asume DB vacía)
-        stmt = text("""
-            INSERT INTO provincia (
-                id_provincia_indec,
-                nombre,
-                latitud,
-                longitud
+    # COPY directo (asume DB vacía)
+    inserted = copiar_filas(
+        conn,
+        "provincia",
+        ("id_provincia_indec", "nombre", "latitud", "longitud"),
+        (
+            (
+                int(prov["id"]),
+                prov["nombre"],
+                prov["centroide"]["lat"],
+                prov["centroide"]["lon"],
             )
-            VALUES (:prov_id, :nombre, :lat, :lon)
-        """)
-
-        try:
-            conn.execute(
-                stmt,
-                {
-                    "prov_id": id_provincia_indec,
-                    "nombre": nombre,
-                    "lat": latitud,
-                    "lon": longitud,
-                },
-            )
-            inserted += 1
-        except Exception as e:
-            errors += 1
-            print(f"   ⚠️  Error con {nombre}: {e}")
-            continue
+            for prov in provincias
+        ),
+    )
 
     # Commit automático al salir del contexto engine.begin()
     print(f"✅ Provincias procesadas: {inserted}")
-    if errors > 0:
-        print(f"⚠️  Errores: {errors}")
     return inserted
 
 
@@ -101,67 +88,39 @@ def seed_departamentos_desde_georef(conn: Connection) -> int:
 
     # API Georef - traer todos los departamentos
     url = "https://apis.datos.gob.ar/georef/api/departamentos?max=1000"
-
-    try:
-        with urllib.request.urlopen(url, timeout=30) as response:
-            data = json.loads(response.read().decode("utf-8"))
-    except Exception as e:
-        print(f"❌ Error descargando departamentos: {e}")
+    data = _descargar_json(url, "georef_departamentos")
+    if data is None:
         return 0
 
     departamentos = data.get("departamentos", [])
     print(f"   Descargados: {len(departamentos)} departamentos")
 
-    inserted = 0
-    errors = 0
-
-    for dept in departamentos:
-        # Extraer datos
-        id_full = dept["id"]  # Ej: "06014"
-        nombre = dept["nombre"]
-        provincia_id = int(dept["provincia"]["id"])  # Ej: "06" -> 6
-        dept_id = int(id_full)  # Usar el ID completo INDEC (5 dígitos)
-
-        # Coordenadas del centroide
-        latitud = dept["centroide"]["lat"]
-        longitud = dept["centroide"]["lon"]
-
-        # INSERT simple (asume DB vacía)
-        stmt = text("""
-            INSERT INTO departamento (
-                id_departamento_indec,
-                nombre,
-                id_provincia_indec,
-                latitud,
-                longitud
+    # COPY directo (asume DB vacía). El ID es el completo INDEC (5 dígitos,
+    # ej: "06014") y la provincia viene anidada (ej: "06" -> 6)
+    inserted = copiar_filas(
+        conn,
+        "departamento",
+        (
+            "id_departamento_indec",
+            "nombre",
+            "id_provincia_indec",
+            "latitud",
+            "longitud",
+        ),
+        (
+            (
+                int(dept["id"]),
+                dept["nombre"],
+                int(dept["provincia"]["id"]),
+                dept["centroide"]["lat"],
+                dept["centroide"]["lon"],
             )
-            VALUES (:dept_id, :nombre, :prov_id, :lat, :lon)
-        """)
-
-        try:
-            conn.execute(
-                stmt,
-                {
-                    "dept_id": dept_id,
-                    "nombre": nombre,
-                    "prov_id": provincia_id,
-                    "lat": latitud,
-                    "lon": longitud,
-                },
-            )
-            inserted += 1
-            if inserted % 50 == 0:
-                print(f"   Procesados: {inserted}...")
-        except Exception as e:
-            errors += 1
-            if errors < 5:
-                print(f"   ⚠️  Error con {nombre}: {e}")
-            continue
+            for dept in departamentos
+        ),
+    )
 
     # Commit automático al salir del contexto engine.begin()
     print(f"\n✅ Departamentos procesados: {inserted}")
-    if errors > 0:
-        print(f"⚠️  Errores: {errors}")
     return inserted
 
 
@@ -183,13 +142,12 @@ def seed_localidades_desde_georef(conn: Connection, max_localidades: int = 5000)
 
     while len(todas_localidades) < max_localidades:
         url_con_params = f"{url}?max={cantidad_por_pagina}&inicio={inicio}"
+        cache_key = f"georef_localidades_{inicio}"
+        descargada = not cache_file(cache_key).exists()
 
-        try:
-            print(f"   Descargando desde {inicio}...")
-            with urllib.request.urlopen(url_con_params, timeout=30) as response:
-                data = json.loads(response.read().decode("utf-8"))
-        except Exception as e:
-            print(f"❌ Error descargando localidades: {e}")
+        print(f"   Descargando desde {inicio}...")
+        data = _descargar_json(url_con_params, cache_key)
+        if data is None:
             break
 
         localidades = data.get("localidades", [])
@@ -199,86 +157,68 @@ def seed_localidades_desde_georef(conn: Connection, max_localidades: int = 5000)
         todas_localidades.extend(localidades)
         inicio += cantidad_por_pagina
 
-        # Respetar rate limits
-        time.sleep(0.5)
+        # Respetar rate limits (solo si se pidió a la API)
+        if descargada:
+            time.sleep(0.5)
 
         if len(localidades) < cantidad_por_pagina:
             break
 
     print(f"   Descargadas: {len(todas_localidades)} localidades")
 
-    inserted = 0
+    # Con COPY una FK inválida aborta toda la carga: se descartan antes las
+    # localidades cuyo departamento no está en la BD
+    departamentos_bd = set(
+        conn.execute(text("SELECT id_departamento_indec FROM departamento")).scalars()
+    )
+
+    filas = []
     skipped_no_dept = 0
-    errors = 0
 
     for loc in todas_localidades:
-        # Extraer datos
-        id_full = loc["id"]  # Ej: "060014010"
-        nombre = loc["nombre"]
-
-        # IDs INDEC
-        id_localidad = int(id_full)
-
-        # Departamento (si existe)
-        if loc.get("departamento"):
-            dept_id_full = loc["departamento"]["id"]
-            dept_id = int(dept_id_full)  # Usar el ID completo INDEC (5 dígitos)
-        else:
+        # Departamento (si existe), con el ID completo INDEC (5 dígitos)
+        departamento = loc.get("departamento")
+        if not departamento or int(departamento["id"]) not in departamentos_bd:
             skipped_no_dept += 1
             continue
 
         # Coordenadas
-        if loc.get("centroide"):
-            latitud = loc["centroide"]["lat"]
-            longitud = loc["centroide"]["lon"]
-        else:
-            latitud = None
-            longitud = None
+        centroide = loc.get("centroide") or {}
 
         # Población (del censo 2010)
         poblacion = loc.get("poblacion")
         if poblacion and isinstance(poblacion, dict):
             poblacion = poblacion.get("valor")
 
-        # INSERT simple (asume DB vacía)
-        stmt = text("""
-            INSERT INTO localidad (
-                id_localidad_indec,
-                nombre,
-                id_departamento_indec,
+        filas.append(
+            (
+                int(loc["id"]),  # Ej: "060014010"
+                loc["nombre"],
+                int(departamento["id"]),
                 poblacion,
-                latitud,
-                longitud
-            )
-            VALUES (:loc_id, :nombre, :dept_id, :poblacion, :lat, :lon)
-        """)
-
-        try:
-            conn.execute(
-                stmt,
-                {
-                    "loc_id": id_localidad,
-                    "nombre": nombre,
-                    "dept_id": dept_id,
-                    "poblacion": poblacion,
-                    "lat": latitud,
-                    "lon": longitud,
-                },
+                centroide.get("lat"),
+                centroide.get("lon"),
             )
-            inserted += 1
-            if inserted % 500 == 0:
-                print(f"   Procesadas: {inserted}...")
-        except Exception as e:
-            errors += 1
-            if errors < 5:
-                print(f"   ⚠️  Error con {nombre}: {e}")
-            continue
+        )
+
+    # COPY directo (asume DB vacía)
+    inserted = copiar_filas(
+        conn,
+        "localidad",
+        (
+            "id_localidad_indec",
+            "nombre",
+            "id_departamento_indec",
+            "poblacion",
+            "latitud",
+            "longitud",
+        ),
+        filas,
+    )
 
     # Commit automático al salir del contexto engine.begin()
     print(f"\n✅ Localidades procesadas: {inserted}")
     print(f"⚠️  Localidades sin departamento: {skipped_no_dept}")
-    if errors > 0:
-        print(f"⚠️  Errores: {errors}")
     return inserted
 
 
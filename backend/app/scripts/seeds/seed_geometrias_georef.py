@@ -5,7 +5,9 @@ Descarga los GeoJSON completos desde:
 - https://infra.datos.gob.ar/georef/provincias.geojson
 - https://infra.datos.gob.ar/georef/departamentos.geojson
 
-Y actualiza las tablas provincia y departamento con las geometrías.
+Y actualiza las tablas provincia y departamento con las geometrías: los
+GeoJSON se cargan con COPY en una tabla temporal y PostGIS los convierte en
+un único UPDATE por tabla.
 
 IMPORTANTE: Este seed solo actualiza registros existentes (no crea nuevos).
 Debe ejecutarse DESPUÉS del seed principal de geografía.
@@ -13,13 +15,14 @@ Debe ejecutarse DESPUÉS del seed principal de geografía.
 
 import json
 import os
-import urllib.request
-from typing import Any
+from typing import Any, cast
 
-from shapely.geometry import shape
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Connection
 
+from app.scripts.seeds.cache_helper import download_with_cache
+from app.scripts.seeds.copy_helper import copiar_filas, crear_tabla_temporal
+
 # URLs de descarga directa de GeoJSON
 PROVINCIAS_GEOJSON_URL = "https://infra.datos.gob.ar/georef/provincias.geojson"
 DEPARTAMENTOS_GEOJSON_URL = "https://infra.datos.gob.ar/georef/departamentos.geojson"
@@ -29,34 +32,35 @@ FUENTE = "Georef API (datos.gob.ar)"
 
 
 def descargar_geojson(url: str, nombre: str) -> dict[str, Any] | None:
-    """Descarga un GeoJSON desde una URL."""
+    """Descarga un GeoJSON desde una URL (con caché local)."""
     print(f"   Descargando {nombre} desde {url}...")
     try:
-        with urllib.request.urlopen(url, timeout=120) as response:
-            data = json.loads(response.read().decode("utf-8"))
-            import typing
-
-            return typing.cast(dict[str, Any], data)
+        contenido = download_with_cache(
+            url, f"georef_geometrias_{nombre}", max_age_days=30, timeout=300
+        )
+        return cast(dict[str, Any], json.loads(contenido))
     except Exception as e:
         print(f"❌ Error descargando {nombre}: {e}")
         return None
 
 
-def geometry_to_multipolygon_wkt(geometry: dict) -> str:
+def _actualizar_geometrias(
+    conn: Connection, filas: list[tuple[int, int | None, str]], update_sql: str
+) -> int:
     """
-    Convierte una geometría GeoJSON a WKT MultiPolygon.
+    Carga (id, id_provincia, geometría GeoJSON) con COPY en una tabla temporal
+    y actualiza la tabla destino con un solo UPDATE.
 
-    Maneja tanto Polygon como MultiPolygon.
+    PostGIS parsea el GeoJSON y ``ST_Multi`` convierte Polygon en
+    MultiPolygon.
     """
-    geom = shape(geometry)
-
-    # Si es Polygon, convertir a MultiPolygon
-    if geom.geom_type == "Polygon":
-        from shapely.geometry import MultiPolygon
-
-        geom = MultiPolygon([geom])
-
-    return str(geom.wkt)
+    crear_tabla_temporal(
+        conn, "_geometrias", "id bigint, id_provincia bigint, geojson text"
+    )
+    copiar_filas(conn, "_geometrias", ("id", "id_provincia", "geojson"), filas)
+    result = conn.execute(text(update_sql), {"fuente": FUENTE})
+    conn.execute(text("DROP TABLE _geometrias"))
+    return result.rowcount
 
 
 def seed_geometrias_provincias(conn: Connection) -> int:
@@ -85,54 +89,32 @@ def seed_geometrias_provincias(conn: Connection) -> int:
     features = geojson.get("features", [])
     print(f"   Descargadas: {len(features)} provincias con geometría")
 
-    updated = 0
-    errors = 0
-
+    filas = []
     for feature in features:
-        props = {}
-        try:
-            props = feature.get("properties", {})
-            geometry = feature.get("geometry")
-
-            if not geometry:
-                continue
-
-            # ID de provincia INDEC
-            id_provincia_indec = int(props.get("id", 0))
-            if not id_provincia_indec:
-                continue
-
-            # Convertir geometría a WKT MultiPolygon
-            geom_wkt = geometry_to_multipolygon_wkt(geometry)
-
-            # UPDATE usando ST_GeomFromText
-            stmt = text("""
-                UPDATE provincia
-                SET
-                    geometria = ST_GeomFromText(:geom_wkt, 4326),
-                    fuente_geometria = :fuente
-                WHERE id_provincia_indec = :prov_id
-            """)
-
-            result = conn.execute(
-                stmt,
-                {"geom_wkt": geom_wkt, "fuente": FUENTE, "prov_id": id_provincia_indec},
-            )
-
-            if result.rowcount > 0:
-                updated += 1
-
-        except Exception as e:
-            errors += 1
-            if errors < 5:
-                print(
-                    f"   ⚠️  Error procesando provincia {props.get('nombre', 'desconocida')}: {e}"
-                )
+        props = feature.get("properties") or {}
+        geometry = feature.get("geometry")
+
+        # ID de provincia INDEC
+        id_provincia_indec = int(props.get("id") or 0)
+        if not geometry or not id_provincia_indec:
+            continue
+        filas.append((id_provincia_indec, None, json.dumps(geometry)))
+
+    updated = _actualizar_geometrias(
+        conn,
+        filas,
+        """
+        UPDATE provincia p
+        SET
+            geometria = ST_Multi(ST_SetSRID(ST_GeomFromGeoJSON(g.geojson), 4326)),
+            fuente_geometria = :fuente
+        FROM _geometrias g
+        WHERE p.id_provincia_indec = g.id
+        """,
+    )
 
     # Commit automático al salir del contexto engine.begin()
     print(f"✅ Geometrías de provincias actualizadas: {updated}")
-    if errors > 0:
-        print(f"⚠️  Errores: {errors}")
 
     return updated
 
@@ -163,78 +145,41 @@ def seed_geometrias_departamentos(conn: Connection) -> int:
     features = geojson.get("features", [])
     print(f"   Descargados: {len(features)} departamentos con geometría")
 
-    updated = 0
-    errors = 0
-    not_found = 0
-
+    filas = []
     for feature in features:
-        props = {}
-        try:
-            props = feature.get("properties", {})
-            geometry = feature.get("geometry")
-
-            if not geometry:
-                continue
-
-            # ID completo de departamento INDEC (5 dígitos, ej: "06014")
-            id_full = props.get("id", "")
-            if not id_full or len(id_full) < 4:
-                continue
-
-            id_departamento_indec = int(id_full)
-
-            # ID de provincia desde las props anidadas
-            provincia_info = props.get("provincia", {})
-            id_provincia_indec = int(provincia_info.get("id", 0))
-
-            if not id_provincia_indec:
-                continue
-
-            # Convertir geometría a WKT MultiPolygon
-            geom_wkt = geometry_to_multipolygon_wkt(geometry)
-
-            # UPDATE usando ST_GeomFromText
-            stmt = text("""
-                UPDATE departamento
-                SET
-                    geometria = ST_GeomFromText(:geom_wkt, 4326),
-                    fuente_geometria = :fuente
-                WHERE id_departamento_indec = :dept_id
-                  AND id_provincia_indec = :prov_id
-            """)
-
-            result = conn.execute(
-                stmt,
-                {
-                    "geom_wkt": geom_wkt,
-                    "fuente": FUENTE,
-                    "dept_id": id_departamento_indec,
-                    "prov_id": id_provincia_indec,
-                },
-            )
-
-            if result.rowcount > 0:
-                updated += 1
-                if updated % 100 == 0:
-                    print(f"   Actualizados: {updated}...")
-            else:
-                not_found += 1
-
-        except Exception as e:
-            errors += 1
-            if errors < 5:
-                print(
-                    f"   ⚠️  Error procesando departamento {props.get('nombre', 'desconocido')}: {e}"
-                )
+        props = feature.get("properties") or {}
+        geometry = feature.get("geometry")
+
+        # ID completo de departamento INDEC (5 dígitos, ej: "06014")
+        id_full = props.get("id") or ""
+        # ID de provincia desde las props anidadas
+        id_provincia_indec = int((props.get("provincia") or {}).get("id") or 0)
+
+        if not geometry or len(id_full) < 4 or not id_provincia_indec:
+            continue
+        filas.append((int(id_full), id_provincia_indec, json.dumps(geometry)))
+
+    updated = _actualizar_geometrias(
+        conn,
+        filas,
+        """
+        UPDATE departamento d
+        SET
+            geometria = ST_Multi(ST_SetSRID(ST_GeomFromGeoJSON(g.geojson), 4326)),
+            fuente_geometria = :fuente
+        FROM _geometrias g
+        WHERE d.id_departamento_indec = g.id
+          AND d.id_provincia_indec = g.id_provincia
+        """,
+    )
 
     # Commit automático al salir del contexto engine.begin()
     print(f"✅ Geometrías de departamentos actualizadas: {updated}")
+    not_found = len(filas) - updated
     if not_found > 0:
         print(
             f"ℹ️  Departamentos no encontrados en BD: {not_found} (normal si no están todos)"
         )
-    if errors > 0:
-        print(f"⚠️  Errores: {errors}")
 
     return updated
 
@@ -6,6 +6,8 @@ Fuente: https://www.indec.gob.ar/ftp/cuadros/poblacion/cnphv2022_resultados_prov
 Poblamos:
 - Población de provincias (Cuadro 1)
 - Población de departamentos (Cuadros 2.1 a 2.24)
+- Tabla poblacion_referencia (denominadores del servicio de población):
+  total por departamento y, si el cuadro las trae, columnas por sexo
 
 El archivo se descarga automáticamente si no existe.
 """
@@ -22,13 +24,24 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
-from sqlmodel import col, select, update
+from sqlmodel import col, delete, insert, select, update
 
 from app.domains.territorio.geografia_models import Departamento, Provincia
+from app.domains.territorio.poblacion_models import (
+    GRUPO_ETARIO_TOTAL,
+    SEXO_TOTAL,
+    PoblacionReferencia,
+)
 
 # URL del archivo del Censo 2022
 CENSO_2022_URL = "https://www.indec.gob.ar/ftp/cuadros/poblacion/cnphv2022_resultados_provisionales.xlsx"
 
+ANIO_CENSO = 2022
+FUENTE_CENSO = "censo_2022"
+
+# Prefijo de columna del cuadro -> código de sexo en poblacion_referencia
+COLUMNAS_SEXO = {"Mujeres": "F", "Varones": "M"}
+
 
 def descargar_censo_si_no_existe(archivo_path: Path) -> bool:
     """
@@ -213,10 +226,17 @@ def seed_poblacion_departamentos(session: Session, archivo_path: Path) -> None:
 
     total_updated = 0
     total_not_found = 0
+    # Poblaciones por id de departamento, se actualizan todas juntas al final
+    actualizaciones: list[dict[str, int]] = []
+    # Filas de poblacion_referencia (total y por sexo)
+    referencias: list[dict[str, int | str]] = []
+
+    # El libro se parsea una sola vez (no una por cuadro)
+    libro = pd.ExcelFile(archivo_path)
 
     for cuadro, id_provincia_indec in cuadros_provincias.items():
         try:
-            df = pd.read_excel(archivo_path, sheet_name=cuadro, header=2)
+            df = libro.parse(cuadro, header=2)
 
             # Obtener nombre de provincia
             stmt_prov = select(Provincia.nombre).where(
@@ -239,12 +259,19 @@ def seed_poblacion_departamentos(session: Session, archivo_path: Path) -> None:
             )
             deptos_bd = deptos_result.scalars().all()
 
-            # Mapa: nombre_normalizado -> id_departamento
-            depto_map = {normalizar_nombre(d.nombre): d.id for d in deptos_bd}
+            # Mapa: nombre_normalizado -> departamento
+            depto_map = {normalizar_nombre(d.nombre): d for d in deptos_bd}
 
             # La primera columna tiene el nombre del departamento/comuna/partido
             # La segunda columna tiene "Total" con la población
             primera_col = df.columns[0]
+            # Columnas por sexo (ej: "Mujeres (2)"), si el cuadro las trae
+            columnas_sexo = {
+                columna: sexo
+                for columna in df.columns
+                for prefijo, sexo in COLUMNAS_SEXO.items()
+                if str(columna).startswith(prefijo)
+            }
 
             for _, row in df.iterrows():
                 nombre_depto = str(row[primera_col]).strip()
@@ -278,16 +305,26 @@ def seed_poblacion_departamentos(session: Session, archivo_path: Path) -> None:
                 nombre_norm = normalizar_nombre(nombre_depto)
 
                 # Buscar en mapa
-                id_depto = depto_map.get(nombre_norm)
-
-                if id_depto:
-                    # UPDATE usando ID
-                    stmt_update = (
-                        update(Departamento)
-                        .where(col(Departamento.id) == id_depto)
-                        .values(poblacion=poblacion)
+                depto = depto_map.get(nombre_norm)
+
+                if depto:
+                    actualizaciones.append({"id": depto.id, "poblacion": poblacion})
+                    por_sexo = [(SEXO_TOTAL, poblacion)]
+                    for columna, sexo in columnas_sexo.items():
+                        if not pd.isna(row[columna]):
+                            por_sexo.append((sexo, int(row[columna])))
+                    referencias.extend(
+                        {
+                            "id_provincia_indec": id_provincia_indec,
+                            "id_departamento_indec": depto.id_departamento_indec,
+                            "anio": ANIO_CENSO,
+                            "sexo": sexo,
+                            "grupo_etario": GRUPO_ETARIO_TOTAL,
+                            "poblacion": valor,
+                            "fuente": FUENTE_CENSO,
+                        }
+                        for sexo, valor in por_sexo
                     )
-                    session.execute(stmt_update)
                     total_updated += 1
                     print(f"    ✅ {nombre_depto}: {poblacion:,} hab")
                 else:
@@ -298,12 +335,27 @@ def seed_poblacion_departamentos(session: Session, archivo_path: Path) -> None:
             print(f"❌ Error procesando {cuadro}: {e}")
             continue
 
+    libro.close()
+
+    # UPDATE por id en bloque (executemany)
+    if actualizaciones:
+        session.execute(update(Departamento), actualizaciones)
+
+    # Denominadores del censo: se reemplazan todos en la misma transacción
+    if referencias:
+        session.execute(
+            delete(PoblacionReferencia).where(
+                col(PoblacionReferencia.fuente) == FUENTE_CENSO
+            )
+        )
+        session.execute(insert(PoblacionReferencia), referencias)
     session.commit()
 
     print(f"\n{'=' * 60}")
     print("✅ RESUMEN DEPARTAMENTOS:")
     print(f"   Actualizados: {total_updated}")
     print(f"   No encontrados: {total_not_found}")
+    print(f"   Filas de población de referencia: {len(referencias)}")
     print(f"{'=' * 60}")
 
 
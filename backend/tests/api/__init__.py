@@ -0,0 +1 @@
+"""Tests de los endpoints de la API."""
@@ -0,0 +1 @@
+"""Tests unitarios de los endpoints de la API."""
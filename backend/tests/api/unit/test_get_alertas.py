@@ -0,0 +1,77 @@
+"""
+Tests unitarios para el listado de alertas epidemiológicas.
+
+La sesión se mockea: se verifica el filtro de estado de la consulta armada.
+"""
+
+import inspect
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import Select
+
+from app.api.v1.analytics.get_alertas import get_alertas
+from app.core.database import get_async_session
+from app.domains.alertas.models import EstadoAlerta
+
+
+def _cliente() -> tuple[TestClient, list[Select]]:
+    consultas: list[Select] = []
+
+    async def ejecutar(query: Select) -> MagicMock:
+        consultas.append(query)
+        resultado = MagicMock()
+        resultado.all.return_value = []
+        return resultado
+
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=ejecutar)
+
+    app = FastAPI()
+    app.add_api_route("/alertas", get_alertas, methods=["GET"])
+    app.dependency_overrides[get_async_session] = lambda: db
+    # RequireAnyRole() es una instancia: se reemplaza la del endpoint
+    usuario = inspect.signature(get_alertas).parameters["current_user"].default
+    app.dependency_overrides[usuario.dependency] = lambda: MagicMock()
+    return TestClient(app), consultas
+
+
+def _filtro_estado(query: Select) -> str | None:
+    where = query.whereclause
+    if where is None:
+        return None
+    sql = str(
+        where.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    return sql if "estado" in sql else None
+
+
+class TestGetAlertas:
+    """Tests del filtro por estado."""
+
+    def test_sin_estado_lista_todas(self) -> None:
+        cliente, consultas = _cliente()
+
+        respuesta = cliente.get("/alertas")
+
+        assert respuesta.status_code == 200
+        assert _filtro_estado(consultas[0]) is None
+
+    @pytest.mark.parametrize("estado", list(EstadoAlerta))
+    def test_filtra_por_estado(self, estado: EstadoAlerta) -> None:
+        cliente, consultas = _cliente()
+
+        respuesta = cliente.get("/alertas", params={"estado": estado.value})
+
+        assert respuesta.status_code == 200
+        assert f"'{estado.value}'" in (_filtro_estado(consultas[0]) or "")
+
+    def test_estado_invalido(self) -> None:
+        cliente, _ = _cliente()
+
+        assert cliente.get("/alertas", params={"estado": "TODAS"}).status_code == 422
@@ -0,0 +1,163 @@
+"""
+Tests unitarios para el endpoint de analytics.
+
+Las tres familias de métricas corren en paralelo, cada una en su sesión: una
+sesión falsa devuelve las filas de cada query según su SQL y lleva la cuenta
+de las sesiones abiertas a la vez.
+"""
+
+import asyncio
+from datetime import date
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.api.v1.analytics import get_analytics as modulo
+from app.api.v1.analytics.get_analytics import get_analytics
+from app.api.v1.analytics.schemas import ComparisonType, PeriodType
+
+
+def _filas(*nombres: str) -> Any:
+    def armar(*valores: Any) -> SimpleNamespace:
+        return SimpleNamespace(**dict(zip(nombres, valores, strict=True)))
+
+    return armar
+
+
+_semana = _filas("anio_epi", "semana_epi", "casos_actual", "casos_comp")
+_depto = _filas(
+    "id_departamento_indec", "departamento_nombre", "casos_actual", "casos_comp"
+)
+_tasa = _filas(
+    "clasificacion_estrategia",
+    "total_actual",
+    "total_comp",
+    "confianza_suma_actual",
+    "confianza_n_actual",
+    "confianza_suma_comp",
+    "confianza_n_comp",
+)
+
+FILAS = {
+    "semana_epi": [_semana(2025, 10, 3, 1), _semana(2025, 11, 0, 2)],
+    "departamento_nombre": [
+        _depto(1, "Rawson", 2, 0),
+        _depto(2, "Trelew", 1, 1),
+        _depto(3, "Gaiman", 0, 4),
+    ],
+    "confianza_suma_actual": [
+        _tasa("CONFIRMADOS", 3, 1, 2.4, 3, 0.5, 1),
+        _tasa("SOSPECHOSOS", 1, 2, None, 0, None, 0),
+    ],
+}
+
+
+class _Sesion:
+    """AsyncSession falsa; cuenta cuántas hay abiertas a la vez."""
+
+    abiertas = 0
+    maximo = 0
+
+    def __init__(self, bind: Any, **kwargs: Any) -> None:
+        self.bind = bind
+
+    async def __aenter__(self) -> "_Sesion":
+        _Sesion.abiertas += 1
+        _Sesion.maximo = max(_Sesion.maximo, _Sesion.abiertas)
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        _Sesion.abiertas -= 1
+
+    async def execute(self, query: Any, params: dict[str, Any]) -> Any:
+        # Cede el loop para que las familias se solapen
+        await asyncio.sleep(0.01)
+        sql = str(query)
+        resultado = MagicMock()
+        resultado.all.return_value = next(
+            filas for clave, filas in FILAS.items() if clave in sql
+        )
+        return resultado
+
+
+@pytest.fixture(autouse=True)
+def sesiones(monkeypatch: pytest.MonkeyPatch) -> None:
+    _Sesion.abiertas = _Sesion.maximo = 0
+    monkeypatch.setattr(modulo, "AsyncSession", _Sesion)
+
+    async def poblacion(db: Any) -> Any:
+        return SimpleNamespace(poblacion=lambda **kwargs: 100_000)
+
+    monkeypatch.setattr(modulo, "obtener_poblacion", poblacion)
+
+
+async def _analytics() -> Any:
+    respuesta = await get_analytics(
+        period_type=PeriodType.PERSONALIZADO,
+        fecha_desde=date(2025, 3, 3),
+        fecha_hasta=date(2025, 3, 16),
+        comparison_type=ComparisonType.ROLLING,
+        fecha_referencia=None,
+        grupo_id=None,
+        tipo_eno_ids=None,
+        clasificaciones=None,
+        provincia_id=None,
+        db=MagicMock(),
+        current_user=None,
+    )
+    return respuesta.data
+
+
+class TestGetAnalytics:
+    """Tests de las métricas combinadas de las tres familias."""
+
+    @pytest.mark.asyncio
+    async def test_forma_del_resultado(self) -> None:
+        data = await _analytics()
+
+        assert data.casos.total_casos.valor_actual == 3
+        assert data.casos.total_casos.valor_anterior == 3
+        assert data.casos.total_casos.tendencia == "stable"
+        assert data.casos.incidencia_100k.valor_actual == 3
+        assert data.casos.promedio_semanal.valor_anterior == 1.5
+        assert data.casos.casos_por_semana == [
+            {"anio_epi": 2025, "semana_epi": 10, "casos": 3}
+        ]
+
+        assert data.cobertura.areas_afectadas.valor_actual == 2
+        assert data.cobertura.areas_afectadas.valor_anterior == 2
+        assert data.cobertura.nuevas_areas == 1
+        assert data.cobertura.areas_sin_casos == 1
+        assert [d["departamento_nombre"] for d in data.cobertura.top_departamentos] == [
+            "Rawson",
+            "Trelew",
+        ]
+
+        assert data.performance.tasa_confirmacion.valor_actual == 75.0
+        assert data.performance.tasa_confirmacion.valor_anterior == 33.33
+        assert data.performance.tasa_confirmacion.tendencia == "up"
+        assert data.performance.confianza_promedio.valor_actual == 0.8
+        assert data.performance.tiempo_promedio_clasificacion is None
+
+        assert data.periodo_comparacion.fecha_hasta < data.periodo_actual.fecha_desde
+
+    @pytest.mark.asyncio
+    async def test_familias_en_paralelo(self) -> None:
+        await _analytics()
+
+        # Una sesión por familia, abiertas a la vez y cerradas al terminar
+        assert _Sesion.maximo == 3
+        assert _Sesion.abiertas == 0
+
+    @pytest.mark.asyncio
+    async def test_tope_de_sesiones(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(modulo, "_sesiones_metricas", asyncio.Semaphore(4))
+
+        resultados = await asyncio.gather(*(_analytics() for _ in range(3)))
+
+        # Tres requests piden nueve sesiones; nunca hay más de cuatro abiertas
+        assert _Sesion.maximo == 4
+        assert _Sesion.abiertas == 0
+        assert all(r.casos.total_casos.valor_actual == 3 for r in resultados)
@@ -0,0 +1,309 @@
+"""
+Tests unitarios para el detalle de un caso epidemiológico.
+
+La query se compila contra el dialecto de PostgreSQL para verificar que las
+claves de cada ``json_build_object`` coincidan con los campos de la respuesta;
+el endpoint se prueba con una sesión mockeada que devuelve el documento JSON
+tal como lo armaría ``row_to_json``.
+"""
+
+import inspect
+import json
+import re
+from typing import Any, get_args
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.eventos.get_detail import (
+    AnimalInfo,
+    CasoEpidemiologicoDetailResponse,
+    CiudadanoInfo,
+    DomicilioGeograficoInfo,
+    EstablecimientoInfo,
+    EstudioInfo,
+    MuestraInfo,
+    _animal,
+    _ciudadano,
+    _domicilio,
+    _establecimiento,
+    _query_detalle,
+    _relaciones,
+    get_evento_detail,
+)
+from app.core.database import get_async_session
+from app.domains.vigilancia_nominal.models.caso import CasoEpidemiologico
+
+# Campos que la respuesta declara pero la query no arma (quedan en None)
+SIN_COLUMNA = {"fecha_diagnostico", "fecha_investigacion", "fecha_notificacion"}
+RELACIONES = set(_relaciones())
+
+
+def _sql(elemento: Any) -> str:
+    return str(elemento.compile(dialect=postgresql.dialect()))
+
+
+def _claves(elemento: Any) -> set[str]:
+    """Claves literales de los ``json_build_object`` del elemento."""
+    return set(re.findall(r"'(\w+)', ", _sql(elemento)))
+
+
+def _campos(*modelos: type[BaseModel]) -> set[str]:
+    return {campo for modelo in modelos for campo in modelo.model_fields}
+
+
+def _columnas(include_relations: bool) -> set[str]:
+    (detalle,) = _query_detalle(1, include_relations).get_final_froms()
+    return set(detalle.c.keys())
+
+
+class TestQueryDetalle:
+    """Tests de la query compilada."""
+
+    def test_con_relaciones(self) -> None:
+        columnas = _columnas(include_relations=True)
+
+        assert columnas == _campos(CasoEpidemiologicoDetailResponse) - SIN_COLUMNA
+        assert "json_agg" in _sql(_query_detalle(1, include_relations=True))
+
+    def test_sin_relaciones(self) -> None:
+        columnas = _columnas(include_relations=False)
+        sql = _sql(_query_detalle(1, include_relations=False))
+
+        # Las colecciones no se consultan; los totales se calculan igual
+        assert columnas == (
+            _campos(CasoEpidemiologicoDetailResponse) - SIN_COLUMNA - RELACIONES
+        )
+        assert "json_agg" not in sql
+        assert "total_sintomas" in columnas
+        assert sql.startswith("SELECT CAST(row_to_json(detalle) AS TEXT)")
+
+    def test_parametro_del_caso(self) -> None:
+        parametros = (
+            _query_detalle(42, include_relations=True)
+            .compile(dialect=postgresql.dialect())
+            .params
+        )
+
+        # El id filtra el caso y prioriza los datos del ciudadano de ese caso
+        assert parametros["id_1"] == 42
+        assert parametros["id_caso_1"] == 42
+
+    @pytest.mark.parametrize(
+        ("builder", "modelo"),
+        [
+            (lambda: _ciudadano(1), CiudadanoInfo),
+            (_animal, AnimalInfo),
+            (_domicilio, DomicilioGeograficoInfo),
+            (
+                lambda: _establecimiento(CasoEpidemiologico.id_establecimiento_carga),
+                EstablecimientoInfo,
+            ),
+        ],
+    )
+    def test_objetos(self, builder: Any, modelo: type[BaseModel]) -> None:
+        assert _claves(builder()) == _campos(modelo)
+
+    @pytest.mark.parametrize("nombre", sorted(RELACIONES))
+    def test_relaciones(self, nombre: str) -> None:
+        subquery = _relaciones()[nombre]
+        anotacion = CasoEpidemiologicoDetailResponse.model_fields[nombre].annotation
+        (modelo,) = get_args(anotacion)
+        # Las muestras anidan sus estudios
+        anidados = (EstudioInfo,) if modelo is MuestraInfo else ()
+
+        assert _claves(subquery) == _campos(modelo, *anidados)
+        assert "'[]'::json" in _sql(subquery)
+
+
+# Documento como lo devuelve row_to_json: fechas ISO, numeric como número
+BASE: dict[str, Any] = {
+    "id": 10,
+    "id_evento_caso": 987654,
+    "tipo_eno_id": 3,
+    "tipo_eno_nombre": "Dengue",
+    "tipo_eno_descripcion": None,
+    "enfermedad": "Dengue",
+    "fecha_minima_caso": "2025-03-04",
+    "fecha_inicio_sintomas": "2025-03-01",
+    "fecha_apertura_caso": "2025-03-04",
+    "fecha_primera_consulta": None,
+    "semana_epidemiologica_apertura": 10,
+    "anio_epidemiologico_apertura": 2025,
+    "semana_epidemiologica_sintomas": 9,
+    "clasificacion_estrategia": "CONFIRMADOS",
+    "confidence_score": 0.9,
+    "metadata_clasificacion": {"regla": 1},
+    "metadata_extraida": None,
+    "id_estrategia_aplicada": 5,
+    "estrategia_nombre": "Dengue 2025",
+    "trazabilidad_clasificacion": None,
+    "tipo_sujeto": "humano",
+    "ciudadano": None,
+    "animal": None,
+    "domicilio_geografico": None,
+    "establecimiento_consulta": None,
+    "establecimiento_notificacion": {
+        "id": 8,
+        "nombre": "Hospital Zonal",
+        "tipo": None,
+        "provincia": None,
+        "localidad": "Trelew",
+    },
+    "establecimiento_carga": None,
+    "es_caso_sintomatico": True,
+    "requiere_revision_especie": False,
+    "observaciones_texto": None,
+    "id_origen": None,
+    "datos_originales_csv": {"IDEVENTOCASO": "987654"},
+    "created_at": "2025-03-05T10:00:00",
+    "updated_at": None,
+    "total_sintomas": 0,
+    "total_muestras": 1,
+    "total_diagnosticos": 0,
+    "total_tratamientos": 0,
+    "total_internaciones": 0,
+    "total_investigaciones": 0,
+}
+
+CIUDADANO = {
+    "codigo": 77,
+    "nombre": "Ana",
+    "apellido": "",
+    "documento": "30111222",
+    "fecha_nacimiento": "1990-05-01",
+    "sexo": "FEMENINO",
+    "provincia": None,
+    "localidad": "Rawson",
+    "calle": "San Martín",
+    "numero": "120",
+    "barrio": None,
+    "telefono": None,
+    "es_embarazada": None,
+    "cobertura_social": None,
+    "ocupacion_laboral": None,
+}
+
+ANIMAL = {
+    "id": 4,
+    "identificacion": "Perro 12",
+    "especie": "Canino",
+    "raza": None,
+    "provincia": "Chubut",
+    "localidad": None,
+}
+
+DOMICILIO = {
+    "latitud": -43.3,
+    "longitud": -65.1,
+    "calle": "San Martín",
+    "numero": "120",
+    "localidad": "Rawson",
+    "departamento": None,
+    "provincia": None,
+}
+
+# Relaciones vacías como las deja el coalesce a '[]'::json
+VACIAS: dict[str, Any] = {nombre: [] for nombre in RELACIONES}
+
+
+def _cliente(documento: dict[str, Any] | None) -> TestClient:
+    resultado = MagicMock()
+    resultado.scalar_one_or_none.return_value = (
+        None if documento is None else json.dumps(documento)
+    )
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=resultado)
+
+    app = FastAPI()
+    app.add_api_route("/eventos/{evento_id}", get_evento_detail, methods=["GET"])
+    app.dependency_overrides[get_async_session] = lambda: db
+    usuario = inspect.signature(get_evento_detail).parameters["current_user"].default
+    app.dependency_overrides[usuario.dependency] = lambda: MagicMock()
+    return TestClient(app)
+
+
+def _detalle(documento: dict[str, Any] | None, **params: Any) -> Any:
+    return _cliente(documento).get("/eventos/10", params=params)
+
+
+class TestDocumentoDetalle:
+    """Tests de la validación del documento JSON contra la respuesta."""
+
+    def test_ciudadano_con_domicilio(self) -> None:
+        documento = (
+            BASE | VACIAS | {"ciudadano": CIUDADANO, "domicilio_geografico": DOMICILIO}
+        )
+        documento["muestras"] = [
+            {
+                "id": 1,
+                "tipo": "Suero",
+                "fecha_toma_muestra": "2025-03-04",
+                "establecimiento": None,
+                "semana_epidemiologica": 10,
+                "anio_epidemiologico": 2025,
+                "valor": None,
+                "estudios": [
+                    {
+                        "id": 2,
+                        "determinacion": "NS1",
+                        "tecnica": "ELISA",
+                        "resultado": "Positivo",
+                        "fecha_estudio": "2025-03-05",
+                        "fecha_recepcion": None,
+                    }
+                ],
+            }
+        ]
+
+        respuesta = _detalle(documento)
+
+        assert respuesta.status_code == 200
+        data = respuesta.json()["data"]
+        assert data["tipo_sujeto"] == "humano"
+        assert data["ciudadano"]["codigo"] == 77
+        assert data["ciudadano"]["fecha_nacimiento"] == "1990-05-01"
+        assert data["animal"] is None
+        assert data["domicilio_geografico"]["localidad"] == "Rawson"
+        assert data["muestras"][0]["estudios"][0]["resultado"] == "Positivo"
+        assert data["establecimiento_notificacion"]["nombre"] == "Hospital Zonal"
+        assert data["clasificacion_estrategia"] == "CONFIRMADOS"
+
+    def test_animal_sin_domicilio(self) -> None:
+        documento = BASE | VACIAS | {"tipo_sujeto": "animal", "animal": ANIMAL}
+
+        respuesta = _detalle(documento)
+
+        assert respuesta.status_code == 200
+        data = respuesta.json()["data"]
+        assert data["tipo_sujeto"] == "animal"
+        assert data["ciudadano"] is None
+        assert data["animal"]["especie"] == "Canino"
+        assert data["domicilio_geografico"] is None
+        assert all(data[nombre] == [] for nombre in RELACIONES)
+
+    def test_sin_relaciones(self) -> None:
+        # Sin include_relations el documento no trae las colecciones
+        respuesta = _detalle(BASE | {"ciudadano": CIUDADANO}, include_relations="false")
+
+        assert respuesta.status_code == 200
+        data = respuesta.json()["data"]
+        assert all(data[nombre] == [] for nombre in RELACIONES)
+        assert data["total_muestras"] == 1
+
+    def test_documento_valida_directo(self) -> None:
+        documento = BASE | VACIAS | {"animal": ANIMAL, "tipo_sujeto": "animal"}
+
+        respuesta = CasoEpidemiologicoDetailResponse.model_validate_json(
+            json.dumps(documento)
+        )
+
+        assert respuesta.animal == AnimalInfo.model_validate(ANIMAL)
+        assert respuesta.fecha_minima_caso.isoformat() == "2025-03-04"
+
+    def test_caso_inexistente(self) -> None:
+        assert _detalle(None).status_code == 404
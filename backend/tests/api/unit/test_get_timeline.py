@@ -0,0 +1,510 @@
+"""
+Tests unitarios para el timeline paginado de una persona.
+
+Las ramas del ``UNION ALL`` leen tablas de PostgreSQL, así que la sesión falsa
+reemplaza el CTE ``timeline`` por una tabla SQLite en memoria con las mismas
+columnas y ejecuta ahí la página tal como la arma ``_query_timeline``
+(condición de keyset, orden y ``LIMIT``), adaptada por nombre de columna.
+"""
+
+import inspect
+from collections.abc import Iterator
+from datetime import date
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Connection,
+    Date,
+    Float,
+    Integer,
+    MetaData,
+    Select,
+    String,
+    Table,
+    create_engine,
+    func,
+    insert,
+    literal,
+    select,
+    true,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql import Subquery, visitors
+from sqlalchemy.sql.util import ClauseAdapter
+
+from app.api.v1.personas.get_timeline import (
+    TipoItemTimeline,
+    _item,
+    _query_timeline,
+    get_persona_timeline,
+)
+from app.core.database import get_async_session
+from app.core.pagination import decode_cursor, encode_cursor
+
+metadata = MetaData()
+timeline = Table(
+    "items_timeline",
+    metadata,
+    Column("tipo", String),
+    Column("fecha", Date),
+    Column("item_id", Integer),
+    Column("evento_id", Integer),
+    Column("nombre", String),
+    Column("valor", String),
+    Column("marca_1", Boolean),
+    Column("marca_2", Boolean),
+)
+casos = Table(
+    "casos_persona",
+    metadata,
+    Column("id", Integer),
+    Column("id_snvs", Integer),
+    Column("clasificacion", String),
+    Column("confidence_score", Float),
+    Column("evento_tipo", String),
+)
+
+CASOS = [
+    {"id": 1, "id_snvs": 1001, "clasificacion": "CONFIRMADOS", "evento_tipo": "Dengue"},
+    {"id": 2, "id_snvs": 1002, "clasificacion": None, "evento_tipo": "Dengue"},
+    {"id": 3, "id_snvs": 1003, "clasificacion": "DESCARTADOS", "evento_tipo": "Rabia"},
+]
+MARZO, FEBRERO = date(2025, 3, 10), date(2025, 2, 1)
+
+
+def _items() -> list[dict[str, Any]]:
+    """Items con empates de fecha, de tipo y de id entre tablas distintas."""
+    items: list[dict[str, Any]] = [
+        {"tipo": "evento", "fecha": MARZO, "item_id": 1, "evento_id": 1},
+        {"tipo": "evento", "fecha": MARZO, "item_id": 2, "evento_id": 2},
+        {"tipo": "evento", "fecha": date(2024, 11, 2), "item_id": 3, "evento_id": 3},
+    ]
+    cantidades = {
+        "sintoma": 8,
+        "muestra": 6,
+        "diagnostico": 4,
+        "vacuna": 3,
+        "tratamiento": 2,
+        "internacion": 2,
+        "investigacion": 2,
+    }
+    for tipo, cantidad in cantidades.items():
+        # Los ids se repiten entre tipos y la mitad cae en la misma fecha
+        items.extend(
+            {
+                "tipo": tipo,
+                "fecha": MARZO if item_id % 2 else FEBRERO,
+                "item_id": item_id,
+                "evento_id": 1 + item_id % 2,
+            }
+            for item_id in range(1, cantidad + 1)
+        )
+    return items
+
+
+ITEMS = _items()
+
+
+def _esperado(tipos: set[str] | None = None) -> list[tuple[date, str, int]]:
+    """Orden completo del timeline: fecha, tipo e id descendentes."""
+    return sorted(
+        (
+            (i["fecha"], i["tipo"], i["item_id"])
+            for i in ITEMS
+            if tipos is None or i["tipo"] in tipos
+        ),
+        reverse=True,
+    )
+
+
+@pytest.fixture
+def conexion() -> Iterator[Connection]:
+    # StaticPool: el TestClient ejecuta el endpoint en otro hilo
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    metadata.create_all(engine)
+    with engine.connect() as conn:
+        conn.execute(insert(casos), [{"confidence_score": None} | c for c in CASOS])
+        conn.execute(
+            insert(timeline),
+            [
+                {"nombre": None, "valor": None, "marca_1": None, "marca_2": None} | i
+                for i in ITEMS
+            ],
+        )
+        yield conn
+
+
+def _subquery(query: Select[Any], nombre: str) -> Subquery:
+    return next(
+        s
+        for s in visitors.iterate(query)
+        if isinstance(s, Subquery) and s.name == nombre
+    )
+
+
+class _Sesion:
+    """Ejecuta en SQLite la página de ``_query_timeline``."""
+
+    def __init__(self, conexion: Connection, existe: bool = True) -> None:
+        self.conexion = conexion
+        self.existe = existe
+        self.consultas: list[Select[Any]] = []
+
+    async def execute(self, query: Select[Any]) -> Any:
+        self.consultas.append(query)
+        if not self.existe:
+            return self.conexion.execute(select(literal(1)).where(literal(False)))
+
+        # Los tipos que no se piden no tienen rama en el UNION ALL
+        ramas = _subquery(query, "items").element.selects
+        tipos = [rama.selected_columns.tipo.element.value for rama in ramas]
+        filtrado = select(timeline).where(timeline.c.tipo.in_(tipos)).subquery()
+
+        # Misma condición, orden y límite que la página, sobre la tabla
+        original = _subquery(query, "pagina").element
+        adaptar = ClauseAdapter(filtrado, adapt_on_names=True).traverse
+        pagina_query = (
+            select(filtrado)
+            .order_by(*(adaptar(c) for c in original._order_by_clauses))
+            .limit(original._limit)
+        )
+        if original.whereclause is not None:
+            pagina_query = pagina_query.where(adaptar(original.whereclause))
+        pagina = pagina_query.subquery()
+        totales = select(
+            func.count().label("total_items"),
+            func.min(filtrado.c.fecha).label("fecha_inicio"),
+            func.max(filtrado.c.fecha).label("fecha_fin"),
+        ).subquery()
+        persona = select(literal("Ana Pérez").label("nombre_completo")).subquery()
+        return self.conexion.execute(
+            select(
+                persona,
+                totales,
+                literal(len(CASOS)).label("total_eventos"),
+                pagina,
+                casos.c.id_snvs,
+                casos.c.clasificacion,
+                casos.c.confidence_score,
+                casos.c.evento_tipo,
+            )
+            .select_from(
+                persona.join(totales, true())
+                .outerjoin(pagina, true())
+                .outerjoin(casos, casos.c.id == pagina.c.evento_id)
+            )
+            .order_by(
+                pagina.c.fecha.desc(), pagina.c.tipo.desc(), pagina.c.item_id.desc()
+            )
+        )
+
+
+def _cliente(sesion: _Sesion) -> TestClient:
+    app = FastAPI()
+    app.add_api_route(
+        "/personas/{tipo_sujeto}/{persona_id}/timeline",
+        get_persona_timeline,
+        methods=["GET"],
+    )
+    app.dependency_overrides[get_async_session] = lambda: sesion
+    usuario = inspect.signature(get_persona_timeline).parameters["current_user"]
+    app.dependency_overrides[usuario.default.dependency] = lambda: MagicMock()
+    return TestClient(app)
+
+
+def _recorrer(
+    cliente: TestClient, page_size: int, **params: Any
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Pide páginas siguiendo ``next_cursor``; devuelve items y respuestas."""
+    items: list[dict[str, Any]] = []
+    paginas: list[dict[str, Any]] = []
+    cursor = None
+    while True:
+        respuesta = cliente.get(
+            "/personas/humano/7/timeline",
+            params={"page_size": page_size, **params}
+            | ({"cursor": cursor} if cursor else {}),
+        )
+        assert respuesta.status_code == 200
+        data = respuesta.json()["data"]
+        paginas.append(data)
+        items.extend(data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return items, paginas
+
+
+class TestPaginacion:
+    """Tests del recorrido por cursor."""
+
+    @pytest.mark.parametrize("page_size", [10, 11, 16, 29, 100])
+    def test_sin_repetidos_ni_faltantes(
+        self, conexion: Connection, page_size: int
+    ) -> None:
+        sesion = _Sesion(conexion)
+
+        items, paginas = _recorrer(_cliente(sesion), page_size)
+
+        # El item no expone su id: el orden (fecha, tipo) se compara completo
+        # y el id de cada corte, con el cursor de la página
+        esperado = _esperado()
+        assert [(date.fromisoformat(i["fecha"]), i["tipo"]) for i in items] == [
+            (fecha, tipo) for fecha, tipo, _ in esperado
+        ]
+        assert len(paginas) == -(-len(ITEMS) // page_size)
+        for numero, pagina in enumerate(paginas[:-1]):
+            assert pagina["has_next"]
+            ultimo = esperado[(numero + 1) * page_size - 1]
+            assert decode_cursor(pagina["next_cursor"], 3) == list(ultimo)
+        assert not paginas[-1]["has_next"]
+        assert all(p["total_items"] == len(ITEMS) for p in paginas)
+        assert paginas[0]["fecha_inicio"] == "2024-11-02"
+        assert paginas[0]["fecha_fin"] == MARZO.isoformat()
+
+    def test_corte_en_empate(self, conexion: Connection) -> None:
+        # Cursor en medio de los síntomas de marzo: sigue por el id siguiente
+        # del mismo tipo y fecha, y después por el tipo anterior
+        cursor = encode_cursor([MARZO, "sintoma", 5])
+        respuesta = _cliente(_Sesion(conexion)).get(
+            "/personas/humano/7/timeline",
+            params={"page_size": 10, "cursor": cursor},
+        )
+
+        assert respuesta.status_code == 200
+        items = respuesta.json()["data"]["items"]
+        posicion = _esperado().index((MARZO, "sintoma", 5))
+        siguientes = _esperado()[posicion + 1 : posicion + 11]
+        assert [(i["tipo"], i["fecha"]) for i in items] == [
+            (tipo, fecha.isoformat()) for fecha, tipo, _ in siguientes
+        ]
+        assert siguientes[:2] == [(MARZO, "sintoma", 3), (MARZO, "sintoma", 1)]
+
+    def test_filtro_por_tipos(self, conexion: Connection) -> None:
+        pedidos = {"sintoma", "vacuna"}
+
+        items, paginas = _recorrer(
+            _cliente(_Sesion(conexion)), 10, tipos=sorted(pedidos)
+        )
+
+        assert {i["tipo"] for i in items} == pedidos
+        assert len(items) == len(_esperado(pedidos))
+        assert paginas[0]["total_items"] == len(_esperado(pedidos))
+
+    def test_persona_sin_items(self, conexion: Connection) -> None:
+        conexion.execute(timeline.delete())
+
+        respuesta = _cliente(_Sesion(conexion)).get("/personas/humano/7/timeline")
+
+        assert respuesta.status_code == 200
+        data = respuesta.json()["data"]
+        assert data["items"] == []
+        assert data["total_items"] == 0
+        assert data["next_cursor"] is None
+
+    def test_persona_inexistente(self, conexion: Connection) -> None:
+        respuesta = _cliente(_Sesion(conexion, existe=False)).get(
+            "/personas/humano/7/timeline"
+        )
+
+        assert respuesta.status_code == 404
+
+    @pytest.mark.parametrize(
+        "cursor",
+        ["no es base64!", encode_cursor([MARZO.isoformat(), "evento"])],
+    )
+    def test_cursor_invalido(self, conexion: Connection, cursor: str) -> None:
+        respuesta = _cliente(_Sesion(conexion)).get(
+            "/personas/humano/7/timeline", params={"cursor": cursor}
+        )
+
+        assert respuesta.status_code == 400
+
+
+class TestQueryTimeline:
+    """Tests de la query compilada."""
+
+    @staticmethod
+    def _sql(tipos: set[TipoItemTimeline], cursor: list[Any] | None = None) -> str:
+        query, _ = _query_timeline("humano", 7, tipos, cursor, 10)
+        return str(query.compile(dialect=postgresql.dialect()))
+
+    def test_solo_ramas_pedidas(self) -> None:
+        sql = self._sql({TipoItemTimeline.SINTOMA, TipoItemTimeline.VACUNA})
+
+        assert sql.count("UNION ALL") == 1
+        assert "detalle_caso_sintomas" in sql
+        assert "vacunas_ciudadano" in sql
+        for tabla in (
+            "muestra_caso_epidemiologico",
+            "diagnostico_caso_epidemiologico",
+            "tratamiento_caso_epidemiologico",
+            "internacion_caso_epidemiologico",
+            "investigacion_caso_epidemiologico",
+        ):
+            assert tabla not in sql
+
+    def test_todas_las_ramas(self) -> None:
+        assert self._sql(set(TipoItemTimeline)).count("UNION ALL") == (
+            len(TipoItemTimeline) - 1
+        )
+
+    def test_orden_del_cursor(self) -> None:
+        _, orden = _query_timeline("humano", 7, set(TipoItemTimeline), None, 10)
+
+        # El cursor lleva (fecha, tipo, item_id), todos descendentes
+        assert [(c.name, desc) for c, desc in orden] == [
+            ("fecha", True),
+            ("tipo", True),
+            ("item_id", True),
+        ]
+        assert "timeline.fecha < " not in self._sql(set(TipoItemTimeline))
+        assert "timeline.fecha < " in self._sql(
+            set(TipoItemTimeline), [MARZO, "evento", 1]
+        )
+
+
+def _fila(tipo: TipoItemTimeline, **valores: Any) -> Any:
+    campos = {
+        "tipo": tipo.value,
+        "fecha": MARZO,
+        "evento_id": 1,
+        "evento_tipo": "Dengue",
+        "nombre": None,
+        "valor": None,
+        "marca_1": None,
+        "marca_2": None,
+        "id_snvs": 1001,
+        "clasificacion": None,
+        "confidence_score": None,
+    }
+    return SimpleNamespace(**(campos | valores))
+
+
+# (fila, titulo, icono, color, es_critico) por tipo
+CASOS_ITEM: dict[TipoItemTimeline, list[tuple[dict[str, Any], str, str, str, bool]]] = {
+    TipoItemTimeline.EVENTO: [
+        (
+            {"clasificacion": "CONFIRMADOS"},
+            "CasoEpidemiologico Dengue",
+            "alert-circle",
+            "red",
+            True,
+        ),
+        ({}, "CasoEpidemiologico Dengue", "activity", "blue", False),
+    ],
+    TipoItemTimeline.SINTOMA: [
+        ({"nombre": "Fiebre"}, "Síntoma: Fiebre", "heart", "red", False),
+        ({}, "Síntoma: Síntoma no especificado", "heart", "red", False),
+    ],
+    TipoItemTimeline.MUESTRA: [
+        (
+            {"nombre": "Suero", "valor": "Positivo"},
+            "Muestra: Suero",
+            "test-tube",
+            "purple",
+            True,
+        ),
+        ({}, "Muestra: Muestra", "test-tube", "purple", False),
+    ],
+    TipoItemTimeline.DIAGNOSTICO: [
+        ({"nombre": "Dengue"}, "Diagnóstico: Dengue", "stethoscope", "green", False),
+    ],
+    TipoItemTimeline.VACUNA: [
+        (
+            {"nombre": "Fiebre amarilla"},
+            "Vacuna: Fiebre amarilla",
+            "syringe",
+            "indigo",
+            False,
+        ),
+        ({}, "Vacuna: Vacuna", "syringe", "indigo", False),
+    ],
+    TipoItemTimeline.TRATAMIENTO: [
+        ({"valor": "Paracetamol"}, "Tratamiento", "pill", "orange", False),
+    ],
+    TipoItemTimeline.INTERNACION: [
+        ({"marca_1": True}, "Internación (UCI)", "building", "red", True),
+        ({"marca_2": True}, "Internación", "building", "red", True),
+        ({}, "Internación", "building", "yellow", False),
+    ],
+    TipoItemTimeline.INVESTIGACION: [
+        ({"marca_1": True}, "Investigación de terreno", "search", "teal", False),
+        ({}, "Investigación", "search", "teal", False),
+    ],
+}
+
+
+class TestItem:
+    """Tests del armado de cada tipo de item."""
+
+    def test_cubre_todos_los_tipos(self) -> None:
+        assert set(CASOS_ITEM) == set(TipoItemTimeline)
+
+    @pytest.mark.parametrize(
+        ("tipo", "valores", "titulo", "icono", "color", "es_critico"),
+        [
+            (tipo, *caso)
+            for tipo, casos_tipo in CASOS_ITEM.items()
+            for caso in casos_tipo
+        ],
+    )
+    def test_item(
+        self,
+        tipo: TipoItemTimeline,
+        valores: dict[str, Any],
+        titulo: str,
+        icono: str,
+        color: str,
+        es_critico: bool,
+    ) -> None:
+        item = _item(_fila(tipo, **valores))
+
+        assert item.tipo == tipo.value
+        assert item.fecha == MARZO
+        assert item.evento_id == 1
+        assert item.evento_tipo == "Dengue"
+        assert (item.titulo, item.icono, item.color, item.es_critico) == (
+            titulo,
+            icono,
+            color,
+            es_critico,
+        )
+
+    def test_detalles(self) -> None:
+        evento = _item(
+            _fila(
+                TipoItemTimeline.EVENTO,
+                clasificacion="CONFIRMADOS",
+                confidence_score=0.8,
+            )
+        )
+        muestra = _item(_fila(TipoItemTimeline.MUESTRA, nombre="Suero"))
+        vacuna = _item(_fila(TipoItemTimeline.VACUNA, valor="2"))
+        internacion = _item(_fila(TipoItemTimeline.INTERNACION, marca_2=True))
+        tratamiento = _item(_fila(TipoItemTimeline.TRATAMIENTO))
+
+        assert evento.descripcion == "Caso #1001 - CONFIRMADOS"
+        assert evento.clasificacion == "CONFIRMADOS"
+        assert evento.detalles == {
+            "id_evento_caso": 1001,
+            "clasificacion": "CONFIRMADOS",
+            "confidence_score": 0.8,
+        }
+        assert muestra.descripcion == "Pendiente"
+        assert muestra.detalles == {"tipo": "Suero", "resultado": None}
+        assert vacuna.detalles == {"nombre": "Vacuna", "dosis": "2"}
+        assert internacion.descripcion == "Resultado mortal"
+        assert internacion.detalles == {"requirio_uci": False, "es_fallecido": True}
+        assert tratamiento.descripcion == "Tratamiento"
@@ -0,0 +1 @@
+"""Tests de los comandos de mantenimiento."""
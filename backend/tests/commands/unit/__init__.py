@@ -0,0 +1 @@
+"""Tests unitarios de los comandos de mantenimiento."""
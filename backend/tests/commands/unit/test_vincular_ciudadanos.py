@@ -0,0 +1,94 @@
+"""
+Tests unitarios para el backfill de la vinculación de ciudadanos.
+
+Una sesión falsa devuelve el padrón por keyset (``codigo > último``, ``LIMIT``)
+y ``vincular_ciudadanos`` se reemplaza por un espía que registra los lotes.
+"""
+
+from typing import Any
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.commands import vincular_ciudadanos as comando
+from app.domains.vigilancia_nominal.procesamiento.vinculacion import (
+    ResultadoVinculacion,
+)
+
+PADRON = [3, 8, 15, 16, 42]
+
+
+class _Resultado:
+    def __init__(self, valores: list[int]) -> None:
+        self.valores = valores
+
+    def scalars(self) -> list[int]:
+        return self.valores
+
+
+class _Padron:
+    """Sesión falsa con los ``codigo_ciudadano`` del padrón."""
+
+    def __init__(self) -> None:
+        self.commits = 0
+
+    def execute(self, query: Any) -> _Resultado:
+        params = query.compile(dialect=postgresql.dialect()).params
+        ultimo = params.get("codigo_ciudadano_1")
+        codigos = [c for c in PADRON if ultimo is None or c > ultimo]
+        return _Resultado(codigos[: params["param_1"]])
+
+    def commit(self) -> None:
+        self.commits += 1
+
+
+@pytest.fixture
+def lotes(monkeypatch: pytest.MonkeyPatch) -> list[list[int]]:
+    recibidos: list[list[int]] = []
+
+    def espia(session: Any, codigos: list[int]) -> ResultadoVinculacion:
+        recibidos.append(list(codigos))
+        return ResultadoVinculacion(
+            personas=len(codigos),
+            personas_procesadas=len(codigos) - 1,
+            pares_comparados=2,
+            candidatos=1,
+            duracion_segundos=0.5,
+        )
+
+    monkeypatch.setattr(comando, "vincular_ciudadanos", espia)
+    return recibidos
+
+
+class TestBackfill:
+    """Tests del recorrido del padrón en lotes."""
+
+    def test_recorre_todo_el_padron(self, lotes: list[list[int]]) -> None:
+        sesion = _Padron()
+
+        total = comando.backfill(sesion, lote=2)  # type: ignore[arg-type]
+
+        assert lotes == [[3, 8], [15, 16], [42]]
+        # Un commit por lote: lo ya vinculado sobrevive a un corte
+        assert sesion.commits == 3
+        assert total == ResultadoVinculacion(
+            personas=5,
+            personas_procesadas=2,
+            pares_comparados=6,
+            candidatos=3,
+            duracion_segundos=1.5,
+        )
+
+    def test_retoma_desde(self, lotes: list[list[int]]) -> None:
+        comando.backfill(_Padron(), lote=10, desde=15)  # type: ignore[arg-type]
+
+        assert lotes == [[16, 42]]
+
+    def test_padron_vacio(self, lotes: list[list[int]]) -> None:
+        sesion = _Padron()
+
+        total = comando.backfill(sesion, lote=5, desde=42)  # type: ignore[arg-type]
+
+        assert lotes == []
+        assert sesion.commits == 0
+        assert total == ResultadoVinculacion()
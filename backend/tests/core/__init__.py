@@ -0,0 +1 @@
+"""Tests del núcleo de la aplicación."""
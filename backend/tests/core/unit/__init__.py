@@ -0,0 +1 @@
+"""Tests unitarios del núcleo de la aplicación."""
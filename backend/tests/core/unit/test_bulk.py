@@ -0,0 +1,93 @@
+"""
+Tests unitarios para ``CatalogResolver``.
+
+El join contra el catálogo tiene que devolver el ID de cada valor, null para
+los que no están y mantener el orden de las filas del frame original (la
+ingesta alinea después las columnas resueltas por posición).
+"""
+
+import random
+
+import polars as pl
+import pytest
+
+from app.core.bulk import CatalogResolver
+
+ESTABLECIMIENTOS = {
+    "HOSPITAL ZONAL TRELEW": 10,
+    "HOSPITAL REGIONAL COMODORO": 20,
+    "CENTRO DE SALUD RAWSON": 30,
+}
+
+
+class TestCatalogResolver:
+    """Tests del mapeo de nombres a IDs."""
+
+    def test_mapea_ids_y_claves_desconocidas(self) -> None:
+        df = pl.DataFrame(
+            {
+                "estab": [
+                    "CENTRO DE SALUD RAWSON",
+                    "NO EXISTE",
+                    None,
+                    "HOSPITAL ZONAL TRELEW",
+                    "CENTRO DE SALUD RAWSON",
+                ]
+            }
+        )
+
+        resuelto = CatalogResolver(ESTABLECIMIENTOS).resolve(df, "estab", "id_estab")
+
+        assert isinstance(resuelto, pl.DataFrame)
+        assert resuelto.columns == ["estab", "id_estab"]
+        assert resuelto["id_estab"].dtype == pl.Int64
+        assert resuelto["id_estab"].to_list() == [30, None, None, 10, 30]
+        # La columna original queda intacta (sin el Categorical auxiliar)
+        assert resuelto["estab"].dtype == pl.String
+
+    def test_mantiene_el_orden(self) -> None:
+        generador = random.Random(7)
+        claves = [*ESTABLECIMIENTOS, "OTRO", None]
+        valores = [generador.choice(claves) for _ in range(50_000)]
+        df = pl.DataFrame({"fila": range(len(valores)), "estab": valores})
+
+        resuelto = CatalogResolver(ESTABLECIMIENTOS).resolve(df, "estab", "id")
+
+        assert resuelto["fila"].to_list() == list(range(len(valores)))
+        assert resuelto["id"].to_list() == [
+            ESTABLECIMIENTOS.get(v) if v is not None else None for v in valores
+        ]
+
+    def test_lazy_frame(self) -> None:
+        lf = pl.LazyFrame({"estab": ["HOSPITAL REGIONAL COMODORO", "X"]})
+
+        resuelto = CatalogResolver(ESTABLECIMIENTOS).resolve(lf, "estab", "id")
+
+        assert isinstance(resuelto, pl.LazyFrame)
+        assert resuelto.collect()["id"].to_list() == [20, None]
+
+    def test_varias_columnas_con_el_mismo_catalogo(self) -> None:
+        resolver = CatalogResolver(ESTABLECIMIENTOS)
+        df = pl.DataFrame(
+            {
+                "notif": ["HOSPITAL ZONAL TRELEW", "CENTRO DE SALUD RAWSON"],
+                "carga": ["CENTRO DE SALUD RAWSON", None],
+            }
+        )
+
+        resuelto = resolver.resolve(
+            resolver.resolve(df, "notif", "id_notif"), "carga", "id_carga"
+        )
+
+        assert resuelto.select("id_notif", "id_carga").rows() == [(10, 30), (30, None)]
+
+    @pytest.mark.parametrize("mapping", [{}, {"A": "x"}])
+    def test_catalogo_vacio_o_tipo_propio(self, mapping: dict[str, str]) -> None:
+        resolver = CatalogResolver(mapping, value_dtype=pl.String)
+        df = pl.DataFrame({"clave": ["A", "B"]})
+
+        resuelto = resolver.resolve(df, "clave", "valor")
+
+        assert len(resolver) == len(mapping)
+        assert resuelto["valor"].dtype == pl.String
+        assert resuelto["valor"].to_list() == [mapping.get("A"), None]
@@ -0,0 +1,220 @@
+"""
+Tests unitarios para los snapshots de catálogos de los procesadores bulk.
+
+Usan un catálogo propio en SQLite (archivo temporal), sin PostgreSQL.
+"""
+
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine, create_engine, event, insert
+from sqlmodel import Field, Session, SQLModel, delete
+
+from app.core.catalog_snapshots import CatalogSnapshotStore, _armar_frame
+
+
+class CatalogoPrueba(SQLModel, table=True):
+    __tablename__ = "catalogo_prueba_snapshots"
+
+    id: int | None = Field(default=None, primary_key=True)
+    codigo: str | None = None
+    updated_at: datetime | None = None
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Iterator[Engine]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'catalogo.db'}")
+    CatalogoPrueba.__table__.create(engine)
+    with Session(engine) as session:
+        session.execute(
+            insert(CatalogoPrueba),
+            [{"id": i, "codigo": c} for i, c in enumerate(["a", "b", "c"], start=1)],
+        )
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def store() -> CatalogSnapshotStore:
+    return CatalogSnapshotStore()
+
+
+def _insertar(engine: Engine, **fila: object) -> None:
+    """Inserta desde otra sesión, como lo haría otro job."""
+    with Session(engine) as otra:
+        otra.execute(insert(CatalogoPrueba), [fila])
+        otra.commit()
+
+
+def _contar_consultas(engine: Engine) -> list[str]:
+    consultas: list[str] = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda _c, _cur, sql, *_args: consultas.append(sql),
+    )
+    return consultas
+
+
+class TestArmarFrame:
+    """Tests para el frame (clave, id) del snapshot."""
+
+    def test_descarta_nulos_y_conserva_el_mayor_id(self) -> None:
+        """Una clave repetida se queda con el id más alto."""
+        frame = _armar_frame([("a", 1), (None, 2), ("b", 3), ("a", 4)])
+
+        assert dict(frame.iter_rows()) == {"a": 4, "b": 3}
+
+
+class TestLookup:
+    """Tests para la resolución de claves."""
+
+    def test_resuelve_claves_existentes(
+        self, engine: Engine, store: CatalogSnapshotStore
+    ) -> None:
+        """Devuelve solo las claves que existen en el catálogo."""
+        with Session(engine) as session:
+            resultado = store.lookup(session, CatalogoPrueba, "codigo", ["a", "c", "z"])
+
+        assert resultado == {"a": 1, "c": 3}
+
+    def test_segunda_busqueda_usa_el_snapshot(
+        self, engine: Engine, store: CatalogSnapshotStore
+    ) -> None:
+        """Las claves ya cacheadas no vuelven a consultar la BD."""
+        with Session(engine) as session:
+            store.lookup(session, CatalogoPrueba, "codigo", ["a"])
+            consultas = _contar_consultas(engine)
+            resultado = store.lookup(session, CatalogoPrueba, "codigo", ["a", "b"])
+
+        assert resultado == {"a": 1, "b": 2}
+        assert consultas == []
+
+    def test_clave_nueva_se_busca_en_la_bd(
+        self, engine: Engine, store: CatalogSnapshotStore
+    ) -> None:
+        """Un snapshot desactualizado no oculta filas creadas después."""
+        with Session(engine) as session:
+            store.lookup(session, CatalogoPrueba, "codigo", ["a"])
+        _insertar(engine, id=10, codigo="d")
+
+        with Session(engine) as session:
+            resultado = store.lookup(session, CatalogoPrueba, "codigo", ["a", "d"])
+
+        assert resultado == {"a": 1, "d": 10}
+
+    def test_comparacion_en_mayusculas(
+        self, engine: Engine, store: CatalogSnapshotStore
+    ) -> None:
+        """Con ``upper`` las claves se normalizan a mayúsculas."""
+        with Session(engine) as session:
+            resultado = store.lookup(
+                session, CatalogoPrueba, "codigo", ["a", "B"], upper=True
+            )
+
+        assert resultado == {"A": 1, "B": 2}
+
+    def test_sin_claves_no_consulta(
+        self, engine: Engine, store: CatalogSnapshotStore
+    ) -> None:
+        """Claves vacías o nulas no cargan el snapshot."""
+        consultas = _contar_consultas(engine)
+        with Session(engine) as session:
+            assert store.lookup(session, CatalogoPrueba, "codigo", [None]) == {}
+
+        assert consultas == []
+
+
+class TestRegistrar:
+    """Tests para las filas registradas por una sesión."""
+
+    def test_visible_en_la_sesion_y_publicado_en_commit(
+        self, engine: Engine, store: CatalogSnapshotStore
+    ) -> None:
+        """Lo registrado se ve en la sesión y pasa al snapshot con el commit."""
+        with Session(engine) as session:
+            store.lookup(session, CatalogoPrueba, "codigo", ["a"])
+            session.execute(insert(CatalogoPrueba), [{"id": 20, "codigo": "e"}])
+            store.registrar(session, CatalogoPrueba, "codigo", {"e": 20})
+
+            assert store.lookup(session, CatalogoPrueba, "codigo", ["e"]) == {"e": 20}
+            session.commit()
+
+        snapshot = store._snapshots[(CatalogoPrueba.__tablename__, "codigo", False)]
+        assert snapshot.buscar({"e"}) == {"e": 20}
+
+    def test_rollback_descarta_lo_registrado(
+        self, engine: Engine, store: CatalogSnapshotStore
+    ) -> None:
+        """Un rollback no deja en el snapshot ids que no existen."""
+        with Session(engine) as session:
+            store.lookup(session, CatalogoPrueba, "codigo", ["a"])
+            session.execute(insert(CatalogoPrueba), [{"id": 30, "codigo": "f"}])
+            store.registrar(session, CatalogoPrueba, "codigo", {"f": 30})
+            session.rollback()
+
+            assert store.lookup(session, CatalogoPrueba, "codigo", ["f"]) == {}
+
+        snapshot = store._snapshots[(CatalogoPrueba.__tablename__, "codigo", False)]
+        assert snapshot.buscar({"f"}) == {}
+
+
+class TestValidar:
+    """Tests para la validación de versiones entre jobs."""
+
+    def test_altas_se_incorporan_sin_recargar(
+        self, engine: Engine, store: CatalogSnapshotStore
+    ) -> None:
+        """Las filas nuevas se traen como delta y la versión se actualiza."""
+        with Session(engine) as session:
+            store.lookup(session, CatalogoPrueba, "codigo", ["a"])
+        _insertar(engine, id=40, codigo="g")
+
+        with Session(engine) as session:
+            store.validar(session)
+            snapshot = store._snapshots[(CatalogoPrueba.__tablename__, "codigo", False)]
+            consultas = _contar_consultas(engine)
+            resultado = store.lookup(session, CatalogoPrueba, "codigo", ["g"])
+
+        assert snapshot.version[:2] == (4, 40)
+        assert resultado == {"g": 40}
+        assert consultas == []
+
+    def test_borrados_recargan_el_snapshot(
+        self, engine: Engine, store: CatalogSnapshotStore
+    ) -> None:
+        """Si el total no cierra con las altas, se recarga completo."""
+        with Session(engine) as session:
+            store.lookup(session, CatalogoPrueba, "codigo", ["a"])
+            session.execute(delete(CatalogoPrueba).where(CatalogoPrueba.id == 2))
+            session.commit()
+        _insertar(engine, id=50, codigo="h")
+
+        with Session(engine) as session:
+            store.validar(session)
+
+        snapshot = store._snapshots[(CatalogoPrueba.__tablename__, "codigo", False)]
+        assert dict(snapshot.frame.iter_rows()) == {"a": 1, "c": 3, "h": 50}
+
+    def test_sin_cambios_no_modifica(
+        self, engine: Engine, store: CatalogSnapshotStore
+    ) -> None:
+        """Con la misma versión el snapshot queda igual."""
+        with Session(engine) as session:
+            store.lookup(session, CatalogoPrueba, "codigo", ["a"])
+            clave = (CatalogoPrueba.__tablename__, "codigo", False)
+            antes = store._snapshots[clave]
+            store.validar(session)
+
+        assert store._snapshots[clave] is antes
+
+    def test_invalidar(self, engine: Engine, store: CatalogSnapshotStore) -> None:
+        """Invalidar un modelo descarta sus snapshots."""
+        with Session(engine) as session:
+            store.lookup(session, CatalogoPrueba, "codigo", ["a"])
+        store.invalidar(CatalogoPrueba)
+
+        assert store._snapshots == {}
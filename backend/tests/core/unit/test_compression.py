@@ -0,0 +1,203 @@
+"""
+Tests unitarios para la compresión de respuestas.
+
+La negociación se prueba con las tres codificaciones registradas; el
+middleware, sobre una app FastAPI mínima con ``TestClient``.
+"""
+
+import gzip
+import json
+from collections.abc import Iterator
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, elegir_codificacion
+
+DATOS = {"items": [{"id": i, "nombre": f"caso {i}"} for i in range(200)]}
+BODY = json.dumps(DATOS).encode()
+
+
+@pytest.fixture
+def todas_las_codificaciones(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        compression,
+        "_CODIFICACIONES",
+        {
+            "zstd": (compression._zstd, compression._CompresorZstd),
+            "br": (compression._brotli, compression._CompresorBrotli),
+            "gzip": (compression._gzip, compression._CompresorGzip),
+        },
+    )
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, min_bytes=500)
+
+    @app.get("/json")
+    def datos() -> Response:
+        return Response(BODY, media_type="application/json")
+
+    @app.get("/chico")
+    def chico() -> Response:
+        return Response(b'{"ok": true}', media_type="application/json")
+
+    @app.get("/etag")
+    def con_etag() -> Response:
+        return Response(BODY, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/png")
+    def png() -> Response:
+        return Response(b"\x89PNG" * 500, media_type="image/png")
+
+    @app.get("/precomprimido")
+    def precomprimido() -> Response:
+        return Response(
+            gzip.compress(BODY),
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    @app.get("/no-modificado")
+    def no_modificado() -> Response:
+        return Response(status_code=304, headers={"ETag": '"v1"'})
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        def chunks() -> Iterator[bytes]:
+            yield b"chunk,relleno\n"
+            for i in range(5):
+                yield f"{i},{'x' * 300}\n".encode()
+
+        return StreamingResponse(chunks(), media_type="text/csv")
+
+    return TestClient(app)
+
+
+class TestElegirCodificacion:
+    """Tests para la negociación con ``Accept-Encoding``."""
+
+    @pytest.mark.usefixtures("todas_las_codificaciones")
+    @pytest.mark.parametrize(
+        ("accept_encoding", "esperada"),
+        [
+            (None, None),
+            ("", None),
+            ("identity", None),
+            ("gzip", "gzip"),
+            ("gzip, deflate, br", "br"),
+            ("gzip, deflate, br, zstd", "zstd"),
+            ("zstd;q=0.5, br;q=0.8, gzip;q=0.1", "br"),
+            ("zstd;q=0, gzip", "gzip"),
+            ("*", "zstd"),
+            ("*;q=0.2, gzip;q=0.5", "gzip"),
+            ("GZIP", "gzip"),
+            ("br;q=alto, gzip", "gzip"),
+        ],
+    )
+    def test_negociacion(self, accept_encoding: str | None, esperada: str) -> None:
+        """Gana la de mayor q; a igual q, la preferida por el servidor."""
+        assert elegir_codificacion(accept_encoding) == esperada
+
+    def test_sin_extras_solo_gzip(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Sin zstandard ni brotli instalados solo se ofrece gzip."""
+        monkeypatch.setattr(
+            compression,
+            "_CODIFICACIONES",
+            {"gzip": (compression._gzip, compression._CompresorGzip)},
+        )
+
+        assert elegir_codificacion("zstd, br") is None
+        assert elegir_codificacion("zstd, br, gzip;q=0.1") == "gzip"
+
+
+class TestCompressionMiddleware:
+    """Tests para el middleware ASGI."""
+
+    def test_gzip_respuesta_completa(self, client: TestClient) -> None:
+        """Comprime y ajusta Content-Length, Content-Encoding y Vary."""
+        respuesta = client.get("/json", headers={"Accept-Encoding": "gzip"})
+
+        assert respuesta.headers["content-encoding"] == "gzip"
+        assert int(respuesta.headers["content-length"]) < len(BODY)
+        assert respuesta.headers["vary"] == "Accept-Encoding"
+        assert respuesta.json() == DATOS
+
+    @pytest.mark.parametrize(
+        ("codificacion", "modulo"), [("zstd", "zstandard"), ("br", "brotli")]
+    )
+    def test_codificaciones_opcionales(
+        self, client: TestClient, codificacion: str, modulo: str
+    ) -> None:
+        """Con el extra ``compression`` instalado se usan zstd y Brotli."""
+        pytest.importorskip(modulo)
+
+        respuesta = client.get(
+            "/json", headers={"Accept-Encoding": f"gzip;q=0.5, {codificacion}"}
+        )
+
+        assert respuesta.headers["content-encoding"] == codificacion
+        assert respuesta.json() == DATOS
+
+    def test_debilita_etag_fuerte(self, client: TestClient) -> None:
+        """Un ETag fuerte pasa a débil al cambiar los bytes."""
+        comprimida = client.get("/etag", headers={"Accept-Encoding": "gzip"})
+        plana = client.get("/etag", headers={"Accept-Encoding": "identity"})
+
+        assert comprimida.headers["etag"] == 'W/"v1"'
+        assert plana.headers["etag"] == '"v1"'
+
+    def test_body_chico_sin_comprimir(self, client: TestClient) -> None:
+        """Debajo del mínimo se manda tal cual, pero con Vary."""
+        respuesta = client.get("/chico", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in respuesta.headers
+        assert respuesta.headers["vary"] == "Accept-Encoding"
+
+    def test_tipo_no_comprimible(self, client: TestClient) -> None:
+        """Binarios (imágenes) no se comprimen ni llevan Vary."""
+        respuesta = client.get("/png", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in respuesta.headers
+        assert "vary" not in respuesta.headers
+
+    def test_respeta_content_encoding_existente(self, client: TestClient) -> None:
+        """Bodies ya comprimidos (cache de respuestas) no se recomprimen."""
+        respuesta = client.get("/precomprimido", headers={"Accept-Encoding": "gzip"})
+
+        assert respuesta.headers["content-encoding"] == "gzip"
+        assert respuesta.json() == DATOS
+
+    def test_304_sin_body(self, client: TestClient) -> None:
+        """Las respuestas sin body pasan sin tocar."""
+        respuesta = client.get("/no-modificado", headers={"Accept-Encoding": "gzip"})
+
+        assert respuesta.status_code == 304
+        assert "content-encoding" not in respuesta.headers
+
+    def test_streaming_comprime_por_chunk(self, client: TestClient) -> None:
+        """Un export CSV en streaming se comprime por chunk, sin Content-Length."""
+        respuesta = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        assert respuesta.headers["content-encoding"] == "gzip"
+        assert "content-length" not in respuesta.headers
+        lineas = respuesta.text.splitlines()
+        assert [linea.split(",")[0] for linea in lineas[1:]] == [
+            "0",
+            "1",
+            "2",
+            "3",
+            "4",
+        ]
+
+    def test_sin_accept_encoding(self, client: TestClient) -> None:
+        """Sin codificación aceptada la respuesta queda igual."""
+        respuesta = client.get("/json", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in respuesta.headers
+        assert respuesta.content == BODY
@@ -0,0 +1,255 @@
+"""
+Tests unitarios para el stack de middlewares ASGI.
+
+Se arma una app chica con ``setup_middleware`` (más el access log que agrega
+``app.main``) y se le pega con ``httpx.AsyncClient`` sobre ``ASGITransport``:
+los middlewares corren igual que bajo uvicorn, sin BD ni red.
+"""
+
+import logging
+import uuid
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from app.core.exceptions import (
+    AuthorizationException,
+    BusinessRuleException,
+    DuplicateException,
+    EpidemiologiaException,
+    ExternalServiceException,
+    NotFoundException,
+    ValidationException,
+)
+from app.core.middleware import (
+    AccessLogMiddleware,
+    setup_middleware,
+    validation_exception_handler,
+)
+
+EXCEPCIONES: dict[str, EpidemiologiaException] = {
+    "validacion": ValidationException("Edad inválida", field="edad", value=-1),
+    "regla": BusinessRuleException("Caso cerrado", rule="caso_cerrado"),
+    "no-encontrado": NotFoundException("Caso", "7"),
+    "duplicado": DuplicateException("Ciudadano", "documento", "30123456"),
+    "permisos": AuthorizationException(),
+    "externo": ExternalServiceException("SNVS", "SNVS no responde"),
+}
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    setup_middleware(app)
+    app.add_middleware(AccessLogMiddleware)
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+
+    @app.exception_handler(StarletteHTTPException)
+    async def http_exception_handler(
+        request: Request, exc: StarletteHTTPException
+    ) -> JSONResponse:
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={"error": True, "message": exc.detail},
+        )
+
+    @app.get("/ok")
+    async def ok() -> dict[str, bool]:
+        return {"ok": True}
+
+    @app.get("/dominio/{nombre}")
+    async def dominio(nombre: str) -> None:
+        raise EXCEPCIONES[nombre]
+
+    @app.get("/http")
+    async def http() -> None:
+        raise HTTPException(status_code=418, detail="Soy una tetera")
+
+    @app.get("/falla")
+    def falla() -> None:
+        raise RuntimeError("explotó")
+
+    @app.get("/validado")
+    async def validado(semana: int) -> dict[str, int]:
+        return {"semana": semana}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def partes() -> AsyncIterator[bytes]:
+            yield b"primera parte"
+            raise RuntimeError("se cortó el stream")
+
+        return StreamingResponse(partes())
+
+    return app
+
+
+@pytest_asyncio.fixture
+async def cliente() -> AsyncIterator[httpx.AsyncClient]:
+    transport = httpx.ASGITransport(app=_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+def _registro(caplog: pytest.LogCaptureFixture, inicio: str) -> Any:
+    return next(r for r in caplog.records if r.getMessage().startswith(inicio))
+
+
+class TestHeaders:
+    """Tests de los headers que agregan los middlewares."""
+
+    @pytest.mark.asyncio
+    async def test_request_id_y_tiempos(self, cliente: httpx.AsyncClient) -> None:
+        respuesta = await cliente.get("/ok")
+
+        assert respuesta.status_code == 200
+        assert respuesta.json() == {"ok": True}
+        uuid.UUID(respuesta.headers["X-Request-ID"])
+        assert float(respuesta.headers["X-Process-Time"]) >= 0
+        assert respuesta.headers["Server-Timing"].startswith("db;dur=")
+
+    @pytest.mark.asyncio
+    async def test_request_id_distinto_por_request(
+        self, cliente: httpx.AsyncClient
+    ) -> None:
+        ids = {(await cliente.get("/ok")).headers["X-Request-ID"] for _ in range(3)}
+
+        assert len(ids) == 3
+
+    @pytest.mark.asyncio
+    async def test_headers_de_seguridad(self, cliente: httpx.AsyncClient) -> None:
+        respuesta = await cliente.get("/ok")
+
+        assert respuesta.headers["X-Content-Type-Options"] == "nosniff"
+        assert respuesta.headers["X-Frame-Options"] == "DENY"
+        assert "Strict-Transport-Security" not in respuesta.headers
+
+    @pytest.mark.asyncio
+    async def test_hsts_solo_con_https(self) -> None:
+        transport = httpx.ASGITransport(app=_app())
+        async with httpx.AsyncClient(
+            transport=transport, base_url="https://test"
+        ) as cliente:
+            respuesta = await cliente.get("/ok")
+
+        assert respuesta.headers["Strict-Transport-Security"].startswith("max-age=")
+
+    @pytest.mark.asyncio
+    async def test_headers_tambien_en_errores(self, cliente: httpx.AsyncClient) -> None:
+        respuesta = await cliente.get("/falla")
+
+        assert respuesta.status_code == 500
+        assert respuesta.headers["X-Request-ID"] == respuesta.json()["request_id"]
+        assert "X-Process-Time" in respuesta.headers
+        assert respuesta.headers["X-Frame-Options"] == "DENY"
+
+
+class TestLogging:
+    """Tests del access log y del log estructurado de cada request."""
+
+    @pytest.mark.asyncio
+    async def test_access_log(
+        self, cliente: httpx.AsyncClient, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        with caplog.at_level(logging.INFO, logger="app.core.middleware"):
+            await cliente.get("/ok")
+
+        assert _registro(caplog, "🔍 GET /ok").getMessage() == (
+            "🔍 GET /ok - IP: 127.0.0.1"
+        )
+        assert (
+            _registro(caplog, "✅ GET /ok")
+            .getMessage()
+            .startswith("✅ GET /ok - Status: 200 - Time: ")
+        )
+
+    @pytest.mark.asyncio
+    async def test_log_estructurado(
+        self, cliente: httpx.AsyncClient, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        with caplog.at_level(logging.INFO, logger="app.core.middleware"):
+            respuesta = await cliente.get("/dominio/no-encontrado")
+
+        registro = _registro(caplog, "GET /dominio/no-encontrado - 404")
+        assert registro.request_id == respuesta.headers["X-Request-ID"]
+        assert registro.method == "GET"
+        assert registro.path == "/dominio/no-encontrado"
+        assert registro.status_code == 404
+        assert registro.duration_ms >= 0
+        # Sin BD: la contabilidad de SQL está activa pero en cero
+        assert registro.sql_statements == 0
+
+
+class TestExcepciones:
+    """Tests de cómo llegan las excepciones a los handlers."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("nombre", "status_code", "codigo"),
+        [
+            ("validacion", 422, "VALIDATION_ERROR"),
+            ("regla", 400, "BUSINESS_RULE_ERROR"),
+            ("no-encontrado", 404, "NOT_FOUND_ERROR"),
+            ("duplicado", 409, "DUPLICATE_ERROR"),
+            ("permisos", 403, "AUTHORIZATION_ERROR"),
+            ("externo", 502, "EXTERNAL_SERVICE_ERROR"),
+        ],
+    )
+    async def test_excepciones_de_dominio(
+        self, cliente: httpx.AsyncClient, nombre: str, status_code: int, codigo: str
+    ) -> None:
+        respuesta = await cliente.get(f"/dominio/{nombre}")
+
+        cuerpo = respuesta.json()
+        assert respuesta.status_code == status_code
+        assert cuerpo["error"]["code"] == codigo
+        assert cuerpo["error"]["message"] == EXCEPCIONES[nombre].message
+        assert cuerpo["request_id"] == respuesta.headers["X-Request-ID"]
+
+    @pytest.mark.asyncio
+    async def test_excepcion_inesperada(
+        self, cliente: httpx.AsyncClient, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        with caplog.at_level(logging.ERROR, logger="app.core.middleware"):
+            respuesta = await cliente.get("/falla")
+
+        request_id = respuesta.headers["X-Request-ID"]
+        assert respuesta.status_code == 500
+        assert respuesta.json()["error"]["code"] == "INTERNAL_SERVER_ERROR"
+        # El detalle queda en el log, no en la respuesta
+        assert "explotó" not in respuesta.text
+        error = _registro(caplog, f"Excepción no manejada [{request_id}]")
+        assert "RuntimeError: explotó" in error.getMessage()
+
+    @pytest.mark.asyncio
+    async def test_http_exception_usa_el_handler_de_la_app(
+        self, cliente: httpx.AsyncClient
+    ) -> None:
+        respuesta = await cliente.get("/http")
+
+        assert respuesta.status_code == 418
+        assert respuesta.json() == {"error": True, "message": "Soy una tetera"}
+        assert "X-Request-ID" in respuesta.headers
+
+    @pytest.mark.asyncio
+    async def test_validacion_de_parametros(self, cliente: httpx.AsyncClient) -> None:
+        respuesta = await cliente.get("/validado", params={"semana": "doce"})
+
+        cuerpo = respuesta.json()
+        assert respuesta.status_code == 422
+        assert cuerpo["request_id"] == respuesta.headers["X-Request-ID"]
+        assert cuerpo["errors"][0]["field"] == "query.semana"
+
+    @pytest.mark.asyncio
+    async def test_error_con_la_respuesta_iniciada_se_propaga(
+        self, cliente: httpx.AsyncClient
+    ) -> None:
+        # Ya se mandaron status y headers: no se puede responder un 500
+        with pytest.raises(RuntimeError, match="se cortó el stream"):
+            await cliente.get("/stream")
@@ -0,0 +1,177 @@
+"""
+Tests unitarios para la paginación por keyset.
+
+Recorren una tabla SQLite en memoria página por página y comparan contra el
+ordenamiento completo, sin necesidad de PostgreSQL.
+"""
+
+import base64
+from collections.abc import Iterator
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import (
+    Column,
+    Connection,
+    Date,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    insert,
+    select,
+)
+
+from app.core.pagination import (
+    InvalidCursorError,
+    KeysetColumn,
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    split_page,
+)
+
+metadata = MetaData()
+casos = Table(
+    "casos",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("fecha", Date, nullable=False),
+    Column("nombre", String, nullable=False),
+)
+
+
+@pytest.fixture
+def conexion() -> Iterator[Connection]:
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    filas = [
+        {
+            "id": i,
+            "fecha": date(2024, 1, 1 + i % 4),
+            "nombre": "abc"[i % 3],
+        }
+        for i in range(1, 24)
+    ]
+    with engine.connect() as conn:
+        conn.execute(insert(casos), filas)
+        yield conn
+
+
+def _recorrer(conn: Connection, orden: list[KeysetColumn], page_size: int) -> list[int]:
+    """Pide páginas siguiendo ``next_cursor`` hasta la última."""
+    ids: list[int] = []
+    cursor = None
+    while True:
+        query = (
+            select(casos.c.id, casos.c.fecha, casos.c.nombre)
+            .order_by(*(c.desc() if desc else c.asc() for c, desc in orden))
+            .limit(page_size + 1)
+        )
+        if cursor:
+            valores = decode_cursor(cursor, len(orden))
+            query = query.where(keyset_condition(orden, valores))
+        filas, cursor = split_page(conn.execute(query).all(), page_size, orden)
+        ids.extend(f.id for f in filas)
+        if cursor is None:
+            return ids
+
+
+class TestCursor:
+    """Tests para la codificación del cursor."""
+
+    def test_round_trip_tipos(self) -> None:
+        """Fechas, fechas con hora, números y textos sobreviven al cursor."""
+        valores = [date(2024, 3, 1), datetime(2024, 3, 1, 12, 30), 0.75, "pérez", 7]
+
+        assert decode_cursor(encode_cursor(valores), len(valores)) == valores
+
+    def test_cursor_es_url_safe(self) -> None:
+        """El cursor se puede pasar como query param sin escapar."""
+        cursor = encode_cursor(["?&/+" * 10])
+
+        assert "+" not in cursor and "/" not in cursor
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "no es base64!",
+            base64.urlsafe_b64encode(b"{no json").decode(),
+            base64.urlsafe_b64encode(b'{"a": 1}').decode(),
+        ],
+    )
+    def test_cursor_corrupto(self, cursor: str) -> None:
+        """Un cursor que no es una lista JSON en base64 es inválido."""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, 1)
+
+    def test_cursor_de_otro_ordenamiento(self) -> None:
+        """La cantidad de valores debe coincidir con las columnas de orden."""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(encode_cursor([1, 2]), 3)
+
+    def test_invalid_cursor_es_value_error(self) -> None:
+        """Los endpoints pueden tratarlo como cualquier ValueError."""
+        assert issubclass(InvalidCursorError, ValueError)
+
+
+class TestKeyset:
+    """Tests para la condición de keyset y el corte de páginas."""
+
+    @pytest.mark.parametrize("page_size", [1, 4, 7, 23, 50])
+    def test_orden_mixto_recorre_todas_las_filas(
+        self, conexion: Connection, page_size: int
+    ) -> None:
+        """Fecha DESC, nombre ASC, id DESC: sin repetidos ni faltantes."""
+        orden: list[KeysetColumn] = [
+            (casos.c.fecha, True),
+            (casos.c.nombre, False),
+            (casos.c.id, True),
+        ]
+        completo = [
+            f.id
+            for f in conexion.execute(
+                select(casos.c.id).order_by(
+                    casos.c.fecha.desc(), casos.c.nombre.asc(), casos.c.id.desc()
+                )
+            )
+        ]
+
+        assert _recorrer(conexion, orden, page_size) == completo
+
+    def test_orden_ascendente(self, conexion: Connection) -> None:
+        """Con una sola columna ascendente avanza por id."""
+        assert _recorrer(conexion, [(casos.c.id, False)], 5) == list(range(1, 24))
+
+    def test_ultima_pagina_sin_cursor(self, conexion: Connection) -> None:
+        """Si no sobra la fila extra, no hay página siguiente."""
+        orden: list[KeysetColumn] = [(casos.c.id, False)]
+        filas = conexion.execute(select(casos.c.id).order_by(casos.c.id)).all()
+
+        pagina, cursor = split_page(filas, len(filas), orden)
+
+        assert len(pagina) == len(filas)
+        assert cursor is None
+
+    def test_cursor_apunta_a_la_ultima_fila_de_la_pagina(
+        self, conexion: Connection
+    ) -> None:
+        """El cursor lleva los valores de orden de la última fila devuelta."""
+        orden: list[KeysetColumn] = [(casos.c.fecha, True), (casos.c.id, True)]
+        filas = conexion.execute(
+            select(casos.c.id, casos.c.fecha)
+            .order_by(casos.c.fecha.desc(), casos.c.id.desc())
+            .limit(4)
+        ).all()
+
+        pagina, cursor = split_page(filas, 3, orden)
+
+        assert cursor is not None
+        assert decode_cursor(cursor, 2) == [pagina[-1].fecha, pagina[-1].id]
+
+    def test_sin_columnas_no_devuelve_filas(self, conexion: Connection) -> None:
+        """Un ordenamiento vacío no avanza (condición siempre falsa)."""
+        query = select(casos.c.id).where(keyset_condition([], []))
+
+        assert conexion.execute(query).all() == []
@@ -0,0 +1,236 @@
+"""
+Tests unitarios para el profiler por request.
+
+pyinstrument es un extra opcional: se reemplaza por un módulo falso cuyo
+``Profiler`` registra start/stop y devuelve un HTML fijo. La app se arma con
+``setup_middleware`` y se le pega con ``httpx.AsyncClient``.
+"""
+
+import logging
+import sys
+import types
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+from typing import ClassVar
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+
+from app.core import profiling
+from app.core.config import settings
+from app.core.middleware import setup_middleware
+from app.core.profiling import ARTIFACT_HEADER
+from app.domains.autenticacion.security import TokenSecurity
+
+HTML_PERFIL = "<html>perfil</html>"
+
+
+class _Profiler:
+    """Profiler falso de pyinstrument."""
+
+    instancias: ClassVar[list["_Profiler"]] = []
+
+    def __init__(self, interval: float, async_mode: str) -> None:
+        self.interval = interval
+        self.async_mode = async_mode
+        self.eventos: list[str] = []
+        _Profiler.instancias.append(self)
+
+    def start(self) -> None:
+        self.eventos.append("start")
+
+    def stop(self) -> None:
+        self.eventos.append("stop")
+
+    def output_html(self) -> str:
+        return HTML_PERFIL
+
+
+def _token(rol: str) -> dict[str, str]:
+    token = TokenSecurity.crear_token_acceso({"sub": "1", "role": rol})
+    return {"Authorization": f"Bearer {token}"}
+
+
+ADMIN = _token("SUPERADMIN")
+
+
+@pytest.fixture(autouse=True)
+def pyinstrument(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Iterator[None]:
+    modulo = types.ModuleType("pyinstrument")
+    modulo.Profiler = _Profiler  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, "pyinstrument", modulo)
+    monkeypatch.setattr(profiling, "_pyinstrument_disponible", None)
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILING_HEADER_ENABLED", True)
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(settings, "PROFILING_SLOW_MS", 2000)
+    _Profiler.instancias = []
+    yield
+
+
+@pytest_asyncio.fixture
+async def cliente() -> AsyncIterator[httpx.AsyncClient]:
+    app = FastAPI()
+    setup_middleware(app)
+
+    @app.get("/casos/{id_caso}")
+    async def caso(id_caso: int) -> dict[str, int]:
+        return {"id": id_caso}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+def _artefactos(directorio: Path) -> list[Path]:
+    return sorted(directorio.glob("*.html"))
+
+
+class TestActivacionPorAdmin:
+    """Tests del perfilado pedido por header o query param."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("headers", "params"),
+        [({"X-Profile": "1"}, {}), ({}, {"profile": "1"})],
+        ids=["header", "query_param"],
+    )
+    async def test_perfila_y_guarda_el_artefacto(
+        self,
+        cliente: httpx.AsyncClient,
+        tmp_path: Path,
+        headers: dict[str, str],
+        params: dict[str, str],
+    ) -> None:
+        respuesta = await cliente.get(
+            "/casos/7", headers={**ADMIN, **headers}, params=params
+        )
+
+        assert respuesta.status_code == 200
+        assert respuesta.json() == {"id": 7}
+        (profiler,) = _Profiler.instancias
+        assert profiler.eventos == ["start", "stop"]
+        assert profiler.async_mode == "enabled"
+
+        nombre = respuesta.headers[ARTIFACT_HEADER]
+        assert nombre.endswith(
+            f"_GET_casos_7_{respuesta.headers['X-Request-ID'][:8]}.html"
+        )
+        assert _artefactos(tmp_path) == [tmp_path / nombre]
+        assert (tmp_path / nombre).read_text() == HTML_PERFIL
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("headers", "params"),
+        [
+            ({}, {}),
+            ({"X-Profile": "0"}, {}),
+            ({}, {"profile": "true"}),
+        ],
+        ids=["sin_pedido", "header_en_cero", "param_invalido"],
+    )
+    async def test_sin_pedido_no_perfila(
+        self,
+        cliente: httpx.AsyncClient,
+        tmp_path: Path,
+        headers: dict[str, str],
+        params: dict[str, str],
+    ) -> None:
+        respuesta = await cliente.get(
+            "/casos/7", headers={**ADMIN, **headers}, params=params
+        )
+
+        assert respuesta.status_code == 200
+        assert ARTIFACT_HEADER not in respuesta.headers
+        assert _Profiler.instancias == []
+        assert _artefactos(tmp_path) == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "auth",
+        [{}, _token("EPIDEMIOLOGO"), {"Authorization": "Bearer no-es-un-jwt"}],
+        ids=["sin_token", "no_admin", "token_invalido"],
+    )
+    async def test_solo_superadmin(
+        self, cliente: httpx.AsyncClient, auth: dict[str, str]
+    ) -> None:
+        respuesta = await cliente.get(
+            "/casos/7", headers={**auth, "X-Profile": "1"}, params={"profile": "1"}
+        )
+
+        assert respuesta.status_code == 200
+        assert ARTIFACT_HEADER not in respuesta.headers
+        assert _Profiler.instancias == []
+
+    @pytest.mark.asyncio
+    async def test_deshabilitado_por_config(
+        self, cliente: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "PROFILING_HEADER_ENABLED", False)
+
+        respuesta = await cliente.get("/casos/7", headers={**ADMIN, "X-Profile": "1"})
+
+        assert ARTIFACT_HEADER not in respuesta.headers
+        assert _Profiler.instancias == []
+
+    @pytest.mark.asyncio
+    async def test_sin_pyinstrument_no_hace_nada(
+        self,
+        cliente: httpx.AsyncClient,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        # Un None en sys.modules hace fallar el import
+        monkeypatch.setitem(sys.modules, "pyinstrument", None)
+
+        with caplog.at_level(logging.WARNING, logger="app.core.profiling"):
+            respuesta = await cliente.get(
+                "/casos/7", headers={**ADMIN, "X-Profile": "1"}
+            )
+
+        assert respuesta.status_code == 200
+        assert respuesta.json() == {"id": 7}
+        assert ARTIFACT_HEADER not in respuesta.headers
+        assert "pyinstrument no está instalado" in caplog.text
+
+
+class TestMuestreo:
+    """Tests del perfilado por muestreo (se guardan solo los lentos)."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(("lento_ms", "guardados"), [(0, 1), (60_000, 0)])
+    async def test_guarda_solo_los_lentos(
+        self,
+        cliente: httpx.AsyncClient,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        lento_ms: int,
+        guardados: int,
+    ) -> None:
+        monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 1.0)
+        monkeypatch.setattr(settings, "PROFILING_SLOW_MS", lento_ms)
+
+        respuesta = await cliente.get("/casos/7")
+
+        assert len(_Profiler.instancias) == 1
+        # El nombre del artefacto solo vuelve cuando lo pidió un admin
+        assert ARTIFACT_HEADER not in respuesta.headers
+        assert len(_artefactos(tmp_path)) == guardados
+
+    @pytest.mark.asyncio
+    async def test_error_al_guardar_no_rompe_el_request(
+        self,
+        cliente: httpx.AsyncClient,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+    ) -> None:
+        archivo = tmp_path / "no-es-un-directorio"
+        archivo.write_text("")
+        monkeypatch.setattr(settings, "PROFILING_DIR", str(archivo / "perfiles"))
+
+        respuesta = await cliente.get("/casos/7", headers={**ADMIN, "X-Profile": "1"})
+
+        assert respuesta.status_code == 200
+        assert respuesta.json() == {"id": 7}
@@ -0,0 +1,276 @@
+"""
+Tests unitarios para el ruteo de lecturas a réplicas.
+
+La elección de réplica se prueba con engines falsos que devuelven el lag.
+El paso al primario usa dos SQLite en memoria (réplica y primario) con una
+tabla que dice de cuál se leyó; la caída de la réplica se simula cerrando
+su conexión justo antes de ejecutar.
+"""
+
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import Engine, create_engine, event, text
+from sqlalchemy.exc import StatementError
+from sqlalchemy.pool import StaticPool
+
+from app.core import database, replicas
+from app.core.database import SesionLectura, get_read_session
+from app.core.replicas import Replica, ReplicaRouter, debe_leer_primario
+
+INTERVALO = 15.0
+MAX_LAG = 30.0
+
+
+def _engine_con_lag(lag: float | Exception) -> MagicMock:
+    """Engine falso cuyo chequeo de salud devuelve ``lag`` (o falla)."""
+    engine = MagicMock()
+    conn = engine.connect.return_value.__enter__.return_value
+    if isinstance(lag, Exception):
+        conn.execute.side_effect = lag
+    else:
+        conn.execute.return_value.scalar_one.return_value = lag
+    return engine
+
+
+def _router(*replicas_: Replica) -> ReplicaRouter:
+    router = ReplicaRouter([], intervalo_chequeo=INTERVALO, max_lag=MAX_LAG)
+    router.replicas = list(replicas_)
+    return router
+
+
+def _replica(nombre: str, engine: Any = None, **estado: Any) -> Replica:
+    replica = Replica(
+        nombre=nombre,
+        engine=engine if engine is not None else _engine_con_lag(0.0),
+        async_engine=MagicMock(),
+        **estado,
+    )
+    # Chequeo de salud vigente, salvo que el test pida otro
+    replica.chequeada_en = estado.get("chequeada_en", float("inf"))
+    return replica
+
+
+def _sqlite(origen: str) -> Engine:
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE origen (nombre TEXT)"))
+        conn.execute(text("INSERT INTO origen VALUES (:nombre)"), {"nombre": origen})
+    return engine
+
+
+def _origen(session: SesionLectura) -> str:
+    return session.execute(text("SELECT nombre FROM origen")).scalar_one()
+
+
+class TestElegir:
+    """Tests de la elección de réplica por salud y lag."""
+
+    def test_sin_replicas_lee_del_primario(self) -> None:
+        router = _router()
+
+        assert not router.habilitado
+        assert router.elegir() is None
+
+    def test_round_robin_entre_sanas(self) -> None:
+        a, b = _replica("a"), _replica("b")
+        router = _router(a, _replica("caida", sana=False), b)
+
+        elegidas = [router.elegir() for _ in range(4)]
+
+        assert elegidas == [a, b, a, b]
+
+    def test_todas_caidas_lee_del_primario(self) -> None:
+        router = _router(_replica("a", sana=False), _replica("b", sana=False))
+
+        assert router.elegir() is None
+
+    @pytest.mark.parametrize(
+        ("lag", "sana"),
+        [
+            (0.0, True),
+            (MAX_LAG, True),
+            (MAX_LAG + 0.1, False),
+            (ConnectionRefusedError("réplica apagada"), False),
+        ],
+    )
+    def test_chequeo_de_salud(self, lag: float | Exception, sana: bool) -> None:
+        replica = _replica("a", _engine_con_lag(lag), chequeada_en=0.0)
+        router = _router(replica)
+
+        elegida = router.elegir()
+
+        assert replica.sana is sana
+        assert elegida is (replica if sana else None)
+
+    def test_chequeo_vigente_no_consulta(self) -> None:
+        replica = _replica("a", _engine_con_lag(MAX_LAG * 2))
+        router = _router(replica)
+
+        assert router.elegir() is replica
+        replica.engine.connect.assert_not_called()
+
+    def test_caida_vuelve_con_el_proximo_chequeo(self) -> None:
+        replica = _replica("a")
+        router = _router(replica)
+
+        router.marcar_caida(replica)
+        assert router.elegir() is None
+
+        replica.chequeada_en = 0.0
+        assert router.elegir() is replica
+        assert router.estado() == [{"replica": "a", "sana": True, "lag_segundos": 0.0}]
+
+    def test_replica_de(self) -> None:
+        replica = _replica("a")
+        router = _router(replica)
+
+        assert router.replica_de(replica.engine) is replica
+        assert router.replica_de(replica.async_engine.sync_engine) is replica
+        assert router.replica_de(MagicMock()) is None
+
+
+class TestLecturaPrimarioTrasJob:
+    """Tests del ruteo al primario después de un job."""
+
+    def test_sin_usuario_no_consulta_redis(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        redis = MagicMock()
+        monkeypatch.setattr(replicas, "_get_redis", lambda: redis)
+
+        assert debe_leer_primario(None) is False
+        redis.exists.assert_not_called()
+
+    @pytest.mark.parametrize(("marcado", "esperado"), [(1, True), (0, False)])
+    def test_marca_en_redis(
+        self, monkeypatch: pytest.MonkeyPatch, marcado: int, esperado: bool
+    ) -> None:
+        redis = MagicMock()
+        redis.exists.return_value = marcado
+        monkeypatch.setattr(replicas, "_get_redis", lambda: redis)
+
+        assert debe_leer_primario(7) is esperado
+        redis.exists.assert_called_once_with("lectura_primario:7")
+
+    def test_sin_redis_lee_del_primario(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        redis = MagicMock()
+        redis.exists.side_effect = ConnectionError("redis caído")
+        monkeypatch.setattr(replicas, "_get_redis", lambda: redis)
+
+        assert debe_leer_primario(7) is True
+
+    def test_usuario_marcado_no_elige_replica(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        router = _router(_replica("a"))
+        monkeypatch.setattr(database, "replica_router", router)
+        monkeypatch.setattr(database, "_usuario_de_request", lambda request: 7)
+        monkeypatch.setattr(database, "debe_leer_primario", lambda user_id: True)
+
+        assert database._elegir_replica(MagicMock()) is None
+
+
+class TestSesionLectura:
+    """Tests del paso al primario cuando la réplica falla en una consulta."""
+
+    @pytest.fixture
+    def primario(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[Engine]:
+        engine = _sqlite("primario")
+        monkeypatch.setattr(database, "engine", engine)
+        yield engine
+        engine.dispose()
+
+    @pytest.fixture
+    def estado(self) -> dict[str, bool]:
+        return {"caida": False}
+
+    @pytest.fixture
+    def replica(
+        self, monkeypatch: pytest.MonkeyPatch, estado: dict[str, bool]
+    ) -> Iterator[Replica]:
+        engine = _sqlite("replica")
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _caer(conn: Any, *args: Any) -> None:
+            if estado["caida"]:
+                conn.connection.dbapi_connection.close()
+
+        replica = _replica("replica", engine)
+        monkeypatch.setattr(database, "replica_router", _router(replica))
+        yield replica
+        engine.dispose()
+
+    def test_lee_de_la_replica(self, primario: Engine, replica: Replica) -> None:
+        with SesionLectura(replica.engine) as session:
+            assert _origen(session) == "replica"
+
+        assert replica.sana
+
+    def test_caida_a_mitad_de_sesion(
+        self, primario: Engine, replica: Replica, estado: dict[str, bool]
+    ) -> None:
+        with SesionLectura(replica.engine) as session:
+            assert _origen(session) == "replica"
+
+            estado["caida"] = True
+            assert _origen(session) == "primario"
+            # El resto de la sesión sigue en el primario
+            assert session.scalar(text("SELECT count(*) FROM origen")) == 1
+            assert session.bind is primario
+
+        assert not replica.sana
+        assert database.replica_router.elegir() is None
+
+    def test_replica_inalcanzable(
+        self, primario: Engine, monkeypatch: pytest.MonkeyPatch, tmp_path: Any
+    ) -> None:
+        inalcanzable = create_engine(f"sqlite:///{tmp_path}/no/existe.db")
+        replica = _replica("inalcanzable", inalcanzable)
+        monkeypatch.setattr(database, "replica_router", _router(replica))
+
+        with SesionLectura(inalcanzable) as session:
+            assert _origen(session) == "primario"
+
+        assert not replica.sana
+
+    def test_error_de_la_consulta_se_propaga(
+        self, primario: Engine, replica: Replica
+    ) -> None:
+        with SesionLectura(replica.engine) as session:
+            with pytest.raises(StatementError):
+                session.execute(text("SELECT nombre FROM origen WHERE nombre = :n"))
+            session.rollback()
+            assert _origen(session) == "replica"
+
+        assert replica.sana
+
+    def test_sin_replica_no_reintenta(self, primario: Engine, replica: Replica) -> None:
+        with (
+            SesionLectura(primario) as session,
+            pytest.raises(Exception, match="no such table"),
+        ):
+            session.execute(text("SELECT * FROM no_existe"))
+
+        assert replica.sana
+
+    def test_dependencia_usa_la_replica(
+        self, primario: Engine, replica: Replica, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(database, "debe_leer_primario", lambda user_id: False)
+        request = MagicMock()
+        request.headers = {}
+
+        dependencia = get_read_session(request)
+        session = next(dependencia)
+
+        assert isinstance(session, SesionLectura)
+        assert session.bind is replica.engine
+        assert _origen(session) == "replica"
+        dependencia.close()
@@ -0,0 +1,207 @@
+"""
+Tests unitarios para el cache de respuestas con ETag.
+
+Redis se reemplaza por un contador en memoria; el endpoint corre en una app
+FastAPI mínima con ``TestClient``.
+"""
+
+import gzip
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core import response_cache
+from app.core.response_cache import cache_respuesta, invalidar_tablas
+
+
+class _RedisFalso:
+    """Contadores de versión en memoria (cliente sync y async a la vez)."""
+
+    def __init__(self) -> None:
+        self.valores: dict[str, str] = {}
+        self.disponible = True
+
+    async def mget(self, claves: list[str]) -> list[str | None]:
+        if not self.disponible:
+            raise ConnectionError("Redis caído")
+        return [self.valores.get(clave) for clave in claves]
+
+    def pipeline(self) -> "_RedisFalso":
+        return self
+
+    def incr(self, clave: str) -> None:
+        self.valores[clave] = str(int(self.valores.get(clave, "0")) + 1)
+
+    def execute(self) -> None:
+        return None
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch) -> Iterator[_RedisFalso]:
+    falso = _RedisFalso()
+    monkeypatch.setattr(response_cache, "_get_redis", lambda: falso)
+    monkeypatch.setattr(response_cache, "_get_redis_async", lambda: falso)
+    response_cache._cache.clear()
+    yield falso
+    response_cache._cache.clear()
+
+
+@pytest.fixture
+def llamadas() -> list[Any]:
+    return []
+
+
+@pytest.fixture
+def client(redis: _RedisFalso, llamadas: list[Any]) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/catalogo")
+    @cache_respuesta("catalogo_prueba")
+    async def catalogo(nombre: str | None = None, cantidad: int = 3) -> dict:
+        llamadas.append(nombre)
+        return {"nombre": nombre, "items": [f"item-{i}" for i in range(cantidad)]}
+
+    @app.get("/sync")
+    @cache_respuesta("otra_tabla")
+    def sync(request: Request) -> dict:
+        llamadas.append(request.url.path)
+        return {"ruta": request.url.path}
+
+    return TestClient(app, headers={"Accept-Encoding": "identity"})
+
+
+class TestETag:
+    """Tests para ETag, 304 y cache en memoria."""
+
+    def test_primera_respuesta_con_etag(self, client: TestClient) -> None:
+        """La respuesta lleva un ETag débil y revalidación obligatoria."""
+        respuesta = client.get("/catalogo", params={"nombre": "dengue"})
+
+        assert respuesta.status_code == 200
+        assert respuesta.json()["nombre"] == "dengue"
+        assert respuesta.headers["etag"].startswith('W/"')
+        assert respuesta.headers["cache-control"] == "private, no-cache"
+
+    def test_if_none_match_devuelve_304(
+        self, client: TestClient, llamadas: list[Any]
+    ) -> None:
+        """Con el ETag vigente responde 304 sin body ni ejecutar el endpoint."""
+        etag = client.get("/catalogo").headers["etag"]
+
+        respuesta = client.get("/catalogo", headers={"If-None-Match": etag})
+
+        assert respuesta.status_code == 304
+        assert respuesta.content == b""
+        assert respuesta.headers["etag"] == etag
+        assert len(llamadas) == 1
+
+    def test_if_none_match_con_lista_y_comodin(self, client: TestClient) -> None:
+        """Acepta listas de ETags y ``*``."""
+        etag = client.get("/catalogo").headers["etag"]
+
+        lista = client.get("/catalogo", headers={"If-None-Match": f'"otro", {etag}'})
+        comodin = client.get("/catalogo", headers={"If-None-Match": "*"})
+
+        assert lista.status_code == 304
+        assert comodin.status_code == 304
+
+    def test_etag_viejo_devuelve_body(self, client: TestClient) -> None:
+        """Un ETag que no coincide recibe la respuesta completa."""
+        respuesta = client.get("/catalogo", headers={"If-None-Match": 'W/"viejo"'})
+
+        assert respuesta.status_code == 200
+        assert respuesta.json()["items"] == ["item-0", "item-1", "item-2"]
+
+    def test_hit_no_ejecuta_el_endpoint(
+        self, client: TestClient, llamadas: list[Any]
+    ) -> None:
+        """Sin If-None-Match, un hit sirve el body ya serializado."""
+        primera = client.get("/catalogo", params={"nombre": "zika"})
+        segunda = client.get("/catalogo", params={"nombre": "zika"})
+
+        assert segunda.content == primera.content
+        assert llamadas == ["zika"]
+
+    def test_clave_independiente_del_orden_de_params(
+        self, client: TestClient, llamadas: list[Any]
+    ) -> None:
+        """Los query params en otro orden son la misma entrada."""
+        a = client.get("/catalogo?nombre=x&cantidad=2")
+        b = client.get("/catalogo?cantidad=2&nombre=x")
+        c = client.get("/catalogo?nombre=y&cantidad=2")
+
+        assert a.headers["etag"] == b.headers["etag"] != c.headers["etag"]
+        assert llamadas == ["x", "y"]
+
+    def test_invalidar_tabla_cambia_el_etag(
+        self, client: TestClient, llamadas: list[Any]
+    ) -> None:
+        """Incrementar la versión de una tabla invalida sus respuestas."""
+        etag = client.get("/catalogo").headers["etag"]
+        etag_sync = client.get("/sync").headers["etag"]
+
+        invalidar_tablas(["catalogo_prueba"])
+
+        respuesta = client.get("/catalogo", headers={"If-None-Match": etag})
+        sync = client.get("/sync", headers={"If-None-Match": etag_sync})
+        assert respuesta.status_code == 200
+        assert respuesta.headers["etag"] != etag
+        assert sync.status_code == 304
+        assert llamadas == [None, "/sync", None]
+
+    def test_sin_redis_ejecuta_sin_etag(
+        self, client: TestClient, redis: _RedisFalso, llamadas: list[Any]
+    ) -> None:
+        """Si Redis no responde, el endpoint funciona igual, sin cache."""
+        redis.disponible = False
+
+        primera = client.get("/catalogo")
+        client.get("/catalogo")
+
+        assert primera.status_code == 200
+        assert "etag" not in primera.headers
+        assert len(llamadas) == 2
+
+
+class TestCompresionCacheada:
+    """Tests para los bodies comprimidos guardados en el cache."""
+
+    def test_body_grande_se_sirve_comprimido(self, client: TestClient) -> None:
+        """Se comprime con la codificación aceptada y se agrega Vary."""
+        respuesta = client.get(
+            "/catalogo",
+            params={"cantidad": 500},
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert respuesta.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in respuesta.headers["vary"]
+        assert len(respuesta.json()["items"]) == 500
+
+    def test_mismo_etag_con_y_sin_compresion(self, client: TestClient) -> None:
+        """El ETag es débil: identifica el contenido, no los bytes."""
+        comprimida = client.get(
+            "/catalogo", params={"cantidad": 500}, headers={"Accept-Encoding": "gzip"}
+        )
+        plana = client.get("/catalogo", params={"cantidad": 500})
+
+        assert comprimida.headers["etag"] == plana.headers["etag"]
+        assert "content-encoding" not in plana.headers
+
+    def test_body_chico_sin_comprimir(self, client: TestClient) -> None:
+        """Debajo de COMPRESSION_MIN_BYTES no se comprime."""
+        respuesta = client.get("/catalogo", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in respuesta.headers
+
+    def test_comprimido_se_guarda_por_codificacion(self, client: TestClient) -> None:
+        """El body comprimido queda en la entrada para los siguientes hits."""
+        client.get(
+            "/catalogo", params={"cantidad": 500}, headers={"Accept-Encoding": "gzip"}
+        )
+
+        (entrada,) = response_cache._cache._entradas.values()
+        assert gzip.decompress(entrada.comprimidos["gzip"]) == entrada.body
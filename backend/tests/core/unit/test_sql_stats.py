@@ -0,0 +1,157 @@
+"""
+Tests unitarios para la contabilidad de SQL por request.
+
+Usan un engine SQLite instrumentado; el plan de PostgreSQL se simula.
+"""
+
+import logging
+from collections.abc import Iterator
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import Engine, create_engine, text
+
+from app.core import sql_stats
+from app.core.config import settings
+from app.core.sql_stats import (
+    _explain,
+    _redactar_plan,
+    finalizar_request,
+    iniciar_request,
+    instrumentar_engine,
+)
+
+PLAN_POSTGRES = """Index Scan using ix_ciudadano_documento on ciudadano  (cost=0.43..8.45 rows=1 width=64)
+  Index Cond: (numero_documento = 30123456)
+  Filter: ((apellido)::text = 'Pérez'::text AND edad > -2.5)"""
+
+
+@pytest.fixture
+def engine() -> Iterator[Engine]:
+    engine = create_engine("sqlite://")
+    instrumentar_engine(engine)
+    yield engine
+    engine.dispose()
+
+
+class TestContabilidad:
+    """Tests para los totales por request."""
+
+    def test_cuenta_statements_y_formas(self, engine: Engine) -> None:
+        """Cada ejecución suma; la forma es el SQL sin bindear."""
+        stats, token = iniciar_request()
+        with engine.connect() as conn:
+            for i in range(3):
+                conn.execute(text("SELECT :valor"), {"valor": i})
+        finalizar_request(stats, token, "/prueba")
+
+        assert stats.statements == 3
+        assert stats.repetidas(3) == [("SELECT ?", 3)]
+        assert stats.server_timing().startswith("db;dur=")
+
+    def test_fuera_de_request_no_acumula(self, engine: Engine) -> None:
+        """Sin request activo no hay estadísticas que actualizar."""
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert sql_stats._estadisticas.get() is None
+
+    def test_posible_n_mas_1(
+        self, engine: Engine, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Una forma repetida sobre el umbral se loguea."""
+        stats, token = iniciar_request()
+        with engine.connect() as conn:
+            for i in range(settings.SQL_N1_THRESHOLD):
+                conn.execute(text("SELECT :valor"), {"valor": i})
+        with caplog.at_level(logging.WARNING, logger=sql_stats.__name__):
+            finalizar_request(stats, token, "/casos")
+
+        assert "Posible N+1 en /casos" in caplog.text
+
+
+class TestQueryLenta:
+    """Tests para el log de queries lentas."""
+
+    def test_no_loguea_parametros(
+        self,
+        engine: Engine,
+        caplog: pytest.LogCaptureFixture,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Solo la forma del statement: los valores pueden ser datos personales."""
+        monkeypatch.setattr(settings, "SQL_SLOW_QUERY_MS", 0)
+        with (
+            caplog.at_level(logging.WARNING, logger=sql_stats.__name__),
+            engine.connect() as conn,
+        ):
+            conn.execute(
+                text("SELECT :documento, :apellido"),
+                {"documento": 30123456, "apellido": "Pérez"},
+            )
+
+        assert "Query lenta" in caplog.text
+        assert "SELECT ?, ?" in caplog.text
+        assert "30123456" not in caplog.text
+        assert "Pérez" not in caplog.text
+
+
+class TestExplain:
+    """Tests para el plan adjunto a las queries lentas."""
+
+    def _conexion(self, es_async: bool) -> MagicMock:
+        conn = MagicMock()
+        conn.dialect.is_async = es_async
+        return conn
+
+    def test_redacta_literales_de_condiciones(self) -> None:
+        """Los valores de Cond/Filter se reemplazan; costos y nombres quedan."""
+        plan = _redactar_plan(PLAN_POSTGRES)
+
+        assert "30123456" not in plan
+        assert "Pérez" not in plan
+        assert "(numero_documento = ?)" in plan
+        assert "((apellido)::text = ?::text AND edad > ?)" in plan
+        assert "cost=0.43..8.45 rows=1" in plan
+
+    def test_pide_el_plan_con_driver_sync(self) -> None:
+        """Con un driver sync usa un cursor nuevo y redacta el resultado."""
+        cursor = MagicMock()
+        explain_cursor = cursor.connection.cursor.return_value
+        explain_cursor.fetchall.return_value = [
+            (linea,) for linea in PLAN_POSTGRES.splitlines()
+        ]
+
+        plan = _explain(
+            self._conexion(False), cursor, "SELECT * FROM ciudadano", {"d": 1}
+        )
+
+        explain_cursor.execute.assert_called_once_with(
+            "EXPLAIN SELECT * FROM ciudadano", {"d": 1}
+        )
+        explain_cursor.close.assert_called_once()
+        assert plan is not None and "(numero_documento = ?)" in plan
+
+    def test_async_no_pide_el_plan(self) -> None:
+        """Con asyncpg no se abre otro cursor."""
+        cursor = MagicMock()
+
+        assert _explain(self._conexion(True), cursor, "SELECT 1", ()) is None
+        cursor.connection.cursor.assert_not_called()
+
+    def test_solo_consultas(self) -> None:
+        """INSERT/UPDATE no se explican."""
+        cursor = MagicMock()
+
+        assert _explain(self._conexion(False), cursor, "UPDATE x SET y=1", ()) is None
+
+    def test_error_no_expone_el_statement(self) -> None:
+        """El error del driver puede incluir valores: solo se loguea el tipo."""
+        cursor = MagicMock()
+        cursor.connection.cursor.return_value.execute.side_effect = RuntimeError(
+            "LINE 1: ... WHERE documento = '30123456'"
+        )
+
+        plan = _explain(self._conexion(False), cursor, "SELECT 1", ())
+
+        assert plan == "(EXPLAIN falló: RuntimeError)"
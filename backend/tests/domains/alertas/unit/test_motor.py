@@ -0,0 +1,285 @@
+"""
+Tests unitarios para el motor de alertas por umbral endémico.
+
+Cubren los estadísticos, las señales por celda y el armado de episodios con
+histéresis, sin base de datos.
+"""
+
+import numpy as np
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.core.config import settings
+from app.domains.alertas.models import MetodoAlerta
+from app.domains.alertas.motor import (
+    _RETROSPECTIVA,
+    BITS_METODO,
+    _Estadisticos,
+    calcular_estadisticos,
+    calcular_senales,
+    episodios,
+)
+from app.domains.metricas.aberraciones import SIGMA_MIN, cusum, ears
+
+
+def _conteos(semanas: int, semilla: int = 0) -> np.ndarray:
+    """Tres áreas con ruido Poisson y un brote en la segunda."""
+    rng = np.random.default_rng(semilla)
+    conteos = rng.poisson([[2.0], [5.0], [0.3]], (3, semanas)).astype(np.float64)
+    conteos[1, -6:-3] += 15
+    return conteos
+
+
+def _estadisticos(forma: tuple[int, int], **valores: float) -> _Estadisticos:
+    campos = {"c1": np.nan, "c2": np.nan, "c3": np.nan, "cusum": np.nan} | valores
+    return _Estadisticos(**{c: np.full(forma, v) for c, v in campos.items()})
+
+
+class TestCalcularEstadisticos:
+    """Tests de EARS y CUSUM sobre las semanas evaluadas."""
+
+    def test_solo_semanas_evaluadas(self) -> None:
+        conteos = _conteos(_RETROSPECTIVA + 8)
+
+        resultado = calcular_estadisticos(conteos, np.zeros(3))
+
+        c1, c2, c3 = ears(conteos)
+        assert resultado.c1.shape == (3, 8)
+        np.testing.assert_allclose(resultado.c1, c1[:, _RETROSPECTIVA:])
+        np.testing.assert_allclose(resultado.c2, c2[:, _RETROSPECTIVA:])
+        np.testing.assert_allclose(resultado.c3, c3[:, _RETROSPECTIVA:])
+        # La retrospectiva alcanza para que C3 esté definido desde la primera
+        assert not np.isnan(resultado.c3).any()
+
+    def test_base_constante(self) -> None:
+        conteos = np.full((1, _RETROSPECTIVA + 1), 4.0)
+        conteos[0, -1] = 10.0
+
+        resultado = calcular_estadisticos(conteos, np.zeros(1))
+
+        # Base sin variación: el desvío es el piso
+        assert resultado.c1[0, 0] == pytest.approx(6.0 / SIGMA_MIN)
+        assert resultado.c2[0, 0] == pytest.approx(6.0 / SIGMA_MIN)
+        assert resultado.cusum[0, 0] == pytest.approx(6.0 / SIGMA_MIN - 0.5)
+
+    def test_cusum_arranca_del_previo(self) -> None:
+        conteos = _conteos(_RETROSPECTIVA + 4)
+        previo = np.array([0.0, 2.5, 10.0])
+
+        resultado = calcular_estadisticos(conteos, previo)
+
+        c2 = ears(conteos)[1][:, _RETROSPECTIVA:]
+        np.testing.assert_allclose(resultado.cusum, cusum(c2, inicial=previo))
+        assert not np.allclose(
+            resultado.cusum, calcular_estadisticos(conteos, np.zeros(3)).cusum
+        )
+
+    def test_evaluacion_incremental_igual_a_completa(self) -> None:
+        # Evaluar en dos ingestas (la segunda con el CUSUM guardado de la
+        # primera) da lo mismo que evaluar todo junto
+        conteos = _conteos(_RETROSPECTIVA + 20, semilla=4)
+
+        completa = calcular_estadisticos(conteos, np.zeros(3))
+        primera = calcular_estadisticos(conteos[:, : _RETROSPECTIVA + 12], np.zeros(3))
+        segunda = calcular_estadisticos(conteos[:, 12:], primera.cusum[:, -1])
+
+        np.testing.assert_allclose(primera.cusum, completa.cusum[:, :12])
+        np.testing.assert_allclose(segunda.cusum, completa.cusum[:, 12:])
+        np.testing.assert_allclose(segunda.c3, completa.c3[:, 12:])
+
+
+class TestCalcularSenales:
+    """Tests de la máscara de señales por celda."""
+
+    @pytest.fixture(autouse=True)
+    def _min_casos(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "ALERTAS_MIN_CASOS", 3)
+
+    def test_bit_por_metodo(self) -> None:
+        casos = np.array([[10.0]])
+        casos_por_metodo = {
+            MetodoAlerta.ZONA_EPIDEMICA: (np.array([[5.0]]), {}),
+            MetodoAlerta.EARS_C1: (np.array([[np.nan]]), {"c1": 3.5}),
+            MetodoAlerta.EARS_C2: (np.array([[np.nan]]), {"c2": 3.5}),
+            MetodoAlerta.EARS_C3: (np.array([[np.nan]]), {"c3": 2.5}),
+            MetodoAlerta.CUSUM: (np.array([[np.nan]]), {"cusum": 4.5}),
+        }
+        for metodo, (umbral_zona, valores) in casos_por_metodo.items():
+            senales = calcular_senales(
+                casos, umbral_zona, _estadisticos(casos.shape, **valores)
+            )
+            assert senales.tolist() == [[BITS_METODO[metodo]]], metodo
+
+    def test_umbrales_estrictos(self) -> None:
+        casos = np.array([[5.0]])
+
+        senales = calcular_senales(
+            casos,
+            np.array([[5.0]]),
+            _estadisticos(casos.shape, c1=3.0, c2=3.0, c3=2.0, cusum=4.0),
+        )
+
+        assert senales.tolist() == [[0]]
+
+    def test_combina_metodos(self) -> None:
+        casos = np.array([[10.0, 10.0]])
+
+        senales = calcular_senales(
+            casos,
+            np.array([[5.0, np.nan]]),
+            _estadisticos(casos.shape, c1=4.0, cusum=5.0),
+        )
+
+        base = BITS_METODO[MetodoAlerta.EARS_C1] | BITS_METODO[MetodoAlerta.CUSUM]
+        assert senales.tolist() == [
+            [base | BITS_METODO[MetodoAlerta.ZONA_EPIDEMICA], base]
+        ]
+
+    def test_min_casos(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        casos = np.array([[0.0, 2.0, 3.0, 4.0]])
+        estadisticos = _estadisticos(casos.shape, c1=10.0, c2=10.0, c3=10.0, cusum=10.0)
+        umbral_zona = np.zeros(casos.shape)
+
+        senales = calcular_senales(casos, umbral_zona, estadisticos)
+
+        todos = sum(BITS_METODO.values())
+        assert senales.tolist() == [[0, 0, todos, todos]]
+
+        monkeypatch.setattr(settings, "ALERTAS_MIN_CASOS", 4)
+        senales = calcular_senales(casos, umbral_zona, estadisticos)
+        assert senales.tolist() == [[0, 0, 0, todos]]
+
+
+def _estadisticos_anteriores(
+    conteos: np.ndarray, cusum_previo: np.ndarray
+) -> _Estadisticos:
+    """
+    ``calcular_estadisticos`` tal como estaba antes de delegar en
+    ``aberraciones`` (ventanas propias de 7 semanas, 2 de desfase, piso 0.5).
+    """
+    conteos = conteos.astype(np.float64)
+    ventanas = sliding_window_view(conteos, 7, axis=1)
+    medias = ventanas.mean(axis=2)
+    desvios = np.maximum(ventanas.std(axis=2, ddof=1), 0.5)
+    n = conteos.shape[1]
+
+    t_c1 = np.arange(11, n)
+    c1 = (conteos[:, t_c1] - medias[:, t_c1 - 7]) / desvios[:, t_c1 - 7]
+    t_c2 = np.arange(11 - 2, n)
+    j_c2 = t_c2 - 7 - 2
+    c2_extendido = (conteos[:, t_c2] - medias[:, j_c2]) / desvios[:, j_c2]
+    excesos = np.maximum(c2_extendido - 1.0, 0.0)
+    c3 = excesos[:, 2:] + excesos[:, 1:-1] + excesos[:, :-2]
+    c2 = c2_extendido[:, 2:]
+
+    acumulados = np.empty_like(c2)
+    acumulado = cusum_previo.astype(np.float64)
+    for semana in range(c2.shape[1]):
+        acumulado = np.maximum(acumulado + c2[:, semana] - 0.5, 0.0)
+        acumulados[:, semana] = acumulado
+    return _Estadisticos(c1=c1, c2=c2, c3=c3, cusum=acumulados)
+
+
+class TestRegresionAberraciones:
+    """
+    Delegar EARS y CUSUM en ``aberraciones`` no cambia los estadísticos ni
+    las señales del motor.
+    """
+
+    @staticmethod
+    def _casos() -> list[tuple[np.ndarray, np.ndarray]]:
+        rng = np.random.default_rng(7)
+        ruido = rng.poisson(rng.uniform(0.1, 30.0, (40, 1)), (40, 60)).astype(
+            np.float64
+        )
+        ruido[::5, -10:] += rng.integers(5, 40, (8, 10))
+        previo = np.where(rng.random(40) < 0.5, 0.0, rng.uniform(0.0, 8.0, 40))
+        constantes = np.vstack([np.zeros(30), np.full(30, 3.0)])
+        return [
+            (ruido, previo),
+            (ruido, np.zeros(40)),
+            (constantes, np.array([0.0, 5.5])),
+            (np.zeros((1, _RETROSPECTIVA + 1)), np.array([1.0])),
+            (_conteos(_RETROSPECTIVA + 25, semilla=3), np.array([0.0, 3.0, 0.2])),
+        ]
+
+    def test_estadisticos_iguales(self) -> None:
+        for conteos, previo in self._casos():
+            nuevo = calcular_estadisticos(conteos, previo)
+            anterior = _estadisticos_anteriores(conteos, previo)
+            for campo in ("c1", "c2", "c3", "cusum"):
+                np.testing.assert_allclose(
+                    getattr(nuevo, campo), getattr(anterior, campo), err_msg=campo
+                )
+
+    def test_senales_iguales(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "ALERTAS_MIN_CASOS", 3)
+        for conteos, previo in self._casos():
+            casos = conteos[:, _RETROSPECTIVA:]
+            umbral_zona = np.full(casos.shape, 10.0)
+
+            nuevas = calcular_senales(
+                casos, umbral_zona, calcular_estadisticos(conteos, previo)
+            )
+            anteriores = calcular_senales(
+                casos, umbral_zona, _estadisticos_anteriores(conteos, previo)
+            )
+
+            np.testing.assert_array_equal(nuevas, anteriores)
+        # El caso con ruido y brotes ejercita todos los métodos
+        conteos, previo = self._casos()[0]
+        senales = calcular_senales(
+            conteos[:, _RETROSPECTIVA:],
+            np.full((40, conteos.shape[1] - _RETROSPECTIVA), 10.0),
+            calcular_estadisticos(conteos, previo),
+        )
+        for bit in BITS_METODO.values():
+            assert (senales & bit).any()
+
+
+class TestEpisodios:
+    """Tests del armado de episodios con histéresis."""
+
+    @staticmethod
+    def _senales(largo: int, *posiciones: int) -> np.ndarray:
+        con_senal = np.zeros(largo, dtype=bool)
+        con_senal[list(posiciones)] = True
+        return con_senal
+
+    def test_sin_senales(self) -> None:
+        assert episodios(np.zeros(10, dtype=bool), 2) == []
+
+    def test_hueco_menor_al_cierre_no_corta(self) -> None:
+        # Una semana sin señal entre medio: sigue siendo el mismo episodio
+        resultado = episodios(self._senales(12, 2, 3, 5), 2)
+
+        assert resultado == [(2, 5, 7, 3)]
+
+    def test_cierra_tras_semanas_cierre(self) -> None:
+        # Dos semanas sin señal (4 y 5) cierran el episodio en la 5
+        resultado = episodios(self._senales(12, 2, 3, 6, 7), 2)
+
+        assert resultado == [(2, 3, 5, 2), (6, 7, 9, 2)]
+
+    @pytest.mark.parametrize("semanas_cierre", [1, 3])
+    def test_semanas_cierre_configurable(self, semanas_cierre: int) -> None:
+        resultado = episodios(self._senales(20, 2, 5), semanas_cierre)
+
+        if semanas_cierre < 3:
+            assert resultado == [
+                (2, 2, 2 + semanas_cierre, 1),
+                (5, 5, 5 + semanas_cierre, 1),
+            ]
+        else:
+            assert resultado == [(2, 5, 5 + semanas_cierre, 2)]
+
+    def test_abierto_al_final(self) -> None:
+        # La última señal en la anteúltima semana: el cierre caería fuera
+        resultado = episodios(self._senales(10, 1, 8), 2)
+
+        assert resultado == [(1, 1, 3, 1), (8, 8, None, 1)]
+
+    def test_cierre_en_la_ultima_semana(self) -> None:
+        resultado = episodios(self._senales(10, 6, 7), 2)
+
+        assert resultado == [(6, 7, 9, 2)]
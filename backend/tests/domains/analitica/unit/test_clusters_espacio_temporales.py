@@ -0,0 +1,388 @@
+"""
+Tests unitarios para el scan de clusters espacio-temporales.
+
+Los casos son sintéticos (semilla fija); las funciones internas se comparan
+contra implementaciones por fuerza bruta sobre modelos chicos.
+"""
+
+from datetime import date
+from typing import Any
+
+import numpy as np
+import pytest
+
+from app.api.v1.analytics import get_clusters_espacio_temporales as endpoint
+from app.core.config import settings
+from app.domains.analitica import clusters_espacio_temporales as scan
+from app.domains.analitica.clusters_espacio_temporales import (
+    ClusterEspacioTemporal,
+    ParametrosEscaneo,
+    ResultadoEscaneo,
+    escanear_clusters,
+)
+
+_DESDE = date(2024, 1, 1)
+# Centro de Rawson; un grado de latitud son ~111 km
+_LAT, _LON = -43.3, -65.1
+_KM_LAT = 1 / 111.2
+_KM_LON = 1 / (111.2 * np.cos(np.radians(_LAT)))
+
+
+def _casos(
+    rng: np.random.Generator,
+    n: int,
+    km: float,
+    semanas: tuple[int, int],
+    centro_km: tuple[float, float] = (0.0, 0.0),
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Casos uniformes en un cuadrado de ``km`` de lado y un rango de semanas."""
+    x = centro_km[0] + rng.uniform(-km / 2, km / 2, n)
+    y = centro_km[1] + rng.uniform(-km / 2, km / 2, n)
+    dias = rng.integers(semanas[0] * 7, semanas[1] * 7, n)
+    return (
+        _LAT + y * _KM_LAT,
+        _LON + x * _KM_LON,
+        np.datetime64(_DESDE, "D") + dias,
+    )
+
+
+def _unir(
+    *grupos: tuple[np.ndarray, np.ndarray, np.ndarray],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return (
+        np.concatenate([g[0] for g in grupos]),
+        np.concatenate([g[1] for g in grupos]),
+        np.concatenate([g[2] for g in grupos]),
+    )
+
+
+def _distancia_km(
+    cluster: ClusterEspacioTemporal, centro_km: tuple[float, float]
+) -> float:
+    return float(
+        np.hypot(
+            (cluster.longitud - _LON) / _KM_LON - centro_km[0],
+            (cluster.latitud - _LAT) / _KM_LAT - centro_km[1],
+        )
+    )
+
+
+class TestVecindarios:
+    """Tests de los vecindarios del índice de grilla."""
+
+    @staticmethod
+    def _fuerza_bruta(
+        xy: np.ndarray, radio: float, max_vecinos: int
+    ) -> list[list[tuple[int, float]]]:
+        distancias = np.hypot(*(xy[:, None, :] - xy[None, :, :]).transpose(2, 0, 1))
+        return [
+            sorted(
+                ((j, float(d)) for j, d in enumerate(fila) if d <= radio),
+                key=lambda par: (par[1], par[0]),
+            )[:max_vecinos]
+            for fila in distancias
+        ]
+
+    @pytest.mark.parametrize(("radio", "max_vecinos"), [(0.5, 50), (1.0, 4)])
+    def test_coincide_con_fuerza_bruta(self, radio: float, max_vecinos: int) -> None:
+        rng = np.random.default_rng(7)
+        # Puntos en varias celdas, con coordenadas negativas y un punto aislado
+        xy = np.vstack([rng.uniform(-2, 2, (150, 2)), [[40.0, 40.0]]])
+
+        vecinos, distancias = scan._vecindarios(xy, radio, max_vecinos)
+
+        esperados = self._fuerza_bruta(xy, radio, max_vecinos)
+        assert vecinos.shape[1] == max(len(e) for e in esperados)
+        for i, esperado in enumerate(esperados):
+            k = len(esperado)
+            assert vecinos[i, 0] == i
+            assert vecinos[i, :k].tolist() == [j for j, _ in esperado]
+            assert distancias[i, :k] == pytest.approx([d for _, d in esperado])
+            # Relleno: la ubicación vacía
+            assert (vecinos[i, k:] == len(xy)).all()
+            assert np.isinf(distancias[i, k:]).all()
+
+    def test_radio_mayor_que_celda(self) -> None:
+        indice = scan.IndiceGrilla(np.zeros((2, 2)), 1.0)
+        with pytest.raises(ValueError, match="tamaño de celda"):
+            indice.pares_en_radio(np.zeros((1, 2)), 2.0)
+
+
+def _modelo(
+    monkeypatch: pytest.MonkeyPatch,
+    casos: tuple[np.ndarray, np.ndarray, np.ndarray],
+    parametros: ParametrosEscaneo,
+) -> scan._Modelo:
+    """El modelo que arma ``escanear_clusters`` para estos casos."""
+    capturados: list[scan._Modelo] = []
+    original = scan._mejores_por_centro
+
+    def capturar(modelo: scan._Modelo) -> tuple[np.ndarray, np.ndarray]:
+        capturados.append(modelo)
+        return original(modelo)
+
+    monkeypatch.setattr(scan, "_mejores_por_centro", capturar)
+    escanear_clusters(*casos, _DESDE, parametros)
+    return capturados[0]
+
+
+def _llr_fuerza_bruta(modelo: scan._Modelo, periodos: np.ndarray) -> float:
+    """Máximo LLR recorriendo cilindro por cilindro."""
+    total = len(periodos)
+    mejor = 0.0
+    n_ubicaciones, k = modelo.vecinos.shape
+    for centro in range(n_ubicaciones):
+        for vecino in range(k):
+            miembros = modelo.vecinos[centro, : vecino + 1]
+            en_circulo = np.isin(modelo.ubicaciones, miembros)
+            for duracion, total_ventana in enumerate(modelo.total_ventana, start=1):
+                for inicio in range(len(total_ventana)):
+                    esperados = float(modelo.fraccion_circulo[centro, vecino]) * float(
+                        total_ventana[inicio]
+                    )
+                    n = int(
+                        (
+                            en_circulo
+                            & (periodos >= inicio)
+                            & (periodos < inicio + duracion)
+                        ).sum()
+                    )
+                    if not np.isfinite(esperados) or n <= esperados:
+                        continue
+                    if n < modelo.min_casos:
+                        continue
+                    mejor = max(
+                        mejor,
+                        float(
+                            scan._llr(np.array([n]), np.array([esperados]), total)[0]
+                        ),
+                    )
+    return mejor
+
+
+class TestMinimosCasos:
+    """Tests de la poda de cilindros en las réplicas."""
+
+    @pytest.fixture
+    def modelo(self, monkeypatch: pytest.MonkeyPatch) -> scan._Modelo:
+        rng = np.random.default_rng(11)
+        casos = _unir(
+            _casos(rng, 60, 3.0, (0, 8)),
+            _casos(rng, 12, 0.2, (3, 4), centro_km=(0.5, 0.5)),
+        )
+        return _modelo(
+            monkeypatch,
+            casos,
+            ParametrosEscaneo(radio_km=0.6, resolucion_km=0.2, dias_max=21),
+        )
+
+    def test_cota_del_llr(self, modelo: scan._Modelo) -> None:
+        piso = 3.0
+        total = len(modelo.periodos)
+
+        # Menos de _BLOQUE_CENTROS ubicaciones: un solo bloque
+        (minimos_bloque,) = scan._minimos_casos(modelo, piso)
+        bloque = slice(0, scan._BLOQUE_CENTROS)
+        evaluados = 0
+        for duracion, minimo in enumerate(minimos_bloque, start=1):
+            esperados = scan._esperados(modelo, bloque, duracion)
+            assert minimo.shape == esperados.shape
+            finitos = np.isfinite(esperados) & (esperados > 0)
+            assert (minimo[finitos] >= modelo.min_casos).all()
+            # Con un caso menos que el mínimo el cilindro no llega al piso
+            # (salvo que el mínimo sea el piso de min_casos)
+            podados = finitos & (minimo > modelo.min_casos)
+            n = minimo[podados].astype(np.float64) - 1
+            e = esperados[podados].astype(np.float64)
+            posibles = n > e
+            llr = scan._llr(n[posibles], e[posibles], total)
+            assert (llr < piso).all()
+            evaluados += int(posibles.sum())
+        assert evaluados > 0
+
+    def test_replica_exacta_sobre_el_piso(self, modelo: scan._Modelo) -> None:
+        rng = np.random.default_rng(3)
+        for _ in range(5):
+            periodos = rng.permutation(modelo.periodos)
+            exacto = _llr_fuerza_bruta(modelo, periodos)
+
+            for piso in (0.0, exacto * 0.9, exacto * 1.5):
+                podado = scan._maximo_llr(
+                    modelo, periodos, scan._minimos_casos(modelo, piso)
+                )
+                if exacto >= piso:
+                    assert podado == pytest.approx(exacto, rel=1e-5)
+                else:
+                    assert podado <= exacto * (1 + 1e-5)
+
+    def test_mejores_por_centro_coincide(self, modelo: scan._Modelo) -> None:
+        mejor, _posicion = scan._mejores_por_centro(modelo)
+
+        assert mejor.max() == pytest.approx(
+            _llr_fuerza_bruta(modelo, modelo.periodos), rel=1e-5
+        )
+
+
+class TestEscanearClusters:
+    """Tests del scan completo sobre casos sintéticos."""
+
+    def test_recupera_cluster_inyectado(self) -> None:
+        rng = np.random.default_rng(20240101)
+        centro_km = (3.0, -2.0)
+        casos = _unir(
+            # Fondo: 800 casos en 20 x 20 km durante 26 semanas
+            _casos(rng, 800, 20.0, (0, 26)),
+            # Brote: 30 casos en 300 m durante las semanas 10 y 11
+            _casos(rng, 30, 0.3, (10, 12), centro_km=centro_km),
+        )
+
+        resultado = escanear_clusters(
+            *casos, _DESDE, ParametrosEscaneo(replicas=99, resolucion_km=0.1)
+        )
+
+        assert resultado.casos == 830
+        assert resultado.periodos == 26
+        principal = resultado.clusters[0]
+        assert _distancia_km(principal, centro_km) < 0.5
+        assert principal.fecha_inicio <= date(2024, 3, 18)
+        assert principal.fecha_fin >= date(2024, 3, 11)
+        assert principal.casos >= 25
+        assert principal.riesgo_relativo is not None
+        assert principal.riesgo_relativo > 5
+        assert principal.p_valor == 0.01
+        # Los secundarios no comparten ubicaciones: ninguno cae en el brote
+        assert all(c.p_valor > 0.05 for c in resultado.clusters[1:])
+
+    def test_sin_cluster_no_es_significativo(self) -> None:
+        rng = np.random.default_rng(5)
+        casos = _casos(rng, 400, 10.0, (0, 20))
+
+        resultado = escanear_clusters(*casos, _DESDE, ParametrosEscaneo(replicas=99))
+
+        assert all(c.p_valor > 0.05 for c in resultado.clusters)
+
+    def test_determinista(self) -> None:
+        rng = np.random.default_rng(9)
+        casos = _unir(
+            _casos(rng, 200, 5.0, (0, 10)),
+            _casos(rng, 15, 0.2, (4, 5)),
+        )
+        parametros = ParametrosEscaneo(replicas=19)
+
+        primero = escanear_clusters(*casos, _DESDE, parametros)
+        segundo = escanear_clusters(*casos, _DESDE, parametros)
+
+        assert [c.p_valor for c in primero.clusters] == [
+            c.p_valor for c in segundo.clusters
+        ]
+        assert [c.llr for c in primero.clusters] == [c.llr for c in segundo.clusters]
+
+    def test_clusters_sin_solapamiento(self) -> None:
+        rng = np.random.default_rng(13)
+        casos = _unir(
+            _casos(rng, 300, 10.0, (0, 20)),
+            _casos(rng, 15, 0.2, (4, 5), centro_km=(-3.0, 0.0)),
+            _casos(rng, 15, 0.2, (14, 15), centro_km=(3.0, 0.0)),
+        )
+
+        resultado = escanear_clusters(
+            *casos, _DESDE, ParametrosEscaneo(replicas=0, max_clusters=5)
+        )
+
+        assert 2 <= len(resultado.clusters) <= 5
+        llrs = [c.llr for c in resultado.clusters]
+        assert llrs == sorted(llrs, reverse=True)
+        # Sin réplicas no hay p-valor
+        assert all(c.p_valor == 1.0 for c in resultado.clusters)
+        # Los dos brotes aparecen como clusters distintos
+        for centro_km in ((-3.0, 0.0), (3.0, 0.0)):
+            assert any(_distancia_km(c, centro_km) < 0.5 for c in resultado.clusters)
+
+    def test_pocos_casos(self) -> None:
+        rng = np.random.default_rng(1)
+        resultado = escanear_clusters(
+            *_casos(rng, 2, 1.0, (0, 1)), _DESDE, ParametrosEscaneo()
+        )
+
+        assert resultado.clusters == []
+        assert resultado.casos == 2
+        assert resultado.ubicaciones == 0
+
+
+class TestProcesos:
+    """Tests de la cantidad de procesos de las réplicas."""
+
+    @pytest.mark.parametrize(
+        ("configurado", "cpus", "esperado"),
+        [(0, 8, 8), (4, 8, 4), (16, 8, 8), (0, None, 1)],
+    )
+    def test_acotado_por_cpus(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        configurado: int,
+        cpus: int | None,
+        esperado: int,
+    ) -> None:
+        monkeypatch.setattr(settings, "CLUSTERS_PROCESOS", configurado)
+        monkeypatch.setattr(scan.os, "cpu_count", lambda: cpus)
+
+        assert scan._procesos() == esperado
+
+
+def _cluster(p_valor: float) -> ClusterEspacioTemporal:
+    return ClusterEspacioTemporal(
+        latitud=_LAT,
+        longitud=_LON,
+        radio_km=0.3,
+        fecha_inicio=_DESDE,
+        fecha_fin=_DESDE,
+        casos=10,
+        casos_esperados=1.0,
+        riesgo_relativo=10.0,
+        llr=12.0,
+        p_valor=p_valor,
+        ubicaciones=3,
+    )
+
+
+class TestGeojson:
+    """Tests del filtro por p-valor de la capa GeoJSON."""
+
+    @staticmethod
+    def _geojson(
+        monkeypatch: pytest.MonkeyPatch, resultado: ResultadoEscaneo
+    ) -> dict[str, Any]:
+        monkeypatch.setattr(endpoint, "_escanear", lambda *_args: resultado)
+        return endpoint.get_clusters_espacio_temporales_geojson.__wrapped__(
+            id_enfermedad=1,
+            fecha_desde=_DESDE,
+            fecha_hasta=date(2024, 6, 30),
+            id_provincia_indec=None,
+            clasificaciones=None,
+            radio_km=1.0,
+            dias_max=28,
+            dias_periodo=7,
+            replicas=resultado.replicas,
+            p_max=0.05,
+            session=None,
+            current_user=None,
+        )
+
+    def test_filtra_por_p_valor(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        resultado = ResultadoEscaneo(
+            clusters=[_cluster(0.01), _cluster(0.2)], replicas=99
+        )
+
+        geojson = self._geojson(monkeypatch, resultado)
+
+        assert [f["properties"]["p_valor"] for f in geojson["features"]] == [0.01]
+
+    def test_sin_replicas_no_filtra(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        resultado = ResultadoEscaneo(
+            clusters=[_cluster(1.0), _cluster(1.0)], replicas=0
+        )
+
+        geojson = self._geojson(monkeypatch, resultado)
+
+        assert len(geojson["features"]) == 2
+        assert geojson["features"][0]["properties"]["radio_m"] == 300
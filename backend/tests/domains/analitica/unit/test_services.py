@@ -0,0 +1,231 @@
+"""
+Tests unitarios para ``AnalyticsService.get_datos_visualizacion``.
+
+Una sesión falsa devuelve las filas que daría PostgreSQL para el GROUPING SETS
+de agregados y para la tabla; los tests fijan la forma de la respuesta.
+"""
+
+from datetime import date
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from app.domains.analitica.schemas import (
+    CasoEpidemiologicoDentroGrupo,
+    DatosVisualizacionRequest,
+    GrupoCasoEpidemiologico,
+    GrupoCasoEpidemiologicoResponse,
+)
+from app.domains.analitica.services import AnalyticsService
+from app.domains.dashboard.age_groups_config import (
+    obtener_configuracion_grupos_edad,
+    obtener_etiquetas_grupos_edad,
+)
+
+# Máscaras de GROUPING(sexo, anio, mes, grupo_edad)
+TOTAL, SEXO, MENSUAL, EDAD = 0b1111, 0b0111, 0b1001, 0b1110
+
+
+def _agregado(conjunto: int, casos: int, ciudadanos: int, **valores: Any) -> Any:
+    campos = {"sexo": None, "anio": None, "mes": None, "grupo_edad": None}
+    return SimpleNamespace(
+        conjunto=conjunto,
+        casos=casos,
+        casos_ciudadanos=ciudadanos,
+        **(campos | valores),
+    )
+
+
+# Tres casos de ciudadanos y dos animales (sin sexo ni edad)
+AGREGADOS = [
+    _agregado(TOTAL, 5, 3),
+    _agregado(SEXO, 2, 2, sexo="FEMENINO"),
+    _agregado(SEXO, 1, 1, sexo="MASCULINO"),
+    _agregado(SEXO, 2, 0),
+    _agregado(MENSUAL, 2, 1, anio=2025, mes=3),
+    _agregado(MENSUAL, 3, 2, anio=2024, mes=11),
+    _agregado(MENSUAL, 1, 1),
+    _agregado(EDAD, 1, 1, grupo_edad="15-19"),
+    _agregado(EDAD, 4, 2, grupo_edad="Desconocido"),
+]
+
+TABLA = [
+    SimpleNamespace(
+        id=42,
+        nombre="Ana Pérez",
+        fecha_minima_caso=date(2025, 3, 4),
+        clasificacion="CONFIRMADOS",
+        provincia="Chubut",
+        localidad="Rawson",
+    ),
+    SimpleNamespace(
+        id=7,
+        nombre="",
+        fecha_minima_caso=None,
+        clasificacion=None,
+        provincia=None,
+        localidad=None,
+    ),
+]
+
+
+class _Sesion:
+    """Devuelve agregados o filas de tabla según la consulta."""
+
+    def __init__(self) -> None:
+        self.consultas: list[tuple[str, dict[str, Any]]] = []
+
+    def execute(self, query: Any, params: dict[str, Any]) -> list[Any]:
+        sql = str(query)
+        self.consultas.append((sql, params))
+        return AGREGADOS if "GROUPING SETS" in sql else TABLA
+
+
+@pytest.fixture
+def servicio(monkeypatch: pytest.MonkeyPatch) -> AnalyticsService:
+    servicio = AnalyticsService(_Sesion())  # type: ignore[arg-type]
+
+    async def grupo_detalle(grupo_id: int) -> GrupoCasoEpidemiologicoResponse:
+        return GrupoCasoEpidemiologicoResponse(
+            grupo=GrupoCasoEpidemiologico(
+                id=grupo_id,
+                nombre="Rabia",
+                tipo="simple",
+                clasificaciones_disponibles=["todos"],
+            ),
+            eventos=[
+                CasoEpidemiologicoDentroGrupo(
+                    id=3,
+                    tipo_eno_id=3,
+                    nombre="Rabia animal",
+                    grupo_id=grupo_id,
+                    grupo_nombre="Rabia",
+                )
+            ],
+            graficos_disponibles=[],
+        )
+
+    monkeypatch.setattr(servicio, "get_grupo_detalle", grupo_detalle)
+    return servicio
+
+
+def _request(tipo_grafico: str, **extra: Any) -> DatosVisualizacionRequest:
+    return DatosVisualizacionRequest(grupo_id=1, tipo_grafico=tipo_grafico, **extra)
+
+
+class TestDatosVisualizacion:
+    """Tests de la forma de los datos por tipo de gráfico."""
+
+    @pytest.mark.asyncio
+    async def test_total_cuenta_todos_los_casos(
+        self, servicio: AnalyticsService
+    ) -> None:
+        respuesta = await servicio.get_datos_visualizacion(_request("totales"))
+
+        assert respuesta.total_casos == 5
+        assert respuesta.datos == [{"categoria": "Total de casos", "valor": 5}]
+        assert respuesta.eventos == ["Rabia animal"]
+
+    @pytest.mark.asyncio
+    async def test_sexo_sin_casos_animales(self, servicio: AnalyticsService) -> None:
+        respuesta = await servicio.get_datos_visualizacion(_request("torta_sexo"))
+
+        # El grupo sin sexo solo tenía animales: no aparece como "Sin datos"
+        assert respuesta.datos == [
+            {"sexo": "FEMENINO", "casos": 2},
+            {"sexo": "MASCULINO", "casos": 1},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_edad_sin_casos_animales(self, servicio: AnalyticsService) -> None:
+        respuesta = await servicio.get_datos_visualizacion(_request("casos_por_edad"))
+
+        etiquetas = obtener_etiquetas_grupos_edad(
+            obtener_configuracion_grupos_edad("standard")
+        )
+        assert [d["rango"] for d in respuesta.datos] == [*etiquetas, "Desconocido"]
+        casos = {d["rango"]: d["casos"] for d in respuesta.datos}
+        assert casos["15-19"] == 1
+        assert casos["Desconocido"] == 2
+        assert sum(casos.values()) == 3
+
+    @pytest.mark.asyncio
+    async def test_mensual_ordenado_sin_fechas_nulas(
+        self, servicio: AnalyticsService
+    ) -> None:
+        respuesta = await servicio.get_datos_visualizacion(_request("casos_mensual"))
+
+        assert respuesta.datos == [
+            {"periodo": "2024-11", "casos": 3, "anio": 2024, "mes": 11},
+            {"periodo": "2025-03", "casos": 2, "anio": 2025, "mes": 3},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_tabla_mantiene_las_columnas(
+        self, servicio: AnalyticsService
+    ) -> None:
+        respuesta = await servicio.get_datos_visualizacion(_request("tabla"))
+
+        assert respuesta.datos == [
+            {
+                "id": 42,
+                "nombre": "Ana Pérez",
+                "fecha": "2025-03-04",
+                "clasificacion": "CONFIRMADOS",
+                "provincia": "Chubut",
+                "localidad": "Rawson",
+            },
+            {
+                "id": 7,
+                "nombre": None,
+                "fecha": None,
+                "clasificacion": None,
+                "provincia": None,
+                "localidad": None,
+            },
+        ]
+        sql_tabla = servicio.session.consultas[-1][0]  # type: ignore[attr-defined]
+        # Solo casos de ciudadanos
+        assert "\n        JOIN ciudadano c" in sql_tabla
+
+    @pytest.mark.asyncio
+    async def test_filtros(self, servicio: AnalyticsService) -> None:
+        respuesta = await servicio.get_datos_visualizacion(
+            _request(
+                "totales",
+                clasificacion="confirmados",
+                fecha_desde="2025-01-01",
+                fecha_hasta="2025-06-30",
+            )
+        )
+
+        sql, params = servicio.session.consultas[0]  # type: ignore[attr-defined]
+        assert params == {
+            "evento_ids": [3],
+            "clasificacion": "CONFIRMADOS",
+            "fecha_desde": date(2025, 1, 1),
+            "fecha_hasta": date(2025, 6, 30),
+        }
+        assert "e.clasificacion_estrategia = :clasificacion" in sql
+        assert respuesta.filtros_aplicados == {
+            "clasificacion": "confirmados",
+            "fecha_desde": "2025-01-01",
+            "fecha_hasta": "2025-06-30",
+        }
+
+
+class TestDatosVisualizacionRequest:
+    """Tests de validación del request."""
+
+    def test_age_group_config_desconocida(self) -> None:
+        with pytest.raises(ValidationError, match="Configuración desconocida"):
+            _request("casos_por_edad", parametros_extra={"age_group_config": "otra"})
+
+    def test_age_group_config_valida(self) -> None:
+        request = _request(
+            "casos_por_edad", parametros_extra={"age_group_config": "pediatric"}
+        )
+
+        assert request.parametros_extra == {"age_group_config": "pediatric"}
@@ -0,0 +1,90 @@
+"""
+Tests unitarios para la ejecución en batch de las series de un bloque.
+
+El MetricService se reemplaza por un mock: se verifica cómo el adapter arma
+el batch y cómo reparte resultados o errores entre las series.
+"""
+
+from unittest.mock import MagicMock
+
+import polars as pl
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.domains.boletines.constants import TipoBloque, TipoVisualizacion
+from app.domains.boletines.models import BoletinBloque
+from app.domains.boletines.services.adapter import (
+    BloqueQueryAdapter,
+    BoletinContexto,
+)
+from app.domains.metricas.service import MetricResult
+
+
+class TestEjecutarBloqueBatch:
+    """Tests para ``ejecutar_bloque`` con series en batch."""
+
+    def setup_method(self) -> None:
+        """Setup con session y MetricService mock."""
+        self.adapter = BloqueQueryAdapter(MagicMock())
+        self.adapter.metric_service = MagicMock()
+        self.contexto = BoletinContexto(
+            semana_actual=20, anio_actual=2025, num_semanas=4
+        )
+        self.bloque = BoletinBloque(
+            id=1,
+            seccion_id=1,
+            slug="curva-eti",
+            titulo_template="Curva",
+            tipo_bloque=TipoBloque.CURVA_EPIDEMIOLOGICA,
+            tipo_visualizacion=TipoVisualizacion.LINE_CHART,
+            metrica_codigo="casos_clinicos",
+            dimensiones=["SEMANA_EPIDEMIOLOGICA"],
+            criterios_fijos={},
+            series_config=[
+                {"slug": "eti", "label": "ETI", "tipo_evento_slug": "eti"},
+                {"slug": "neumonia", "label": "Neumonía", "tipo_evento_slug": "nac"},
+            ],
+            orden=1,
+            activo=True,
+        )
+        # Cargados desde la BD los enums llegan como Enum; al construir el
+        # modelo use_enum_values los guarda como str
+        set_committed_value(self.bloque, "tipo_bloque", TipoBloque.CURVA_EPIDEMIOLOGICA)
+        set_committed_value(
+            self.bloque, "tipo_visualizacion", TipoVisualizacion.LINE_CHART
+        )
+
+    def test_un_batch_con_una_request_por_serie(self) -> None:
+        """Todas las series van en un solo batch y cada una recibe su frame."""
+        self.adapter.metric_service.query_batch_results.return_value = (
+            [
+                MetricResult(pl.DataFrame({"semana": [19, 20], "valor": [3, 4]}), {}),
+                MetricResult(pl.DataFrame({"semana": [20], "valor": [1]}), {}),
+            ],
+            {"statements": 1},
+        )
+
+        resultado = self.adapter.ejecutar_bloque(self.bloque, self.contexto)
+
+        self.adapter.metric_service.query_batch_results.assert_called_once()
+        (requests,) = self.adapter.metric_service.query_batch_results.call_args.args
+        assert len(requests) == 2
+        assert {r.metric for r in requests} == {"casos_clinicos"}
+        assert requests[0].filters["periodo"]["semana_desde"] == 17
+        assert [s["slug"] for s in resultado.series] == ["eti", "neumonia"]
+        assert resultado.series[0]["data"] == [
+            {"semana": 19, "valor": 3},
+            {"semana": 20, "valor": 4},
+        ]
+        assert "error" not in resultado.series[1]
+
+    def test_error_del_batch_marca_todas_las_series(self) -> None:
+        """Si el batch falla, todas las series quedan vacías con el error."""
+        self.adapter.metric_service.query_batch_results.side_effect = RuntimeError(
+            "timeout"
+        )
+
+        resultado = self.adapter.ejecutar_bloque(self.bloque, self.contexto)
+
+        assert [s["slug"] for s in resultado.series] == ["eti", "neumonia"]
+        assert all(s["data"] == [] for s in resultado.series)
+        assert all(s["error"] == "timeout" for s in resultado.series)
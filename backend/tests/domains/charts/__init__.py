@@ -0,0 +1 @@
+"""Tests para el módulo de charts."""
@@ -0,0 +1 @@
+"""Tests unitarios para charts."""
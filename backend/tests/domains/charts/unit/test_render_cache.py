@@ -0,0 +1,437 @@
+"""
+Tests unitarios para las cachés del renderer de charts.
+
+El mapa se arma parseando los paths del SVG de Chubut (sin svglib/renderPM):
+se prueba el parser, la caché de capas base por (dpi, tamaño) con su
+desalojo, el pool de figuras por clave y que el render con caché y pool da
+los mismos píxeles que sin ellos.
+"""
+
+import io
+from pathlib import Path as FsPath
+from typing import Any
+
+import numpy as np
+import pytest
+from matplotlib.path import Path
+from PIL import Image
+
+from app.core.slug import generar_slug
+from app.domains.charts.schemas import (
+    ConfiguracionGraficoBarra,
+    ConfiguracionGraficoMapa,
+    ConjuntoDatos,
+    DatosDepartamentoMapa,
+    DatosGraficoBarra,
+    DatosGraficoBase,
+    DatosGraficoMapa,
+    EspecificacionGraficoUniversal,
+    WrapperConfiguracionGraficoBarra,
+    WrapperConfiguracionGraficoMapa,
+    WrapperDatosGraficoMapa,
+)
+from app.domains.charts.services import render_cache, renderer
+from app.domains.charts.services.render_cache import (
+    SVG_CHUBUT,
+    FigurePool,
+    MapaChubut,
+    parsear_path_svg,
+)
+from app.domains.charts.services.renderer import (
+    ANCHO_MAPA,
+    COLOR_SIN_DATOS_MAPA,
+    COLOR_TASA_CERO_MAPA,
+    ChartRenderer,
+)
+
+# Dos departamentos cuadrados; "norte" tiene además un nombre como contorno
+SVG_MINIMO = """<svg viewBox="0 0 100 50" xmlns="http://www.w3.org/2000/svg">
+  <g id="provincia">
+    <g id="norte">
+      <path d="M10 10H40V40H10Z"/>
+      <path d="M20 20h10v5h-10z"/>
+    </g>
+    <g id="sur"><path d="M60 10L90 10L90 40L60 40Z"/></g>
+  </g>
+</svg>
+"""
+
+DPI = 20
+
+
+@pytest.fixture
+def svg_minimo(tmp_path: FsPath) -> FsPath:
+    path = tmp_path / "mapa.svg"
+    path.write_text(SVG_MINIMO)
+    return path
+
+
+def _departamento(nombre: str, casos: int, tasa: float) -> DatosDepartamentoMapa:
+    return DatosDepartamentoMapa(
+        codigo_indec=1,
+        nombre=nombre,
+        zona_ugd="Zona Norte",
+        poblacion=10_000,
+        casos=casos,
+        tasa_incidencia=tasa,
+    )
+
+
+def _spec_mapa(departamentos: list[DatosDepartamentoMapa]) -> Any:
+    return EspecificacionGraficoUniversal(
+        id="mapa",
+        titulo="Casos por departamento",
+        tipo="mapa",
+        datos=WrapperDatosGraficoMapa(
+            datos=DatosGraficoMapa(
+                departamentos=departamentos,
+                total_casos=sum(d.casos for d in departamentos),
+            )
+        ),
+        configuracion=WrapperConfiguracionGraficoMapa(
+            configuracion=ConfiguracionGraficoMapa()
+        ),
+    )
+
+
+def _spec_barra(valores: list[float]) -> Any:
+    return EspecificacionGraficoUniversal(
+        id="barra",
+        titulo="Casos por semana",
+        tipo="bar",
+        datos=DatosGraficoBarra(
+            datos=DatosGraficoBase(
+                etiquetas=[f"SE {i}" for i in range(1, len(valores) + 1)],
+                conjuntos_datos=[ConjuntoDatos(etiqueta="Casos", datos=valores)],
+            )
+        ),
+        configuracion=WrapperConfiguracionGraficoBarra(
+            configuracion=ConfiguracionGraficoBarra()
+        ),
+    )
+
+
+def _pixeles(png: bytes) -> np.ndarray:
+    return np.asarray(Image.open(io.BytesIO(png)))
+
+
+class TestParsearPathSvg:
+    """Tests del parser de paths SVG a paths de matplotlib."""
+
+    def test_comandos_absolutos(self) -> None:
+        path = parsear_path_svg("M10 10H40V40L10 40Z")
+
+        assert path.vertices.tolist() == [
+            [10, 10],
+            [40, 10],
+            [40, 40],
+            [10, 40],
+            [10, 10],
+        ]
+        assert path.codes.tolist() == [
+            Path.MOVETO,
+            Path.LINETO,
+            Path.LINETO,
+            Path.LINETO,
+            Path.CLOSEPOLY,
+        ]
+
+    def test_relativos_y_line_to_implicito(self) -> None:
+        # Los pares que siguen a un "m" son "l" relativos al punto anterior
+        path = parsear_path_svg("m5 5 10 0v10h-10z")
+
+        assert path.vertices.tolist() == [
+            [5, 5],
+            [15, 5],
+            [15, 15],
+            [5, 15],
+            [5, 5],
+        ]
+        assert path.codes[1] == Path.LINETO
+
+    def test_curvas_y_numeros_compactos(self) -> None:
+        path = parsear_path_svg("M0 0C1.5-2 .5 3e1 4 5c1 1 2 2 3 3")
+
+        assert path.vertices.tolist() == [
+            [0, 0],
+            [1.5, -2],
+            [0.5, 30],
+            [4, 5],
+            [5, 6],
+            [6, 7],
+            [7, 8],
+        ]
+        assert path.codes.tolist() == [Path.MOVETO] + [Path.CURVE4] * 6
+
+    def test_varios_subpaths_cierran_en_su_inicio(self) -> None:
+        path = parsear_path_svg("M0 0H2V2ZM5 5H7V7Z")
+
+        cierres = path.vertices[path.codes == Path.CLOSEPOLY].tolist()
+        assert cierres == [[0, 0], [5, 5]]
+
+    def test_comando_no_soportado(self) -> None:
+        with pytest.raises(ValueError, match="no soportado"):
+            parsear_path_svg("M0 0A5 5 0 0 1 10 10")
+
+
+class TestMapaChubut:
+    """Tests del SVG parseado y de la caché de capas base."""
+
+    def test_departamentos_y_etiquetas(self, svg_minimo: FsPath) -> None:
+        mapa = MapaChubut(svg_minimo)
+
+        assert (mapa.ancho, mapa.alto, mapa.aspecto) == (100, 50, 0.5)
+        # El grupo contenedor no tiene paths propios: no es un departamento
+        assert list(mapa.departamentos) == ["norte", "sur"]
+        norte, sur = mapa.departamentos["norte"], mapa.departamentos["sur"]
+        # Con nombre: centro inferior del nombre; sin nombre: centro del polígono
+        assert norte.posicion_etiqueta == (25, 25)
+        assert sur.posicion_etiqueta == (75, 25)
+
+    def test_svg_de_chubut(self) -> None:
+        mapa = MapaChubut(SVG_CHUBUT)
+
+        assert len(mapa.departamentos) == 15
+        # Los ids del SVG coinciden con el slug de los nombres de la base
+        assert {"rawson", "paso-de-indios", "rio-senguer"} <= set(mapa.departamentos)
+        assert generar_slug("Río Senguer") == "rio-senguer"
+        for departamento in mapa.departamentos.values():
+            extents = departamento.poligono.get_extents()
+            assert 0 <= extents.x0 < extents.x1 <= mapa.ancho
+            assert 0 <= extents.y0 < extents.y1 <= mapa.alto
+
+    def test_capa_base_cacheada_por_clave(
+        self, svg_minimo: FsPath, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        mapa = MapaChubut(svg_minimo)
+        rasterizaciones: list[tuple[int, int, int]] = []
+        rasterizar = mapa._rasterizar_base
+
+        def contar(dpi: int, ancho_px: int, alto_px: int) -> np.ndarray:
+            rasterizaciones.append((dpi, ancho_px, alto_px))
+            return rasterizar(dpi, ancho_px, alto_px)
+
+        monkeypatch.setattr(mapa, "_rasterizar_base", contar)
+
+        primera = mapa.capa_base(DPI, 200, 100)
+        assert mapa.capa_base(DPI, 200, 100) is primera
+        assert mapa.capa_base(DPI * 2, 200, 100) is not primera
+        assert mapa.capa_base(DPI, 200, 101) is not primera
+        assert rasterizaciones == [
+            (DPI, 200, 100),
+            (DPI * 2, 200, 100),
+            (DPI, 200, 101),
+        ]
+        assert primera.alto == 100
+
+    def test_capa_base_desaloja_la_menos_usada(
+        self, svg_minimo: FsPath, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(render_cache, "MAX_MAPAS_BASE", 2)
+        mapa = MapaChubut(svg_minimo)
+
+        a = mapa.capa_base(DPI, 100, 50)
+        b = mapa.capa_base(DPI, 120, 60)
+        # Usar "a" la vuelve la más reciente: se desaloja "b"
+        assert mapa.capa_base(DPI, 100, 50) is a
+        mapa.capa_base(DPI, 140, 70)
+
+        assert list(mapa._capas) == [(DPI, 100, 50), (DPI, 140, 70)]
+        assert mapa.capa_base(DPI, 100, 50) is a
+        assert mapa.capa_base(DPI, 120, 60) is not b
+
+    def test_aplicar_capa_base(self, svg_minimo: FsPath) -> None:
+        mapa = MapaChubut(svg_minimo)
+        capa = mapa.capa_base(DPI, 200, 100)
+        # Imagen más alta que el mapa: la capa va a la esquina inferior izquierda
+        imagen = np.full((130, 220, 4), 255, dtype=np.uint8)
+
+        mapa.aplicar_capa_base(imagen, DPI, 200, 100)
+
+        filas, columnas = np.nonzero((imagen[..., :3] != 255).any(axis=2))
+        assert len(filas) > 0
+        assert filas.min() >= 30
+        assert columnas.max() < 200
+        # Solo se tocan los píxeles no transparentes de la capa
+        assert len(filas) <= len(capa.filas)
+        # El alpha de la imagen no cambia
+        assert (imagen[..., 3] == 255).all()
+
+
+class TestFigurePool:
+    """Tests de las claves y la reutilización del pool de figuras."""
+
+    def test_reutiliza_por_clave_redondeada(self) -> None:
+        pool = FigurePool()
+        fig, ax = pool.obtener(8.0, 5.0, DPI)
+        ax.plot([1, 2], [3, 4])
+        ax.set_title("anterior")
+        pool.devolver(fig, ax)
+
+        # Diferencias por debajo del redondeo usan la misma figura
+        fig_2, ax_2 = pool.obtener(8.0001, 5.0, DPI)
+
+        assert fig_2 is fig
+        assert ax_2 is ax
+        assert not ax_2.lines
+        assert ax_2.get_title() == ""
+
+    @pytest.mark.parametrize(
+        "clave",
+        [
+            (8.01, 5.0, DPI, None),
+            (8.0, 5.0, DPI + 1, None),
+            (8.0, 5.0, DPI, (0, 0, 1, 0.9)),
+        ],
+    )
+    def test_claves_distintas_no_comparten(self, clave: tuple[Any, ...]) -> None:
+        pool = FigurePool()
+        fig, ax = pool.obtener(8.0, 5.0, DPI)
+        pool.devolver(fig, ax)
+
+        assert pool.obtener(*clave)[0] is not fig
+        # La figura devuelta sigue disponible para su clave
+        assert pool.obtener(8.0, 5.0, DPI)[0] is fig
+
+    def test_figura_en_uso_no_se_entrega_dos_veces(self) -> None:
+        pool = FigurePool()
+
+        fig_1, _ = pool.obtener(8.0, 5.0, DPI)
+        fig_2, _ = pool.obtener(8.0, 5.0, DPI)
+
+        assert fig_1 is not fig_2
+
+    def test_ignora_figuras_ajenas(self) -> None:
+        pool = FigurePool()
+        fig, ax = render_cache.crear_figura(8.0, 5.0, DPI)
+
+        pool.devolver(fig, ax)
+
+        assert pool.obtener(8.0, 5.0, DPI)[0] is not fig
+
+    def test_limite_por_clave(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(render_cache, "MAX_FIGURAS_POR_CLAVE", 2)
+        pool = FigurePool()
+        figuras = [pool.obtener(8.0, 5.0, DPI) for _ in range(3)]
+        for fig, ax in figuras:
+            pool.devolver(fig, ax)
+
+        assert [len(libres) for libres in pool._libres.values()] == [2]
+
+    def test_desaloja_la_clave_menos_usada(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(render_cache, "MAX_CLAVES_POOL", 2)
+        pool = FigurePool()
+        a = pool.obtener(4.0, 3.0, DPI)
+        b = pool.obtener(5.0, 3.0, DPI)
+        c = pool.obtener(6.0, 3.0, DPI)
+
+        pool.devolver(*a)
+        pool.devolver(*b)
+        pool.devolver(*c)
+
+        assert list(pool._libres) == [(5.0, 3.0, DPI, None), (6.0, 3.0, DPI, None)]
+        assert pool.obtener(4.0, 3.0, DPI)[0] is not a[0]
+
+
+class TestRenderizarMapa:
+    """Tests del render del mapa con la capa base cacheada."""
+
+    @pytest.fixture(autouse=True)
+    def mapa_minimo(
+        self, svg_minimo: FsPath, monkeypatch: pytest.MonkeyPatch
+    ) -> MapaChubut:
+        mapa = MapaChubut(svg_minimo)
+        monkeypatch.setattr(renderer, "mapa_chubut", lambda: mapa)
+        return mapa
+
+    def test_png_del_tamano_del_mapa(self) -> None:
+        png = ChartRenderer().renderizar_a_bytes(
+            _spec_mapa([_departamento("Norte", 3, 12.5)]), dpi=DPI
+        )
+
+        imagen = Image.open(io.BytesIO(png))
+        assert imagen.format == "PNG"
+        # Ancho fijo; alto del mapa (aspecto del viewBox) más el margen del título
+        assert imagen.width == round(ANCHO_MAPA * DPI)
+        assert imagen.height == round((ANCHO_MAPA * 0.5 + 0.6) * DPI)
+
+    def test_relleno_y_bordes(self) -> None:
+        png = ChartRenderer().renderizar_a_bytes(
+            _spec_mapa([_departamento("Sur", 120, 75)]), dpi=DPI
+        )
+
+        pixeles = _pixeles(png)
+        margen = pixeles.shape[0] - round(ANCHO_MAPA * 0.5 * DPI)
+        escala = ANCHO_MAPA * DPI / 100
+
+        def pixel(x: float, y: float) -> str:
+            r, g, b = pixeles[margen + round(y * escala), round(x * escala), :3]
+            return f"#{r:02x}{g:02x}{b:02x}"
+
+        # Interior de cada departamento: color por tasa o "sin datos"
+        assert pixel(75, 20) == "#cb181d"
+        assert pixel(15, 15) == COLOR_SIN_DATOS_MAPA
+        # Borde de la capa base compuesto encima del relleno
+        assert pixel(60, 20) not in {"#cb181d", "#ffffff"}
+
+    def test_capa_base_una_vez_por_tamano(self, mapa_minimo: MapaChubut) -> None:
+        chart_renderer = ChartRenderer()
+        spec = _spec_mapa([_departamento("Sur", 0, 0)])
+
+        chart_renderer.renderizar_a_bytes(spec, dpi=DPI)
+        capa = next(iter(mapa_minimo._capas.values()))
+        chart_renderer.renderizar_a_bytes(spec, dpi=DPI)
+        chart_renderer.renderizar_a_bytes(spec, dpi=DPI * 2)
+
+        assert list(mapa_minimo._capas) == [
+            (DPI, round(ANCHO_MAPA * DPI), round(ANCHO_MAPA * 0.5 * DPI)),
+            (DPI * 2, round(ANCHO_MAPA * DPI * 2), round(ANCHO_MAPA * DPI)),
+        ]
+        assert next(iter(mapa_minimo._capas.values())) is capa
+
+    def test_pool_no_cambia_los_pixeles(self) -> None:
+        specs = [
+            _spec_mapa([_departamento("Norte", 3, 12.5)]),
+            _spec_barra([1, 4, 2]),
+            _spec_mapa([_departamento("Sur", 120, 75)]),
+            _spec_barra([5, 0, 3, 8]),
+        ]
+        con_pool = ChartRenderer()
+        sin_pool = ChartRenderer(reutilizar_figuras=False)
+
+        for spec in specs + specs:
+            np.testing.assert_array_equal(
+                _pixeles(con_pool.renderizar_a_bytes(spec, dpi=DPI)),
+                _pixeles(sin_pool.renderizar_a_bytes(spec, dpi=DPI)),
+            )
+
+    def test_placeholder_si_el_svg_falla(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def fallar() -> MapaChubut:
+            raise FileNotFoundError("chubut.svg")
+
+        monkeypatch.setattr(renderer, "mapa_chubut", fallar)
+
+        png = ChartRenderer().renderizar_a_bytes(
+            _spec_mapa([_departamento("Norte", 3, 12.5)]), dpi=DPI
+        )
+
+        assert Image.open(io.BytesIO(png)).format == "PNG"
+
+    @pytest.mark.parametrize(
+        ("tasa", "color"),
+        [
+            (0, COLOR_TASA_CERO_MAPA),
+            (0.5, "#fee0d2"),
+            (1, "#fcbba1"),
+            (19.99, "#fb6a4a"),
+            (50, "#cb181d"),
+            (1_000, "#cb181d"),
+        ],
+    )
+    def test_color_por_tasa(self, tasa: float, color: str) -> None:
+        assert ChartRenderer._color_tasa_mapa(_departamento("X", 1, tasa)) == color
+
+    def test_color_sin_datos(self) -> None:
+        assert ChartRenderer._color_tasa_mapa(None) == COLOR_SIN_DATOS_MAPA
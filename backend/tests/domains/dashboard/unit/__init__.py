@@ -0,0 +1 @@
+"""Tests unitarios del dominio de dashboard."""
@@ -0,0 +1,101 @@
+"""
+Tests unitarios para la pirámide poblacional del dashboard.
+
+La consulta de casos se mockea; la población sale de una tabla sintética.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import polars as pl
+import pytest
+
+from app.core.static_data.salud import POBLACIONES_ESTANDAR
+from app.domains.dashboard.processors import ChartDataProcessor
+from app.domains.territorio.services import poblacion_service
+from app.domains.territorio.services.poblacion_service import TablaPoblacion
+
+# (grupo_edad, sexo, casos) como los devuelve la consulta
+_FILAS = [
+    ("0-4", "MASCULINO", 6),
+    ("0-4", "FEMENINO", 3),
+    ("0-4", "NO_ESPECIFICADO", 1),
+    ("80+", "FEMENINO", 10),
+    ("Desconocido", "MASCULINO", 4),
+]
+
+
+def _processor(filas: list[tuple[str, str, int]]) -> ChartDataProcessor:
+    resultado = MagicMock()
+    resultado.fetchall.return_value = filas
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=resultado)
+    return ChartDataProcessor(db)
+
+
+def _tabla(por_edad: bool) -> TablaPoblacion:
+    filas: list[tuple[int, int, str, str, int, float]] = [
+        (26, 7, "T", "total", 2024, 161_000.0)
+    ]
+    if por_edad:
+        filas += [
+            (26, 7, "T", grupo, 2024, 1_000.0 if grupo == "80+" else 10_000.0)
+            for grupo in POBLACIONES_ESTANDAR["OMS_2000"]
+        ]
+    return TablaPoblacion(
+        pl.DataFrame(filas, schema=poblacion_service._ESQUEMA, orient="row"), "v1"
+    )
+
+
+@pytest.fixture
+def usar_tabla(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    obtener = AsyncMock()
+    monkeypatch.setattr(poblacion_service, "obtener_poblacion", obtener)
+    return obtener
+
+
+class TestPiramidePoblacional:
+    """Tests de la tasa ajustada por edad de la pirámide."""
+
+    @pytest.mark.asyncio
+    async def test_tasa_ajustada(self, usar_tabla: AsyncMock) -> None:
+        usar_tabla.return_value = _tabla(por_edad=True)
+
+        resultado = await _processor(_FILAS).procesar_piramide_poblacional(
+            {"provincia_id": 26, "fecha_hasta": "2024-06-30"}
+        )
+
+        estandar = POBLACIONES_ESTANDAR["OMS_2000"]
+        # Los casos de sexo no especificado cuentan para la tasa
+        esperada = (
+            (10 / 10_000 * estandar["0-4"] + 10 / 1_000 * estandar["80+"])
+            / sum(estandar.values())
+            * 100_000
+        )
+        metadata = resultado["metadata"]
+        assert metadata["total_casos"] == 19
+        assert metadata["tasa_ajustada"] == pytest.approx(round(esperada, 2))
+
+    @pytest.mark.asyncio
+    async def test_sin_poblacion_por_edad(self, usar_tabla: AsyncMock) -> None:
+        usar_tabla.return_value = _tabla(por_edad=False)
+
+        resultado = await _processor(_FILAS).procesar_piramide_poblacional({})
+
+        assert resultado["metadata"]["tasa_ajustada"] is None
+
+    @pytest.mark.asyncio
+    async def test_sin_casos(self, usar_tabla: AsyncMock) -> None:
+        usar_tabla.return_value = _tabla(por_edad=True)
+
+        resultado = await _processor([]).procesar_piramide_poblacional({})
+
+        assert resultado["metadata"]["tasa_ajustada"] == 0
+
+    @pytest.mark.asyncio
+    async def test_otros_grupos_no_ajustan(self, usar_tabla: AsyncMock) -> None:
+        resultado = await _processor(_FILAS).procesar_piramide_poblacional(
+            {"age_group_config": "decennial"}
+        )
+
+        assert resultado["metadata"]["tasa_ajustada"] is None
+        usar_tabla.assert_not_awaited()
@@ -0,0 +1 @@
+"""Tests del motor de métricas."""
@@ -0,0 +1 @@
+"""Tests unitarios del motor de métricas."""
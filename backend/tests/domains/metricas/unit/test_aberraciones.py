@@ -0,0 +1,248 @@
+"""
+Tests unitarios de los métodos de detección de aberraciones.
+
+EARS y CUSUM se comparan contra cálculos a mano; el IRLS en lote de
+Farrington contra un Newton-Raphson de referencia celda por celda.
+"""
+
+import numpy as np
+import pytest
+
+from app.domains.metricas.aberraciones import (
+    CUSUM_H,
+    CUSUM_K,
+    METODOS,
+    SIGMA_MIN,
+    UMBRAL_C1_C2,
+    UMBRAL_C3,
+    _irls,
+    cusum,
+    ears,
+    farrington,
+)
+
+# Primera semana que Farrington puede evaluar con 5 años de base y ventana 3
+PRIMERA_FARRINGTON = 5 * 52 + 3
+
+
+def _newton_poisson(y: np.ndarray, diseno: np.ndarray, pesos: np.ndarray) -> np.ndarray:
+    """Ajuste Poisson ponderado de una celda, con Newton-Raphson clásico."""
+    beta = np.zeros(diseno.shape[1])
+    beta[0] = np.log(y.mean() + 0.5)
+    for _ in range(100):
+        mu = np.exp(diseno @ beta)
+        gradiente = diseno.T @ (pesos * (y - mu))
+        hessiano = diseno.T @ (diseno * (pesos * mu)[:, None])
+        paso = np.linalg.solve(hessiano, gradiente)
+        beta += paso
+        if np.abs(paso).max() < 1e-12:
+            break
+    return beta
+
+
+class TestEars:
+    """Tests de EARS C1, C2 y C3."""
+
+    def test_valores_a_mano(self) -> None:
+        rng = np.random.default_rng(0)
+        conteos = rng.poisson(4.0, (2, 20)).astype(np.float64)
+
+        c1, c2, c3 = ears(conteos)
+
+        for s in range(2):
+            for t in range(7, 20):
+                base = conteos[s, t - 7 : t]
+                sigma = max(base.std(ddof=1), SIGMA_MIN)
+                assert c1[s, t] == pytest.approx((conteos[s, t] - base.mean()) / sigma)
+            for t in range(9, 20):
+                base = conteos[s, t - 9 : t - 2]
+                sigma = max(base.std(ddof=1), SIGMA_MIN)
+                assert c2[s, t] == pytest.approx((conteos[s, t] - base.mean()) / sigma)
+            for t in range(11, 20):
+                excesos = [max(c2[s, u] - 1.0, 0.0) for u in (t, t - 1, t - 2)]
+                assert c3[s, t] == pytest.approx(sum(excesos))
+
+    def test_nan_sin_base(self) -> None:
+        conteos = np.ones((1, 15))
+
+        c1, c2, c3 = ears(conteos)
+
+        assert np.isnan(c1[0, :7]).all() and not np.isnan(c1[0, 7:]).any()
+        assert np.isnan(c2[0, :9]).all() and not np.isnan(c2[0, 9:]).any()
+        assert np.isnan(c3[0, :11]).all() and not np.isnan(c3[0, 11:]).any()
+
+    def test_serie_corta(self) -> None:
+        c1, c2, c3 = ears(np.ones((3, 7)))
+
+        assert c1.shape == (3, 7)
+        assert np.isnan(c1).all() and np.isnan(c2).all() and np.isnan(c3).all()
+
+    def test_piso_del_desvio(self) -> None:
+        conteos = np.full((1, 10), 2.0)
+        conteos[0, -1] = 5.0
+
+        c1, c2, _ = ears(conteos)
+
+        assert c1[0, -1] == pytest.approx(3.0 / SIGMA_MIN)
+        assert c2[0, -1] == pytest.approx(3.0 / SIGMA_MIN)
+
+    def test_senal_por_umbral(self) -> None:
+        conteos = np.full((1, 12), 2.0)
+        conteos[0, -1] = 2.0 + UMBRAL_C1_C2 * SIGMA_MIN + 0.1
+
+        resultado = METODOS["ears_c1"](conteos)
+
+        assert resultado.senal[0, -1]
+        assert not resultado.senal[0, :-1].any()
+        assert (resultado.umbral == UMBRAL_C1_C2).all()
+        assert (METODOS["ears_c3"](conteos).umbral == UMBRAL_C3).all()
+
+
+class TestCusum:
+    """Tests del CUSUM unilateral."""
+
+    def test_recursion(self) -> None:
+        desvios = np.array([[1.0, 2.0, -3.0, 0.5, 4.0]])
+
+        resultado = cusum(desvios)
+
+        esperado, acumulado = [], 0.0
+        for z in desvios[0]:
+            acumulado = max(0.0, acumulado + z - CUSUM_K)
+            esperado.append(acumulado)
+        np.testing.assert_allclose(resultado[0], esperado)
+
+    def test_nan_no_acumula(self) -> None:
+        resultado = cusum(np.array([[2.0, np.nan, 2.0]]))
+
+        np.testing.assert_allclose(resultado[0], [1.5, 1.5, 3.0])
+
+    def test_inicial(self) -> None:
+        inicial = np.array([3.0, 0.0])
+
+        resultado = cusum(np.array([[0.0], [0.0]]), inicial=inicial)
+
+        np.testing.assert_allclose(resultado[:, 0], [2.5, 0.0])
+        # No modifica el acumulado recibido
+        np.testing.assert_allclose(inicial, [3.0, 0.0])
+
+    def test_senal_sobre_h(self) -> None:
+        conteos = np.full((1, 14), 2.0)
+        conteos[0, 9:] = 4.0
+
+        resultado = METODOS["cusum"](conteos)
+
+        assert np.isnan(resultado.estadistico[0, :9]).all()
+        assert resultado.senal[0, 9:].any()
+        np.testing.assert_array_equal(resultado.senal, resultado.estadistico > CUSUM_H)
+
+
+class TestIrls:
+    """Tests del ajuste Poisson en lote contra la referencia por celda."""
+
+    def test_contra_newton(self) -> None:
+        rng = np.random.default_rng(1)
+        tiempo = np.linspace(-1.0, 1.0, 15)
+        diseno = np.column_stack([np.ones_like(tiempo), tiempo])
+        y = rng.poisson(rng.uniform(1.0, 20.0, (30, 1)), (30, 15)).astype(np.float64)
+        pesos = rng.uniform(0.2, 1.5, (30, 15))
+
+        beta, mu, inversa = _irls(y, diseno, pesos)
+
+        for celda in range(30):
+            referencia = _newton_poisson(y[celda], diseno, pesos[celda])
+            np.testing.assert_allclose(beta[celda], referencia, rtol=1e-5, atol=1e-6)
+            np.testing.assert_allclose(
+                mu[celda], np.exp(diseno @ referencia), rtol=1e-5
+            )
+            hessiano = diseno.T @ (diseno * (pesos[celda] * mu[celda])[:, None])
+            np.testing.assert_allclose(
+                inversa[celda], np.linalg.inv(hessiano), rtol=1e-5
+            )
+
+    def test_solo_intercepto(self) -> None:
+        diseno = np.ones((4, 1))
+        y = np.array([[1.0, 2.0, 3.0, 6.0]])
+        pesos = np.array([[1.0, 1.0, 1.0, 0.5]])
+
+        beta, mu, inversa = _irls(y, diseno, pesos)
+
+        media = (pesos * y).sum() / pesos.sum()
+        assert beta[0, 0] == pytest.approx(np.log(media))
+        np.testing.assert_allclose(mu[0], media)
+        assert inversa[0, 0, 0] == pytest.approx(1.0 / (pesos.sum() * media))
+
+    def test_base_en_cero(self) -> None:
+        tiempo = np.linspace(-1.0, 1.0, 6)
+        diseno = np.column_stack([np.ones_like(tiempo), tiempo])
+        y = np.array([[0.0] * 6, [1.0, 2.0, 1.0, 3.0, 2.0, 2.0]])
+
+        beta, mu, _ = _irls(y, diseno, np.ones_like(y))
+
+        assert beta[0, 0] == -20.0 and beta[0, 1] == 0.0
+        assert (mu[0] < 1e-8).all()
+        np.testing.assert_allclose(
+            beta[1], _newton_poisson(y[1], diseno, np.ones(6)), atol=1e-6
+        )
+
+
+class TestFarrington:
+    """Tests del Farrington flexible."""
+
+    @staticmethod
+    def _conteos(semanas: int, semilla: int = 0) -> np.ndarray:
+        rng = np.random.default_rng(semilla)
+        return rng.poisson(10.0, (2, semanas)).astype(np.float64)
+
+    def test_nan_sin_historia(self) -> None:
+        resultado = farrington(self._conteos(PRIMERA_FARRINGTON + 5))
+
+        assert np.isnan(resultado.esperado[:, :PRIMERA_FARRINGTON]).all()
+        assert not np.isnan(resultado.esperado[:, PRIMERA_FARRINGTON:]).any()
+        assert not resultado.senal[:, :PRIMERA_FARRINGTON].any()
+
+    def test_historia_insuficiente(self) -> None:
+        resultado = farrington(self._conteos(PRIMERA_FARRINGTON))
+
+        assert np.isnan(resultado.umbral).all()
+        assert not resultado.senal.any()
+
+    def test_serie_plana_sin_senal(self) -> None:
+        conteos = np.full((1, PRIMERA_FARRINGTON + 10), 8.0)
+
+        resultado = farrington(conteos)
+
+        evaluadas = slice(PRIMERA_FARRINGTON, None)
+        np.testing.assert_allclose(resultado.esperado[0, evaluadas], 8.0)
+        assert (resultado.umbral[0, evaluadas] > 8.0).all()
+        assert not resultado.senal.any()
+
+    def test_pico_da_senal(self) -> None:
+        conteos = self._conteos(PRIMERA_FARRINGTON + 10)
+        conteos[1, -1] = 60.0
+
+        resultado = farrington(conteos)
+
+        assert resultado.senal[1, -1]
+        assert resultado.estadistico[1, -1] > 1.0
+        assert not resultado.senal[0, -1]
+
+    def test_min_casos_4_semanas(self) -> None:
+        conteos = np.zeros((1, PRIMERA_FARRINGTON + 1))
+        conteos[0, -1] = 4.0
+
+        con_minimo = farrington(conteos)
+        sin_minimo = farrington(conteos, min_casos_4_semanas=0)
+
+        # Sin casos en la base el umbral es ~0: solo el mínimo evita la señal
+        assert sin_minimo.senal[0, -1]
+        assert not con_minimo.senal[0, -1]
+
+    def test_metodo_uniforme(self) -> None:
+        conteos = self._conteos(PRIMERA_FARRINGTON + 3)
+
+        resultado = METODOS["farrington"](conteos)
+
+        directo = farrington(conteos)
+        np.testing.assert_array_equal(resultado.senal, directo.senal)
+        np.testing.assert_allclose(resultado.umbral, directo.umbral)
@@ -0,0 +1,139 @@
+"""
+Tests unitarios para el formato columnar del Metric Engine.
+
+Cubren la conversión de filas del cursor a Arrow, la serialización (IPC y
+Parquet) y la negociación del formato por header ``Accept``.
+"""
+
+import io
+import json
+from decimal import Decimal
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from app.api.v1.metricas.router import _negociar_formato
+from app.domains.metricas.arrow import (
+    MEDIA_TYPE_ARROW_STREAM,
+    MEDIA_TYPE_PARQUET,
+    METADATA_KEY,
+    rows_to_arrow,
+    to_ipc_stream,
+    to_parquet,
+    with_metadata,
+)
+
+
+class TestRowsToArrow:
+    """Tests para la tabla Arrow armada desde las tuplas del cursor."""
+
+    def test_decimal_entero_pasa_a_int64(self) -> None:
+        """SUM de enteros llega como NUMERIC sin decimales: int64."""
+        tabla = rows_to_arrow(["valor"], [(Decimal("3"),), (Decimal("40"),)])
+
+        assert tabla.schema.field("valor").type == pa.int64()
+        assert tabla["valor"].to_pylist() == [3, 40]
+
+    def test_decimal_con_escala_pasa_a_float64(self) -> None:
+        """AVG llega como NUMERIC con decimales: float64."""
+        tabla = rows_to_arrow(["valor"], [(Decimal("2.50"),), (Decimal("1.25"),)])
+
+        assert tabla.schema.field("valor").type == pa.float64()
+        assert tabla["valor"].to_pylist() == [2.5, 1.25]
+
+    def test_nulos_y_columnas_no_numericas(self) -> None:
+        """Los NULL se conservan y los textos quedan como string."""
+        tabla = rows_to_arrow(
+            ["semana", "evento", "valor"],
+            [(1, "Dengue", Decimal("5")), (2, None, None)],
+        )
+
+        assert tabla.column_names == ["semana", "evento", "valor"]
+        assert tabla.schema.field("evento").type == pa.string()
+        assert tabla["valor"].type == pa.int64()
+        assert tabla.to_pylist()[1] == {"semana": 2, "evento": None, "valor": None}
+
+    def test_sin_filas_conserva_las_columnas(self) -> None:
+        """Un resultado vacío mantiene los nombres de columna."""
+        tabla = rows_to_arrow(["semana", "valor"], [])
+
+        assert tabla.num_rows == 0
+        assert tabla.column_names == ["semana", "valor"]
+
+
+class TestSerializacion:
+    """Tests para IPC stream y Parquet con la metadata del resultado."""
+
+    def setup_method(self) -> None:
+        tabla = rows_to_arrow(["semana", "valor"], [(1, Decimal("3")), (2, None)])
+        self.tabla = with_metadata(tabla, {"metric": "casos", "total": 3})
+
+    def test_ipc_stream_round_trip(self) -> None:
+        """El stream IPC se lee con la misma tabla y metadata."""
+        leida = pa.ipc.open_stream(to_ipc_stream(self.tabla)).read_all()
+
+        assert leida.equals(self.tabla)
+        assert json.loads(leida.schema.metadata[METADATA_KEY]) == {
+            "metric": "casos",
+            "total": 3,
+        }
+
+    def test_parquet_round_trip(self) -> None:
+        """El Parquet conserva filas y metadata."""
+        leida = pq.read_table(io.BytesIO(to_parquet(self.tabla)))
+
+        assert leida.to_pylist() == self.tabla.to_pylist()
+        assert json.loads(leida.schema.metadata[METADATA_KEY])["metric"] == "casos"
+
+
+class TestNegociarFormato:
+    """Tests para la elección de formato según el header Accept."""
+
+    @pytest.mark.parametrize(
+        ("accept", "esperado"),
+        [
+            (None, "application/json"),
+            ("", "application/json"),
+            ("*/*", "application/json"),
+            ("text/html", "application/json"),
+            ("application/json", "application/json"),
+            (MEDIA_TYPE_ARROW_STREAM, MEDIA_TYPE_ARROW_STREAM),
+            (MEDIA_TYPE_PARQUET, MEDIA_TYPE_PARQUET),
+            ("application/x-parquet", MEDIA_TYPE_PARQUET),
+            ("Application/Vnd.Apache.Arrow.Stream", MEDIA_TYPE_ARROW_STREAM),
+        ],
+    )
+    def test_tipo_unico(self, accept: str | None, esperado: str) -> None:
+        """Un solo tipo elige ese formato; lo no soportado cae a JSON."""
+        assert _negociar_formato(accept) == esperado
+
+    def test_respeta_los_pesos_q(self) -> None:
+        """Gana el tipo con mayor ``q`` aunque esté listado después."""
+        accept = f"application/json;q=0.5, {MEDIA_TYPE_PARQUET};q=0.9"
+
+        assert _negociar_formato(accept) == MEDIA_TYPE_PARQUET
+
+    def test_empate_gana_el_primero(self) -> None:
+        """Con el mismo peso gana el primero listado."""
+        accept = f"{MEDIA_TYPE_ARROW_STREAM}, {MEDIA_TYPE_PARQUET}"
+
+        assert _negociar_formato(accept) == MEDIA_TYPE_ARROW_STREAM
+
+    def test_q_cero_excluye_el_tipo(self) -> None:
+        """``q=0`` descarta el tipo aunque sea el único columnar."""
+        accept = f"{MEDIA_TYPE_ARROW_STREAM};q=0, */*;q=0.1"
+
+        assert _negociar_formato(accept) == "application/json"
+
+    def test_q_invalido_se_ignora(self) -> None:
+        """Un ``q`` mal formado cuenta como 0."""
+        accept = f"{MEDIA_TYPE_PARQUET};q=alto, application/json;q=0.2"
+
+        assert _negociar_formato(accept) == "application/json"
+
+    def test_navegador_con_comodin(self) -> None:
+        """Un Accept típico de navegador sigue recibiendo JSON."""
+        accept = "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+
+        assert _negociar_formato(accept) == "application/json"
@@ -0,0 +1,155 @@
+"""
+Tests unitarios del pivot de ``MetricService._compute_aberracion``.
+
+El frame del GROUP BY se pivotea a la matriz series × semanas que reciben
+los métodos de ``aberraciones`` y el resultado se despliega de vuelta en
+filas; un método espía registra la matriz y numera las celdas para verificar
+que cada fila quede alineada con su serie y su semana.
+"""
+
+import numpy as np
+import polars as pl
+import pytest
+
+from app.domains.metricas.aberraciones import METODOS, Aberracion
+from app.domains.metricas.registry.dimensions import DimensionCode
+from app.domains.metricas.registry.metrics import get_metric
+from app.domains.metricas.service import MetricService
+
+ANIO = DimensionCode.ANIO_EPIDEMIOLOGICO
+SEMANA = DimensionCode.SEMANA_EPIDEMIOLOGICA
+PROVINCIA = DimensionCode.PROVINCIA
+METRICA = get_metric("aberracion_ears_c1")
+
+# Semanas consecutivas del cruce de año (2024 tiene 52 semanas)
+SEMANAS = [(2024, 51), (2024, 52), (2025, 1), (2025, 2)]
+
+
+def _frame(filas: list[tuple[str | None, int | None, int | None, int]]) -> pl.DataFrame:
+    return pl.DataFrame(
+        filas,
+        schema={
+            "provincia": pl.String,
+            "anio_epidemiologico": pl.Int64,
+            "semana_epidemiologica": pl.Int64,
+            "casos_nominales": pl.Int64,
+        },
+        orient="row",
+    )
+
+
+class TestComputeAberracion:
+    """Tests del armado de la matriz y del despliegue del resultado."""
+
+    @pytest.fixture
+    def matrices(self, monkeypatch: pytest.MonkeyPatch) -> list[np.ndarray]:
+        """Reemplaza el método por un espía que numera las celdas."""
+        recibidas: list[np.ndarray] = []
+
+        def espia(conteos: np.ndarray) -> Aberracion:
+            recibidas.append(conteos.copy())
+            numeradas = np.arange(conteos.size, dtype=np.float64).reshape(conteos.shape)
+            return Aberracion(
+                estadistico=numeradas,
+                umbral=np.full(conteos.shape, np.nan),
+                esperado=numeradas * 10,
+                senal=numeradas % 2 == 0,
+            )
+
+        monkeypatch.setitem(METODOS, METRICA.aberracion or "", espia)
+        return recibidas
+
+    def test_matriz_y_alineacion(self, matrices: list[np.ndarray]) -> None:
+        frame = _frame(
+            [
+                ("Neuquén", 2024, 52, 2),
+                ("Chubut", 2025, 1, 5),
+                ("Chubut", 2024, 51, 3),
+                (None, 2025, 2, 1),
+                ("Neuquén", None, None, 9),
+            ]
+        )
+
+        resultado = MetricService(None)._compute_aberracion(  # type: ignore[arg-type]
+            METRICA, frame, [PROVINCIA, ANIO, SEMANA]
+        )
+
+        # Series en orden de aparición (la provincia nula es una serie más),
+        # semanas consecutivas y las que faltan en cero; la fila sin semana
+        # no entra
+        (matriz,) = matrices
+        np.testing.assert_array_equal(
+            matriz,
+            [
+                [0.0, 2.0, 0.0, 0.0],
+                [3.0, 0.0, 5.0, 0.0],
+                [0.0, 0.0, 0.0, 1.0],
+            ],
+        )
+        # Producto cruzado serie × semana en el orden de ``ravel``
+        assert resultado.columns == [
+            "provincia",
+            "anio_epidemiologico",
+            "semana_epidemiologica",
+            "valor",
+            "esperado",
+            "estadistico",
+            "umbral",
+            "senal",
+        ]
+        claves = [
+            (provincia, anio, semana)
+            for provincia in ("Neuquén", "Chubut", None)
+            for anio, semana in SEMANAS
+        ]
+        assert (
+            resultado.select(
+                "provincia", "anio_epidemiologico", "semana_epidemiologica"
+            ).rows()
+            == claves
+        )
+        assert resultado["valor"].to_list() == matriz.ravel().tolist()
+        assert resultado["estadistico"].to_list() == list(range(12))
+        assert resultado["esperado"].to_list() == [10.0 * i for i in range(12)]
+        assert resultado["umbral"].null_count() == 12
+        assert resultado["senal"].to_list() == [i % 2 == 0 for i in range(12)]
+
+    def test_sin_dimensiones_no_temporales(self, matrices: list[np.ndarray]) -> None:
+        frame = _frame([(None, 2025, 2, 4), (None, 2024, 51, 1)]).drop("provincia")
+
+        resultado = MetricService(None)._compute_aberracion(  # type: ignore[arg-type]
+            METRICA, frame, [ANIO, SEMANA]
+        )
+
+        (matriz,) = matrices
+        np.testing.assert_array_equal(matriz, [[1.0, 0.0, 0.0, 4.0]])
+        assert resultado.columns[:3] == [
+            "anio_epidemiologico",
+            "semana_epidemiologica",
+            "valor",
+        ]
+        assert (
+            resultado.select("anio_epidemiologico", "semana_epidemiologica").rows()
+            == SEMANAS
+        )
+        assert resultado["valor"].to_list() == [1.0, 0.0, 0.0, 4.0]
+
+    def test_frame_vacio(self, matrices: list[np.ndarray]) -> None:
+        resultado = MetricService(None)._compute_aberracion(  # type: ignore[arg-type]
+            METRICA, _frame([]), [PROVINCIA, ANIO, SEMANA]
+        )
+
+        assert resultado.height == 0
+        assert not matrices
+
+    def test_metodo_real(self) -> None:
+        # Doce semanas de una provincia: C1 definido desde la octava
+        filas = [("Chubut", 2024, semana, 2) for semana in range(1, 12)]
+        filas.append(("Chubut", 2024, 12, 9))
+
+        resultado = MetricService(None)._compute_aberracion(  # type: ignore[arg-type]
+            METRICA, _frame(filas), [PROVINCIA, ANIO, SEMANA]
+        )
+
+        assert resultado["estadistico"].null_count() == 7
+        assert resultado["senal"].to_list() == [False] * 11 + [True]
@@ -0,0 +1,340 @@
+"""
+Tests unitarios para ``MetricQueryBuilder.execute_grouping_sets``.
+
+El SQL se compila con el dialecto de PostgreSQL. Para el reparto de filas, una
+sesión falsa resuelve los GROUPING SETS sobre una tabla chica en memoria con la
+misma semántica que PostgreSQL (GROUPING(), FILTER, WHERE).
+"""
+
+import re
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Integer,
+    MetaData,
+    Select,
+    String,
+    Table,
+    select,
+)
+from sqlalchemy.dialects import postgresql
+
+from app.domains.metricas.builders.base import ConsultaBatch, MetricQueryBuilder
+from app.domains.metricas.criteria.base import Criterion
+from app.domains.metricas.registry.dimensions import DimensionCode
+from app.domains.metricas.registry.metrics import (
+    AggregationType,
+    MetricDefinition,
+    MetricSource,
+)
+
+conteos = Table(
+    "conteos",
+    MetaData(),
+    Column("semana", Integer),
+    Column("provincia", String),
+    Column("evento", String),
+    Column("casos", Integer),
+)
+
+# (semana, provincia, evento, casos)
+FILAS = [
+    (1, "Chubut", "dengue", 3),
+    (1, "Chubut", "zika", 1),
+    (1, "Neuquén", "dengue", 2),
+    (2, "Chubut", "dengue", 5),
+    (2, "Neuquén", "zika", 4),
+    (3, "Neuquén", "zika", 7),
+    (3, "Salta", "rabia", 9),
+]
+COLUMNAS = {"semana": 0, "provincia": 1, "evento": 2, "casos": 3}
+# Etiqueta de la dimensión en el SELECT → columna de la tabla
+COLUMNA_DIMENSION = {"semana_epidemiologica": "semana", "provincia": "provincia"}
+SEMANA = DimensionCode.SEMANA_EPIDEMIOLOGICA
+PROVINCIA = DimensionCode.PROVINCIA
+
+CASOS = MetricDefinition(
+    code="casos",
+    label="Casos",
+    description="Casos de prueba",
+    source=MetricSource.CLINICO,
+    aggregation=AggregationType.SUM,
+    field_getter=lambda: conteos.c.casos,
+)
+FILAS_METRICA = MetricDefinition(
+    code="filas",
+    label="Filas",
+    description="Filas de prueba",
+    source=MetricSource.CLINICO,
+    aggregation=AggregationType.COUNT,
+    field_getter=lambda: conteos.c.casos,
+)
+
+
+class _EventoCriterion(Criterion):
+    def __init__(self, evento: str) -> None:
+        self.evento = evento
+
+    def to_expression(self) -> Any:
+        return conteos.c.evento == self.evento
+
+    def cumple(self, fila: tuple) -> bool:
+        return fila[COLUMNAS["evento"]] == self.evento
+
+
+class _SesionPostgres:
+    """Resuelve la query de ``execute_grouping_sets`` como lo haría PostgreSQL."""
+
+    def __init__(self, consultas: list[ConsultaBatch]) -> None:
+        self.consultas = consultas
+        self.query: Select | None = None
+
+    def execute(self, query: Select) -> "_SesionPostgres":
+        self.query = query
+        nombres = [c.name for c in query.selected_columns]
+        dims = [n for n in nombres if n in COLUMNA_DIMENSION]
+
+        # Criterios distintos en orden de aparición (igual que el builder)
+        predicados: list[Callable[[tuple], bool]] = []
+        claves: list[str | None] = []
+        for consulta in self.consultas:
+            clave = consulta.criterio.evento if consulta.criterio else None
+            if clave not in claves:
+                claves.append(clave)
+                predicados.append(
+                    consulta.criterio.cumple if consulta.criterio else lambda _f: True
+                )
+        filas = [f for f in FILAS if any(p(f) for p in predicados)]
+
+        self._filas: list[tuple] = []
+        for grupo in self._grouping_sets(query):
+            grupos: dict[tuple, list[tuple]] = {}
+            for fila in filas:
+                clave = tuple(
+                    fila[COLUMNAS[COLUMNA_DIMENSION[d]]] if d in grupo else None
+                    for d in dims
+                )
+                grupos.setdefault(clave, []).append(fila)
+            mascara = sum(
+                1 << (len(dims) - 1 - j) for j, d in enumerate(dims) if d not in grupo
+            )
+            for clave, miembros in grupos.items():
+                self._filas.append(
+                    tuple(
+                        self._valor(nombre, clave, dims, mascara, miembros, predicados)
+                        for nombre in nombres
+                    )
+                )
+        return self
+
+    @staticmethod
+    def _grouping_sets(query: Select) -> list[tuple[str, ...]]:
+        """Sets del GROUP BY compilado, repetidos incluidos (como PostgreSQL)."""
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        if "GROUPING SETS(" not in sql:
+            return [()]
+        clausula = sql.split("GROUPING SETS(", 1)[1]
+        dimension_de = {f"conteos.{c}": d for d, c in COLUMNA_DIMENSION.items()}
+        return [
+            tuple(dimension_de[c.strip()] for c in grupo.split(",") if c.strip())
+            for grupo in re.findall(r"\(([^()]*)\)", clausula.split(" ORDER BY")[0])
+        ]
+
+    @staticmethod
+    def _valor(
+        nombre: str,
+        clave: tuple,
+        dims: list[str],
+        mascara: int,
+        miembros: list[tuple],
+        predicados: list[Callable[[tuple], bool]],
+    ) -> Any:
+        if nombre in dims:
+            return clave[dims.index(nombre)]
+        if nombre == "_grupo":
+            return mascara
+        codigo, indice = nombre.rsplit("__", 1)
+        filtradas = [f for f in miembros if predicados[int(indice)](f)]
+        if codigo in ("_filas", "filas"):
+            return len(filtradas)
+        return sum(f[COLUMNAS["casos"]] for f in filtradas) if filtradas else None
+
+    def keys(self) -> list[str]:
+        assert self.query is not None
+        return [c.name for c in self.query.selected_columns]
+
+    def all(self) -> list[tuple]:
+        return self._filas
+
+
+class _BuilderPrueba(MetricQueryBuilder):
+    def build_base_query(self, metric: MetricDefinition) -> Select:
+        return select(conteos)
+
+    def get_dimension_column(self, dim_code: DimensionCode) -> ColumnElement[Any]:
+        return {SEMANA: conteos.c.semana, PROVINCIA: conteos.c.provincia}[dim_code]
+
+
+def _ejecutar(consultas: list[ConsultaBatch]) -> tuple[list[dict], str]:
+    sesion = _SesionPostgres(consultas)
+    tablas = _BuilderPrueba(sesion).execute_grouping_sets(consultas)  # type: ignore[arg-type]
+    sql = str(
+        sesion.query.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    return [t.to_pylist() for t in tablas], sql
+
+
+def _esperado(consulta: ConsultaBatch) -> list[dict]:
+    """Resultado de la consulta ejecutada sola (GROUP BY + WHERE propio)."""
+    grupos: dict[tuple, list[tuple]] = {}
+    for fila in FILAS:
+        if consulta.criterio and not consulta.criterio.cumple(fila):
+            continue
+        clave = tuple(
+            fila[COLUMNAS[COLUMNA_DIMENSION[d.value.lower()]]]
+            for d in consulta.dimensiones
+        )
+        grupos.setdefault(clave, []).append(fila)
+    resultado = []
+    for clave, miembros in sorted(grupos.items()):
+        fila_esperada: dict[str, Any] = {
+            d.value.lower(): v for d, v in zip(consulta.dimensiones, clave, strict=True)
+        }
+        for metrica in consulta.metricas:
+            fila_esperada[metrica.code] = (
+                len(miembros)
+                if metrica.aggregation == AggregationType.COUNT
+                else sum(f[COLUMNAS["casos"]] for f in miembros)
+            )
+        resultado.append(fila_esperada)
+    return resultado
+
+
+class TestCompilacion:
+    """Tests para el SQL generado."""
+
+    def test_grouping_sets_filter_y_where(self) -> None:
+        """Criterios distintos: FILTER por criterio y WHERE con el OR."""
+        _, sql = _ejecutar(
+            [
+                ConsultaBatch((CASOS,), (SEMANA,), _EventoCriterion("dengue")),
+                ConsultaBatch((CASOS,), (PROVINCIA,), _EventoCriterion("zika")),
+            ]
+        )
+
+        assert "GROUP BY GROUPING SETS((conteos.semana), (conteos.provincia))" in sql
+        assert "grouping(conteos.semana, conteos.provincia) AS _grupo" in sql
+        assert (
+            "sum(conteos.casos) FILTER (WHERE conteos.evento = 'dengue') AS casos__0"
+            in sql
+        )
+        assert (
+            "sum(conteos.casos) FILTER (WHERE conteos.evento = 'zika') AS casos__1"
+            in sql
+        )
+        assert "count(*) FILTER (WHERE conteos.evento = 'zika') AS _filas__1" in sql
+        assert "WHERE conteos.evento = 'dengue' OR conteos.evento = 'zika'" in sql
+
+    def test_mismo_criterio_sin_filter(self) -> None:
+        """Con un solo criterio distinto va en el WHERE, sin FILTER."""
+        criterio = _EventoCriterion("dengue")
+        _, sql = _ejecutar(
+            [
+                ConsultaBatch((CASOS,), (SEMANA,), criterio),
+                ConsultaBatch(
+                    (CASOS,), (SEMANA, PROVINCIA), _EventoCriterion("dengue")
+                ),
+            ]
+        )
+
+        assert "FILTER" not in sql
+        assert "_filas__" not in sql
+        assert "WHERE conteos.evento = 'dengue'" in sql
+        assert sql.count("casos__0") == 1
+
+    def test_consulta_sin_criterio_quita_el_where(self) -> None:
+        """Si una consulta no filtra, el scan compartido no lleva WHERE."""
+        _, sql = _ejecutar(
+            [
+                ConsultaBatch((CASOS,), (SEMANA,)),
+                ConsultaBatch((CASOS,), (SEMANA,), _EventoCriterion("zika")),
+            ]
+        )
+
+        assert "WHERE" not in sql.split("FROM conteos", 1)[1]
+        assert "FILTER (WHERE conteos.evento = 'zika')" in sql
+
+
+class TestRepartoDeFilas:
+    """Tests para el reparto de filas por consulta."""
+
+    def test_cada_consulta_recibe_su_grouping_set(self) -> None:
+        """Cada consulta obtiene lo mismo que ejecutada sola."""
+        consultas = [
+            ConsultaBatch(
+                (CASOS, FILAS_METRICA), (SEMANA,), _EventoCriterion("dengue")
+            ),
+            ConsultaBatch((CASOS,), (PROVINCIA,), _EventoCriterion("zika")),
+            ConsultaBatch((CASOS,), (SEMANA, PROVINCIA), _EventoCriterion("dengue")),
+            ConsultaBatch((CASOS,), (), _EventoCriterion("zika")),
+        ]
+
+        resultados, _ = _ejecutar(consultas)
+
+        for consulta, resultado in zip(consultas, resultados, strict=True):
+            assert sorted(resultado, key=lambda f: tuple(map(str, f.values()))) == (
+                sorted(_esperado(consulta), key=lambda f: tuple(map(str, f.values())))
+            )
+
+    def test_descarta_grupos_sin_filas_del_criterio(self) -> None:
+        """Semanas que solo existen por otro criterio no aparecen."""
+        resultados, _ = _ejecutar(
+            [
+                ConsultaBatch((CASOS,), (SEMANA,), _EventoCriterion("dengue")),
+                ConsultaBatch((CASOS,), (SEMANA,), _EventoCriterion("rabia")),
+            ]
+        )
+
+        assert resultados[0] == [
+            {"semana_epidemiologica": 1, "casos": 5},
+            {"semana_epidemiologica": 2, "casos": 5},
+        ]
+        assert resultados[1] == [{"semana_epidemiologica": 3, "casos": 9}]
+
+    def test_columnas_por_consulta(self) -> None:
+        """Cada tabla trae sus dimensiones y una columna por métrica."""
+        resultados, _ = _ejecutar(
+            [
+                ConsultaBatch((CASOS,), (PROVINCIA,)),
+                ConsultaBatch((CASOS, FILAS_METRICA), ()),
+            ]
+        )
+
+        assert set(resultados[0][0]) == {"provincia", "casos"}
+        assert resultados[1] == [{"casos": 31, "filas": 7}]
+
+    def test_dimensiones_permutadas_comparten_el_set(self) -> None:
+        """El mismo conjunto en otro orden es un solo set y no duplica filas."""
+        consultas = [
+            ConsultaBatch((CASOS,), (SEMANA, PROVINCIA)),
+            ConsultaBatch((CASOS,), (PROVINCIA, SEMANA)),
+            ConsultaBatch((CASOS,), (PROVINCIA,)),
+        ]
+
+        resultados, sql = _ejecutar(consultas)
+
+        assert (
+            "GROUPING SETS((conteos.semana, conteos.provincia), (conteos.provincia))"
+            in sql
+        )
+        for consulta, resultado in zip(consultas, resultados, strict=True):
+            assert sorted(resultado, key=lambda f: tuple(map(str, f.values()))) == (
+                sorted(_esperado(consulta), key=lambda f: tuple(map(str, f.values())))
+            )
+        # Cada tabla trae las columnas en el orden de su consulta
+        assert list(resultados[1][0]) == ["provincia", "semana_epidemiologica", "casos"]
@@ -0,0 +1 @@
+"""Tests del dominio de territorio."""
@@ -0,0 +1,289 @@
+"""
+Tests unitarios para el servicio de población de referencia.
+
+La tabla se arma con censos sintéticos; la carga desde la BD usa una sesión
+mockeada.
+"""
+
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, MagicMock
+
+import polars as pl
+import pytest
+
+from app.core.config import settings
+from app.core.static_data.salud import POBLACIONES_ESTANDAR
+from app.domains.territorio.services import poblacion_service
+from app.domains.territorio.services.poblacion_service import (
+    TablaPoblacion,
+    invalidar_poblacion,
+    obtener_poblacion,
+)
+
+
+def _censos(*filas: tuple[int, int, str, str, int, float]) -> pl.DataFrame:
+    return pl.DataFrame(list(filas), schema=poblacion_service._ESQUEMA, orient="row")
+
+
+@pytest.fixture
+def tabla() -> TablaPoblacion:
+    # Dos departamentos de Chubut con dos censos y uno de otra provincia con uno
+    return TablaPoblacion(
+        _censos(
+            (26, 7, "T", "total", 2010, 100_000),
+            (26, 7, "T", "total", 2020, 121_000),
+            (26, 14, "T", "total", 2010, 50_000),
+            (26, 14, "T", "total", 2020, 50_000),
+            (2, 1, "T", "total", 2022, 300_000),
+        ),
+        version="v1",
+    )
+
+
+class TestEstimar:
+    """Tests de la interpolación y proyección de censos."""
+
+    def test_censo_exacto(self, tabla: TablaPoblacion) -> None:
+        assert tabla.poblacion(2010, 26, 7) == pytest.approx(100_000)
+
+    def test_interpolacion_geometrica(self, tabla: TablaPoblacion) -> None:
+        # 100.000 * 1,21 ** (5/10) = 110.000
+        assert tabla.poblacion(2015, 26, 7) == pytest.approx(110_000)
+
+    def test_proyeccion_con_crecimiento_observado(self, tabla: TablaPoblacion) -> None:
+        # Factor anual 1,21 ** (1/10); dos años después del último censo
+        factor = 1.21**0.1
+        assert tabla.poblacion(2022, 26, 7) == pytest.approx(121_000 * factor**2)
+        assert tabla.poblacion(2008, 26, 7) == pytest.approx(100_000 / factor**2)
+
+    def test_un_solo_censo_usa_crecimiento_configurado(
+        self, tabla: TablaPoblacion, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "POBLACION_CRECIMIENTO_ANUAL", 0.01)
+        assert tabla.poblacion(2024, 2, 1) == pytest.approx(300_000 * 1.01**2)
+
+    def test_memoriza_por_anio(
+        self, tabla: TablaPoblacion, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        llamadas: list[list[int]] = []
+        original = poblacion_service._estimar
+
+        def contar(censos: pl.DataFrame, anios: list[int]) -> pl.DataFrame:
+            llamadas.append(anios)
+            return original(censos, anios)
+
+        monkeypatch.setattr(poblacion_service, "_estimar", contar)
+        tabla.estimar([2015, 2016])
+        tabla.estimar([2016, 2017])
+
+        assert llamadas == [[2015, 2016], [2017]]
+
+    def test_tabla_vacia(self) -> None:
+        vacia = TablaPoblacion(_censos(), version=None)
+        assert vacia.estimar([2020]).is_empty()
+        assert vacia.poblacion(2020) == 0
+
+
+class TestPoblacion:
+    """Tests de la población de un área."""
+
+    def test_suma_departamentos(self, tabla: TablaPoblacion) -> None:
+        assert tabla.poblacion(2020, 26) == pytest.approx(171_000)
+        assert tabla.poblacion(2022, 2) == pytest.approx(300_000)
+
+    def test_pais(self, tabla: TablaPoblacion) -> None:
+        assert tabla.poblacion(2020) == pytest.approx(
+            171_000 + tabla.poblacion(2020, 2)
+        )
+
+    def test_area_sin_datos(self, tabla: TablaPoblacion) -> None:
+        assert tabla.poblacion(2020, 99) == 0
+
+
+class TestAgregarTasas:
+    """Tests de las tasas vectorizadas."""
+
+    def test_por_departamento(self, tabla: TablaPoblacion) -> None:
+        df = pl.DataFrame(
+            {
+                "id_provincia_indec": [26, 26, 26],
+                "id_departamento_indec": [7, 14, 99],
+                "casos": [121, 5, 3],
+            }
+        )
+
+        resultado = tabla.agregar_tasas(df, anio=2020)
+
+        assert resultado["poblacion"].to_list() == [121_000, 50_000, None]
+        assert resultado["tasa"].to_list() == pytest.approx([100.0, 10.0, None])
+
+    def test_por_provincia_y_anio(self, tabla: TablaPoblacion) -> None:
+        df = pl.DataFrame(
+            {"id_provincia_indec": [26, 26], "anio": [2010, 2020], "casos": [15, 171]}
+        )
+
+        resultado = tabla.agregar_tasas(df, por=1000, columna="tasa_1000")
+
+        assert resultado["poblacion"].to_list() == pytest.approx([150_000, 171_000])
+        assert resultado["tasa_1000"].to_list() == pytest.approx([0.1, 1.0])
+
+    def test_sin_claves(self, tabla: TablaPoblacion) -> None:
+        resultado = tabla.agregar_tasas(pl.DataFrame({"casos": [471]}), anio=2020)
+
+        total = tabla.poblacion(2020)
+        assert resultado["poblacion"][0] == pytest.approx(total)
+        assert resultado["tasa"][0] == pytest.approx(471 / total * 100_000)
+
+
+class TestTasasAjustadasPorEdad:
+    """Tests de las tasas ajustadas por edad (método directo)."""
+
+    @pytest.fixture
+    def por_edad(self) -> TablaPoblacion:
+        grupos = POBLACIONES_ESTANDAR["OMS_2000"]
+        return TablaPoblacion(
+            _censos(
+                *(
+                    (26, 7, "T", grupo, 2022, 10_000.0)
+                    for grupo in grupos
+                    if grupo != "80+"
+                ),
+                (26, 7, "T", "80+", 2022, 1_000.0),
+                (26, 7, "T", "total", 2022, 161_000.0),
+            ),
+            version="v1",
+        )
+
+    def test_pondera_por_poblacion_estandar(self, por_edad: TablaPoblacion) -> None:
+        df = pl.DataFrame(
+            {"grupo_etario": ["0-4", "80+", "Desconocido"], "casos": [10, 10, 7]}
+        )
+
+        resultado = por_edad.tasas_ajustadas_por_edad(df, anio=2022)
+
+        estandar = POBLACIONES_ESTANDAR["OMS_2000"]
+        total = sum(estandar.values())
+        esperada = (
+            (10 / 10_000 * estandar["0-4"] + 10 / 1_000 * estandar["80+"])
+            / total
+            * 100_000
+        )
+        assert resultado.height == 1
+        # Los grupos fuera del estándar no suman casos ni tasa
+        assert resultado["casos"][0] == 20
+        assert resultado["tasa_ajustada"][0] == pytest.approx(esperada)
+
+    def test_otra_poblacion_estandar(self, por_edad: TablaPoblacion) -> None:
+        df = pl.DataFrame({"grupo_etario": ["0-4", "80+"], "casos": [10, 10]})
+
+        oms = por_edad.tasas_ajustadas_por_edad(df, anio=2022)
+        segi = por_edad.tasas_ajustadas_por_edad(df, anio=2022, estandar="SEGI_1960")
+
+        assert segi["tasa_ajustada"][0] != pytest.approx(oms["tasa_ajustada"][0])
+
+    def test_agrupa_por_area(self, por_edad: TablaPoblacion) -> None:
+        df = pl.DataFrame(
+            {
+                "id_departamento_indec": [7, 7, 8],
+                "grupo_etario": ["0-4", "5-9", "0-4"],
+                "casos": [10, 10, 1],
+            }
+        )
+
+        resultado = por_edad.tasas_ajustadas_por_edad(df, anio=2022)
+
+        assert resultado["id_departamento_indec"].to_list() == [7, 8]
+        assert resultado["tasa_ajustada"][0] is not None
+        # El departamento 8 no tiene población por edad
+        assert resultado["tasa_ajustada"][1] is None
+
+    def test_sin_poblacion_por_edad(self, tabla: TablaPoblacion) -> None:
+        df = pl.DataFrame({"grupo_etario": ["0-4"], "casos": [3]})
+
+        resultado = tabla.tasas_ajustadas_por_edad(df, anio=2020)
+
+        assert resultado["tasa_ajustada"][0] is None
+
+    def test_errores(self, tabla: TablaPoblacion) -> None:
+        with pytest.raises(ValueError, match="grupo_etario"):
+            tabla.tasas_ajustadas_por_edad(pl.DataFrame({"casos": [1]}))
+        with pytest.raises(ValueError, match="desconocida"):
+            tabla.tasas_ajustadas_por_edad(
+                pl.DataFrame({"grupo_etario": ["0-4"], "casos": [1]}),
+                estandar="NO_EXISTE",
+            )
+
+
+def _resultado(valor: object = None, filas: list[tuple] | None = None) -> MagicMock:
+    resultado = MagicMock()
+    resultado.scalar.return_value = valor
+    resultado.all.return_value = filas or []
+    return resultado
+
+
+class TestObtenerPoblacion:
+    """Tests de la caché del proceso y su invalidación por versión del seed."""
+
+    @pytest.fixture(autouse=True)
+    def _cache_limpia(self) -> Iterator[None]:
+        invalidar_poblacion()
+        yield
+        invalidar_poblacion()
+
+    @staticmethod
+    def _db(version: str | None, filas: list[tuple]) -> MagicMock:
+        db = MagicMock()
+        respuestas = [_resultado(version is not None)]
+        if version is not None:
+            respuestas.append(_resultado(version))
+        respuestas.append(_resultado(filas=filas))
+        db.execute = AsyncMock(side_effect=respuestas)
+        return db
+
+    @pytest.mark.asyncio
+    async def test_carga_y_reutiliza(self) -> None:
+        db = self._db("geografia:a,poblacion:b", [(26, 7, "T", "total", 2022, 10)])
+
+        tabla = await obtener_poblacion(db)
+
+        assert tabla.version == "geografia:a,poblacion:b"
+        assert tabla.poblacion(2022) == 10
+        # Dentro de la ventana de verificación no consulta la BD
+        assert await obtener_poblacion(db) is tabla
+        assert db.execute.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_recarga_si_cambia_la_version(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "POBLACION_VERIFICAR_SEGUNDOS", 0)
+        primera = await obtener_poblacion(self._db("v1", []))
+
+        # Misma versión: solo verifica
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=[_resultado(True), _resultado("v1")])
+        assert await obtener_poblacion(db) is primera
+
+        segunda = await obtener_poblacion(
+            self._db("v2", [(26, 7, "T", "total", 2022, 5)])
+        )
+        assert segunda is not primera
+        assert segunda.poblacion(2022) == 5
+
+    @pytest.mark.asyncio
+    async def test_sin_seed_estado_recarga(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "POBLACION_VERIFICAR_SEGUNDOS", 0)
+        primera = await obtener_poblacion(self._db(None, []))
+        segunda = await obtener_poblacion(self._db(None, []))
+
+        assert primera.version is None
+        assert segunda is not primera
+
+    @pytest.mark.asyncio
+    async def test_invalidar(self) -> None:
+        primera = await obtener_poblacion(self._db("v1", []))
+        invalidar_poblacion()
+
+        assert await obtener_poblacion(self._db("v1", [])) is not primera
@@ -0,0 +1 @@
+"""Tests de integración de vigilancia nominal."""
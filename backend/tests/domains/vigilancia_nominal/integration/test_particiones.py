@@ -0,0 +1,221 @@
+"""
+Tests de integración del particionado por año epidemiológico.
+
+Requieren una base PostgreSQL migrada. Cada test corre en una transacción
+que se descarta al final y usa años lejanos (2101+) para no tocar datos
+reales. Las filas mínimas se arman desde la metadata de las tablas y se
+insertan con ``session_replication_role = replica`` como en la ingesta (sin
+triggers de FK), así no hace falta cargar enfermedades ni ciudadanos.
+"""
+
+import logging
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+import pytest
+from sqlalchemy import Enum, Table, inspect, text
+from sqlmodel import Session
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("DATABASE_URL"), reason="Requiere DATABASE_URL configurada"
+)
+
+ANIO, ANIO_NUEVO = 2101, 2102
+ID_SNVS = 987_654_321_012
+
+
+def _valor(columna: Any) -> Any:
+    """Valor de relleno para una columna obligatoria."""
+    if isinstance(columna.type, Enum):
+        return columna.type.enums[0]
+    tipo = columna.type.python_type
+    rellenos = {
+        int: 1,
+        str: "x",
+        bool: False,
+        float: 1.0,
+        Decimal: Decimal(1),
+        date: date(ANIO, 6, 1),
+        datetime: datetime(ANIO, 6, 1),
+    }
+    return rellenos.get(tipo, "{}")
+
+
+def _insertar(session: Session, modelo: Any, **valores: Any) -> int:
+    """Inserta una fila con las columnas obligatorias completas; devuelve el id."""
+    tabla: Table = inspect(modelo).local_table
+    for columna in tabla.columns:
+        obligatoria = (
+            not columna.nullable
+            and columna.default is None
+            and columna.server_default is None
+            and columna.name != "id"
+        )
+        if obligatoria and columna.name not in valores:
+            valores[columna.name] = _valor(columna)
+    return session.execute(
+        tabla.insert().values(**valores).returning(tabla.c.id)
+    ).scalar_one()
+
+
+def _particion(session: Session, tabla: str, id_fila: int) -> str:
+    return session.execute(
+        text(f"SELECT tableoid::regclass::text FROM {tabla} WHERE id = :id"),
+        {"id": id_fila},
+    ).scalar_one()
+
+
+@pytest.fixture
+def session() -> Any:
+    from app.core.database import engine
+
+    with Session(engine) as session:
+        session.execute(text("SET LOCAL session_replication_role = replica"))
+        try:
+            yield session
+        finally:
+            session.rollback()
+
+
+class TestParticiones:
+    """Tests de creación de particiones y ruteo de filas."""
+
+    def test_rollback_descarta_la_particion(self, session: Session) -> None:
+        from app.domains.vigilancia_nominal.models.particionado import (
+            TABLAS_PARTICIONADAS,
+        )
+        from app.domains.vigilancia_nominal.queries.particiones import (
+            asegurar_particiones,
+        )
+
+        assert asegurar_particiones(session, [ANIO]) == len(TABLAS_PARTICIONADAS)
+        assert asegurar_particiones(session, [ANIO]) == 0
+        session.rollback()
+
+        # La partición desapareció con el rollback: se vuelve a crear
+        assert asegurar_particiones(session, [ANIO]) == len(TABLAS_PARTICIONADAS)
+
+    def test_ruteo_por_anio(self, session: Session) -> None:
+        from app.domains.vigilancia_nominal.models.caso import (
+            CasoEpidemiologico,
+            DetalleCasoSintomas,
+        )
+        from app.domains.vigilancia_nominal.queries.particiones import (
+            asegurar_particiones,
+        )
+
+        asegurar_particiones(session, [ANIO, ANIO_NUEVO])
+        id_caso = _insertar(
+            session,
+            CasoEpidemiologico,
+            id_snvs=ID_SNVS,
+            fecha_minima_caso=date(ANIO_NUEVO, 3, 1),
+            fecha_minima_caso_anio_epi=ANIO_NUEVO,
+        )
+        id_sintoma = _insertar(
+            session, DetalleCasoSintomas, id_caso=id_caso, anio_epi_caso=ANIO_NUEVO
+        )
+
+        assert _particion(session, "caso_epidemiologico", id_caso) == (
+            f"caso_epidemiologico_{ANIO_NUEVO}"
+        )
+        assert _particion(session, "detalle_caso_sintomas", id_sintoma) == (
+            f"detalle_caso_sintomas_{ANIO_NUEVO}"
+        )
+
+
+class TestMoverCasosDeAnio:
+    """Tests del movimiento de un caso y sus hijas entre particiones."""
+
+    def test_mueve_el_caso_y_sus_hijas(self, session: Session) -> None:
+        from app.domains.vigilancia_nominal.models.agentes import CasoAgente
+        from app.domains.vigilancia_nominal.models.atencion import (
+            DiagnosticoCasoEpidemiologico,
+        )
+        from app.domains.vigilancia_nominal.models.caso import (
+            CasoEpidemiologico,
+            DetalleCasoSintomas,
+        )
+        from app.domains.vigilancia_nominal.models.salud import (
+            EstudioCasoEpidemiologico,
+            MuestraCasoEpidemiologico,
+        )
+        from app.domains.vigilancia_nominal.procesamiento.bulk.eventos.processor import (
+            CasoEpidemiologicosProcessor,
+        )
+        from app.domains.vigilancia_nominal.procesamiento.config.context import (
+            ProcessingContext,
+        )
+        from app.domains.vigilancia_nominal.queries.particiones import (
+            asegurar_particiones,
+        )
+
+        asegurar_particiones(session, [ANIO, ANIO_NUEVO])
+        id_caso = _insertar(
+            session,
+            CasoEpidemiologico,
+            id_snvs=ID_SNVS,
+            fecha_minima_caso=date(ANIO, 12, 1),
+            fecha_minima_caso_anio_epi=ANIO,
+        )
+        hijas = {
+            modelo: _insertar(session, modelo, id_caso=id_caso, anio_epi_caso=ANIO)
+            for modelo in (
+                DetalleCasoSintomas,
+                MuestraCasoEpidemiologico,
+                DiagnosticoCasoEpidemiologico,
+                CasoAgente,
+            )
+        }
+        id_estudio = _insertar(
+            session,
+            EstudioCasoEpidemiologico,
+            id_muestra=hijas[MuestraCasoEpidemiologico],
+            anio_epi_caso=ANIO,
+        )
+        # Otro caso del lote que no cambia de año
+        id_quieto = _insertar(
+            session,
+            CasoEpidemiologico,
+            id_snvs=ID_SNVS + 1,
+            fecha_minima_caso=date(ANIO, 6, 1),
+            fecha_minima_caso_anio_epi=ANIO,
+        )
+
+        procesador = CasoEpidemiologicosProcessor(
+            ProcessingContext(session), logging.getLogger(__name__)
+        )
+        movidos = procesador._mover_casos_de_anio(
+            [
+                {"id_snvs": ID_SNVS, "fecha_minima_caso_anio_epi": ANIO_NUEVO},
+                {"id_snvs": ID_SNVS + 1, "fecha_minima_caso_anio_epi": ANIO},
+            ]
+        )
+
+        assert movidos == 1
+        assert _particion(session, "caso_epidemiologico", id_caso) == (
+            f"caso_epidemiologico_{ANIO_NUEVO}"
+        )
+        assert _particion(session, "caso_epidemiologico", id_quieto) == (
+            f"caso_epidemiologico_{ANIO}"
+        )
+        for modelo, id_hija in hijas.items():
+            tabla = inspect(modelo).local_table.name
+            assert _particion(session, tabla, id_hija) == f"{tabla}_{ANIO_NUEVO}"
+        anio_estudio = session.execute(
+            text(
+                "SELECT anio_epi_caso FROM estudio_caso_epidemiologico WHERE id = :id"
+            ),
+            {"id": id_estudio},
+        ).scalar_one()
+        assert anio_estudio == ANIO_NUEVO
+
+        # Un segundo lote con el mismo año no mueve nada
+        assert (
+            procesador._mover_casos_de_anio(
+                [{"id_snvs": ID_SNVS, "fecha_minima_caso_anio_epi": ANIO_NUEVO}]
+            )
+            == 0
+        )
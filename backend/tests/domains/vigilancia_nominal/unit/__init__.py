@@ -0,0 +1 @@
+"""Tests unitarios de vigilancia nominal."""
@@ -0,0 +1,47 @@
+"""
+Tests unitarios para el ranking de búsqueda de casos y ciudadanos.
+
+Compilan las expresiones con el dialecto de PostgreSQL, sin base de datos.
+"""
+
+from sqlalchemy import ColumnElement
+from sqlalchemy.dialects import postgresql
+
+from app.domains.vigilancia_nominal.queries.busqueda import (
+    ranking_busqueda_caso,
+    ranking_busqueda_ciudadano,
+)
+
+
+def _sql(expresion: ColumnElement) -> str:
+    return str(
+        expresion.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+class TestRankingPrefijo:
+    """Tests para el ranking de términos numéricos."""
+
+    def test_documento_compara_exacto_y_prefijo(self) -> None:
+        """Un documento corto puntúa la igualdad exacta y el prefijo."""
+        sql = _sql(ranking_busqueda_ciudadano("30123456"))
+
+        assert "ciudadano.numero_documento = 30123456" in sql
+        assert "LIKE '30123456" in sql
+
+    def test_mas_de_18_digitos_solo_prefijo(self) -> None:
+        """Un término que no entra en BIGINT no se compara por igualdad."""
+        digitos = "1" * 25
+        sql = _sql(ranking_busqueda_caso(digitos))
+
+        assert f"= {digitos}" not in sql
+        assert sql.count(f"LIKE '{digitos}") == 2
+
+    def test_limite_de_18_digitos_compara_exacto(self) -> None:
+        """Con 18 dígitos todavía se compara por igualdad."""
+        digitos = "9" * 18
+        sql = _sql(ranking_busqueda_ciudadano(digitos))
+
+        assert f"= {digitos}" in sql
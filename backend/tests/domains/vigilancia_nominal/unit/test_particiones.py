@@ -0,0 +1,114 @@
+"""
+Tests unitarios para las particiones por año epidemiológico.
+
+Una sesión falsa hace de catálogo: sabe qué años tienen todas sus
+particiones y cuenta las llamadas a ``crear_particiones_anio_epi``.
+"""
+
+from datetime import date
+from typing import Any
+
+from sqlalchemy.dialects import postgresql
+
+from app.domains.vigilancia_nominal.models.particionado import TABLAS_PARTICIONADAS
+from app.domains.vigilancia_nominal.queries.particiones import (
+    asegurar_particiones,
+    condiciones_particion,
+)
+
+
+class _Resultado:
+    def __init__(self, valores: list[Any]) -> None:
+        self.valores = valores
+
+    def scalars(self) -> list[Any]:
+        return self.valores
+
+    def scalar_one(self) -> Any:
+        (valor,) = self.valores
+        return valor
+
+
+class _Catalogo:
+    """Sesión falsa con las particiones existentes por año."""
+
+    def __init__(self, anios_existentes: set[int]) -> None:
+        self.anios_existentes = set(anios_existentes)
+        self.consultas: list[dict[str, Any]] = []
+        self.creados: list[int] = []
+
+    def execute(self, query: Any, params: dict[str, Any]) -> _Resultado:
+        self.consultas.append(params)
+        if "crear_particiones_anio_epi" in str(query):
+            self.creados.append(params["anio"])
+            self.anios_existentes.add(params["anio"])
+            return _Resultado([len(TABLAS_PARTICIONADAS)])
+        assert params["tablas"] == list(TABLAS_PARTICIONADAS)
+        return _Resultado(
+            [a for a in params["anios"] if a not in self.anios_existentes]
+        )
+
+    def rollback(self) -> None:
+        """Descarta lo creado (el DDL es transaccional en PostgreSQL)."""
+        self.anios_existentes -= set(self.creados)
+        self.creados = []
+
+
+class TestAsegurarParticiones:
+    """Tests de la creación de particiones faltantes."""
+
+    def test_solo_crea_los_anios_faltantes(self) -> None:
+        sesion = _Catalogo({2024})
+
+        creadas = asegurar_particiones(sesion, [2025, 2024, None, 2023, 2025])  # type: ignore[arg-type]
+
+        assert creadas == 2 * len(TABLAS_PARTICIONADAS)
+        assert sesion.creados == [2023, 2025]
+        assert sesion.consultas[0]["anios"] == [2023, 2024, 2025]
+
+    def test_sin_anios_no_consulta(self) -> None:
+        sesion = _Catalogo(set())
+
+        assert asegurar_particiones(sesion, [None]) == 0  # type: ignore[arg-type]
+        assert sesion.consultas == []
+
+    def test_rollback_vuelve_a_crear(self) -> None:
+        # Sin caché en el proceso: si la transacción que creó la partición
+        # hace rollback, la próxima ingesta del año la vuelve a crear
+        sesion = _Catalogo(set())
+        asegurar_particiones(sesion, [2030])  # type: ignore[arg-type]
+        sesion.rollback()
+
+        creadas = asegurar_particiones(sesion, [2030])  # type: ignore[arg-type]
+
+        assert creadas == len(TABLAS_PARTICIONADAS)
+        assert sesion.creados == [2030]
+
+
+class TestCondicionesParticion:
+    """Tests de la poda de particiones por rango de fechas."""
+
+    @staticmethod
+    def _sql(condiciones: list[Any]) -> list[str]:
+        return [
+            str(
+                c.compile(
+                    dialect=postgresql.dialect(),
+                    compile_kwargs={"literal_binds": True},
+                )
+            )
+            for c in condiciones
+        ]
+
+    def test_rango_en_anios_epidemiologicos(self) -> None:
+        # 2024-12-30 ya es semana 1 de 2025; 2022-01-01 es semana 52 de 2021
+        condiciones = condiciones_particion(date(2022, 1, 1), date(2024, 12, 30))
+
+        assert self._sql(condiciones) == [
+            "caso_epidemiologico.fecha_minima_caso_anio_epi >= 2021",
+            "caso_epidemiologico.fecha_minima_caso_anio_epi <= 2025",
+        ]
+
+    def test_sin_fechas(self) -> None:
+        assert condiciones_particion() == []
+        assert len(condiciones_particion(fecha_hasta=date(2024, 6, 1))) == 1
@@ -0,0 +1,403 @@
+"""
+Tests unitarios para la reclasificación masiva de casos.
+
+Verifican la traducción de reglas a SQL y a Polars, y que la evaluación
+vectorizada coincide con ``SyncEventClassificationService`` sin base de datos.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any
+from unittest.mock import MagicMock
+
+import pandas as pd
+import polars as pl
+import pytest
+
+from app.domains.vigilancia_nominal.clasificacion.models import (
+    ClassificationRule,
+    EstrategiaClasificacion,
+    FilterCondition,
+    TipoClasificacion,
+    TipoFiltro,
+)
+from app.domains.vigilancia_nominal.clasificacion.reclasificacion import (
+    CompiladorReglas,
+    ReclasificadorCasos,
+    _CombinadorSQL,
+)
+from app.domains.vigilancia_nominal.clasificacion.sync_services import (
+    SyncEventClassificationService,
+)
+
+
+def _condicion(
+    tipo: TipoFiltro,
+    campo: str,
+    config: dict[str, Any],
+    orden: int = 0,
+    operador: str = "AND",
+) -> FilterCondition:
+    return FilterCondition(
+        filter_type=tipo,
+        field_name=campo,
+        config=config,
+        order=orden,
+        logical_operator=operador,
+    )
+
+
+def _regla(
+    id_: int,
+    clasificacion: str,
+    prioridad: int,
+    condiciones: list[FilterCondition],
+    activa: bool = True,
+) -> ClassificationRule:
+    return ClassificationRule(
+        id=id_,
+        classification=clasificacion,
+        name=f"regla {id_}",
+        priority=prioridad,
+        is_active=activa,
+        filters=condiciones,
+    )
+
+
+def _estrategia(
+    reglas: list[ClassificationRule], **kwargs: Any
+) -> EstrategiaClasificacion:
+    return EstrategiaClasificacion(
+        id=3,
+        id_enfermedad=7,
+        name="Dengue",
+        valid_from=datetime(2024, 1, 1),
+        classification_rules=reglas,
+        **kwargs,
+    )
+
+
+class TestCompiladorReglas:
+    """Tests para la traducción de reglas a predicados SQL."""
+
+    def test_alcance_por_enfermedad_y_vigencia(self) -> None:
+        """El alcance filtra por enfermedad y ventana de validez."""
+        plan = CompiladorReglas(
+            _estrategia([], valid_until=datetime(2024, 12, 31))
+        ).compilar()
+
+        assert plan.alcance_sql == (
+            "ce.id_enfermedad = :id_enfermedad"
+            " AND ce.fecha_minima_caso >= :valido_desde"
+            " AND ce.fecha_minima_caso <= :valido_hasta"
+        )
+        assert plan.params["id_enfermedad"] == 7
+        assert plan.params["valido_hasta"].isoformat() == "2024-12-31"
+
+    def test_igual_insensible_normaliza_el_valor(self) -> None:
+        """CAMPO_IGUAL sin strict compara contra el valor normalizado."""
+        condicion = _condicion(
+            TipoFiltro.CAMPO_IGUAL, "EVENTO", {"value": "  Fiebre  AMARILLA "}
+        )
+        plan = CompiladorReglas(
+            _estrategia([_regla(1, "CONFIRMADOS", 1, [condicion])])
+        ).compilar()
+
+        predicado = plan.condiciones[0].predicado_sql
+        assert plan.modo == "sql"
+        assert predicado is not None and "enf.nombre" in predicado
+        assert "fiebre amarilla" in plan.params.values()
+
+    def test_campo_multivalor_usa_exists(self) -> None:
+        """Los campos de tablas hijas se cumplen si alguna fila hija cumple."""
+        condicion = _condicion(
+            TipoFiltro.CAMPO_EN_LISTA, "RESULTADO", {"values": ["Positivo"]}
+        )
+        plan = CompiladorReglas(
+            _estrategia([_regla(1, "CONFIRMADOS", 1, [condicion])])
+        ).compilar()
+
+        predicado = plan.condiciones[0].predicado_sql
+        assert predicado is not None
+        assert predicado.startswith("COALESCE(EXISTS (SELECT 1 FROM estudio_caso")
+
+    def test_campo_sin_columna_se_lee_del_csv_original(self) -> None:
+        """Un campo no almacenado sale de ``datos_originales_csv``."""
+        condicion = _condicion(TipoFiltro.CAMPO_EXISTE, "SEROTIPO", {})
+        plan = CompiladorReglas(
+            _estrategia([_regla(1, "CONFIRMADOS", 1, [condicion])])
+        ).compilar()
+
+        assert plan.campos_desde_csv == ["SEROTIPO"]
+        assert "ce.datos_originales_csv IS NOT NULL" in plan.alcance_sql
+
+    def test_column_mapping_resuelve_el_nombre_original(self) -> None:
+        """Las reglas usan el nombre renombrado; se busca la columna original."""
+        condicion = _condicion(TipoFiltro.CAMPO_NO_NULO, "clasif", {})
+        plan = CompiladorReglas(
+            _estrategia(
+                [_regla(1, "CONFIRMADOS", 1, [condicion])],
+                config={"column_mapping": {"CLASIFICACION_MANUAL": "clasif"}},
+            )
+        ).compilar()
+
+        assert plan.campos_desde_csv == []
+        assert plan.condiciones[0].predicado_sql == (
+            "COALESCE((ce.clasificacion_manual) IS NOT NULL, FALSE)"
+        )
+
+    def test_contiene_estricto_y_regex_pasan_a_polars(self) -> None:
+        """Las condiciones sin traducción exacta cambian el modo a Polars."""
+        reglas = [
+            _regla(
+                1,
+                "CONFIRMADOS",
+                1,
+                [_condicion(TipoFiltro.REGEX_EXTRACCION, "EVENTO", {"pattern": "D"})],
+            )
+        ]
+        plan = CompiladorReglas(_estrategia(reglas)).compilar()
+
+        assert plan.modo == "polars"
+        assert plan.condiciones[0].predicado_sql is None
+
+    def test_regex_invalida_nunca_se_cumple(self) -> None:
+        """Una regex inválida es FALSE, como el ``except`` del servicio sync."""
+        condicion = _condicion(TipoFiltro.REGEX_EXTRACCION, "EVENTO", {"pattern": "("})
+        plan = CompiladorReglas(
+            _estrategia([_regla(1, "CONFIRMADOS", 1, [condicion])])
+        ).compilar()
+
+        assert plan.modo == "sql"
+        assert plan.condiciones[0].predicado_sql == "COALESCE(FALSE, FALSE)"
+
+    def test_reglas_inactivas_y_orden_por_prioridad(self) -> None:
+        """Solo las reglas activas, ordenadas por prioridad."""
+        reglas = [
+            _regla(1, "CONFIRMADOS", 5, []),
+            _regla(2, "SOSPECHOSOS", 1, []),
+            _regla(3, "DESCARTADOS", 0, [], activa=False),
+        ]
+        plan = CompiladorReglas(_estrategia(reglas)).compilar()
+
+        assert [r.regla.id for r in plan.reglas] == [2, 1]
+
+    def test_clasificacion_invalida_falla_antes_de_escribir(self) -> None:
+        """El UPDATE castea al enum: se valida al compilar."""
+        with pytest.raises(ValueError):
+            CompiladorReglas(_estrategia([_regla(1, "NO_EXISTE", 1, [])])).compilar()
+
+    def test_combinacion_acumulada_en_orden(self) -> None:
+        """AND/OR se acumulan de izquierda a derecha como ``_apply_rule``."""
+        condiciones = [
+            _condicion(TipoFiltro.CAMPO_NO_NULO, "EVENTO", {}, orden=0),
+            _condicion(TipoFiltro.CAMPO_NO_NULO, "IDEVENTOCASO", {}, 1, "OR"),
+            _condicion(TipoFiltro.CAMPO_NO_NULO, "CLASIFICACION_MANUAL", {}, 2),
+        ]
+        plan = CompiladorReglas(
+            _estrategia([_regla(1, "CONFIRMADOS", 1, condiciones)])
+        ).compilar()
+        regla = plan.reglas[0]
+
+        sql = regla.combinar(
+            [_CombinadorSQL(c.alias) for c in regla.condiciones], _CombinadorSQL("T")
+        ).sql
+
+        assert sql == "(((T AND c1) OR c2) AND c3)"
+
+
+class TestEvaluacionPolars:
+    """Tests para la evaluación vectorizada de reglas."""
+
+    VALORES = ("Dengue grave", "DENGUE", "dengue", None, "Zika", "Den.gue", "")
+
+    @pytest.mark.parametrize(
+        ("tipo", "config"),
+        [
+            (TipoFiltro.CAMPO_CONTIENE, {"value": "Dengue", "strict": True}),
+            (
+                TipoFiltro.CAMPO_CONTIENE,
+                {"value": "den.ue", "strict": True, "case_sensitive": False},
+            ),
+            (TipoFiltro.REGEX_EXTRACCION, {"pattern": "[Dd]engue"}),
+            (TipoFiltro.REGEX_EXTRACCION, {"pattern": "grave"}),
+        ],
+    )
+    def test_paridad_con_servicio_sync(self, tipo: TipoFiltro, config: dict) -> None:
+        """La máscara Polars coincide con la evaluación pandas de la ingesta."""
+        condicion = _condicion(tipo, "EVENTO", config)
+        plan = CompiladorReglas(
+            _estrategia([_regla(1, "CONFIRMADOS", 1, [condicion])])
+        ).compilar()
+        compilada = plan.condiciones[0]
+
+        df = pl.DataFrame(
+            {compilada.alias: list(self.VALORES)}, schema={compilada.alias: pl.Utf8}
+        )
+        polars = df.select(compilada.mascara_polars())[compilada.alias].to_list()
+        pandas = SyncEventClassificationService(MagicMock())._evaluate_condition(
+            pd.DataFrame({"EVENTO": pd.Series(list(self.VALORES), dtype=object)}),
+            condicion,
+        )
+
+        assert polars == [bool(v) for v in pandas.tolist()]
+
+    def test_lote_aplica_la_regla_de_mayor_prioridad(self) -> None:
+        """La primera regla que se cumple gana; el resto requiere revisión."""
+        reglas = [
+            _regla(
+                10,
+                "SOSPECHOSOS",
+                2,
+                [_condicion(TipoFiltro.REGEX_EXTRACCION, "EVENTO", {"pattern": "D"})],
+            ),
+            _regla(
+                20,
+                "CONFIRMADOS",
+                1,
+                [
+                    _condicion(
+                        TipoFiltro.CAMPO_CONTIENE,
+                        "EVENTO",
+                        {"value": "grave", "strict": True},
+                    )
+                ],
+            ),
+        ]
+        plan = CompiladorReglas(_estrategia(reglas)).compilar()
+        session = MagicMock()
+        session.execute.return_value.all.return_value = [
+            (1, 100, None, None, "Dengue grave", "Dengue grave"),
+            (2, 101, "CONFIRMADOS", 3, "Dengue", "Dengue"),
+            (3, None, "SOSPECHOSOS", 3, "Zika", "Zika"),
+        ]
+
+        _, params = ReclasificadorCasos(session)._evaluado_polars(plan, 0)
+
+        assert params["ids"] == [1, 2, 3]
+        assert params["nuevas"] == [
+            "CONFIRMADOS",
+            "SOSPECHOSOS",
+            TipoClasificacion.REQUIERE_REVISION.value,
+        ]
+        assert params["reglas_ids"] == [20, 10, None]
+
+    def test_lote_vacio_termina(self) -> None:
+        """Sin filas no hay CTE ``evaluado``: el recorrido por lotes termina."""
+        condicion = _condicion(TipoFiltro.REGEX_EXTRACCION, "EVENTO", {"pattern": "D"})
+        plan = CompiladorReglas(
+            _estrategia([_regla(1, "CONFIRMADOS", 1, [condicion])])
+        ).compilar()
+        session = MagicMock()
+        session.execute.return_value.all.return_value = []
+
+        assert ReclasificadorCasos(session)._evaluado_polars(plan, 0) == (None, {})
+
+
+class TestConsultaLote:
+    """Tests para la sentencia por lote."""
+
+    def test_dry_run_no_actualiza(self) -> None:
+        """En dry-run la sentencia solo calcula el diff."""
+        sql = ReclasificadorCasos._consulta_lote("evaluado AS (SELECT 1)", True)
+
+        assert "UPDATE" not in sql
+        assert "0 AS actualizados" in sql
+
+    def test_actualiza_solo_los_que_cambian(self) -> None:
+        """El UPDATE filtra casos sin cambio de clasificación ni estrategia."""
+        sql = ReclasificadorCasos._consulta_lote("evaluado AS (SELECT 1)", False)
+
+        assert "UPDATE caso_epidemiologico" in sql
+        assert "e.actual IS DISTINCT FROM e.nueva" in sql
+        assert "(SELECT count(*) FROM actualizado) AS actualizados" in sql
+
+
+def _session_con_lock(
+    id_enfermedad: int | None, tomado: bool = True
+) -> tuple[MagicMock, MagicMock, list[str]]:
+    """
+    Sesión falsa cuya conexión del lock registra el SQL ejecutado.
+
+    La primera sentencia devuelve la enfermedad de la estrategia y la segunda
+    (``pg_try_advisory_lock``) si el lock estaba libre.
+    """
+    sentencias: list[str] = []
+    escalares = iter([id_enfermedad, tomado])
+
+    def ejecutar(stmt: Any, params: Any = None) -> MagicMock:
+        sentencias.append(str(stmt))
+        resultado = MagicMock()
+        if len(sentencias) <= 2:
+            valor = next(escalares)
+            resultado.scalar_one_or_none.return_value = valor
+            resultado.scalar_one.return_value = valor
+        return resultado
+
+    session = MagicMock()
+    conectar = session.get_bind.return_value.connect.return_value.execution_options
+    conectar.return_value.__enter__.return_value.execute.side_effect = ejecutar
+    return session, conectar, sentencias
+
+
+class TestBloqueoEnfermedad:
+    """Tests del advisory lock por enfermedad durante la corrida."""
+
+    def test_toma_y_libera_el_lock(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """La estrategia se carga y se reclasifica con el lock tomado."""
+        session, conectar, sentencias = _session_con_lock(id_enfermedad=7)
+        reclasificador = ReclasificadorCasos(session)
+        eventos: list[str] = []
+
+        def cargar(id_estrategia: int) -> EstrategiaClasificacion:
+            eventos.append(f"cargar tras {len(sentencias)} sentencias")
+            return _estrategia([])
+
+        def reclasificar(*args: Any) -> dict[str, Any]:
+            eventos.append(f"reclasificar tras {len(sentencias)} sentencias")
+            return {"casos_evaluados": 0}
+
+        monkeypatch.setattr(reclasificador, "_cargar_estrategia", cargar)
+        monkeypatch.setattr(reclasificador, "_reclasificar", reclasificar)
+
+        assert reclasificador.ejecutar(3) == {"casos_evaluados": 0}
+
+        assert eventos == ["cargar tras 2 sentencias", "reclasificar tras 2 sentencias"]
+        assert len(sentencias) == 3
+        assert "pg_try_advisory_lock(hashtext(:espacio), :id)" in sentencias[1]
+        assert "pg_advisory_unlock(hashtext(:espacio), :id)" in sentencias[2]
+        conectar.assert_called_once_with(isolation_level="AUTOCOMMIT")
+
+    def test_espera_si_otra_corrida_lo_tiene(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        session, _, sentencias = _session_con_lock(id_enfermedad=7, tomado=False)
+        reclasificador = ReclasificadorCasos(session)
+
+        with (
+            caplog.at_level(logging.INFO),
+            reclasificador._bloquear_enfermedad(3),
+        ):
+            assert "pg_advisory_lock(hashtext(:espacio), :id)" in sentencias[-1]
+
+        assert "Esperando otra reclasificación de la enfermedad 7" in caplog.text
+        assert "pg_advisory_unlock" in sentencias[-1]
+
+    def test_libera_el_lock_si_la_corrida_falla(self) -> None:
+        session, _, sentencias = _session_con_lock(id_enfermedad=7)
+
+        with (
+            pytest.raises(RuntimeError),
+            ReclasificadorCasos(session)._bloquear_enfermedad(3),
+        ):
+            raise RuntimeError("falló un lote")
+
+        assert "pg_advisory_unlock" in sentencias[-1]
+
+    def test_estrategia_inexistente_no_bloquea(self) -> None:
+        session, _, sentencias = _session_con_lock(id_enfermedad=None)
+
+        with pytest.raises(ValueError, match="Estrategia 3 no encontrada"):
+            ReclasificadorCasos(session).ejecutar(3)
+
+        assert len(sentencias) == 1
@@ -0,0 +1,83 @@
+"""
+Tests unitarios para el refresco de ``ciudadano_resumen_casos``.
+
+Las sentencias usan funciones de PostgreSQL (``array_agg``, ON CONFLICT): se
+capturan con una sesión falsa y se compilan con el dialecto de PostgreSQL.
+"""
+
+from typing import Any
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.domains.vigilancia_nominal.queries.resumen_ciudadanos import (
+    ciudadanos_de_casos,
+    refrescar_resumen_ciudadanos,
+)
+
+
+def _compilar(stmt: Any) -> tuple[str, dict[str, Any]]:
+    compilado = stmt.compile(dialect=postgresql.dialect())
+    return str(compilado), compilado.params
+
+
+def _sentencias(session: MagicMock) -> list[tuple[str, dict[str, Any]]]:
+    return [_compilar(llamada.args[0]) for llamada in session.execute.call_args_list]
+
+
+class TestCiudadanosDeCasos:
+    """Tests de la búsqueda de titulares antes del upsert de casos."""
+
+    def test_sin_casos_no_consulta(self) -> None:
+        session = MagicMock()
+
+        assert ciudadanos_de_casos(session, []) == set()
+        session.execute.assert_not_called()
+
+    def test_titulares_por_id_snvs(self) -> None:
+        session = MagicMock()
+        session.execute.return_value.scalars.return_value = iter([10, 20])
+
+        titulares = ciudadanos_de_casos(session, [1001, 1002])
+
+        assert titulares == {10, 20}
+        ((sql, params),) = _sentencias(session)
+        assert "SELECT DISTINCT caso_epidemiologico.codigo_ciudadano" in sql
+        assert "caso_epidemiologico.id_snvs IN" in sql
+        assert "caso_epidemiologico.codigo_ciudadano IS NOT NULL" in sql
+        assert params["id_snvs_1"] == [1001, 1002]
+
+
+class TestRefrescarResumen:
+    """Tests del alcance del refresco."""
+
+    def test_lista_vacia_no_hace_nada(self) -> None:
+        session = MagicMock()
+
+        refrescar_resumen_ciudadanos(session, [])
+
+        session.execute.assert_not_called()
+
+    def test_refresca_y_limpia_solo_los_ciudadanos_dados(self) -> None:
+        # 20 es el titular anterior de un caso que pasó a 10
+        session = MagicMock()
+
+        refrescar_resumen_ciudadanos(session, [10, 20])
+
+        (upsert, upsert_params), (borrado, borrado_params) = _sentencias(session)
+        assert upsert.startswith("INSERT INTO ciudadano_resumen_casos")
+        assert "ON CONFLICT (codigo_ciudadano) DO UPDATE" in upsert
+        assert [10, 20] in upsert_params.values()
+        # El que se quedó sin casos se borra del resumen
+        assert borrado.startswith("DELETE FROM ciudadano_resumen_casos")
+        assert "NOT (EXISTS" in borrado
+        assert [10, 20] in borrado_params.values()
+
+    def test_sin_codigos_refresca_todos(self) -> None:
+        session = MagicMock()
+
+        refrescar_resumen_ciudadanos(session)
+
+        (upsert, _), (borrado, _) = _sentencias(session)
+        assert " IN " not in upsert
+        assert " IN " not in borrado
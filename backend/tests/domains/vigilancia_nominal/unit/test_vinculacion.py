@@ -0,0 +1,215 @@
+"""
+Tests unitarios para la vinculación de registros de ciudadanos.
+
+Cubren la normalización fonética, las claves de bloqueo y el score de los
+pares, sin base de datos.
+"""
+
+from datetime import date
+
+import numpy as np
+import polars as pl
+import pytest
+
+from app.domains.vigilancia_nominal.procesamiento.vinculacion import (
+    PESOS,
+    claves_bloqueo,
+    preparar_personas,
+    puntuar_pares,
+    similitud_documento,
+)
+
+_BASE = {
+    "nombre": "Juan Carlos",
+    "apellido": "Gonzalez",
+    "numero_documento": 30123456,
+    "fecha_nacimiento": date(1985, 3, 12),
+    "sexo": "MASCULINO",
+    "id_localidad_indec": 26007010,
+}
+
+
+def _personas(*filas: dict) -> pl.DataFrame:
+    return preparar_personas(
+        pl.DataFrame(
+            [
+                {**_BASE, "codigo_ciudadano": codigo, **fila}
+                for codigo, fila in enumerate(filas, start=1)
+            ],
+            schema={
+                "codigo_ciudadano": pl.Int64,
+                "nombre": pl.Utf8,
+                "apellido": pl.Utf8,
+                "numero_documento": pl.Int64,
+                "fecha_nacimiento": pl.Date,
+                "sexo": pl.Utf8,
+                "id_localidad_indec": pl.Int64,
+            },
+        )
+    )
+
+
+def _puntuar(a: dict, b: dict) -> dict:
+    """Score del par (1, 2); ``{}`` si el par se descarta."""
+    pares = pl.DataFrame(
+        {
+            "codigo_ciudadano_a": [1],
+            "codigo_ciudadano_b": [2],
+            "bloques": [["apellido_anio"]],
+        }
+    )
+    resultado = puntuar_pares(pares, _personas(a, b))
+    return resultado.row(0, named=True) if resultado.height else {}
+
+
+class TestFonetica:
+    """Tests de la forma fonética y las claves de bloqueo."""
+
+    @pytest.mark.parametrize(
+        ("apellido_a", "apellido_b", "clave"),
+        [
+            ("gonzalez", "gonsales", "gnsls"),
+            ("González", "GONSALES", "gnsls"),
+            ("villalba", "bilalva", "bllb"),
+            ("Quiroga", "Kiroga", "krg"),
+            ("Hernández", "Ernandes", "ernnds"),
+        ],
+    )
+    def test_grafias_equivalentes(
+        self, apellido_a: str, apellido_b: str, clave: str
+    ) -> None:
+        personas = _personas({"apellido": apellido_a}, {"apellido": apellido_b})
+
+        assert personas["apellido"][0] == personas["apellido"][1]
+        assert personas["fonetico_apellido"].to_list() == [clave, clave]
+
+    def test_nombre_vacio_al_normalizar(self) -> None:
+        personas = _personas({"nombre": " .. "}, {"nombre": None})
+
+        assert personas["nombre"].to_list() == [None, None]
+        assert personas["primer_nombre"].to_list() == [None, None]
+
+    def test_claves_bloqueo_sin_nulos(self) -> None:
+        personas = _personas(
+            {},
+            {
+                "nombre": None,
+                "fecha_nacimiento": None,
+                "numero_documento": None,
+                "id_localidad_indec": None,
+            },
+        )
+
+        claves = claves_bloqueo(personas)
+
+        # Sin nombre, fecha, documento ni localidad no queda ninguna clave
+        assert claves.filter(codigo_ciudadano=2).is_empty()
+        assert sorted(claves["tipo"]) == [
+            "apellido_anio",
+            "apellido_localidad",
+            "documento",
+            "nombre_apellido",
+        ]
+        assert (
+            claves.filter(tipo="apellido_anio", codigo_ciudadano=1)["clave"][0]
+            == "gnsls|1985"
+        )
+
+
+class TestSimilitudDocumento:
+    """Tests de la similitud entre números de documento."""
+
+    def test_errores_de_tipeo(self) -> None:
+        a = np.array([30123456, 30123456, 30123456, 30123456, 30123456, 30123456.0])
+        b = np.array([30123456, 30123457, 30213456, 30124356, 31123457, 3012345.0])
+
+        # Igual, un dígito, dos contiguos transpuestos (x2), dos dígitos
+        # sueltos y un dígito de menos
+        assert similitud_documento(a, b).tolist() == [1.0, 0.8, 0.8, 0.8, 0.0, 0.0]
+
+    def test_faltante(self) -> None:
+        resultado = similitud_documento(
+            np.array([np.nan, 30123456.0]), np.array([30123456.0, np.nan])
+        )
+        assert np.isnan(resultado).all()
+
+
+class TestPuntuarPares:
+    """Tests del score de un par candidato."""
+
+    def test_mismo_registro(self) -> None:
+        par = _puntuar({}, {})
+
+        assert all(par[campo] == 1.0 for campo in PESOS)
+        assert par["score"] == 1.0
+
+    def test_grafia_fonetica_y_documento_con_error(self) -> None:
+        par = _puntuar(
+            {"apellido": "Gonzalez", "numero_documento": 30123456},
+            {"apellido": "Gonsales", "numero_documento": 30213456},
+        )
+
+        assert par["apellido"] == 1.0
+        assert par["documento"] == 0.8
+        assert par["score"] == pytest.approx(1 - PESOS["documento"] * 0.2)
+
+    def test_segundo_nombre_faltante(self) -> None:
+        par = _puntuar({"nombre": "Juan Carlos"}, {"nombre": "Juan"})
+
+        assert par["nombre"] == 1.0
+
+    @pytest.mark.parametrize("nombre_faltante", [None, "", " - "])
+    def test_nombre_faltante_no_cuenta(self, nombre_faltante: str | None) -> None:
+        par = _puntuar({}, {"nombre": nombre_faltante})
+
+        # Sin nombre en un lado, el campo se ignora (no puntúa 0)
+        assert par["nombre"] is None
+        assert par["score"] == 1.0
+
+    def test_campos_nulos_renormalizan_pesos(self) -> None:
+        par = _puntuar(
+            {"fecha_nacimiento": None, "numero_documento": None},
+            {"apellido": "Gonzales", "nombre": "Juan Carlos"},
+        )
+
+        assert par["fecha_nacimiento"] is None
+        assert par["documento"] is None
+        esperado = (PESOS["apellido"] * par["apellido"] + PESOS["nombre"]) / (
+            PESOS["apellido"] + PESOS["nombre"]
+        )
+        assert par["score"] == pytest.approx(esperado, abs=1e-4)
+
+    def test_sin_apellido_se_descarta(self) -> None:
+        assert _puntuar({}, {"apellido": None}) == {}
+
+    @pytest.mark.parametrize(
+        ("fecha_b", "similitud"),
+        [
+            (date(1985, 12, 3), 0.8),
+            (date(1985, 3, 21), 0.6),
+            (date(1958, 3, 12), 0.0),
+            (date(1995, 3, 12), 0.6),
+        ],
+    )
+    def test_fecha_mal_tipeada(self, fecha_b: date, similitud: float) -> None:
+        assert _puntuar({}, {"fecha_nacimiento": fecha_b})["fecha_nacimiento"] == (
+            similitud
+        )
+
+    def test_sexo_distinto_penaliza(self) -> None:
+        assert _puntuar({}, {"sexo": "FEMENINO"})["score"] == 0.7
+        assert _puntuar({}, {"sexo": "NO_ESPECIFICADO"})["score"] == 1.0
+        assert _puntuar({}, {"sexo": None})["score"] == 1.0
+
+    def test_personas_distintas(self) -> None:
+        par = _puntuar(
+            {},
+            {
+                "nombre": "Maria",
+                "apellido": "Villalba",
+                "numero_documento": 28999111,
+                "fecha_nacimiento": date(1970, 8, 1),
+            },
+        )
+
+        assert par["score"] < 0.3
@@ -0,0 +1 @@
+"""Tests de los scripts de mantenimiento y seeds."""
@@ -0,0 +1 @@
+"""Tests unitarios de los scripts de mantenimiento y seeds."""
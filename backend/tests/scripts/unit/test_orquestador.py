@@ -0,0 +1,287 @@
+"""
+Tests unitarios para el orquestador de seeds (DAG, paralelismo y salteo por hash).
+
+El estado se guarda en SQLite (archivo temporal): la tabla ``seed_estado`` se
+crea desde el modelo y ``now()`` se registra como función para el upsert.
+"""
+
+import threading
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine, create_engine, event, text
+
+from app.scripts.seeds import orquestador
+from app.scripts.seeds.models import SeedEstado
+from app.scripts.seeds.orquestador import (
+    PasoSeed,
+    ejecutar_seeds,
+    fallo_obligatorio,
+    hash_paso,
+)
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Iterator[Engine]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'seeds.db'}")
+
+    @event.listens_for(engine, "connect")
+    def _registrar_now(dbapi_conn: object, _registro: object) -> None:
+        dbapi_conn.create_function("now", 0, lambda: datetime.now().isoformat())  # type: ignore[attr-defined]
+
+    with engine.begin() as conn:
+        SeedEstado.__table__.create(conn)
+        conn.execute(text("CREATE TABLE datos (id INTEGER)"))
+    yield engine
+    engine.dispose()
+
+
+class Registro:
+    """Pasos de prueba que anotan en qué orden se ejecutaron."""
+
+    def __init__(self) -> None:
+        self.ejecutados: list[str] = []
+        self._lock = threading.Lock()
+
+    def paso(
+        self,
+        nombre: str,
+        depende_de: tuple[str, ...] = (),
+        falla: bool = False,
+        **kwargs: object,
+    ) -> PasoSeed:
+        def ejecutar(_engine: Engine) -> int:
+            with self._lock:
+                self.ejecutados.append(nombre)
+            if falla:
+                raise RuntimeError(f"falló {nombre}")
+            return 1
+
+        return PasoSeed(
+            nombre, f"Paso {nombre}", ejecutar, depende_de=depende_de, **kwargs
+        )
+
+
+def _estados(pasos: dict[str, orquestador.ResultadoPaso]) -> dict[str, str]:
+    return {nombre: r.estado for nombre, r in pasos.items()}
+
+
+class TestValidar:
+    """Tests de la validación del DAG."""
+
+    def test_nombre_repetido(self) -> None:
+        registro = Registro()
+        with pytest.raises(ValueError, match="repetido"):
+            orquestador._validar([registro.paso("a"), registro.paso("a")])
+
+    def test_dependencia_inexistente(self) -> None:
+        with pytest.raises(ValueError, match="inexistentes"):
+            orquestador._validar([Registro().paso("a", ("x",))])
+
+    def test_dependencia_circular(self) -> None:
+        registro = Registro()
+        pasos = [
+            registro.paso("a", ("c",)),
+            registro.paso("b", ("a",)),
+            registro.paso("c", ("b",)),
+        ]
+        with pytest.raises(ValueError, match="circular"):
+            orquestador._validar(pasos)
+
+
+class TestHashPaso:
+    """Tests del hash de contenido de un paso."""
+
+    def test_cambia_con_archivos_y_dependencias(self, tmp_path: Path) -> None:
+        archivo = tmp_path / "fuente.csv"
+        archivo.write_text("a,b\n1,2\n")
+        paso = Registro().paso(
+            "a", modulos=("app.scripts.seeds.orquestador",), archivos=lambda: [archivo]
+        )
+
+        original = hash_paso(paso)
+        assert hash_paso(paso) == original
+        assert hash_paso(paso, ["dependencia"]) != original
+
+        archivo.write_text("a,b\n1,3\n")
+        assert hash_paso(paso) != original
+
+        archivo.unlink()
+        assert hash_paso(paso) != original
+
+    def test_modulo_inexistente(self) -> None:
+        paso = Registro().paso("a", modulos=("app.scripts.seeds.no_existe",))
+        with pytest.raises(ValueError, match="inexistente"):
+            hash_paso(paso)
+
+
+class TestEjecutarSeeds:
+    """Tests de la ejecución del DAG."""
+
+    def test_respeta_dependencias(self, engine: Engine) -> None:
+        registro = Registro()
+        pasos = [
+            registro.paso("c", ("b",)),
+            registro.paso("b", ("a",)),
+            registro.paso("a"),
+        ]
+
+        resultado = ejecutar_seeds(engine, pasos)
+
+        assert registro.ejecutados == ["a", "b", "c"]
+        assert set(_estados(resultado.pasos).values()) == {"ejecutado"}
+        assert not resultado.fallidos
+
+    def test_independientes_corren_en_paralelo(self, engine: Engine) -> None:
+        # Cada paso espera al otro: en serie la barrera vence el timeout
+        barrera = threading.Barrier(2, timeout=5)
+
+        def esperar(_engine: Engine) -> int:
+            barrera.wait()
+            return 0
+
+        pasos = [
+            PasoSeed("geografia", "", esperar),
+            PasoSeed("catalogos", "", esperar),
+        ]
+
+        resultado = ejecutar_seeds(engine, pasos, paralelo=2)
+
+        assert _estados(resultado.pasos) == {
+            "geografia": "ejecutado",
+            "catalogos": "ejecutado",
+        }
+
+    def test_saltea_sin_cambios(self, engine: Engine) -> None:
+        registro = Registro()
+        pasos = [registro.paso("a"), registro.paso("b", ("a",))]
+        ejecutar_seeds(engine, pasos)
+        registro.ejecutados.clear()
+
+        resultado = ejecutar_seeds(engine, pasos)
+
+        assert registro.ejecutados == []
+        assert _estados(resultado.pasos) == {"a": "sin_cambios", "b": "sin_cambios"}
+
+        resultado = ejecutar_seeds(engine, pasos, forzar=True)
+        assert sorted(registro.ejecutados) == ["a", "b"]
+
+    def test_archivo_cambiado_reejecuta_dependientes(
+        self, engine: Engine, tmp_path: Path
+    ) -> None:
+        archivo = tmp_path / "geografia.json"
+        archivo.write_text("[]")
+        registro = Registro()
+        pasos = [
+            registro.paso("a", archivos=lambda: [archivo]),
+            registro.paso("b", ("a",)),
+            registro.paso("c"),
+        ]
+        ejecutar_seeds(engine, pasos)
+        registro.ejecutados.clear()
+
+        archivo.write_text("[1]")
+        resultado = ejecutar_seeds(engine, pasos)
+
+        assert sorted(registro.ejecutados) == ["a", "b"]
+        assert resultado.pasos["c"].estado == "sin_cambios"
+
+    def test_tabla_vacia_fuerza_ejecucion(self, engine: Engine) -> None:
+        registro = Registro()
+        pasos = [registro.paso("a", tablas=("datos",))]
+        ejecutar_seeds(engine, pasos)
+        registro.ejecutados.clear()
+
+        ejecutar_seeds(engine, pasos)
+        assert registro.ejecutados == ["a"]
+
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO datos VALUES (1)"))
+        registro.ejecutados.clear()
+        ejecutar_seeds(engine, pasos)
+        assert registro.ejecutados == []
+
+    def test_fallo_omite_dependientes(self, engine: Engine) -> None:
+        registro = Registro()
+        pasos = [
+            registro.paso("a", falla=True),
+            registro.paso("b", ("a",)),
+            registro.paso("c", ("b",)),
+            registro.paso("d"),
+        ]
+
+        resultado = ejecutar_seeds(engine, pasos)
+
+        assert _estados(resultado.pasos) == {
+            "a": "fallido",
+            "b": "omitido",
+            "c": "omitido",
+            "d": "ejecutado",
+        }
+        assert resultado.pasos["a"].error == "falló a"
+        assert "a" in (resultado.pasos["b"].error or "")
+        assert [r.nombre for r in resultado.fallidos] == ["a"]
+        # El paso fallido no guarda hash: la próxima corrida lo reintenta
+        with engine.connect() as conn:
+            guardados = conn.execute(text("SELECT paso FROM seed_estado")).scalars()
+            assert set(guardados) == {"d"}
+
+    @pytest.mark.parametrize(("opcional", "esperado"), [(True, False), (False, True)])
+    def test_fallo_obligatorio(
+        self, engine: Engine, opcional: bool, esperado: bool
+    ) -> None:
+        registro = Registro()
+        pasos = [
+            registro.paso("externo", falla=True, opcional=opcional),
+            registro.paso("local"),
+        ]
+
+        resultado = ejecutar_seeds(engine, pasos)
+
+        assert fallo_obligatorio(resultado, pasos) is esperado
+
+    def test_dependiente_de_opcional_es_obligatorio(self, engine: Engine) -> None:
+        registro = Registro()
+        pasos = [
+            registro.paso("externo", falla=True, opcional=True),
+            registro.paso("derivado", ("externo",)),
+        ]
+
+        resultado = ejecutar_seeds(engine, pasos)
+
+        assert resultado.pasos["derivado"].estado == "omitido"
+        assert fallo_obligatorio(resultado, pasos)
+
+    def test_solo(self, engine: Engine) -> None:
+        registro = Registro()
+        pasos = [
+            registro.paso("a"),
+            registro.paso("b", ("a",)),
+            registro.paso("demo", por_defecto=False),
+        ]
+
+        ejecutar_seeds(engine, pasos)
+        assert sorted(registro.ejecutados) == ["a", "b"]
+
+        registro.ejecutados.clear()
+        # ``solo`` fuerza la ejecución y asume cargadas las dependencias
+        resultado = ejecutar_seeds(engine, pasos, solo={"b", "demo"})
+        assert sorted(registro.ejecutados) == ["b", "demo"]
+        assert set(resultado.pasos) == {"b", "demo"}
+
+    def test_solo_desconocido(self, engine: Engine) -> None:
+        with pytest.raises(ValueError, match="desconocidos: x"):
+            ejecutar_seeds(engine, [Registro().paso("a")], solo={"x"})
+
+    def test_guarda_filas_y_hash(self, engine: Engine) -> None:
+        registro = Registro()
+        paso = registro.paso("a")
+
+        ejecutar_seeds(engine, [paso])
+
+        with engine.connect() as conn:
+            fila = conn.execute(text("SELECT hash, filas FROM seed_estado")).one()
+        assert fila.hash == hash_paso(paso)
+        assert fila.filas == 1